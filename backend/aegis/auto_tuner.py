@@ -11,16 +11,19 @@ Features:
 - Compare clutch game predictions to actual close games
 - Adjust archetype probabilities based on accuracy
 - Track prediction confidence calibration
+- Set-based audits: a night's finals are scored and written in one pass
 """
 
 import sqlite3
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 import json
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -198,47 +201,95 @@ class AutoTuner:
         Returns:
             AuditResult with comparison data
         """
+        results = self.update_actuals_batch([{
+            'game_id': game_id,
+            'home_score': home_score,
+            'away_score': away_score,
+            'was_blowout': was_blowout,
+            'was_clutch': was_clutch,
+        }])
+        return results[0] if results else None
+    
+    def update_actuals_batch(self, finals: Iterable[Dict]) -> List[AuditResult]:
+        """
+        Update a slate of game predictions with actual results.
+        
+        One read of the matching predictions, errors and script accuracy
+        computed over the whole slate, one executemany write.
+        
+        Args:
+            finals: dicts with game_id, home_score, away_score,
+                    was_blowout, was_clutch
+        
+        Returns:
+            AuditResults for the games that had a prediction, in input order
+        """
+        finals = {f['game_id']: f for f in finals}
+        if not finals:
+            return []
+        
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             
-            # Get prediction
-            cursor = conn.execute("""
-                SELECT * FROM game_scripts WHERE game_id = ?
-            """, (game_id,))
+            # Get predictions (chunked to stay under SQLite's parameter limit)
+            game_ids = list(finals)
+            predictions = {}
+            for i in range(0, len(game_ids), 500):
+                chunk = game_ids[i:i + 500]
+                cursor = conn.execute(f"""
+                    SELECT * FROM game_scripts WHERE game_id IN ({','.join('?' * len(chunk))})
+                """, chunk)
+                predictions.update((row['game_id'], row) for row in cursor.fetchall())
             
-            row = cursor.fetchone()
-            if not row:
-                logger.warning(f"[AUTO-TUNER] No prediction found for game {game_id}")
-                return None
+            for game_id in game_ids:
+                if game_id not in predictions:
+                    logger.warning(f"[AUTO-TUNER] No prediction found for game {game_id}")
+            
+            rows = [predictions[g] for g in game_ids if g in predictions]
+            if not rows:
+                return []
+            actual = [finals[row['game_id']] for row in rows]
             
             # Calculate errors
-            home_error = abs(row['predicted_home_score_ev'] - home_score)
-            away_error = abs(row['predicted_away_score_ev'] - away_score)
+            home_error = np.abs(np.array([r['predicted_home_score_ev'] for r in rows], dtype=float)
+                                - np.array([a['home_score'] for a in actual], dtype=float))
+            away_error = np.abs(np.array([r['predicted_away_score_ev'] for r in rows], dtype=float)
+                                - np.array([a['away_score'] for a in actual], dtype=float))
             
             # Script accuracy: did we predict game flow correctly?
-            blowout_correct = (row['predicted_blowout_pct'] > 0.5) == was_blowout
-            clutch_correct = (row['predicted_clutch_pct'] > 0.2) == was_clutch
-            script_accuracy = (1.0 if blowout_correct else 0.0) * 0.5 + (1.0 if clutch_correct else 0.0) * 0.5
+            predicted_blowout = np.array([r['predicted_blowout_pct'] for r in rows], dtype=float) > 0.5
+            predicted_clutch = np.array([r['predicted_clutch_pct'] for r in rows], dtype=float) > 0.2
+            was_blowout = np.array([bool(a['was_blowout']) for a in actual])
+            was_clutch = np.array([bool(a['was_clutch']) for a in actual])
+            script_accuracy = ((predicted_blowout == was_blowout) * 0.5
+                               + (predicted_clutch == was_clutch) * 0.5)
             
             # Update database
-            conn.execute("""
+            now = datetime.now().isoformat()
+            conn.executemany("""
                 UPDATE game_scripts
                 SET actual_home_score = ?, actual_away_score = ?,
                     actual_was_blowout = ?, actual_was_clutch = ?,
                     home_score_error = ?, away_score_error = ?,
                     script_accuracy = ?, audited_at = ?
                 WHERE game_id = ?
-            """, (
-                home_score, away_score,
-                was_blowout, was_clutch,
-                home_error, away_error,
-                script_accuracy,
-                datetime.now().isoformat(),
-                game_id
-            ))
-            
-            return AuditResult(
-                game_id=game_id,
+            """, [
+                (
+                    a['home_score'], a['away_score'],
+                    a['was_blowout'], a['was_clutch'],
+                    float(home_error[i]), float(away_error[i]),
+                    float(script_accuracy[i]),
+                    now,
+                    a['game_id']
+                )
+                for i, a in enumerate(actual)
+            ])
+        
+        logger.info(f"[AUTO-TUNER] Audited {len(rows)} game scripts")
+        
+        return [
+            AuditResult(
+                game_id=a['game_id'],
                 game_date=date.fromisoformat(row['game_date']),
                 home_team=row['home_team'],
                 away_team=row['away_team'],
@@ -252,16 +303,18 @@ class AutoTuner:
                     row['predicted_away_score_ev'],
                     row['predicted_away_score_ceiling']
                 ),
-                actual_home_score=home_score,
-                actual_away_score=away_score,
-                predicted_blowout=row['predicted_blowout_pct'] > 0.5,
-                actual_blowout=was_blowout,
-                predicted_clutch=row['predicted_clutch_pct'] > 0.2,
-                actual_clutch=was_clutch,
-                home_score_error=home_error,
-                away_score_error=away_error,
-                script_accuracy=script_accuracy
+                actual_home_score=a['home_score'],
+                actual_away_score=a['away_score'],
+                predicted_blowout=bool(predicted_blowout[i]),
+                actual_blowout=a['was_blowout'],
+                predicted_clutch=bool(predicted_clutch[i]),
+                actual_clutch=a['was_clutch'],
+                home_score_error=float(home_error[i]),
+                away_score_error=float(away_error[i]),
+                script_accuracy=float(script_accuracy[i])
             )
+            for i, (row, a) in enumerate(zip(rows, actual))
+        ]
     
     def run_next_day_audit(self, target_date: Optional[date] = None) -> List[TuningRecommendation]:
         """
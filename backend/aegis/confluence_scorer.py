@@ -109,6 +109,10 @@ class ConfluenceScorer:
             interpretation=interpretation
         )
     
+    def grade_for(self, score: float) -> str:
+        """Letter grade for a 0-100 score (e.g. a stored ledger score)"""
+        return self._get_grade(score)
+    
     def _get_grade(self, score: float) -> str:
         """Convert score to letter grade"""
         for grade, (low, high) in self.GRADES.items():
@@ -5,16 +5,21 @@ Projection history database for ML feedback loop.
 
 Every simulation result (Floor/EV/Ceiling) is saved.
 Next-Day Audit compares projections to actuals.
+
+Slates are written set-based: record_projections / update_actuals_batch
+use one connection and one executemany per call.
 """
 
 import sqlite3
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from dataclasses import dataclass
 import logging
 import json
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -94,6 +99,25 @@ class LearningLedger:
     CREATE INDEX IF NOT EXISTS idx_ledger_date ON learning_ledger(game_date);
     """
     
+    INSERT_SQL = """
+    INSERT OR REPLACE INTO learning_ledger (
+        player_id, opponent_id, game_date,
+        pts_floor, pts_ev, pts_ceiling,
+        reb_floor, reb_ev, reb_ceiling,
+        ast_floor, ast_ev, ast_ceiling,
+        model_weights, confluence_score, execution_time_ms,
+        created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    UPDATE_ACTUALS_SQL = """
+    UPDATE learning_ledger
+    SET pts_actual = ?, reb_actual = ?, ast_actual = ?,
+        prediction_error = ?, within_range = ?,
+        updated_at = ?
+    WHERE id = ?
+    """
+    
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or Path(__file__).parent.parent / "data" / "learning_ledger.db"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -128,34 +152,66 @@ class LearningLedger:
         Returns:
             Row ID of inserted record
         """
-        floor = projection.get('floor', {})
-        ev = projection.get('ev', {})
-        ceiling = projection.get('ceiling', {})
-        
+        row = self._projection_row(
+            player_id, opponent_id, game_date, projection,
+            confluence_score, model_weights, execution_time_ms
+        )
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                INSERT OR REPLACE INTO learning_ledger (
-                    player_id, opponent_id, game_date,
-                    pts_floor, pts_ev, pts_ceiling,
-                    reb_floor, reb_ev, reb_ceiling,
-                    ast_floor, ast_ev, ast_ceiling,
-                    model_weights, confluence_score, execution_time_ms,
-                    created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                player_id, opponent_id, game_date.isoformat(),
-                floor.get('points'), ev.get('points'), ceiling.get('points'),
-                floor.get('rebounds'), ev.get('rebounds'), ceiling.get('rebounds'),
-                floor.get('assists'), ev.get('assists'), ceiling.get('assists'),
-                json.dumps(model_weights) if model_weights else None,
-                confluence_score,
-                execution_time_ms,
-                datetime.now().isoformat()
-            ))
+            cursor = conn.execute(self.INSERT_SQL, row)
             
             logger.info(f"[LEDGER] Recorded projection for {player_id} vs {opponent_id}")
             return cursor.lastrowid
     
+    def record_projections(self, projections: Iterable[Dict[str, Any]]) -> int:
+        """
+        Record a slate of projections in one transaction.
+        
+        Args:
+            projections: dicts of record_projection keyword arguments
+            
+        Returns:
+            Number of rows written
+        """
+        rows = [
+            self._projection_row(
+                p['player_id'], p['opponent_id'], p['game_date'], p['projection'],
+                p['confluence_score'], p.get('model_weights'), p.get('execution_time_ms')
+            )
+            for p in projections
+        ]
+        if not rows:
+            return 0
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(self.INSERT_SQL, rows)
+        
+        logger.info(f"[LEDGER] Recorded {len(rows)} projections")
+        return len(rows)
+    
+    @staticmethod
+    def _projection_row(
+        player_id: str,
+        opponent_id: str,
+        game_date: date,
+        projection: Dict[str, Dict[str, float]],
+        confluence_score: float,
+        model_weights: Optional[Dict[str, float]],
+        execution_time_ms: Optional[float]
+    ) -> tuple:
+        floor = projection.get('floor', {})
+        ev = projection.get('ev', {})
+        ceiling = projection.get('ceiling', {})
+        return (
+            player_id, opponent_id, game_date.isoformat(),
+            floor.get('points'), ev.get('points'), ceiling.get('points'),
+            floor.get('rebounds'), ev.get('rebounds'), ceiling.get('rebounds'),
+            floor.get('assists'), ev.get('assists'), ceiling.get('assists'),
+            json.dumps(model_weights) if model_weights else None,
+            confluence_score,
+            execution_time_ms,
+            datetime.now().isoformat()
+        )
+    
     def update_actuals(
         self,
         player_id: str,
@@ -173,44 +229,69 @@ class LearningLedger:
         Returns:
             True if record was updated
         """
-        with sqlite3.connect(self.db_path) as conn:
-            # Get projection to calculate error
-            cursor = conn.execute("""
-                SELECT pts_ev, pts_floor, pts_ceiling 
-                FROM learning_ledger
-                WHERE player_id = ? AND game_date = ?
-            """, (player_id, game_date.isoformat()))
-            
-            row = cursor.fetchone()
-            if not row:
-                return False
+        return self.update_actuals_batch(game_date, {player_id: actuals}) > 0
+    
+    def update_actuals_batch(
+        self,
+        game_date: date,
+        actuals: Dict[str, Dict[str, float]]
+    ) -> int:
+        """
+        Update every projection for a date with actual results, in one pass.
+        
+        Errors and within-range flags are computed over the whole slate at
+        once, then written with a single executemany.
+        
+        Args:
+            game_date: Date of the games
+            actuals: {player_id: {'points': x, 'rebounds': y, 'assists': z}}
             
-            pts_ev, pts_floor, pts_ceiling = row
-            pts_actual = actuals.get('points', 0)
+        Returns:
+            Number of ledger rows updated
+        """
+        if not actuals:
+            return 0
+        
+        with sqlite3.connect(self.db_path) as conn:
+            rows = [
+                row for row in conn.execute("""
+                    SELECT id, player_id, pts_ev, pts_floor, pts_ceiling
+                    FROM learning_ledger
+                    WHERE game_date = ?
+                """, (game_date.isoformat(),))
+                if row[1] in actuals
+            ]
+            if not rows:
+                return 0
             
-            # Calculate error and within_range
-            prediction_error = abs(pts_ev - pts_actual) if pts_ev else None
-            within_range = pts_floor <= pts_actual <= pts_ceiling if all([pts_floor, pts_ceiling]) else None
+            ids, player_ids, pts_ev, pts_floor, pts_ceiling = zip(*rows)
+            # None -> NaN; a missing or zero projection yields no error / range, as before
+            ev = np.array(pts_ev, dtype=float)
+            floor = np.array(pts_floor, dtype=float)
+            ceiling = np.array(pts_ceiling, dtype=float)
+            actual = np.array([actuals[pid].get('points', 0) for pid in player_ids], dtype=float)
             
-            conn.execute("""
-                UPDATE learning_ledger
-                SET pts_actual = ?, reb_actual = ?, ast_actual = ?,
-                    prediction_error = ?, within_range = ?,
-                    updated_at = ?
-                WHERE player_id = ? AND game_date = ?
-            """, (
-                pts_actual,
-                actuals.get('rebounds'),
-                actuals.get('assists'),
-                prediction_error,
-                within_range,
-                datetime.now().isoformat(),
-                player_id,
-                game_date.isoformat()
-            ))
+            has_ev = np.nan_to_num(ev) != 0
+            has_range = (np.nan_to_num(floor) != 0) & (np.nan_to_num(ceiling) != 0)
+            error = np.abs(ev - actual)
+            within = (floor <= actual) & (actual <= ceiling)
             
-            logger.info(f"[LEDGER] Updated actuals for {player_id} on {game_date}")
-            return True
+            now = datetime.now().isoformat()
+            conn.executemany(self.UPDATE_ACTUALS_SQL, [
+                (
+                    actuals[pid].get('points', 0),
+                    actuals[pid].get('rebounds'),
+                    actuals[pid].get('assists'),
+                    float(error[i]) if has_ev[i] else None,
+                    bool(within[i]) if has_range[i] else None,
+                    now,
+                    ids[i]
+                )
+                for i, pid in enumerate(player_ids)
+            ])
+        
+        logger.info(f"[LEDGER] Updated actuals for {len(rows)} projections on {game_date}")
+        return len(rows)
     
     def get_player_history(
         self,
@@ -253,6 +334,18 @@ class LearningLedger:
             
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_audited_between(self, start: date, end: date) -> List[Dict]:
+        """Audited projections (actuals filled) for a date range, inclusive (for backtests)"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute("""
+                SELECT * FROM learning_ledger
+                WHERE game_date BETWEEN ? AND ? AND pts_actual IS NOT NULL
+                ORDER BY game_date, player_id
+            """, (start.isoformat(), end.isoformat()))
+            
+            return [dict(row) for row in cursor.fetchall()]
+    
     def get_recent_accuracy_stats(self, days: int = 30) -> Dict:
         """Get aggregate accuracy stats for recent projections"""
         cutoff = (date.today() - timedelta(days=days)).isoformat()
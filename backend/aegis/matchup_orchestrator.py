@@ -8,9 +8,18 @@ Coordinates:
 2. Batch archetype refresh for all players
 3. Full-game Crucible simulation
 4. Team-level offensive/defensive profile aggregation
+
+Both rosters share one pipeline per request: archetypes are classified in
+one bulk read/write, each opponent's defensive context is fetched once,
+and player projections run concurrently (bounded by
+PROJECTION_CONCURRENCY) on the request loop through one long-lived
+AegisOrchestrator, so its SimulationCache serves repeat matchups. The
+orchestrator pushes its Monte Carlo and CSV work to the executor tier.
 """
 import asyncio
 import logging
+import os
+from contextlib import contextmanager
 from datetime import date, datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
@@ -19,6 +28,19 @@ import time
 
 logger = logging.getLogger(__name__)
 
+PROJECTION_CONCURRENCY = int(os.getenv("MATCHUP_PROJECTION_CONCURRENCY", "4"))
+PROJECTION_SIMULATIONS = 10_000  # Fewer sims for batch speed
+
+
+@contextmanager
+def _stage(timings: Dict[str, float], name: str):
+    """Record the wall time of a run_matchup stage in ms."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
 
 @dataclass
 class PlayerProjection:
@@ -68,6 +90,7 @@ class MatchupResult:
     usage_vacuum_applied: List[str] = field(default_factory=list)
     execution_time_ms: float = 0.0
     game_date: str = ""
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)
 
 
 # Team archetype definitions
@@ -129,10 +152,28 @@ class MatchupOrchestrator:
     4. Team-level archetype aggregation
     """
     
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        projector=None,
+        max_concurrency: int = PROJECTION_CONCURRENCY
+    ):
         if db_path is None:
             db_path = Path(__file__).parent.parent / 'data' / 'nba_data.db'
         self.db_path = str(db_path)
+        self.max_concurrency = max(1, max_concurrency)
+        self._projector = projector
+    
+    @property
+    def projector(self):
+        """Shared AegisOrchestrator (one SimulationCache across requests)."""
+        if self._projector is None:
+            from aegis.orchestrator import AegisOrchestrator, OrchestratorConfig
+            self._projector = AegisOrchestrator(OrchestratorConfig(
+                n_simulations=PROJECTION_SIMULATIONS,
+                cache_enabled=True
+            ))
+        return self._projector
     
     async def run_matchup(
         self,
@@ -150,6 +191,7 @@ class MatchupOrchestrator:
         4. Aggregate team-level profiles
         """
         start_time = time.time()
+        timings: Dict[str, float] = {}
         
         if game_date is None:
             game_date = date.today()
@@ -157,17 +199,17 @@ class MatchupOrchestrator:
         # Import services
         from services.roster_validator import get_roster_validator
         from services.archetype_engine import ArchetypeEngine
-        from engines.usage_vacuum import get_usage_vacuum
+        from services.executor_tier import run_io
         
         validator = get_roster_validator()
         archetype_engine = ArchetypeEngine(db_path=self.db_path)
-        vacuum = get_usage_vacuum()
         
         # Step 1: Validate both rosters
         logger.info(f"🔍 Validating rosters for {home_team_id} vs {away_team_id}")
-        home_validation, away_validation = validator.validate_both_teams(
-            home_team_id, away_team_id
-        )
+        with _stage(timings, 'validate'):
+            home_validation, away_validation = validator.validate_both_teams(
+                home_team_id, away_team_id
+            )
         
         # Step 2: Collect all players for batch processing
         all_home_players = (
@@ -184,36 +226,63 @@ class MatchupOrchestrator:
         home_boosts = {}
         away_boosts = {}
         
-        if home_validation.vacuum_triggered:
-            home_boosts = validator.get_vacuum_redistribution(home_team_id)
-            vacuum_applied.extend(home_validation.vacuum_targets)
-            logger.info(f"   ⚡ Usage vacuum applied for {len(home_validation.vacuum_targets)} home players")
-        
-        if away_validation.vacuum_triggered:
-            away_boosts = validator.get_vacuum_redistribution(away_team_id)
-            vacuum_applied.extend(away_validation.vacuum_targets)
-            logger.info(f"   ⚡ Usage vacuum applied for {len(away_validation.vacuum_targets)} away players")
-        
-        # Step 4: Batch archetype refresh and projections
-        home_projections = await self._process_team_players(
-            all_home_players, 
-            home_team_id,
-            home_validation.health_lights,
-            home_boosts,
-            away_team_id,  # opponent
-            archetype_engine,
-            game_date
-        )
+        with _stage(timings, 'vacuum'):
+            if home_validation.vacuum_triggered:
+                home_boosts = validator.get_vacuum_redistribution(home_team_id)
+                vacuum_applied.extend(home_validation.vacuum_targets)
+                logger.info(f"   ⚡ Usage vacuum applied for {len(home_validation.vacuum_targets)} home players")
+            
+            if away_validation.vacuum_triggered:
+                away_boosts = validator.get_vacuum_redistribution(away_team_id)
+                vacuum_applied.extend(away_validation.vacuum_targets)
+                logger.info(f"   ⚡ Usage vacuum applied for {len(away_validation.vacuum_targets)} away players")
+        
+        # Step 4a: One bulk archetype refresh for both rosters
+        player_ids = [str(p['player_id']) for p in all_home_players + all_away_players]
+        with _stage(timings, 'archetypes'):
+            archetypes = await run_io(
+                archetype_engine.classify_players, player_ids, route="matchup_archetypes"
+            )
         
-        away_projections = await self._process_team_players(
-            all_away_players,
-            away_team_id,
-            away_validation.health_lights,
-            away_boosts,
-            home_team_id,  # opponent
-            archetype_engine,
-            game_date
-        )
+        # Step 4b: Opponent context once per team, then every projection concurrently
+        with _stage(timings, 'opponent_context'):
+            away_defense, home_defense = await asyncio.gather(
+                self._get_opponent_context(away_team_id),
+                self._get_opponent_context(home_team_id),
+            )
+        
+        with _stage(timings, 'projections'):
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            jobs = [(str(p['player_id']), away_team_id, away_defense) for p in all_home_players] + \
+                   [(str(p['player_id']), home_team_id, home_defense) for p in all_away_players]
+            base = await asyncio.gather(*(
+                self._get_player_projection(pid, opp, game_date, context, semaphore)
+                for pid, opp, context in jobs
+            ))
+            base_projections = dict(zip(((pid, opp) for pid, opp, _ in jobs), base))
+        
+        with _stage(timings, 'assemble'):
+            home_projections = self._process_team_players(
+                all_home_players, 
+                home_team_id,
+                home_validation.health_lights,
+                home_boosts,
+                away_team_id,  # opponent
+                archetype_engine,
+                archetypes,
+                base_projections
+            )
+            
+            away_projections = self._process_team_players(
+                all_away_players,
+                away_team_id,
+                away_validation.health_lights,
+                away_boosts,
+                home_team_id,  # opponent
+                archetype_engine,
+                archetypes,
+                base_projections
+            )
         
         # Step 5: Aggregate team archetypes
         home_offensive = self._aggregate_team_archetype(home_projections, 'offensive')
@@ -247,7 +316,8 @@ class MatchupOrchestrator:
         
         execution_time = (time.time() - start_time) * 1000
         
-        logger.info(f"✅ Matchup analysis complete in {execution_time:.0f}ms")
+        logger.info(f"✅ Matchup analysis complete in {execution_time:.0f}ms "
+                    f"({len(jobs)} players, stages: {timings})")
         
         return MatchupResult(
             home_team=home_analysis,
@@ -256,10 +326,11 @@ class MatchupOrchestrator:
             edge_reason=edge_reason,
             usage_vacuum_applied=vacuum_applied,
             execution_time_ms=execution_time,
-            game_date=game_date.isoformat()
+            game_date=game_date.isoformat(),
+            stage_timings_ms=timings
         )
     
-    async def _process_team_players(
+    def _process_team_players(
         self,
         players: List[Dict],
         team_id: str,
@@ -267,22 +338,19 @@ class MatchupOrchestrator:
         usage_boosts: Dict[str, float],
         opponent_id: str,
         archetype_engine,
-        game_date: date
+        archetypes: Dict[str, Dict],
+        base_projections: Dict[Tuple[str, str], Dict[str, float]]
     ) -> List[PlayerProjection]:
-        """Process all players for a team, generating projections."""
+        """Build a team's PlayerProjections from the batch archetypes and base projections."""
         projections = []
         
         for player in players:
             player_id = str(player['player_id'])
             
-            # Get/refresh archetype
-            archetype_data = archetype_engine.classify_player(player_id)
+            archetype_data = archetypes.get(player_id)
             archetype = archetype_data.get('primary', 'unknown') if archetype_data else 'unknown'
             
-            # Get base projection (simplified - in production, call Crucible)
-            base_projection = await self._get_player_projection(
-                player_id, opponent_id, game_date
-            )
+            base_projection = base_projections[(player_id, opponent_id)]
             
             # Apply usage boost if applicable
             usage_boost = usage_boosts.get(player_id, 0.0)
@@ -328,27 +396,33 @@ class MatchupOrchestrator:
         
         return projections
     
+    async def _get_opponent_context(self, opponent_id: str) -> Optional[Dict]:
+        """Opponent defense for the whole roster; None lets each projection fetch its own."""
+        try:
+            return await self.projector.get_opponent_context(opponent_id)
+        except Exception as e:
+            logger.warning(f"Opponent context unavailable for {opponent_id}: {e}")
+            return None
+    
     async def _get_player_projection(
         self, 
         player_id: str, 
         opponent_id: str,
-        game_date: date
+        game_date: date,
+        team_defense: Optional[Dict] = None,
+        semaphore: Optional[asyncio.Semaphore] = None
     ) -> Dict[str, float]:
         """Get base projection for a player (simplified version)."""
         try:
-            from aegis.orchestrator import AegisOrchestrator, OrchestratorConfig
-            
-            config = OrchestratorConfig(
-                n_simulations=10_000,  # Fewer sims for batch speed
-                cache_enabled=True
-            )
-            orchestrator = AegisOrchestrator(config)
-            
-            result = await orchestrator.run_simulation(
-                player_id=player_id,
-                opponent_id=opponent_id,
-                game_date=game_date
-            )
+            # Runs on the request loop so the router's background syncs outlive
+            # the call; the orchestrator offloads its Monte Carlo and CSV work.
+            async with semaphore or asyncio.Semaphore(1):
+                result = await self.projector.run_simulation(
+                    player_id=player_id,
+                    opponent_id=opponent_id,
+                    game_date=game_date,
+                    team_defense=team_defense
+                )
             
             return {
                 'points': result.expected_value.get('points', 15.0),
@@ -84,7 +84,14 @@ class NextDayAudit:
         # Fetch actual results
         actuals = await self._fetch_actuals(audit_date)
         
-        # Compare and update
+        # Update ledger with actuals - whole slate in one pass
+        matched = {
+            proj['player_id']: actuals[proj['player_id']]
+            for proj in projections if proj['player_id'] in actuals
+        }
+        self.ledger.update_actuals_batch(audit_date, matched)
+        
+        # Compare
         audit_results = []
         
         for proj in projections:
@@ -95,9 +102,6 @@ class NextDayAudit:
             
             actual = actuals[player_id]
             
-            # Update ledger with actuals
-            self.ledger.update_actuals(player_id, audit_date, actual)
-            
             # Record result
             pts_ev = proj.get('pts_ev', 0)
             pts_actual = actual.get('points', 0)
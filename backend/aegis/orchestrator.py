@@ -34,10 +34,15 @@ from aegis.simulation_cache import SimulationCache
 
 # Services
 from services.truth_serum_filter import GarbageTimeFilter
+from services.executor_tier import run_cpu, run_io
 
 logger = logging.getLogger(__name__)
 
 
+async def _resolved(value):
+    return value
+
+
 @dataclass
 class OrchestratorConfig:
     """Configuration for the orchestrator"""
@@ -45,6 +50,7 @@ class OrchestratorConfig:
     cache_enabled: bool = True
     cache_ttl: int = 3600
     data_dir: Optional[Path] = None
+    ledger_path: Optional[Path] = None
 
 
 @dataclass
@@ -110,7 +116,7 @@ class AegisOrchestrator:
         self.healer = HealerProtocol(data_dir)
         
         # Feedback layer
-        self.ledger = LearningLedger()
+        self.ledger = LearningLedger(self.config.ledger_path)
         self.scorer = ConfluenceScorer(learning_ledger=self.ledger)
         self.garbage_filter = GarbageTimeFilter()
         
@@ -129,7 +135,8 @@ class AegisOrchestrator:
         game_date: Optional[date] = None,
         lines: Optional[Dict[str, float]] = None,
         injuries: Optional[List[Dict]] = None,
-        force_fresh: bool = False
+        force_fresh: bool = False,
+        team_defense: Optional[Dict] = None
     ) -> FullSimulationResult:
         """
         Run complete simulation pipeline.
@@ -152,6 +159,8 @@ class AegisOrchestrator:
             lines: Optional stat lines for hit probability
             injuries: Optional list of injured teammates
             force_fresh: Skip cache
+            team_defense: Pre-fetched opponent context (get_opponent_context),
+                shared by batch callers so each roster skips the lookup
             
         Returns:
             FullSimulationResult with projections and metadata
@@ -169,7 +178,7 @@ class AegisOrchestrator:
                 return cached
         
         # Step 2: Parallel data fetch
-        data = await self._parallel_fetch(player_id, opponent_id, game_date)
+        data = await self._parallel_fetch(player_id, opponent_id, game_date, team_defense)
         
         # Step 3: Truth-Serum filter
         game_logs = data.get('game_logs', [])
@@ -202,36 +211,26 @@ class AegisOrchestrator:
         
         # NEW: Calculate volatility factor (coefficient of variation)
         # High CV = volatile player = wider confidence bands
-        volatility_factor = 1.0
-        if game_logs and len(game_logs) >= 5:
-            pts_values = [g.get('pts') or g.get('points') or 0 for g in game_logs[:15]]
-            if pts_values:
-                pts_mean = sum(pts_values) / len(pts_values)
-                if pts_mean > 0:
-                    pts_std = (sum((x - pts_mean) ** 2 for x in pts_values) / len(pts_values)) ** 0.5
-                    cv = pts_std / pts_mean
-                    # Scale CV to volatility factor (0.8 to 1.4 range)
-                    # CV of 0.2 = consistent (vol=0.8), CV of 0.5 = volatile (vol=1.4)
-                    volatility_factor = 0.8 + (cv * 1.2)
-                    volatility_factor = max(0.7, min(1.5, volatility_factor))
-                    logger.info(f"[ORCHESTRATOR] Volatility: CV={cv:.2f}, factor={volatility_factor:.2f}")
+        volatility_factor = VertexMonteCarloEngine.volatility_from_points(
+            [g.get('pts') or g.get('points') or 0 for g in game_logs[:15]]
+        )
+        if volatility_factor != 1.0:
+            logger.info(f"[ORCHESTRATOR] Volatility factor={volatility_factor:.2f}")
         
         # NEW: Calculate minutes modifier
         # If player expected to play fewer/more minutes, scale projection
-        minutes_modifier = 1.0
+        # (32 = baseline minutes for starters)
         minutes_ema = ema_stats.get('minutes_ema', 0)
+        minutes_modifier = VertexMonteCarloEngine.minutes_modifier(minutes_ema)
         if minutes_ema > 0:
-            # Use 32 as baseline minutes for starters
-            baseline_minutes = 32.0
-            minutes_modifier = minutes_ema / baseline_minutes
-            # Clamp to reasonable range (0.5 to 1.3)
-            minutes_modifier = max(0.5, min(1.3, minutes_modifier))
             logger.info(f"[ORCHESTRATOR] Minutes: EMA={minutes_ema:.1f}, modifier={minutes_modifier:.2f}")
         
         # Step 6: Monte Carlo simulation
         pace_factor = data.get('pace_factor', 1.0)
         
-        sim_result = self.monte_carlo.run_simulation(
+        sim_result = await run_cpu(
+            self.monte_carlo.run_simulation,
+            route="monte_carlo",
             ema_stats=ema_stats,
             pace_factor=pace_factor,
             friction=friction,
@@ -340,7 +339,8 @@ class AegisOrchestrator:
         self,
         player_id: str,
         opponent_id: str,
-        game_date: date
+        game_date: date,
+        team_defense: Optional[Dict] = None
     ) -> Dict[str, Any]:
         """
         Parallel data fetching using asyncio.gather.
@@ -348,7 +348,7 @@ class AegisOrchestrator:
         """
         results = await asyncio.gather(
             self._fetch_player_data(player_id),
-            self._fetch_team_defense(opponent_id),
+            self._fetch_team_defense(opponent_id) if team_defense is None else _resolved(team_defense),
             self._fetch_schedule_context(player_id, game_date),
             self._fetch_pace_data(player_id, opponent_id),
             return_exceptions=True
@@ -379,6 +379,10 @@ class AegisOrchestrator:
             'pace_factor': pace_data.get('pace_factor', 1.0) if not isinstance(pace_data, Exception) else 1.0
         }
     
+    async def get_opponent_context(self, opponent_id: str) -> Dict:
+        """Opponent defensive context, fetched once and passed to run_simulation(team_defense=...)"""
+        return await self._fetch_team_defense(opponent_id)
+    
     async def _fetch_player_data(self, player_id: str) -> Dict:
         """Fetch player game logs and stats"""
         result = await self.router.route_request(player_id)
@@ -411,6 +415,10 @@ class AegisOrchestrator:
     
     async def _fetch_schedule_context(self, player_id: str, game_date: date) -> Dict:
         """Fetch schedule context for fatigue calculation - DYNAMICALLY calculated"""
+        return await run_io(self._schedule_context_sync, player_id, game_date, route="schedule_context")
+    
+    def _schedule_context_sync(self, player_id: str, game_date: date) -> Dict:
+        """Scan game_logs.csv for the player's recent dates (blocking, runs on the IO pool)"""
         try:
             import csv
             from datetime import datetime
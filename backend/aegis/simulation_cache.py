@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 import hashlib
 import logging
+import threading
 
 try:
     from cachetools import TTLCache
@@ -39,6 +40,8 @@ class SimulationCache:
     - 1-hour TTL for data freshness
     - 1000 entry max to limit memory
     - Cache key includes all simulation parameters
+    - Thread-safe: batch callers (MatchupOrchestrator) share one instance
+      across executor threads
     """
     
     DEFAULT_TTL = 3600  # 1 hour
@@ -58,6 +61,8 @@ class SimulationCache:
             # Simple dict fallback
             self._cache: Dict[str, CacheEntry] = {}
         
+        self._lock = threading.Lock()
+        
         # Metrics
         self._metrics = {
             'hits': 0,
@@ -78,7 +83,10 @@ class SimulationCache:
             Cached result if fresh, None if expired/missing
         """
         key = self._make_key(player_id, opponent_id, **kwargs)
-        
+        with self._lock:
+            return self._get(key, player_id)
+    
+    def _get(self, key: str, player_id: str) -> Optional[Any]:
         if CACHETOOLS_AVAILABLE:
             result = self._cache.get(key)
             if result:
@@ -111,7 +119,12 @@ class SimulationCache:
         Cache a simulation result.
         """
         key = self._make_key(player_id, opponent_id, **kwargs)
+        with self._lock:
+            self._set(key, result)
         
+        logger.debug(f"[CACHE] Stored result for {player_id}")
+    
+    def _set(self, key: str, result: Any):
         if CACHETOOLS_AVAILABLE:
             self._cache[key] = result
         else:
@@ -127,8 +140,6 @@ class SimulationCache:
                 result=result,
                 created_at=datetime.now()
             )
-        
-        logger.debug(f"[CACHE] Stored result for {player_id}")
     
     def _make_key(
         self,
@@ -23,6 +23,7 @@ from firestore_db import (
     batch_write_players,
     batch_write_collection
 )
+from services.player_directory import invalidate_player_directory
 
 logger = logging.getLogger(__name__)
 router = APIRouter(
@@ -123,6 +124,7 @@ async def bulk_seed_players(players: List[Dict]):
 
     try:
         result = batch_write_players(players)
+        invalidate_player_directory()
         logger.info(f"[BULK-SEED] Seeded {len(players)} players")
         return {
             "status": "success",
@@ -160,6 +162,8 @@ async def purge_cache():
         except ImportError:
             logger.warning("[PURGE] Rate limiter not available")
 
+        invalidate_player_directory()
+
         return {
             "success": True,
             "message": "In-memory caches purged",
@@ -278,6 +282,7 @@ async def seed_sample_data(
         
         batch_write_teams([sample_team])
         batch_write_players([sample_player])
+        invalidate_player_directory()
         
         return {
             "status": "success",
@@ -320,6 +325,9 @@ async def clear_collection(collection_name: str):
             batch.commit()
             docs = coll_ref.limit(batch_size).stream()
 
+        if collection_name == "players":
+            invalidate_player_directory()
+
         logger.info(f"[ADMIN] Cleared {deleted} docs from {collection_name}")
         return {
             "status": "success",
@@ -10,9 +10,12 @@ This cloud version calls the NBA API directly and caches in Firestore.
 """
 from fastapi import APIRouter, HTTPException, Query
 from datetime import datetime, timedelta
+from typing import Optional
 import logging
 import time
 
+from services.executor_tier import run_io, ExecutorSaturated
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["data"])
@@ -74,42 +77,9 @@ async def get_player_hustle(player_id: str):
 
     # 2) Try NBA API (best-effort — times out from Cloud Run frequently)
     try:
-        from nba_api.stats.endpoints import leaguehustlestatsplayer
-        time.sleep(0.6)  # rate limit
-        hustle = leaguehustlestatsplayer.LeagueHustleStatsPlayer(
-            season=CURRENT_SEASON,
-            season_type_all_star="Regular Season",
-            per_mode_time="PerGame",
-            timeout=8,  # Reduced from 15 to fail faster
-        )
-        df = hustle.get_data_frames()[0]
-
-        player_row = df[df["PLAYER_ID"].astype(str) == str(player_id)]
-        if player_row.empty:
-            return {
-                "player_id": player_id,
-                "data_available": False,
-                "message": f"No hustle stats found for player {player_id}",
-            }
-
-        row = player_row.iloc[0]
-        result = {
-            "player_id": str(row["PLAYER_ID"]),
-            "player_name": row.get("PLAYER_NAME", ""),
-            "team": row.get("TEAM_ABBREVIATION", ""),
-            "contested_shots": float(row.get("CONTESTED_SHOTS", 0)),
-            "contested_shots_2pt": float(row.get("CONTESTED_SHOTS_2PT", 0)),
-            "contested_shots_3pt": float(row.get("CONTESTED_SHOTS_3PT", 0)),
-            "deflections": float(row.get("DEFLECTIONS", 0)),
-            "charges_drawn": float(row.get("CHARGES_DRAWN", 0)),
-            "screen_assists": float(row.get("SCREEN_ASSISTS", 0)),
-            "loose_balls_recovered": float(row.get("LOOSE_BALLS_RECOVERED", 0)),
-            "off_boxouts": float(row.get("OFF_BOXOUTS", 0)),
-            "def_boxouts": float(row.get("DEF_BOXOUTS", 0)),
-            "data_available": True,
-            "source": "nba_api",
-        }
-        _firestore_cache_set("player_hustle", player_id, result)
+        result = await run_io(_fetch_hustle_sync, player_id, route="player_hustle")
+        if result.get("data_available"):
+            _firestore_cache_set("player_hustle", player_id, result)
         return result
 
     except Exception as e:
@@ -123,6 +93,45 @@ async def get_player_hustle(player_id: str):
         }
 
 
+def _fetch_hustle_sync(player_id: str) -> dict:
+    """Blocking NBA API hustle fetch — runs on the I/O executor pool."""
+    from nba_api.stats.endpoints import leaguehustlestatsplayer
+    time.sleep(0.6)  # rate limit
+    hustle = leaguehustlestatsplayer.LeagueHustleStatsPlayer(
+        season=CURRENT_SEASON,
+        season_type_all_star="Regular Season",
+        per_mode_time="PerGame",
+        timeout=8,  # Reduced from 15 to fail faster
+    )
+    df = hustle.get_data_frames()[0]
+
+    player_row = df[df["PLAYER_ID"].astype(str) == str(player_id)]
+    if player_row.empty:
+        return {
+            "player_id": player_id,
+            "data_available": False,
+            "message": f"No hustle stats found for player {player_id}",
+        }
+
+    row = player_row.iloc[0]
+    return {
+        "player_id": str(row["PLAYER_ID"]),
+        "player_name": row.get("PLAYER_NAME", ""),
+        "team": row.get("TEAM_ABBREVIATION", ""),
+        "contested_shots": float(row.get("CONTESTED_SHOTS", 0)),
+        "contested_shots_2pt": float(row.get("CONTESTED_SHOTS_2PT", 0)),
+        "contested_shots_3pt": float(row.get("CONTESTED_SHOTS_3PT", 0)),
+        "deflections": float(row.get("DEFLECTIONS", 0)),
+        "charges_drawn": float(row.get("CHARGES_DRAWN", 0)),
+        "screen_assists": float(row.get("SCREEN_ASSISTS", 0)),
+        "loose_balls_recovered": float(row.get("LOOSE_BALLS_RECOVERED", 0)),
+        "off_boxouts": float(row.get("OFF_BOXOUTS", 0)),
+        "def_boxouts": float(row.get("DEF_BOXOUTS", 0)),
+        "data_available": True,
+        "source": "nba_api",
+    }
+
+
 
 # ─── Box Scores (alternate path) ────────────────────────────────────────────
 
@@ -161,37 +170,7 @@ async def get_player_play_types(player_id: str):
 
     # 2) Fetch from NBA API
     try:
-        from nba_api.stats.endpoints import synergyplaytypes
-        time.sleep(0.6)  # rate limit
-
-        play_types = []
-        for play_type in ["Isolation", "Transition", "PRBallHandler", "PRRollman",
-                          "Postup", "Spotup", "Handoff", "Cut", "OffScreen"]:
-            try:
-                synergy = synergyplaytypes.SynergyPlayTypes(
-                    season=CURRENT_SEASON,
-                    play_type_nullable=play_type,
-                    player_or_team_abbreviation="P",
-                    type_grouping_nullable="offensive",
-                    per_mode_simple="PerGame",
-                    timeout=15,
-                )
-                df = synergy.get_data_frames()[0]
-                player_row = df[df["PLAYER_ID"].astype(str) == str(player_id)]
-                if not player_row.empty:
-                    row = player_row.iloc[0]
-                    play_types.append({
-                        "play_type": play_type,
-                        "frequency": float(row.get("POSS_PCT", 0)),
-                        "ppp": float(row.get("PPP", 0)),
-                        "percentile": float(row.get("PERCENTILE", 0)),
-                        "gp": int(row.get("GP", 0)),
-                        "possessions": float(row.get("POSS", 0)),
-                    })
-                time.sleep(0.6)  # rate limit between calls
-            except Exception as e:
-                logger.warning(f"[PLAY-TYPES] {play_type} fetch failed for {player_id}: {e}")
-                continue
+        play_types = await run_io(_fetch_play_types_sync, player_id, route="player_play_types")
 
         result = {
             "player_id": player_id,
@@ -209,6 +188,10 @@ async def get_player_play_types(player_id: str):
     except ImportError:
         logger.error("[PLAY-TYPES] nba_api not installed")
         raise HTTPException(status_code=503, detail="NBA API dependency not available")
+    except ExecutorSaturated as e:
+        logger.warning(f"[PLAY-TYPES] Shed request for {player_id}: {e}")
+        raise HTTPException(status_code=503, detail="Play-type fetch busy, retry shortly",
+                            headers={"Retry-After": "5"})
     except Exception as e:
         logger.error(f"[PLAY-TYPES] NBA API fetch failed for {player_id}: {e}")
         raise HTTPException(
@@ -217,6 +200,42 @@ async def get_player_play_types(player_id: str):
         )
 
 
+def _fetch_play_types_sync(player_id: str) -> list:
+    """Blocking SynergyPlayTypes sweep — runs on the I/O executor pool."""
+    from nba_api.stats.endpoints import synergyplaytypes
+    time.sleep(0.6)  # rate limit
+
+    play_types = []
+    for play_type in ["Isolation", "Transition", "PRBallHandler", "PRRollman",
+                      "Postup", "Spotup", "Handoff", "Cut", "OffScreen"]:
+        try:
+            synergy = synergyplaytypes.SynergyPlayTypes(
+                season=CURRENT_SEASON,
+                play_type_nullable=play_type,
+                player_or_team_abbreviation="P",
+                type_grouping_nullable="offensive",
+                per_mode_simple="PerGame",
+                timeout=15,
+            )
+            df = synergy.get_data_frames()[0]
+            player_row = df[df["PLAYER_ID"].astype(str) == str(player_id)]
+            if not player_row.empty:
+                row = player_row.iloc[0]
+                play_types.append({
+                    "play_type": play_type,
+                    "frequency": float(row.get("POSS_PCT", 0)),
+                    "ppp": float(row.get("PPP", 0)),
+                    "percentile": float(row.get("PERCENTILE", 0)),
+                    "gp": int(row.get("GP", 0)),
+                    "possessions": float(row.get("POSS", 0)),
+                })
+            time.sleep(0.6)  # rate limit between calls
+        except Exception as e:
+            logger.warning(f"[PLAY-TYPES] {play_type} fetch failed for {player_id}: {e}")
+            continue
+    return play_types
+
+
 # ─── /api/today — Schedule shortcut ─────────────────────────────────────────
 
 @router.get("/api/today")
@@ -556,28 +575,208 @@ async def get_player_game_logs(player_id: str):
 # ─── Player Shot Chart (ESPN Firestore) ──────────────────────────────────────
 
 
+_NBA_STATS_HEADERS = {
+    "Host": "stats.nba.com",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.nba.com/",
+    "x-nba-stats-origin": "stats",
+    "x-nba-stats-token": "true",
+    "Origin": "https://www.nba.com",
+    "Connection": "keep-alive",
+}
+
+
+_SHOT_COLUMNS = [
+    "GAME_ID", "GAME_DATE", "HTM", "VTM", "PLAYER_NAME", "ACTION_TYPE",
+    "SHOT_DISTANCE", "SHOT_ZONE_BASIC", "SHOT_MADE_FLAG", "PERIOD",
+    "MINUTES_REMAINING", "SECONDS_REMAINING", "LOC_X", "LOC_Y", "SHOT_TYPE",
+]
+
+
+def _stream_firestore_shots_sync(player_id: str, limit: Optional[int] = 2000) -> list:
+    """Blocking Firestore stream of player_shots — runs on the I/O executor pool."""
+    from firestore_db import get_firestore_db
+    from services.firestore_collections import PLAYER_SHOTS, PLAYER_SHOTS_SUB
+
+    db = get_firestore_db()
+    col = (
+        db.collection(PLAYER_SHOTS)
+        .document(str(player_id))
+        .collection(PLAYER_SHOTS_SUB)
+    )
+    if limit:
+        col = col.limit(limit)
+    return [doc.to_dict() for doc in col.stream()]
+
+
+def _fetch_nba_shots_sync(player_id: str) -> list:
+    """
+    Blocking ShotChartDetail fetch — runs on the I/O executor pool.
+
+    Columns are cast once and zipped, rather than walking df.iterrows(),
+    which boxes every row into a Series.
+    """
+    from nba_api.stats.endpoints import shotchartdetail
+    time.sleep(0.8)
+    chart = shotchartdetail.ShotChartDetail(
+        player_id=int(player_id),
+        team_id=0,
+        season_nullable=CURRENT_SEASON,
+        season_type_all_star="Regular Season",
+        context_measure_simple="FGA",
+        timeout=25,
+        headers=_NBA_STATS_HEADERS,
+    )
+    df = chart.get_data_frames()[0]
+    if df.empty:
+        return []
+
+    df = df.reindex(columns=_SHOT_COLUMNS)
+    ints = df[["SHOT_DISTANCE", "PERIOD", "LOC_X", "LOC_Y"]].fillna(0).astype(int)
+    text = df[["GAME_ID", "GAME_DATE", "PLAYER_NAME", "ACTION_TYPE", "SHOT_ZONE_BASIC"]].fillna("").astype(str)
+    matchup = df["HTM"].astype(str) + " vs " + df["VTM"].astype(str)
+    clock = df["MINUTES_REMAINING"].astype(str) + ":" + df["SECONDS_REMAINING"].astype(str)
+    made = df["SHOT_MADE_FLAG"] == 1
+    is_three = df["SHOT_TYPE"] == "3PT Field Goal"
+
+    return [
+        {
+            "sequenceNumber": 0,
+            "gameId": game_id,
+            "gameDate": game_date,
+            "matchup": mu,
+            "playerId": player_id,
+            "playerName": name,
+            "teamTricode": "",
+            "shotType": action,
+            "distance": dist,
+            "shotArea": zone,
+            "made": hit,
+            "period": period,
+            "clock": clk,
+            "x": x,
+            "y": y,
+            "pointsValue": 3 if three else 2,
+        }
+        for game_id, game_date, name, action, zone, mu, clk, hit, three, dist, period, x, y in zip(
+            text["GAME_ID"].tolist(), text["GAME_DATE"].tolist(), text["PLAYER_NAME"].tolist(),
+            text["ACTION_TYPE"].tolist(), text["SHOT_ZONE_BASIC"].tolist(),
+            matchup.tolist(), clock.tolist(), made.tolist(), is_three.tolist(),
+            ints["SHOT_DISTANCE"].tolist(), ints["PERIOD"].tolist(),
+            ints["LOC_X"].tolist(), ints["LOC_Y"].tolist(),
+        )
+    ]
+
+
+def _stream_player_game_shots_sync(player_id: str, game_id: str) -> list:
+    """One game's shots for a player (a few dozen docs) — runs on the I/O pool."""
+    from firestore_db import get_firestore_db
+    from services.firestore_collections import PLAYER_SHOTS, PLAYER_SHOTS_SUB
+
+    db = get_firestore_db()
+    col = (
+        db.collection(PLAYER_SHOTS)
+        .document(str(player_id))
+        .collection(PLAYER_SHOTS_SUB)
+        .where("gameId", "==", str(game_id))
+    )
+    return [doc.to_dict() for doc in col.stream()]
+
+
+def _load_shot_summary_sync(player_id: str):
+    """
+    Resolve a player's binned summary with as few reads as possible.
+
+    1. player_shot_summaries/{id}           — one document read
+    2. Backfill from raw player_shots        — once per schema version, then persisted
+       (also when live increments created the doc before any backfill ran)
+    3. NBA API ShotChartDetail               — binned and cached 24h
+    """
+    from firestore_db import get_firestore_db
+    from services.shot_aggregator import (
+        get_player_summary, needs_rebuild, rebuild_player_summary, summarize_shots,
+    )
+
+    db = get_firestore_db()
+    summary = get_player_summary(db, player_id)
+    if not needs_rebuild(summary):
+        return summary, "firestore"
+
+    rebuilt = rebuild_player_summary(
+        db, player_id, lambda: _stream_firestore_shots_sync(player_id, limit=None)
+    )
+    if rebuilt:
+        return rebuilt, "firestore_backfill"
+    if summary:
+        return summary, "firestore"
+
+    cached = _firestore_cache_get("player_shot_bins_nba", player_id)
+    if cached:
+        cached.pop("_cached_at", None)
+        return cached, "nba_api_cache"
+
+    nba_shots = _fetch_nba_shots_sync(player_id)
+    if nba_shots:
+        summary = summarize_shots(nba_shots, player_id)
+        _firestore_cache_set("player_shot_bins_nba", player_id, dict(summary))
+        return summary, "nba_api"
+    return None, "none"
+
+
 @router.get("/player-shots/{player_id}")
-async def get_player_shot_chart(player_id: str):
+async def get_player_shot_chart(
+    player_id: str,
+    view: str = Query("bins", pattern="^(bins|raw)$", description="bins (default) or raw shot docs"),
+    season: Optional[str] = Query(None, description="Season filter for bins, e.g. 2025-26"),
+    game_id: Optional[str] = Query(None, description="Bin a single game's shots"),
+):
     """
     Shot chart data for a player.
-    Tries Firestore player_shots first, then falls back to NBA API ShotChartDetail.
+
+    Default view returns pre-aggregated zones + hexbins from
+    player_shot_summaries (maintained incrementally by the PBP ingest),
+    so a chart costs one Firestore read instead of up to 2000.
+    view=raw preserves the legacy payload: Firestore player_shots first,
+    then NBA API ShotChartDetail. All sources are blocking and run on the
+    I/O executor pool.
     """
+    from services.shot_aggregator import summarize_shots, to_payload
+
+    if view == "bins":
+        try:
+            if game_id:
+                shots = await run_io(_stream_player_game_shots_sync, player_id, game_id, route="shot_chart")
+                summary, source = summarize_shots(shots, player_id), "firestore_game"
+            else:
+                summary, source = await run_io(_load_shot_summary_sync, player_id, route="shot_chart")
+
+            if not summary:
+                return {"status": "success", "playerId": player_id, "view": "bins", "count": 0,
+                        "summary": None, "source": source}
+
+            payload = to_payload(summary, season=season)
+            return {
+                "status": "success",
+                "playerId": player_id,
+                "view": "bins",
+                "season": season,
+                "gameId": game_id,
+                "count": payload["attempts"],
+                "summary": payload,
+                "source": source,
+            }
+        except Exception as e:
+            logger.error(f"[SHOT-CHART] Binned summary failed for {player_id}: {e}")
+            return {"status": "success", "playerId": player_id, "view": "bins", "count": 0,
+                    "summary": None, "source": "error"}
+
     try:
         # Source 1: Firestore player_shots (from live game tracking)
-        from firestore_db import get_firestore_db
-        db = get_firestore_db()
-        from services.firestore_collections import PLAYER_SHOTS, PLAYER_SHOTS_SUB
-
         shots = []
         try:
-            col = (
-                db.collection(PLAYER_SHOTS)
-                .document(str(player_id))
-                .collection(PLAYER_SHOTS_SUB)
-                .limit(2000)
-            )
-            for doc in col.stream():
-                shots.append(doc.to_dict())
+            shots = await run_io(_stream_firestore_shots_sync, player_id, route="shot_chart")
         except Exception:
             pass
 
@@ -586,49 +785,7 @@ async def get_player_shot_chart(player_id: str):
 
         # Source 2: NBA API ShotChartDetail (historical data)
         try:
-            from nba_api.stats.endpoints import shotchartdetail
-            time.sleep(0.8)
-            _nba_headers = {
-                "Host": "stats.nba.com",
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "application/json, text/plain, */*",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Referer": "https://www.nba.com/",
-                "x-nba-stats-origin": "stats",
-                "x-nba-stats-token": "true",
-                "Origin": "https://www.nba.com",
-                "Connection": "keep-alive",
-            }
-            chart = shotchartdetail.ShotChartDetail(
-                player_id=int(player_id),
-                team_id=0,
-                season_nullable=CURRENT_SEASON,
-                season_type_all_star="Regular Season",
-                context_measure_simple="FGA",
-                timeout=25,
-                headers=_nba_headers,
-            )
-            df = chart.get_data_frames()[0]
-            for _, row in df.iterrows():
-                shots.append({
-                    "sequenceNumber": 0,
-                    "gameId": str(row.get("GAME_ID", "")),
-                    "gameDate": str(row.get("GAME_DATE", "")),
-                    "matchup": str(row.get("HTM", "")) + " vs " + str(row.get("VTM", "")),
-                    "playerId": player_id,
-                    "playerName": str(row.get("PLAYER_NAME", "")),
-                    "teamTricode": "",
-                    "shotType": str(row.get("ACTION_TYPE", "")),
-                    "distance": int(row.get("SHOT_DISTANCE", 0) or 0),
-                    "shotArea": str(row.get("SHOT_ZONE_BASIC", "")),
-                    "made": row.get("SHOT_MADE_FLAG", 0) == 1,
-                    "period": int(row.get("PERIOD", 0) or 0),
-                    "clock": str(row.get("MINUTES_REMAINING", "")) + ":" + str(row.get("SECONDS_REMAINING", "")),
-                    "x": int(row.get("LOC_X", 0) or 0),
-                    "y": int(row.get("LOC_Y", 0) or 0),
-                    "pointsValue": 3 if row.get("SHOT_TYPE", "") == "3PT Field Goal" else 2,
-                })
-
+            shots = await run_io(_fetch_nba_shots_sync, player_id, route="shot_chart")
             return {"status": "success", "playerId": player_id, "count": len(shots), "shots": shots, "source": "nba_api"}
         except Exception as e:
             logger.warning(f"[SHOT-CHART] NBA API fallback failed: {e}")
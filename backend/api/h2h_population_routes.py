@@ -16,11 +16,13 @@ logger = logging.getLogger(__name__)
 try:
     from services.h2h_fetcher import get_h2h_fetcher
     from services.h2h_firestore_adapter import get_h2h_adapter
+    from services.h2h_materializer import get_h2h_materializer
     HAS_H2H = True
 except ImportError:
     HAS_H2H = False
     get_h2h_fetcher = None
     get_h2h_adapter = None
+    get_h2h_materializer = None
 
 router = APIRouter(prefix="/api/h2h", tags=["H2H Data"])
 
@@ -104,6 +106,32 @@ async def populate_h2h(request: PopulateRequest, background_tasks: BackgroundTas
     )
 
 
+@router.post("/materialize")
+async def materialize_h2h(background_tasks: BackgroundTasks, full: bool = False):
+    """
+    Recompute H2H aggregates from locally stored game logs.
+    
+    Incremental by default (only pairs touched by logs added since the last
+    run); `full=true` rebuilds every player × opponent pair.
+    
+    Returns:
+        Status message
+    """
+    if not HAS_H2H:
+        raise HTTPException(status_code=503, detail="H2H service not available")
+    
+    def _materialize():
+        result = get_h2h_materializer().refresh(full=full)
+        logger.info(f"H2H materialization complete: {result}")
+    
+    background_tasks.add_task(_materialize)
+    
+    return {
+        "status": "queued",
+        "message": f"H2H {'full' if full else 'incremental'} materialization started",
+    }
+
+
 @router.get("/status/{player_id}/{opponent}", response_model=H2HStatusResponse)
 async def get_h2h_status(player_id: str, opponent: str):
     """
@@ -5,7 +5,7 @@ SSE and REST endpoints for the live pulse system.
 Bridges the CloudAsyncPulseProducer in-memory snapshot to frontend clients.
 
 Endpoints:
-  GET /live/stream   — SSE endpoint (EventSource) pushing LivePulseData every 1s
+  GET /live/stream   — SSE endpoint (EventSource) fed by the shared LiveBroadcastHub
   GET /live/leaders  — REST snapshot of top 10 players by PIE
   GET /live/games    — REST snapshot of current live game data
   GET /live/status   — Health check for the live pulse system
@@ -13,7 +13,7 @@ Endpoints:
 Frontend contract:
   - useLiveStats.ts connects to /live/stream via EventSource
   - Expects: { games, meta, changes } shape (LivePulseData)
-  - Auto-reconnect on disconnect
+  - Auto-reconnect on disconnect (resumes via Last-Event-ID)
   - /live/games returns same data as /live/stream but as a single REST snapshot
 
 Registration:
@@ -22,14 +22,15 @@ Registration:
 """
 
 import asyncio
-import json
 import logging
 from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Query
 from fastapi.responses import StreamingResponse, JSONResponse
 
+from services.live_broadcast_hub import encode_event, get_live_hub
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Live Pulse"])
@@ -47,77 +48,64 @@ def _get_producer():
 
 # ── SSE Stream (/live/stream) ────────────────────────────────────────────────
 
-async def _sse_event_generator():
+def _degraded_payload() -> dict:
+    return {
+        "games": [],
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "game_count": 0,
+            "live_count": 0,
+            "update_cycle": 0,
+        },
+        "changes": {},
+    }
+
+
+async def _sse_event_generator(mode: str = "full", last_event_id: Optional[str] = None):
     """
-    Generates SSE events from the producer's in-memory snapshot.
-    Yields every 1s, only when data is available.
-    Sends heartbeat comments every 15s to keep the connection alive.
+    Streams pre-encoded frames from the shared LiveBroadcastHub.
+    The producer publishes each snapshot once; this generator only wakes
+    when its queue receives a frame, and sends a heartbeat comment every
+    15s of silence to keep the connection alive.
     """
-    heartbeat_counter = 0
-    last_timestamp = None
-
-    while True:
-        try:
-            producer = _get_producer()
-
-            if producer is None:
-                # Producer not running — send a degraded status event
-                degraded = {
-                    "games": [],
-                    "meta": {
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                        "game_count": 0,
-                        "live_count": 0,
-                        "update_cycle": 0,
-                    },
-                    "changes": {},
-                }
-                yield f"data: {json.dumps(degraded)}\n\n"
-                await asyncio.sleep(5)  # slower poll when degraded
-                continue
-
-            snapshot = producer.get_latest_snapshot()
-
-            if snapshot is not None:
-                current_ts = snapshot.get("meta", {}).get("timestamp")
-
-                # Only push if data has changed since last push
-                if current_ts != last_timestamp:
-                    yield f"data: {json.dumps(snapshot)}\n\n"
-                    last_timestamp = current_ts
-                    heartbeat_counter = 0
-
-            # Heartbeat every 15s to prevent proxy/LB timeout
-            heartbeat_counter += 1
-            if heartbeat_counter >= 15:
-                yield ": heartbeat\n\n"
-                heartbeat_counter = 0
-
-            await asyncio.sleep(1)
-
-        except asyncio.CancelledError:
-            logger.info("SSE stream cancelled (client disconnect)")
-            break
-        except Exception as e:
-            logger.error(f"SSE stream error: {e}")
-            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
-            await asyncio.sleep(5)
+    hub = get_live_hub()
+    sub = hub.subscribe(mode=mode, last_event_id=last_event_id)
+    try:
+        if _get_producer() is None:
+            # Producer not running — tell the client, then wait for the hub
+            yield encode_event(None, _degraded_payload())
+
+        while True:
+            yield await sub.next_frame()
+
+    except asyncio.CancelledError:
+        logger.info("SSE stream cancelled (client disconnect)")
+    finally:
+        hub.unsubscribe(sub)
 
 
 @router.get("/live/stream")
-async def live_stats_stream():
+async def live_stats_stream(
+    mode: str = Query("full", pattern="^(full|delta)$"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """
     SSE endpoint for real-time live game stats.
-    All clients stream from shared CloudAsyncPulseProducer snapshot.
+    All clients share one LiveBroadcastHub fed by CloudAsyncPulseProducer.
+
+    mode=full  (default) — every update is a full LivePulseData snapshot
+    mode=delta           — one full keyframe, then `event: delta` patch frames
+                           (services/live_delta.py); resync on a base_seq gap
 
-    Updates pushed every 1s (checks for changes).
+    Reconnecting EventSource clients send Last-Event-ID and resume from it;
+    an id from another instance or an earlier producer run gets a full frame.
     Data includes:
     - All live games with scores and clock
     - Top 10 players by in-game PIE
     - Stat changes for gold pulse animation
     """
     return StreamingResponse(
-        _sse_event_generator(),
+        _sse_event_generator(mode, last_event_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -230,5 +218,6 @@ async def get_live_status():
         "last_update_duration_seconds": producer_status.get("last_update_duration_seconds", 0),
         "poll_interval_seconds": producer_status.get("poll_interval_seconds", 10),
         "firebase_write_errors": producer_status.get("firebase_write_errors", 0),
+        "stream_hub": get_live_hub().stats(),
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
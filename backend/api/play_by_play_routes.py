@@ -7,14 +7,16 @@ Changes from original:
   - GET /by-date/{date}   → NEW: calendar browsing from calendar/{date}/games/
   - GET /live             → unchanged
   - POST /{game_id}/start-tracking → unchanged
-  - GET /{game_id}/stream → unchanged (SSE from in-memory queue)
+  - GET /{game_id}/stream → SSE from the per-game ring buffer, resumable
+                             via Last-Event-ID (services/pbp_stream_buffer.py)
 """
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request
 from fastapi.responses import StreamingResponse
 import asyncio
 import logging
 import json
 from datetime import datetime
+from typing import Optional
 
 from services.nba_pbp_service import pbp_client
 from services.firebase_pbp_service import firebase_pbp_service, FirebasePBPService
@@ -476,6 +478,14 @@ async def get_game_plays(game_id: str, limit: int = 1500):
     tracked and stored before the schema migration ran.
     """
     try:
+        # Tracked games are served from the in-memory stream buffer when it
+        # holds the whole game — no Firestore read for late joiners.
+        buffered = pbp_polling_manager.buffered_plays(game_id)
+        if buffered is not None:
+            ordered = sorted(buffered, key=lambda p: p.get("sequenceNumber", 0))[:limit]
+            plays = FirebasePBPService._sort_plays_chronologically(ordered)
+            return {"status": "success", "count": len(plays), "plays": plays, "source": "buffer"}
+
         # v2: reads from pbp_events/, falls back to legacy automatically
         plays = FirebasePBPService.get_cached_plays_v2(game_id, limit=limit)
         return {"status": "success", "count": len(plays), "plays": plays}
@@ -616,15 +626,18 @@ async def get_player_shots(
         raise HTTPException(status_code=500, detail="Failed fetching player shot data")
 
 
-# ── Unchanged: SSE stream ─────────────────────────────────────────────────────
+# ── SSE stream (ring-buffer fan-out) ──────────────────────────────────────────
 
-async def _sse_pbp_generator(request: Request, game_id: str):
+async def _sse_pbp_generator(request: Request, game_id: str, last_event_id: Optional[int] = None):
     """
     Async SSE generator yielding new plays and 15-second heartbeats.
-    Data comes from the in-memory SSE queue — Firestore is not read here.
+    Frames are pre-encoded once per batch by the game's PBPGameChannel;
+    Firestore is not read here. A resuming client first receives one
+    compacted replay of every buffered play after `last_event_id`.
     """
     await pbp_polling_manager.start_tracking(game_id)
-    q = pbp_polling_manager.subscribe_sse(game_id)
+    channel = pbp_polling_manager.get_channel(game_id)
+    sub = pbp_polling_manager.subscribe_sse(game_id, last_event_id)
     try:
         yield f"data: {json.dumps({'type': 'connection', 'status': 'connected', 'gameId': game_id})}\n\n"
 
@@ -632,43 +645,46 @@ async def _sse_pbp_generator(request: Request, game_id: str):
             if await request.is_disconnected():
                 break
 
-            try:
-                payload = await asyncio.wait_for(q.get(), timeout=15.0)
-                # Check for termination sentinel from the polling service.
-                # Sending a game_ended event allows the client to close the
-                # EventSource cleanly instead of auto-reconnecting into a
-                # heartbeat loop (which would exhaust Cloud Run concurrency).
-                if (
-                    isinstance(payload, list)
-                    and len(payload) == 1
-                    and isinstance(payload[0], dict)
-                    and payload[0].get("type") == "system_game_ended"
-                ):
-                    yield f"data: {json.dumps({'type': 'game_ended', 'gameId': game_id})}\n\n"
-                    break
-                yield f"data: {json.dumps({'type': 'plays_update', 'plays': payload})}\n\n"
-            except asyncio.TimeoutError:
-                if await request.is_disconnected():
-                    break
-                yield ": heartbeat\n\n"
+            frame = await channel.next_frame(sub)
+            yield frame
+            # game_ended lets the client close the EventSource cleanly instead
+            # of auto-reconnecting into a heartbeat loop (which would exhaust
+            # Cloud Run concurrency).
+            if frame is channel.ended_frame:
+                break
 
     except asyncio.CancelledError:
         logger.info(f"SSE cancelled by client for game {game_id}")
     except Exception as e:
         logger.error(f"SSE error for {game_id}: {e}")
     finally:
-        pbp_polling_manager.unsubscribe_sse(game_id, q)
+        pbp_polling_manager.unsubscribe_sse(game_id, sub)
         logger.info(f"SSE client detached from {game_id}")
 
 
 @router.get("/{game_id}/stream")
-async def stream_live_plays(request: Request, game_id: str):
+async def stream_live_plays(
+    request: Request,
+    game_id: str,
+    last_event_id: Optional[int] = Query(None, description="Resume after this sequenceNumber"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """
     Server-Sent Events endpoint pushing real-time play-by-play events.
     Returns `text/event-stream`.
+
+    Every plays_update frame carries `id: <last sequenceNumber>`. Clients
+    resume with the Last-Event-ID header (native EventSource reconnects)
+    or `?last_event_id=` (manual reconnects); if the buffer no longer
+    covers that point a `resync` event asks them to re-hydrate.
     """
+    if last_event_id is None and last_event_id_header:
+        try:
+            last_event_id = int(last_event_id_header)
+        except ValueError:
+            last_event_id = None
     return StreamingResponse(
-        _sse_pbp_generator(request, game_id),
+        _sse_pbp_generator(request, game_id, last_event_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
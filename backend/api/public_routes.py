@@ -2,7 +2,7 @@
 Public API Routes for Cloud Backend - FIRESTORE VERSION
 Provides endpoints for frontend consumption using Firebase Firestore
 """
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Response, Header
 import os
 import logging
 from typing import Optional, List
@@ -27,6 +27,8 @@ from firestore_db import (
     get_team_stats,
     get_firestore_db
 )
+from services.player_directory import get_player_directory
+from services.executor_tier import run_cpu, run_io, ExecutorSaturated
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -171,7 +173,11 @@ async def get_all_players_endpoint(is_active: Optional[bool] = Query(None)):
 
 
 @router.get("/players/search", response_model=List[PlayerSearchResult])
-async def search_players_endpoint(q: Optional[str] = Query(None, min_length=0, max_length=50)):
+async def search_players_endpoint(
+    response: Response,
+    q: Optional[str] = Query(None, min_length=0, max_length=50),
+    if_none_match: Optional[str] = Header(None),
+):
     """
     Search for players by name (for OmniSearch)
     Query params:
@@ -181,44 +187,30 @@ async def search_players_endpoint(q: Optional[str] = Query(None, min_length=0, m
         - name: player name
         - team: team abbreviation
         - position: position
+
+    Served from the in-memory PlayerDirectory (prefix trie + trigram fuzzy
+    index) instead of streaming the players collection per request. The
+    ETag tracks the roster snapshot, so unchanged rosters return 304.
     """
     try:
-        # Get ACTIVE players only (current rosters)
-        all_players = get_all_players(active_only=True)
-        
-        if not all_players:
-            logger.warning("No players found in database")
-            return []
-        
-        def normalize_player(p):
-            """Normalize player data to standard frontend format"""
-            return {
-                'id': p.get('player_id') or p.get('id') or '',
-                'name': p.get('name') or p.get('player_name') or p.get('fullName') or 'Unknown',
-                'team': p.get('team') or p.get('team_id') or '',
-                'position': p.get('position') or '',
-                'avatar': p.get('headshot_url') or ''
-            }
-        
-        # If no query or empty string, return all active players for client-side Fuse.js index
-        if not q or q.strip() == '':
-            normalized = [normalize_player(p) for p in all_players]
-            logger.info(f"✅ Returned {len(normalized)} active players (no query)")
-            return normalized
-        
-        # Case-insensitive search
-        query_lower = q.lower().strip()
-        filtered = []
-        for p in all_players:
-            # Check multiple common name fields
-            name = (p.get('name') or p.get('player_name') or p.get('fullName') or '').lower()
-            if query_lower in name:
-                filtered.append(normalize_player(p))
-        
-        # Return top 50 matches
-        logger.info(f"✅ Search '{q}' returned {len(filtered[:50])} active players")
-        return filtered[:50]
-        
+        directory = get_player_directory()
+        # One snapshot for both the ETag and the results; only the first
+        # load waits on Firestore (in the I/O pool), later ones refresh
+        # in the background.
+        snap = directory.peek() or await run_io(directory.snapshot, route="players_search")
+        etag = f'W/"{snap.version}"'
+
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "public, max-age=60"})
+
+        results = snap.search(q)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "public, max-age=60"
+
+        if not results:
+            logger.warning(f"No players matched search '{q}'" if q else "No players found in database")
+        return results
+
     except Exception as e:
         logger.error(f"Player search failed for query '{q}': {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Search temporarily unavailable")
@@ -735,18 +727,24 @@ async def analyze_matchup(
         raise HTTPException(status_code=400, detail="Both home_team and away_team are required")
     
     try:
-        # Run multi-stat confluence analysis (sync method - do NOT await)
-        confluence_data = multi_stat_engine.analyze_game(home_team.upper(), away_team.upper())
+        # Run multi-stat confluence analysis (sync engine — offloaded to the CPU pool)
+        confluence_data = await run_cpu(
+            multi_stat_engine.analyze_game, home_team.upper(), away_team.upper(),
+            route="matchup_analyze",
+        )
         
         # Add game_id to response if provided
         if game_id:
             confluence_data['game_id'] = game_id
         
-        # Generate AI insights
+        # Generate AI insights (Gemini round-trip — offloaded to the I/O pool)
         insights = {}
         if ai_insights_engine:
             try:
-                insights = ai_insights_engine.generate_insights(confluence_data)
+                insights = await run_io(
+                    ai_insights_engine.generate_insights, confluence_data,
+                    route="matchup_insights",
+                )
             except Exception as e:
                 logger.error(f"AI insights error: {e}")
                 insights = {
@@ -769,6 +767,10 @@ async def analyze_matchup(
         
     except HTTPException:
         raise
+    except ExecutorSaturated as e:
+        logger.warning(f"Matchup analysis shed: {e}")
+        raise HTTPException(status_code=503, detail="Matchup engine busy, retry shortly",
+                            headers={"Retry-After": "2"})
     except Exception as e:
         logger.error(f"Error analyzing matchup {home_team} vs {away_team}: {e}")
         return {
@@ -1116,9 +1118,13 @@ async def public_players_alias(is_active: Optional[bool] = Query(None)):
 
 
 @router.get("/public/players/search", include_in_schema=False)
-async def public_players_search_alias(q: Optional[str] = Query(None, min_length=0, max_length=50)):
+async def public_players_search_alias(
+    response: Response,
+    q: Optional[str] = Query(None, min_length=0, max_length=50),
+    if_none_match: Optional[str] = Header(None),
+):
     """Alias: /public/players/search → /players/search"""
-    return await search_players_endpoint(q=q)
+    return await search_players_endpoint(response=response, q=q, if_none_match=if_none_match)
 
 
 @router.get("/public/roster/{team_id}", include_in_schema=False)
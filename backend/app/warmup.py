@@ -0,0 +1,268 @@
+"""
+App Warm-up - Deferred Routers and Services
+===========================================
+Cold starts on Cloud Run pay for every module main.py imports before
+uvicorn binds the port. Most routers pull in pandas, firebase_admin,
+google-genai or the Vanguard AI stack at import time, yet a fresh
+instance only needs /health, /readyz and the live pulse endpoints to
+start serving.
+
+AppWarmup keeps those routers as LazyRouter specs (module path + the
+path prefixes they serve) and:
+
+  - imports a router on the first request under one of its prefixes
+    (import runs in a worker thread; the request waits for it),
+  - loads everything still pending when a request matches nothing,
+  - imports all routers and starts heavy services from a background
+    task once the app is serving,
+  - keeps the original registration order, so route precedence is the
+    same as with eager include_router() calls.
+
+/readyz reports status(): "serving" as soon as the app accepts traffic,
+"warm" once every router and service has loaded.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# SPECS
+# ============================================================================
+
+@dataclass(frozen=True)
+class LazyRouter:
+    """A router registered by module path, imported on first use."""
+    module: str
+    paths: Tuple[str, ...] = ()          # path prefixes served (besides prefix)
+    attr: str = "router"
+    prefix: str = ""
+    tags: Optional[Tuple[str, ...]] = None
+    name: str = ""
+    eager: bool = False                  # startup-critical: import at app creation
+
+    @property
+    def key(self) -> str:
+        return self.name or self.module
+
+    def serves(self, path: str) -> bool:
+        return any(path == p or path.startswith(p.rstrip("/") + "/") for p in self.prefixes)
+
+    @property
+    def prefixes(self) -> Tuple[str, ...]:
+        return ((self.prefix,) if self.prefix else ()) + self.paths
+
+
+@dataclass
+class WarmService:
+    """A heavy service started from the warm-up task instead of the lifespan."""
+    name: str
+    start: Callable[[], Awaitable[Any]]
+    stop: Optional[Callable[[], Awaitable[Any]]] = None
+    state: str = "pending"
+    error: Optional[str] = None
+
+
+# ============================================================================
+# WARM-UP
+# ============================================================================
+
+class AppWarmup:
+    """
+    Deferred router registry + background warm-up for one FastAPI app.
+
+    Loop-agnostic on purpose: TestClient runs each request on its own
+    event loop, so bookkeeping is guarded by a threading lock rather than
+    asyncio primitives.
+    """
+
+    def __init__(self, routers: Sequence[LazyRouter] = (), services: Sequence[WarmService] = ()):
+        self.routers: List[LazyRouter] = list(routers)
+        self.services: List[WarmService] = list(services)
+        self.loaded: Dict[str, float] = {}          # key -> import ms
+        self.failed: Dict[str, str] = {}
+        self._rank = {spec.key: i for i, spec in enumerate(self.routers)}
+        self._route_rank: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._app = None
+        self._default = None
+        self._task: Optional[asyncio.Task] = None
+        self._created = time.perf_counter()
+        self.warm_ms: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Installation
+    # ------------------------------------------------------------------
+
+    def install(self, app) -> 'AppWarmup':
+        """
+        Attach to an app: import eager routers now, add the path gate and
+        route-miss fallback, expose self as app.state.warmup.
+        """
+        self._app = app
+        app.state.warmup = self
+        for route in app.router.routes:              # FastAPI's own (openapi) routes stay first
+            self._route_rank.setdefault(id(route), -1)
+        for spec in self.routers:
+            if spec.eager:
+                self._include(spec, self._import(spec))
+
+        self._default = app.router.default
+        app.router.default = self._on_route_miss
+        app.add_middleware(LazyRouteMiddleware, warmup=self)
+        return self
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @property
+    def pending(self) -> List[LazyRouter]:
+        return [s for s in self.routers if s.key not in self.loaded and s.key not in self.failed]
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self.loaded
+
+    def _import(self, spec: LazyRouter):
+        start = time.perf_counter()
+        try:
+            # __import__ (not importlib) so -X importtime accounts for it
+            router = getattr(__import__(spec.module, fromlist=[spec.attr]), spec.attr)
+        except Exception as e:
+            with self._lock:
+                self.failed[spec.key] = f"{type(e).__name__}: {e}"
+            logger.warning(f"⚠️ {spec.key} router not available: {e}")
+            return None
+        return router, (time.perf_counter() - start) * 1000
+
+    def _include(self, spec: LazyRouter, imported) -> bool:
+        if imported is None:
+            return False
+        router, import_ms = imported
+        with self._lock:
+            if spec.key in self.loaded:
+                return True
+            before = {id(r) for r in self._app.router.routes}
+            kwargs = {"prefix": spec.prefix} if spec.prefix else {}
+            if spec.tags:
+                kwargs["tags"] = list(spec.tags)
+            self._app.include_router(router, **kwargs)
+            rank = self._rank[spec.key]
+            for route in self._app.router.routes:
+                if id(route) not in before:
+                    self._route_rank[id(route)] = rank
+            # Stable sort: same precedence as registering every router up front
+            last = len(self.routers)
+            self._app.router.routes[:] = sorted(
+                self._app.router.routes, key=lambda r: self._route_rank.get(id(r), last)
+            )
+            self.loaded[spec.key] = round(import_ms, 1)
+        logger.info(f"✅ {spec.key} routes registered ({import_ms:.0f}ms import)")
+        return True
+
+    async def load(self, specs: Sequence[LazyRouter]):
+        """Import (off the event loop) and register the given routers, in rank order."""
+        for spec in sorted(specs, key=lambda s: self._rank[s.key]):
+            if spec.key in self.loaded or spec.key in self.failed:
+                continue
+            imported = await asyncio.to_thread(self._import, spec)
+            self._include(spec, imported)
+
+    async def load_for_path(self, path: str) -> bool:
+        specs = [s for s in self.pending if s.serves(path)]
+        if specs:
+            await self.load(specs)
+        return bool(specs)
+
+    async def _on_route_miss(self, scope, receive, send):
+        """Router default: load whatever is still pending and route again."""
+        pending = self.pending
+        if pending and scope["type"] in ("http", "websocket"):
+            await self.load(pending)
+            await self._app.router.app(scope, receive, send)
+            return
+        await self._default(scope, receive, send)
+
+    # ------------------------------------------------------------------
+    # Background warm-up
+    # ------------------------------------------------------------------
+
+    def start(self) -> asyncio.Task:
+        """Schedule the warm-up task; call from the lifespan once serving."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.warm())
+        return self._task
+
+    async def warm(self):
+        start = time.perf_counter()
+        await self.load(self.pending)
+        for service in self.services:
+            if service.state != "pending":
+                continue
+            try:
+                await service.start()
+                service.state = "running"
+                logger.info(f"✅ {service.name} started")
+            except Exception as e:
+                service.state, service.error = "failed", str(e)
+                logger.warning(f"⚠️ {service.name} not started (non-fatal): {e}")
+        self.warm_ms = round((time.perf_counter() - start) * 1000, 1)
+        logger.info(f"✅ Warm-up complete in {self.warm_ms:.0f}ms "
+                    f"({len(self.loaded)} routers, {len(self.failed)} unavailable)")
+
+    async def shutdown(self):
+        """Cancel an unfinished warm-up and stop started services, newest first."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        for service in reversed(self.services):
+            if service.state == "running" and service.stop:
+                try:
+                    await service.stop()
+                    service.state = "stopped"
+                    logger.info(f"✅ {service.name} stopped")
+                except Exception as e:
+                    logger.debug(f"{service.name} stop error (non-fatal): {e}")
+
+    @property
+    def is_warm(self) -> bool:
+        return not self.pending and all(s.state != "pending" for s in self.services)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "status": "warm" if self.is_warm else "serving",
+            "warm": self.is_warm,
+            "uptime_s": round(time.perf_counter() - self._created, 1),
+            "warm_ms": self.warm_ms,
+            "routers": {
+                "loaded": dict(self.loaded),
+                "pending": [s.key for s in self.pending],
+                "failed": dict(self.failed),
+            },
+            "services": {s.name: s.state if not s.error else f"{s.state}: {s.error}" for s in self.services},
+        }
+
+
+class LazyRouteMiddleware:
+    """
+    Innermost ASGI gate: a request under a pending router's prefix waits
+    for that router to load before routing. Free once everything is loaded.
+    """
+
+    def __init__(self, app, warmup: AppWarmup):
+        self.app = app
+        self.warmup = warmup
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.warmup.pending:
+            await self.warmup.load_for_path(scope.get("path", ""))
+        await self.app(scope, receive, send)
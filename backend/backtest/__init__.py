@@ -0,0 +1,34 @@
+"""
+Historical Backtests
+====================
+Replays the projection engines over stored game logs for any date range,
+one or many parameter configs at a time, in a process pool, and reports
+MAE, Floor-Ceiling calibration and hit rate per config. Run via
+scripts/run_backtest.py.
+"""
+
+from backtest.engine import (
+    BacktestConfig,
+    BacktestRun,
+    EMAStateCache,
+    ReplayRecord,
+    expand_grid,
+    load_player_games,
+    run_backtest,
+)
+from backtest.report import BacktestReport, format_reports, records_from_ledger, summarize, summarize_run
+
+__all__ = [
+    'BacktestConfig',
+    'BacktestReport',
+    'BacktestRun',
+    'EMAStateCache',
+    'ReplayRecord',
+    'expand_grid',
+    'format_reports',
+    'load_player_games',
+    'records_from_ledger',
+    'run_backtest',
+    'summarize',
+    'summarize_run',
+]
@@ -0,0 +1,381 @@
+"""
+Backtest Engine
+===============
+Replays the projection core - EMA baselines -> Vertex Monte Carlo ->
+Confluence score - for every stored game in a date range, using only the
+games each player had logged before that night, and scores the result
+against what actually happened.
+
+Work is split by player across a process pool: a player's games are
+replayed in order (historical accuracy feeds the confluence score), and
+every config in a sweep shares that player's pre-game EMA windows
+(EMAStateCache) instead of recomputing them per config.
+
+Matchup context the game logs don't carry (opponent defense, pace,
+schedule fatigue, injuries) is held neutral, so two configs differ only
+in the parameters under test. Each projection draws from its own seeded
+RNG, so results do not depend on the worker count.
+"""
+
+import itertools
+import logging
+import os
+import sqlite3
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.random import default_rng
+
+from engines.ema_calculator import EMACalculator
+
+logger = logging.getLogger(__name__)
+
+# Stats EMACalculator tracks -> player_game_logs columns
+LOG_COLUMNS = {
+    'points': 'points',
+    'rebounds': 'rebounds',
+    'assists': 'assists',
+    'threes': 'fg3_made',
+    'steals': 'steals',
+    'blocks': 'blocks',
+    'minutes': 'minutes',
+}
+AUDITED_STATS = ('points', 'rebounds', 'assists')
+HISTORY_LIMIT = 20            # LearningLedger.get_historical_accuracy default
+
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    """One set of engine parameters to replay."""
+    name: str = 'baseline'
+    ema_alpha: float = 0.15
+    lookback: int = 15                      # games the router hands the EMA
+    n_simulations: int = 10_000
+    baseline_minutes: float = 32.0
+    use_volatility: bool = True
+    confluence_weights: Optional[Tuple[Tuple[str, float], ...]] = None
+    min_history: int = 5                    # skip games with less history
+    line_window: int = 10                   # trailing games behind the hit-rate line
+    seed: int = 42
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {k: getattr(self, k) for k in self.__dataclass_fields__}
+        out['confluence_weights'] = dict(self.confluence_weights) if self.confluence_weights else None
+        return out
+
+
+def expand_grid(base: BacktestConfig, grid: Dict[str, Sequence[Any]]) -> List[BacktestConfig]:
+    """
+    Cartesian product of parameter values over a base config, named after
+    the values that vary, e.g. "ema_alpha=0.1,n_simulations=2000".
+    """
+    if not grid:
+        return [base]
+    keys = list(grid)
+    configs = []
+    for values in itertools.product(*(grid[k] for k in keys)):
+        overrides = dict(zip(keys, values))
+        if isinstance(overrides.get('confluence_weights'), dict):
+            overrides['confluence_weights'] = tuple(sorted(overrides['confluence_weights'].items()))
+        name = ','.join(f"{k}={_label(v)}" for k, v in zip(keys, values))
+        configs.append(replace(base, name=name, **overrides))
+    return configs
+
+
+def _label(value: Any) -> str:
+    if isinstance(value, dict):
+        return '/'.join(f"{v:g}" for v in value.values())
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+# ============================================================================
+# GAME LOGS
+# ============================================================================
+
+@dataclass
+class PlayerGames:
+    """One player's logged games, oldest-first, as columns."""
+    player_id: str
+    dates: List[str]
+    stats: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def targets(self, start: str, end: str, min_history: int) -> List[int]:
+        return [i for i, d in enumerate(self.dates) if start <= d <= end and i >= min_history]
+
+
+def load_player_games(db_path: Path, end: date, players: Optional[Iterable[str]] = None) -> List[PlayerGames]:
+    """Every logged game up to `end` in one query, grouped per player."""
+    columns = ', '.join(f"COALESCE({col}, 0)" for col in LOG_COLUMNS.values())
+    sql = f"""
+        SELECT player_id, game_date, {columns}
+        FROM player_game_logs
+        WHERE game_date <= ?
+    """
+    params: List[Any] = [end.isoformat()]
+    if players is not None:
+        players = [str(p) for p in players]
+        sql += f" AND player_id IN ({','.join('?' * len(players))})"
+        params += players
+    sql += " ORDER BY player_id, game_date, game_id"
+
+    with sqlite3.connect(str(db_path)) as conn:
+        rows = conn.execute(sql, params).fetchall()
+
+    out = []
+    for player_id, group in itertools.groupby(rows, key=lambda r: str(r[0])):
+        group = list(group)
+        values = np.array([r[2:] for r in group], dtype=float)
+        out.append(PlayerGames(
+            player_id=player_id,
+            dates=[r[1] for r in group],
+            stats={stat: values[:, j] for j, stat in enumerate(LOG_COLUMNS)},
+        ))
+    return out
+
+
+# ============================================================================
+# EMA STATE CACHE
+# ============================================================================
+
+class EMAStateCache:
+    """
+    Pre-game EMA / std for every game of one player, per (alpha, lookback).
+    Configs that only differ elsewhere (simulations, confluence weights,
+    minutes baseline) reuse the same arrays.
+    """
+
+    def __init__(self, games: PlayerGames):
+        self.games = games
+        self._states: Dict[Tuple[float, int], Dict[str, Tuple[np.ndarray, np.ndarray]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def windows(self, alpha: float, lookback: int) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        key = (alpha, lookback)
+        if key in self._states:
+            self.hits += 1
+        else:
+            self.misses += 1
+            calculator = EMACalculator(alpha=alpha)
+            self._states[key] = {
+                stat: calculator.prior_windows(values, lookback)
+                for stat, values in self.games.stats.items()
+            }
+        return self._states[key]
+
+    @staticmethod
+    def baselines(windows: Dict[str, Tuple[np.ndarray, np.ndarray]], i: int) -> Dict[str, float]:
+        """EMACalculator.calculate() output for the window before game i."""
+        return {
+            f'{stat}_{kind}': round(float(arr[i]), 2)
+            for stat, (ema, std) in windows.items()
+            for kind, arr in (('ema', ema), ('std', std))
+        }
+
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+
+@dataclass
+class ReplayRecord:
+    """One replayed projection next to the actual line."""
+    config: str
+    player_id: str
+    game_date: str
+    floor: Dict[str, float]
+    ev: Dict[str, float]
+    ceiling: Dict[str, float]
+    actual: Dict[str, float]
+    line: Dict[str, float]
+    nominal_coverage: float
+    confluence_score: float
+    confluence_grade: str
+
+
+_forge = None
+
+
+def _get_forge():
+    """One VanguardForge per worker process (it only feeds model agreement here)."""
+    global _forge
+    if _forge is None:
+        from engines.vanguard_forge import VanguardForge
+        _forge = VanguardForge()
+    return _forge
+
+
+class _ReplayLedger:
+    """Historical accuracy from a config's own earlier replays (ConfluenceScorer's ledger)."""
+
+    def __init__(self):
+        self.within: List[bool] = []
+
+    def get_historical_accuracy(self, player_id: str, limit: int = HISTORY_LIMIT) -> float:
+        recent = self.within[-limit:]
+        return sum(recent) / len(recent) if recent else 0.5
+
+
+@dataclass
+class PlayerTask:
+    games: PlayerGames
+    configs: List[BacktestConfig]
+    start: str
+    end: str
+
+
+@dataclass
+class PlayerReplay:
+    records: List[ReplayRecord] = field(default_factory=list)
+    ema_hits: int = 0
+    ema_misses: int = 0
+
+
+def replay_player(task: PlayerTask) -> PlayerReplay:
+    """Replay every target game of one player under every config (runs in a worker)."""
+    from aegis.confluence_scorer import ConfluenceScorer
+    from engines.vertex_monte_carlo import VertexMonteCarloEngine
+
+    games = task.games
+    cache = EMAStateCache(games)
+    forge = _get_forge()
+    out = PlayerReplay()
+    player_key = zlib.crc32(games.player_id.encode())
+
+    for config in task.configs:
+        targets = games.targets(task.start, task.end, config.min_history)
+        if not targets:
+            continue
+        windows = cache.windows(config.ema_alpha, config.lookback)
+        engine = VertexMonteCarloEngine(n_simulations=config.n_simulations)
+        ledger = _ReplayLedger()
+        scorer = ConfluenceScorer(learning_ledger=ledger)
+        if config.confluence_weights:
+            scorer.WEIGHTS = dict(config.confluence_weights)
+
+        for i in targets:
+            ema_stats = EMAStateCache.baselines(windows, i)
+            history = slice(max(0, i - config.lookback), i)
+            recent_points = games.stats['points'][history][::-1].tolist()
+
+            volatility = VertexMonteCarloEngine.volatility_from_points(recent_points) \
+                if config.use_volatility else 1.0
+            minutes = VertexMonteCarloEngine.minutes_modifier(ema_stats['minutes_ema'], config.baseline_minutes)
+
+            # Seeded per (config, player, game): identical under any worker split
+            engine.rng = default_rng([config.seed, player_key, i])
+            np.random.seed([config.seed, player_key, i])
+            projection = engine.run_simulation(
+                ema_stats, volatility_factor=volatility, minutes_modifier=minutes
+            ).projection
+
+            forge_result = forge.predict_from_stats(ema_stats)
+            model_preds = forge_result['points'].model_predictions if 'points' in forge_result else {}
+            confluence = scorer.calculate(model_preds, sample_size=i - history.start, player_id=games.player_id)
+
+            floor_pct, ceil_pct = VertexMonteCarloEngine.band_percentiles(volatility)
+            trailing = slice(max(0, i - config.line_window), i)
+            record = ReplayRecord(
+                config=config.name,
+                player_id=games.player_id,
+                game_date=games.dates[i],
+                floor={s: projection.floor_20th[s] for s in AUDITED_STATS},
+                ev={s: projection.expected_value[s] for s in AUDITED_STATS},
+                ceiling={s: projection.ceiling_80th[s] for s in AUDITED_STATS},
+                actual={s: float(games.stats[s][i]) for s in AUDITED_STATS},
+                # Half-point line off the trailing average: no pushes on integer stats
+                line={s: float(np.floor(games.stats[s][trailing].mean())) + 0.5 for s in AUDITED_STATS},
+                nominal_coverage=(ceil_pct - floor_pct) / 100,
+                confluence_score=confluence.score,
+                confluence_grade=confluence.grade,
+            )
+            out.records.append(record)
+            pts = record.actual['points']
+            ledger.within.append(record.floor['points'] <= pts <= record.ceiling['points'])
+
+    out.ema_hits, out.ema_misses = cache.hits, cache.misses
+    return out
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+@dataclass
+class BacktestRun:
+    """Replayed records per config plus run bookkeeping."""
+    configs: List[BacktestConfig]
+    start: date
+    end: date
+    records: Dict[str, List[ReplayRecord]]
+    players: int
+    workers: int
+    ema_hits: int = 0
+    ema_misses: int = 0
+
+
+def run_backtest(
+    db_path: Path,
+    configs: Sequence[BacktestConfig],
+    start: date,
+    end: date,
+    players: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+) -> BacktestRun:
+    """
+    Replay every stored game between start and end (inclusive) under each
+    config. workers=None uses every CPU; 0 or 1 replays in-process.
+    """
+    configs = list(configs)
+    names = [c.name for c in configs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Config names must be unique: {names}")
+
+    start_s, end_s = start.isoformat(), end.isoformat()
+    min_history = min(c.min_history for c in configs)
+    tasks = [
+        PlayerTask(games, configs, start_s, end_s)
+        for games in load_player_games(db_path, end, players)
+        if games.targets(start_s, end_s, min_history)
+    ]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+    logger.info(f"[BACKTEST] {len(tasks)} players x {len(configs)} configs, {start_s}..{end_s}, "
+                f"{workers} worker(s)")
+
+    if workers == 1:
+        replays = [replay_player(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            replays = list(pool.map(replay_player, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    records: Dict[str, List[ReplayRecord]] = {name: [] for name in names}
+    for replay in replays:
+        for record in replay.records:
+            records[record.config].append(record)
+    for config_records in records.values():
+        config_records.sort(key=lambda r: (r.game_date, r.player_id))
+
+    return BacktestRun(
+        configs=configs,
+        start=start,
+        end=end,
+        records=records,
+        players=len(tasks),
+        workers=workers,
+        ema_hits=sum(r.ema_hits for r in replays),
+        ema_misses=sum(r.ema_misses for r in replays),
+    )
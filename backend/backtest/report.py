@@ -0,0 +1,160 @@
+"""
+Backtest Reports
+================
+Scores replayed projections per config:
+
+- MAE of the EV per stat
+- calibration: share of actuals inside Floor-Ceiling vs the band's nominal
+  coverage (60% for 20th/80th), plus misses below / above
+- hit rate: over/under calls (EV vs a half-point line off the trailing
+  average) that came in
+- the same accuracy split by Confluence grade, so a scorer change shows
+  whether higher grades really are more reliable
+
+records_from_ledger() turns audited Learning Ledger rows into the same
+records, so what production projected over a range can sit next to the
+replayed configs.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from backtest.engine import AUDITED_STATS, ReplayRecord
+
+GRADES = ('A', 'B', 'C', 'D', 'F')
+
+
+@dataclass
+class BacktestReport:
+    config: str
+    projections: int
+    mae: Dict[str, Optional[float]]
+    coverage: Dict[str, Optional[float]]
+    below_floor: Dict[str, Optional[float]]
+    above_ceiling: Dict[str, Optional[float]]
+    nominal_coverage: Optional[float]
+    hit_rate: Dict[str, Optional[float]]
+    by_grade: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def calibration_gap(self) -> Dict[str, Optional[float]]:
+        """Observed minus nominal coverage; negative = bands too narrow."""
+        if self.nominal_coverage is None:
+            return {s: None for s in self.coverage}
+        return {s: None if c is None else round(c - self.nominal_coverage, 4) for s, c in self.coverage.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        out['calibration_gap'] = self.calibration_gap
+        return out
+
+
+def _rate(values: np.ndarray) -> Optional[float]:
+    """nanmean as a rounded float, None when nothing counts."""
+    values = values[~np.isnan(values)]
+    return round(float(values.mean()), 4) if values.size else None
+
+
+def _columns(records: List[ReplayRecord], attr: str, stat: str) -> np.ndarray:
+    return np.array([getattr(r, attr).get(stat, np.nan) for r in records], dtype=float)
+
+
+def summarize(config: str, records: List[ReplayRecord]) -> BacktestReport:
+    """One config's records -> MAE, calibration and hit-rate report."""
+    mae, coverage, below, above, hit_rate = {}, {}, {}, {}, {}
+    for stat in AUDITED_STATS:
+        floor, ev, ceiling, actual, line = (
+            _columns(records, attr, stat) for attr in ('floor', 'ev', 'ceiling', 'actual', 'line')
+        )
+        scored = ~np.isnan(actual)
+        banded = scored & ~np.isnan(floor) & ~np.isnan(ceiling)
+        lined = scored & ~np.isnan(line) & ~np.isnan(ev)
+
+        mae[stat] = _rate(np.where(scored, np.abs(ev - actual), np.nan))
+        coverage[stat] = _rate(np.where(banded, (actual >= floor) & (actual <= ceiling), np.nan))
+        below[stat] = _rate(np.where(banded, actual < floor, np.nan))
+        above[stat] = _rate(np.where(banded, actual > ceiling, np.nan))
+        hit_rate[stat] = _rate(np.where(lined, (ev > line) == (actual > line), np.nan))
+
+    grades = np.array([r.confluence_grade for r in records], dtype=object)
+    pts_error = np.abs(_columns(records, 'ev', 'points') - _columns(records, 'actual', 'points'))
+    pts_floor, pts_ceiling, pts_actual = (_columns(records, a, 'points') for a in ('floor', 'ceiling', 'actual'))
+    pts_within = np.where(np.isnan(pts_floor) | np.isnan(pts_ceiling), np.nan,
+                          (pts_actual >= pts_floor) & (pts_actual <= pts_ceiling))
+    by_grade = {}
+    for grade in GRADES:
+        mask = grades == grade
+        if mask.any():
+            by_grade[grade] = {
+                'projections': int(mask.sum()),
+                'points_mae': _rate(pts_error[mask]),
+                'points_coverage': _rate(pts_within[mask]),
+            }
+
+    return BacktestReport(
+        config=config,
+        projections=len(records),
+        mae=mae,
+        coverage=coverage,
+        below_floor=below,
+        above_ceiling=above,
+        nominal_coverage=_rate(np.array([r.nominal_coverage for r in records], dtype=float)),
+        hit_rate=hit_rate,
+        by_grade=by_grade,
+    )
+
+
+def summarize_run(records: Dict[str, List[ReplayRecord]]) -> List[BacktestReport]:
+    return [summarize(config, config_records) for config, config_records in records.items()]
+
+
+def records_from_ledger(rows: Iterable[Dict[str, Any]], config: str = 'ledger') -> List[ReplayRecord]:
+    """Audited learning_ledger rows as records (no line, so no hit rate)."""
+    prefixes = {'points': 'pts', 'rebounds': 'reb', 'assists': 'ast'}
+
+    def values(row, suffix):
+        return {s: np.nan if row.get(f'{p}_{suffix}') is None else float(row[f'{p}_{suffix}'])
+                for s, p in prefixes.items()}
+
+    from aegis.confluence_scorer import ConfluenceScorer
+    scorer = ConfluenceScorer()
+    return [
+        ReplayRecord(
+            config=config,
+            player_id=str(row['player_id']),
+            game_date=str(row['game_date']),
+            floor=values(row, 'floor'),
+            ev=values(row, 'ev'),
+            ceiling=values(row, 'ceiling'),
+            actual=values(row, 'actual'),
+            line={},
+            nominal_coverage=np.nan,
+            confluence_score=row.get('confluence_score') or 0.0,
+            confluence_grade=scorer.grade_for(row.get('confluence_score') or 0.0),
+        )
+        for row in rows
+        if row.get('pts_actual') is not None
+    ]
+
+
+def format_reports(reports: List[BacktestReport]) -> str:
+    """Table of the headline numbers, best points MAE first."""
+    def fmt(value, pct=False):
+        if value is None:
+            return '-'
+        return f"{value * 100:.1f}%" if pct else f"{value:.2f}"
+
+    width = max([len('config')] + [len(r.config) for r in reports])
+    header = (f"{'config':<{width}} {'n':>6} {'pts MAE':>8} {'reb MAE':>8} {'ast MAE':>8} "
+              f"{'pts cov':>8} {'nominal':>8} {'pts hit':>8}")
+    lines = [header, '-' * len(header)]
+    ranked = sorted(reports, key=lambda r: (r.mae['points'] is None, r.mae['points'] or 0.0))
+    for r in ranked:
+        lines.append(
+            f"{r.config:<{width}} {r.projections:>6} {fmt(r.mae['points']):>8} {fmt(r.mae['rebounds']):>8} "
+            f"{fmt(r.mae['assists']):>8} {fmt(r.coverage['points'], True):>8} "
+            f"{fmt(r.nominal_coverage, True):>8} {fmt(r.hit_rate['points'], True):>8}"
+        )
+    return '\n'.join(lines)
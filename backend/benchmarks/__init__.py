@@ -0,0 +1,30 @@
+"""
+Projection Engine Benchmarks
+============================
+Seeded, fixture-backed benchmarks for the projection engines with JSON
+baselines. Run via scripts/benchmark_sims.py.
+"""
+
+from benchmarks.harness import (
+    BenchCase,
+    BenchResult,
+    Comparison,
+    compare,
+    format_results,
+    load_baseline,
+    measure,
+    run_cases,
+    save_baseline,
+)
+
+__all__ = [
+    'BenchCase',
+    'BenchResult',
+    'Comparison',
+    'compare',
+    'format_results',
+    'load_baseline',
+    'measure',
+    'run_cases',
+    'save_baseline',
+]
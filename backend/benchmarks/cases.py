@@ -0,0 +1,160 @@
+"""
+Engine Benchmark Cases
+======================
+One case per projection engine, each fed from the fixture league:
+
+  crucible       CrucibleProjector.project            (games/s)
+  deep_mc        DeepMonteCarloEngine.run_deep_simulation (games/s)
+  vertex_mc      VertexMonteCarloEngine.run_simulation (sims/s)
+  ema            EMACalculator.calculate over the roster (players/s)
+  confluence     MultiStatConfluence.project_player over the roster (players/s)
+  orchestrator   AegisOrchestrator.run_simulation     (sims/s)
+
+Profiles scale the work: "quick" for CI smoke runs, "full" for numbers
+worth comparing.
+"""
+
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.fixtures import (
+    AWAY_ROSTER,
+    GAME_DATE,
+    HOME_ROSTER,
+    ROSTER,
+    FixtureLeague,
+    deep_player_stats,
+)
+from benchmarks.harness import BenchCase
+
+PROFILES: Dict[str, Dict[str, Dict[str, int]]] = {
+    'quick': {
+        'crucible': {'n': 5, 'iterations': 3},
+        'deep_mc': {'n': 20, 'iterations': 3},
+        'vertex_mc': {'n': 10_000, 'iterations': 10},
+        'ema': {'n': 1, 'iterations': 50},
+        'confluence': {'n': 1, 'iterations': 5},
+        'orchestrator': {'n': 10_000, 'iterations': 5},
+    },
+    'full': {
+        'crucible': {'n': 100, 'iterations': 5},
+        'deep_mc': {'n': 500, 'iterations': 5},
+        'vertex_mc': {'n': 50_000, 'iterations': 50},
+        'ema': {'n': 1, 'iterations': 500},
+        'confluence': {'n': 1, 'iterations': 50},
+        'orchestrator': {'n': 50_000, 'iterations': 20},
+    },
+}
+
+
+def crucible_case(league: FixtureLeague, n: int, iterations: int) -> BenchCase:
+    from engines.crucible_engine import CrucibleProjector
+
+    projector = CrucibleProjector(n_simulations=n, verbose=False)
+
+    def run(seed: int) -> float:
+        projector.simulator.friction_log.clear()
+        result = projector.project(HOME_ROSTER, AWAY_ROSTER)
+        return sum(p['ev']['points'] for p in result['home'].values())
+
+    return BenchCase('crucible', run, units=n, unit='games', iterations=iterations)
+
+
+def deep_mc_case(league: FixtureLeague, n: int, iterations: int) -> BenchCase:
+    from engines.deep_monte_carlo import DeepMonteCarloEngine
+
+    engine = DeepMonteCarloEngine(n_games=n, verbose=False)
+    stats = deep_player_stats(HOME_ROSTER[0])
+
+    def run(seed: int) -> float:
+        return engine.run_deep_simulation(stats).expected_value['points']
+
+    return BenchCase('deep_mc', run, units=n, unit='games', iterations=iterations)
+
+
+def vertex_mc_case(league: FixtureLeague, n: int, iterations: int) -> BenchCase:
+    from numpy.random import default_rng
+
+    from engines.ema_calculator import EMACalculator
+    from engines.vertex_monte_carlo import VertexMonteCarloEngine
+
+    engine = VertexMonteCarloEngine(n_simulations=n)
+    ema_stats = EMACalculator().calculate(league.logs[HOME_ROSTER[0]['player_id']])
+
+    def run(seed: int) -> float:
+        engine.rng = default_rng(seed)
+        result = engine.run_simulation(ema_stats, pace_factor=1.02, friction=-0.01,
+                                       fatigue_modifier=-0.02, volatility_factor=1.1)
+        return result.projection.expected_value['points']
+
+    return BenchCase('vertex_mc', run, units=n, unit='sims', iterations=iterations)
+
+
+def ema_case(league: FixtureLeague, n: int, iterations: int) -> BenchCase:
+    from engines.ema_calculator import EMACalculator
+
+    calculator = EMACalculator(alpha=0.15)
+    roster_logs = [league.logs[p['player_id']] for p in ROSTER] * n
+
+    def run(seed: int) -> float:
+        return sum(calculator.calculate(logs)['points_ema'] for logs in roster_logs)
+
+    return BenchCase('ema', run, units=len(roster_logs), unit='players', iterations=iterations)
+
+
+def confluence_case(league: FixtureLeague, n: int, iterations: int) -> BenchCase:
+    from services.multi_stat_confluence import MultiStatConfluence
+
+    engine = MultiStatConfluence(db_path=league.db_path)
+    home, away = HOME_ROSTER[0]['team'], AWAY_ROSTER[0]['team']
+    defenses = {team: engine.get_team_defense(team) for team in (home, away)}
+    pace = engine.calculate_pace_multiplier(defenses[home], defenses[away])
+    matchups = [(p['player_id'], away if p['team'] == home else home) for p in ROSTER] * n
+
+    def run(seed: int) -> float:
+        total = 0.0
+        for player_id, opponent in matchups:
+            projection = engine.project_player(player_id, opponent, defenses[opponent], pace)
+            total += projection['projections']['pts']['projected'] if projection else 0.0
+        return total
+
+    return BenchCase('confluence', run, units=len(matchups), unit='players', iterations=iterations)
+
+
+def orchestrator_case(league: FixtureLeague, n: int, iterations: int) -> BenchCase:
+    from numpy.random import default_rng
+
+    from aegis.orchestrator import AegisOrchestrator, OrchestratorConfig
+
+    orchestrator = AegisOrchestrator(OrchestratorConfig(
+        n_simulations=n,
+        cache_enabled=False,
+        data_dir=league.data_dir,
+        ledger_path=league.data_dir / 'learning_ledger.db',
+    ))
+    loop = asyncio.new_event_loop()
+    player, opponent = HOME_ROSTER[0], AWAY_ROSTER[0]['team']
+
+    def run(seed: int) -> float:
+        orchestrator.monte_carlo.rng = default_rng(seed)
+        result = loop.run_until_complete(orchestrator.run_simulation(
+            player['player_id'], opponent, game_date=GAME_DATE, lines={'points': 24.5}, force_fresh=True,
+        ))
+        return result.expected_value['points']
+
+    return BenchCase('orchestrator', run, units=n, unit='sims', iterations=iterations, teardown=loop.close)
+
+
+CASES: Dict[str, Callable[..., BenchCase]] = {
+    'crucible': crucible_case,
+    'deep_mc': deep_mc_case,
+    'vertex_mc': vertex_mc_case,
+    'ema': ema_case,
+    'confluence': confluence_case,
+    'orchestrator': orchestrator_case,
+}
+
+
+def build_cases(league: FixtureLeague, profile: str = 'full', names: Optional[List[str]] = None) -> List[BenchCase]:
+    sizes = PROFILES[profile]
+    return [CASES[name](league, **sizes[name]) for name in (names or list(CASES))]
@@ -0,0 +1,266 @@
+"""
+Benchmark Fixtures
+==================
+Deterministic rosters, game logs and a throwaway SQLite league database
+that stand in for nba_data.db / Cloud SQL while the engines are timed.
+
+Everything here is generated from a fixed seed, so two runs of the suite
+feed the engines byte-identical inputs and any change in timing comes
+from the code, not the data.
+"""
+
+import contextlib
+import csv
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+FIXTURE_SEED = 20240101
+GAMES_PER_PLAYER = 25
+GAME_DATE = date(2025, 1, 15)
+
+# ============================================================================
+# ROSTERS
+# ============================================================================
+
+# Warriors @ Lakers, the same matchup crucible_engine.run_demo() uses, with
+# the per-game baselines the synthetic game logs are drawn around.
+HOME_ROSTER: List[Dict] = [
+    {'player_id': '2544', 'name': 'LeBron James', 'team': 'LAL', 'position': 'SF', 'archetype': 'Scorer',
+     'fg2_pct': 0.58, 'fg3_pct': 0.38, 'usage': 0.30, 'pts': 25.5, 'reb': 7.8, 'ast': 8.1, 'fg3m': 2.1, 'min': 35.0},
+    {'player_id': '203076', 'name': 'Anthony Davis', 'team': 'LAL', 'position': 'C', 'archetype': 'Rim Protector',
+     'fg2_pct': 0.56, 'fg3_pct': 0.28, 'usage': 0.28, 'pts': 24.7, 'reb': 12.1, 'ast': 3.4, 'fg3m': 0.6, 'min': 35.5},
+    {'player_id': '1626156', 'name': "D'Angelo Russell", 'team': 'LAL', 'position': 'PG', 'archetype': 'Playmaker',
+     'fg2_pct': 0.48, 'fg3_pct': 0.36, 'usage': 0.22, 'pts': 14.2, 'reb': 3.0, 'ast': 5.8, 'fg3m': 2.7, 'min': 30.0},
+    {'player_id': '1630559', 'name': 'Austin Reaves', 'team': 'LAL', 'position': 'SG', 'archetype': 'Three-and-D',
+     'fg2_pct': 0.50, 'fg3_pct': 0.40, 'usage': 0.15, 'pts': 15.9, 'reb': 4.3, 'ast': 5.5, 'fg3m': 2.0, 'min': 32.1},
+    {'player_id': '1629060', 'name': 'Rui Hachimura', 'team': 'LAL', 'position': 'PF', 'archetype': 'Balanced',
+     'fg2_pct': 0.52, 'fg3_pct': 0.35, 'usage': 0.12, 'pts': 12.2, 'reb': 4.3, 'ast': 1.2, 'fg3m': 1.1, 'min': 26.8},
+    {'player_id': '1629637', 'name': 'Jaxson Hayes', 'team': 'LAL', 'position': 'C', 'archetype': 'Rim Protector',
+     'fg2_pct': 0.66, 'fg3_pct': 0.00, 'usage': 0.10, 'pts': 4.3, 'reb': 3.0, 'ast': 0.5, 'fg3m': 0.0, 'min': 12.0},
+    {'player_id': '1630692', 'name': 'Max Christie', 'team': 'LAL', 'position': 'SG', 'archetype': 'Balanced',
+     'fg2_pct': 0.48, 'fg3_pct': 0.37, 'usage': 0.10, 'pts': 4.0, 'reb': 2.2, 'ast': 0.8, 'fg3m': 0.7, 'min': 14.0},
+]
+
+AWAY_ROSTER: List[Dict] = [
+    {'player_id': '201939', 'name': 'Stephen Curry', 'team': 'GSW', 'position': 'PG', 'archetype': 'Scorer',
+     'fg2_pct': 0.55, 'fg3_pct': 0.42, 'usage': 0.32, 'pts': 26.4, 'reb': 4.5, 'ast': 5.1, 'fg3m': 4.8, 'min': 32.7},
+    {'player_id': '203110', 'name': 'Draymond Green', 'team': 'GSW', 'position': 'PF', 'archetype': 'Playmaker',
+     'fg2_pct': 0.52, 'fg3_pct': 0.30, 'usage': 0.14, 'pts': 8.6, 'reb': 7.2, 'ast': 6.0, 'fg3m': 0.9, 'min': 27.0},
+    {'player_id': '203952', 'name': 'Andrew Wiggins', 'team': 'GSW', 'position': 'SF', 'archetype': 'Balanced',
+     'fg2_pct': 0.50, 'fg3_pct': 0.38, 'usage': 0.18, 'pts': 13.2, 'reb': 4.5, 'ast': 1.7, 'fg3m': 1.4, 'min': 27.0},
+    {'player_id': '1628398', 'name': 'Kevon Looney', 'team': 'GSW', 'position': 'C', 'archetype': 'Rim Protector',
+     'fg2_pct': 0.62, 'fg3_pct': 0.00, 'usage': 0.08, 'pts': 4.5, 'reb': 5.7, 'ast': 1.8, 'fg3m': 0.0, 'min': 16.0},
+    {'player_id': '1630228', 'name': 'Jonathan Kuminga', 'team': 'GSW', 'position': 'PF', 'archetype': 'Slasher',
+     'fg2_pct': 0.54, 'fg3_pct': 0.32, 'usage': 0.16, 'pts': 16.1, 'reb': 4.8, 'ast': 2.2, 'fg3m': 0.7, 'min': 26.3},
+    {'player_id': '1627780', 'name': 'Gary Payton II', 'team': 'GSW', 'position': 'SG', 'archetype': 'Three-and-D',
+     'fg2_pct': 0.60, 'fg3_pct': 0.34, 'usage': 0.10, 'pts': 5.4, 'reb': 3.1, 'ast': 0.9, 'fg3m': 0.4, 'min': 15.0},
+    {'player_id': '1641764', 'name': 'Brandin Podziemski', 'team': 'GSW', 'position': 'SG', 'archetype': 'Balanced',
+     'fg2_pct': 0.49, 'fg3_pct': 0.36, 'usage': 0.10, 'pts': 9.2, 'reb': 5.8, 'ast': 3.7, 'fg3m': 1.2, 'min': 26.6},
+]
+
+ROSTER = HOME_ROSTER + AWAY_ROSTER
+
+TEAMS = [
+    'ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW',
+    'HOU', 'IND', 'LAC', 'LAL', 'MEM', 'MIA', 'MIL', 'MIN', 'NOP', 'NYK',
+    'OKC', 'ORL', 'PHI', 'PHX', 'POR', 'SAC', 'SAS', 'TOR', 'UTA', 'WAS',
+]
+
+
+def deep_player_stats(player: Dict) -> Dict[str, float]:
+    """DeepMonteCarloEngine input built from a roster entry."""
+    return {
+        'points_ema': player['pts'], 'points_std': player['pts'] * 0.22,
+        'rebounds_ema': player['reb'], 'rebounds_std': player['reb'] * 0.3,
+        'assists_ema': player['ast'], 'assists_std': player['ast'] * 0.3,
+        'threes_ema': player['fg3m'], 'minutes_ema': player['min'],
+        'fg3_pct': player['fg3_pct'], 'fg2_pct': player['fg2_pct'], 'ft_pct': 0.78,
+    }
+
+
+# ============================================================================
+# GAME LOGS
+# ============================================================================
+
+def game_logs(player: Dict, n_games: int = GAMES_PER_PLAYER, seed: int = FIXTURE_SEED) -> List[Dict]:
+    """
+    Synthetic newest-first game logs for one player, in the row shape
+    SovereignRouter returns (pts/reb/ast/fg3m/min aliases included).
+    """
+    rng = np.random.default_rng([seed, int(player['player_id'])])
+    opponents = [t for t in TEAMS if t != player['team']]
+    logs = []
+    for i in range(n_games):
+        game_date = GAME_DATE - timedelta(days=2 * (i + 1))
+        minutes = max(4.0, rng.normal(player['min'], 3.5))
+        scale = minutes / player['min']
+        fg3m = int(rng.poisson(player['fg3m'] * scale))
+        fg3a = fg3m + int(rng.poisson(fg3m * 1.6 + 0.5))
+        pts = max(0, int(round(rng.normal(player['pts'] * scale, max(player['pts'] * 0.25, 1.0)))))
+        fga = max(fg3a, int(round(pts / 1.15)))
+        fgm = min(fga, max(fg3m, int(round(fga * player['fg2_pct'] * 0.9))))
+        fta = int(rng.poisson(max(pts * 0.18, 0.2)))
+        logs.append({
+            'player_id': player['player_id'],
+            'game_id': f"00224{i:05d}",
+            'game_date': game_date.isoformat(),
+            'opponent': opponents[i % len(opponents)],
+            'pts': pts,
+            'reb': int(rng.poisson(player['reb'] * scale)),
+            'ast': int(rng.poisson(player['ast'] * scale)),
+            'stl': int(rng.poisson(0.9)),
+            'blk': int(rng.poisson(0.6)),
+            'tov': int(rng.poisson(1.8)),
+            'fgm': fgm, 'fga': fga,
+            'fg3m': fg3m, 'fg3a': fg3a,
+            'ftm': int(round(fta * 0.78)), 'fta': fta,
+            'min': round(minutes, 1),
+            'plus_minus': int(rng.integers(-15, 16)),
+        })
+    return logs
+
+
+# ============================================================================
+# SQLITE STAND-IN
+# ============================================================================
+
+SCHEMA = """
+CREATE TABLE player_game_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, player_id TEXT NOT NULL, player_name TEXT,
+    game_id TEXT NOT NULL, game_date TEXT, opponent TEXT, minutes REAL, points INTEGER,
+    rebounds INTEGER, assists INTEGER, steals INTEGER, blocks INTEGER, turnovers INTEGER,
+    fg_made INTEGER, fg_attempted INTEGER, fg3_made INTEGER, fg3_attempted INTEGER,
+    ft_made INTEGER, ft_attempted INTEGER, plus_minus INTEGER,
+    UNIQUE(player_id, game_id)
+);
+CREATE INDEX idx_game_logs_player ON player_game_logs(player_id, game_date);
+CREATE TABLE player_rolling_averages (
+    player_id TEXT PRIMARY KEY, player_name TEXT, last_n_games INTEGER,
+    avg_points REAL, avg_rebounds REAL, avg_assists REAL, avg_minutes REAL, trend TEXT
+);
+CREATE TABLE player_bio (player_id TEXT PRIMARY KEY, player_name TEXT, team TEXT, position TEXT);
+CREATE TABLE player_vs_team (
+    player_id TEXT, opponent TEXT, games INTEGER, avg_pts REAL, avg_reb REAL, avg_ast REAL,
+    PRIMARY KEY (player_id, opponent)
+);
+CREATE TABLE team_defense (
+    team_id TEXT PRIMARY KEY, team_abbr TEXT, division TEXT, def_rating REAL, opp_pts REAL,
+    opp_fg_pct REAL, opp_fg3_pct REAL, opp_reb REAL, opp_ast REAL, pace REAL
+);
+CREATE TABLE player_defense_tracking (
+    player_id TEXT PRIMARY KEY, player_name TEXT, d_fg_pct REAL, pct_plusminus REAL
+);
+CREATE TABLE player_hustle (player_id TEXT PRIMARY KEY, contested_shots REAL, deflections REAL);
+CREATE TABLE player_shot_clock (player_id TEXT, team TEXT, clock_range TEXT, fga_freq REAL);
+"""
+
+CLOCK_RANGES = ['22-18 Seconds', '18-15 Seconds', '15-7 Seconds', '7-4 Seconds', '4-0 Very Late']
+
+
+@dataclass(frozen=True)
+class FixtureLeague:
+    """Paths of one generated fixture league."""
+    data_dir: Path
+    db_path: Path
+    logs: Dict[str, List[Dict]]
+
+
+def build_fixture_league(data_dir: Path, seed: int = FIXTURE_SEED) -> FixtureLeague:
+    """
+    Write nba_data.db, game_logs.csv and the per-player freshness files
+    under data_dir - everything the six benchmarked engines read.
+    """
+    data_dir = Path(data_dir)
+    (data_dir / 'players').mkdir(parents=True, exist_ok=True)
+    db_path = data_dir / 'nba_data.db'
+    if db_path.exists():
+        db_path.unlink()
+
+    rng = np.random.default_rng(seed)
+    logs = {p['player_id']: game_logs(p, seed=seed) for p in ROSTER}
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    conn.executemany("""
+        INSERT INTO player_game_logs
+        (player_id, player_name, game_id, game_date, opponent, minutes, points, rebounds, assists,
+         steals, blocks, turnovers, fg_made, fg_attempted, fg3_made, fg3_attempted, ft_made,
+         ft_attempted, plus_minus)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (p['player_id'], p['name'], g['game_id'], g['game_date'], g['opponent'], g['min'], g['pts'],
+         g['reb'], g['ast'], g['stl'], g['blk'], g['tov'], g['fgm'], g['fga'], g['fg3m'], g['fg3a'],
+         g['ftm'], g['fta'], g['plus_minus'])
+        for p in ROSTER for g in logs[p['player_id']]
+    ])
+    conn.executemany("INSERT INTO player_rolling_averages VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [
+        (p['player_id'], p['name'], 15,
+         *(float(np.mean([g[k] for g in logs[p['player_id']][:15]])) for k in ('pts', 'reb', 'ast', 'min')),
+         'stable')
+        for p in ROSTER
+    ])
+    conn.executemany("INSERT INTO player_bio VALUES (?, ?, ?, ?)",
+                     [(p['player_id'], p['name'], p['team'], p['position']) for p in ROSTER])
+    conn.executemany("INSERT INTO player_vs_team VALUES (?, ?, ?, ?, ?, ?)", [
+        (p['player_id'], opp, int(rng.integers(2, 12)),
+         p['pts'] * rng.uniform(0.85, 1.15), p['reb'] * rng.uniform(0.85, 1.15), p['ast'] * rng.uniform(0.85, 1.15))
+        for p in ROSTER for opp in TEAMS if opp != p['team']
+    ])
+    conn.executemany("INSERT INTO team_defense VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+        (str(1610612737 + i), abbr, '', float(rng.uniform(106, 120)), float(rng.uniform(106, 124)),
+         float(rng.uniform(0.44, 0.50)), float(rng.uniform(0.33, 0.39)), float(rng.uniform(41, 47)),
+         float(rng.uniform(23, 29)), float(rng.uniform(95, 104)))
+        for i, abbr in enumerate(TEAMS)
+    ])
+    conn.executemany("INSERT INTO player_defense_tracking VALUES (?, ?, ?, ?)", [
+        (p['player_id'], p['name'], float(rng.uniform(0.40, 0.50)), float(rng.uniform(-4, 4))) for p in ROSTER
+    ])
+    conn.executemany("INSERT INTO player_hustle VALUES (?, ?, ?)", [
+        (p['player_id'], float(rng.uniform(3, 10)), float(rng.uniform(0.5, 3))) for p in ROSTER
+    ])
+    conn.executemany("INSERT INTO player_shot_clock VALUES (?, ?, ?, ?)", [
+        (p['player_id'], p['team'], clock, float(freq))
+        for p in ROSTER for clock, freq in zip(CLOCK_RANGES, rng.dirichlet(np.ones(len(CLOCK_RANGES))))
+    ])
+    conn.commit()
+    conn.close()
+
+    with open(data_dir / 'game_logs.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['PLAYER_ID', 'GAME_DATE', 'PTS', 'REB', 'AST'])
+        for player_id, player_logs in logs.items():
+            for g in player_logs:
+                writer.writerow([player_id, g['game_date'], g['pts'], g['reb'], g['ast']])
+
+    # SovereignRouter's freshness gate keys off these files; present + recent = FRESH
+    for player_id in logs:
+        (data_dir / 'players' / f"{player_id}_games.csv").write_text('fixture\n', encoding='utf-8')
+
+    return FixtureLeague(data_dir=data_dir, db_path=db_path, logs=logs)
+
+
+@contextlib.contextmanager
+def league_singletons(db_path: Path) -> Iterator[None]:
+    """
+    Point the process-wide singletons the engines reach for (team context
+    store default path, defense friction module, injury worker) at the
+    fixture database for the duration of a run, then restore them.
+    """
+    import engines.defense_friction_module as friction
+    import services.automated_injury_worker as injuries
+    import services.team_context_store as team_context
+
+    saved = (team_context._default_db_path, team_context._stores, friction._module, injuries._worker)
+    team_context._default_db_path = lambda: Path(db_path)
+    team_context._stores = {}
+    friction._module = friction.DefenseFrictionModule(db_path=str(db_path))
+    injuries._worker = injuries.AutomatedInjuryWorker(db_path=str(db_path))
+    try:
+        yield
+    finally:
+        team_context._default_db_path, team_context._stores, friction._module, injuries._worker = saved
@@ -0,0 +1,287 @@
+"""
+Benchmark Harness
+=================
+Times a callable under a fixed seed and records:
+
+- p50 / p99 / mean latency per call (ms)
+- throughput in the case's own unit (sims/sec, players/sec, ...)
+- peak traced memory of one call (tracemalloc, run untimed)
+- a result fingerprint, so a faster engine that quietly changed its
+  output shows up as drift rather than as a win
+
+Results are compared against a JSON baseline; anything slower / heavier
+than the baseline by more than the tolerance is reported as a regression.
+"""
+
+import gc
+import json
+import platform
+import random
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+BASELINE_VERSION = 1
+DEFAULT_TOLERANCE = 0.25          # latency / throughput
+DEFAULT_MEMORY_TOLERANCE = 0.20
+FINGERPRINT_TOLERANCE = 1e-6
+
+
+# ============================================================================
+# CASES AND RESULTS
+# ============================================================================
+
+@dataclass
+class BenchCase:
+    """
+    One benchmarked call.
+
+    fn(seed) runs the workload once and returns a float fingerprint of its
+    output. units is how many sims / players / games one call processes.
+    """
+    name: str
+    fn: Callable[[int], float]
+    units: int = 1
+    unit: str = "calls"
+    iterations: int = 10
+    warmup: int = 1
+    teardown: Optional[Callable[[], None]] = None
+
+
+@dataclass
+class BenchResult:
+    name: str
+    iterations: int
+    units: int
+    unit: str
+    p50_ms: float
+    p99_ms: float
+    mean_ms: float
+    throughput: float
+    peak_kb: float
+    fingerprint: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change_pct(self) -> float:
+        if not self.baseline:
+            return 0.0
+        return (self.current - self.baseline) / self.baseline * 100
+
+    def __str__(self) -> str:
+        return (f"{self.name}.{self.metric}: {self.baseline:.4g} -> {self.current:.4g} "
+                f"({self.change_pct:+.1f}%)")
+
+
+@dataclass
+class Comparison:
+    regressions: List[Regression] = field(default_factory=list)
+    improvements: List[Regression] = field(default_factory=list)
+    drift: List[Regression] = field(default_factory=list)
+    new_cases: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.regressions and not self.drift
+
+
+def percentile(samples: List[float], q: float) -> float:
+    return float(np.percentile(np.asarray(samples), q)) if samples else 0.0
+
+
+def seed_everything(seed: int):
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def measure(case: BenchCase, seed: int = 42, iterations: Optional[int] = None,
+            trace_memory: bool = True) -> BenchResult:
+    """
+    Run a case: warmup calls, then timed calls (each reseeded so every call
+    does identical work), then one untimed call under tracemalloc.
+    """
+    iterations = iterations or case.iterations
+    for _ in range(case.warmup):
+        seed_everything(seed)
+        case.fn(seed)
+
+    samples = []
+    fingerprint = 0.0
+    gc_was_enabled = gc.isenabled()
+    try:
+        for i in range(iterations):
+            seed_everything(seed)
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            value = case.fn(seed)
+            samples.append((time.perf_counter() - start) * 1000)
+            if gc_was_enabled:
+                gc.enable()
+            if i == 0:
+                fingerprint = float(value or 0.0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    peak_kb = 0.0
+    if trace_memory:
+        seed_everything(seed)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            case.fn(seed)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_kb = peak / 1024
+
+    mean_ms = float(np.mean(samples))
+    return BenchResult(
+        name=case.name,
+        iterations=iterations,
+        units=case.units,
+        unit=case.unit,
+        p50_ms=round(percentile(samples, 50), 3),
+        p99_ms=round(percentile(samples, 99), 3),
+        mean_ms=round(mean_ms, 3),
+        throughput=round(case.units / (mean_ms / 1000), 2) if mean_ms > 0 else 0.0,
+        peak_kb=round(peak_kb, 1),
+        fingerprint=round(fingerprint, 6),
+    )
+
+
+def run_cases(cases: List[BenchCase], seed: int = 42, iterations: Optional[int] = None,
+              trace_memory: bool = True, on_result: Optional[Callable[[BenchResult], None]] = None
+              ) -> List[BenchResult]:
+    results = []
+    for case in cases:
+        try:
+            result = measure(case, seed=seed, iterations=iterations, trace_memory=trace_memory)
+        finally:
+            if case.teardown:
+                case.teardown()
+        results.append(result)
+        if on_result:
+            on_result(result)
+    return results
+
+
+# ============================================================================
+# BASELINES
+# ============================================================================
+
+def environment() -> Dict[str, str]:
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor() or platform.machine(),
+        'system': platform.system(),
+    }
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path: Path, results: List[BenchResult], profile: str, seed: int,
+                  existing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Write results under baseline['profiles'][profile], keeping other profiles."""
+    baseline = dict(existing or {})
+    profiles = dict(baseline.get('profiles', {}))
+    cases = dict(profiles.get(profile, {}).get('cases', {}))
+    cases.update({r.name: r.to_dict() for r in results})
+    profiles[profile] = {
+        'seed': seed,
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'cases': dict(sorted(cases.items())),
+    }
+    baseline.update({'version': BASELINE_VERSION, 'profiles': profiles})
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+    tmp.replace(path)
+    return baseline
+
+
+def compare(results: List[BenchResult], baseline: Dict[str, Any], profile: str,
+            tolerance: float = DEFAULT_TOLERANCE,
+            memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE) -> Comparison:
+    """
+    Compare a run against the stored profile. Latency (p50, p99) and peak
+    memory regress when they grow past tolerance; throughput when it drops
+    past it. p99 gets double the tolerance since it is one or two samples.
+    """
+    recorded = baseline.get('profiles', {}).get(profile, {}).get('cases', {})
+    out = Comparison()
+
+    for result in results:
+        base = recorded.get(result.name)
+        if not base:
+            out.new_cases.append(result.name)
+            continue
+
+        if base.get('units') == result.units and \
+                abs(base.get('fingerprint', 0.0) - result.fingerprint) > FINGERPRINT_TOLERANCE:
+            out.drift.append(Regression(result.name, 'fingerprint', base['fingerprint'], result.fingerprint))
+
+        checks = [
+            ('p50_ms', 1 + tolerance, True),
+            ('p99_ms', 1 + 2 * tolerance, True),
+            ('throughput', 1 / (1 + tolerance), False),
+            ('peak_kb', 1 + memory_tolerance, True),
+        ]
+        for metric, limit, higher_is_worse in checks:
+            old, new = base.get(metric), getattr(result, metric)
+            if not old:
+                continue
+            entry = Regression(result.name, metric, old, new)
+            if higher_is_worse:
+                if new > old * limit:
+                    out.regressions.append(entry)
+                elif metric != 'peak_kb' and new < old / (1 + tolerance):
+                    out.improvements.append(entry)
+            else:
+                if new < old * limit:
+                    out.regressions.append(entry)
+                elif new > old * (1 + tolerance):
+                    out.improvements.append(entry)
+    return out
+
+
+def format_results(results: List[BenchResult]) -> str:
+    header = f"{'case':<28} {'p50 ms':>10} {'p99 ms':>10} {'throughput':>18} {'peak KB':>10}"
+    lines = [header, '-' * len(header)]
+    for r in results:
+        lines.append(f"{r.name:<28} {r.p50_ms:>10.2f} {r.p99_ms:>10.2f} "
+                     f"{r.throughput:>10,.0f} {r.unit + '/s':<7} {r.peak_kb:>10,.0f}")
+    return '\n'.join(lines)
@@ -15,6 +15,8 @@ from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 
+from services.team_context_store import get_team_context_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -83,8 +85,9 @@ class DefenseFrictionModule:
         if db_path is None:
             db_path = Path(__file__).parent.parent / 'data' / 'nba_data.db'
         self.db_path = str(db_path)
+        self._teams = get_team_context_store(self.db_path)
         self._defender_cache: Dict[str, DefenderProfile] = {}
-        self._pace_cache: Dict[str, TeamPaceProfile] = {}
+        self._pace_cache: Dict[str, Tuple[int, TeamPaceProfile]] = {}
     
     def _get_connection(self) -> sqlite3.Connection:
         conn = sqlite3.connect(self.db_path, timeout=30)
@@ -137,50 +140,26 @@ class DefenseFrictionModule:
     
     def get_team_pace_profile(self, team_abbr: str) -> Optional[TeamPaceProfile]:
         """Get team's shot clock distribution for temporal pacing"""
-        team_abbr = team_abbr.upper()
-        
-        if team_abbr in self._pace_cache:
-            return self._pace_cache[team_abbr]
+        snapshot = self._teams.snapshot()
+        team_abbr = snapshot.resolve(team_abbr)
+        cached = self._pace_cache.get(team_abbr)
+        if cached is not None and cached[0] == snapshot.version:
+            return cached[1]
         
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            # Get base pace
-            cursor.execute("""
-                SELECT pace FROM team_defense WHERE team_abbr = ?
-            """, (team_abbr,))
-            pace_row = cursor.fetchone()
-            pace = float(pace_row['pace']) if pace_row else 100.0
-            
-            # Get shot clock distribution (from player averages for that team)
-            # This is aggregated from player_shot_clock data
-            cursor.execute("""
-                SELECT clock_range, AVG(fga_freq) as avg_freq
-                FROM player_shot_clock
-                WHERE team = ?
-                GROUP BY clock_range
-            """, (team_abbr,))
-            
-            clock_data = {row['clock_range']: float(row['avg_freq'] or 0) for row in cursor.fetchall()}
-            conn.close()
-            
-            profile = TeamPaceProfile(
-                team_abbr=team_abbr,
-                pace=pace,
-                early_clock_freq=clock_data.get('22-18 Seconds', 0) + clock_data.get('18-15 Seconds', 0),
-                mid_clock_freq=clock_data.get('15-7 Seconds', 0),
-                late_clock_freq=clock_data.get('7-4 Seconds', 0),
-                very_late_freq=clock_data.get('4-0 Very Late', 0) + clock_data.get('0-4 Seconds', 0),
-            )
-            
-            self._pace_cache[team_abbr] = profile
-            return profile
-            
-        except Exception as e:
-            logger.warning(f"Error fetching pace profile: {e}")
+        # Base pace plus shot clock distribution aggregated from player_shot_clock,
+        # both read once for all teams by the shared team context store
+        clock_data = snapshot.clock_distribution.get(team_abbr, {})
+        profile = TeamPaceProfile(
+            team_abbr=team_abbr,
+            pace=snapshot.pace.get(team_abbr, 100.0),
+            early_clock_freq=clock_data.get('22-18 Seconds', 0) + clock_data.get('18-15 Seconds', 0),
+            mid_clock_freq=clock_data.get('15-7 Seconds', 0),
+            late_clock_freq=clock_data.get('7-4 Seconds', 0),
+            very_late_freq=clock_data.get('4-0 Very Late', 0) + clock_data.get('0-4 Seconds', 0),
+        )
         
-        return None
+        self._pace_cache[team_abbr] = (snapshot.version, profile)
+        return profile
     
     def apply_defender_friction(
         self,
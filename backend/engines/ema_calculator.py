@@ -15,7 +15,7 @@ Result: ~6x more weight on recent games vs simple average.
 """
 
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -93,6 +93,45 @@ class EMACalculator:
         
         return ema
     
+    def prior_windows(self, values: np.ndarray, lookback: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        EMA and std "as of" every game in one vectorized pass.
+        
+        Row i covers values[max(0, i - lookback):i] - the games before game i,
+        exactly what calculate() sees when handed that window - so a replay
+        gets every pre-game baseline for a player without re-running the
+        recurrence per game. Row 0 (no history) is NaN.
+        
+        Args:
+            values: One stat, ordered oldest-first
+            lookback: Window length (games)
+            
+        Returns:
+            (ema, std) arrays of len(values) + 1; the last row is the
+            baseline going into the next, unplayed game
+        """
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        window = np.minimum(np.arange(n + 1), lookback)
+        start = np.arange(n + 1) - window
+        
+        ema = np.full(n + 1, np.nan)
+        std = np.full(n + 1, np.nan)
+        if n == 0:
+            return ema, std
+        
+        # Same recurrence (and float op order) as _compute_ema, stepped once
+        # per window position across every game at the same time
+        ema[1:] = values[start[1:]]
+        for j in range(1, lookback):
+            active = j < window
+            x = values[np.minimum(start + j, n - 1)]
+            ema = np.where(active, self.alpha * x + (1 - self.alpha) * ema, ema)
+        
+        std[1:] = [float(np.std(values[s:s + m])) if m > 1 else 0.0
+                   for s, m in zip(start[1:], window[1:])]
+        return ema, std
+    
     def _default_baselines(self) -> Dict[str, float]:
         """Return league-average baselines when no data available"""
         return {
@@ -4,16 +4,20 @@ Model Auto-Tuner
 Compares Crucible projections to actual box scores.
 Triggers hyperparameter re-calibration if MAE > 3.5.
 
+The audit is set-based: one projection_log / game_logs join per slate,
+errors and MAE computed over NumPy arrays.
+
 Schedule: Daily at 4:00 AM
 """
 import sqlite3
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass
-import statistics
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +54,14 @@ class ModelAutoTuner:
     """
     
     MAE_THRESHOLD = 3.5  # Trigger recalibration if MAE > 3.5
+    WORST_MISSES = 10
+    
+    # (stat, projection_log column, game_logs column) audited per projection
+    AUDITED_STATS = (
+        ('points', 'proj_points', 'pts'),
+        ('rebounds', 'proj_rebounds', 'reb'),
+        ('assists', 'proj_assists', 'ast'),
+    )
     
     def __init__(self, db_path: Optional[str] = None):
         if db_path is None:
@@ -119,20 +131,44 @@ class ModelAutoTuner:
         proj_threes: float = 0
     ):
         """Log a projection for later audit"""
-        conn = self._get_connection()
+        self.log_projections([{
+            'player_id': player_id, 'player_name': player_name,
+            'game_date': game_date, 'opponent': opponent,
+            'proj_points': proj_points, 'proj_rebounds': proj_rebounds,
+            'proj_assists': proj_assists, 'proj_threes': proj_threes,
+        }])
+    
+    def log_projections(self, projections: Iterable[Dict]) -> int:
+        """
+        Log a slate of projections in one transaction.
         
-        conn.execute("""
-            INSERT INTO projection_log
-            (player_id, player_name, game_date, opponent,
-             proj_points, proj_rebounds, proj_assists, proj_threes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            str(player_id), player_name, game_date, opponent,
-            proj_points, proj_rebounds, proj_assists, proj_threes
-        ))
+        Each dict carries the log_projection keyword arguments.
+        Returns the number of rows written.
+        """
+        rows = [
+            (
+                str(p['player_id']), p.get('player_name'), p['game_date'], p.get('opponent'),
+                p.get('proj_points'), p.get('proj_rebounds'), p.get('proj_assists'),
+                p.get('proj_threes', 0)
+            )
+            for p in projections
+        ]
+        if not rows:
+            return 0
         
-        conn.commit()
-        conn.close()
+        conn = self._get_connection()
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT INTO projection_log
+                    (player_id, player_name, game_date, opponent,
+                     proj_points, proj_rebounds, proj_assists, proj_threes)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+        finally:
+            conn.close()
+        
+        return len(rows)
     
     def get_actual_stats(self, player_id: str, game_date: str) -> Optional[Dict]:
         """Get actual stats from game logs"""
@@ -168,83 +204,50 @@ class ModelAutoTuner:
         
         logger.info(f"Running daily audit for {audit_date}")
         
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Get all projections for that date
-        cursor.execute("""
-            SELECT player_id, player_name, opponent,
-                   proj_points, proj_rebounds, proj_assists, proj_threes
-            FROM projection_log
-            WHERE game_date = ?
-        """, (audit_date,))
+        rows = self._fetch_audit_rows(audit_date)
         
-        projections = cursor.fetchall()
-        conn.close()
-        
-        audits = []
-        points_errors = []
-        reb_errors = []
-        ast_errors = []
-        
-        for proj in projections:
-            actual = self.get_actual_stats(proj['player_id'], audit_date)
-            
-            if actual:
-                # Points
-                pts_error = abs(proj['proj_points'] - actual['points'])
-                points_errors.append(pts_error)
-                audits.append(ProjectionAudit(
-                    player_id=proj['player_id'],
-                    player_name=proj['player_name'],
-                    stat='points',
-                    projected=proj['proj_points'],
-                    actual=actual['points'],
-                    error=pts_error,
-                    game_date=audit_date,
-                ))
-                
-                # Rebounds
-                reb_error = abs(proj['proj_rebounds'] - actual['rebounds'])
-                reb_errors.append(reb_error)
-                audits.append(ProjectionAudit(
-                    player_id=proj['player_id'],
-                    player_name=proj['player_name'],
-                    stat='rebounds',
-                    projected=proj['proj_rebounds'],
-                    actual=actual['rebounds'],
-                    error=reb_error,
-                    game_date=audit_date,
-                ))
-                
-                # Assists
-                ast_error = abs(proj['proj_assists'] - actual['assists'])
-                ast_errors.append(ast_error)
-                audits.append(ProjectionAudit(
-                    player_id=proj['player_id'],
-                    player_name=proj['player_name'],
-                    stat='assists',
-                    projected=proj['proj_assists'],
-                    actual=actual['assists'],
-                    error=ast_error,
-                    game_date=audit_date,
-                ))
+        # Projections without a box score (DNP, postponed) count toward the
+        # slate but not toward the error
+        matched = [row for row in rows if row['matched']]
+        if matched:
+            projected = np.array(
+                [[row[proj_col] for _, proj_col, _ in self.AUDITED_STATS] for row in matched], dtype=float
+            )
+            actual = np.array(
+                [[row[log_col] or 0 for _, _, log_col in self.AUDITED_STATS] for row in matched], dtype=float
+            )
+        else:
+            projected = actual = np.empty((0, len(self.AUDITED_STATS)))
+        errors = np.abs(projected - actual)
         
         # Calculate MAE
-        mae_points = statistics.mean(points_errors) if points_errors else 0
-        mae_rebounds = statistics.mean(reb_errors) if reb_errors else 0
-        mae_assists = statistics.mean(ast_errors) if ast_errors else 0
-        
-        overall_mae = statistics.mean(points_errors + reb_errors + ast_errors) if audits else 0
-        
-        # Get worst misses
-        audits.sort(key=lambda x: x.error, reverse=True)
-        worst_misses = audits[:10]
+        if len(matched):
+            mae_points, mae_rebounds, mae_assists = (float(m) for m in errors.mean(axis=0))
+            overall_mae = float(errors.mean())
+        else:
+            mae_points = mae_rebounds = mae_assists = overall_mae = 0
+        
+        # Get worst misses (stable: ties keep projection, then stat, order)
+        flat = errors.ravel()
+        worst_misses = []
+        for i in np.argsort(-flat, kind='stable')[:self.WORST_MISSES]:
+            row_idx, stat_idx = divmod(int(i), len(self.AUDITED_STATS))
+            row = matched[row_idx]
+            stat, proj_col, log_col = self.AUDITED_STATS[stat_idx]
+            worst_misses.append(ProjectionAudit(
+                player_id=row['player_id'],
+                player_name=row['player_name'],
+                stat=stat,
+                projected=row[proj_col],
+                actual=row[log_col] or 0,
+                error=float(flat[i]),
+                game_date=audit_date,
+            ))
         
         # Create report
         report = DriftReport(
             audit_date=audit_date,
-            total_projections=len(projections),
+            total_projections=len(rows),
             mae_points=round(mae_points, 2),
             mae_rebounds=round(mae_rebounds, 2),
             mae_assists=round(mae_assists, 2),
@@ -265,6 +268,34 @@ class ModelAutoTuner:
         
         return report
     
+    def _fetch_audit_rows(self, audit_date: str) -> List[sqlite3.Row]:
+        """
+        Every projection logged for audit_date joined to its box score, in
+        one query. `matched` is 0 where the player has no game log.
+        """
+        stat_cols = ', '.join(f"g.{log_col}" for _, _, log_col in self.AUDITED_STATS)
+        conn = self._get_connection()
+        try:
+            # One log row per player (bare columns follow MIN(rowid)): mirrors
+            # get_actual_stats' first match
+            return conn.execute(f"""
+                SELECT p.player_id, p.player_name, p.opponent,
+                       p.proj_points, p.proj_rebounds, p.proj_assists, p.proj_threes,
+                       {stat_cols}, g.player_id IS NOT NULL AS matched
+                FROM projection_log p
+                LEFT JOIN (
+                    SELECT player_id, MIN(rowid) AS first_row,
+                           {', '.join(c for _, _, c in self.AUDITED_STATS)}
+                    FROM game_logs
+                    WHERE game_date = ?
+                    GROUP BY player_id
+                ) g ON g.player_id = p.player_id
+                WHERE p.game_date = ?
+                ORDER BY p.id
+            """, (audit_date, audit_date)).fetchall()
+        finally:
+            conn.close()
+    
     def _save_drift_report(self, report: DriftReport):
         """Save drift report to database"""
         conn = self._get_connection()
@@ -12,7 +12,7 @@ Features:
 
 import numpy as np
 from numpy.random import default_rng
-from typing import Dict, List, Optional, Protocol, Any
+from typing import Dict, List, Optional, Protocol, Any, Sequence, Tuple
 from dataclasses import dataclass
 import logging
 
@@ -235,17 +235,13 @@ class VertexMonteCarloEngine:
         ceiling = {}
         
         # Dynamic percentile thresholds based on volatility
-        if volatility_factor > 1.2:
-            floor_pct, ceil_pct = 15, 85  # Wider bands for volatile players
-        elif volatility_factor < 0.8:
-            floor_pct, ceil_pct = 25, 75  # Narrower bands for consistent players
-        else:
-            floor_pct, ceil_pct = 20, 80  # Standard bands
+        floor_pct, ceil_pct = self.band_percentiles(volatility_factor)
         
         for stat, values in simulations.items():
-            floor[stat] = round(float(np.percentile(values, floor_pct)), 1)
+            low, high = np.percentile(values, [floor_pct, ceil_pct])  # one sort for both
+            floor[stat] = round(float(low), 1)
             expected[stat] = round(float(np.mean(values)), 1)
-            ceiling[stat] = round(float(np.percentile(values, ceil_pct)), 1)
+            ceiling[stat] = round(float(high), 1)
         
         return ProjectionMatrix(
             floor_20th=floor,
@@ -254,6 +250,41 @@ class VertexMonteCarloEngine:
             simulations=simulations
         )
     
+    @staticmethod
+    def band_percentiles(volatility_factor: float = 1.0) -> Tuple[int, int]:
+        """Floor / ceiling percentiles for a volatility factor"""
+        if volatility_factor > 1.2:
+            return 15, 85  # Wider bands for volatile players
+        elif volatility_factor < 0.8:
+            return 25, 75  # Narrower bands for consistent players
+        return 20, 80  # Standard bands
+    
+    @staticmethod
+    def volatility_from_points(points: Sequence[float]) -> float:
+        """
+        Volatility factor from recent points (newest-first, last 15 used).
+        
+        Coefficient of variation scaled into 0.7-1.5:
+        CV of 0.2 = consistent (vol=0.8), CV of 0.5 = volatile (vol=1.4).
+        Needs 5+ games; otherwise 1.0.
+        """
+        if len(points) < 5:
+            return 1.0
+        pts_values = list(points[:15])
+        pts_mean = sum(pts_values) / len(pts_values)
+        if pts_mean <= 0:
+            return 1.0
+        pts_std = (sum((x - pts_mean) ** 2 for x in pts_values) / len(pts_values)) ** 0.5
+        cv = pts_std / pts_mean
+        return max(0.7, min(1.5, 0.8 + (cv * 1.2)))
+    
+    @staticmethod
+    def minutes_modifier(minutes_ema: float, baseline_minutes: float = 32.0) -> float:
+        """Expected-minutes scaling vs a starter's baseline, clamped to 0.5-1.3"""
+        if minutes_ema <= 0:
+            return 1.0
+        return max(0.5, min(1.3, minutes_ema / baseline_minutes))
+    
     def probability_of_hit(
         self,
         simulations: np.ndarray,
@@ -260,6 +260,13 @@ class NBAGameLogFetcher:
         if not data:
             return []
         
+        players = self.parse_player_list(data)
+        print(f"   ✅ Found {len(players)} players")
+        return players
+    
+    @classmethod
+    def parse_player_list(cls, data: dict) -> List[Dict]:
+        """leaguedashplayerstats response -> [{player_id, name, team}]"""
         headers = data['resultSets'][0]['headers']
         rows = data['resultSets'][0]['rowSet']
         
@@ -269,10 +276,8 @@ class NBAGameLogFetcher:
             players.append({
                 'player_id': str(player.get('PLAYER_ID', '')),
                 'name': player.get('PLAYER_NAME', ''),
-                'team': self.TEAMS.get(player.get('TEAM_ID'), 'UNK'),
+                'team': cls.TEAMS.get(player.get('TEAM_ID'), 'UNK'),
             })
-        
-        print(f"   ✅ Found {len(players)} players")
         return players
     
     def get_player_game_log(self, player_id: str, player_name: str) -> List[Dict]:
@@ -287,7 +292,11 @@ class NBAGameLogFetcher:
         data = self.make_request(url, params)
         if not data:
             return []
-        
+        return self.parse_game_log(data, player_id, player_name, self.games_per_player)
+    
+    @staticmethod
+    def parse_game_log(data: dict, player_id: str, player_name: str, limit: int) -> List[Dict]:
+        """playergamelog response -> last `limit` game dicts"""
         try:
             headers = data['resultSets'][0]['headers']
             rows = data['resultSets'][0]['rowSet']
@@ -295,7 +304,7 @@ class NBAGameLogFetcher:
             return []
         
         games = []
-        for row in rows[:self.games_per_player]:  # Limit to last N games
+        for row in rows[:limit]:  # Limit to last N games
             game = dict(zip(headers, row))
             
             # Parse matchup to get opponent
@@ -347,7 +356,11 @@ class NBAGameLogFetcher:
         data = self.make_request(url, params)
         if not data:
             return None
-        
+        return self.parse_player_bio(data, player_id, player_name)
+    
+    @staticmethod
+    def parse_player_bio(data: dict, player_id: str, player_name: str) -> Optional[Dict]:
+        """commonplayerinfo response -> bio dict"""
         try:
             headers = data['resultSets'][0]['headers']
             row = data['resultSets'][0]['rowSet'][0]
@@ -401,28 +414,29 @@ class NBAGameLogFetcher:
     
     def save_player_bio(self, bio: Dict):
         """Save player bio to database"""
-        if not bio:
-            return
-        
+        if bio:
+            self.save_player_bios([bio])
+    
+    def save_player_bios(self, bios: List[Dict]) -> int:
+        """Save many player bios in one transaction"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
+        now = datetime.now().isoformat()
+        conn.executemany("""
             INSERT OR REPLACE INTO player_bio
             (player_id, player_name, team, position, height, height_inches,
              weight, birthdate, age, country, college, draft_year, draft_round,
              draft_pick, years_experience, jersey_number, headshot_url, updated_at)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        """, [(
             bio['player_id'], bio['player_name'], bio['team'], bio['position'],
             bio['height'], bio['height_inches'], bio['weight'], bio['birthdate'],
             bio['age'], bio['country'], bio['college'], bio['draft_year'],
             bio['draft_round'], bio['draft_pick'], bio['years_experience'],
-            bio['jersey_number'], bio['headshot_url'], datetime.now().isoformat()
-        ))
-        
+            bio['jersey_number'], bio['headshot_url'], now
+        ) for bio in bios])
         conn.commit()
         conn.close()
+        return len(bios)
     
     def save_games_to_db(self, games: List[Dict]) -> int:
         """Save games to database (APPEND ONLY - no overwrite)"""
@@ -456,6 +456,11 @@ class TeamDefenseFetcher:
         # Step 5: Calculate player vs team from game logs
         self.calculate_player_vs_team()
         
+        # Step 6: Tell running engines (TeamContextStore) to reload
+        if saved > 0:
+            from services.team_context_store import bump_team_context_version
+            bump_team_context_version(self.db_path, source="fetch_team_defense")
+        
         # Summary
         print("\n" + "="*60)
         if saved > 0:
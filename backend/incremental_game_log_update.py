@@ -311,6 +311,14 @@ class IncrementalGameLogUpdater:
                 results['errors'] += 1
                 print(f"   ❌ {result.get('error', 'Unknown error')}")
         
+        # Fold the new logs into player × opponent H2H aggregates
+        if results['new_games'] > 0:
+            try:
+                from services.h2h_materializer import H2HMaterializer
+                results['h2h'] = H2HMaterializer(self.db_path).refresh()
+            except Exception as e:
+                logger.warning(f"H2H materialization failed: {e}")
+        
         return results
 
 
@@ -15,8 +15,10 @@ Environment:
   - GOOGLE_APPLICATION_CREDENTIALS: Mounted via Secret Manager
 """
 import asyncio
+import importlib
 import logging
 import os
+import sys
 
 # Enable gRPC fork support to prevent child processes from segfaulting
 # when uvicorn forks workers or reloader processes.
@@ -26,6 +28,7 @@ from datetime import datetime
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 # Configure logging for Cloud Run (MUST BE FIRST)
 logging.basicConfig(
@@ -80,56 +83,115 @@ except ImportError as e:
     def is_otel_ok(): return False
 
 
-# Import cloud-native pulse producer (graceful fallback)
-try:
-    from services.async_pulse_producer_cloud import start_cloud_producer, stop_cloud_producer, get_cloud_producer
-    PRODUCER_AVAILABLE = True
-except ImportError as e:
-    logger.warning(f"⚠️ Cloud producer not available: {e}")
-    PRODUCER_AVAILABLE = False
-
-# Import admin routes for database management
-try:
-    from api.admin_routes import router as admin_router
-    ADMIN_ROUTES_AVAILABLE = True
-    logger.info("✅ Admin routes imported successfully")
-except ImportError as e:
-    import traceback
-    logger.error(f"❌ Admin routes not available: {e}")
-    logger.error(f"Full traceback:\n{traceback.format_exc()}")
-    ADMIN_ROUTES_AVAILABLE = False
-
-# Import public API routes
-try:
-    from api.public_routes import router as public_router
-    PUBLIC_ROUTES_AVAILABLE = True
-    logger.info("✅ Public routes imported successfully")
-except ImportError as e:
-    import traceback
-    logger.error(f"❌ Public routes not available: {e}")
-    logger.error(f"Full traceback:\n{traceback.format_exc()}")
-    PUBLIC_ROUTES_AVAILABLE = False
+# ── Deferred routers & services (cold start) ─────────────────────────────────
+# Importing every router up front pulled pandas, firebase_admin, google-genai
+# and the Vanguard AI stack into each Cloud Run cold start. Only the live
+# pulse routers are imported here; the rest are LazyRouters, imported on the
+# first request under their paths or by the warm-up task once the instance is
+# serving (app/warmup.py). List order = registration order = route precedence.
+from app.warmup import AppWarmup, LazyRouter, WarmService
 
 # Nexus routes disabled (uses SQL - will convert later)
 NEXUS_ROUTES_AVAILABLE = False
 # Database diagnostics removed - using Firestore now
 DIAGNOSTICS_AVAILABLE = False
 
-# ── Live SSE stream router (/live/stream) ────────────────────────────────────
-# The frontend Pulse page opens an EventSource to /live/stream.
-# This router bridges the CloudAsyncPulseProducer in-memory snapshot to clients.
-try:
-    from api.live_stream_routes import router as live_stream_router
-    LIVE_STREAM_AVAILABLE = True
-    logger.info("✅ Live stream routes imported successfully")
-except ImportError as e:
-    logger.warning(f"⚠️ Live stream routes not available: {e}")
-    LIVE_STREAM_AVAILABLE = False
-except Exception as e:
-    import traceback
-    logger.error(f"❌ Live stream routes not available: {e}")
-    logger.error(f"Full traceback:\n{traceback.format_exc()}")
-    LIVE_STREAM_AVAILABLE = False
+LAZY_ROUTERS = [
+    # Admin routes for database management
+    LazyRouter("api.admin_routes", name="admin", paths=("/admin",)),
+    # Public routes at bare paths (/teams, /players, etc.)
+    # NOTE: /public/* aliases are defined directly in public_routes.py
+    LazyRouter("api.public_routes", name="public", paths=(
+        "/public", "/teams", "/players", "/player", "/roster", "/injuries", "/schedule",
+        "/matchup", "/matchup-lab", "/analyze", "/settings", "/game-dates", "/game-logs",
+        "/boxscore", "/debug", "/api/game-logs", "/api/insights",
+    )),
+    # Live SSE stream (/live/stream) — bridges the CloudAsyncPulseProducer
+    # snapshot to the Pulse page. MUST have no prefix — frontend hardcodes it.
+    LazyRouter("api.live_stream_routes", name="live_stream", eager=True),
+    LazyRouter("api.injury_admin", name="admin_injury", paths=("/admin/injuries",)),
+    LazyRouter("nexus", name="nexus", paths=("/nexus",)),
+    LazyRouter("api.game_logs_routes", name="game_logs",
+               paths=("/api/game-logs", "/api/box-scores", "/api/insights")),
+    LazyRouter("api.h2h_population_routes", name="h2h", paths=("/api/h2h",)),
+    # Aegis router (AI Analysis / Simulations)
+    LazyRouter("app.routers.aegis", name="aegis", prefix="/aegis", tags=("Aegis AI",)),
+    LazyRouter("app.routers.live_pulse", name="live_pulse", prefix="/pulse", tags=("Live Pulse",), eager=True),
+    # Phase 8: WebSocket full-duplex + Presence + Annotations
+    LazyRouter("api.websocket_routes", name="websocket", eager=True),
+    # Phase 3 (NBA Play-By-Play): Play-By-Play Pipeline routes
+    LazyRouter("api.play_by_play_routes", name="play_by_play", paths=("/v1/games",)),
+    # Data routes — migrated endpoints from legacy server.py
+    LazyRouter("api.data_routes", name="data", paths=(
+        "/data", "/players", "/matchup", "/player-data", "/player-shots", "/radar", "/aegis",
+        "/explain", "/api/box-scores", "/api/today", "/api/live",
+    )),
+]
+
+# Vanguard API routers — each independent, a failure in one never blocks others.
+# The health router is non-critical and only attempted with the Vanguard core.
+_VANGUARD_ROUTERS = [
+    LazyRouter("vanguard.api.admin_routes", name="vanguard_admin", paths=("/vanguard",)),
+    LazyRouter("vanguard.api.cron_routes", name="vanguard_cron", paths=("/vanguard",)),
+    LazyRouter("vanguard.api.vaccine_routes", name="vanguard_vaccine", paths=("/vanguard",)),
+    LazyRouter("vanguard.api.surgeon_routes", name="vanguard_surgeon", paths=("/vanguard",)),
+    # FULL_SOVEREIGN Promotion Gate (Phase 5)
+    LazyRouter("vanguard.sovereign.promotion_gate", name="vanguard_promotion", paths=("/vanguard",)),
+]
+if VANGUARD_AVAILABLE:
+    LAZY_ROUTERS.append(LazyRouter("vanguard.api.health", name="vanguard_health", paths=("/vanguard",)))
+LAZY_ROUTERS.extend(_VANGUARD_ROUTERS)
+
+
+PRODUCER_MODULE = "services.async_pulse_producer_cloud"
+
+
+def _producer_module():
+    """
+    Cloud pulse producer module once warm-up has imported it, else None.
+
+    Never imports on the request path: the module pulls in pandas/firebase,
+    so importing from an async handler would block the event loop (or wait
+    on the import lock held by the warm-up thread) on a cold instance.
+    """
+    if _PRODUCER_SERVICE.state == "pending":
+        return None
+    return sys.modules.get(PRODUCER_MODULE)
+
+
+async def _import_off_loop(module: str):
+    return await asyncio.to_thread(importlib.import_module, module)
+
+
+async def _start_cloud_producer():
+    producer = await _import_off_loop(PRODUCER_MODULE)
+    await producer.start_cloud_producer()
+
+
+async def _stop_cloud_producer():
+    from services.async_pulse_producer_cloud import stop_cloud_producer
+    await stop_cloud_producer()
+
+
+async def _start_injury_poller():
+    # ESPN Injury Poller (isolated — won't affect PBP or pulse)
+    poller = await _import_off_loop("services.espn_injury_service")
+    await poller.start_injury_poller()
+
+
+async def _stop_injury_poller():
+    from services.espn_injury_service import stop_injury_poller
+    await stop_injury_poller()
+
+
+# Started by the warm-up task once serving; stopped newest-first on shutdown
+WARM_SERVICES = [
+    WarmService("Cloud pulse producer", _start_cloud_producer, _stop_cloud_producer),
+    WarmService("ESPN Injury Poller", _start_injury_poller, _stop_injury_poller),
+]
+_PRODUCER_SERVICE = WARM_SERVICES[0]
+
+warmup = AppWarmup(LAZY_ROUTERS, WARM_SERVICES)
 
 
 @asynccontextmanager
@@ -146,6 +208,13 @@ async def lifespan(app: FastAPI):
         setup_telemetry(app, "quantsight-main")
         logger.info(f"   └─ OTel: {'active' if is_otel_ok() else 'disabled'}")
     
+    # Debug: flag handlers that block the event loop (FEATURE_LOOP_BLOCK_DETECTOR)
+    try:
+        from services.executor_tier import start_loop_watchdog
+        start_loop_watchdog()
+    except Exception as e:
+        logger.warning(f"⚠️ Loop watchdog not started: {e}")
+    
     # Initialize Vanguard (runs FIRST)
     if VANGUARD_AVAILABLE:
         from vanguard.snapshot import start_snapshot_loop, stop_snapshot_loop, SYSTEM_SNAPSHOT
@@ -153,14 +222,6 @@ async def lifespan(app: FastAPI):
         start_snapshot_loop()
         
         async with vanguard_lifespan(app):
-            # Start the cloud producer (if available)
-            if PRODUCER_AVAILABLE:
-                try:
-                    await start_cloud_producer()
-                    logger.info("✅ Cloud pulse producer started")
-                except Exception as e:
-                    logger.error(f"❌ Failed to start cloud producer: {e}")
-            
             # Phase 8: Start WebSocket heartbeat loop
             _heartbeat_task = None
             try:
@@ -189,7 +250,7 @@ async def lifespan(app: FastAPI):
                                     status = g.get("status", "")
                                     is_live = (status == "LIVE" or status == 2 or 
                                              str(g.get("statusText", "")).lower() in ("half", "halftime"))
-                                    if is_live and gid and gid not in pbp_polling_manager.active_tasks:
+                                    if is_live and gid and gid not in pbp_polling_manager.games:
                                         logger.info(f"[AutoTrack] Starting PBP tracking for {gid}")
                                         await pbp_polling_manager.start_tracking(gid)
                         except Exception as e:
@@ -201,16 +262,9 @@ async def lifespan(app: FastAPI):
             except Exception as e:
                 logger.warning(f"⚠️ Auto game tracker not started: {e}")
 
-            # ── ESPN Injury Poller (isolated — won't affect PBP or pulse) ──────
-            _injury_poller = None
-            try:
-                from services.espn_injury_service import start_injury_poller, stop_injury_poller, get_injury_poller
-                await start_injury_poller()
-                _injury_poller = get_injury_poller()
-                logger.info("✅ ESPN Injury Poller started")
-            except Exception as e:
-                logger.warning(f"⚠️ ESPN Injury Poller not started (non-fatal): {e}")
-                _injury_poller = None
+            # Pulse producer, injury poller and deferred routers load in the
+            # background — the instance serves /health, /readyz and live pulse now
+            warmup.start()
             yield
             
             # Shutdown heartbeat
@@ -228,51 +282,37 @@ async def lifespan(app: FastAPI):
                     await _auto_track_task
                 except asyncio.CancelledError:
                     pass
-
-            # Shutdown injury poller (isolated — safe even if it never started)
             try:
-                if _injury_poller is not None:
-                    await stop_injury_poller()
-                    logger.info("✅ ESPN Injury Poller stopped")
+                from services.pbp_polling_service import pbp_polling_manager
+                await pbp_polling_manager.shutdown()
             except Exception as e:
-                logger.debug(f"Injury poller stop error (non-fatal): {e}")
-            
+                logger.debug(f"PBP scheduler stop error (non-fatal): {e}")
+
             # Shutdown
             logger.info("🛑 Cloud Run shutting down...")
-            if PRODUCER_AVAILABLE:
-                await stop_cloud_producer()
-                logger.info("✅ Cloud pulse producer stopped")
+            # Injury poller, then cloud producer (safe even if never started)
+            await warmup.shutdown()
             stop_snapshot_loop()
+            await _shutdown_executor_tier()
     else:
         # Run without Vanguard
-        if PRODUCER_AVAILABLE:
-            try:
-                await start_cloud_producer()
-                logger.info("✅ Cloud pulse producer started")
-            except Exception as e:
-                logger.error(f"❌ Failed to start cloud producer: {e}")
-
-        # ESPN Injury Poller (isolated)
-        _injury_poller_nv = None
-        try:
-            from services.espn_injury_service import start_injury_poller, stop_injury_poller, get_injury_poller
-            await start_injury_poller()
-            _injury_poller_nv = get_injury_poller()
-            logger.info("✅ ESPN Injury Poller started (no-vanguard path)")
-        except Exception as e:
-            logger.warning(f"⚠️ ESPN Injury Poller not started (non-fatal): {e}")
+        warmup.start()
 
         yield
 
         logger.info("🛑 Cloud Run shutting down...")
-        if PRODUCER_AVAILABLE:
-            await stop_cloud_producer()
-            logger.info("✅ Cloud pulse producer stopped")
-        try:
-            if _injury_poller_nv is not None:
-                await stop_injury_poller()
-        except Exception:
-            pass
+        await warmup.shutdown()
+        await _shutdown_executor_tier()
+
+
+async def _shutdown_executor_tier():
+    """Stop the loop watchdog and release executor pool threads."""
+    try:
+        from services.executor_tier import stop_loop_watchdog, get_executor_tier
+        await stop_loop_watchdog()
+        get_executor_tier().shutdown(wait=False)
+    except Exception as e:
+        logger.debug(f"Executor tier shutdown error (non-fatal): {e}")
 
 
 
@@ -286,158 +326,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Include admin routes if available
-if ADMIN_ROUTES_AVAILABLE:
-    app.include_router(admin_router)
-    logger.info("✅ Admin routes registered")
-
-# Include public routes if available (bare path: /teams, /players, etc.)
-# NOTE: /public/* aliases are defined directly in public_routes.py
-if PUBLIC_ROUTES_AVAILABLE:
-    app.include_router(public_router)
-    logger.info("✅ Public routes registered at / and /public/*")
-
-# Include Live SSE stream router (/live/stream)
-# MUST be registered with no prefix — frontend hardcodes /live/stream
-if LIVE_STREAM_AVAILABLE:
-    app.include_router(live_stream_router)
-    logger.info("✅ Live stream router registered at /live/*")
-
-# Include admin injury routes
-try:
-    from api.injury_admin import router as admin_injury_router
-    app.include_router(admin_injury_router)
-    logger.info("✅ Admin injury routes registered")
-except ImportError as e:
-    logger.warning(f"⚠️ Admin injury routes not available: {e}")
-
-# Include Nexus service routes
-try:
-    from nexus import router as nexus_router
-    app.include_router(nexus_router)
-    logger.info("✅ Nexus service routes registered")
-except ImportError as e:
-    logger.warning(f"⚠️ Nexus service not available: {e}")
-
-# Include game logs routes
-try:
-    from api.game_logs_routes import router as game_logs_router
-    app.include_router(game_logs_router)
-    logger.info("✅ Game logs routes registered")
-except ImportError as e:
-    logger.warning(f"⚠️ Game logs routes not available: {e}")
-
-# Include H2H population routes
-try:
-    from api.h2h_population_routes import router as h2h_router
-    app.include_router(h2h_router)
-    logger.info("✅ H2H population routes registered")
-except ImportError as e:
-    logger.warning(f"⚠️ H2H population routes not available: {e}")
-
-# Include Aegis router (AI Analysis / Simulations)
-try:
-    from app.routers.aegis import router as aegis_router
-    app.include_router(aegis_router, prefix="/aegis", tags=["Aegis AI"])
-    logger.info("✅ Aegis router registered at /aegis/*")
-except ImportError as e:
-    logger.warning(f"⚠️ Aegis router not available: {e}")
-
-# Include Live Pulse status router
-try:
-    from app.routers.live_pulse import router as live_pulse_router
-    app.include_router(live_pulse_router, prefix="/pulse", tags=["Live Pulse"])
-    logger.info("✅ Live Pulse router registered at /pulse/*")
-except ImportError as e:
-    logger.warning(f"⚠️ Live Pulse router not available: {e}")
-
-# Phase 8: WebSocket full-duplex + Presence + Annotations
-try:
-    from api.websocket_routes import router as ws_router
-    app.include_router(ws_router)
-    logger.info("✅ WebSocket routes registered at /live/ws, /live/presence/*, /annotations/*")
-except ImportError as e:
-    logger.warning(f"⚠️ WebSocket routes not available: {e}")
-
-# Phase 3 (NBA Play-By-Play): Play-By-Play Pipeline routes
-try:
-    from api.play_by_play_routes import router as pbp_router
-    app.include_router(pbp_router)
-    logger.info("✅ Play-By-Play router registered at /v1/games/*")
-except ImportError as e:
-    logger.warning(f"⚠️ Play-By-Play router not available: {e}")
-
-# Data routes — migrated endpoints from legacy server.py
-try:
-    from api.data_routes import router as data_router
-    app.include_router(data_router)
-    logger.info("✅ Data routes registered (player-hustle, boxscore alias, play-types, /api/today)")
-except ImportError as e:
-    logger.warning(f"⚠️ Data routes not available: {e}")
-
-
-
-# Include Vanguard health endpoint (MUST BE BEFORE MIDDLEWARE)
-if VANGUARD_AVAILABLE:
-    try:
-        from vanguard.api.health import router as health_router
-        app.include_router(health_router)
-        logger.info("✅ Vanguard health router registered at /vanguard/health")
-    except ImportError as e:
-        logger.warning(f"⚠️ Vanguard health router not available: {e}")
-        # NOTE: Do NOT set VANGUARD_AVAILABLE=False here — health.py is non-critical
-    except Exception as e:
-        logger.warning(f"⚠️ Vanguard health router registration failed: {e}")
-
-# Vanguard Admin API — always attempt independently (not gated on health router success)
-try:
-    from vanguard.api.admin_routes import router as admin_router
-    app.include_router(admin_router)
-    logger.info("✅ Vanguard admin routes registered at /vanguard/admin/*")
-except ImportError as e:
-    logger.warning(f"⚠️ Vanguard admin router not available: {e}")
-except Exception as e:
-    logger.warning(f"⚠️ Vanguard admin router registration failed: {e}")
-
-# Vanguard Cron API
-try:
-    from vanguard.api.cron_routes import router as cron_router
-    app.include_router(cron_router)
-    logger.info("✅ Vanguard cron routes registered at /vanguard/admin/cron/*")
-except ImportError as e:
-    logger.warning(f"⚠️ Vanguard cron router not available: {e}")
-except Exception as e:
-    logger.warning(f"⚠️ Vanguard cron router registration failed: {e}")
-
-# Vanguard Vaccine API
-try:
-    from vanguard.api.vaccine_routes import router as vaccine_router
-    app.include_router(vaccine_router)
-    logger.info("✅ Vanguard vaccine routes registered at /vanguard/admin/vaccine/*")
-except ImportError as e:
-    logger.warning(f"⚠️ Vanguard vaccine router not available: {e}")
-except Exception as e:
-    logger.warning(f"⚠️ Vanguard vaccine router registration failed: {e}")
-
-# Vanguard Surgeon API
-try:
-    from vanguard.api.surgeon_routes import router as surgeon_router
-    app.include_router(surgeon_router)
-    logger.info("✅ Vanguard surgeon routes registered at /vanguard/surgeon/*")
-except ImportError as e:
-    logger.warning(f"⚠️ Vanguard surgeon router not available: {e}")
-except Exception as e:
-    logger.warning(f"⚠️ Vanguard surgeon router registration failed: {e}")
-
-# Vanguard FULL_SOVEREIGN Promotion Gate (Phase 5)
-try:
-    from vanguard.sovereign.promotion_gate import router as promotion_router
-    app.include_router(promotion_router)
-    logger.info("✅ Vanguard promotion gate registered at /vanguard/admin/promotion-readiness")
-except ImportError as e:
-    logger.warning(f"⚠️ Vanguard promotion gate not available: {e}")
-except Exception as e:
-    logger.warning(f"⚠️ Vanguard promotion gate registration failed: {e}")
+# Register routers: live pulse now, the rest deferred (see LAZY_ROUTERS above).
+# MUST happen before the middleware stack is added.
+warmup.install(app)
+logger.info(f"✅ Routers registered: {len(warmup.loaded)} at startup, {len(warmup.pending)} deferred")
 
 if not VANGUARD_AVAILABLE:
     logger.warning("⚠️ Vanguard core unavailable — only admin routes attempted via fallback")
@@ -592,9 +484,10 @@ async def health_check():
         }
         
         # Add producer status if available
-        if PRODUCER_AVAILABLE:
+        producer_module = _producer_module()
+        if producer_module:
             try:
-                producer = get_cloud_producer()
+                producer = producer_module.get_cloud_producer()
                 if producer:
                     status_data = producer.get_status()
                     result["producer"] = status_data
@@ -602,6 +495,7 @@ async def health_check():
                 result["producer_error"] = str(e)
         else:
             result["producer"] = "not_loaded"
+        result["warmup"] = warmup.status()["status"]
         
         return result
         
@@ -628,8 +522,15 @@ async def health_check():
         }
 
 @app.get("/readyz")
-async def readyz():
-    """Liveness/Readiness probe for Cloud Run. Gates hard dependencies (Firestore)."""
+async def readyz(warm: bool = False):
+    """
+    Readiness probe for Cloud Run. Gates hard dependencies (Firestore).
+
+    200 once the instance is serving; the body says whether it is also
+    fully warmed (deferred routers imported, producer + pollers started).
+    ?warm=true returns 503 until then, for probes that want the latter.
+    """
+    state = warmup.status()
     try:
         from vanguard.health_monitor import get_health_monitor
         monitor = get_health_monitor()
@@ -637,10 +538,12 @@ async def readyz():
         result = await asyncio.wait_for(check_task, timeout=2.0)
         
         if result.get("status") == "critical":
-            return Response(status_code=503, content=f"Service Unavailable: {result.get('error')}")
-        return Response(status_code=200, content="OK")
+            return JSONResponse(status_code=503, content={
+                **state, "status": "unavailable", "error": f"Service Unavailable: {result.get('error')}"})
     except Exception as e:
-        return Response(status_code=503, content=f"Service Unavailable: {e}")
+        return JSONResponse(status_code=503, content={
+            **state, "status": "unavailable", "error": f"Service Unavailable: {e}"})
+    return JSONResponse(status_code=503 if warm and not state["warm"] else 200, content=state)
 
 @app.get("/health/deps")
 async def health_deps():
@@ -662,6 +565,13 @@ async def health_deps():
         except Exception:
             SYSTEM_SNAPSHOT["websocket_connections_active"] = 0
             SYSTEM_SNAPSHOT["websocket_enabled"] = False
+
+        # Executor tier: pool saturation, per-route queue depth, loop stalls
+        try:
+            from services.executor_tier import executor_stats
+            SYSTEM_SNAPSHOT["executors"] = executor_stats()
+        except Exception:
+            pass
         
         return SYSTEM_SNAPSHOT
     except ImportError:
@@ -693,11 +603,13 @@ async def healthz():
 @app.get("/status")
 async def status():
     """Detailed status endpoint for monitoring."""
-    if not PRODUCER_AVAILABLE:
-        return {"status": "producer_not_available", "admin_routes": ADMIN_ROUTES_AVAILABLE}
+    producer_module = _producer_module()
+    if producer_module is None:
+        state = "not_loaded" if _PRODUCER_SERVICE.state == "pending" else "producer_not_available"
+        return {"status": state, "admin_routes": warmup.is_loaded("admin")}
     
     try:
-        producer = get_cloud_producer()
+        producer = producer_module.get_cloud_producer()
         if producer:
             return producer.get_status()
         return {"error": "Producer not initialized"}
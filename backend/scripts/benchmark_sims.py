@@ -1,28 +1,97 @@
 """
-Benchmark simulation times at different scales
+Projection Engine Benchmark
+===========================
+Times the engines we actually run - Crucible, Deep Monte Carlo, Vertex
+Monte Carlo, EMA, Multi-Stat Confluence and the Aegis orchestrator -
+against a seeded fixture league in a temporary SQLite database, and
+compares p50/p99 latency, throughput and peak memory with the stored
+JSON baseline (exit code 1 on regression or output drift).
+
+    python scripts/benchmark_sims.py                      # full profile, compare
+    python scripts/benchmark_sims.py vertex_mc ema --quick
+    python scripts/benchmark_sims.py --update-baseline    # record new numbers
 """
-import numpy as np
-import time
-
-print("=" * 50)
-print("MONTE CARLO SIMULATION BENCHMARK")
-print("=" * 50)
-
-for n in [10_000, 100_000, 1_000_000, 10_000_000, 50_000_000]:
-    start = time.perf_counter()
-    
-    # Simulate points
-    pts = np.random.normal(25, 5, size=n)
-    reb = np.random.normal(8, 2, size=n)
-    ast = np.random.normal(6, 2, size=n)
-    
-    # Calculate percentiles
-    p20_pts = np.percentile(pts, 20)
-    p50_pts = np.percentile(pts, 50)
-    p80_pts = np.percentile(pts, 80)
-    
-    elapsed = (time.perf_counter() - start) * 1000
-    
-    print(f"{n:>15,} sims: {elapsed:>8.1f}ms")
-
-print("=" * 50)
+import argparse
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.cases import CASES, PROFILES, build_cases
+from benchmarks.fixtures import FIXTURE_SEED, build_fixture_league, league_singletons
+from benchmarks.harness import (
+    DEFAULT_MEMORY_TOLERANCE,
+    DEFAULT_TOLERANCE,
+    compare,
+    format_results,
+    load_baseline,
+    run_cases,
+    save_baseline,
+)
+
+DEFAULT_BASELINE = BACKEND_DIR / 'benchmarks' / 'baselines.json'
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cases", nargs="*", choices=[[]] + sorted(CASES), default=[])
+    parser.add_argument("--quick", action="store_true", help="Small smoke-test sizes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=0, help="Override timed calls per case")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='[BENCH] %(message)s')
+    profile = 'quick' if args.quick else 'full'
+    names = [name for name in CASES if name in args.cases] or list(CASES)
+
+    with tempfile.TemporaryDirectory(prefix='quantsight_bench_') as tmp:
+        league = build_fixture_league(Path(tmp), seed=FIXTURE_SEED)
+        with league_singletons(league.db_path):
+            cases = build_cases(league, profile, names)
+            results = run_cases(
+                cases, seed=args.seed, iterations=args.iterations or None, trace_memory=not args.no_memory,
+                on_result=None if args.json else lambda r: print(f"  {r.name}: p50 {r.p50_ms:.2f}ms", flush=True),
+            )
+
+    baseline = load_baseline(args.baseline)
+    comparison = compare(results, baseline, profile, args.tolerance, args.memory_tolerance)
+
+    if args.json:
+        print(json.dumps({
+            'profile': profile,
+            'results': [r.to_dict() for r in results],
+            'regressions': [str(r) for r in comparison.regressions],
+            'drift': [str(r) for r in comparison.drift],
+        }, indent=2))
+    else:
+        print()
+        print(format_results(results))
+        for title, entries in (("REGRESSIONS", comparison.regressions), ("OUTPUT DRIFT", comparison.drift),
+                               ("IMPROVEMENTS", comparison.improvements)):
+            if entries:
+                print(f"\n{title}:")
+                for entry in entries:
+                    print(f"  {entry}")
+        if comparison.new_cases and not args.update_baseline:
+            print(f"\nNo baseline for: {', '.join(comparison.new_cases)} (run with --update-baseline)")
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results, profile, args.seed, existing=baseline)
+        if not args.json:
+            print(f"\nBaseline '{profile}' written to {args.baseline}")
+        return 0
+    return 0 if comparison.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Bulk Ingestion Runner
+=====================
+Declarative full-league refresh on top of services/ingestion_runner.py:
+every job shares one worker pool and one token-bucket governor, retries
+with jittered backoff, checkpoints completed items and writes in bulk.
+The checkpoint only carries an interrupted or partly failed run over to
+the next invocation; a job that completes cleanly clears its keys.
+
+Jobs:
+  game_logs   playergamelog per active player  -> player_game_logs,
+              player_rolling_averages
+  bio         commonplayerinfo per player      -> player_bio
+  h2h         playergamelogs per (player, opponent, season) not covered by
+              local logs -> player_h2h_games (SQLite + Firestore), then one
+              H2H materialization
+
+Replaces the serial sleep loops of fetch_game_logs.py and the subprocess
+fan-out of run_h2h_parallel.py / generate_h2h_batch_*.py.
+
+    python scripts/ingest.py game_logs bio --rate 4 --workers 8
+    python scripts/ingest.py h2h --limit 90 --fresh
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from core.config import CURRENT_SEASON
+from fetch_game_logs import NBAGameLogFetcher
+from nba_rate_limiter import HEADERS, NBA_BASE_URL
+from services.ingestion_runner import IngestionJob, IngestionRunner, JobContext, JobMetrics, format_metrics
+
+logging.basicConfig(level=logging.INFO, format='[INGEST] %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB = BACKEND_DIR / 'data' / 'nba_data.db'
+DEFAULT_CHECKPOINT = BACKEND_DIR / 'data' / 'ingest_checkpoint.json'
+
+
+# ============================================================================
+# JOB DEFINITIONS
+# ============================================================================
+
+def game_logs_job(fetcher: NBAGameLogFetcher, players: List[Dict]) -> IngestionJob:
+    async def fetch(ctx: JobContext, player: Dict) -> List[Dict]:
+        data = await ctx.get_json(f"{NBA_BASE_URL}/playergamelog", {
+            'PlayerID': player['player_id'],
+            'Season': CURRENT_SEASON,
+            'SeasonType': 'Regular Season',
+        })
+        return fetcher.parse_game_log(data, player['player_id'], player['name'], fetcher.games_per_player)
+
+    def write(games: List[Dict]) -> int:
+        new_games = fetcher.save_games_to_db(games)
+        by_player = defaultdict(list)
+        for game in games:
+            by_player[(game['player_id'], game['player_name'])].append(game)
+        for (player_id, name), player_games in by_player.items():
+            fetcher.update_rolling_averages(player_id, name, player_games)
+        return new_games
+
+    return IngestionJob("game_logs", players, fetch, write, key=lambda p: p['player_id'], batch_size=25)
+
+
+def bio_job(fetcher: NBAGameLogFetcher, players: List[Dict]) -> IngestionJob:
+    async def fetch(ctx: JobContext, player: Dict):
+        data = await ctx.get_json(f"{NBA_BASE_URL}/commonplayerinfo", {'PlayerID': player['player_id']})
+        return fetcher.parse_player_bio(data, player['player_id'], player['name'])
+
+    return IngestionJob("bio", players, fetch, fetcher.save_player_bios,
+                        key=lambda p: p['player_id'], batch_size=50)
+
+
+def _init_firebase():
+    """The H2H job dual-writes to Firestore; without credentials it stays SQLite-only."""
+    try:
+        import firebase_admin
+        if not firebase_admin._apps:
+            firebase_admin.initialize_app()
+    except Exception as e:
+        logger.warning(f"Firebase init failed, H2H writes SQLite only: {e}")
+
+
+def h2h_job(players: List[Dict], db_path: str, seasons: int = 3) -> IngestionJob:
+    from services.h2h_fetcher import H2HFetcher
+
+    _init_firebase()
+    fetcher = H2HFetcher(db_path)
+    teams = sorted(H2HFetcher.TEAM_ABBR_TO_ID)
+    items = [
+        (player['player_id'], opponent, season, params)
+        for player in players
+        for opponent in teams if opponent != player.get('team')
+        for season, params in fetcher.backfill_requests(player['player_id'], opponent, seasons)
+    ]
+
+    async def fetch(ctx: JobContext, item) -> List[Dict]:
+        player_id, opponent, _, params = item
+        data = await ctx.get_json(H2HFetcher.PLAYER_GAME_LOG, params)
+        return [{**game, 'player_id': player_id, 'opponent': opponent}
+                for game in fetcher._parse_game_logs(data, opponent)]
+
+    return IngestionJob(
+        "h2h", items, fetch, fetcher.save_h2h_batch,
+        key=lambda item: f"{item[0]}:{item[1]}:{item[2]}",
+        batch_size=200,
+        finalize=fetcher.materializer.refresh,
+    )
+
+
+JOBS = {"game_logs": game_logs_job, "bio": bio_job, "h2h": h2h_job}
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+async def load_players(runner: IngestionRunner) -> List[Dict]:
+    async def fetch(ctx: JobContext, _) -> List[Dict]:
+        data = await ctx.get_json(f"{NBA_BASE_URL}/leaguedashplayerstats", {
+            'LastNGames': '0', 'LeagueID': '00', 'MeasureType': 'Base', 'Month': '0',
+            'OpponentTeamID': '0', 'PORound': '0', 'PerMode': 'PerGame', 'Period': '0',
+            'Season': CURRENT_SEASON, 'SeasonType': 'Regular Season', 'TeamID': '0',
+        })
+        return NBAGameLogFetcher.parse_player_list(data)
+
+    return await runner.fetch_one("players", fetch)
+
+
+async def run(args) -> List[JobMetrics]:
+    runner = IngestionRunner(
+        rate=args.rate, burst=args.burst, workers=args.workers,
+        checkpoint_path=None if args.no_checkpoint else str(args.checkpoint),
+        headers={**HEADERS, 'Accept-Encoding': 'gzip, deflate'},
+    )
+    players = await load_players(runner)
+    if args.limit:
+        players = players[:args.limit]
+    logger.info(f"{len(players)} players, jobs: {', '.join(args.jobs)}")
+
+    fetcher = NBAGameLogFetcher(str(args.db), str(BACKEND_DIR / 'data' / 'fetched'), games_per_player=args.games)
+    jobs = []
+    for name in args.jobs:
+        if name == "h2h":
+            jobs.append(h2h_job(players, str(args.db), args.seasons))
+        else:
+            jobs.append(JOBS[name](fetcher, players))
+    return await runner.run(jobs, resume=not args.fresh)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("jobs", nargs="+", choices=sorted(JOBS))
+    parser.add_argument("--rate", type=float, default=2.0, help="Global upstream requests/sec")
+    parser.add_argument("--burst", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=0, help="Only the first N players")
+    parser.add_argument("--games", type=int, default=15, help="Game logs kept per player")
+    parser.add_argument("--seasons", type=int, default=3, help="H2H seasons to backfill")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--no-checkpoint", action="store_true")
+    parser.add_argument("--fresh", action="store_true", help="Ignore completed items in the checkpoint")
+    parser.add_argument("--json", action="store_true", help="Print metrics as JSON")
+    args = parser.parse_args()
+
+    metrics = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps([m.to_dict() for m in metrics], indent=2))
+    else:
+        print(format_metrics(metrics))
+
+
+if __name__ == "__main__":
+    main()
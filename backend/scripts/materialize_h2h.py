@@ -0,0 +1,46 @@
+"""
+H2H Materialization Runner
+==========================
+Recomputes player × opponent H2H aggregates from local game logs in one
+pass (see services/h2h_materializer.py). Replaces the per-pair NBA API
+sweep of generate_h2h_batch_*.py / run_h2h_parallel.py; use those only to
+backfill seasons that have no local logs.
+
+    python scripts/materialize_h2h.py            # incremental
+    python scripts/materialize_h2h.py --full     # rebuild every pair
+    python scripts/materialize_h2h.py --no-firestore
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.h2h_materializer import H2HMaterializer
+
+logging.basicConfig(level=logging.INFO, format='[H2H-MAT] %(message)s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="Rebuild every pair, not just new logs")
+    parser.add_argument("--db", default=None, help="SQLite path (default data/nba_data.db)")
+    parser.add_argument("--no-firestore", action="store_true", help="Only write player_vs_team")
+    args = parser.parse_args()
+
+    if not args.no_firestore:
+        import firebase_admin
+        if not firebase_admin._apps:
+            try:
+                firebase_admin.initialize_app()
+            except Exception as e:
+                logging.warning(f"Firebase init failed, SQLite only: {e}")
+
+    materializer = H2HMaterializer(args.db, use_firestore=not args.no_firestore)
+    print(json.dumps(materializer.refresh(full=args.full), indent=2))
+
+
+if __name__ == "__main__":
+    main()
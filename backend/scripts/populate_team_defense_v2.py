@@ -2,17 +2,24 @@
 Team Defense by Position Script (Standalone)
 ============================================
 Fetches team defensive stats and infers position-based adjustments.
+Position rows are also mirrored into SQLite and the team context version
+is bumped so running DefenseMatrix/PaceEngine instances reload.
 
 Usage:
   python populate_team_defense_v2.py
 """
 import logging
+import os
+import sys
 
 from nba_rate_limiter import RateLimiter, make_nba_request, create_session, NBA_BASE_URL
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.team_context_store import bump_team_context_version, save_position_defense
+
 POSITIONS = ['G', 'F', 'C']
 
 # Firebase
@@ -59,6 +66,7 @@ def fetch_team_defense() -> int:
         
         batch = db.batch()
         saved = 0
+        position_rows = []
         
         for row in rows:
             team = row[idx.get('TEAM_ABBREVIATION', '')] or ''
@@ -102,10 +110,18 @@ def fetch_team_defense() -> int:
                 }
                 doc_id = f"{team}_{pos}"
                 batch.set(db.collection('team_defense_by_position').document(doc_id), pos_doc, merge=True)
+                position_rows.append(pos_doc)
                 saved += 1
         
         batch.commit()
         logger.info(f"✅ Saved {saved} team defense records")
+        
+        try:
+            save_position_defense(position_rows)
+            version = bump_team_context_version(source="populate_team_defense_v2")
+            logger.info(f"Team context version -> {version}")
+        except Exception as e:
+            logger.warning(f"Local team context not updated: {e}")
         return saved
         
     except Exception as e:
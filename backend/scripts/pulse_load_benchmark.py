@@ -0,0 +1,550 @@
+"""
+Pulse Load Benchmark — Replay-Driven SSE / WebSocket Fan-Out
+=============================================================
+Load-tests CloudAsyncPulseProducer, /live/stream and /live/ws against a
+recorded (or synthetic) game night served by scripts/pulse_replay_server.py,
+so instance sizing and fan-out regressions can be checked on any day.
+
+    run (default)
+        ├─ start pulse_replay_server.py serve      (stand-in CDN/ESPN)
+        ├─ start this script's `app` subcommand     (producer + live routes)
+        ├─ sample idle CPU/RSS of the app process
+        ├─ connect N SSE clients and M WebSocket clients
+        ├─ record every frame's fan-out latency     (receipt - meta.timestamp)
+        └─ report cycle latency, fan-out percentiles, CPU/RSS per client
+
+    app
+        Minimal FastAPI app: live_stream_routes + websocket_routes and a
+        CloudAsyncPulseProducer whose Firestore, archiver and game-log
+        writers are discarded, so the measurement is fetch → extract →
+        encode → fan-out. Presence (viewer counts) uses Redis only when
+        --redis-url is given; otherwise it fails open with 0 viewers.
+        GET /_bench/cycles returns per-cycle timings.
+
+Usage:
+    python scripts/pulse_load_benchmark.py --sse 500 --ws 200 --duration 60
+    python scripts/pulse_load_benchmark.py --recording night.jsonl.gz --speedup 20 \\
+        --json report.json --baseline last_report.json --tolerance 0.25
+
+    # Against an already running server (cycle timings from /live/status):
+    python scripts/pulse_load_benchmark.py --target http://127.0.0.1:8080 --target-pid 4242
+
+Exit code 1 when --baseline is given and a tracked metric regresses by
+more than --tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+import psutil
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+logger = logging.getLogger("pulse_bench")
+
+# Metrics compared against --baseline (lower is better for all of them)
+TRACKED_METRICS = (
+    "cycle_ms.p95",
+    "sse.fanout_ms.p99",
+    "ws.fanout_ms.p99",
+    "server.cpu_ms_per_client_s",
+    "server.rss_kb_per_client",
+)
+
+
+# ============================================================================
+# STATS
+# ============================================================================
+
+def percentiles(values: List[float], points=(50, 90, 95, 99)) -> Dict[str, Optional[float]]:
+    """Nearest-rank percentiles plus count/max; None entries when empty."""
+    ordered = sorted(values)
+    out: Dict[str, Optional[float]] = {"count": len(ordered)}
+    for p in points:
+        if not ordered:
+            out[f"p{p}"] = None
+            continue
+        rank = max(1, -(-p * len(ordered) // 100))  # ceil without floats
+        out[f"p{p}"] = round(ordered[rank - 1], 2)
+    out["max"] = round(ordered[-1], 2) if ordered else None
+    return out
+
+
+def _parse_ts(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _frame_timestamp(payload: Dict[str, Any]) -> Optional[float]:
+    """Producer timestamp of an SSE full/keyframe/patch payload."""
+    meta = payload.get("meta") or payload.get("snapshot", {}).get("meta") or {}
+    return _parse_ts(meta.get("timestamp"))
+
+
+def _lookup(report: Dict[str, Any], dotted: str) -> Optional[float]:
+    node: Any = report
+    for part in dotted.split("."):
+        if not isinstance(node, dict):
+            return None
+        node = node.get(part)
+    return node if isinstance(node, (int, float)) else None
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Human-readable regressions of TRACKED_METRICS beyond `tolerance`."""
+    regressions = []
+    for metric in TRACKED_METRICS:
+        now, before = _lookup(report, metric), _lookup(baseline, metric)
+        if now is None or not before:
+            continue
+        if now > before * (1 + tolerance):
+            regressions.append(f"{metric}: {before} -> {now} (+{(now / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+# ============================================================================
+# CLIENTS
+# ============================================================================
+
+class ClientStats:
+    """Shared sink for one client population (SSE or WS)."""
+
+    def __init__(self):
+        self.connected = 0
+        self.failed = 0
+        self.frames = 0
+        self.bytes = 0
+        self.gaps = 0
+        self.fanout_ms: List[float] = []
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "failed": self.failed,
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "seq_gaps": self.gaps,
+            "fanout_ms": percentiles(self.fanout_ms),
+        }
+
+
+async def sse_client(session: aiohttp.ClientSession, url: str, stats: ClientStats, stop: asyncio.Event):
+    """One EventSource-like consumer; the first (backlog) frame is not timed."""
+    try:
+        async with session.get(url, headers={"Accept": "text/event-stream"}) as resp:
+            if resp.status != 200:
+                stats.failed += 1
+                return
+            stats.connected += 1
+            last_seq: Optional[int] = None
+            first = True
+            event_id, data = None, []
+            async for raw in resp.content:
+                if stop.is_set():
+                    break
+                line = raw.decode("utf-8").rstrip("\n")
+                if line.startswith("id: "):
+                    event_id = int(line[4:])
+                elif line.startswith("data: "):
+                    data.append(line[6:])
+                elif line == "" and data:
+                    received = time.time()
+                    body = "\n".join(data)
+                    stats.frames += 1
+                    stats.bytes += len(body)
+                    payload = json.loads(body)
+                    if not first:
+                        sent = _frame_timestamp(payload)
+                        if sent is not None:
+                            stats.fanout_ms.append((received - sent) * 1000)
+                        if payload.get("type") == "patch" and payload.get("base_seq") != last_seq:
+                            stats.gaps += 1
+                    first = False
+                    last_seq = event_id if event_id is not None else last_seq
+                    event_id, data = None, []
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        stats.failed += 1
+
+
+async def ws_client(session: aiohttp.ClientSession, url: str, stats: ClientStats,
+                    stop: asyncio.Event, filters: Optional[Dict[str, str]] = None):
+    """One /live/ws consumer; times every broadcast envelope."""
+    try:
+        async with session.ws_connect(url, heartbeat=30) as ws:
+            stats.connected += 1
+            if filters:
+                await ws.send_json({"action": "subscribe", "filters": filters})
+            while not stop.is_set():
+                try:
+                    msg = await asyncio.wait_for(ws.receive(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                        break
+                    continue
+                received = time.time()
+                payload = json.loads(msg.data)
+                if payload.get("type") in ("connected", "subscribed", "pong"):
+                    continue
+                stats.frames += 1
+                stats.bytes += len(msg.data)
+                sent = _parse_ts(payload.get("timestamp"))
+                if sent is not None:
+                    stats.fanout_ms.append((received - sent) * 1000)
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        stats.failed += 1
+
+
+# ============================================================================
+# SERVER SAMPLING
+# ============================================================================
+
+class ProcessSampler:
+    """CPU time and RSS of the server process over a phase."""
+
+    def __init__(self, pid: int):
+        self.proc = psutil.Process(pid)
+        self._cpu0 = 0.0
+        self._t0 = 0.0
+        self.rss: deque = deque(maxlen=3600)
+
+    def _cpu(self) -> float:
+        times = self.proc.cpu_times()
+        return times.user + times.system
+
+    def begin(self):
+        self.rss.clear()
+        self._cpu0, self._t0 = self._cpu(), time.monotonic()
+
+    def sample(self):
+        self.rss.append(self.proc.memory_info().rss)
+
+    def end(self) -> Dict[str, float]:
+        elapsed = max(time.monotonic() - self._t0, 1e-6)
+        self.sample()
+        return {
+            "cpu_pct": round((self._cpu() - self._cpu0) / elapsed * 100, 2),
+            "rss_mb": round(max(self.rss) / 1e6, 2),
+        }
+
+
+async def _sample_loop(sampler: Optional[ProcessSampler], session: aiohttp.ClientSession,
+                       target: str, cycles: List[float], stop: asyncio.Event):
+    """Sample RSS every second and collect cycle durations from /live/status."""
+    last_count = None
+    while not stop.is_set():
+        if sampler:
+            sampler.sample()
+        try:
+            async with session.get(f"{target}/live/status") as resp:
+                status = await resp.json()
+            count = status.get("update_count")
+            if count is not None and count != last_count and last_count is not None:
+                cycles.append(status.get("last_update_duration_seconds", 0) * 1000)
+            last_count = count
+        except Exception:
+            pass
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=1.0)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _wait_http(url: str, timeout: float = 60.0, ready=lambda body: True):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url) as resp:
+                    if resp.status == 200 and ready(await resp.json(content_type=None)):
+                        return
+            except (aiohttp.ClientError, ValueError):
+                pass
+            await asyncio.sleep(0.5)
+    raise TimeoutError(f"{url} not ready after {timeout:.0f}s")
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    procs: List[subprocess.Popen] = []
+    target, pid = args.target, args.target_pid
+    try:
+        if not target:
+            recording = args.recording
+            if not recording:
+                recording = os.path.join(tempfile.gettempdir(), "pulse_synth.jsonl.gz")
+                if not os.path.exists(recording):
+                    subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, "pulse_replay_server.py"),
+                                    "synthesize", "--out", recording, "--games", str(args.games)],
+                                   check=True)
+            replay = f"http://127.0.0.1:{args.replay_port}"
+            procs.append(subprocess.Popen([
+                sys.executable, os.path.join(SCRIPTS_DIR, "pulse_replay_server.py"), "serve",
+                "--recording", recording, "--port", str(args.replay_port),
+                "--speedup", str(args.speedup), "--start-at", str(args.start_at), "--loop",
+            ]))
+            await _wait_http(f"{replay}/_replay/status")
+
+            env = {**os.environ, "NBA_CDN_BASE_URL": replay, "ESPN_API_BASE_URL": replay,
+                   "FEATURE_WEBSOCKET_ENABLED": "true", "PULSE_SERVICE_ENABLED": "true"}
+            app = subprocess.Popen([
+                sys.executable, os.path.abspath(__file__), "app",
+                "--port", str(args.app_port), "--poll-interval", str(args.poll_interval),
+            ] + (["--redis-url", args.redis_url] if args.redis_url else []), env=env, cwd=BACKEND_DIR)
+            procs.append(app)
+            target, pid = f"http://127.0.0.1:{args.app_port}", app.pid
+
+        await _wait_http(f"{target}/live/status", timeout=120,
+                         ready=lambda b: b.get("snapshot_available"))
+
+        sampler = ProcessSampler(pid) if pid else None
+        idle = None
+        if sampler:
+            sampler.begin()
+            for _ in range(int(args.idle)):
+                sampler.sample()
+                await asyncio.sleep(1.0)
+            idle = sampler.end()
+
+        sse, ws = ClientStats(), ClientStats()
+        cycles: List[float] = []
+        stop = asyncio.Event()
+        limits = aiohttp.TCPConnector(limit=0)
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30)
+        async with aiohttp.ClientSession(connector=limits, timeout=timeout) as session:
+            if sampler:
+                sampler.begin()
+            tasks = [asyncio.create_task(sse_client(
+                session, f"{target}/live/stream?mode={args.sse_mode}", sse, stop))
+                for _ in range(args.sse)]
+            ws_url = target.replace("http", "ws", 1) + "/live/ws"
+            tasks += [asyncio.create_task(ws_client(session, ws_url, ws, stop))
+                      for _ in range(args.ws)]
+            sampling = asyncio.create_task(_sample_loop(sampler, session, target, cycles, stop))
+
+            await asyncio.sleep(args.duration)
+            stop.set()
+            loaded = sampler.end() if sampler else None
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, sampling, return_exceptions=True)
+
+            bench_cycles = None
+            try:
+                async with session.get(f"{target}/_bench/cycles") as resp:
+                    if resp.status == 200:
+                        bench_cycles = await resp.json()
+            except aiohttp.ClientError:
+                pass
+
+        clients = max(args.sse + args.ws, 1)
+        report: Dict[str, Any] = {
+            "config": {k: getattr(args, k) for k in (
+                "sse", "ws", "sse_mode", "duration", "speedup", "poll_interval")},
+            "cycle_ms": percentiles(bench_cycles["cycle_ms"] if bench_cycles else cycles),
+            "unchanged_cycles": bench_cycles.get("unchanged_cycles") if bench_cycles else None,
+            "sse": sse.summary(),
+            "ws": ws.summary(),
+        }
+        if idle and loaded:
+            report["server"] = {
+                "idle": idle,
+                "loaded": loaded,
+                "cpu_ms_per_client_s": round((loaded["cpu_pct"] - idle["cpu_pct"]) * 10 / clients, 3),
+                "rss_kb_per_client": round((loaded["rss_mb"] - idle["rss_mb"]) * 1000 / clients, 2),
+            }
+        return report
+    finally:
+        for proc in reversed(procs):
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+def _print_report(report: Dict[str, Any]):
+    cfg = report["config"]
+    print("=" * 64)
+    print(f"PULSE LOAD BENCHMARK  sse={cfg['sse']} ({cfg['sse_mode']})  ws={cfg['ws']}  "
+          f"{cfg['duration']}s @ {cfg['speedup']}x")
+    print("=" * 64)
+    c = report["cycle_ms"]
+    print(f"producer cycle   n={c['count']:<6} p50={c['p50']}ms  p95={c['p95']}ms  max={c['max']}ms")
+    for name in ("sse", "ws"):
+        s = report[name]
+        f = s["fanout_ms"]
+        print(f"{name:<4} fan-out    clients={s['connected']}/{s['connected'] + s['failed']}  "
+              f"frames={s['frames']}  p50={f['p50']}ms  p90={f['p90']}ms  p99={f['p99']}ms  "
+              f"gaps={s['seq_gaps']}")
+    server = report.get("server")
+    if server:
+        print(f"server           idle cpu={server['idle']['cpu_pct']}% rss={server['idle']['rss_mb']}MB  "
+              f"loaded cpu={server['loaded']['cpu_pct']}% rss={server['loaded']['rss_mb']}MB")
+        print(f"per client       cpu={server['cpu_ms_per_client_s']}ms/s  "
+              f"rss={server['rss_kb_per_client']}KB")
+    print("=" * 64)
+
+
+# ============================================================================
+# BENCH APP (subprocess)
+# ============================================================================
+
+class _DiscardSink:
+    """Accepts any async write (Firestore, archiver, game logs) and drops it."""
+
+    def set_firebase(self, _firebase):
+        pass
+
+    def __getattr__(self, name):
+        async def _discard(*args, **kwargs):
+            return None
+        return _discard
+
+
+def build_app(poll_interval: float, redis_url: Optional[str] = None):
+    """Producer + live routes with persistence discarded; see module docstring."""
+    from fastapi import FastAPI
+
+    import services.async_pulse_producer_cloud as producer_mod
+    from api.live_stream_routes import router as live_stream_router
+    from api.websocket_routes import router as ws_router
+    from services.presence_manager import get_presence_manager
+
+    if not redis_url:
+        # Without this every viewer lookup waits out the Redis connect retries
+        async def _no_redis():
+            return None
+        get_presence_manager()._get_redis = _no_redis
+
+    sink = _DiscardSink()
+    producer_mod.get_firebase_service = lambda: sink
+    producer_mod.GameLogPersister = lambda: sink
+    producer_mod.get_pulse_archiver = lambda: sink
+
+    class BenchProducer(producer_mod.CloudAsyncPulseProducer):
+        POLL_INTERVAL_SECONDS = poll_interval
+
+        def __init__(self):
+            super().__init__()
+            self.cycle_ms: deque = deque(maxlen=10000)
+            if self._adapter:
+                # Revalidate every cycle so replay speed-up is visible upstream
+                self._adapter.SCOREBOARD_CACHE_TTL = min(self._adapter.SCOREBOARD_CACHE_TTL, poll_interval)
+                self._adapter.BOXSCORE_CACHE_TTL = min(self._adapter.BOXSCORE_CACHE_TTL, poll_interval)
+
+        async def _update_firebase(self):
+            start = time.perf_counter()
+            await super()._update_firebase()
+            self.cycle_ms.append((time.perf_counter() - start) * 1000)
+
+    app = FastAPI(title="pulse-bench")
+    app.include_router(live_stream_router)
+    app.include_router(ws_router)
+
+    @app.on_event("startup")
+    async def _start():
+        producer_mod._cloud_producer = BenchProducer()
+        await producer_mod._cloud_producer.start()
+
+    @app.on_event("shutdown")
+    async def _stop():
+        await producer_mod.stop_cloud_producer()
+
+    @app.get("/_bench/cycles")
+    async def _cycles():
+        producer = producer_mod.get_cloud_producer()
+        return {
+            "cycle_ms": list(producer.cycle_ms),
+            "unchanged_cycles": producer.get_status()["unchanged_cycles_skipped"],
+        }
+
+    return app
+
+
+def serve_app(port: int, poll_interval: float, redis_url: Optional[str] = None):
+    import uvicorn
+    if redis_url:
+        os.environ["REDIS_URL"] = redis_url
+    uvicorn.run(build_app(poll_interval, redis_url), host="127.0.0.1", port=port, log_level="warning")
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("app", help="(internal) run the instrumented pulse app")
+    p.add_argument("--port", type=int, default=8781)
+    p.add_argument("--poll-interval", type=float, default=2.0)
+    p.add_argument("--redis-url")
+
+    parser.add_argument("--recording", help="Replay file (default: synthetic night)")
+    parser.add_argument("--games", type=int, default=6, help="Games in the synthetic night")
+    parser.add_argument("--speedup", type=float, default=10.0)
+    parser.add_argument("--start-at", type=float, default=900.0, help="Recording second to start from")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Producer cycle (s)")
+    parser.add_argument("--sse", type=int, default=200)
+    parser.add_argument("--sse-mode", choices=("full", "delta"), default="delta")
+    parser.add_argument("--ws", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--idle", type=float, default=5.0, help="Idle sampling before clients (s)")
+    parser.add_argument("--replay-port", type=int, default=8765)
+    parser.add_argument("--app-port", type=int, default=8781)
+    parser.add_argument("--redis-url", help="Redis for presence lookups (default: disabled)")
+    parser.add_argument("--target", help="Benchmark a running server instead of spawning one")
+    parser.add_argument("--target-pid", type=int, help="PID of --target for CPU/RSS sampling")
+    parser.add_argument("--json", help="Write the report here")
+    parser.add_argument("--baseline", help="Previous --json report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(message)s")
+
+    if args.command == "app":
+        serve_app(args.port, args.poll_interval, args.redis_url)
+        return 0
+
+    report = asyncio.run(run_benchmark(args))
+    _print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            regressions = compare(report, json.load(fh), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,552 @@
+"""
+Pulse Replay Server — Stand-in NBA CDN / ESPN for Load Tests
+=============================================================
+Serves recorded scoreboard, boxscore and ESPN play-by-play JSON on the
+same paths as cdn.nba.com and site.api.espn.com, walking through the
+recording at a configurable speed-up. Point the live pipeline at it:
+
+    NBA_CDN_BASE_URL=http://127.0.0.1:8765     (AsyncNBAApiAdapter, CDN PBP)
+    ESPN_API_BASE_URL=http://127.0.0.1:8765    (pbp_client)
+
+Recording format — JSONL (optionally .jsonl.gz), one body per line, ordered by t:
+
+    {"t": <seconds since start>, "path": "/static/json/...",
+     "query": "event=401810734", "body": {...}}
+
+At replay time T a resource answers with its latest line where
+t <= T * speedup (404 before its first line). Bodies are encoded once at
+load and served with an ETag, so If-None-Match revalidation returns 304
+exactly like the real CDN and exercises the adapter's conditional GETs.
+
+Usage:
+    # Capture a real game night (only changed bodies are written)
+    python scripts/pulse_replay_server.py record --out night.jsonl --duration 10800
+
+    # Generate a deterministic synthetic night (no network needed)
+    python scripts/pulse_replay_server.py synthesize --out synth.jsonl.gz --games 6
+
+    # Serve it 10x faster than real time
+    python scripts/pulse_replay_server.py serve --recording synth.jsonl.gz --speedup 10
+
+    GET /_replay/status   clock position, resources, hit/304/404 counters
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from bisect import bisect_right
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from aiohttp import ClientSession, ClientTimeout, web
+
+logger = logging.getLogger("pulse_replay")
+
+# ============================================================================
+# UPSTREAM PATHS (must match the live clients)
+# ============================================================================
+
+SCOREBOARD_PATH = "/static/json/liveData/scoreboard/todaysScoreboard_00.json"
+BOXSCORE_PATH = "/static/json/liveData/boxscore/boxscore_{game_id}.json"
+CDN_PBP_PATH = "/static/json/liveData/playbyplay/playbyplay_{game_id}.json"
+ESPN_SCOREBOARD_PATH = "/apis/site/v2/sports/basketball/nba/scoreboard"
+ESPN_SUMMARY_PATH = "/apis/site/v2/sports/basketball/nba/summary"
+
+NBA_CDN = "https://cdn.nba.com"
+ESPN_SITE_API = "https://site.api.espn.com"
+ESPN_WEB_API = "https://site.web.api.espn.com"
+
+RECORD_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "application/json, text/plain, */*",
+    "Referer": "https://www.nba.com/",
+    "Origin": "https://www.nba.com",
+}
+
+
+def resource_key(path: str, query: str = "") -> str:
+    """Canonical lookup key: path plus the sorted query string."""
+    params = sorted(parse_qsl(query or "", keep_blank_values=True))
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+def open_recording(path: str, mode: str = "r"):
+    """Open a recording as text; a .gz suffix means gzip (bodies compress ~20x)."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _encode(body: Any) -> bytes:
+    return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+
+# ============================================================================
+# TIMELINE
+# ============================================================================
+
+class ReplayTimeline:
+    """Per-resource, time-ordered list of pre-encoded response bodies."""
+
+    def __init__(self):
+        self._times: Dict[str, List[float]] = {}
+        self._bodies: Dict[str, List[Tuple[str, bytes]]] = {}
+        self.duration = 0.0
+
+    def add(self, t: float, path: str, query: str, body: Any):
+        """Append one body; lines for a given resource must arrive in t order."""
+        key = resource_key(path, query)
+        raw = body if isinstance(body, bytes) else _encode(body)
+        etag = '"' + hashlib.blake2b(raw, digest_size=12).hexdigest() + '"'
+        times = self._times.setdefault(key, [])
+        if times and t < times[-1]:
+            raise ValueError(f"Out-of-order line for {key}: {t} < {times[-1]}")
+        times.append(float(t))
+        self._bodies.setdefault(key, []).append((etag, raw))
+        self.duration = max(self.duration, float(t))
+
+    @classmethod
+    def from_records(cls, records) -> "ReplayTimeline":
+        timeline = cls()
+        for rec in sorted(records, key=lambda r: r["t"]):
+            timeline.add(rec["t"], rec["path"], rec.get("query", ""), rec["body"])
+        return timeline
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayTimeline":
+        with open_recording(path) as fh:
+            return cls.from_records(json.loads(line) for line in fh if line.strip())
+
+    def lookup(self, key: str, at: float) -> Optional[Tuple[str, bytes]]:
+        """(etag, body) current at recording time `at`, or None."""
+        times = self._times.get(key)
+        if not times:
+            return None
+        i = bisect_right(times, at) - 1
+        return self._bodies[key][i] if i >= 0 else None
+
+    def keys(self) -> List[str]:
+        return sorted(self._times)
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._times.values())
+
+
+class ReplayClock:
+    """Maps wall time to recording time."""
+
+    def __init__(self, speedup: float = 1.0, start_at: float = 0.0,
+                 loop_after: Optional[float] = None):
+        self.speedup = speedup
+        self.start_at = start_at
+        self.loop_after = loop_after
+        self._t0 = time.monotonic()
+
+    def now(self) -> float:
+        t = self.start_at + (time.monotonic() - self._t0) * self.speedup
+        if self.loop_after:
+            t %= self.loop_after
+        return t
+
+
+# ============================================================================
+# HTTP SERVER
+# ============================================================================
+
+def create_app(timeline: ReplayTimeline, clock: ReplayClock) -> web.Application:
+    """aiohttp app answering every recorded path from `timeline` at `clock`."""
+    counters = {"ok": 0, "not_modified": 0, "not_found": 0}
+
+    async def status(request: web.Request) -> web.Response:
+        return web.json_response({
+            "t": round(clock.now(), 3),
+            "duration": timeline.duration,
+            "speedup": clock.speedup,
+            "resources": len(timeline.keys()),
+            "bodies": len(timeline),
+            **counters,
+        })
+
+    async def serve(request: web.Request) -> web.Response:
+        hit = timeline.lookup(resource_key(request.path, request.query_string), clock.now())
+        if hit is None:
+            counters["not_found"] += 1
+            return web.json_response({"error": "not recorded yet"}, status=404)
+        etag, body = hit
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("If-None-Match") == etag:
+            counters["not_modified"] += 1
+            return web.Response(status=304, headers=headers)
+        counters["ok"] += 1
+        return web.Response(body=body, content_type="application/json", headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/_replay/status", status)
+    app.router.add_get("/{tail:.*}", serve)
+    return app
+
+
+# ============================================================================
+# RECORDER
+# ============================================================================
+
+async def _fetch(session: ClientSession, url: str) -> Optional[Any]:
+    try:
+        async with session.get(url) as resp:
+            if resp.status != 200:
+                return None
+            return await resp.json(content_type=None)
+    except Exception as e:
+        logger.warning(f"[REPLAY] fetch failed {url}: {e}")
+        return None
+
+
+async def record(out: str, duration: float, interval: float) -> int:
+    """
+    Poll the real CDN/ESPN endpoints and append changed bodies to `out`.
+
+    Boxscores and ESPN summaries are captured for live games, plus one
+    final capture when a game ends. Returns the number of lines written.
+    """
+    written = 0
+    last_hash: Dict[str, str] = {}
+    finals_done = set()
+    start = time.monotonic()
+    timeout = ClientTimeout(connect=5, total=15)
+
+    async with ClientSession(headers=RECORD_HEADERS, timeout=timeout) as session:
+        with open_recording(out, "a") as fh:
+            while time.monotonic() - start < duration:
+                t = round(time.monotonic() - start, 3)
+                fetched: List[Tuple[str, str, Any]] = []
+
+                scoreboard = await _fetch(session, NBA_CDN + SCOREBOARD_PATH)
+                if scoreboard:
+                    fetched.append((SCOREBOARD_PATH, "", scoreboard))
+                    for game in scoreboard.get("scoreboard", {}).get("games", []):
+                        gid, status = game.get("gameId"), game.get("gameStatus")
+                        if status == 2 or (status == 3 and gid not in finals_done):
+                            if status == 3:
+                                finals_done.add(gid)
+                            path = BOXSCORE_PATH.format(game_id=gid)
+                            fetched.append((path, "", await _fetch(session, NBA_CDN + path)))
+
+                espn = await _fetch(session, ESPN_SITE_API + ESPN_SCOREBOARD_PATH)
+                if espn:
+                    fetched.append((ESPN_SCOREBOARD_PATH, "", espn))
+                    for event in espn.get("events", []):
+                        state = event.get("status", {}).get("type", {}).get("state")
+                        key = f"espn:{event.get('id')}"
+                        if state == "in" or (state == "post" and key not in finals_done):
+                            if state == "post":
+                                finals_done.add(key)
+                            query = f"event={event.get('id')}"
+                            body = await _fetch(session, f"{ESPN_WEB_API}{ESPN_SUMMARY_PATH}?{query}")
+                            fetched.append((ESPN_SUMMARY_PATH, query, body))
+
+                for path, query, body in fetched:
+                    if body is None:
+                        continue
+                    raw = _encode(body)
+                    digest = hashlib.blake2b(raw, digest_size=12).hexdigest()
+                    key = resource_key(path, query)
+                    if last_hash.get(key) == digest:
+                        continue
+                    last_hash[key] = digest
+                    fh.write(json.dumps({"t": t, "path": path, "query": query, "body": body},
+                                        separators=(",", ":")) + "\n")
+                    written += 1
+                fh.flush()
+                logger.info(f"[REPLAY] t={t:.0f}s fetched={len(fetched)} written={written}")
+                await asyncio.sleep(interval)
+    return written
+
+
+# ============================================================================
+# SYNTHETIC GAME NIGHT
+# ============================================================================
+
+_TRICODES = ["BOS", "NYK", "LAL", "GSW", "MIL", "PHI", "DEN", "PHX",
+             "MIA", "DAL", "OKC", "MIN", "CLE", "SAC", "IND", "ORL"]
+PERIOD_SECONDS = 720
+GAME_SECONDS = 4 * PERIOD_SECONDS
+
+
+def _clock_iso(seconds_left: float) -> str:
+    m, s = divmod(int(seconds_left), 60)
+    return f"PT{m:02d}M{s:02d}.00S"
+
+
+def _minutes_iso(seconds: float) -> str:
+    m, s = divmod(int(seconds), 60)
+    return f"PT{m}M{s:02d}.00S"
+
+
+class _SynthGame:
+    """One simulated game: rosters, running box score and ESPN play list."""
+
+    STAT_KEYS = ("points", "fieldGoalsMade", "fieldGoalsAttempted", "threePointersMade",
+                 "threePointersAttempted", "freeThrowsMade", "freeThrowsAttempted",
+                 "reboundsOffensive", "reboundsDefensive", "reboundsTotal", "assists",
+                 "steals", "blocks", "turnovers", "foulsPersonal", "plusMinusPoints")
+
+    def __init__(self, index: int, tip_off: float, rng: random.Random):
+        self.rng = rng
+        self.tip_off = tip_off
+        self.game_id = f"00225{index:05d}"
+        self.espn_id = str(401900000 + index)
+        self.teams = {}
+        for side, offset in (("home", 0), ("away", 1)):
+            tricode = _TRICODES[(2 * index + offset) % len(_TRICODES)]
+            self.teams[side] = {
+                "teamId": str(1610612700 + (2 * index + offset) % 30),
+                "teamTricode": tricode,
+                "score": 0,
+                "players": [
+                    {"personId": 1700000 + index * 100 + offset * 50 + n,
+                     "name": f"{tricode} Player {n + 1}",
+                     "status": "ACTIVE",
+                     "statistics": {k: 0 for k in self.STAT_KEYS}}
+                    for n in range(10)
+                ],
+            }
+        self.plays: List[Dict[str, Any]] = []
+        self.elapsed = 0.0
+        self._next_possession = 0.0
+
+    def status(self, t: float) -> int:
+        if t < self.tip_off:
+            return 1
+        return 2 if t - self.tip_off < GAME_SECONDS else 3
+
+    @property
+    def period(self) -> int:
+        return min(4, int(self.elapsed // PERIOD_SECONDS) + 1) if self.elapsed else 0
+
+    def _clock(self) -> float:
+        return max(0.0, self.period * PERIOD_SECONDS - self.elapsed)
+
+    def _play(self, side: str, player: Dict, text: str, kind: str,
+              points: int = 0, shooting: bool = False, extra: Optional[Dict] = None):
+        home, away = self.teams["home"]["score"], self.teams["away"]["score"]
+        participants = [{"athlete": {"id": str(player["personId"])}}]
+        if extra:
+            participants.append({"athlete": {"id": str(extra["personId"])}})
+        play = {
+            "id": f"{self.espn_id}{len(self.plays) + 1:05d}",
+            "sequenceNumber": str(len(self.plays) + 1),
+            "type": {"text": kind},
+            "text": f"{player['name']} {text}",
+            "period": {"number": self.period},
+            "clock": {"displayValue": "%d:%02d" % divmod(int(self._clock()), 60)},
+            "homeScore": home,
+            "awayScore": away,
+            "team": {"id": self.teams[side]["teamId"]},
+            "scoringPlay": points > 0,
+            "shootingPlay": shooting,
+            "scoreValue": points,
+            "participants": participants,
+        }
+        if shooting:
+            play["coordinate"] = {"x": self.rng.randint(0, 50), "y": self.rng.randint(0, 30)}
+        self.plays.append(play)
+
+    def advance(self, seconds: float):
+        """Simulate `seconds` of game clock: roughly one possession per 14s."""
+        target = min(GAME_SECONDS, self.elapsed + seconds)
+        while self._next_possession <= target:
+            self.elapsed = self._next_possession
+            self._next_possession += self.rng.uniform(10, 18)
+            self._possession()
+        self.elapsed = target
+        for team in self.teams.values():
+            for p in team["players"][:8]:
+                p["statistics"]["minutes"] = _minutes_iso(self.elapsed * 0.6)
+
+    def _possession(self):
+        side = self.rng.choice(("home", "away"))
+        team, other = self.teams[side], self.teams["away" if side == "home" else "home"]
+        shooter = self.rng.choice(team["players"])
+        st = shooter["statistics"]
+        roll = self.rng.random()
+        if roll < 0.12:
+            st["turnovers"] += 1
+            self._play(side, shooter, "bad pass", "Lost Ball Turnover")
+            return
+        if roll < 0.22:
+            st["freeThrowsAttempted"] += 2
+            made = self.rng.choice((1, 2, 2))
+            st["freeThrowsMade"] += made
+            self._add_points(team, other, shooter, made)
+            self._play(side, shooter, f"makes {made} of 2 free throws", "Free Throw",
+                       points=made, shooting=True)
+            return
+        three = self.rng.random() < 0.38
+        st["fieldGoalsAttempted"] += 1
+        if three:
+            st["threePointersAttempted"] += 1
+        if self.rng.random() < (0.36 if three else 0.52):
+            points = 3 if three else 2
+            st["fieldGoalsMade"] += 1
+            if three:
+                st["threePointersMade"] += 1
+            self._add_points(team, other, shooter, points)
+            assister = None
+            if self.rng.random() < 0.6:
+                assister = self.rng.choice([p for p in team["players"] if p is not shooter])
+                assister["statistics"]["assists"] += 1
+            self._play(side, shooter, f"makes {points}-pt shot", "Jump Shot",
+                       points=points, shooting=True, extra=assister)
+            return
+        self._play(side, shooter, "misses shot", "Jump Shot", shooting=True)
+        rebounder = self.rng.choice(other["players"] + team["players"][:3])
+        offensive = rebounder in team["players"]
+        rs = rebounder["statistics"]
+        rs["reboundsOffensive" if offensive else "reboundsDefensive"] += 1
+        rs["reboundsTotal"] += 1
+        self._play(side if offensive else ("away" if side == "home" else "home"), rebounder,
+                   "rebound", "Offensive Rebound" if offensive else "Defensive Rebound")
+
+    @staticmethod
+    def _add_points(team: Dict, other: Dict, shooter: Dict, points: int):
+        shooter["statistics"]["points"] += points
+        team["score"] += points
+        for p in team["players"][:5]:
+            p["statistics"]["plusMinusPoints"] += points
+        for p in other["players"][:5]:
+            p["statistics"]["plusMinusPoints"] -= points
+
+    def _status_text(self, status: int) -> str:
+        if status == 1:
+            return "7:30 pm ET"
+        if status == 3:
+            return "Final"
+        m, s = divmod(int(self._clock()), 60)
+        return f"Q{self.period} {m}:{s:02d}"
+
+    def scoreboard_row(self, t: float) -> Dict[str, Any]:
+        status = self.status(t)
+        return {
+            "gameId": self.game_id,
+            "gameStatus": status,
+            "gameStatusText": self._status_text(status),
+            "period": self.period,
+            "gameClock": _clock_iso(self._clock()) if status == 2 else "",
+            "homeTeam": {k: self.teams["home"][k] for k in ("teamId", "teamTricode", "score")},
+            "awayTeam": {k: self.teams["away"][k] for k in ("teamId", "teamTricode", "score")},
+        }
+
+    def boxscore(self, t: float) -> Dict[str, Any]:
+        return {"game": {**self.scoreboard_row(t),
+                         "homeTeam": self.teams["home"], "awayTeam": self.teams["away"]}}
+
+    def espn_event(self, t: float) -> Dict[str, Any]:
+        state = {1: "pre", 2: "in", 3: "post"}[self.status(t)]
+        home, away = self.teams["home"]["teamTricode"], self.teams["away"]["teamTricode"]
+        return {
+            "id": self.espn_id,
+            "name": f"{away} at {home}",
+            "status": {"type": {"state": state, "description": self._status_text(self.status(t))}},
+        }
+
+
+def synthesize(games: int = 4, step: float = 10.0, stagger: float = 600.0,
+               seed: int = 7) -> Iterator[Dict[str, Any]]:
+    """
+    Yield recording lines for a deterministic synthetic game night.
+
+    Game i tips off at i * stagger seconds; game time runs at wall speed
+    (no stoppages). A line is emitted only when a resource's body changes.
+    """
+    rng = random.Random(seed)
+    night = [_SynthGame(i, i * stagger, rng) for i in range(games)]
+    end = (games - 1) * stagger + GAME_SECONDS + step
+    last: Dict[str, bytes] = {}
+    t = 0.0
+    while t <= end:
+        bodies: List[Tuple[str, str, Any]] = []
+        for game in night:
+            if game.status(t) == 2:
+                game.advance(step)
+            if game.status(t) >= 2:
+                bodies.append((BOXSCORE_PATH.format(game_id=game.game_id), "", game.boxscore(t)))
+                bodies.append((ESPN_SUMMARY_PATH, f"event={game.espn_id}", {"plays": list(game.plays)}))
+        bodies.append((SCOREBOARD_PATH, "", {"scoreboard": {
+            "gameDate": "2026-01-15", "games": [g.scoreboard_row(t) for g in night]}}))
+        bodies.append((ESPN_SCOREBOARD_PATH, "", {"events": [g.espn_event(t) for g in night]}))
+        for path, query, body in bodies:
+            key = resource_key(path, query)
+            raw = _encode(body)
+            if last.get(key) != raw:
+                last[key] = raw
+                yield {"t": t, "path": path, "query": query, "body": body}
+        t += step
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def serve(recording: str, host: str, port: int, speedup: float, start_at: float, loop: bool):
+    timeline = ReplayTimeline.load(recording)
+    clock = ReplayClock(speedup, start_at, loop_after=(timeline.duration + 1) if loop else None)
+    logger.info(
+        f"[REPLAY] {len(timeline)} bodies / {len(timeline.keys())} resources, "
+        f"{timeline.duration:.0f}s recorded, serving at {speedup}x on {host}:{port}"
+    )
+    web.run_app(create_app(timeline, clock), host=host, port=port, print=None)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("serve", help="Serve a recording")
+    p.add_argument("--recording", required=True)
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--speedup", type=float, default=1.0)
+    p.add_argument("--start-at", type=float, default=0.0, help="Recording second to start from")
+    p.add_argument("--loop", action="store_true", help="Restart from t=0 after the last line")
+
+    p = sub.add_parser("record", help="Record a live game night")
+    p.add_argument("--out", required=True)
+    p.add_argument("--duration", type=float, default=3 * 3600)
+    p.add_argument("--interval", type=float, default=5.0)
+
+    p = sub.add_parser("synthesize", help="Write a synthetic game night")
+    p.add_argument("--out", required=True)
+    p.add_argument("--games", type=int, default=4)
+    p.add_argument("--step", type=float, default=10.0)
+    p.add_argument("--stagger", type=float, default=600.0)
+    p.add_argument("--seed", type=int, default=7)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    if args.command == "serve":
+        serve(args.recording, args.host, args.port, args.speedup, args.start_at, args.loop)
+    elif args.command == "record":
+        lines = asyncio.run(record(args.out, args.duration, args.interval))
+        print(f"Recorded {lines} bodies to {args.out}")
+    else:
+        lines = 0
+        with open_recording(args.out, "w") as fh:
+            for rec in synthesize(args.games, args.step, args.stagger, args.seed):
+                fh.write(json.dumps(rec, separators=(",", ":")) + "\n")
+                lines += 1
+        print(f"Wrote {lines} bodies ({os.path.getsize(args.out) / 1e6:.1f} MB) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
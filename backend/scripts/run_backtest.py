@@ -0,0 +1,109 @@
+"""
+Historical Backtest
+===================
+Replays EMA -> Vertex Monte Carlo -> Confluence over stored game logs for
+a date range and reports MAE, Floor-Ceiling calibration and hit rate per
+config. --grid turns one run into a parameter sweep (cartesian product);
+--ledger adds what production actually recorded over the same range.
+
+    python scripts/run_backtest.py --start 2025-01-01 --end 2025-01-31
+    python scripts/run_backtest.py --start 2025-01-01 --end 2025-01-31 \\
+        --grid ema_alpha=0.1,0.15,0.2 --grid n_simulations=2000,10000 --workers 8
+    python scripts/run_backtest.py --start 2025-01-01 --end 2025-01-31 \\
+        --grid confluence_weights=0.4/0.3/0.3,0.2/0.3/0.5 --ledger data/learning_ledger.db --json
+"""
+import argparse
+import json
+import logging
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from backtest import (
+    BacktestConfig,
+    expand_grid,
+    format_reports,
+    records_from_ledger,
+    run_backtest,
+    summarize,
+    summarize_run,
+)
+
+DEFAULT_DB = BACKEND_DIR / 'data' / 'nba_data.db'
+CONFLUENCE_KEYS = ('model_agreement', 'sample_size', 'historical_accuracy')
+
+
+def parse_grid_value(key: str, raw: str):
+    """One --grid value, typed like the BacktestConfig field it overrides."""
+    if key == 'confluence_weights':
+        weights = [float(w) for w in raw.split('/')]
+        if len(weights) != len(CONFLUENCE_KEYS):
+            raise argparse.ArgumentTypeError(f"confluence_weights needs {len(CONFLUENCE_KEYS)} values: {raw}")
+        return dict(zip(CONFLUENCE_KEYS, weights))
+    default = getattr(BacktestConfig(), key)
+    if isinstance(default, bool):
+        return raw.lower() in ('1', 'true', 'yes', 'on')
+    return type(default)(raw)
+
+
+def parse_grid(entries):
+    grid = {}
+    for entry in entries:
+        key, _, values = entry.partition('=')
+        if key not in BacktestConfig.__dataclass_fields__ or key in ('name', 'seed'):
+            raise SystemExit(f"Unknown --grid parameter: {key}")
+        grid[key] = [parse_grid_value(key, v) for v in values.split(',') if v]
+    return grid
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="SQLite DB with player_game_logs")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="First game date (default: 30 days ago)")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="Last game date (default: yesterday)")
+    parser.add_argument("--players", nargs="*", default=None, help="Limit to these player IDs")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: all CPUs; 1 = in-process)")
+    parser.add_argument("--alpha", type=float, default=BacktestConfig.ema_alpha)
+    parser.add_argument("--lookback", type=int, default=BacktestConfig.lookback)
+    parser.add_argument("--sims", type=int, default=BacktestConfig.n_simulations)
+    parser.add_argument("--seed", type=int, default=BacktestConfig.seed)
+    parser.add_argument("--grid", action="append", default=[], metavar="PARAM=V1,V2",
+                        help="Sweep a BacktestConfig field (repeatable)")
+    parser.add_argument("--ledger", type=Path, default=None, help="learning_ledger.db to report alongside")
+    parser.add_argument("--json", action="store_true", help="Print reports as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='[BACKTEST] %(message)s')
+    end = args.end or date.today() - timedelta(days=1)
+    start = args.start or end - timedelta(days=29)
+
+    base = BacktestConfig(ema_alpha=args.alpha, lookback=args.lookback, n_simulations=args.sims, seed=args.seed)
+    configs = expand_grid(base, parse_grid(args.grid))
+    run = run_backtest(args.db, configs, start, end, players=args.players, workers=args.workers)
+    reports = summarize_run(run.records)
+
+    if args.ledger:
+        from aegis.learning_ledger import LearningLedger
+        rows = LearningLedger(args.ledger).get_audited_between(start, end)
+        reports.append(summarize('ledger (production)', records_from_ledger(rows)))
+
+    if args.json:
+        print(json.dumps({
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'players': run.players,
+            'workers': run.workers,
+            'configs': {c.name: c.to_dict() for c in configs},
+            'reports': [r.to_dict() for r in reports],
+        }, indent=2))
+    else:
+        print(f"{start} .. {end}: {run.players} players, {len(configs)} config(s), {run.workers} worker(s)\n")
+        print(format_reports(reports))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
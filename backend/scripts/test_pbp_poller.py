@@ -19,13 +19,15 @@ async def test_poller():
     print("2. Current tracked games:", pbp_polling_manager.get_tracked_games())
     
     print("3. Subscribing to SSE queue...")
-    q = pbp_polling_manager.subscribe_sse(game_id)
+    channel = pbp_polling_manager.get_channel(game_id)
+    sub = pbp_polling_manager.subscribe_sse(game_id)
     
     print("4. Waiting for first poll event...")
     try:
         # We wait up to 15 seconds for the queue to get populated by the poll loop
-        new_plays = await asyncio.wait_for(q.get(), timeout=15.0)
-        print(f"[PASS] SSE Queue received payload containing {len(new_plays)} plays.")
+        frame = await asyncio.wait_for(sub.queue.get(), timeout=15.0)
+        print(f"[PASS] SSE Queue received batch containing {len(frame.plays)} plays.")
+        print("Buffer stats:", channel.stats())
     except asyncio.TimeoutError:
         print("[FAIL] SSE Queue timed out waiting for payload.")
         
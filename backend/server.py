@@ -2134,6 +2134,7 @@ async def aegis_matchup(
             "edge_reason": result.edge_reason,
             "usage_vacuum_applied": result.usage_vacuum_applied,
             "execution_time_ms": result.execution_time_ms,
+            "stage_timings_ms": result.stage_timings_ms,
             "game_date": result.game_date
         }
         
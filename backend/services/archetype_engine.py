@@ -214,10 +214,33 @@ class ArchetypeEngine:
         Analyze player stats + TRACKING DATA to assign archetypes.
         Returns primary and secondary archetype with confidence scores.
         """
-        stats = self._get_player_stats(player_id)
-        if not stats:
-            return {'primary': None, 'secondary': None, 'scores': {}}
-        
+        return self.classify_players([player_id])[str(player_id)]
+    
+    def classify_players(self, player_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Bulk classify_player: one stats query and one write transaction for
+        the whole batch (e.g. both War Room rosters) instead of a read and a
+        write per player. Returns results keyed by str(player_id).
+        """
+        ids = list(dict.fromkeys(str(pid) for pid in player_ids))
+        stats_by_id = self._get_players_stats(ids)
+        
+        results = {}
+        rows = []
+        for player_id in ids:
+            stats = stats_by_id.get(player_id)
+            if not stats:
+                results[player_id] = {'primary': None, 'secondary': None, 'scores': {}}
+                continue
+            result = self._classify_stats(player_id, stats)
+            results[player_id] = result
+            rows.append(result)
+        
+        self._save_archetypes(rows)
+        return results
+    
+    def _classify_stats(self, player_id: str, stats: Dict) -> Dict:
+        """Score archetypes and friction for one player's stats (no I/O besides tracking)."""
         # Merge tracking data if available
         tracking_used = False
         if self.tracking:
@@ -242,10 +265,6 @@ class ArchetypeEngine:
         # Generate friction matrix for this player
         friction = self._generate_player_friction(primary, secondary, stats)
         
-        # Save to database
-        self._save_archetype(player_id, stats.get('name', 'Unknown'), primary, 
-                            secondary, scores, friction, tracking_used)
-        
         return {
             'player_id': player_id,
             'name': stats.get('name', 'Unknown'),
@@ -359,23 +378,35 @@ class ArchetypeEngine:
     
     def _get_player_stats(self, player_id: str) -> Optional[Dict]:
         """Get player's stats for archetype classification"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        # Try rolling averages first
-        cursor.execute("""
-            SELECT pra.*, pb.player_name as name, pb.height
-            FROM player_rolling_averages pra
-            LEFT JOIN player_bio pb ON pra.player_id = pb.player_id
-            WHERE pra.player_id = ?
-        """, (str(player_id),))
-        
-        row = cursor.fetchone()
-        conn.close()
-        
-        if not row:
-            return None
+        return self._get_players_stats([str(player_id)]).get(str(player_id))
+    
+    def _get_players_stats(self, player_ids: List[str]) -> Dict[str, Dict]:
+        """Stats for archetype classification, keyed by player_id, in one query per chunk"""
+        found = {}
+        if not player_ids:
+            return found
         
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(player_ids), 500):
+                chunk = player_ids[i:i + 500]
+                cursor.execute(f"""
+                    SELECT pra.*, pb.player_name as name, pb.height
+                    FROM player_rolling_averages pra
+                    LEFT JOIN player_bio pb ON pra.player_id = pb.player_id
+                    WHERE pra.player_id IN ({','.join('?' * len(chunk))})
+                """, chunk)
+                for row in cursor.fetchall():
+                    found.setdefault(str(row['player_id']), self._stats_from_row(row))
+        finally:
+            conn.close()
+        
+        return found
+    
+    @staticmethod
+    def _stats_from_row(row: sqlite3.Row) -> Dict:
         # Parse height to inches
         height_inches = 0
         height_str = row['height'] if 'height' in row.keys() else ''
@@ -411,21 +442,31 @@ class ArchetypeEngine:
     def _save_archetype(self, player_id: str, name: str, primary: str, 
                         secondary: str, scores: Dict, friction: Dict, tracking_used: bool):
         """Save archetype classification to database"""
+        self._save_archetypes([{
+            'player_id': player_id, 'name': name, 'primary': primary, 'secondary': secondary,
+            'scores': scores, 'friction_matrix': friction, 'tracking_data_used': tracking_used,
+        }])
+    
+    def _save_archetypes(self, results: List[Dict]):
+        """Save a batch of classify results in one transaction"""
+        if not results:
+            return
+        now = datetime.now().isoformat()
         conn = self._get_connection()
-        
-        conn.execute("""
-            INSERT OR REPLACE INTO player_archetypes
-            (player_id, player_name, primary_archetype, secondary_archetype,
-             archetype_scores, friction_matrix, tracking_data_used, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            str(player_id), name, primary, secondary,
-            json.dumps(scores), json.dumps(friction), 1 if tracking_used else 0,
-            datetime.now().isoformat()
-        ))
-        
-        conn.commit()
-        conn.close()
+        try:
+            conn.executemany("""
+                INSERT OR REPLACE INTO player_archetypes
+                (player_id, player_name, primary_archetype, secondary_archetype,
+                 archetype_scores, friction_matrix, tracking_data_used, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                str(r['player_id']), r['name'], r['primary'], r['secondary'],
+                json.dumps(r['scores']), json.dumps(r['friction_matrix']),
+                1 if r['tracking_data_used'] else 0, now
+            ) for r in results])
+            conn.commit()
+        finally:
+            conn.close()
     
     def get_archetype(self, player_id: str) -> Optional[Dict]:
         """Get cached archetype for player"""
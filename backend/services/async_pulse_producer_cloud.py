@@ -16,6 +16,8 @@ import time
 from typing import Dict, List, Optional, Any, Set
 from datetime import datetime, timedelta
 
+import numpy as np
+
 # Import shared_core for math parity with desktop
 import sys
 from pathlib import Path
@@ -41,15 +43,16 @@ try:
     
     from adapters.nba_api_adapter import (
         AsyncNBAApiAdapter,
+        BoxScoreColumns,
         NormalizedBoxScore,
         get_nba_adapter,
         is_garbage_time
     )
-    from engines.pie_calculator import calculate_live_pie
+    from engines.pie_calculator import calculate_live_pie_many
     from calculators.advanced_stats import (
-        calculate_true_shooting, 
-        calculate_effective_fg,
-        calculate_in_game_usage
+        calculate_true_shooting_many,
+        calculate_effective_fg_many,
+        calculate_in_game_usage_many
     )
     ADAPTER_AVAILABLE = True
     logging.info("✅ Shared core loaded successfully")
@@ -61,40 +64,59 @@ except ImportError as e:
 from services.firebase_admin_service import get_firebase_service
 from services.game_log_persister import GameLogPersister
 from services.pulse_stats_archiver import get_pulse_archiver
+from services.live_broadcast_hub import get_live_hub
+from services.live_delta import LiveDeltaEncoder
 
-# Cloud SQL data service for Alpha metrics (optional - not all deployments have this)
+# Season baselines for Alpha metrics (league snapshot from Firestore)
 try:
-    from services.cloud_sql_data_service import (
-        get_team_defense_rating,
-        get_player_season_usage,
-        get_player_rolling_ts,
-        calculate_usage_vacuum,
-        calculate_heat_scale,
+    from services.season_baseline_service import (
+        gather_leader_baselines,
+        calculate_usage_vacuum_many,
+        calculate_heat_scale_many,
+        warm_cache as warm_baselines,
         LEAGUE_AVG_DEF_RATING
     )
-    CLOUD_SQL_AVAILABLE = True
+    BASELINES_AVAILABLE = True
 except ImportError:
-    CLOUD_SQL_AVAILABLE = False
+    BASELINES_AVAILABLE = False
     LEAGUE_AVG_DEF_RATING = 110.0
     
-    def get_team_defense_rating(team_tricode: str):
-        """Fallback: return league average when Cloud SQL unavailable."""
-        return LEAGUE_AVG_DEF_RATING, 'average'
-    
-    def get_player_season_usage(player_id: str):
-        return 0.20  # League average usage rate
-    
-    def get_player_rolling_ts(player_id: str):
-        return 0.55  # League average TS%
+    def gather_leader_baselines(player_ids, opponents):
+        """Fallback: league averages when the baseline service is unavailable."""
+        n = len(player_ids)
+        return {
+            'season_usage': [0.20] * n,  # League average usage rate
+            'season_ts': [0.55] * n,  # League average TS%
+            'def_rating': [LEAGUE_AVG_DEF_RATING] * n,
+            'matchup_difficulty': ['average'] * n,
+        }
     
-    def calculate_usage_vacuum(current_usage, season_avg):
-        return False
+    def calculate_usage_vacuum_many(current_usage, season_avg):
+        return np.zeros(len(current_usage), dtype=bool)
     
-    def calculate_heat_scale(current_ts, season_avg_ts):
-        return 'steady'
+    def calculate_heat_scale_many(current_ts, season_avg_ts):
+        return np.full(len(current_ts), 'steady', dtype=object)
 
 logger = logging.getLogger(__name__)
 
+LEADERBOARD_SIZE = 10
+BROADCAST_LEADERS = 20
+
+
+def _top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest values, largest first, in O(n) via argpartition.
+    Ties keep their original order, matching a stable descending sort.
+    """
+    n = len(values)
+    if n > k:
+        kth = values[np.argpartition(values, n - k)[n - k]]
+        above = np.flatnonzero(values > kth)
+        idx = np.concatenate([above, np.flatnonzero(values == kth)[:k - len(above)]])
+    else:
+        idx = np.arange(n)
+    return idx[np.lexsort((idx, -values[idx]))]
+
 
 class CloudAsyncPulseProducer:
     """
@@ -123,6 +145,18 @@ class CloudAsyncPulseProducer:
         # the latest payload without re-hitting Firestore per connection.
         self._latest_snapshot: Optional[Dict] = None
         self._latest_leaders: List[Dict] = []
+
+        # Cycle-to-cycle structural diffs (patch frames + periodic keyframes).
+        # Seeded from the hub so a new producer never reuses event ids.
+        self._delta_encoder = LiveDeltaEncoder(start_seq=get_live_hub().seq)
+        self._latest_frame: Optional[Dict] = None
+
+        # Last full WebSocket broadcast, replayed (filtered) to new subscribers
+        self._ws_last_broadcast: List[tuple] = []
+
+        # Upstream content versions seen last cycle (see _content_fingerprint)
+        self._last_fingerprint: Optional[tuple] = None
+        self._unchanged_cycles = 0
         
         # Set Firebase on archiver
         if self._firebase and self._pulse_archiver:
@@ -159,6 +193,9 @@ class CloudAsyncPulseProducer:
     
     async def _producer_loop(self):
         """Main producer loop - polls NBA API and writes to Firebase."""
+        if BASELINES_AVAILABLE:
+            # One bulk read of the league baseline snapshot before the first cycle
+            await asyncio.to_thread(warm_baselines)
         while self._running:
             try:
                 start_time = time.perf_counter()
@@ -218,9 +255,24 @@ class CloudAsyncPulseProducer:
             boxscores: Dict[str, Optional[NormalizedBoxScore]] = {}
             if fetch_ids:
                 boxscores = await self._adapter.fetch_all_live_boxscores_async(fetch_ids)
+
+            # Unchanged cycle: the adapter saw 304s / identical bodies for the
+            # scoreboard and every boxscore, so extraction, Firestore writes
+            # and fan-out would all reproduce the previous cycle exactly.
+            fingerprint = self._content_fingerprint(fetch_ids)
+            if fingerprint is not None and fingerprint == self._last_fingerprint \
+                    and self._latest_snapshot is not None:
+                self._unchanged_cycles += 1
+                logger.debug("No upstream change since last cycle — skipping extraction and writes")
+                return
+            self._last_fingerprint = fingerprint
             
-            # Step 4: Process each game and write to Firebase
-            all_leaders = []
+            # Step 4: Score every live player of the cycle in one vectorized
+            # pass, then process each game and write to Firebase
+            live_leaders, live_rows, live_pie = self._score_leaders([
+                (boxscores[g.game_id], g.home_team_tricode, g.away_team_tricode)
+                for g in games if g.status == 'LIVE' and boxscores.get(g.game_id)
+            ])
             game_meta_map = {}
             
             for game_info in games:
@@ -284,15 +336,7 @@ class CloudAsyncPulseProducer:
                 if not boxscore:
                     continue
                 
-                # Extract leaders from boxscore
-                leaders = self._extract_leaders_from_normalized(
-                    boxscore,
-                    home_team=game_info.home_team_tricode,
-                    away_team=game_info.away_team_tricode
-                )
-                
-                # Collect for leaderboard
-                all_leaders.extend(leaders)
+                leaders = live_leaders.get(boxscore.game_id, [])
                 
                 # Detect garbage time
                 garbage_time_active = is_garbage_time(
@@ -349,9 +393,9 @@ class CloudAsyncPulseProducer:
                     )
             
             # Step 5: Update global leaderboard (top 10 across all games)
-            if all_leaders:
-                all_leaders.sort(key=lambda x: x['pie'], reverse=True)
-                top_10_leaders = all_leaders[:10]
+            ranked_leaders = [live_rows[i] for i in _top_k(live_pie, BROADCAST_LEADERS)]
+            if ranked_leaders:
+                top_10_leaders = ranked_leaders[:LEADERBOARD_SIZE]
 
                 self._latest_leaders = top_10_leaders
                 asyncio.create_task(self._firebase.upsert_live_leaders(top_10_leaders))
@@ -385,7 +429,7 @@ class CloudAsyncPulseProducer:
                         'is_garbage_time': False,
                         'leaders': []
                     })
-            self._latest_snapshot = {
+            snapshot = {
                 'games': live_games_list,
                 'leaders': self._latest_leaders,
                 'meta': {
@@ -394,20 +438,39 @@ class CloudAsyncPulseProducer:
                     'live_count': sum(1 for g in games if g.status == 'LIVE'),
                     'update_cycle': self._update_count,
                 },
-                'changes': {},
             }
+            snapshot['changes'] = self._delta_encoder.changes_for(snapshot)
+            frame = self._delta_encoder.encode(snapshot)
+            self._latest_snapshot = snapshot
+            self._latest_frame = frame
+
+            # Fan out to /live/stream clients: encoded once, pushed to every queue
+            get_live_hub().publish(snapshot, frame)
 
-            # Step 7: Phase 8 — WebSocket broadcast to subscribers
+            # Step 7: Phase 8 — WebSocket broadcast to subscribers (full state)
             try:
                 from vanguard.core.feature_flags import flag
                 if flag("FEATURE_WEBSOCKET_ENABLED"):
-                    await self._ws_broadcast(games, all_leaders, live_games_list)
+                    await self._ws_broadcast(games, ranked_leaders, live_games_list, frame["seq"])
             except Exception as e:
                 logger.debug(f"WS broadcast skipped: {e}")
 
         except Exception as e:
             logger.error(f"❌ Firebase update failed: {e}", exc_info=True)
     
+    def _content_fingerprint(self, fetch_ids: List[str]) -> Optional[tuple]:
+        """
+        Adapter content versions for this cycle's scoreboard and boxscores.
+        None when the adapter cannot report versions (never treated as unchanged).
+        """
+        content_version = getattr(self._adapter, "content_version", None)
+        if content_version is None:
+            return None
+        return (
+            content_version("scoreboard"),
+            tuple(sorted((gid, content_version(f"boxscore:{gid}")) for gid in fetch_ids)),
+        )
+
     def _extract_leaders_from_normalized(
         self, 
         boxscore: 'NormalizedBoxScore',  # String annotation to avoid import-time NameError
@@ -416,92 +479,95 @@ class CloudAsyncPulseProducer:
     ) -> List[Dict]:
 
         """
-        Extract player stats from normalized boxscore.
-        Simplified cloud version - no rolling averages (for now).
+        Extract player stats from normalized boxscore, sorted by PIE.
+        Single-game form of _score_leaders (used for FINAL archival).
         """
-        leaders = []
-        
-        for player in boxscore.all_active_players():
-            # Calculate PIE using shared_core
-            pie = calculate_live_pie(
-                pts=player.pts, fgm=player.fgm, fga=player.fga,
-                ftm=player.ftm, fta=player.fta,
-                oreb=player.oreb, dreb=player.dreb,
-                ast=player.ast, stl=player.stl, blk=player.blk,
-                pf=player.pf, tov=player.tov
-            )
-            
-            # Calculate efficiency metrics
-            ts_pct = round(calculate_true_shooting(player.pts, player.fga, player.fta), 4)
-            efg_pct = round(calculate_effective_fg(player.fgm, player.fg3m, player.fga), 4)
-            
-            # Determine opponent for matchup context
-            opponent_team = away_team if player.team_tricode == home_team else home_team
-            
-            # =================================================================
-            # ALPHA PATCHER: USAGE VACUUM DETECTION (LIVE)
-            # =================================================================
-            usage_rate = None
-            usage_vacuum = False
-            
-            try:
-                # Calculate current in-game usage rate
-                team_stats = boxscore.get_team_stats(player.team_tricode)
-                if team_stats and ADAPTER_AVAILABLE:
-                    usage_rate = calculate_in_game_usage(
-                        player_pts=player.pts,
-                        player_fga=player.fga,
-                        player_fta=player.fta,
-                        player_tov=player.tov,
-                        team_fga=team_stats.fga,
-                        team_fta=team_stats.fta,
-                        team_tov=team_stats.tov
-                    )
-                    
-                    # Query season baseline from Cloud SQL
-                    season_avg_usage = get_player_season_usage(player.player_id)
-                    usage_vacuum = calculate_usage_vacuum(usage_rate, season_avg_usage)
-            except Exception as e:
-                logger.debug(f"Usage calculation failed for {player.name}: {e}")
-            
-            # =================================================================
-            # ALPHA PATCHER: MATCHUP DIFFICULTY DETECTION (LIVE)
-            # =================================================================
-            opponent_def_rating, matchup_difficulty = get_team_defense_rating(opponent_team)
-            
-            # =================================================================
-            # ALPHA PATCHER: HEAT SCALE CALCULATION (LIVE)
-            # =================================================================
-            season_avg_ts = get_player_rolling_ts(player.player_id)
-            heat_scale = calculate_heat_scale(ts_pct, season_avg_ts)
-            
-            # Detect garbage time
-            game_info = boxscore.game_info
-            player_is_garbage_time = is_garbage_time(
-                period=game_info.period,
-                clock_str=game_info.clock,
-                home_score=game_info.home_score,
-                away_score=game_info.away_score
+        leaders_by_game, _, _ = self._score_leaders([(boxscore, home_team, away_team)])
+        return leaders_by_game.get(boxscore.game_id, [])
+
+    def _score_leaders(self, entries: List[tuple]) -> tuple:
+        """
+        Score every active player of a batch of games in one columnar pass.
+
+        entries: (boxscore, home_team, away_team) per game. PIE, TS%, eFG%,
+        in-game usage, usage vacuum and heat scale are computed over
+        BoxScoreColumns arrays, with one baseline gather for the batch.
+
+        Returns (leaders per game_id sorted by PIE descending, leader rows in
+        column order, PIE array aligned with those rows).
+        """
+        if not entries:
+            return {}, [], np.empty(0)
+
+        cols = BoxScoreColumns.from_boxscores(
+            [box for box, _, _ in entries],
+            [(home or box.game_info.home_team_tricode, away or box.game_info.away_team_tricode)
+             for box, home, away in entries],
+        )
+        if not len(cols):
+            return {box.game_id: [] for box, _, _ in entries}, [], np.empty(0)
+
+        s, team = cols.stats, cols.team_totals
+        pie = calculate_live_pie_many(
+            s['pts'], s['fgm'], s['fga'], s['ftm'], s['fta'], s['oreb'], s['dreb'],
+            s['ast'], s['stl'], s['blk'], s['pf'], s['tov']
+        )
+        ts_pct = np.round(calculate_true_shooting_many(s['pts'], s['fga'], s['fta']), 4)
+        efg_pct = np.round(calculate_effective_fg_many(s['fgm'], s['fg3m'], s['fga']), 4)
+
+        # =================================================================
+        # ALPHA PATCHER: USAGE VACUUM / MATCHUP / HEAT SCALE (LIVE)
+        # =================================================================
+        # Elapsed game minutes = the team's floor minutes / 5 players on court
+        usage_rate = np.round(calculate_in_game_usage_many(
+            s['fga'], s['fta'], s['tov'], cols.minutes,
+            team['fga'], team['fta'], team['tov'], team['minutes'] / 5
+        ), 1)
+        baselines = gather_leader_baselines([p.player_id for p in cols.players], cols.opponents)
+        season_usage = np.asarray(baselines['season_usage'], dtype=float)
+        season_ts = np.asarray(baselines['season_ts'], dtype=float)
+        usage_vacuum = calculate_usage_vacuum_many(usage_rate / 100, season_usage)  # baselines are decimals
+        heat_scale = calculate_heat_scale_many(ts_pct, season_ts)
+
+        # Garbage time is per game, not per player
+        garbage = np.zeros(len(cols), dtype=bool)
+        for box, _, _ in entries:
+            info = box.game_info
+            lo, hi = cols.spans[box.game_id]
+            garbage[lo:hi] = is_garbage_time(
+                period=info.period,
+                clock_str=info.clock,
+                home_score=info.home_score,
+                away_score=info.away_score
             )
-            
-            leaders.append({
+
+        rows = []
+        columns = zip(
+            cols.players, cols.opponents, pie.tolist(), ts_pct.tolist(), efg_pct.tolist(),
+            garbage.tolist(), usage_rate.tolist(), usage_vacuum.tolist(),
+            np.asarray(baselines['def_rating'], dtype=float).tolist(),
+            baselines['matchup_difficulty'], season_ts.tolist(), heat_scale,
+        )
+        for (player, opponent, p_pie, p_ts, p_efg, p_garbage, p_usage, p_vacuum,
+             def_rating, difficulty, p_season_ts, heat) in columns:
+            rows.append({
                 'player_id': player.player_id,
                 'name': player.name,
                 'team': player.team_tricode,
-                'pie': pie,
+                'pie': p_pie,
                 'plus_minus': player.plus_minus,
-                'ts_pct': ts_pct,
-                'efg_pct': efg_pct,
-                'opponent': opponent_team,
+                'ts_pct': p_ts,
+                'efg_pct': p_efg,
+                'opponent': opponent,
                 'min': player.minutes,
-                'is_garbage_time': player_is_garbage_time,
-                # Alpha metrics (placeholders until Cloud SQL)
-                'usage_rate': usage_rate,
-                'usage_vacuum': usage_vacuum,
-                'opponent_def_rating': opponent_def_rating,
-                'matchup_difficulty': matchup_difficulty,
-                'season_avg_ts': season_avg_ts,
-                'heat_scale': heat_scale,
+                'is_garbage_time': p_garbage,
+                # Alpha metrics (season baselines snapshot)
+                'usage_rate': p_usage,
+                'usage_vacuum': p_vacuum,
+                'opponent_def_rating': def_rating,
+                'matchup_difficulty': str(difficulty),
+                'season_avg_ts': p_season_ts,
+                'heat_scale': str(heat),
                 'stats': {
                     'pts': player.pts,
                     'reb': player.reb,
@@ -521,15 +587,23 @@ class CloudAsyncPulseProducer:
                 }
             })
 
-        
-        # Sort by PIE descending
-        leaders.sort(key=lambda x: x['pie'], reverse=True)
-        return leaders
+        # Per-game lists sorted by PIE descending (stable, like list.sort)
+        leaders_by_game = {}
+        for game_id, (lo, hi) in cols.spans.items():
+            order = lo + np.argsort(-pie[lo:hi], kind='stable')
+            leaders_by_game[game_id] = [rows[i] for i in order]
+        return leaders_by_game, rows, pie
     
-    async def _ws_broadcast(self, games, all_leaders, live_games_list):
+    async def _ws_broadcast(self, games, all_leaders, live_games_list, seq: Optional[int] = None):
         """
         Phase 8: Broadcast pulse data to WebSocket subscribers.
         FAIL OPEN — broadcast errors never crash the producer cycle.
+
+        WebSocket clients get full state every cycle (every live game and
+        leader, not LiveDeltaEncoder patches); each message carries `seq`.
+        The messages are also kept as the last full broadcast so a client
+        that subscribes between cycles is sent its filtered slice at once
+        (see ws_snapshot).
         """
         try:
             from services.ws_connection_manager import get_ws_manager
@@ -538,75 +612,87 @@ class CloudAsyncPulseProducer:
             manager = get_ws_manager()
             presence = get_presence_manager()
 
+            messages = self._ws_messages(all_leaders, live_games_list, seq)
+            self._ws_last_broadcast = messages
+
             if manager.active_count == 0:
                 return  # No WebSocket clients — skip broadcast
 
-            # Broadcast leaders update (to all connected clients)
-            if all_leaders:
-                await manager.broadcast_to_subscribers(
-                    event_type="leaders_update",
-                    data={
-                        "leaders": all_leaders[:10],
-                        "cycle_id": self._update_count,
-                    },
-                )
-
-            # Broadcast per-team game updates
-            for game_data in live_games_list:
-                if game_data.get("status") != "LIVE":
-                    continue
-                game_payload = dict(game_data)
-                # Enrich with viewer count
-                try:
-                    viewers = await presence.get_viewers("game_id", game_data["game_id"])
-                    game_payload["viewers"] = viewers
-                except Exception:
-                    game_payload["viewers"] = 0
-
-                home = game_data.get("home_team", "")
-                away = game_data.get("away_team", "")
-                if home:
-                    await manager.broadcast_to_subscribers(
-                        event_type="game_update",
-                        data=game_payload,
-                        filter_key="team",
-                        filter_value=home,
-                    )
-                if away:
-                    await manager.broadcast_to_subscribers(
-                        event_type="game_update",
-                        data=game_payload,
-                        filter_key="team",
-                        filter_value=away,
-                    )
-
-            # Broadcast per-player updates
-            for player in all_leaders[:20]:  # Top 20 to avoid excessive broadcasts
-                player_payload = dict(player)
-                player_id_str = str(player.get("player_id", ""))
-                if not player_id_str:
+            # Enrich with viewer count (a game payload is shared by both teams' messages)
+            for _, data, filter_key, _ in messages:
+                if not filter_key or "viewers" in data:
                     continue
-                # Enrich with viewer count
+                context = ("game_id", data["game_id"]) if filter_key == "team" else ("player_id", str(data["player_id"]))
                 try:
-                    viewers = await presence.get_viewers("player_id", player_id_str)
-                    player_payload["viewers"] = viewers
+                    data["viewers"] = await presence.get_viewers(*context)
                 except Exception:
-                    player_payload["viewers"] = 0
+                    data["viewers"] = 0
 
+            for event_type, data, filter_key, filter_value in messages:
                 await manager.broadcast_to_subscribers(
-                    event_type="player_update",
-                    data=player_payload,
-                    filter_key="player_id",
-                    filter_value=player_id_str,
+                    event_type=event_type,
+                    data=data,
+                    filter_key=filter_key,
+                    filter_value=filter_value,
                 )
 
         except Exception as e:
             logger.debug(f"WS broadcast error (non-fatal): {e}")
 
+    def _ws_messages(self, all_leaders, live_games_list, seq: Optional[int]) -> List[tuple]:
+        """(event_type, data, filter_key, filter_value) for one full broadcast."""
+        messages = []
+        if all_leaders:
+            messages.append(("leaders_update", {
+                "leaders": all_leaders[:10],
+                "cycle_id": self._update_count,
+                "seq": seq,
+            }, None, None))
+
+        # Per-team game updates
+        for game_data in live_games_list:
+            if game_data.get("status") != "LIVE":
+                continue
+            game_payload = dict(game_data)
+            game_payload["seq"] = seq
+            for team in (game_data.get("home_team", ""), game_data.get("away_team", "")):
+                if team:
+                    messages.append(("game_update", game_payload, "team", team))
+
+        # Per-player updates
+        for player in all_leaders[:20]:  # Top 20 to avoid excessive broadcasts
+            player_id_str = str(player.get("player_id", ""))
+            if not player_id_str:
+                continue
+            player_payload = dict(player)
+            player_payload["seq"] = seq
+            messages.append(("player_update", player_payload, "player_id", player_id_str))
+        return messages
+
+    def ws_snapshot(self, filters: Dict) -> List[tuple]:
+        """
+        The last full broadcast as (event_type, data) pairs a connection
+        with `filters` would have received — sent on subscribe so a client
+        has every score before the next cycle.
+        """
+        from services.ws_connection_manager import filters_match
+
+        snapshot, seen = [], set()
+        for event_type, data, filter_key, filter_value in self._ws_last_broadcast:
+            if id(data) in seen or not filters_match(filters, filter_key, filter_value):
+                continue
+            seen.add(id(data))
+            snapshot.append((event_type, data))
+        return snapshot
+
     def get_latest_snapshot(self) -> Optional[Dict]:
         """Return the most recent live-data snapshot for SSE streaming."""
         return self._latest_snapshot
 
+    def get_latest_frame(self) -> Optional[Dict]:
+        """Return the most recent keyframe/patch produced by LiveDeltaEncoder."""
+        return self._latest_frame
+
     def get_status(self) -> Dict:
         """Get producer status for health checks."""
         return {
@@ -619,6 +705,8 @@ class CloudAsyncPulseProducer:
             "poll_interval_seconds": self.POLL_INTERVAL_SECONDS,
             "firebase_write_errors": self._firebase_write_errors,
             "snapshot_available": self._latest_snapshot is not None,
+            "delta_seq": self._delta_encoder.seq,
+            "unchanged_cycles_skipped": self._unchanged_cycles,
         }
 
 
@@ -333,6 +333,11 @@ async def populate_players_only(player_ids: List[str] = None, season: str = CURR
 
     written = _write_player_baselines(players, season)
 
+    # Hot-swap the in-memory league snapshot with the new data
+    if written:
+        from services.season_baseline_service import warm_cache
+        await loop.run_in_executor(None, warm_cache, season)
+
     return {
         'season': season,
         'players_fetched': len(players),
@@ -3,7 +3,6 @@ DefenseMatrix v3 - PURE DYNAMIC DATA
 NO hardcoded fallbacks - returns unavailable status if no real data.
 All data comes from team_defense table or returns None.
 """
-import sqlite3
 from typing import Dict, Optional
 import sys
 from pathlib import Path
@@ -11,13 +10,7 @@ from pathlib import Path
 # Add parent to path for centralized imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-try:
-    from data_paths import get_db_connection
-    _USE_CENTRALIZED = True
-except ImportError:
-    _USE_CENTRALIZED = False
-    _SCRIPT_DIR = Path(__file__).parent.parent
-    _DB_PATH = _SCRIPT_DIR / 'data' / 'nba_data.db'
+from services.team_context_store import get_team_context_store
 
 
 class DefenseMatrix:
@@ -25,78 +18,14 @@ class DefenseMatrix:
     Provides team defensive intelligence.
     PURE DYNAMIC - Only uses real data from team_defense table.
     Returns None/unavailable if data doesn't exist instead of fake values.
+    Profiles come from the shared TeamContextStore snapshot (one load for
+    all teams, reloaded when the team_context_version stamp moves).
     """
     
-    _cache: Dict[str, Dict] = {}
-    
-    @staticmethod
-    def _get_db_connection():
-        """Get database connection if available - uses centralized paths"""
-        try:
-            if _USE_CENTRALIZED:
-                return get_db_connection()
-            else:
-                if _DB_PATH.exists():
-                    return sqlite3.connect(str(_DB_PATH))
-        except Exception:
-            pass
-        return None
-    
     @staticmethod
     def _get_real_profile(team_code: str) -> Optional[Dict]:
-        """Get REAL defensive profile from database - NO FALLBACKS"""
-        try:
-            conn = DefenseMatrix._get_db_connection()
-            if not conn:
-                return None
-            
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Try team_defense table - check BOTH team_abbr AND team_id
-            cursor.execute("""
-                SELECT * FROM team_defense 
-                WHERE team_abbr = ? OR team_id = ?
-            """, (team_code.upper(), str(team_code)))
-            
-            row = cursor.fetchone()
-            
-            if row:
-                # Check if data is actually populated (not all zeros)
-                opp_pts = row['opp_pts'] if 'opp_pts' in row.keys() else None
-                pace = row['pace'] if 'pace' in row.keys() else None
-                
-                if opp_pts and opp_pts > 0:
-                    # Real data exists - calculate PAOA
-                    league_avg_ppg = 115.0
-                    base_paoa = opp_pts - league_avg_ppg
-                    
-                    # Get optional fields with safe access
-                    opp_fg_pct = row['opp_fg_pct'] if 'opp_fg_pct' in row.keys() else None
-                    division = row['division'] if 'division' in row.keys() else None
-                    def_rating = row['def_rating'] if 'def_rating' in row.keys() else None
-                    
-                    conn.close()
-                    return {
-                        "vs_PG": round(base_paoa * 0.9, 1),
-                        "vs_SG": round(base_paoa * 0.95, 1),
-                        "vs_SF": round(base_paoa * 1.0, 1),
-                        "vs_PF": round(base_paoa * 1.05, 1),
-                        "vs_C": round(base_paoa * 1.1, 1),
-                        "opp_pts": opp_pts,
-                        "opp_fg_pct": opp_fg_pct,
-                        "def_rating": def_rating,
-                        "pace": pace,
-                        "division": division,
-                        "source": "real_data",
-                        "available": True
-                    }
-            
-            conn.close()
-            return None
-        except Exception as e:
-            print(f"DefenseMatrix DB error: {e}")
-            return None
+        """Get REAL defensive profile (team_abbr or team_id) - NO FALLBACKS"""
+        return get_team_context_store().snapshot().defense_profile(team_code)
     
     @staticmethod
     def get_profile(team_code: str) -> Dict:
@@ -106,14 +35,8 @@ class DefenseMatrix:
         """
         team_code = team_code.upper()
         
-        # Check cache first
-        if team_code in DefenseMatrix._cache:
-            return DefenseMatrix._cache[team_code]
-        
-        # Try real data
         real_profile = DefenseMatrix._get_real_profile(team_code)
         if real_profile:
-            DefenseMatrix._cache[team_code] = real_profile
             return real_profile
         
         # NO FALLBACKS - Return unavailable status
@@ -145,6 +68,12 @@ class DefenseMatrix:
         key = f"vs_{position}"
         return profile.get(key, 0.0)
 
+    @staticmethod
+    def get_position_defense(team_code: str, position: str) -> Optional[Dict]:
+        """Team defense vs a position group (G/F/C) from team_defense_by_position"""
+        snapshot = get_team_context_store().snapshot()
+        return snapshot.position_defense.get((snapshot.resolve(team_code), position.upper()))
+
     @staticmethod
     def get_rebound_resistance(team_code: str) -> str:
         """Get rebounding resistance rating - returns Unknown if no data"""
@@ -174,21 +103,10 @@ class DefenseMatrix:
     
     @staticmethod
     def clear_cache():
-        """Clear the cache (useful after data refresh)"""
-        DefenseMatrix._cache = {}
+        """Force a reload of the shared team context (useful after data refresh)"""
+        get_team_context_store().invalidate()
     
     @staticmethod
     def get_all_teams() -> list:
         """Get list of all teams with real defense data"""
-        try:
-            conn = DefenseMatrix._get_db_connection()
-            if not conn:
-                return []
-            
-            cursor = conn.cursor()
-            cursor.execute("SELECT team_abbr FROM team_defense WHERE opp_pts > 0")
-            teams = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            return teams
-        except Exception:
-            return []
+        return sorted(get_team_context_store().snapshot().defense)
@@ -0,0 +1,325 @@
+"""
+Executor Tier — Off-Loop Execution for Blocking Route Work
+===========================================================
+Async route handlers must never run synchronous engine math or upstream
+HTTP calls on the event loop: one 25-second `ShotChartDetail` call freezes
+every SSE stream and WebSocket on the instance.
+
+Two bounded pools:
+    cpu — projection engines (MultiStatConfluence, Crucible, Monte Carlo)
+    io  — upstream NBA API / Gemini / synchronous Firestore streams
+
+Each submission is tagged with a route name. Routes have a concurrency
+cap (ROUTE_LIMITS) enforced with an asyncio.Semaphore *before* the job
+enters the pool, so a burst on one endpoint queues on the loop instead of
+starving the shared pool. If too many callers are already waiting on a
+route, `ExecutorSaturated` is raised so the handler can degrade quickly.
+
+Debug aid:
+    LoopStallWatchdog runs a heartbeat task on the loop and a watchdog
+    thread off it. When the heartbeat is late by more than
+    LOOP_BLOCK_THRESHOLD_MS, the watchdog captures the loop thread's stack
+    so the offending handler is named in the log. Enabled by the
+    FEATURE_LOOP_BLOCK_DETECTOR flag.
+
+Usage:
+    from services.executor_tier import run_cpu, run_io
+
+    data = await run_cpu(engine.analyze_game, home, away, route="matchup_analyze")
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+CPU_WORKERS = int(os.getenv("EXECUTOR_CPU_WORKERS", str(max(2, (os.cpu_count() or 1)))))
+IO_WORKERS = int(os.getenv("EXECUTOR_IO_WORKERS", "16"))
+
+DEFAULT_ROUTE_LIMIT = 4
+DEFAULT_MAX_QUEUED = 32
+
+# Per-route concurrency caps. NBA stats endpoints are rate-limited upstream,
+# so they get tight caps; engine routes scale with the CPU pool.
+ROUTE_LIMITS: Dict[str, int] = {
+    "matchup_analyze": 2,
+    "matchup_insights": 4,
+    "monte_carlo": 4,
+    "shot_chart": 4,
+    "player_hustle": 2,
+    "player_play_types": 1,
+}
+
+LOOP_BLOCK_THRESHOLD_MS = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))
+_LATENCY_WINDOW = 256
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a route's wait queue is full; callers should shed load."""
+
+    def __init__(self, route: str, queued: int):
+        self.route = route
+        self.queued = queued
+        super().__init__(f"Executor saturated for route '{route}' ({queued} queued)")
+
+
+# ============================================================================
+# ROUTE GATE + METRICS
+# ============================================================================
+
+class _RouteGate:
+    """Concurrency cap and counters for one route on one pool."""
+
+    def __init__(self, limit: int, max_queued: int):
+        self.limit = limit
+        self.max_queued = max_queued
+        self.semaphore = asyncio.Semaphore(limit)
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.run_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "queued": self.queued,
+            "active": self.active,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "wait_p50_ms": _percentile(self.wait_ms, 50),
+            "wait_p99_ms": _percentile(self.wait_ms, 99),
+            "run_p50_ms": _percentile(self.run_ms, 50),
+            "run_p99_ms": _percentile(self.run_ms, 99),
+        }
+
+
+def _percentile(values: Deque[float], pct: int) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round((pct / 100.0) * (len(ordered) - 1))))
+    return round(ordered[idx], 2)
+
+
+class ExecutorTier:
+    """Named, bounded thread pools with per-route admission control."""
+
+    def __init__(self, cpu_workers: int = CPU_WORKERS, io_workers: int = IO_WORKERS):
+        self._pool_sizes = {"cpu": cpu_workers, "io": io_workers}
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._gates: Dict[str, _RouteGate] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, tier: str) -> ThreadPoolExecutor:
+        pool = self._pools.get(tier)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(tier)
+                if pool is None:
+                    pool = ThreadPoolExecutor(
+                        max_workers=self._pool_sizes[tier],
+                        thread_name_prefix=f"qs-{tier}",
+                    )
+                    self._pools[tier] = pool
+        return pool
+
+    def _gate(self, tier: str, route: str) -> _RouteGate:
+        key = f"{tier}:{route}"
+        gate = self._gates.get(key)
+        if gate is None:
+            gate = _RouteGate(ROUTE_LIMITS.get(route, DEFAULT_ROUTE_LIMIT), DEFAULT_MAX_QUEUED)
+            self._gates[key] = gate
+        return gate
+
+    async def run(self, tier: str, fn: Callable[..., Any], *args, route: str = "default", **kwargs) -> Any:
+        """Run `fn(*args, **kwargs)` on the named pool under the route's cap."""
+        gate = self._gate(tier, route)
+        if gate.queued >= gate.max_queued:
+            gate.rejected += 1
+            raise ExecutorSaturated(route, gate.queued)
+
+        enqueued = time.perf_counter()
+        gate.queued += 1
+        try:
+            await gate.semaphore.acquire()
+        finally:
+            gate.queued -= 1
+
+        started = time.perf_counter()
+        gate.wait_ms.append((started - enqueued) * 1000)
+        gate.active += 1
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(fn, *args, **kwargs)
+            result = await loop.run_in_executor(self._pool(tier), call)
+            gate.completed += 1
+            return result
+        except Exception:
+            gate.failed += 1
+            raise
+        finally:
+            gate.active -= 1
+            gate.run_ms.append((time.perf_counter() - started) * 1000)
+            gate.semaphore.release()
+
+    def stats(self) -> dict:
+        pools = {}
+        for tier, size in self._pool_sizes.items():
+            pool = self._pools.get(tier)
+            pools[tier] = {
+                "max_workers": size,
+                "threads": len(pool._threads) if pool else 0,
+                "backlog": pool._work_queue.qsize() if pool else 0,
+            }
+        return {
+            "pools": pools,
+            "routes": {key: gate.snapshot() for key, gate in sorted(self._gates.items())},
+        }
+
+    def shutdown(self, wait: bool = False):
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+        self._pools.clear()
+
+
+_tier: Optional[ExecutorTier] = None
+
+
+def get_executor_tier() -> ExecutorTier:
+    """Get the process-wide ExecutorTier singleton."""
+    global _tier
+    if _tier is None:
+        _tier = ExecutorTier()
+    return _tier
+
+
+async def run_cpu(fn: Callable[..., Any], *args, route: str = "default", **kwargs) -> Any:
+    """Run synchronous engine/compute work off the event loop."""
+    return await get_executor_tier().run("cpu", fn, *args, route=route, **kwargs)
+
+
+async def run_io(fn: Callable[..., Any], *args, route: str = "default", **kwargs) -> Any:
+    """Run blocking upstream I/O (NBA API, Gemini, sync Firestore) off the event loop."""
+    return await get_executor_tier().run("io", fn, *args, route=route, **kwargs)
+
+
+# ============================================================================
+# LOOP STALL WATCHDOG (debug mode)
+# ============================================================================
+
+class LoopStallWatchdog:
+    """
+    Detects handlers that block the event loop for longer than a threshold.
+
+    A heartbeat coroutine stamps `_last_beat` every `interval` seconds. A
+    daemon thread checks the stamp; once it is older than the threshold it
+    snapshots the loop thread's current frame stack — which is, by
+    definition, the code that is blocking — and logs it once per stall.
+    """
+
+    def __init__(self, threshold_ms: float = LOOP_BLOCK_THRESHOLD_MS, interval: float = 0.02):
+        self.threshold_ms = threshold_ms
+        self.interval = interval
+        self.stalls = 0
+        self.max_stall_ms = 0.0
+        self.recent: Deque[dict] = deque(maxlen=20)
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    async def _heartbeat(self):
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        reported_beat = None
+        while not self._stop.wait(self.interval):
+            beat = self._last_beat
+            lag_ms = (time.monotonic() - beat) * 1000 - self.interval * 1000
+            if lag_ms < self.threshold_ms or beat == reported_beat:
+                continue
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame, limit=12)) if frame else "<unavailable>"
+            self.stalls += 1
+            self.max_stall_ms = max(self.max_stall_ms, lag_ms)
+            self.recent.append({"lag_ms": round(lag_ms, 1), "at": time.time(), "stack": stack})
+            logger.warning(
+                f"[LoopWatchdog] Event loop blocked >{self.threshold_ms:.0f}ms "
+                f"(lag={lag_ms:.0f}ms). Blocking stack:\n{stack}"
+            )
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._last_beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"[LoopWatchdog] Started (threshold={self.threshold_ms:.0f}ms)")
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "stalls": self.stalls,
+            "max_stall_ms": round(self.max_stall_ms, 1),
+        }
+
+
+_watchdog: Optional[LoopStallWatchdog] = None
+
+
+def start_loop_watchdog() -> Optional[LoopStallWatchdog]:
+    """Start the stall watchdog if FEATURE_LOOP_BLOCK_DETECTOR is enabled."""
+    global _watchdog
+    from vanguard.core.feature_flags import flag
+    if not flag("FEATURE_LOOP_BLOCK_DETECTOR"):
+        return None
+    if _watchdog is None:
+        _watchdog = LoopStallWatchdog()
+    _watchdog.start()
+    return _watchdog
+
+
+async def stop_loop_watchdog():
+    if _watchdog is not None:
+        await _watchdog.stop()
+
+
+def executor_stats() -> dict:
+    """Pool, per-route queue-depth and watchdog metrics for /health/deps."""
+    stats = get_executor_tier().stats()
+    stats["loop_watchdog"] = _watchdog.stats() if _watchdog else {"enabled": False}
+    return stats
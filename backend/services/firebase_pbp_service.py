@@ -34,12 +34,50 @@ from services.firestore_collections import (
     FINAL_GAMES, GAMES, CALENDAR, CALENDAR_GAMES_SUB,
     pad_sequence,
 )
+from services.shot_aggregator import get_shot_aggregator
 
 logger = logging.getLogger(__name__)
 
-# Batch size — conservatively 225 per sub-batch because each shot play
-# generates TWO Firestore writes (pbp_events + shots).  225 * 2 = 450 < 500.
-_BATCH_LIMIT = 225
+# Firestore rejects batches over 500 operations; leave headroom.
+MAX_BATCH_OPS = 450
+
+
+class BatchedWriter:
+    """
+    Accumulates merge-set operations and commits them in chunks of at most
+    MAX_BATCH_OPS, so one polling cycle's writes for every game share as
+    few commits as possible. Every op is an idempotent merge keyed by
+    sequence number, so a partially committed cycle is safe to replay.
+    """
+
+    def __init__(self, db, max_ops: int = MAX_BATCH_OPS):
+        self.db = db
+        self.max_ops = max_ops
+        self._batch = None
+        self._pending = 0
+        self.ops = 0
+        self.commits = 0
+
+    def set(self, ref, data: Dict[str, Any], merge: bool = True):
+        if self._batch is None:
+            self._batch = self.db.batch()
+        self._batch.set(ref, data, merge=merge)
+        self._pending += 1
+        self.ops += 1
+        if self._pending >= self.max_ops:
+            self._flush()
+
+    def _flush(self):
+        if self._batch is not None and self._pending:
+            self._batch.commit()
+            self.commits += 1
+        self._batch = None
+        self._pending = 0
+
+    def commit(self) -> int:
+        """Commit whatever is pending; returns the total number of commits."""
+        self._flush()
+        return self.commits
 
 
 class FirebasePBPService:
@@ -75,9 +113,15 @@ class FirebasePBPService:
             player_shots/{playerId}/shots/{game_id}_{pad_sequence(sequenceNumber)}
 
         Batch logic:
-            Firestore limits batches to 500 ops.  Since a shot play produces
-            3 writes (pbp + game-shots + player-shots), we cap sub-batches at
-            150 plays to stay safely under 500.
+            Firestore limits batches to 500 ops. Writes go through a
+            BatchedWriter that commits every MAX_BATCH_OPS operations.
+
+        Idempotency:
+            Raw docs are keyed by sequence number, so re-writes overwrite.
+            Shot summaries are incremented only for sequence numbers missing
+            from the player's per-game `applied` ledger (checked in the same
+            transaction), so restarts, parallel instances and backfill
+            re-runs never double count.
 
         Args:
             game_id:    Game ID string.
@@ -93,6 +137,38 @@ class FirebasePBPService:
             return 0
 
         db = FirebasePBPService.get_db()
+        writer = BatchedWriter(db)
+        new_shots = FirebasePBPService.stage_plays_v2(
+            writer, game_id, plays, game_date, home_team, away_team
+        )
+        writer.commit()
+
+        # Fold the new shots into per-player zone/hexbin summaries
+        if new_shots:
+            FirebasePBPService.apply_shot_summaries(db, {str(game_id): new_shots})
+
+        logger.info(
+            f"[PBP-v2] Wrote {len(plays)} plays for game {game_id} "
+            f"(shots extracted + player_shots written)"
+        )
+        return len(plays)
+
+    @staticmethod
+    def stage_plays_v2(
+        writer: "BatchedWriter",
+        game_id: str,
+        plays: List[PlayEvent],
+        game_date: str = "",
+        home_team: str = "",
+        away_team: str = "",
+    ) -> List[Dict[str, Any]]:
+        """
+        Queue the save_plays_batch_v2 writes for one game on `writer`
+        without committing, so several games can share commits.
+
+        Returns the shot docs staged (for apply_shot_summaries after commit).
+        """
+        db = writer.db
         pbp_col = (
             db.collection(PBP_EVENTS)
             .document(str(game_id))
@@ -103,44 +179,43 @@ class FirebasePBPService:
             .document(str(game_id))
             .collection(SHOTS_ATTEMPTS_SUB)
         )
-
         matchup = f"{away_team} @ {home_team}" if home_team and away_team else ""
 
-        # Cap sub-batches at 150 plays (3 writes each = 450 ops, well under 500)
-        _BATCH_LIMIT = 150
-        total_written = 0
-        for i in range(0, len(plays), _BATCH_LIMIT):
-            chunk = plays[i : i + _BATCH_LIMIT]
-            batch = db.batch()
-            for play in chunk:
-                doc_id = pad_sequence(play.sequenceNumber)
-                # 1. PBP event (full)
-                batch.set(pbp_col.document(doc_id), play.model_dump(), merge=True)
-                # 2. Game-level shot chart (only for shooting plays)
-                if play.isShootingPlay:
-                    shot_doc = FirebasePBPService.extract_shot_doc(
-                        play, game_id=game_id, game_date=game_date, matchup=matchup
+        new_shots: List[Dict[str, Any]] = []
+        for play in plays:
+            doc_id = pad_sequence(play.sequenceNumber)
+            # 1. PBP event (full)
+            writer.set(pbp_col.document(doc_id), play.model_dump())
+            # 2. Game-level shot chart (only for shooting plays)
+            if play.isShootingPlay:
+                shot_doc = FirebasePBPService.extract_shot_doc(
+                    play, game_id=game_id, game_date=game_date, matchup=matchup
+                )
+                writer.set(shots_col.document(doc_id), shot_doc)
+                new_shots.append(shot_doc)
+                # 3. Per-player cross-game shot history
+                player_id = play.primaryPlayerId
+                if player_id:
+                    player_shot_ref = (
+                        db.collection(PLAYER_SHOTS)
+                        .document(str(player_id))
+                        .collection(PLAYER_SHOTS_SUB)
+                        .document(f"{game_id}_{doc_id}")
                     )
-                    batch.set(shots_col.document(doc_id), shot_doc, merge=True)
-                    # 3. Per-player cross-game shot history
-                    player_id = play.primaryPlayerId
-                    if player_id:
-                        player_doc_id = f"{game_id}_{doc_id}"
-                        player_shot_ref = (
-                            db.collection(PLAYER_SHOTS)
-                            .document(str(player_id))
-                            .collection(PLAYER_SHOTS_SUB)
-                            .document(player_doc_id)
-                        )
-                        batch.set(player_shot_ref, shot_doc, merge=True)
-            batch.commit()
-            total_written += len(chunk)
+                    writer.set(player_shot_ref, shot_doc)
+        return new_shots
 
-        logger.info(
-            f"[PBP-v2] Wrote {total_written} plays for game {game_id} "
-            f"(shots extracted + player_shots written)"
-        )
-        return total_written
+    @staticmethod
+    def apply_shot_summaries(db, shots_by_game: Dict[str, List[Dict[str, Any]]]) -> int:
+        """Fold committed shot docs into player_shot_summaries (one batch)."""
+        try:
+            applied = get_shot_aggregator().apply_many(db, shots_by_game)
+            logger.debug(f"[PBP-v2] Aggregated {applied} shots across {len(shots_by_game)} games")
+            return applied
+        except Exception as e:
+            # Summaries are derived data — raw shots are already committed
+            logger.warning(f"[PBP-v2] Shot summary update failed for {list(shots_by_game)}: {e}")
+            return 0
 
     @staticmethod
     def extract_shot_doc(
@@ -450,6 +525,8 @@ class FirebasePBPService:
                 from services.firebase_game_service import FirebaseGameService
                 FirebaseGameService.update_game_status(game_id, game_date, "Final")
 
+            get_shot_aggregator().forget_game(game_id)
+
             logger.info(f"[Finalize] Game {game_id} successfully finalized.")
             return True
 
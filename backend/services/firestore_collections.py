@@ -32,6 +32,10 @@ SHOTS_ATTEMPTS_SUB = "attempts"  # subcollection name
 PLAYER_SHOTS = "player_shots"    # player_shots/{playerId}/shots/{gameId}_{seq}
 PLAYER_SHOTS_SUB = "shots"       # subcollection name under player_shots/{playerId}
 
+# ── Pre-binned shot chart summaries (zones + hexbins, per player) ────────────
+PLAYER_SHOT_SUMMARIES = "player_shot_summaries"  # player_shot_summaries/{playerId}
+PLAYER_SHOT_SUMMARIES_APPLIED_SUB = "applied"    # .../{playerId}/applied/{gameId}
+
 # ── Final freeze snapshot (persisted once at game end) ───────────────────────
 FINAL_GAMES = "final_games"      # final_games/{gameId}
 
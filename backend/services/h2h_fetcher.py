@@ -3,15 +3,20 @@ H2H Fetcher
 Fetches head-to-head game logs for a player vs specific opponent team.
 Designed for async/background execution (Shadow-Fetch pattern).
 Now with dual-write to SQLite (local) and Firestore (cloud).
+
+Aggregates are computed by H2HMaterializer from local game logs; the NBA
+API is only called for seasons with no local player_game_logs rows.
 """
 import sqlite3
 import requests
 import logging
 import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from services.h2h_materializer import H2HMaterializer
+
 # Import Firestore adapter for cloud persistence
 try:
     from services.h2h_firestore_adapter import get_h2h_adapter, H2HFirestoreAdapter
@@ -59,6 +64,7 @@ class H2HFetcher:
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
         self._ensure_tables()
+        self.materializer = H2HMaterializer(self.db_path)
         
         # Initialize Firestore adapter for cloud writes
         self.firestore_adapter = None
@@ -128,8 +134,9 @@ class H2HFetcher:
     
     def fetch_h2h(self, player_id: str, opponent: str, seasons: int = 3) -> Dict:
         """
-        Fetch H2H history from NBA API.
-        Returns dict with game list and aggregate stats.
+        Backfill H2H history from the NBA API for seasons missing locally,
+        then materialize the pair's aggregates from all local logs.
+        Returns dict with game counts and aggregate stats.
         """
         start_time = time.time()
         opponent = opponent.upper()
@@ -140,22 +147,13 @@ class H2HFetcher:
                 logger.warning(f"Unknown opponent: {opponent}")
                 return {'success': False, 'error': f'Unknown team: {opponent}'}
             
-            # Fetch game logs for multiple seasons
+            # Seasons already in player_game_logs are aggregated locally
             all_games = []
-            current_season = 2024  # Would be dynamic in production
+            api_requests = 0
             
-            for season_offset in range(seasons):
-                season = current_season - season_offset
-                season_str = f"{season}-{str(season+1)[-2:]}"
-                
-                params = {
-                    'PlayerID': player_id,
-                    'Season': season_str,
-                    'SeasonType': 'Regular Season',
-                    'OpponentTeamID': opponent_id,
-                }
-                
+            for season_str, params in self.backfill_requests(player_id, opponent, seasons):
                 try:
+                    api_requests += 1
                     response = self.session.get(
                         self.PLAYER_GAME_LOG, 
                         params=params, 
@@ -174,10 +172,10 @@ class H2HFetcher:
                     logger.warning(f"API error for season {season_str}: {e}")
                     continue
             
-            # Save to database
+            # Save backfilled games, then aggregate local + backfilled logs
             if all_games:
                 self._save_h2h_games(player_id, opponent, all_games)
-                self._calculate_aggregates(player_id, opponent)
+            summary = self.materializer.refresh_pairs([(player_id, opponent)])
             
             fetch_duration = int((time.time() - start_time) * 1000)
             
@@ -186,6 +184,8 @@ class H2HFetcher:
                 'player_id': player_id,
                 'opponent': opponent,
                 'games_found': len(all_games),
+                'pairs_materialized': summary['pairs'],
+                'api_requests': api_requests,
                 'fetch_duration_ms': fetch_duration,
             }
             
@@ -193,6 +193,27 @@ class H2HFetcher:
             logger.error(f"H2H fetch error: {e}")
             return {'success': False, 'error': str(e)}
     
+    def backfill_requests(self, player_id: str, opponent: str, seasons: int = 3) -> List[Tuple[str, Dict]]:
+        """(season, playergamelogs params) for recent seasons not covered by local logs"""
+        opponent_id = self.TEAM_ABBR_TO_ID.get(opponent.upper())
+        if not opponent_id:
+            return []
+        local_seasons = self.materializer.covered_seasons(player_id)
+        current_season = 2024  # Would be dynamic in production
+        pending = []
+        for season_offset in range(seasons):
+            season = current_season - season_offset
+            season_str = f"{season}-{str(season+1)[-2:]}"
+            if season_str in local_seasons:
+                continue
+            pending.append((season_str, {
+                'PlayerID': player_id,
+                'Season': season_str,
+                'SeasonType': 'Regular Season',
+                'OpponentTeamID': opponent_id,
+            }))
+        return pending
+    
     def _parse_game_logs(self, data: dict, opponent: str) -> List[Dict]:
         """Parse NBA API response into game records"""
         games = []
@@ -237,94 +258,42 @@ class H2HFetcher:
     
     def _save_h2h_games(self, player_id: str, opponent: str, games: List[Dict]):
         """Save individual H2H games to database and Firestore"""
-        # Save to SQLite
-        conn = self._get_connection()
-        
-        for game in games:
-            conn.execute("""
-                INSERT OR REPLACE INTO player_h2h_games
-                (player_id, opponent, game_date, game_id, pts, reb, ast, stl, blk,
-                 tov, min, fgm, fga, fg3m, fg3a, ftm, fta, plus_minus, result)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                str(player_id), opponent, game['game_date'], game['game_id'],
-                game['pts'], game['reb'], game['ast'], game['stl'], game['blk'],
-                game['tov'], game['min'], game['fgm'], game['fga'],
-                game['fg3m'], game['fg3a'], game['ftm'], game['fta'],
-                game['plus_minus'], game['result']
-            ))
-        
-        conn.commit()
-        conn.close()
-        logger.info(f"Saved {len(games)} H2H games for {player_id} vs {opponent} (SQLite)")
-        
-        # Also save to Firestore (cloud persistence)
-        if self.firestore_adapter:
+        self.save_h2h_batch([{**game, 'player_id': player_id, 'opponent': opponent} for game in games])
+        logger.info(f"Saved {len(games)} H2H games for {player_id} vs {opponent}")
+    
+    def save_h2h_batch(self, rows: List[Dict]) -> int:
+        """
+        Dual-write H2H game rows: SQLite player_h2h_games, then the Firestore
+        player_h2h_games collection read by the populate_3pm_* scripts.
+        Returns the number of rows written to SQLite.
+        """
+        count = self.save_h2h_rows(rows)
+        if self.firestore_adapter and rows:
             try:
-                self.firestore_adapter.save_h2h_games(player_id, opponent, games)
-                logger.info(f"Saved {len(games)} H2H games to Firestore")
+                if not self.firestore_adapter.batch_save_h2h_games(rows):
+                    logger.warning(f"Firestore H2H games save failed for {len(rows)} rows")
             except Exception as e:
                 logger.warning(f"Firestore H2H games save failed: {e}")
+        return count
     
-    def _calculate_aggregates(self, player_id: str, opponent: str):
-        """Calculate and store aggregate H2H stats with 3PM tracking"""
+    def save_h2h_rows(self, rows: List[Dict]) -> int:
+        """Bulk insert H2H game rows (each carrying player_id/opponent) in one transaction"""
         conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as games,
-                AVG(pts) as avg_pts,
-                AVG(reb) as avg_reb,
-                AVG(ast) as avg_ast,
-                AVG(stl) as avg_stl,
-                AVG(blk) as avg_blk,
-                AVG(min) as avg_min,
-                AVG(fg3m) as avg_3pm,
-                SUM(fgm) * 1.0 / NULLIF(SUM(fga), 0) as fg_pct,
-                SUM(fg3m) * 1.0 / NULLIF(SUM(fg3a), 0) as fg3_pct,
-                SUM(CASE WHEN result = 'W' THEN 1 ELSE 0 END) * 1.0 / COUNT(*) as win_pct
-            FROM player_h2h_games
-            WHERE player_id = ? AND opponent = ?
-        """, (str(player_id), opponent))
-        
-        row = cursor.fetchone()
-        
-        if row and row['games'] > 0:
-            conn.execute("""
-                INSERT OR REPLACE INTO player_vs_team
-                (player_id, opponent, games, avg_pts, avg_reb, avg_ast, avg_stl,
-                 avg_blk, avg_min, fg_pct, fg3_pct, win_pct, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                str(player_id), opponent, row['games'],
-                row['avg_pts'], row['avg_reb'], row['avg_ast'],
-                row['avg_stl'], row['avg_blk'], row['avg_min'],
-                row['fg_pct'], row['fg3_pct'], row['win_pct'],
-                datetime.now().isoformat()
-            ))
-            conn.commit()
-            
-            # Also save to Firestore with 3PM included
-            if self.firestore_adapter:
-                try:
-                    h2h_stats = {
-                        'pts': round(row['avg_pts'], 1) if row['avg_pts'] else 0,
-                        'reb': round(row['avg_reb'], 1) if row['avg_reb'] else 0,
-                        'ast': round(row['avg_ast'], 1) if row['avg_ast'] else 0,
-                        '3pm': round(row['avg_3pm'], 1) if row['avg_3pm'] else 0,
-                        'games': row['games'],
-                        'fg_pct': round(row['fg_pct'] * 100, 1) if row['fg_pct'] else 0,
-                        'fg3_pct': round(row['fg3_pct'] * 100, 1) if row['fg3_pct'] else 0,
-                        'win_pct': round(row['win_pct'] * 100, 1) if row['win_pct'] else 0,
-                    }
-                    self.firestore_adapter.save_h2h_stats(player_id, opponent, h2h_stats)
-                    logger.info(f"H2H aggregates saved to Firestore for {player_id} vs {opponent}")
-                except Exception as e:
-                    logger.warning(f"Firestore H2H aggregates save failed: {e}")
-        
+        conn.executemany("""
+            INSERT OR REPLACE INTO player_h2h_games
+            (player_id, opponent, game_date, game_id, pts, reb, ast, stl, blk,
+             tov, min, fgm, fga, fg3m, fg3a, ftm, fta, plus_minus, result)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(
+            str(game['player_id']), game['opponent'], game['game_date'], game['game_id'],
+            game['pts'], game['reb'], game['ast'], game['stl'], game['blk'],
+            game['tov'], game['min'], game['fgm'], game['fga'],
+            game['fg3m'], game['fg3a'], game['ftm'], game['fta'],
+            game['plus_minus'], game['result']
+        ) for game in rows])
+        conn.commit()
         conn.close()
-
+        return len(rows)
     
     def get_h2h_stats(self, player_id: str, opponent: str) -> Optional[Dict]:
         """Get cached H2H aggregate stats"""
@@ -396,7 +365,7 @@ class H2HFetcher:
                         results['players_fetched'] += 1
                         continue
                     
-                    # Fetch from API
+                    # Materialize locally; backfills missing seasons from the API
                     result = self.fetch_h2h(player_id, opponent_abbr)
                     if result.get('success'):
                         results['players_fetched'] += 1
@@ -404,8 +373,9 @@ class H2HFetcher:
                     else:
                         results['errors'].append(f"{player_name}: {result.get('error', 'Unknown error')}")
                     
-                    # Rate limiting between players
-                    time.sleep(1.0)
+                    # Rate limiting between players (only after API calls)
+                    if result.get('api_requests'):
+                        time.sleep(1.0)
                     
                 except Exception as e:
                     results['errors'].append(f"{player_name}: {str(e)}")
@@ -21,6 +21,9 @@ logger = logging.getLogger(__name__)
 # Default TTL for H2H data freshness (72 hours)
 H2H_TTL_HOURS = 72
 
+# Firestore rejects batches over 500 operations; leave headroom.
+MAX_BATCH_OPS = 450
+
 
 class H2HFirestoreAdapter:
     """
@@ -167,6 +170,46 @@ class H2HFirestoreAdapter:
             logger.error(f"Firestore H2H games save failed: {e}")
             return False
     
+    def batch_save_h2h_games(self, rows: List[Dict]) -> bool:
+        """
+        Save H2H game rows for many player/opponent pairs at once.
+
+        Args:
+            rows: List of game dicts, each carrying player_id and opponent
+                  (the shape written to SQLite by H2HFetcher.save_h2h_rows)
+
+        Returns:
+            True if all chunks committed
+        """
+        if not self.enabled or not self.db:
+            return False
+
+        if not rows:
+            return True
+
+        try:
+            for start in range(0, len(rows), MAX_BATCH_OPS):
+                batch = self.db.batch()
+                for row in rows[start:start + MAX_BATCH_OPS]:
+                    player_id = str(row['player_id'])
+                    opponent = str(row['opponent']).upper()
+                    doc_id = f"{player_id}_{opponent}_{row.get('game_date', 'unknown')}"
+                    doc_ref = self.db.collection('player_h2h_games').document(doc_id)
+                    batch.set(doc_ref, {
+                        **row,
+                        'player_id': player_id,
+                        'opponent': opponent,
+                        'updated_at': firestore.SERVER_TIMESTAMP,
+                    }, merge=True)
+                batch.commit()
+
+            logger.info(f"✓ Batch saved {len(rows)} H2H games")
+            return True
+
+        except Exception as e:
+            logger.error(f"Batch H2H games save failed: {e}")
+            return False
+    
     def check_freshness(self, player_id: str, opponent: str, ttl_hours: int = H2H_TTL_HOURS) -> bool:
         """
         Check if H2H data is fresh (within TTL).
@@ -0,0 +1,423 @@
+"""
+H2H Materializer
+================
+Builds every player × opponent head-to-head aggregate from the game logs
+we already store, instead of one NBA API request per season per pair.
+
+Sources (SQLite, data/nba_data.db):
+    player_game_logs   — regular game logs (has an `opponent` column)
+    player_h2h_games   — rows H2HFetcher backfilled from the NBA API
+Rows are de-duplicated on (player_id, game_id), preferring player_game_logs.
+
+One vectorized group-by over (player_id, opponent) yields games played,
+per-game averages (pts/reb/ast/3pm/stl/blk/min), FG/3P/win percentages and
+recency-weighted averages, where each game is weighted
+0.5 ** (days_ago / half_life_days).
+
+Incremental refresh:
+    The highest rowid seen in each source is kept in h2h_materializer_state.
+    INSERT OR REPLACE re-inserts a row with a fresh rowid, so rows past the
+    watermark are exactly the new or corrected logs. Only the pairs they
+    touch are recomputed (from all of those players' logs), and the
+    watermark only advances once the results are persisted.
+
+Outputs:
+    player_vs_team (SQLite)          — read by H2HFetcher.get_h2h_stats,
+                                       NemesisEngine, MultiStatConfluence
+    player_h2h/{player}_{opp}        — via H2HFirestoreAdapter.batch_upsert_h2h
+
+The NBA API (H2HFetcher.fetch_h2h) is only needed to backfill seasons that
+have no local logs.
+"""
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.team_context_store import bump_team_context_version
+from shared_core.utils.season import season_for_date
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+H2H_HALF_LIFE_DAYS = 365.0
+SOURCES = ("player_game_logs", "player_h2h_games")   # in dedupe priority order
+FIRESTORE_CHUNK = 400                                # batch_upsert_h2h is one batch
+SQL_PARAM_CHUNK = 500
+
+AVERAGED = ("pts", "reb", "ast", "fg3m", "stl", "blk", "min")
+WEIGHTED = ("pts", "reb", "ast", "fg3m")
+SHOOTING = ("fgm", "fga", "fg3m", "fg3a")
+
+# Column spellings used by the various game-log writers
+COLUMN_ALIASES = {
+    "points": "pts",
+    "rebounds": "reb",
+    "assists": "ast",
+    "fg3_made": "fg3m",
+    "minutes": "min",
+    "mins": "min",
+    "wl": "result",
+}
+
+Pair = Tuple[str, str]
+
+
+# ============================================================================
+# VECTORIZED AGGREGATION (pure — DataFrames in, DataFrames out)
+# ============================================================================
+
+def normalize_logs(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Canonical columns for any game-log table shape.
+
+    Opponents like 'vs. BOS' / '@ BOS' become 'BOS'; stats are numeric
+    (missing → NaN); `win` is 1.0 / 0.0 / NaN from the W/L result.
+    """
+    df = frame.rename(columns=lambda c: COLUMN_ALIASES.get(c.lower(), c.lower()))
+    out = pd.DataFrame({
+        "player_id": df["player_id"].astype(str),
+        "game_id": df.get("game_id", pd.Series("", index=df.index)).astype(str),
+        "game_date": pd.to_datetime(df["game_date"].astype(str).str[:10], errors="coerce"),
+        "opponent": df["opponent"].astype(str).str.upper().str.extract(r"([A-Z]{2,4})\s*$")[0],
+    })
+    for col in set(AVERAGED) | set(SHOOTING):
+        out[col] = pd.to_numeric(df[col], errors="coerce") if col in df else np.nan
+    result = df["result"].astype(str).str.upper().str[:1] if "result" in df else pd.Series("", index=df.index)
+    out["win"] = np.where(result == "W", 1.0, np.where(result == "L", 0.0, np.nan))
+    return out.dropna(subset=["opponent", "game_date"])
+
+
+def compute_h2h(
+    logs: pd.DataFrame,
+    as_of: Optional[datetime] = None,
+    half_life_days: float = H2H_HALF_LIFE_DAYS,
+) -> pd.DataFrame:
+    """
+    One row per (player_id, opponent) from normalized logs.
+
+    Columns: games, <stat> averages, fg_pct, fg3_pct, win_pct (0-1),
+    <stat>_weighted recency-weighted averages, last_game_date.
+    """
+    if logs.empty:
+        return pd.DataFrame()
+    as_of = pd.Timestamp(as_of or datetime.now()).normalize()
+    age_days = (as_of - logs["game_date"]).dt.days.clip(lower=0)
+    weight = np.power(0.5, age_days.to_numpy(dtype=float) / half_life_days)
+
+    frame = logs[["player_id", "opponent", "game_date", "win", *AVERAGED, "fgm", "fga", "fg3a"]].copy()
+    for stat in WEIGHTED:
+        present = frame[stat].notna().to_numpy()
+        frame[f"_wx_{stat}"] = np.where(present, frame[stat].fillna(0).to_numpy() * weight, 0.0)
+        frame[f"_w_{stat}"] = np.where(present, weight, 0.0)
+
+    grouped = frame.groupby(["player_id", "opponent"], sort=False)
+    out = grouped[list(AVERAGED)].mean()
+    out.insert(0, "games", grouped.size())
+
+    sums = grouped[list(SHOOTING)].sum(min_count=1)
+    out["fg_pct"] = sums["fgm"] / sums["fga"].where(sums["fga"] > 0)
+    out["fg3_pct"] = sums["fg3m"] / sums["fg3a"].where(sums["fg3a"] > 0)
+    out["win_pct"] = grouped["win"].mean()
+
+    wsums = grouped[[c for c in frame.columns if c.startswith("_w")]].sum()
+    for stat in WEIGHTED:
+        denom = wsums[f"_w_{stat}"]
+        out[f"{stat}_weighted"] = wsums[f"_wx_{stat}"] / denom.where(denom > 0)
+    out["last_game_date"] = grouped["game_date"].max()
+    return out
+
+
+def _num(value, digits: int = 1, scale: float = 1.0) -> float:
+    return 0 if value is None or pd.isna(value) else round(float(value) * scale, digits)
+
+
+def to_firestore_records(agg: pd.DataFrame, half_life_days: float = H2H_HALF_LIFE_DAYS) -> List[Dict[str, Any]]:
+    """player_h2h docs in the H2HFetcher shape (percentages 0-100)."""
+    records = []
+    for (player_id, opponent), row in agg.iterrows():
+        records.append({
+            "player_id": str(player_id),
+            "opponent": opponent,
+            "games": int(row["games"]),
+            "pts": _num(row["pts"]),
+            "reb": _num(row["reb"]),
+            "ast": _num(row["ast"]),
+            "3pm": _num(row["fg3m"]),
+            "fg_pct": _num(row["fg_pct"], scale=100),
+            "fg3_pct": _num(row["fg3_pct"], scale=100),
+            "win_pct": _num(row["win_pct"], scale=100),
+            "recency_weighted": {
+                "pts": _num(row["pts_weighted"]),
+                "reb": _num(row["reb_weighted"]),
+                "ast": _num(row["ast_weighted"]),
+                "3pm": _num(row["fg3m_weighted"]),
+                "half_life_days": half_life_days,
+            },
+            "last_game_date": row["last_game_date"].strftime("%Y-%m-%d"),
+            "source": "local_logs",
+        })
+    return records
+
+
+# ============================================================================
+# MATERIALIZER
+# ============================================================================
+
+class H2HMaterializer:
+    """Keeps player_vs_team / player_h2h in step with the local game logs."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        adapter: Any = None,
+        use_firestore: bool = True,
+        half_life_days: float = H2H_HALF_LIFE_DAYS,
+    ):
+        if db_path is None:
+            db_path = Path(__file__).parent.parent / 'data' / 'nba_data.db'
+        self.db_path = str(db_path)
+        self.half_life_days = half_life_days
+        self._adapter = adapter
+        self._use_firestore = use_firestore
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('PRAGMA busy_timeout=30000')
+        return conn
+
+    def _get_adapter(self):
+        if self._adapter is None and self._use_firestore:
+            try:
+                from services.h2h_firestore_adapter import get_h2h_adapter
+                self._adapter = get_h2h_adapter()
+            except Exception as e:
+                logger.warning(f"[H2H-MAT] Firestore adapter unavailable: {e}")
+            if self._adapter is None:
+                self._use_firestore = False
+        return self._adapter
+
+    # ── Reads ───────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _tables(conn: sqlite3.Connection) -> Set[str]:
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        return {r[0] for r in rows}
+
+    @staticmethod
+    def _ensure_state(conn: sqlite3.Connection):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS h2h_materializer_state (
+                source TEXT PRIMARY KEY,
+                max_rowid INTEGER NOT NULL,
+                updated_at TEXT
+            )
+        """)
+
+    def _read_watermarks(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        self._ensure_state(conn)
+        return dict(conn.execute("SELECT source, max_rowid FROM h2h_materializer_state").fetchall())
+
+    def _read_delta(self, conn, sources, marks) -> Tuple[Set[Pair], Dict[str, int]]:
+        """Pairs touched by rows past each source's watermark, and new watermarks."""
+        pairs: Set[Pair] = set()
+        new_marks: Dict[str, int] = {}
+        for source in sources:
+            delta = pd.read_sql_query(
+                f"SELECT rowid AS _rowid, player_id, opponent, game_date FROM {source} WHERE rowid > ?",
+                conn, params=(marks.get(source, 0),),
+            )
+            if delta.empty:
+                continue
+            new_marks[source] = int(delta["_rowid"].max())
+            touched = normalize_logs(delta)
+            pairs.update(zip(touched["player_id"], touched["opponent"]))
+        return pairs, new_marks
+
+    def _load_logs(self, conn, sources, player_ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        frames = []
+        for priority, source in enumerate(sources):
+            if player_ids is None:
+                chunks = [pd.read_sql_query(f"SELECT * FROM {source}", conn)]
+            else:
+                ids = sorted({str(p) for p in player_ids})
+                chunks = [
+                    pd.read_sql_query(
+                        f"SELECT * FROM {source} WHERE player_id IN ({','.join('?' * len(part))})",
+                        conn, params=part,
+                    )
+                    for part in (ids[i:i + SQL_PARAM_CHUNK] for i in range(0, len(ids), SQL_PARAM_CHUNK))
+                ]
+            frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+            if not frame.empty:
+                frame = normalize_logs(frame)
+                frame["_priority"] = priority
+                frames.append(frame)
+        if not frames:
+            return pd.DataFrame()
+        logs = pd.concat(frames, ignore_index=True).sort_values("_priority", kind="stable")
+        # Rows without a game_id fall back to (player, date, opponent) identity
+        identity = logs["game_id"].where(
+            ~logs["game_id"].isin(["", "None", "nan"]),
+            logs["game_date"].dt.strftime("%Y-%m-%d") + "_" + logs["opponent"],
+        )
+        return logs.loc[~pd.DataFrame({"p": logs["player_id"], "g": identity}).duplicated()]
+
+    def covered_seasons(self, player_id: str) -> Set[str]:
+        """Seasons ('2024-25') with any local player_game_logs rows for the player."""
+        conn = self._get_connection()
+        try:
+            if "player_game_logs" not in self._tables(conn):
+                return set()
+            rows = conn.execute(
+                "SELECT DISTINCT substr(game_date, 1, 7) FROM player_game_logs WHERE player_id = ?",
+                (str(player_id),),
+            ).fetchall()
+        finally:
+            conn.close()
+        return {s for s in (season_for_date(r[0]) for r in rows) if s}
+
+    # ── Refresh ─────────────────────────────────────────────────────────────
+
+    def refresh(self, full: bool = False, as_of: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Recompute pairs touched since the last refresh (or every pair when
+        `full`) and persist them. Returns a summary dict.
+        """
+        start = time.time()
+        conn = self._get_connection()
+        try:
+            sources = [s for s in SOURCES if s in self._tables(conn)]
+            marks = self._read_watermarks(conn)
+            if full:
+                pairs, new_marks = None, {
+                    s: conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {s}").fetchone()[0]
+                    for s in sources
+                }
+                logs = self._load_logs(conn, sources)
+            else:
+                pairs, new_marks = self._read_delta(conn, sources, marks)
+                if not pairs:
+                    self._write_watermarks(conn, new_marks)
+                    conn.commit()
+                    return self._summary(start, 0, 0, True)
+                logs = self._load_logs(conn, sources, {p for p, _ in pairs})
+            agg = compute_h2h(logs, as_of=as_of, half_life_days=self.half_life_days)
+            if pairs is not None and not agg.empty:
+                agg = agg.loc[agg.index.isin(list(pairs))]
+            synced = self._persist(conn, agg)
+            if synced:
+                self._write_watermarks(conn, new_marks)
+            conn.commit()
+        finally:
+            conn.close()
+        if len(agg):
+            bump_team_context_version(self.db_path, source="h2h_materializer")
+        summary = self._summary(start, len(agg), len(logs), synced)
+        logger.info(f"[H2H-MAT] {'Full' if full else 'Incremental'} refresh: {summary}")
+        return summary
+
+    def refresh_pairs(self, pairs: Iterable[Pair], as_of: Optional[datetime] = None) -> Dict[str, Any]:
+        """Recompute specific (player_id, opponent) pairs, e.g. after an API backfill."""
+        start = time.time()
+        wanted = {(str(p), o.upper()) for p, o in pairs}
+        conn = self._get_connection()
+        try:
+            sources = [s for s in SOURCES if s in self._tables(conn)]
+            logs = self._load_logs(conn, sources, {p for p, _ in wanted})
+            agg = compute_h2h(logs, as_of=as_of, half_life_days=self.half_life_days)
+            if not agg.empty:
+                agg = agg.loc[agg.index.isin(list(wanted))]
+            synced = self._persist(conn, agg)
+            conn.commit()
+        finally:
+            conn.close()
+        if len(agg):
+            bump_team_context_version(self.db_path, source="h2h_materializer")
+        return self._summary(start, len(agg), len(logs), synced)
+
+    @staticmethod
+    def _summary(start: float, pairs: int, rows: int, synced: bool) -> Dict[str, Any]:
+        return {
+            "pairs": pairs,
+            "log_rows": rows,
+            "firestore_synced": synced,
+            "duration_ms": int((time.time() - start) * 1000),
+        }
+
+    # ── Writes ──────────────────────────────────────────────────────────────
+
+    def _persist(self, conn: sqlite3.Connection, agg: pd.DataFrame) -> bool:
+        """Write player_vs_team rows and upsert player_h2h docs; False if Firestore failed."""
+        if agg.empty:
+            return True
+        self._ensure_player_vs_team(conn)
+        now = datetime.now().isoformat()
+        conn.executemany("""
+            INSERT OR REPLACE INTO player_vs_team
+            (player_id, opponent, games, avg_pts, avg_reb, avg_ast, avg_stl,
+             avg_blk, avg_min, fg_pct, fg3_pct, win_pct, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (player_id, opponent, int(row.games),
+             *(None if pd.isna(v) else float(v) for v in (
+                 row.pts, row.reb, row.ast, row.stl, row.blk, row["min"],
+                 row.fg_pct, row.fg3_pct, row.win_pct)),
+             now)
+            for (player_id, opponent), row in agg.iterrows()
+        ])
+
+        adapter = self._get_adapter()
+        if adapter is None:
+            return True
+        records = to_firestore_records(agg, self.half_life_days)
+        ok = True
+        for i in range(0, len(records), FIRESTORE_CHUNK):
+            ok = adapter.batch_upsert_h2h(records[i:i + FIRESTORE_CHUNK]) and ok
+        return ok
+
+    @staticmethod
+    def _ensure_player_vs_team(conn: sqlite3.Connection):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS player_vs_team (
+                player_id TEXT NOT NULL,
+                opponent TEXT NOT NULL,
+                games INTEGER DEFAULT 0,
+                avg_pts REAL,
+                avg_reb REAL,
+                avg_ast REAL,
+                avg_stl REAL,
+                avg_blk REAL,
+                avg_min REAL,
+                fg_pct REAL,
+                fg3_pct REAL,
+                win_pct REAL,
+                last_updated TIMESTAMP,
+                PRIMARY KEY (player_id, opponent)
+            )
+        """)
+
+    def _write_watermarks(self, conn: sqlite3.Connection, marks: Dict[str, int]):
+        now = datetime.now().isoformat()
+        conn.executemany(
+            "INSERT OR REPLACE INTO h2h_materializer_state (source, max_rowid, updated_at) VALUES (?, ?, ?)",
+            [(source, int(mark), now) for source, mark in marks.items()],
+        )
+
+
+# Singleton
+_materializer = None
+
+def get_h2h_materializer() -> H2HMaterializer:
+    global _materializer
+    if _materializer is None:
+        _materializer = H2HMaterializer()
+    return _materializer
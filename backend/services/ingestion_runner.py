@@ -0,0 +1,437 @@
+"""
+Ingestion Runner
+================
+Shared engine for the bulk fetch_* / populate_* jobs.
+
+A run is a declarative list of IngestionJob entries (items + an async
+fetch + a bulk write). All jobs share:
+
+  - one async worker pool (asyncio tasks, sync fetchers run in threads)
+  - one global TokenBucket governor, so total upstream requests/sec stay
+    at the configured limit however many workers are in flight; a 429
+    pauses the whole bucket instead of one worker
+  - retries with full-jitter exponential backoff
+  - a JSON checkpoint: item keys are marked done only after their bulk
+    write committed, so an interrupted run resumes where it stopped; a
+    job that finishes with no failed items or writes clears its keys, so
+    the next scheduled run refetches everything
+  - per-job throughput metrics printed at the end
+
+Usage:
+    runner = IngestionRunner(rate=4.0, workers=8, checkpoint_path="data/ingest.json")
+    metrics = runner.run_sync([job_a, job_b])
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+
+class IngestError(Exception):
+    """Non-retryable failure for one item."""
+
+
+class RetryableError(IngestError):
+    """Transient failure (timeout, 5xx); the item is retried with backoff."""
+
+
+class RateLimited(RetryableError):
+    """Upstream said slow down; pauses the global governor before retrying."""
+
+    def __init__(self, message: str = "rate limited", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# ============================================================================
+# GOVERNOR
+# ============================================================================
+
+class TokenBucket:
+    """
+    Async token bucket shared by every worker.
+
+    `rate` tokens refill per second up to `burst`. penalize() blocks all
+    acquirers for a cool-down, e.g. after a 429.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self.acquired = 0
+        self.waited = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                else:
+                    if now > self._updated:
+                        self._refill(now)
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        self.acquired += 1
+                        return
+                    delay = (1.0 - self._tokens) / self.rate
+                self.waited += delay
+                await self._sleep(delay)
+
+    def penalize(self, seconds: float):
+        """Block every acquirer for `seconds` and drain the burst."""
+        now = self._clock()
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = max(self._updated, self._blocked_until)   # nothing accrues while blocked
+
+
+# ============================================================================
+# JOBS & METRICS
+# ============================================================================
+
+@dataclass
+class IngestionJob:
+    """
+    One declarative ingest job.
+
+    fetch(ctx, item) returns the records for an item. Async fetchers take
+    tokens through ctx.get_json / ctx.call; sync fetchers run in a worker
+    thread and are charged one token per attempt. write(records)
+    bulk-persists a batch and returns the number written. finalize() runs
+    once after the last flush.
+    """
+    name: str
+    items: Iterable[Any]
+    fetch: Callable[["JobContext", Any], Any]
+    write: Optional[Callable[[List[Any]], int]] = None
+    key: Callable[[Any], str] = str
+    batch_size: int = 50
+    max_retries: int = 4
+    finalize: Optional[Callable[[], Any]] = None
+
+
+@dataclass
+class JobMetrics:
+    name: str
+    items: int = 0
+    skipped: int = 0
+    ok: int = 0
+    failed: int = 0
+    records: int = 0
+    written: int = 0
+    write_errors: int = 0
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    started: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def items_per_sec(self) -> float:
+        return self.ok / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def requests_per_sec(self) -> float:
+        return self.requests / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job": self.name, "items": self.items, "skipped": self.skipped, "ok": self.ok,
+            "failed": self.failed, "records": self.records, "written": self.written,
+            "write_errors": self.write_errors, "requests": self.requests, "retries": self.retries,
+            "rate_limited": self.rate_limited, "elapsed_s": round(self.elapsed, 1),
+            "items_per_sec": round(self.items_per_sec, 2),
+            "requests_per_sec": round(self.requests_per_sec, 2),
+        }
+
+
+def format_metrics(metrics: Iterable[JobMetrics]) -> str:
+    header = f"{'job':<18}{'ok':>7}{'fail':>6}{'skip':>7}{'written':>9}{'req':>7}{'retry':>7}{'429':>5}{'items/s':>9}{'req/s':>7}{'secs':>8}"
+    lines = [header, "-" * len(header)]
+    for m in metrics:
+        lines.append(
+            f"{m.name:<18}{m.ok:>7}{m.failed:>6}{m.skipped:>7}{m.written:>9}{m.requests:>7}"
+            f"{m.retries:>7}{m.rate_limited:>5}{m.items_per_sec:>9.2f}{m.requests_per_sec:>7.2f}{m.elapsed:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+# ============================================================================
+# CHECKPOINT
+# ============================================================================
+
+class Checkpoint:
+    """Done item keys per job, persisted atomically as JSON (in memory if no path)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self._done: Dict[str, Set[str]] = {}
+        if self.path and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                self._done = {job: set(keys) for job, keys in data.get("done", {}).items()}
+            except (OSError, ValueError) as e:
+                logger.warning(f"[INGEST] Ignoring unreadable checkpoint {self.path}: {e}")
+
+    def done(self, job: str) -> Set[str]:
+        return self._done.setdefault(job, set())
+
+    def mark(self, job: str, keys: Iterable[str]):
+        self.done(job).update(keys)
+        self.save()
+
+    def reset(self, job: str):
+        self._done.pop(job, None)
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({
+            "done": {job: sorted(keys) for job, keys in self._done.items()},
+            "updated_at": time.time(),
+        }))
+        os.replace(tmp, self.path)
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+class JobContext:
+    """Handed to fetch(): governed HTTP and thread calls, attributed to one job."""
+
+    def __init__(self, runner: "IngestionRunner", metrics: JobMetrics):
+        self.runner = runner
+        self.metrics = metrics
+
+    async def get_json(self, url: str, params: Optional[Dict] = None) -> Any:
+        """GET through the governor; 429 -> RateLimited, 5xx/timeouts -> RetryableError."""
+        await self.runner.governor.acquire()
+        self.metrics.requests += 1
+        session = await self.runner._http()
+        try:
+            async with session.get(url, params=params) as resp:
+                if resp.status == 429:
+                    retry_after = resp.headers.get("Retry-After")
+                    raise RateLimited(retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None)
+                if resp.status >= 500:
+                    raise RetryableError(f"HTTP {resp.status}")
+                if resp.status != 200:
+                    raise IngestError(f"HTTP {resp.status}")
+                return await resp.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise RetryableError(f"{type(e).__name__}: {e}") from e
+
+    async def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run one blocking upstream call in a thread after taking a token."""
+        await self.runner.governor.acquire()
+        self.metrics.requests += 1
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+class IngestionRunner:
+    def __init__(self, rate: float = 2.0, burst: float = 2.0, workers: int = 8,
+                 checkpoint_path: Optional[str] = None, headers: Optional[Dict] = None,
+                 timeout: float = 30.0, backoff_base: float = 1.0, backoff_cap: float = 60.0,
+                 rate_limit_cooldown: float = 30.0, governor: Optional[TokenBucket] = None,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.governor = governor or TokenBucket(rate, burst)
+        self.workers = workers
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self._sleep = sleep
+        self._session = None
+
+    async def _http(self):
+        if not AIOHTTP_AVAILABLE:
+            raise IngestError("aiohttp is required for get_json")
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers, timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    async def fetch_one(self, name: str, fetch: Callable[[JobContext, Any], Any],
+                        max_retries: int = 4) -> List[Any]:
+        """One governed fetch outside any job (e.g. the roster a run is built from), same retries."""
+        job = IngestionJob(name, [], fetch, key=lambda _: name, max_retries=max_retries)
+        records = await self._fetch(job, JobContext(self, JobMetrics(name)), None)
+        if records is None:
+            raise IngestError(f"{name}: fetch failed")
+        return records
+
+    # ── per item ─────────────────────────────────────────────────────────
+
+    async def _fetch(self, job: IngestionJob, ctx: JobContext, item: Any) -> Optional[List[Any]]:
+        metrics = ctx.metrics
+        for attempt in range(job.max_retries + 1):
+            try:
+                if asyncio.iscoroutinefunction(job.fetch):
+                    result = await job.fetch(ctx, item)
+                else:
+                    # Blocking fetchers are charged one token per attempt
+                    await self.governor.acquire()
+                    metrics.requests += 1
+                    result = await asyncio.to_thread(job.fetch, ctx, item)
+                if result is None:
+                    return []
+                return result if isinstance(result, list) else [result]
+            except RateLimited as e:
+                metrics.rate_limited += 1
+                self.governor.penalize(e.retry_after or self.rate_limit_cooldown)
+                logger.warning(f"[INGEST] {job.name}: 429, governor paused {e.retry_after or self.rate_limit_cooldown:.0f}s")
+            except RetryableError as e:
+                if attempt < job.max_retries:
+                    await self._sleep(self.backoff(attempt))
+                logger.debug(f"[INGEST] {job.name} {job.key(item)}: {e}")
+            except Exception as e:
+                logger.warning(f"[INGEST] {job.name} {job.key(item)} failed: {e}")
+                return None
+            if attempt < job.max_retries:
+                metrics.retries += 1
+        logger.warning(f"[INGEST] {job.name} {job.key(item)} gave up after {job.max_retries + 1} attempts")
+        return None
+
+    async def _flush(self, job: IngestionJob, metrics: JobMetrics, buffer: List):
+        if not buffer:
+            return
+        batch, buffer[:] = list(buffer), []
+        keys = [k for k, _ in batch]
+        records = [r for _, recs in batch for r in recs]
+        if job.write and records:
+            try:
+                written = await asyncio.to_thread(job.write, records)
+                metrics.written += written if isinstance(written, int) else len(records)
+            except Exception as e:
+                metrics.write_errors += 1
+                logger.error(f"[INGEST] {job.name} bulk write of {len(records)} records failed: {e}")
+                return
+        self.checkpoint.mark(job.name, keys)
+
+    # ── run ──────────────────────────────────────────────────────────────
+
+    async def run(self, jobs: List[IngestionJob], resume: bool = True) -> List[JobMetrics]:
+        queue: asyncio.Queue = asyncio.Queue()
+        state = {}
+        for job in jobs:
+            metrics = JobMetrics(job.name)
+            if not resume:
+                self.checkpoint.reset(job.name)
+            done = self.checkpoint.done(job.name)
+            pending = 0
+            for item in job.items:
+                metrics.items += 1
+                if job.key(item) in done:
+                    metrics.skipped += 1
+                    continue
+                queue.put_nowait((job, item))
+                pending += 1
+            state[job.name] = {"metrics": metrics, "ctx": JobContext(self, metrics), "buffer": [],
+                               "lock": asyncio.Lock(), "pending": pending}
+            logger.info(f"[INGEST] {job.name}: {pending} items queued ({metrics.skipped} already done)")
+
+        async def worker():
+            while True:
+                try:
+                    job, item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                st = state[job.name]
+                metrics = st["metrics"]
+                records = await self._fetch(job, st["ctx"], item)
+                async with st["lock"]:
+                    st["pending"] -= 1
+                    if records is None:
+                        metrics.failed += 1
+                    else:
+                        metrics.ok += 1
+                        metrics.records += len(records)
+                        st["buffer"].append((job.key(item), records))
+                    if len(st["buffer"]) >= job.batch_size or st["pending"] == 0:
+                        await self._flush(job, metrics, st["buffer"])
+                    if st["pending"] == 0:
+                        await self._complete(job, metrics)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, self.workers))))
+            for job in jobs:
+                st = state[job.name]
+                if st["metrics"].finished is None:         # nothing was queued
+                    await self._complete(job, st["metrics"])
+        finally:
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+
+        all_metrics = [state[job.name]["metrics"] for job in jobs]
+        logger.info("[INGEST] Run complete\n" + format_metrics(all_metrics))
+        return all_metrics
+
+    async def _complete(self, job: IngestionJob, metrics: JobMetrics):
+        if job.finalize:
+            try:
+                await asyncio.to_thread(job.finalize)
+            except Exception as e:
+                logger.error(f"[INGEST] {job.name} finalize failed: {e}")
+        metrics.finished = time.time()
+        if metrics.failed == 0 and metrics.write_errors == 0:
+            # Resume is for interrupted runs; a clean finish starts the next run from scratch
+            self.checkpoint.reset(job.name)
+        logger.info(
+            f"[INGEST] {job.name} done: {metrics.ok} ok, {metrics.failed} failed, "
+            f"{metrics.written} written, {metrics.items_per_sec:.2f} items/s, "
+            f"{metrics.requests_per_sec:.2f} req/s"
+        )
+
+    def run_sync(self, jobs: List[IngestionJob], resume: bool = True) -> List[JobMetrics]:
+        return asyncio.run(self.run(jobs, resume=resume))
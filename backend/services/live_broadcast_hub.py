@@ -0,0 +1,241 @@
+"""
+Live Broadcast Hub — Shared SSE Fan-Out for /live/stream
+=========================================================
+One producer, many viewers. Previously every /live/stream client ran its
+own 1-second polling loop and re-serialized the full producer snapshot
+whenever it changed — N identical `json.dumps` calls per update and N
+wakeups per second even when nothing moved.
+
+The hub is fed once per producer cycle by CloudAsyncPulseProducer:
+
+    publish(snapshot, frame)
+        ├─ seq = frame["seq"]                          (LiveDeltaEncoder)
+        ├─ encode the full snapshot frame ONCE        (default SSE message)
+        ├─ encode the producer's patch frame ONCE     (event: delta)
+        ├─ append both to a short history ring
+        └─ push the pre-encoded bytes to every subscriber queue
+
+Subscribers:
+    mode="full"  — receive every full snapshot (legacy LivePulseData shape)
+    mode="delta" — receive one full keyframe, then LiveDeltaEncoder patch
+                   frames (and the producer's periodic keyframes)
+
+Each subscriber owns a bounded asyncio.Queue; the generator awaits it and
+therefore wakes only when there is new data (or to send a heartbeat).
+A slow consumer never grows memory: on overflow its backlog is discarded
+and replaced with the latest full frame, which is a valid resync point
+for both modes.
+
+Resume:
+    Every frame carries `id: <epoch>-<seq>`. The epoch is random per hub
+    and is renewed whenever the producer's sequence goes backwards (an
+    encoder restart), so a cursor is only compared against sequence
+    numbers from the same run of the same instance. A reconnecting
+    EventSource sends Last-Event-ID; delta subscribers whose id is still
+    inside the history ring get the missed deltas replayed, everyone else
+    — including ids from another instance or an earlier epoch — gets the
+    latest full frame (or nothing, if they are already current).
+"""
+
+import asyncio
+import json
+import logging
+import secrets
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+SUBSCRIBER_QUEUE_SIZE = 16
+HISTORY_SIZE = 64
+HEARTBEAT_SECONDS = 15.0
+
+MODES = ("full", "delta")
+
+HEARTBEAT_FRAME = b": heartbeat\n\n"
+
+
+def _dumps(payload: Any) -> str:
+    return json.dumps(payload, separators=(",", ":"), default=str)
+
+
+def encode_event(event_id: Optional[str], payload: Any, event: Optional[str] = None) -> bytes:
+    """Encode one SSE frame. Called once per frame, never per client."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {_dumps(payload)}")
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+def _new_epoch() -> str:
+    return secrets.token_hex(4)
+
+
+def parse_event_id(value: Optional[str]) -> Optional[Tuple[str, int]]:
+    """'<epoch>-<seq>' → (epoch, seq); None for a missing or foreign id."""
+    epoch, _, seq = (value or "").rpartition("-")
+    try:
+        return (epoch, int(seq)) if epoch else None
+    except ValueError:
+        return None
+
+
+# ============================================================================
+# SUBSCRIBER
+# ============================================================================
+
+class HubSubscriber:
+    """One connected SSE client: a bounded queue of pre-encoded frames."""
+
+    def __init__(self, mode: str, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.mode = mode
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.resyncs = 0
+
+    def offer(self, frame: bytes, resync_frame: bytes):
+        """Enqueue without blocking; on overflow collapse to a resync frame."""
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(resync_frame)
+            self.resyncs += 1
+
+    async def next_frame(self, timeout: float = HEARTBEAT_SECONDS) -> bytes:
+        """Wait for the next frame; a heartbeat comment if none arrives in time."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return HEARTBEAT_FRAME
+
+
+# ============================================================================
+# HUB
+# ============================================================================
+
+class LiveBroadcastHub:
+    """Encodes each producer snapshot once and fans the bytes out."""
+
+    def __init__(self, history_size: int = HISTORY_SIZE, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self._queue_size = queue_size
+        self._epoch = _new_epoch()
+        self._seq = 0
+        self._resets = 0
+        # (seq, full_frame, delta_frame)
+        self._history: Deque[Tuple[int, bytes, bytes]] = deque(maxlen=history_size)
+        self._subscribers: Set[HubSubscriber] = set()
+        self._published = 0
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @property
+    def epoch(self) -> str:
+        return self._epoch
+
+    def event_id(self, seq: int) -> str:
+        return f"{self._epoch}-{seq}"
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def latest_full_frame(self) -> Optional[bytes]:
+        return self._history[-1][1] if self._history else None
+
+    # ── Publishing ──────────────────────────────────────────────────────────
+
+    def publish(self, snapshot: Dict, frame: Optional[Dict] = None) -> int:
+        """
+        Encode and broadcast one snapshot. Returns its sequence number.
+
+        `frame` is the producer's LiveDeltaEncoder output for this cycle;
+        without one (or for a keyframe) delta subscribers get the full frame.
+        A sequence number at or below the last one means the encoder was
+        restarted: the hub starts a new epoch, drops the history (its
+        deltas no longer apply) and sends this cycle as a full frame.
+        """
+        seq = frame["seq"] if frame else self._seq + 1
+        reset = seq <= self._seq
+        if reset:
+            logger.info(f"[LIVE-HUB] Sequence reset {self._seq} -> {seq}, starting a new epoch")
+            self._epoch = _new_epoch()
+            self._history.clear()
+            self._resets += 1
+        self._seq = seq
+        event_id = self.event_id(seq)
+        full_frame = encode_event(event_id, snapshot)
+        if frame and frame.get("type") == "patch" and not reset:
+            delta_frame = encode_event(event_id, frame, event="delta")
+        else:
+            delta_frame = full_frame
+        self._history.append((self._seq, full_frame, delta_frame))
+        self._published += 1
+
+        for sub in list(self._subscribers):
+            sub.offer(full_frame if sub.mode == "full" else delta_frame, full_frame)
+        return self._seq
+
+    # ── Subscribing ─────────────────────────────────────────────────────────
+
+    def _backlog(self, mode: str, last_event_id: Optional[str]) -> List[bytes]:
+        """Frames a new or resuming subscriber needs before live frames."""
+        if not self._history:
+            return []
+        latest_seq, latest_full, _ = self._history[-1]
+        cursor = parse_event_id(last_event_id)
+        if cursor is None or cursor[0] != self._epoch:
+            return [latest_full]  # new client, another instance, or before a reset
+        last_seq = cursor[1]
+        if last_seq >= latest_seq:
+            return []  # already current
+        if mode == "delta":
+            oldest_seq = self._history[0][0]
+            if last_seq >= oldest_seq - 1:
+                return [delta for seq, _, delta in self._history if seq > last_seq]
+        return [latest_full]
+
+    def subscribe(self, mode: str = "full", last_event_id: Optional[str] = None) -> HubSubscriber:
+        """Register a client (Last-Event-ID as sent) and pre-load whatever it needs to catch up."""
+        if mode not in MODES:
+            mode = "full"
+        sub = HubSubscriber(mode, maxsize=self._queue_size)
+        latest_full = self.latest_full_frame()
+        for frame in self._backlog(mode, last_event_id):
+            sub.offer(frame, latest_full)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: HubSubscriber):
+        self._subscribers.discard(sub)
+
+    def stats(self) -> Dict:
+        return {
+            "seq": self._seq,
+            "epoch": self._epoch,
+            "resets": self._resets,
+            "published": self._published,
+            "subscribers": len(self._subscribers),
+            "history": len(self._history),
+            "resyncs": sum(s.resyncs for s in self._subscribers),
+        }
+
+
+_hub: Optional[LiveBroadcastHub] = None
+
+
+def get_live_hub() -> LiveBroadcastHub:
+    """Get the process-wide LiveBroadcastHub singleton."""
+    global _hub
+    if _hub is None:
+        _hub = LiveBroadcastHub()
+    return _hub
@@ -0,0 +1,246 @@
+"""
+Live Delta Encoder — Structural Diffs Between Producer Cycles
+==============================================================
+CloudAsyncPulseProducer rebuilds the complete live state every cycle
+(every game plus the top-10 leaders). Most cycles only move a clock and
+a score or two, so shipping the full state to every SSE/WebSocket client
+wastes egress and client parse time.
+
+`LiveDeltaEncoder.encode(snapshot)` compares the new snapshot with the
+previous one and returns a frame:
+
+    keyframe  {"type": "keyframe", "seq": N, "snapshot": {...}}
+        Sent first, every KEYFRAME_INTERVAL cycles, and whenever the
+        encoder is reset. Clients replace their state wholesale.
+
+    patch     {"type": "patch", "seq": N, "base_seq": N-1,
+               "games":   {"upsert": {game_id: row_patch}, "remove": [ids]},
+               "leaders": {"upsert": {player_id: row_patch}, "remove": [ids],
+                           "order": [player_ids]},          # only if changed
+               "meta":    {...}}
+
+A row patch holds only the changed keys; nested dicts (e.g. `stats`) are
+diffed recursively and removed keys are listed under "$unset". Lists are
+replaced whole.
+
+Sequence numbers increase by exactly one per cycle. A client that sees
+`base_seq` != its last applied seq has missed a frame and must resync —
+reconnect with Last-Event-ID or fetch GET /live/games. `apply_frame()`
+is the reference client implementation and raises `SequenceGap`.
+
+Patches are opt-in: only /live/stream?mode=delta subscribers receive them.
+The default SSE mode and the WebSocket broadcast keep sending full state
+until a client that applies patches ships.
+"""
+
+import copy
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+KEYFRAME_INTERVAL = 30  # cycles (~5 minutes at the 10s producer interval)
+
+UNSET = "$unset"
+
+# Numeric stat keys surfaced in snapshot["changes"] for the gold pulse
+PULSE_STATS = ("pts", "reb", "ast", "stl", "blk", "fg3m", "to")
+
+
+class SequenceGap(Exception):
+    """Raised when a patch does not follow the last applied sequence."""
+
+    def __init__(self, expected: int, base_seq: int):
+        self.expected = expected
+        self.base_seq = base_seq
+        super().__init__(f"Sequence gap: have {expected}, patch is based on {base_seq}")
+
+
+# ============================================================================
+# DIFF PRIMITIVES
+# ============================================================================
+
+def diff_row(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Changed keys of `new` relative to `old`; nested dicts recurse."""
+    patch: Dict[str, Any] = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+            continue
+        previous = old[key]
+        if previous == value:
+            continue
+        if isinstance(previous, dict) and isinstance(value, dict):
+            patch[key] = diff_row(previous, value)
+        else:
+            patch[key] = value
+    removed = [key for key in old if key not in new]
+    if removed:
+        patch[UNSET] = removed
+    return patch
+
+
+def apply_row(row: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of diff_row: apply a row patch in place and return the row."""
+    for key in patch.get(UNSET, ()):
+        row.pop(key, None)
+    for key, value in patch.items():
+        if key == UNSET:
+            continue
+        if isinstance(value, dict) and isinstance(row.get(key), dict):
+            apply_row(row[key], value)
+        else:
+            row[key] = copy.deepcopy(value)
+    return row
+
+
+def _diff_rows(old: Dict[str, Dict], new: Dict[str, Dict]) -> Dict[str, Any]:
+    upsert = {}
+    for key, row in new.items():
+        if key not in old:
+            upsert[key] = row
+        elif old[key] != row:
+            upsert[key] = diff_row(old[key], row)
+    return {"upsert": upsert, "remove": [key for key in old if key not in new]}
+
+
+def _index(rows: List[Dict], key: str) -> Dict[str, Dict]:
+    return {str(r.get(key)): r for r in rows}
+
+
+def stat_changes(old: Dict[str, Dict], new: Dict[str, Dict]) -> Dict[str, Dict[str, int]]:
+    """Per-player positive stat increments between two leader indexes."""
+    changes: Dict[str, Dict[str, int]] = {}
+    for pid, row in new.items():
+        before = old.get(pid, {}).get("stats", {})
+        after = row.get("stats", {})
+        moved = {}
+        for stat in PULSE_STATS:
+            delta = (after.get(stat) or 0) - (before.get(stat) or 0)
+            if delta > 0 and pid in old:
+                moved[stat] = delta
+        if moved:
+            changes[pid] = moved
+    return changes
+
+
+# ============================================================================
+# ENCODER
+# ============================================================================
+
+class LiveDeltaEncoder:
+    """Turns consecutive producer snapshots into keyframes and patches."""
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL, start_seq: int = 0):
+        self.keyframe_interval = keyframe_interval
+        self.seq = start_seq
+        self._games: Dict[str, Dict] = {}
+        self._leaders: Dict[str, Dict] = {}
+        self._leader_order: List[str] = []
+        self._since_keyframe = 0
+        self._force_keyframe = True
+
+    def reset(self):
+        """Force the next frame to be a keyframe (e.g. after a producer restart)."""
+        self._force_keyframe = True
+
+    def changes_for(self, snapshot: Dict) -> Dict[str, Dict[str, int]]:
+        """Stat increments since the previous cycle, for snapshot['changes']."""
+        return stat_changes(self._leaders, _index(snapshot.get("leaders", []), "player_id"))
+
+    def encode(self, snapshot: Dict) -> Dict[str, Any]:
+        """Diff against the previous cycle; stamps snapshot["meta"]["seq"]."""
+        self.seq += 1
+        snapshot.setdefault("meta", {})["seq"] = self.seq
+        games = _index(snapshot.get("games", []), "game_id")
+        leaders = _index(snapshot.get("leaders", []), "player_id")
+        order = list(leaders)
+
+        keyframe = self._force_keyframe or self._since_keyframe >= self.keyframe_interval
+        if keyframe:
+            frame = {"type": "keyframe", "seq": self.seq, "snapshot": snapshot}
+            self._since_keyframe = 0
+            self._force_keyframe = False
+        else:
+            frame = {
+                "type": "patch",
+                "seq": self.seq,
+                "base_seq": self.seq - 1,
+                "games": _diff_rows(self._games, games),
+                "leaders": _diff_rows(self._leaders, leaders),
+                "meta": snapshot.get("meta", {}),
+            }
+            if order != self._leader_order:
+                frame["leaders"]["order"] = order
+            if snapshot.get("changes"):
+                frame["changes"] = snapshot["changes"]
+            self._since_keyframe += 1
+
+        self._games = copy.deepcopy(games)
+        self._leaders = copy.deepcopy(leaders)
+        self._leader_order = order
+        return frame
+
+
+def is_empty_patch(frame: Dict[str, Any]) -> bool:
+    """True for a patch that carries nothing beyond meta."""
+    if frame.get("type") != "patch":
+        return False
+    games, leaders = frame["games"], frame["leaders"]
+    return not (games["upsert"] or games["remove"] or leaders["upsert"]
+                or leaders["remove"] or "order" in leaders)
+
+
+# ============================================================================
+# REFERENCE CLIENT
+# ============================================================================
+
+def apply_frame(state: Optional[Dict[str, Any]], frame: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a keyframe or patch to client state and return the new state.
+
+    State shape: {"seq", "games": [...], "leaders": [...], "meta", "changes"}.
+    Raises SequenceGap if a patch does not build on `state["seq"]`.
+    """
+    if frame["type"] == "keyframe":
+        snap = copy.deepcopy(frame["snapshot"])
+        snap["seq"] = frame["seq"]
+        return snap
+
+    have = state.get("seq") if state else None
+    if have != frame["base_seq"]:
+        raise SequenceGap(have if have is not None else -1, frame["base_seq"])
+
+    games = _index(state.get("games", []), "game_id")
+    order_games = list(games)
+    for gid in frame["games"]["remove"]:
+        games.pop(gid, None)
+    for gid, patch in frame["games"]["upsert"].items():
+        if gid in games:
+            apply_row(games[gid], patch)
+        else:
+            games[gid] = copy.deepcopy(patch)
+            order_games.append(gid)
+
+    leaders = _index(state.get("leaders", []), "player_id")
+    for pid in frame["leaders"]["remove"]:
+        leaders.pop(pid, None)
+    for pid, patch in frame["leaders"]["upsert"].items():
+        if pid in leaders:
+            apply_row(leaders[pid], patch)
+        else:
+            leaders[pid] = copy.deepcopy(patch)
+    order = frame["leaders"].get("order") or [str(l.get("player_id")) for l in state.get("leaders", [])]
+
+    return {
+        **state,
+        "seq": frame["seq"],
+        "games": [games[g] for g in order_games if g in games],
+        "leaders": [leaders[p] for p in order if p in leaders],
+        "meta": frame.get("meta", state.get("meta", {})),
+        "changes": frame.get("changes", {}),
+    }
@@ -1,12 +1,22 @@
 import logging
+import os
+import aiohttp
 import requests
 import datetime
 import asyncio
-from typing import Dict, Any, List, Optional
+import hashlib
+import json
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
+# Upstream hosts. Override both with the same base URL to replay a recorded
+# game night from scripts/pulse_replay_server.py.
+ESPN_SITE_API = os.environ.get("ESPN_API_BASE_URL", "https://site.api.espn.com").rstrip("/")
+ESPN_WEB_API = os.environ.get("ESPN_API_BASE_URL", "https://site.web.api.espn.com").rstrip("/")
+NBA_CDN_BASE_URL = os.environ.get("NBA_CDN_BASE_URL", "https://cdn.nba.com").rstrip("/")
+
 # --- UNIFIED DATA MODELS ---
 
 class PlayEvent(BaseModel):
@@ -196,7 +206,7 @@ class NBAPlayByPlayClient:
         
     def fetch_live_game_ids(self) -> List[Dict[str, Any]]:
         """Returns a list of dicts with 'game_id', 'status', 'home', 'away' from ESPN"""
-        url = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
+        url = f"{ESPN_SITE_API}/apis/site/v2/sports/basketball/nba/scoreboard"
         try:
             res = self.session.get(url, timeout=5)
             res.raise_for_status()
@@ -218,7 +228,7 @@ class NBAPlayByPlayClient:
 
     def fetch_espn_plays(self, espn_game_id: str) -> List[PlayEvent]:
         """Fetch plays from ESPN and map to unified schema"""
-        url = f"https://site.web.api.espn.com/apis/site/v2/sports/basketball/nba/summary?event={espn_game_id}"
+        url = f"{ESPN_WEB_API}/apis/site/v2/sports/basketball/nba/summary?event={espn_game_id}"
         res = self.session.get(url, timeout=5)
         res.raise_for_status()
         data = res.json()
@@ -236,7 +246,7 @@ class NBAPlayByPlayClient:
 
     def fetch_nba_cdn_plays(self, nba_game_id: str) -> List[PlayEvent]:
         """Fallback: Fetch from CDN and map to unified schema"""
-        url = f"https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_{nba_game_id}.json"
+        url = f"{NBA_CDN_BASE_URL}/static/json/liveData/playbyplay/playbyplay_{nba_game_id}.json"
         res = self.session.get(url, timeout=5)
         res.raise_for_status()
         data = res.json()
@@ -252,3 +262,85 @@ class NBAPlayByPlayClient:
         return sorted(unified_plays, key=lambda x: x.sequenceNumber)
 
 pbp_client = NBAPlayByPlayClient()
+
+
+GAME_END_EVENT_TYPES = ("end game", "game end")
+GAME_END_DESCRIPTIONS = ("end of game", "game over")
+
+
+def is_game_end(event_type: str, description: str) -> bool:
+    """True for the ESPN/CDN play that closes a game."""
+    return (event_type or "").lower() in GAME_END_EVENT_TYPES \
+        or (description or "").lower() in GAME_END_DESCRIPTIONS
+
+
+class AsyncPlayByPlayClient:
+    """
+    aiohttp ESPN client shared by every tracked game.
+
+    One pooled session (keep-alive, bounded per-host connections) serves all
+    games. A summary body identical to the previous one for that game is
+    reported as unchanged without parsing, and only plays past the caller's
+    cursor are mapped to PlayEvent.
+    """
+
+    MAX_CONNECTIONS = 16
+    TIMEOUT_SECONDS = 8
+
+    def __init__(self):
+        self._session = None
+        self._body_hash: Dict[str, str] = {}
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.MAX_CONNECTIONS, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT_SECONDS),
+                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36'},
+            )
+        return self._session
+
+    async def fetch_plays_since(
+        self, espn_game_id: str, after_seq: int
+    ) -> Optional[Tuple[List[PlayEvent], bool]]:
+        """
+        New plays (sequenceNumber > after_seq, sorted) and whether the game
+        has ended, or None when the summary body has not changed.
+        Raises on HTTP/network errors so the caller can back off.
+        """
+        session = await self._get_session()
+        url = f"{ESPN_WEB_API}/apis/site/v2/sports/basketball/nba/summary?event={espn_game_id}"
+        async with session.get(url) as res:
+            res.raise_for_status()
+            body = await res.read()
+
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        if self._body_hash.get(espn_game_id) == digest:
+            return None
+        self._body_hash[espn_game_id] = digest
+
+        plays_raw = json.loads(body).get("plays", [])
+        ended = any(
+            is_game_end(p.get("type", {}).get("text", ""), p.get("text", ""))
+            for p in plays_raw
+        )
+        unified = []
+        for p in plays_raw:
+            try:
+                if int(p.get("sequenceNumber", 0)) <= after_seq:
+                    continue
+                unified.append(map_espn_to_unified(p))
+            except Exception as e:
+                logger.error(f"Error mapping ESPN play {p.get('id')}: {e}")
+        return sorted(unified, key=lambda x: x.sequenceNumber), ended
+
+    def forget(self, espn_game_id: str):
+        self._body_hash.pop(espn_game_id, None)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+async_pbp_client = AsyncPlayByPlayClient()
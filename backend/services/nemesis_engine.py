@@ -3,7 +3,6 @@ NemesisEngine v3 - PURE DYNAMIC DATA
 NO hardcoded fallbacks - returns unavailable status if no real data.
 All data comes from player_vs_team table.
 """
-import sqlite3
 from typing import Dict, Optional
 import sys
 from pathlib import Path
@@ -11,13 +10,7 @@ from pathlib import Path
 # Add parent to path for centralized imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-try:
-    from data_paths import get_db_connection
-    _USE_CENTRALIZED = True
-except ImportError:
-    _USE_CENTRALIZED = False
-    _SCRIPT_DIR = Path(__file__).parent.parent
-    _DB_PATH = _SCRIPT_DIR / 'data' / 'nba_data.db'
+from services.team_context_store import get_team_context_store
 
 
 class NemesisEngine:
@@ -25,49 +18,23 @@ class NemesisEngine:
     Analyzes historical player performance against specific opponents.
     PURE DYNAMIC - Only uses real data from player_vs_team table.
     Returns unavailable status if data doesn't exist.
+    A player's rows vs every opponent are read once and cached on the
+    shared TeamContextStore snapshot, so they refresh with the team data.
     """
     
-    _cache: Dict[str, Dict] = {}
-    
-    @staticmethod
-    def _get_db_connection():
-        """Get database connection if available - uses centralized paths"""
-        try:
-            if _USE_CENTRALIZED:
-                return get_db_connection()
-            else:
-                if _DB_PATH.exists():
-                    return sqlite3.connect(str(_DB_PATH))
-        except Exception:
-            pass
-        return None
-    
     @staticmethod
     def _get_real_matchup(player_id: str, opponent_team: str) -> Optional[Dict]:
         """Get REAL matchup data from database - NO FALLBACKS"""
         try:
-            conn = NemesisEngine._get_db_connection()
-            if not conn:
-                return None
-            
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT * FROM player_vs_team 
-                WHERE player_id = ? AND opponent = ?
-            """, (str(player_id), opponent_team.upper()))
-            
-            row = cursor.fetchone()
-            conn.close()
+            row = get_team_context_store().player_matchups(player_id).get(opponent_team.upper())
             
             if row:
-                avg_pts = row['avg_pts'] if 'avg_pts' in row.keys() else None
+                avg_pts = row.get('avg_pts')
                 if avg_pts and avg_pts > 0:
                     # Safe access for optional columns
-                    avg_reb = row['avg_reb'] if 'avg_reb' in row.keys() else 0
-                    avg_ast = row['avg_ast'] if 'avg_ast' in row.keys() else 0
-                    games = row['games'] if 'games' in row.keys() else 0
+                    avg_reb = row.get('avg_reb', 0)
+                    avg_ast = row.get('avg_ast', 0)
+                    games = row.get('games') or row.get('games_played', 0)
                     
                     return {
                         'avg_pts': avg_pts,
@@ -140,26 +107,11 @@ class NemesisEngine:
     @staticmethod
     def get_all_matchups(player_id: str) -> list:
         """Get all matchup data for a player against all opponents"""
-        try:
-            conn = NemesisEngine._get_db_connection()
-            if not conn:
-                return []
-            
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT * FROM player_vs_team 
-                WHERE player_id = ? AND avg_pts > 0
-                ORDER BY avg_pts DESC
-            """, (str(player_id),))
-            
-            rows = cursor.fetchall()
-            conn.close()
-            
-            return [dict(row) for row in rows]
-        except Exception:
-            return []
+        rows = get_team_context_store().player_matchups(player_id).values()
+        return sorted(
+            (dict(row) for row in rows if (row.get('avg_pts') or 0) > 0),
+            key=lambda row: row['avg_pts'], reverse=True,
+        )
     
     @staticmethod
     def has_matchup_history(player_id: str, opponent_team: str) -> bool:
@@ -169,5 +121,5 @@ class NemesisEngine:
     
     @staticmethod
     def clear_cache():
-        """Clear the cache"""
-        NemesisEngine._cache = {}
+        """Force a reload of the shared team context and player matchups"""
+        get_team_context_store().invalidate()
@@ -3,7 +3,6 @@ PaceEngine v3 - PURE DYNAMIC DATA
 NO hardcoded fallbacks - returns unavailable status if no real data.
 All data comes from team_defense table pace column.
 """
-import sqlite3
 from typing import Dict, Optional
 import sys
 from pathlib import Path
@@ -11,17 +10,7 @@ from pathlib import Path
 # Add parent to path for centralized imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-try:
-    from data_paths import get_db_connection
-    _USE_CENTRALIZED = True
-except ImportError:
-    _USE_CENTRALIZED = False
-    _SCRIPT_DIR = Path(__file__).parent.parent
-    _DB_PATH = _SCRIPT_DIR / 'data' / 'nba_data.db'
-
-
-# League average pace (only for multiplier calculation, not as fallback)
-LEAGUE_AVG_PACE = 99.5
+from services.team_context_store import LEAGUE_AVG_PACE, get_team_context_store, pace_category
 
 
 class PaceEngine:
@@ -29,69 +18,17 @@ class PaceEngine:
     Calculates pace adjustment factors for matchup projections.
     PURE DYNAMIC - Only uses real pace data from team_defense table.
     Returns neutral multiplier (1.0) if no data available.
+    Pace and all 435 pair multipliers are precomputed on the shared
+    TeamContextStore snapshot.
     """
     
-    _cache: Dict[str, Dict] = {}
-    
-    @staticmethod
-    def _get_db_connection():
-        """Get database connection if available - uses centralized paths"""
-        try:
-            if _USE_CENTRALIZED:
-                return get_db_connection()
-            else:
-                if _DB_PATH.exists():
-                    return sqlite3.connect(str(_DB_PATH))
-        except Exception:
-            pass
-        return None
-    
-    @staticmethod
-    def _get_real_pace(team_code: str) -> Optional[Dict]:
-        """Get REAL pace from database - NO FALLBACKS"""
-        team_code = team_code.upper()
-        
-        # Check cache first
-        if team_code in PaceEngine._cache:
-            return PaceEngine._cache[team_code]
-        
-        try:
-            conn = PaceEngine._get_db_connection()
-            if not conn:
-                return None
-            
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT pace FROM team_defense WHERE team_abbr = ?
-            """, (team_code,))
-            
-            row = cursor.fetchone()
-            conn.close()
-            
-            if row and row['pace'] and row['pace'] > 0:
-                result = {
-                    'pace': float(row['pace']),
-                    'available': True,
-                    'source': 'real_data'
-                }
-                PaceEngine._cache[team_code] = result
-                return result
-            return None
-        except Exception:
-            return None
-    
     @staticmethod
     def get_team_pace(team_code: str) -> Optional[float]:
         """
         Get pace for a team.
         Returns None if no real data available.
         """
-        data = PaceEngine._get_real_pace(team_code)
-        if data and data.get('available'):
-            return data['pace']
-        return None
+        return get_team_context_store().snapshot().team_pace(team_code)
     
     @staticmethod
     def calculate_multiplier(team1: str, team2: str) -> float:
@@ -99,23 +36,9 @@ class PaceEngine:
         Calculate pace adjustment multiplier for a matchup.
         Returns 1.0 (neutral) if either team's pace is unavailable.
         """
-        pace1 = PaceEngine.get_team_pace(team1)
-        pace2 = PaceEngine.get_team_pace(team2)
-        
-        # If either team has no data, return neutral multiplier
-        if pace1 is None or pace2 is None:
-            return 1.0
-        
-        projected_pace = (pace1 + pace2) / 2
-        multiplier = projected_pace / LEAGUE_AVG_PACE
-        
-        # Safety Valve: Cap at +/- 12%
-        if multiplier > 1.12: 
-            multiplier = 1.12
-        if multiplier < 0.88: 
-            multiplier = 0.88
-        
-        return round(multiplier, 3)
+        # Pairs without pace on both sides carry the neutral 1.0
+        pair = get_team_context_store().snapshot().pair(team1, team2)
+        return pair.pace_multiplier if pair else 1.0
     
     @staticmethod
     def get_matchup_pace_info(team1: str, team2: str) -> Dict:
@@ -123,8 +46,9 @@ class PaceEngine:
         Get detailed pace information for a matchup.
         Returns availability status for each team.
         """
-        pace1 = PaceEngine.get_team_pace(team1)
-        pace2 = PaceEngine.get_team_pace(team2)
+        snapshot = get_team_context_store().snapshot()
+        pace1 = snapshot.team_pace(team1)
+        pace2 = snapshot.team_pace(team2)
         
         # Build response with availability info
         result = {
@@ -138,15 +62,9 @@ class PaceEngine:
         
         if pace1 is not None and pace2 is not None:
             projected = (pace1 + pace2) / 2
-            multiplier = PaceEngine.calculate_multiplier(team1, team2)
-            
-            # Determine pace category
-            if projected > 101:
-                category = "Fast"
-            elif projected < 98:
-                category = "Slow"
-            else:
-                category = "Average"
+            pair = snapshot.pair(team1, team2)
+            multiplier = pair.pace_multiplier if pair else 1.0
+            category = pace_category(projected)
             
             result.update({
                 "projected_pace": round(projected, 1),
@@ -177,20 +95,9 @@ class PaceEngine:
     @staticmethod
     def get_all_teams_with_pace() -> list:
         """Get list of all teams with real pace data"""
-        try:
-            conn = PaceEngine._get_db_connection()
-            if not conn:
-                return []
-            
-            cursor = conn.cursor()
-            cursor.execute("SELECT team_abbr, pace FROM team_defense WHERE pace > 0")
-            teams = [(row[0], row[1]) for row in cursor.fetchall()]
-            conn.close()
-            return teams
-        except Exception:
-            return []
+        return sorted(get_team_context_store().snapshot().pace.items())
     
     @staticmethod
     def clear_cache():
-        """Clear the cache"""
-        PaceEngine._cache = {}
+        """Force a reload of the shared team context"""
+        get_team_context_store().invalidate()
@@ -1,69 +1,207 @@
 """
-PBP Polling Service — Refactored (Phase 3)
-==========================================
-Key changes from the original:
-
-1. CURSOR PERSISTENCE: On poller start, reads lastSequenceNumber from
-   live_games/{gameId} in Firestore. If Cloud Run cold-starts mid-game,
-   we resume from the correct position — no redundant re-ingestion.
-
-2. LIVE STATE CADENCE: live_games/{gameId} is written at most every
-   LIVE_STATE_CADENCE_SEC seconds (default 5). This prevents Firestore
-   write hotspots on busy games.
-
-3. NEW WRITE PATH: Uses save_plays_batch_v2() which writes to both
-   pbp_events/ (new) AND live_games/.../plays/ (legacy dual-write).
-
-4. FINALIZATION: When 'End Game' is detected, calls finalize_game()
-   which creates final_games/{gameId} and marks tracking disabled.
-
-5. GAME RECORD UPDATE: On every batch, upserts canonical games/ and
-   calendar/ records via FirebaseGameService.
+PBP Polling Service — Multiplexed Scheduler
+===========================================
+Every tracked game is polled by ONE scheduler task instead of a task per
+game. Each pass over the due games:
+
+    1. INIT (once per game): one live_games/{gameId} read supplies both the
+       resume cursor (lastSequenceNumber) and the game metadata (date,
+       teams) used for shot docs and the canonical games/ + calendar/
+       records. If Cloud Run cold-starts mid-game we resume from the stored
+       cursor and seed the SSE ring buffer from Firestore.
+
+    2. FETCH: all due games are fetched concurrently through
+       AsyncPlayByPlayClient, which shares one pooled aiohttp session and
+       skips parsing when a game's summary body has not changed.
+
+    3. WRITE: new plays for every game (pbp_events/, shots, player_shots)
+       plus the cadence-throttled live_games/{gameId} state docs are staged
+       into a single BatchedWriter and committed together in one thread
+       hop, then shot summaries are folded in across games. Cursors only
+       advance after the commit succeeds.
+
+    4. FAN-OUT: each game's batch is encoded once into its PBPGameChannel
+       ring buffer (services/pbp_stream_buffer.py) and pushed to every SSE
+       subscriber. Reconnects resume from Last-Event-ID out of the buffer.
+
+    5. FINALIZE: when 'End Game' is seen, finalize_game() creates
+       final_games/{gameId}, SSE clients get game_ended, and the game is
+       dropped from the schedule.
+
+ADAPTIVE INTERVALS: each game's next poll is derived from its last play —
+CLUTCH_INTERVAL_SEC late in close 4th quarters/overtime, HALFTIME and BREAK
+intervals between periods, PREGAME_INTERVAL_SEC before the first play and
+POLL_INTERVAL_SEC otherwise. Consecutive errors back off exponentially up
+to MAX_BACKOFF_SEC.
 """
 import asyncio
 import logging
 import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from firestore_db import get_firestore_db
-from services.nba_pbp_service import pbp_client, PlayEvent
-from services.firebase_pbp_service import firebase_pbp_service, FirebasePBPService
+from services.nba_pbp_service import async_pbp_client, PlayEvent
+from services.firebase_pbp_service import BatchedWriter, FirebasePBPService
 from services.firestore_collections import LIVE_GAMES
+from services.pbp_stream_buffer import PBPGameChannel, PBPSubscriber, RING_MAX_PLAYS
 
 logger = logging.getLogger(__name__)
 
 
+def clock_seconds(clock: str) -> Optional[float]:
+    """Seconds left in the period from an ESPN clock ('5:32' or '45.2')."""
+    try:
+        if ":" in clock:
+            minutes, seconds = clock.split(":", 1)
+            return int(minutes) * 60 + float(seconds)
+        return float(clock)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class TrackedGame:
+    """Scheduler state for one game."""
+    game_id: str
+    cursor: int = -1
+    ready: bool = False                  # cursor + metadata loaded
+    meta: Dict[str, Any] = field(default_factory=dict)
+    meta_checked: float = 0.0            # monotonic time of last metadata read
+    records_written: bool = False        # canonical games/ + calendar/ upserted
+    last_play: Optional[PlayEvent] = None
+    interval: float = 0.0
+    next_poll: float = 0.0
+    errors: int = 0
+    last_live_write: float = 0.0
+
+    @property
+    def game_date(self) -> str:
+        return self.meta.get("gameDate", "")
+
+    def tricode(self, side: str) -> str:
+        team = self.meta.get(side)
+        return team.get("tricode", "") if isinstance(team, dict) else ""
+
+
+# (game, new plays, game ended, write live state this cycle)
+_Staged = Tuple[TrackedGame, List[PlayEvent], bool, bool]
+
+
 class PBPPollingService:
     # Minimum seconds between live_games/{id} state writes
     LIVE_STATE_CADENCE_SEC: float = 5.0
+    # Finished games whose ring buffers stay in memory for late viewers
+    ENDED_CHANNELS_KEPT: int = 16
+
+    # Adaptive poll intervals (seconds)
+    POLL_INTERVAL_SEC: float = 10.0
+    CLUTCH_INTERVAL_SEC: float = 3.0
+    BREAK_INTERVAL_SEC: float = 20.0
+    HALFTIME_INTERVAL_SEC: float = 45.0
+    PREGAME_INTERVAL_SEC: float = 30.0
+    MAX_BACKOFF_SEC: float = 60.0
+    # Clutch: 4th quarter or OT, under this many seconds, within this margin
+    CLUTCH_SECONDS_LEFT: float = 300.0
+    CLUTCH_MARGIN: int = 5
+    # Games without a gameDate re-read live_games at most this often
+    META_REFRESH_SEC: float = 60.0
 
     def __init__(self):
-        self.active_tasks: Dict[str, asyncio.Task] = {}
+        self.games: Dict[str, TrackedGame] = {}
         self.game_metadata_cache: Dict[str, Dict[str, Any]] = {}
-        # In-memory broker for SSE routes. game_id -> list[asyncio.Queue]
-        self.sse_queues: Dict[str, List[asyncio.Queue]] = {}
+        # In-memory broker for SSE routes. game_id -> ring buffer + subscribers
+        self.channels: Dict[str, PBPGameChannel] = {}
+        self._ended_order: List[str] = []
+        self._scheduler: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.cycles = 0
+        self.commits = 0
 
     def get_tracked_games(self) -> List[str]:
-        return list(self.active_tasks.keys())
+        return list(self.games.keys())
 
     async def start_tracking(self, game_id: str):
-        if game_id in self.active_tasks:
+        if game_id in self.games:
             logger.info(f"Already tracking game {game_id}")
             return
         logger.info(f"Starting tracking for game {game_id}")
-        self.active_tasks[game_id] = asyncio.create_task(
-            self._poll_loop(game_id)
-        )
+        self.games[game_id] = TrackedGame(game_id=game_id)
+        self._ensure_scheduler()
 
     def stop_tracking(self, game_id: str):
-        task = self.active_tasks.pop(game_id, None)
-        if task:
-            task.cancel()
+        if self.games.pop(game_id, None) is not None:
+            async_pbp_client.forget(game_id)
+            self._notify()
             logger.info(f"Stopped tracking game {game_id}")
+        self._drop_channel(game_id)
+
+    async def shutdown(self):
+        """Cancel the scheduler and close the shared HTTP session."""
+        task = self._scheduler
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await async_pbp_client.close()
+
+    def _ensure_scheduler(self):
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.create_task(self._run_scheduler())
+        self._notify()
+
+    def _notify(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    # ── Adaptive cadence ──────────────────────────────────────────────────────
+
+    @classmethod
+    def adaptive_interval(cls, last_play: Optional[PlayEvent]) -> float:
+        """Poll interval implied by the most recent play of a game."""
+        if last_play is None:
+            return cls.PREGAME_INTERVAL_SEC
+        event = (last_play.eventType or "").lower()
+        text = (last_play.description or "").lower()
+        if event == "end period" or text.startswith("end of"):
+            return cls.HALFTIME_INTERVAL_SEC if last_play.period == 2 else cls.BREAK_INTERVAL_SEC
+        left = clock_seconds(last_play.clock)
+        margin = abs(last_play.homeScore - last_play.awayScore)
+        if (last_play.period >= 4 and left is not None
+                and left <= cls.CLUTCH_SECONDS_LEFT and margin <= cls.CLUTCH_MARGIN):
+            return cls.CLUTCH_INTERVAL_SEC
+        return cls.POLL_INTERVAL_SEC
+
+    def _reschedule(self, game: TrackedGame, now: float):
+        game.interval = self.adaptive_interval(game.last_play)
+        delay = game.interval
+        if game.errors:
+            delay = min(game.interval * (2 ** game.errors), self.MAX_BACKOFF_SEC)
+        game.next_poll = now + delay
 
     # ── Core helpers (sync — called via asyncio.to_thread) ────────────────────
 
+    @staticmethod
+    def _read_live_doc(game_id: str) -> Optional[Dict[str, Any]]:
+        """live_games/{gameId} as a dict, {} if missing, None on read failure."""
+        try:
+            db = get_firestore_db()
+            doc = db.collection(LIVE_GAMES).document(str(game_id)).get()
+            return doc.to_dict() if doc.exists else {}
+        except Exception as e:
+            logger.warning(f"[Polling] live_games read failed for {game_id}: {e}")
+            return None
+
+    @staticmethod
+    def _cursor_from(live: Optional[Dict[str, Any]]) -> int:
+        val = (live or {}).get("lastSequenceNumber", -1)
+        return int(val) if val is not None else -1
+
     @staticmethod
     def _read_cursor(game_id: str) -> int:
         """
@@ -72,17 +210,23 @@ class PBPPollingService:
         Returns the stored cursor, or -1 if the doc doesn't exist yet
         (first time tracking this game).
         """
-        try:
-            db = get_firestore_db()
-            doc = db.collection(LIVE_GAMES).document(str(game_id)).get()
-            if doc.exists:
-                data = doc.to_dict()
-                val = data.get("lastSequenceNumber", -1)
-                return int(val) if val is not None else -1
-            return -1
-        except Exception as e:
-            logger.warning(f"[Polling] _read_cursor failed for {game_id}: {e}")
-            return -1
+        return PBPPollingService._cursor_from(PBPPollingService._read_live_doc(game_id))
+
+    @staticmethod
+    def _live_state_doc(last_seq: int, last_play: PlayEvent) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc).isoformat()
+        return {
+            "status": "In Progress",
+            "period": last_play.period,
+            "clock": last_play.clock,
+            "homeScore": last_play.homeScore,
+            "awayScore": last_play.awayScore,
+            "lastSequenceNumber": last_seq,
+            "lastPlayId": str(last_play.playId),
+            "ingestHeartbeat": now,
+            "updatedAt": now,
+            "trackingEnabled": True,
+        }
 
     @staticmethod
     def _write_live_state(game_id: str, last_seq: int, last_play: PlayEvent):
@@ -96,43 +240,22 @@ class PBPPollingService:
         """
         try:
             db = get_firestore_db()
-            now = datetime.now(timezone.utc).isoformat()
-            doc = {
-                "status": "In Progress",
-                "period": last_play.period,
-                "clock": last_play.clock,
-                "homeScore": last_play.homeScore,
-                "awayScore": last_play.awayScore,
-                "lastSequenceNumber": last_seq,
-                "lastPlayId": str(last_play.playId),
-                "ingestHeartbeat": now,
-                "updatedAt": now,
-                "trackingEnabled": True,
-            }
+            doc = PBPPollingService._live_state_doc(last_seq, last_play)
             db.collection(LIVE_GAMES).document(str(game_id)).set(doc, merge=True)
         except Exception as e:
             logger.error(f"[Polling] _write_live_state failed for {game_id}: {e}")
 
     @staticmethod
-    def _update_game_records(game_id: str, plays: List[PlayEvent]):
+    def _update_game_records(game_id: str, live: Dict[str, Any]) -> bool:
         """
-        Upsert canonical games/ + calendar/ index from the latest play metadata.
+        Upsert canonical games/ + calendar/ index from cached live_games metadata.
 
-        Only has the game_id and score info from plays — we use the live_games
-        doc for any richer metadata (teams, date) if available.
+        Returns False when there is no gameDate to index by yet.
         """
+        game_date = live.get("gameDate", "")
+        if not game_date:
+            return False  # Can't build calendar index without a date
         try:
-            db = get_firestore_db()
-            live_doc = db.collection(LIVE_GAMES).document(str(game_id)).get()
-
-            if not live_doc.exists:
-                return  # No metadata yet — skip silently
-
-            live = live_doc.to_dict()
-            game_date = live.get("gameDate", "")
-            if not game_date:
-                return  # Can't build calendar index without a date
-
             from services.firebase_game_service import FirebaseGameService
             home_team = live.get("homeTeam", {})
             away_team = live.get("awayTeam", {})
@@ -156,144 +279,228 @@ class PBPPollingService:
             )
         except Exception as e:
             logger.error(f"[Polling] _update_game_records failed for {game_id}: {e}")
+        return True
 
-    # ── Main polling loop ─────────────────────────────────────────────────────
+    def _commit_cycle(self, staged: List[_Staged]) -> bool:
+        """
+        Stage every game's writes into shared batches and commit them.
 
-    async def _poll_loop(self, game_id: str):
-        poll_interval = 10  # seconds
-        consecutive_errors = 0
+        Returns False (nothing to advance) if a commit fails; already
+        committed chunks are idempotent merges and are simply rewritten.
+        """
+        db = get_firestore_db()
+        writer = BatchedWriter(db)
+        shots_by_game: Dict[str, List[Dict[str, Any]]] = {}
+        now = time.monotonic()
+
+        for game, plays, _ended, write_live in staged:
+            if not game.game_date and now - game.meta_checked >= self.META_REFRESH_SEC:
+                game.meta_checked = now
+                live = self._read_live_doc(game.game_id)
+                if live:
+                    game.meta = live
+                    self.game_metadata_cache[game.game_id] = live
+            if plays:
+                shots = FirebasePBPService.stage_plays_v2(
+                    writer, game.game_id, plays,
+                    game.game_date, game.tricode("homeTeam"), game.tricode("awayTeam"),
+                )
+                if shots:
+                    shots_by_game[game.game_id] = shots
+            if write_live:
+                last = plays[-1]
+                writer.set(
+                    db.collection(LIVE_GAMES).document(str(game.game_id)),
+                    self._live_state_doc(last.sequenceNumber, last),
+                )
 
-        # Phase 3 addition: bootstrap cursor from Firestore (crash-recovery)
-        last_sequence_num: int = await asyncio.to_thread(
-            self._read_cursor, game_id
-        )
-        logger.info(
-            f"[Polling] Starting game {game_id} with cursor={last_sequence_num}"
-        )
+        try:
+            self.commits += writer.commit()
+        except Exception as e:
+            logger.error(f"[Polling] Cycle commit failed for {[g.game_id for g, *_ in staged]}: {e}")
+            return False
 
-        last_live_write: float = 0.0  # epoch time of last live_games write
+        if shots_by_game:
+            FirebasePBPService.apply_shot_summaries(db, shots_by_game)
+        for game, plays, _ended, _write_live in staged:
+            if plays and not game.records_written:
+                game.records_written = self._update_game_records(game.game_id, game.meta)
+        return True
 
+    # ── Scheduler ─────────────────────────────────────────────────────────────
+
+    async def _run_scheduler(self):
+        logger.info("[Polling] Scheduler started")
         try:
-            while True:
-                try:
-                    plays = pbp_client.fetch_espn_plays(game_id)
-                    consecutive_errors = 0
-                except Exception as e:
-                    logger.error(f"ESPN failed for {game_id}: {e}")
-                    consecutive_errors += 1
-                    plays = []
-
-                # Filter to only plays newer than cursor
-                new_plays = [
-                    p for p in plays if p.sequenceNumber > last_sequence_num
-                ]
-
-                if new_plays:
-                    # Fetch game metadata for player shot docs (best-effort — won't fail the batch)
+            while self.games:
+                now = time.monotonic()
+                due = [g for g in self.games.values() if g.next_poll <= now]
+                if due:
                     try:
-                        db = get_firestore_db()
-                        meta_doc = db.collection(LIVE_GAMES).document(str(game_id)).get()
-                        meta = meta_doc.to_dict() if meta_doc.exists else {}
-                    except Exception:
-                        meta = {}
-
-                    game_date = meta.get("gameDate", "")
-                    home_team = meta.get("homeTeam", {}).get("tricode", "") if isinstance(meta.get("homeTeam"), dict) else ""
-                    away_team = meta.get("awayTeam", {}).get("tricode", "") if isinstance(meta.get("awayTeam"), dict) else ""
-
-                    # Phase 3: use v2 write (writes to pbp_events/ + dual-writes legacy)
-                    await asyncio.to_thread(
-                        firebase_pbp_service.save_plays_batch_v2,
-                        game_id,
-                        new_plays,
-                        game_date,
-                        home_team,
-                        away_team,
-                    )
-
-                    last_sequence_num = max(p.sequenceNumber for p in new_plays)
-
-                    # Cadence-throttled live state write
-                    now = time.monotonic()
-                    if now - last_live_write >= self.LIVE_STATE_CADENCE_SEC:
-                        await asyncio.to_thread(
-                            self._write_live_state,
-                            game_id,
-                            last_sequence_num,
-                            new_plays[-1],
-                        )
-                        last_live_write = now
-
-                    # Update canonical game records (non-blocking best-effort)
-                    await asyncio.to_thread(
-                        self._update_game_records, game_id, new_plays
-                    )
-
-                    # Push new plays to SSE listeners
-                    if game_id in self.sse_queues:
-                        payload = [p.model_dump() for p in new_plays]
-                        for q in self.sse_queues[game_id]:
-                            try:
-                                q.put_nowait(payload)
-                            except asyncio.QueueFull:
-                                pass
-
-                    logger.info(
-                        f"[Polling] {len(new_plays)} new plays for {game_id}. "
-                        f"Cursor={last_sequence_num}"
-                    )
-
-                # Game-end detection → finalize
-                if plays and any(
-                    (
-                        p.eventType.lower() in ("end game", "game end")
-                        or p.description.lower() in ("end of game", "game over")
-                    )
-                    for p in plays
-                ):
-                    logger.info(f"[Polling] Game {game_id} ended. Finalizing.")
-                    await asyncio.to_thread(
-                        FirebasePBPService.finalize_game, game_id
-                    )
-                    # Signal SSE clients to close gracefully — prevents zombie
-                    # connections from exhausting Cloud Run concurrency limits.
-                    sentinel = [{"type": "system_game_ended"}]
-                    for q in self.sse_queues.get(game_id, []):
-                        try:
-                            q.put_nowait(sentinel)
-                        except asyncio.QueueFull:
-                            pass
-                    self.active_tasks.pop(game_id, None)
-                    break
-
-                # Exponential backoff on consecutive errors
-                sleep_time = (
-                    min(poll_interval * (2 ** consecutive_errors), 60)
-                    if consecutive_errors > 0
-                    else poll_interval
-                )
-                await asyncio.sleep(sleep_time)
-
+                        await self._run_cycle(due)
+                    except Exception as e:
+                        logger.error(f"[Polling] Cycle failed: {e}")
+                        for game in due:
+                            game.errors += 1
+                            self._reschedule(game, time.monotonic())
+                await self._sleep_until_due()
         except asyncio.CancelledError:
-            logger.info(f"[Polling] Poller for {game_id} was cancelled.")
-        except Exception as e:
-            logger.error(f"[Polling] Fatal error in loop for {game_id}: {e}")
-            self.active_tasks.pop(game_id, None)
+            logger.info("[Polling] Scheduler was cancelled.")
+        finally:
+            self._scheduler = None
+        logger.info("[Polling] Scheduler idle — no tracked games")
+
+    async def _sleep_until_due(self):
+        if not self.games:
+            return
+        delay = min(g.next_poll for g in self.games.values()) - time.monotonic()
+        self._wake.clear()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _init_game(self, game: TrackedGame):
+        live = await asyncio.to_thread(self._read_live_doc, game.game_id)
+        game.meta = live or {}
+        game.meta_checked = time.monotonic()
+        game.cursor = self._cursor_from(live)
+        game.ready = True
+        self.game_metadata_cache[game.game_id] = game.meta
+        logger.info(f"[Polling] Starting game {game.game_id} with cursor={game.cursor}")
+
+        channel = self.get_channel(game.game_id)
+        if not channel.primed:
+            channel.prime(game.cursor)
+            if game.cursor >= 0:
+                # Cold start mid-game: one Firestore read fills the ring so
+                # reconnecting viewers never have to re-read it themselves
+                await asyncio.to_thread(self._seed_channel, channel)
+
+    async def _run_cycle(self, due: List[TrackedGame]):
+        cold = [g for g in due if not g.ready]
+        if cold:
+            await asyncio.gather(*(self._init_game(g) for g in cold))
+
+        results = await asyncio.gather(
+            *(async_pbp_client.fetch_plays_since(g.game_id, g.cursor) for g in due),
+            return_exceptions=True,
+        )
+
+        now = time.monotonic()
+        staged: List[_Staged] = []
+        for game, result in zip(due, results):
+            if isinstance(result, Exception):
+                logger.error(f"ESPN failed for {game.game_id}: {result}")
+                game.errors += 1
+                continue
+            game.errors = 0
+            if result is None:
+                continue  # summary unchanged since last poll
+            plays, ended = result
+            if not plays and not ended:
+                continue
+            write_live = bool(plays) and (
+                ended or now - game.last_live_write >= self.LIVE_STATE_CADENCE_SEC
+            )
+            staged.append((game, plays, ended, write_live))
+
+        if staged:
+            committed = await asyncio.to_thread(self._commit_cycle, staged)
+            if committed:
+                self._publish(staged, now)
+                for game, _plays, ended, _write_live in staged:
+                    if ended and game.game_id in self.games:
+                        await self._finalize(game)
+            else:
+                for game, *_ in staged:
+                    game.errors += 1
+                    # Refetch the same body next time instead of skipping it
+                    async_pbp_client.forget(game.game_id)
+
+        self.cycles += 1
+        done = time.monotonic()
+        for game in due:
+            self._reschedule(game, done)
+
+    def _publish(self, staged: List[_Staged], now: float):
+        for game, plays, _ended, write_live in staged:
+            if not plays:
+                continue
+            game.cursor = max(p.sequenceNumber for p in plays)
+            game.last_play = plays[-1]
+            if write_live:
+                game.last_live_write = now
+            # Encode once into the ring buffer and push to SSE listeners
+            self.get_channel(game.game_id).publish([p.model_dump() for p in plays])
+            logger.info(
+                f"[Polling] {len(plays)} new plays for {game.game_id}. "
+                f"Cursor={game.cursor}"
+            )
+
+    async def _finalize(self, game: TrackedGame):
+        logger.info(f"[Polling] Game {game.game_id} ended. Finalizing.")
+        await asyncio.to_thread(FirebasePBPService.finalize_game, game.game_id)
+        # Signal SSE clients to close gracefully — prevents zombie
+        # connections from exhausting Cloud Run concurrency limits.
+        self.get_channel(game.game_id).end()
+        self._retire_channel(game.game_id)
+        self.games.pop(game.game_id, None)
+        async_pbp_client.forget(game.game_id)
 
     # ── SSE Broker ────────────────────────────────────────────────────────────
 
-    def subscribe_sse(self, game_id: str) -> asyncio.Queue:
-        if game_id not in self.sse_queues:
-            self.sse_queues[game_id] = []
-        q = asyncio.Queue(maxsize=100)
-        self.sse_queues[game_id].append(q)
-        return q
-
-    def unsubscribe_sse(self, game_id: str, q: asyncio.Queue):
-        if game_id in self.sse_queues and q in self.sse_queues[game_id]:
-            self.sse_queues[game_id].remove(q)
-            if not self.sse_queues[game_id]:
-                del self.sse_queues[game_id]
+    @staticmethod
+    def _seed_channel(channel: PBPGameChannel):
+        try:
+            plays = FirebasePBPService.get_cached_plays_v2(channel.game_id, limit=RING_MAX_PLAYS)
+            channel.seed(plays)
+            logger.info(f"[Polling] Seeded stream buffer for {channel.game_id} with {len(plays)} plays")
+        except Exception as e:
+            logger.warning(f"[Polling] Stream buffer seed failed for {channel.game_id}: {e}")
+
+    def _retire_channel(self, game_id: str):
+        """Keep the most recent finished games' buffers; drop older ones."""
+        if game_id in self._ended_order:
+            self._ended_order.remove(game_id)
+        self._ended_order.append(game_id)
+        while len(self._ended_order) > self.ENDED_CHANNELS_KEPT:
+            self._drop_channel(self._ended_order[0])
+
+    def _drop_channel(self, game_id: str):
+        """
+        Release a game's ring buffer. Connected clients get game_ended first
+        (if they have not already) and keep their own reference until they
+        read it and disconnect.
+        """
+        if game_id in self._ended_order:
+            self._ended_order.remove(game_id)
+        channel = self.channels.pop(game_id, None)
+        if channel is not None and channel.ended_frame is None:
+            channel.end()
+
+    def get_channel(self, game_id: str) -> PBPGameChannel:
+        channel = self.channels.get(game_id)
+        if channel is None:
+            channel = PBPGameChannel(game_id, start_cursor=None)  # primed by the scheduler
+            self.channels[game_id] = channel
+        return channel
+
+    def buffered_plays(self, game_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Plays held in memory for the whole game, or None if not fully buffered."""
+        channel = self.channels.get(game_id)
+        if channel is None or not channel.complete or not channel.plays():
+            return None
+        return channel.plays()
+
+    def subscribe_sse(self, game_id: str, last_event_id: Optional[int] = None) -> PBPSubscriber:
+        return self.get_channel(game_id).subscribe(last_event_id)
+
+    def unsubscribe_sse(self, game_id: str, sub: PBPSubscriber):
+        channel = self.channels.get(game_id)
+        if channel is not None:
+            channel.unsubscribe(sub)
 
 
 # Module-level singleton (unchanged API for callers)
@@ -0,0 +1,250 @@
+"""
+PBP Stream Buffer — Per-Game Ring Buffer + SSE Fan-Out
+======================================================
+Backs GET /v1/games/{id}/stream. Previously each SSE client had its own
+asyncio.Queue fed with raw play lists that were re-serialized per client,
+and a reconnecting client lost every play emitted while it was away (or
+re-read up to 1500 plays from Firestore to recover).
+
+One `PBPGameChannel` per tracked game:
+
+    publish(plays)
+        ├─ encode one `plays_update` SSE frame ONCE  (id: <last sequenceNumber>)
+        ├─ append (first_seq, last_seq, plays, frame) to the ring
+        ├─ evict oldest batches beyond RING_MAX_PLAYS
+        └─ push the frame bytes to every subscriber's bounded queue
+
+Replay:
+    `subscribe(last_event_id)` pre-loads one compacted frame holding every
+    buffered play after `last_event_id`. The ring knows the highest
+    sequence it has evicted (or never held), so it can tell whether a
+    resume point is fully covered; when it is not, the client receives a
+    `resync` event and re-hydrates from GET /plays.
+
+Slow consumers:
+    A subscriber whose queue overflows has its backlog discarded and a
+    COMPACT marker queued; the stream generator then sends a single
+    compacted replay from the ring instead of the dropped frames, so
+    memory per client stays bounded by SUBSCRIBER_QUEUE_SIZE.
+
+Hydration:
+    When the ring holds the game from its first play (`complete`), GET
+    /plays is answered from memory instead of Firestore.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+RING_MAX_PLAYS = 2000        # a full NBA game is ~450-650 ESPN plays
+SUBSCRIBER_QUEUE_SIZE = 32
+HEARTBEAT_SECONDS = 15.0
+
+HEARTBEAT_FRAME = b": heartbeat\n\n"
+COMPACT = object()           # queue marker: backlog dropped, replay from ring
+
+
+def encode_sse(payload: Dict[str, Any], event_id: Optional[int] = None) -> bytes:
+    """Encode one SSE data frame (once per batch, never per client)."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}data: {json.dumps(payload, default=str)}\n\n".encode("utf-8")
+
+
+@dataclass
+class _Batch:
+    first_seq: int
+    last_seq: int
+    plays: List[Dict[str, Any]]
+    frame: bytes
+
+
+# ============================================================================
+# SUBSCRIBER
+# ============================================================================
+
+class PBPSubscriber:
+    """One SSE client on one game."""
+
+    def __init__(self, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.last_seq: int = -1      # highest sequenceNumber delivered
+        self.compactions = 0
+
+    def offer(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(COMPACT)
+            self.compactions += 1
+
+    async def next_item(self, timeout: float = HEARTBEAT_SECONDS):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return HEARTBEAT_FRAME
+
+
+# ============================================================================
+# CHANNEL
+# ============================================================================
+
+class PBPGameChannel:
+    """Ring buffer of encoded play batches and the subscribers of one game."""
+
+    def __init__(self, game_id: str, start_cursor: Optional[int] = -1, max_plays: int = RING_MAX_PLAYS):
+        self.game_id = str(game_id)
+        self.max_plays = max_plays
+        self._ring: Deque[_Batch] = deque()
+        self._buffered = 0
+        # Highest sequence number known to exist but not held in the ring.
+        # -1 means the ring holds the game from its first play; None means
+        # the poller has not read its cursor yet (coverage unknown).
+        self._floor: Optional[int] = start_cursor
+        self._subscribers: Set[PBPSubscriber] = set()
+        self.ended_frame: Optional[bytes] = None
+        self.published = 0
+
+    # ── State ───────────────────────────────────────────────────────────────
+
+    @property
+    def primed(self) -> bool:
+        return self._floor is not None
+
+    @property
+    def complete(self) -> bool:
+        return self.primed and self._floor < 0
+
+    @property
+    def last_seq(self) -> int:
+        if self._ring:
+            return self._ring[-1].last_seq
+        return self._floor if self.primed else -1
+
+    def prime(self, cursor: int):
+        """Set the resume floor once the poller knows its starting cursor."""
+        if not self.primed and not self._ring:
+            self._floor = cursor
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def covers(self, since_seq: int) -> bool:
+        """True if every play after `since_seq` is still in the ring."""
+        return self.primed and since_seq >= self._floor
+
+    def plays(self) -> List[Dict[str, Any]]:
+        """All buffered plays in ingestion order."""
+        return [p for batch in self._ring for p in batch.plays]
+
+    # ── Producer side ───────────────────────────────────────────────────────
+
+    def seed(self, plays: List[Dict[str, Any]]):
+        """Load already-persisted plays (cold start mid-game) without fan-out."""
+        if not plays:
+            return
+        self._append(sorted(plays, key=lambda p: p.get("sequenceNumber", 0)))
+        self._floor = -1
+        self._evict()
+
+    def publish(self, plays: List[Dict[str, Any]]) -> Optional[bytes]:
+        """Encode a batch once, buffer it and push it to every subscriber."""
+        if not plays:
+            return None
+        batch = self._append(plays)
+        self._evict()
+        self.published += 1
+        for sub in list(self._subscribers):
+            sub.offer(batch)
+        return batch.frame
+
+    def end(self):
+        """Broadcast game_ended; late joiners receive it immediately."""
+        self.ended_frame = encode_sse({"type": "game_ended", "gameId": self.game_id})
+        for sub in list(self._subscribers):
+            sub.offer(self.ended_frame)
+
+    def _append(self, plays: List[Dict[str, Any]]) -> _Batch:
+        seqs = [p.get("sequenceNumber", 0) for p in plays]
+        last = max(seqs)
+        frame = encode_sse({"type": "plays_update", "plays": plays}, event_id=last)
+        batch = _Batch(min(seqs), last, plays, frame)
+        self._ring.append(batch)
+        self._buffered += len(plays)
+        return batch
+
+    def _evict(self):
+        while self._buffered > self.max_plays and len(self._ring) > 1:
+            old = self._ring.popleft()
+            self._buffered -= len(old.plays)
+            self._floor = max(self._floor if self.primed else -1, old.last_seq)
+
+    # ── Consumer side ───────────────────────────────────────────────────────
+
+    def replay_frame(self, since_seq: int) -> Optional[bytes]:
+        """
+        One compacted frame with every buffered play after `since_seq`.
+
+        Returns a `resync` frame if the ring no longer covers `since_seq`,
+        or None when the client is already current.
+        """
+        if not self.primed:
+            return None  # first poll still starting; live batches will follow
+        if not self.covers(since_seq):
+            return encode_sse({"type": "resync", "gameId": self.game_id, "lastSequence": self.last_seq})
+        plays = [
+            p for batch in self._ring if batch.last_seq > since_seq
+            for p in batch.plays if p.get("sequenceNumber", 0) > since_seq
+        ]
+        if not plays:
+            return None
+        return encode_sse({"type": "plays_update", "plays": plays}, event_id=self.last_seq)
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> PBPSubscriber:
+        sub = PBPSubscriber()
+        if last_event_id is not None:
+            sub.last_seq = last_event_id
+            frame = self.replay_frame(last_event_id)
+            if frame is not None:
+                sub.offer(frame)
+                sub.last_seq = max(last_event_id, self.last_seq)
+        if self.ended_frame is not None:
+            sub.offer(self.ended_frame)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: PBPSubscriber):
+        self._subscribers.discard(sub)
+
+    async def next_frame(self, sub: PBPSubscriber) -> bytes:
+        """Next encoded frame for `sub`, resolving batches and COMPACT markers."""
+        item = await sub.next_item()
+        if item is COMPACT:
+            frame = self.replay_frame(sub.last_seq)
+            sub.last_seq = max(sub.last_seq, self.last_seq)
+            return frame if frame is not None else HEARTBEAT_FRAME
+        if isinstance(item, _Batch):
+            sub.last_seq = max(sub.last_seq, item.last_seq)
+            return item.frame
+        return item
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buffered_plays": self._buffered,
+            "batches": len(self._ring),
+            "complete": self.complete,
+            "last_seq": self.last_seq,
+            "subscribers": len(self._subscribers),
+            "compactions": sum(s.compactions for s in self._subscribers),
+        }
@@ -0,0 +1,348 @@
+"""
+Player Directory — Process-Level Search Index
+==============================================
+Replaces the per-request `get_all_players(active_only=True)` scan behind
+GET /players/search. The active roster is streamed from Firestore once,
+normalized, and indexed in memory; every subsequent keystroke is served
+from the index without touching Firestore.
+
+Indexes:
+    - Prefix trie over normalized name tokens (and the full name), with
+      the matching player rows cached on each node so a prefix lookup is
+      a single walk of len(prefix) steps.
+    - Character trigram index for accent-insensitive fuzzy matching
+      ("jokic" → "Nikola Jokić", "giannis antetokoumpo" → typo tolerant).
+
+Freshness:
+    The snapshot is rebuilt lazily when it is older than DIRECTORY_TTL_SECONDS
+    or after `invalidate()` is called (admin roster writes call it). Each
+    snapshot carries a content-derived version used as the HTTP ETag.
+    Request handlers use `peek()`: a stale snapshot keeps serving while a
+    background thread rebuilds it, so only the very first load blocks.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DIRECTORY_TTL_SECONDS = 900  # 15 minutes — rosters move slowly
+DEFAULT_LIMIT = 50
+FUZZY_MIN_SIMILARITY = 0.3
+
+# Ranking tiers (lower is better)
+_RANK_EXACT = 0
+_RANK_FULL_PREFIX = 1
+_RANK_TOKEN_PREFIX = 2
+_RANK_SUBSTRING = 3
+_RANK_FUZZY = 4
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+# ============================================================================
+# NORMALIZATION
+# ============================================================================
+
+def normalize_name(text: str) -> str:
+    """
+    Fold a display name into its search key.
+
+    Strips accents (NFKD + drop combining marks), lowercases, splits hyphenated
+    names into tokens, drops other punctuation ("O'Neale" → "oneale") and
+    collapses whitespace.
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    lowered = stripped.lower().replace("-", " ")
+    cleaned = _NON_ALNUM.sub("", lowered)
+    return _WHITESPACE.sub(" ", cleaned).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Padded character trigrams of a normalized string."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def normalize_player(p: dict) -> dict:
+    """Normalize a Firestore player document to the PlayerSearchResult shape."""
+    return {
+        'id': str(p.get('player_id') or p.get('id') or ''),
+        'name': p.get('name') or p.get('player_name') or p.get('fullName') or 'Unknown',
+        'team': p.get('team') or p.get('team_id') or '',
+        'position': p.get('position') or '',
+        'avatar': p.get('headshot_url') or '',
+    }
+
+
+# ============================================================================
+# INDEX STRUCTURES
+# ============================================================================
+
+class _TrieNode:
+    __slots__ = ("children", "rows")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.rows: Set[int] = set()
+
+
+class _DirectorySnapshot:
+    """Immutable, fully built index over one roster load."""
+
+    def __init__(self, players: List[dict]):
+        self.entries: List[dict] = []
+        self.keys: List[str] = []
+        self.root = _TrieNode()
+        self.grams: Dict[str, Set[int]] = {}
+        self.gram_counts: List[int] = []
+
+        seen: Set[str] = set()
+        for raw in players:
+            entry = normalize_player(raw)
+            if entry['id'] and entry['id'] in seen:
+                continue
+            seen.add(entry['id'])
+            key = normalize_name(entry['name'])
+
+            row = len(self.entries)
+            self.entries.append(entry)
+            self.keys.append(key)
+
+            tokens = key.split(" ") if key else []
+            for term in set(tokens + [key.replace(" ", "")]):
+                self._insert(term, row)
+
+            grams = _trigrams(key)
+            self.gram_counts.append(len(grams))
+            for g in grams:
+                self.grams.setdefault(g, set()).add(row)
+
+        # Sort order used for the no-query payload and for tie-breaking
+        self.order = sorted(range(len(self.entries)), key=lambda r: self.keys[r])
+        self.position = {row: i for i, row in enumerate(self.order)}
+
+        digest = hashlib.sha1()
+        for row in self.order:
+            e = self.entries[row]
+            digest.update(f"{e['id']}|{e['name']}|{e['team']}|{e['position']}|{e['avatar']}\n".encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+        self.built_at = time.time()
+
+    def _insert(self, term: str, row: int):
+        node = self.root
+        for ch in term:
+            node = node.children.setdefault(ch, _TrieNode())
+            node.rows.add(row)
+
+    def prefix_rows(self, prefix: str) -> Set[int]:
+        node = self.root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return set()
+        return node.rows
+
+    def fuzzy_rows(self, query: str) -> Dict[int, float]:
+        """Dice similarity over trigrams for every row sharing a trigram."""
+        q_grams = _trigrams(query)
+        overlap: Dict[int, int] = {}
+        for g in q_grams:
+            for row in self.grams.get(g, ()):
+                overlap[row] = overlap.get(row, 0) + 1
+        n_q = len(q_grams)
+        return {
+            row: (2.0 * shared) / (n_q + self.gram_counts[row])
+            for row, shared in overlap.items()
+        }
+
+    def search(self, query: Optional[str], limit: int = DEFAULT_LIMIT) -> List[dict]:
+        """Ranked search: exact > full-name prefix > token prefix > substring > fuzzy."""
+        if not query or not query.strip():
+            return [self.entries[r] for r in self.order]
+        q = normalize_name(query)
+        if not q:
+            return [self.entries[r] for r in self.order[:limit]]
+
+        ranked: Dict[int, Tuple[int, float]] = {}
+
+        def offer(row: int, tier: int, score: float = 0.0):
+            current = ranked.get(row)
+            if current is None or (tier, -score) < (current[0], -current[1]):
+                ranked[row] = (tier, score)
+
+        # Prefix matches: every query token must prefix some name token
+        q_tokens = q.split(" ")
+        candidate_rows: Optional[Set[int]] = None
+        for tok in q_tokens:
+            rows = self.prefix_rows(tok)
+            candidate_rows = set(rows) if candidate_rows is None else candidate_rows & rows
+            if not candidate_rows:
+                break
+        compact_rows = self.prefix_rows(q.replace(" ", ""))
+        for row in (candidate_rows or set()) | compact_rows:
+            key = self.keys[row]
+            if key == q:
+                offer(row, _RANK_EXACT)
+            elif key.startswith(q):
+                offer(row, _RANK_FULL_PREFIX)
+            else:
+                offer(row, _RANK_TOKEN_PREFIX)
+
+        # Substring matches preserve the legacy `q in name` behaviour
+        if len(ranked) < limit:
+            for row, key in enumerate(self.keys):
+                if row not in ranked and q in key:
+                    offer(row, _RANK_SUBSTRING)
+
+        # Fuzzy fill for typos and transliterations
+        if len(ranked) < limit and len(q) >= 3:
+            for row, sim in self.fuzzy_rows(q).items():
+                if row not in ranked and sim >= FUZZY_MIN_SIMILARITY:
+                    offer(row, _RANK_FUZZY, sim)
+
+        best = sorted(
+            ranked.items(),
+            key=lambda item: (item[1][0], -item[1][1], self.position[item[0]]),
+        )
+        return [self.entries[row] for row, _ in best[:limit]]
+
+
+# ============================================================================
+# DIRECTORY SINGLETON
+# ============================================================================
+
+class PlayerDirectory:
+    """
+    Lazily loaded, atomically swapped player search index.
+
+    Readers always see a complete snapshot; rebuilds happen under a lock
+    (on the caller's thread, or a background thread via `peek()`) and
+    replace the reference in one assignment.
+    """
+
+    def __init__(self, loader: Optional[Callable[[], List[dict]]] = None, ttl: int = DIRECTORY_TTL_SECONDS):
+        self._loader = loader or self._load_active_players
+        self._ttl = ttl
+        self._snapshot: Optional[_DirectorySnapshot] = None
+        self._stale = True
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._refresh_lock = threading.Lock()  # guards _refreshing only, never held during a load
+
+    @staticmethod
+    def _load_active_players() -> List[dict]:
+        from firestore_db import get_all_players
+        return get_all_players(active_only=True)
+
+    def invalidate(self):
+        """Mark the snapshot stale; the next read triggers a rebuild."""
+        self._stale = True
+
+    def _needs_refresh(self) -> bool:
+        snap = self._snapshot
+        return snap is None or self._stale or time.time() - snap.built_at > self._ttl
+
+    def snapshot(self) -> _DirectorySnapshot:
+        if self._needs_refresh():
+            with self._lock:
+                if self._needs_refresh():
+                    self._rebuild()
+        return self._snapshot
+
+    def peek(self) -> Optional[_DirectorySnapshot]:
+        """
+        Current snapshot without blocking on Firestore.
+
+        A stale snapshot is returned as-is and rebuilt on a background thread;
+        None means nothing has loaded yet and the caller must build one with
+        `snapshot()` (off the event loop).
+        """
+        snap = self._snapshot
+        if snap is not None and self._needs_refresh():
+            self._refresh_in_background()
+        return snap
+
+    def _refresh_in_background(self):
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def _run():
+            try:
+                self.snapshot()
+            except Exception as e:
+                logger.warning(f"[PlayerDirectory] Background refresh failed: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=_run, name="player-directory-refresh", daemon=True).start()
+
+    def _rebuild(self):
+        started = time.perf_counter()
+        try:
+            players = self._loader() or []
+        except Exception as e:
+            if self._snapshot is not None:
+                # Keep serving the last good roster rather than failing search
+                logger.warning(f"[PlayerDirectory] Refresh failed, serving stale snapshot: {e}")
+                self._snapshot.built_at = time.time()
+                self._stale = False
+                return
+            raise
+        self._snapshot = _DirectorySnapshot(players)
+        self._stale = False
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"[PlayerDirectory] Indexed {len(self._snapshot.entries)} players "
+            f"(version={self._snapshot.version}, {elapsed_ms:.1f}ms)"
+        )
+
+    @property
+    def version(self) -> str:
+        return self.snapshot().version
+
+    def search(self, query: Optional[str], limit: int = DEFAULT_LIMIT) -> List[dict]:
+        """Ranked search: exact > full-name prefix > token prefix > substring > fuzzy."""
+        return self.snapshot().search(query, limit)
+
+    def stats(self) -> dict:
+        snap = self._snapshot
+        return {
+            "loaded": snap is not None,
+            "players": len(snap.entries) if snap else 0,
+            "version": snap.version if snap else None,
+            "age_seconds": round(time.time() - snap.built_at, 1) if snap else None,
+            "stale": self._stale,
+        }
+
+
+_directory: Optional[PlayerDirectory] = None
+
+
+def get_player_directory() -> PlayerDirectory:
+    """Get the process-wide PlayerDirectory singleton."""
+    global _directory
+    if _directory is None:
+        _directory = PlayerDirectory()
+    return _directory
+
+
+def invalidate_player_directory():
+    """Signal a roster change (called after admin player writes)."""
+    if _directory is not None:
+        _directory.invalidate()
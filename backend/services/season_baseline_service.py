@@ -13,15 +13,29 @@ Firestore Schema:
         - def_rating, off_rating, pace, matchup_difficulty
         - last_updated
 
-Caching:
-    In-memory LRU cache with 15-minute TTL to avoid per-request Firestore reads.
-    Cache is warm after first request and refreshed lazily.
+Snapshot:
+    The whole league is held in one immutable `BaselineSnapshot`: numeric
+    fields in float64 NumPy matrices with a dense id → row index, plus a
+    trailing defaults row that unknown ids map to. It is loaded with one
+    bulk read per collection (`warm_cache`, at startup) and replaced by a
+    single reference swap whenever baseline_populator writes new data, so
+    readers never see a half-built table and never fall through to
+    per-document Firestore reads.
+
+    `gather_leader_baselines()` enriches every player of a boxscore with
+    one vectorized gather. A missing snapshot, or one older than
+    CACHE_TTL_SECONDS, is loaded in a background thread while readers keep
+    the current one (league defaults before the first load), so the
+    pulse producer's event loop never waits on Firestore.
 """
 
 import logging
+import threading
 import time
-from typing import Dict, Optional, Tuple
-from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +47,10 @@ CURRENT_SEASON = "2025-26"
 LEAGUE_AVG_DEF_RATING = 110.0
 LEAGUE_AVG_USAGE = 0.20
 LEAGUE_AVG_TS = 0.55
+LEAGUE_AVG_PPG = 10.0
+LEAGUE_AVG_PACE = 100.0
 CACHE_TTL_SECONDS = 900  # 15 minutes
+LOAD_RETRY_SECONDS = 60  # minimum gap between failed bulk loads
 
 # Defense rating tiers
 _DEF_TIERS = {
@@ -42,6 +59,13 @@ _DEF_TIERS = {
     'average': (110, 114),
     'weak': (114, float('inf')),
 }
+_TIER_NAMES = np.array(list(_DEF_TIERS))
+_TIER_UPPER = np.array([high for _, high in _DEF_TIERS.values()][:-1])
+
+PLAYER_FIELDS = ("ppg", "rpg", "apg", "usage_pct", "ts_pct", "efg_pct", "fg3_pct", "min_pg", "game_count")
+TEAM_FIELDS = ("def_rating", "off_rating", "pace")
+PLAYER_DEFAULTS = {"usage_pct": LEAGUE_AVG_USAGE, "ts_pct": LEAGUE_AVG_TS, "ppg": LEAGUE_AVG_PPG}
+TEAM_DEFAULTS = {"def_rating": LEAGUE_AVG_DEF_RATING, "pace": LEAGUE_AVG_PACE}
 
 
 # ============================================================================
@@ -64,104 +88,148 @@ def _get_db():
 
 
 # ============================================================================
-# IN-MEMORY CACHE
+# SNAPSHOT
 # ============================================================================
 
-class _BaselineCache:
-    """Simple TTL cache for season baselines."""
-
-    def __init__(self, ttl: int = CACHE_TTL_SECONDS):
-        self._ttl = ttl
-        self._player_cache: Dict[str, Tuple[dict, float]] = {}
-        self._team_cache: Dict[str, Tuple[dict, float]] = {}
-        self._all_players_loaded = False
-        self._all_teams_loaded = False
-        self._last_full_load = 0.0
-
-    def get_player(self, player_id: str) -> Optional[dict]:
-        if player_id in self._player_cache:
-            data, ts = self._player_cache[player_id]
-            if time.time() - ts < self._ttl:
-                return data
-        return None
-
-    def set_player(self, player_id: str, data: dict):
-        self._player_cache[player_id] = (data, time.time())
-
-    def get_team(self, tricode: str) -> Optional[dict]:
-        if tricode in self._team_cache:
-            data, ts = self._team_cache[tricode]
-            if time.time() - ts < self._ttl:
-                return data
-        return None
-
-    def set_team(self, tricode: str, data: dict):
-        self._team_cache[tricode] = (data, time.time())
-
-    def bulk_load_players(self, players: Dict[str, dict]):
-        now = time.time()
-        for pid, data in players.items():
-            self._player_cache[pid] = (data, now)
-        self._all_players_loaded = True
-        self._last_full_load = now
-
-    def bulk_load_teams(self, teams: Dict[str, dict]):
-        now = time.time()
-        for tricode, data in teams.items():
-            self._team_cache[tricode] = (data, now)
-        self._all_teams_loaded = True
-
-    def needs_full_load(self) -> bool:
-        return (
-            not self._all_players_loaded or
-            time.time() - self._last_full_load > self._ttl
+class BaselineTable:
+    """
+    Numeric fields of one collection as a (rows + 1, fields) float64 matrix.
+
+    Row `len(docs)` is the defaults row: ids missing from the index gather
+    the league-average fallbacks (NaN where a field has none). Values a
+    document lacks are filled with the same defaults.
+    """
+
+    def __init__(self, docs: Dict[str, dict], fields: Sequence[str], defaults: Dict[str, float]):
+        self.docs = docs
+        self.fields = tuple(fields)
+        self.columns = {f: i for i, f in enumerate(self.fields)}
+        self.index = {str(key): row for row, key in enumerate(docs)}
+        self.default_row = len(docs)
+
+        values = np.full((len(docs) + 1, len(self.fields)), np.nan)
+        for key, row in self.index.items():
+            doc = docs[key]
+            for col, name in enumerate(self.fields):
+                value = doc.get(name)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    values[row, col] = value
+        fill = np.array([defaults.get(f, np.nan) for f in self.fields])
+        values = np.where(np.isnan(values), fill, values)
+        values.setflags(write=False)
+        self.values = values
+
+    def __len__(self) -> int:
+        return self.default_row
+
+    def rows(self, keys: Iterable) -> np.ndarray:
+        index, default = self.index, self.default_row
+        return np.array([index.get(str(k), default) for k in keys], dtype=np.intp)
+
+    def gather(self, keys: Iterable, *fields: str) -> np.ndarray:
+        """(len(keys), len(fields)) values; unknown keys get the defaults row."""
+        cols = [self.columns[f] for f in fields]
+        return self.values[np.ix_(self.rows(keys), cols)]
+
+    def value(self, key: str, name: str) -> float:
+        return float(self.values[self.index.get(str(key), self.default_row), self.columns[name]])
+
+
+@dataclass(frozen=True)
+class BaselineSnapshot:
+    """One immutable, versioned view of every player and team baseline."""
+    season: str
+    version: int
+    players: BaselineTable
+    teams: BaselineTable
+    loaded_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def build(cls, players: Dict[str, dict], teams: Dict[str, dict],
+              season: str = CURRENT_SEASON, version: int = 0) -> "BaselineSnapshot":
+        return cls(
+            season=season,
+            version=version,
+            players=BaselineTable(players, PLAYER_FIELDS, PLAYER_DEFAULTS),
+            teams=BaselineTable(teams, TEAM_FIELDS, TEAM_DEFAULTS),
         )
 
     @property
-    def player_count(self) -> int:
-        return len(self._player_cache)
+    def age_seconds(self) -> float:
+        return time.time() - self.loaded_at
 
-    @property
-    def team_count(self) -> int:
-        return len(self._team_cache)
+
+_EMPTY = BaselineSnapshot.build({}, {}, version=0)
+_snapshot: BaselineSnapshot = _EMPTY
+_load_lock = threading.Lock()
+_last_attempt = 0.0
+_refreshing = False
+
+
+def install_snapshot(players: Dict[str, dict], teams: Dict[str, dict],
+                     season: str = CURRENT_SEASON) -> BaselineSnapshot:
+    """Build a new snapshot and swap it in with a single reference assignment."""
+    global _snapshot
+    snapshot = BaselineSnapshot.build(players, teams, season, version=_snapshot.version + 1)
+    _snapshot = snapshot
+    return snapshot
+
+
+def get_baseline_snapshot() -> BaselineSnapshot:
+    """
+    Current snapshot; never blocks on Firestore. If none has loaded yet
+    (or the current one is older than CACHE_TTL_SECONDS) a bulk load starts
+    in the background, at most every LOAD_RETRY_SECONDS, and callers get
+    the league-default snapshot until it lands.
+    """
+    snapshot = _snapshot
+    if snapshot.version == 0 or snapshot.age_seconds > CACHE_TTL_SECONDS:
+        _refresh_in_background(snapshot.season)
+    return snapshot
 
 
-_cache = _BaselineCache()
+def _refresh_in_background(season: str):
+    global _refreshing
+    with _load_lock:
+        if _refreshing or time.time() - _last_attempt < LOAD_RETRY_SECONDS:
+            return
+        _refreshing = True
+
+    def _run():
+        global _refreshing
+        try:
+            warm_cache(season)
+        finally:
+            _refreshing = False
+
+    threading.Thread(target=_run, name="baseline-snapshot-refresh", daemon=True).start()
 
 
 # ============================================================================
-# BULK WARM-UP (called once at startup or on-demand)
+# BULK LOAD (startup, TTL refresh, and after baseline_populator writes)
 # ============================================================================
 
 def warm_cache(season: str = CURRENT_SEASON) -> bool:
     """
-    Load all season baselines into memory cache.
+    Load all season baselines and hot-swap the league snapshot.
     Returns True if successful, False if Firestore unavailable.
     """
+    global _last_attempt
+    _last_attempt = time.time()
     db = _get_db()
     if db is None:
         logger.warning("Cannot warm cache — Firestore unavailable")
         return False
 
     try:
-        # Load all players
-        players_ref = db.collection("season_baselines").document(season).collection("players")
-        player_docs = players_ref.stream()
-        players = {}
-        for doc in player_docs:
-            players[doc.id] = doc.to_dict()
-        _cache.bulk_load_players(players)
-        logger.info(f"✅ Warmed player baseline cache: {len(players)} players")
-
-        # Load all teams
-        teams_ref = db.collection("season_baselines").document(season).collection("teams")
-        team_docs = teams_ref.stream()
-        teams = {}
-        for doc in team_docs:
-            teams[doc.id] = doc.to_dict()
-        _cache.bulk_load_teams(teams)
-        logger.info(f"✅ Warmed team baseline cache: {len(teams)} teams")
-
+        root = db.collection("season_baselines").document(season)
+        players = {doc.id: doc.to_dict() for doc in root.collection("players").stream()}
+        teams = {doc.id: doc.to_dict() for doc in root.collection("teams").stream()}
+        snapshot = install_snapshot(players, teams, season)
+        logger.info(
+            f"✅ Baseline snapshot v{snapshot.version}: "
+            f"{len(snapshot.players)} players, {len(snapshot.teams)} teams"
+        )
         return True
 
     except Exception as e:
@@ -169,6 +237,33 @@ def warm_cache(season: str = CURRENT_SEASON) -> bool:
         return False
 
 
+# ============================================================================
+# VECTORIZED ENRICHMENT
+# ============================================================================
+
+def classify_defense_many(ratings: np.ndarray) -> np.ndarray:
+    """Vectorized _classify_defense."""
+    return _TIER_NAMES[np.searchsorted(_TIER_UPPER, ratings, side='right')]
+
+
+def gather_leader_baselines(player_ids: Sequence[str], opponents: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Season baselines for a batch of players in one gather.
+
+    Returns arrays aligned with `player_ids`: season_usage, season_ts,
+    def_rating (of each player's opponent) and matchup_difficulty.
+    """
+    snapshot = get_baseline_snapshot()
+    players = snapshot.players.gather(player_ids, "usage_pct", "ts_pct")
+    def_rating = snapshot.teams.gather(opponents, "def_rating")[:, 0]
+    return {
+        "season_usage": players[:, 0],
+        "season_ts": players[:, 1],
+        "def_rating": def_rating,
+        "matchup_difficulty": classify_defense_many(def_rating),
+    }
+
+
 # ============================================================================
 # PLAYER BASELINE READS
 # ============================================================================
@@ -180,10 +275,7 @@ def get_player_season_usage(player_id: str) -> float:
     Returns:
         Usage rate as decimal (0.0-1.0). Falls back to league average (0.20).
     """
-    data = _get_player_data(player_id)
-    if data and 'usage_pct' in data:
-        return data['usage_pct']
-    return LEAGUE_AVG_USAGE
+    return get_baseline_snapshot().players.value(player_id, "usage_pct")
 
 
 def get_player_rolling_ts(player_id: str) -> float:
@@ -193,10 +285,7 @@ def get_player_rolling_ts(player_id: str) -> float:
     Returns:
         TS% as decimal (0.0-1.0). Falls back to league average (0.55).
     """
-    data = _get_player_data(player_id)
-    if data and 'ts_pct' in data:
-        return data['ts_pct']
-    return LEAGUE_AVG_TS
+    return get_baseline_snapshot().players.value(player_id, "ts_pct")
 
 
 def get_player_season_ppg(player_id: str) -> float:
@@ -206,46 +295,12 @@ def get_player_season_ppg(player_id: str) -> float:
     Returns:
         PPG as float. Falls back to 10.0 (rough league average for active players).
     """
-    data = _get_player_data(player_id)
-    if data and 'ppg' in data:
-        return data['ppg']
-    return 10.0
+    return get_baseline_snapshot().players.value(player_id, "ppg")
 
 
 def get_player_baselines(player_id: str) -> Optional[dict]:
     """Get full player baseline document."""
-    return _get_player_data(player_id)
-
-
-def _get_player_data(player_id: str) -> Optional[dict]:
-    """Internal: get player data from cache or Firestore."""
-    # 1. Check cache
-    cached = _cache.get_player(player_id)
-    if cached is not None:
-        return cached
-
-    # 2. If cache needs full reload, load everything
-    if _cache.needs_full_load():
-        warm_cache()
-        cached = _cache.get_player(player_id)
-        if cached is not None:
-            return cached
-
-    # 3. Single-document fallback
-    db = _get_db()
-    if db is None:
-        return None
-
-    try:
-        doc = db.collection("season_baselines").document(CURRENT_SEASON).collection("players").document(str(player_id)).get()
-        if doc.exists:
-            data = doc.to_dict()
-            _cache.set_player(player_id, data)
-            return data
-    except Exception as e:
-        logger.debug(f"Failed to fetch player baseline {player_id}: {e}")
-
-    return None
+    return get_baseline_snapshot().players.docs.get(str(player_id))
 
 
 # ============================================================================
@@ -261,12 +316,8 @@ def get_team_defense_rating(team_tricode: str) -> Tuple[float, str]:
         'elite', 'tough', 'average', or 'weak'.
         Falls back to (110.0, 'average').
     """
-    data = _get_team_data(team_tricode)
-    if data and 'def_rating' in data:
-        rating = data['def_rating']
-        difficulty = _classify_defense(rating)
-        return rating, difficulty
-    return LEAGUE_AVG_DEF_RATING, 'average'
+    rating = get_baseline_snapshot().teams.value(team_tricode, "def_rating")
+    return rating, _classify_defense(rating)
 
 
 def get_team_pace(team_tricode: str) -> float:
@@ -276,32 +327,7 @@ def get_team_pace(team_tricode: str) -> float:
     Returns:
         Pace as float (possessions per 48 min). Falls back to 100.0.
     """
-    data = _get_team_data(team_tricode)
-    if data and 'pace' in data:
-        return data['pace']
-    return 100.0
-
-
-def _get_team_data(team_tricode: str) -> Optional[dict]:
-    """Internal: get team data from cache or Firestore."""
-    cached = _cache.get_team(team_tricode)
-    if cached is not None:
-        return cached
-
-    db = _get_db()
-    if db is None:
-        return None
-
-    try:
-        doc = db.collection("season_baselines").document(CURRENT_SEASON).collection("teams").document(team_tricode).get()
-        if doc.exists:
-            data = doc.to_dict()
-            _cache.set_team(team_tricode, data)
-            return data
-    except Exception as e:
-        logger.debug(f"Failed to fetch team baseline {team_tricode}: {e}")
-
-    return None
+    return get_baseline_snapshot().teams.value(team_tricode, "pace")
 
 
 def _classify_defense(rating: float) -> str:
@@ -350,17 +376,37 @@ def calculate_heat_scale(current_ts: float, season_avg_ts: float) -> str:
         return 'steady'
 
 
+def calculate_usage_vacuum_many(current_usage: np.ndarray, season_avg_usage: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_usage_vacuum (boolean array)."""
+    season_avg_usage = np.asarray(season_avg_usage, dtype=float)
+    return (season_avg_usage > 0) & (np.asarray(current_usage, dtype=float) > season_avg_usage * 1.20)
+
+
+_HEAT_NAMES = np.array(['steady', 'hot', 'cold'])
+
+
+def calculate_heat_scale_many(current_ts: np.ndarray, season_avg_ts: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_heat_scale (array of 'hot' / 'cold' / 'steady')."""
+    season_avg_ts = np.asarray(season_avg_ts, dtype=float)
+    delta = np.asarray(current_ts, dtype=float) - season_avg_ts
+    tier = np.where(delta >= 0.05, 1, np.where(delta <= -0.05, 2, 0))
+    return _HEAT_NAMES[np.where(season_avg_ts > 0, tier, 0)]
+
+
 # ============================================================================
 # STATUS / DIAGNOSTICS
 # ============================================================================
 
 def get_baseline_status() -> dict:
     """Get current baseline service status for health checks."""
+    snapshot = _snapshot
     return {
         "service": "season_baseline_service",
-        "season": CURRENT_SEASON,
-        "players_cached": _cache.player_count,
-        "teams_cached": _cache.team_count,
+        "season": snapshot.season,
+        "snapshot_version": snapshot.version,
+        "snapshot_age_seconds": round(snapshot.age_seconds, 1) if snapshot.version else None,
+        "players_cached": len(snapshot.players),
+        "teams_cached": len(snapshot.teams),
         "cache_ttl_seconds": CACHE_TTL_SECONDS,
         "firestore_available": _get_db() is not None,
     }
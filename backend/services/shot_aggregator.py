@@ -0,0 +1,431 @@
+"""
+Shot Aggregator — Pre-Binned Shot Chart Summaries
+==================================================
+Maintains one compact summary document per player so /player-shots/{id}
+no longer streams up to 2000 raw shot docs (or rebuilds them from
+ShotChartDetail) for every chart render.
+
+Firestore Schema:
+    player_shot_summaries/{playerId}
+        all:      {att, made, pts, zones: {paint|mid|three|ft: {att, made}},
+                   hex: {"{q}_{r}": {att, made}}}   (att/made = field goals)
+        seasons:  {"2025-26": <same shape as all>}
+        games:    {gameId: {date, matchup, att, made}}
+        schemaVersion                               (set only by a from-raw rebuild)
+        updatedAt
+
+    player_shot_summaries/{playerId}/applied/{gameId}
+        seqs:     [sequenceNumber, ...]             (every shot folded in, FTs included)
+        updatedAt
+
+Zones mirror the frontend breakdown (paint < 8 ft, mid 8–23 ft, three ≥ 23 ft);
+free throws are counted under "ft" and never hex-binned. Hex bins use
+pointy-top axial coordinates in the same units as the raw shot x/y, so
+the client renders bins and raw shots with the same court transform.
+
+Incremental updates:
+    FirebasePBPService.apply_shot_summaries hands each polling cycle's shot
+    docs (all games) to `ShotAggregator.apply_many()`, which commits the
+    counts as Firestore Increment transforms in one transaction.
+    The `applied` ledger is one small subdocument per player and game; the
+    transaction reads only the ledgers of the games in the batch and
+    extends them, so a process restart, a second instance polling the same
+    game, or a backfill re-run never counts a shot twice, and the summary
+    doc itself does not grow with every shot of the season. The in-process
+    set of applied sequence numbers only saves the transaction when a
+    batch has nothing new.
+
+Backfill:
+    `rebuild_player_summary()` is the exact, from-raw repair path. It
+    stamps schemaVersion = SUMMARY_SCHEMA_VERSION; a summary without it
+    (e.g. created by the first live increment after deploy) still lacks
+    the player's earlier history and is rebuilt on read. Raw shots are
+    streamed outside any transaction; the summary and its ledgers are then
+    written in one commit, which is abandoned and retried if a live
+    increment touched the summary in the meantime.
+"""
+
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from services.firestore_collections import PLAYER_SHOT_SUMMARIES, PLAYER_SHOT_SUMMARIES_APPLIED_SUB
+from shared_core.utils.season import season_for_date
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+HEX_SIZE = 15.0          # hex radius in raw court units (NBA LOC units ≈ 1.5 ft)
+PAINT_MAX_FT = 8
+THREE_MIN_FT = 23
+ZONES = ("paint", "mid", "three", "ft")
+
+# Bump to force every summary to be rebuilt from raw shots on next read
+# (2: applied ledger moved out of the summary doc into per-game subdocs)
+SUMMARY_SCHEMA_VERSION = 2
+REBUILD_ATTEMPTS = 3
+
+_SQRT3 = math.sqrt(3.0)
+
+
+# ============================================================================
+# CLASSIFICATION
+# ============================================================================
+
+def _is_free_throw(shot: Dict[str, Any]) -> bool:
+    shot_type = str(shot.get("shotType") or "").lower().replace(" ", "")
+    return "freethrow" in shot_type
+
+
+def shot_zone(shot: Dict[str, Any]) -> str:
+    """Classify a shot doc into paint / mid / three / ft."""
+    if _is_free_throw(shot):
+        return "ft"
+    distance = shot.get("distance")
+    if distance is None:
+        return "three" if shot.get("pointsValue") == 3 else "paint"
+    if distance < PAINT_MAX_FT:
+        return "paint"
+    if distance < THREE_MIN_FT:
+        return "mid"
+    return "three"
+
+
+def hex_key(x: float, y: float, size: float = HEX_SIZE) -> str:
+    """Axial (q, r) coordinates of the pointy-top hex containing (x, y)."""
+    qf = (_SQRT3 / 3.0 * x - y / 3.0) / size
+    rf = (2.0 / 3.0 * y) / size
+    # Cube rounding
+    sf = -qf - rf
+    q, r, s = round(qf), round(rf), round(sf)
+    dq, dr, ds = abs(q - qf), abs(r - rf), abs(s - sf)
+    if dq > dr and dq > ds:
+        q = -r - s
+    elif dr > ds:
+        r = -q - s
+    return f"{int(q)}_{int(r)}"
+
+
+def hex_center(key: str, size: float = HEX_SIZE) -> tuple:
+    """Court coordinates of a hex bin's center."""
+    q, r = (int(v) for v in key.split("_"))
+    return size * _SQRT3 * (q + r / 2.0), size * 1.5 * r
+
+
+# ============================================================================
+# ACCUMULATION (pure — plain nested dicts of ints)
+# ============================================================================
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {"att": 0, "made": 0, "pts": 0, "zones": {}, "hex": {}}
+
+
+def _empty_summary() -> Dict[str, Any]:
+    return {"all": _empty_bucket(), "seasons": {}, "games": {}, "applied": {}}
+
+
+def _add_to_bucket(bucket: Dict[str, Any], shot: Dict[str, Any], zone: str):
+    """att/made are field goals only; free throws land in zones.ft and pts."""
+    made = 1 if shot.get("made") else 0
+    bucket["pts"] += int(shot.get("pointsValue") or 0) if made else 0
+    z = bucket["zones"].setdefault(zone, {"att": 0, "made": 0})
+    z["att"] += 1
+    z["made"] += made
+    if zone == "ft":
+        return
+    bucket["att"] += 1
+    bucket["made"] += made
+    x, y = shot.get("x"), shot.get("y")
+    if x is not None and y is not None:
+        h = bucket["hex"].setdefault(hex_key(float(x), float(y)), {"att": 0, "made": 0})
+        h["att"] += 1
+        h["made"] += made
+
+
+def build_delta(shots: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fold shot docs into per-player summary deltas.
+
+    Returns {playerId: {"all": bucket, "seasons": {season: bucket},
+                        "games": {gameId: {date, matchup, att, made}},
+                        "applied": {gameId: [sequenceNumber, ...]}}}
+    """
+    deltas: Dict[str, Dict[str, Any]] = {}
+    for shot in shots:
+        player_id = shot.get("playerId")
+        if not player_id:
+            continue
+        d = deltas.setdefault(str(player_id), _empty_summary())
+        zone = shot_zone(shot)
+        _add_to_bucket(d["all"], shot, zone)
+
+        season = season_for_date(shot.get("gameDate", ""))
+        if season:
+            _add_to_bucket(d["seasons"].setdefault(season, _empty_bucket()), shot, zone)
+
+        game_id = str(shot.get("gameId") or "")
+        seq = shot.get("sequenceNumber")
+        if game_id and seq is not None:
+            d["applied"].setdefault(game_id, []).append(seq)
+        if game_id and zone != "ft":
+            g = d["games"].setdefault(game_id, {
+                "date": shot.get("gameDate", ""),
+                "matchup": shot.get("matchup", ""),
+                "att": 0,
+                "made": 0,
+            })
+            g["att"] += 1
+            g["made"] += 1 if shot.get("made") else 0
+    return deltas
+
+
+def _to_increments(node: Any) -> Any:
+    """Replace integer leaves with Firestore Increment transforms."""
+    from google.cloud.firestore_v1 import Increment
+    if isinstance(node, dict):
+        return {k: _to_increments(v) for k, v in node.items()}
+    if isinstance(node, int) and not isinstance(node, bool):
+        return Increment(node)
+    return node
+
+
+# ============================================================================
+# PAYLOAD
+# ============================================================================
+
+def _pct(made: int, att: int) -> Optional[float]:
+    return round(made / att * 100, 1) if att else None
+
+
+def to_payload(summary: Dict[str, Any], season: Optional[str] = None) -> Dict[str, Any]:
+    """Shape a stored summary (or one season of it) into the compact chart payload."""
+    bucket = (summary.get("seasons", {}).get(season) if season else summary.get("all")) or _empty_bucket()
+    stored_zones = bucket.get("zones", {})
+    zones = {}
+    for name in ZONES:
+        z = stored_zones.get(name, {})
+        zones[name] = {"att": z.get("att", 0), "made": z.get("made", 0),
+                       "pct": _pct(z.get("made", 0), z.get("att", 0))}
+    hexbins = []
+    for key, cell in bucket.get("hex", {}).items():
+        cx, cy = hex_center(key)
+        hexbins.append({
+            "x": round(cx, 1),
+            "y": round(cy, 1),
+            "att": cell.get("att", 0),
+            "made": cell.get("made", 0),
+            "pct": _pct(cell.get("made", 0), cell.get("att", 0)),
+        })
+    hexbins.sort(key=lambda h: -h["att"])
+
+    games = [
+        {"gameId": gid, "gameDate": g.get("date", ""), "matchup": g.get("matchup", ""),
+         "att": g.get("att", 0), "made": g.get("made", 0)}
+        for gid, g in summary.get("games", {}).items()
+        if not season or season_for_date(g.get("date", "")) == season
+    ]
+    games.sort(key=lambda g: g["gameDate"] or "", reverse=True)
+
+    return {
+        "attempts": bucket.get("att", 0),
+        "made": bucket.get("made", 0),
+        "points": bucket.get("pts", 0),
+        "fgPct": _pct(bucket.get("made", 0), bucket.get("att", 0)),
+        "zones": zones,
+        "hexSize": HEX_SIZE,
+        "hexbins": hexbins,
+        "games": games,
+        "seasons": sorted(summary.get("seasons", {}).keys(), reverse=True),
+    }
+
+
+def _player_delta(shots: List[Dict[str, Any]], player_id: str) -> Dict[str, Any]:
+    delta = build_delta(s if s.get("playerId") else {**s, "playerId": player_id} for s in shots)
+    return delta.get(str(player_id), _empty_summary())
+
+
+def summarize_shots(shots: List[Dict[str, Any]], player_id: str) -> Dict[str, Any]:
+    """Exact summary for one player from raw shot docs."""
+    summary = _player_delta(shots, player_id)
+    summary.pop("applied")
+    return summary
+
+
+# ============================================================================
+# FIRESTORE PERSISTENCE
+# ============================================================================
+
+class ShotAggregator:
+    """Applies shot deltas to player_shot_summaries with per-game dedupe."""
+
+    def __init__(self):
+        self._applied: Dict[str, Set[int]] = {}
+
+    def pending(self, game_id: str, shots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        seen = self._applied.get(str(game_id), set())
+        return [s for s in shots if s.get("sequenceNumber") not in seen]
+
+    def apply(self, db, game_id: str, shots: List[Dict[str, Any]]) -> int:
+        """
+        Commit increments for shots not yet folded in for this game.
+
+        Returns the number of shots applied. One transaction per call —
+        a batch of plays touches at most ~30 players.
+        """
+        return self.apply_many(db, {str(game_id): shots})
+
+    def apply_many(self, db, shots_by_game: Dict[str, List[Dict[str, Any]]]) -> int:
+        """
+        apply() for several games in one transaction (one polling cycle).
+
+        Returns the number of shots applied across all games; shots already
+        in a summary's `applied` ledger are skipped.
+        """
+        from google.cloud.firestore_v1 import transactional
+
+        fresh_by_game = {
+            str(gid): fresh for gid, shots in shots_by_game.items()
+            if (fresh := self.pending(gid, shots))
+        }
+        if not fresh_by_game:
+            return 0
+        keys = sorted({
+            (str(s["playerId"]), gid) for gid, fresh in fresh_by_game.items() for s in fresh if s.get("playerId")
+        })
+        applied = 0
+        if keys:
+            ledgers = {key: _ledger_ref(db, *key) for key in keys}
+            applied = transactional(_fold_in)(db.transaction(), db, ledgers, fresh_by_game)
+
+        for gid, fresh in fresh_by_game.items():
+            self._applied.setdefault(gid, set()).update(
+                s.get("sequenceNumber") for s in fresh
+            )
+        return applied
+
+    def forget_game(self, game_id: str):
+        """Drop dedupe state once a game is finalized."""
+        self._applied.pop(str(game_id), None)
+
+
+def _summary_ref(db, player_id: str):
+    return db.collection(PLAYER_SHOT_SUMMARIES).document(str(player_id))
+
+
+def _ledger_ref(db, player_id: str, game_id: str):
+    """player_shot_summaries/{playerId}/applied/{gameId}"""
+    return _summary_ref(db, player_id).collection(PLAYER_SHOT_SUMMARIES_APPLIED_SUB).document(str(game_id))
+
+
+def _fold_in(transaction, db, ledgers: Dict[tuple, Any],
+             fresh_by_game: Dict[str, List[Dict[str, Any]]]) -> int:
+    """Transaction body: skip shots in the stored ledgers, increment the rest."""
+    from google.cloud.firestore_v1 import ArrayUnion
+
+    key_by_path = {ref.path: key for key, ref in ledgers.items()}
+    seen: Dict[tuple, Set[int]] = {}
+    for snap in db.get_all(list(ledgers.values()), field_paths=["seqs"], transaction=transaction):
+        if snap.exists:
+            seen[key_by_path[snap.reference.path]] = set((snap.to_dict() or {}).get("seqs", []))
+
+    new_shots = [
+        s for gid, fresh in fresh_by_game.items() for s in fresh
+        if s.get("sequenceNumber") not in seen.get((str(s.get("playerId")), gid), ())
+    ]
+    deltas = build_delta(new_shots)
+    if not deltas:
+        return 0
+
+    now = datetime.now(timezone.utc).isoformat()
+    for player_id, delta in deltas.items():
+        games_meta = {
+            gid: {**_to_increments({"att": g["att"], "made": g["made"]}),
+                  "date": g["date"], "matchup": g["matchup"]}
+            for gid, g in delta["games"].items()
+        }
+        transaction.set(_summary_ref(db, player_id), {
+            "playerId": player_id,
+            "all": _to_increments(delta["all"]),
+            "seasons": _to_increments(delta["seasons"]),
+            "games": games_meta,
+            "updatedAt": now,
+        }, merge=True)
+        for gid, seqs in delta["applied"].items():
+            transaction.set(ledgers[(player_id, gid)], {"seqs": ArrayUnion(seqs), "updatedAt": now}, merge=True)
+    return sum(1 for s in new_shots if s.get("playerId"))
+
+
+_aggregator: Optional[ShotAggregator] = None
+
+
+def get_shot_aggregator() -> ShotAggregator:
+    """Get the process-wide ShotAggregator singleton."""
+    global _aggregator
+    if _aggregator is None:
+        _aggregator = ShotAggregator()
+    return _aggregator
+
+
+def get_player_summary(db, player_id: str) -> Optional[Dict[str, Any]]:
+    """Read one summary doc (a single Firestore read)."""
+    doc = _summary_ref(db, player_id).get()
+    return doc.to_dict() if doc.exists else None
+
+
+def needs_rebuild(summary: Optional[Dict[str, Any]]) -> bool:
+    """True if a summary was never rebuilt from raw shots under the current schema."""
+    return not summary or summary.get("schemaVersion", 0) < SUMMARY_SCHEMA_VERSION
+
+
+def rebuild_player_summary(
+    db, player_id: str, load_shots: Callable[[], List[Dict[str, Any]]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Overwrite a player's summary with an exact recount of `load_shots()`.
+
+    The raw shots are loaded and counted outside any transaction. The
+    summary and one ledger per game are then written in a single commit
+    that first checks the summary's update time: if a live apply_many()
+    landed while the shots were loading, the recount is discarded and
+    redone (up to REBUILD_ATTEMPTS). Returns None (and writes nothing) if
+    there are no shots or every attempt raced a live update.
+    """
+    from google.cloud.firestore_v1 import transactional
+
+    ref = _summary_ref(db, player_id)
+    for _ in range(REBUILD_ATTEMPTS):
+        before = ref.get(field_paths=["updatedAt"])
+        shots = load_shots()
+        if not shots:
+            return None
+        summary = _player_delta(shots, player_id)
+        applied = summary.pop("applied")
+        doc = {
+            "playerId": str(player_id),
+            **summary,
+            "schemaVersion": SUMMARY_SCHEMA_VERSION,
+            "updatedAt": datetime.now(timezone.utc).isoformat(),
+        }
+        seen = before.update_time if before.exists else None
+        if transactional(_commit_rebuild)(db.transaction(), db, ref, seen, doc, applied):
+            logger.info(f"[SHOT-AGG] Rebuilt summary for {player_id} from {len(shots)} shots")
+            return doc
+        logger.info(f"[SHOT-AGG] Summary for {player_id} changed during rebuild, recounting")
+    logger.warning(f"[SHOT-AGG] Gave up rebuilding {player_id} after {REBUILD_ATTEMPTS} attempts")
+    return None
+
+
+def _commit_rebuild(transaction, db, ref, seen, doc: Dict[str, Any],
+                    applied: Dict[str, List[int]]) -> bool:
+    """Transaction body: write the recount only if the summary is unchanged since `seen`."""
+    snap = ref.get(field_paths=["updatedAt"], transaction=transaction)
+    if (snap.update_time if snap.exists else None) != seen:
+        return False
+    transaction.set(ref, doc)
+    for gid, seqs in applied.items():
+        transaction.set(_ledger_ref(db, doc["playerId"], gid), {"seqs": seqs, "updatedAt": doc["updatedAt"]})
+    return True
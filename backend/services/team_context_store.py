@@ -0,0 +1,413 @@
+"""
+Team Context Store
+==================
+One read-only, versioned view of the league's team tables shared by
+DefenseMatrix, PaceEngine, NemesisEngine and DefenseFrictionModule.
+
+Each load reads, over a single connection:
+  team_defense              one SELECT for all 30 teams
+  team_defense_by_position  one SELECT (mirrored by populate_team_defense_v2.py)
+  player_shot_clock         one GROUP BY team, clock_range
+
+and precomputes every matchup pair (30 choose 2 = 435) with its pace
+multiplier and both sides' PAOA by position. Snapshots are immutable and
+swapped in by reference, so a reader keeps a consistent view across a
+whole projection.
+
+Invalidation:
+  Writers call bump_team_context_version() after refreshing team tables.
+  The store polls the team_context_version row at most every
+  VERSION_CHECK_SECONDS and reloads when the stamp moves; invalidate()
+  forces a reload in-process.
+
+Player-vs-team history (NemesisEngine) is cached per player on the
+snapshot, so it is dropped together with the team data it was read with.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+LEAGUE_AVG_PPG = 115.0
+LEAGUE_AVG_PACE = 99.5
+PACE_MULTIPLIER_CAP = 0.12
+
+# PAOA position scaling applied to (opp_pts - league avg)
+POSITION_PAOA_SCALE = {"PG": 0.9, "SG": 0.95, "SF": 1.0, "PF": 1.05, "C": 1.1}
+
+VERSION_CHECK_SECONDS = 30.0
+LOAD_RETRY_SECONDS = 60.0
+PLAYER_CACHE_LIMIT = 2000
+
+VERSION_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS team_context_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL,
+        source TEXT,
+        updated_at TEXT
+    )
+"""
+
+POSITION_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS team_defense_by_position (
+        team TEXT NOT NULL,
+        position TEXT NOT NULL,
+        opp_pts REAL,
+        opp_fg_pct REAL,
+        opp_fg3_pct REAL,
+        def_rating REAL,
+        updated_at TEXT,
+        PRIMARY KEY (team, position)
+    )
+"""
+
+
+def _default_db_path() -> Path:
+    try:
+        from data_paths import get_db_path
+        path = get_db_path()
+        if path:
+            return Path(path)
+    except ImportError:
+        pass
+    return Path(__file__).parent.parent / 'data' / 'nba_data.db'
+
+
+def _connect(db_path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def bump_team_context_version(db_path=None, source: str = "") -> int:
+    """Advance the shared version stamp after team tables are rewritten."""
+    conn = _connect(db_path or _default_db_path())
+    try:
+        conn.execute(VERSION_TABLE_SQL)
+        conn.execute("""
+            INSERT INTO team_context_version (id, version, source, updated_at)
+            VALUES (1, 1, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                version = version + 1, source = excluded.source, updated_at = excluded.updated_at
+        """, (source, datetime.now().isoformat()))
+        conn.commit()
+        version = conn.execute("SELECT version FROM team_context_version WHERE id = 1").fetchone()[0]
+    finally:
+        conn.close()
+    store = _stores.get(str(db_path or _default_db_path()))
+    if store is not None:
+        store.invalidate()
+    return version
+
+
+def save_position_defense(records: Iterable[Dict], db_path=None) -> int:
+    """Mirror team_defense_by_position rows into SQLite for the store."""
+    rows = [
+        (r['team'], r['position'], r.get('opp_pts'), r.get('opp_fg_pct'),
+         r.get('opp_fg3_pct'), r.get('def_rating'), datetime.now().isoformat())
+        for r in records
+    ]
+    conn = _connect(db_path or _default_db_path())
+    try:
+        conn.execute(POSITION_TABLE_SQL)
+        conn.executemany(
+            "INSERT OR REPLACE INTO team_defense_by_position VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.commit()
+    finally:
+        conn.close()
+    return len(rows)
+
+
+# ============================================================================
+# SNAPSHOT
+# ============================================================================
+
+def pace_multiplier(pace1: float, pace2: float) -> float:
+    """Projected-pace multiplier vs league average, capped at +/- 12%."""
+    multiplier = ((pace1 + pace2) / 2) / LEAGUE_AVG_PACE
+    multiplier = min(1 + PACE_MULTIPLIER_CAP, max(1 - PACE_MULTIPLIER_CAP, multiplier))
+    return round(multiplier, 3)
+
+
+def pace_category(projected: float) -> str:
+    if projected > 101:
+        return "Fast"
+    if projected < 98:
+        return "Slow"
+    return "Average"
+
+
+def _defense_profile(row: Dict) -> Optional[Dict]:
+    opp_pts = row.get('opp_pts')
+    if not opp_pts or opp_pts <= 0:
+        return None
+    base_paoa = opp_pts - LEAGUE_AVG_PPG
+    profile = {f"vs_{pos}": round(base_paoa * scale, 1) for pos, scale in POSITION_PAOA_SCALE.items()}
+    profile.update({
+        "opp_pts": opp_pts,
+        "opp_fg_pct": row.get('opp_fg_pct'),
+        "def_rating": row.get('def_rating'),
+        "pace": row.get('pace'),
+        "division": row.get('division'),
+        "source": "real_data",
+        "available": True,
+    })
+    return profile
+
+
+@dataclass(frozen=True)
+class MatchupPair:
+    """Precomputed context for one unordered team pair."""
+    team_a: str
+    team_b: str
+    projected_pace: Optional[float]
+    pace_multiplier: float
+    paoa_a: Dict[str, float]        # what team_a's defense allows, by position
+    paoa_b: Dict[str, float]
+
+    def paoa_against(self, defense: str) -> Dict[str, float]:
+        return self.paoa_a if defense.upper() == self.team_a else self.paoa_b
+
+
+def _pair_key(team1: str, team2: str) -> Tuple[str, str]:
+    a, b = team1.upper(), team2.upper()
+    return (a, b) if a <= b else (b, a)
+
+
+@dataclass(frozen=True)
+class TeamContext:
+    """Immutable snapshot of the league's team tables."""
+    version: int
+    source_version: int
+    teams: Dict[str, Dict]
+    aliases: Dict[str, str]
+    defense: Dict[str, Dict]
+    pace: Dict[str, float]
+    position_defense: Dict[Tuple[str, str], Dict]
+    clock_distribution: Dict[str, Dict[str, float]]
+    pairs: Dict[Tuple[str, str], MatchupPair]
+    loaded_at: float = field(default_factory=time.time)
+    player_matchups: Dict[str, Dict[str, Dict]] = field(default_factory=dict, compare=False)
+
+    @classmethod
+    def build(cls, team_rows: List[Dict], position_rows: List[Dict] = (),
+              clock_rows: List[Dict] = (), version: int = 0, source_version: int = 0) -> "TeamContext":
+        teams, aliases = {}, {}
+        for row in team_rows:
+            abbr = (row.get('team_abbr') or '').upper()
+            if not abbr:
+                continue
+            teams[abbr] = row
+            if row.get('team_id') is not None:
+                aliases[str(row['team_id'])] = abbr
+
+        defense = {abbr: p for abbr, row in teams.items() if (p := _defense_profile(row))}
+        pace = {abbr: float(row['pace']) for abbr, row in teams.items() if row.get('pace') and row['pace'] > 0}
+
+        position_defense = {
+            (str(r['team']).upper(), str(r['position']).upper()): r for r in position_rows
+        }
+        clock: Dict[str, Dict[str, float]] = {}
+        for r in clock_rows:
+            clock.setdefault(str(r['team']).upper(), {})[r['clock_range']] = float(r['avg_freq'] or 0)
+
+        neutral = {pos: 0.0 for pos in POSITION_PAOA_SCALE}
+        pairs = {}
+        for a, b in combinations(sorted(teams), 2):
+            both = a in pace and b in pace
+            pairs[(a, b)] = MatchupPair(
+                team_a=a,
+                team_b=b,
+                projected_pace=round((pace[a] + pace[b]) / 2, 1) if both else None,
+                pace_multiplier=pace_multiplier(pace[a], pace[b]) if both else 1.0,
+                paoa_a={pos: defense[a][f"vs_{pos}"] for pos in POSITION_PAOA_SCALE} if a in defense else neutral,
+                paoa_b={pos: defense[b][f"vs_{pos}"] for pos in POSITION_PAOA_SCALE} if b in defense else neutral,
+            )
+
+        return cls(version=version, source_version=source_version, teams=teams, aliases=aliases,
+                   defense=defense, pace=pace, position_defense=position_defense,
+                   clock_distribution=clock, pairs=pairs)
+
+    def resolve(self, team: str) -> str:
+        code = str(team).upper()
+        return code if code in self.teams else self.aliases.get(str(team), code)
+
+    def defense_profile(self, team: str) -> Optional[Dict]:
+        return self.defense.get(self.resolve(team))
+
+    def team_pace(self, team: str) -> Optional[float]:
+        return self.pace.get(self.resolve(team))
+
+    def pair(self, team1: str, team2: str) -> Optional[MatchupPair]:
+        return self.pairs.get(_pair_key(self.resolve(team1), self.resolve(team2)))
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.loaded_at
+
+
+_EMPTY = TeamContext.build([], version=0)
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class TeamContextStore:
+    """Loads, versions and hot-swaps TeamContext snapshots for one database."""
+
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or _default_db_path())
+        self._snapshot: TeamContext = _EMPTY
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._last_attempt = 0.0
+        self._stale = True
+
+    # ── loading ──────────────────────────────────────────────────────────
+
+    def _read_source_version(self, conn: sqlite3.Connection) -> int:
+        if not _table_exists(conn, 'team_context_version'):
+            return 0
+        row = conn.execute("SELECT version FROM team_context_version WHERE id = 1").fetchone()
+        return int(row[0]) if row else 0
+
+    def load(self) -> TeamContext:
+        """Read every team table once and install a new snapshot."""
+        self._last_attempt = time.time()
+        if not Path(self.db_path).exists():
+            logger.warning(f"[TEAM-CTX] Database not found at {self.db_path}")
+            return self._snapshot
+
+        conn = _connect(self.db_path)
+        try:
+            source_version = self._read_source_version(conn)
+            team_rows = position_rows = clock_rows = []
+            if _table_exists(conn, 'team_defense'):
+                team_rows = [dict(r) for r in conn.execute("SELECT * FROM team_defense")]
+            if _table_exists(conn, 'team_defense_by_position'):
+                position_rows = [dict(r) for r in conn.execute("SELECT * FROM team_defense_by_position")]
+            if _table_exists(conn, 'player_shot_clock'):
+                clock_rows = [dict(r) for r in conn.execute("""
+                    SELECT team, clock_range, AVG(fga_freq) AS avg_freq
+                    FROM player_shot_clock GROUP BY team, clock_range
+                """)]
+        except sqlite3.Error as e:
+            logger.warning(f"[TEAM-CTX] Load failed: {e}")
+            return self._snapshot
+        finally:
+            conn.close()
+
+        with self._lock:
+            snapshot = TeamContext.build(
+                team_rows, position_rows, clock_rows,
+                version=self._snapshot.version + 1, source_version=source_version,
+            )
+            self._snapshot = snapshot
+            self._stale = False
+            self._last_check = time.time()
+        logger.info(
+            f"[TEAM-CTX] v{snapshot.version} loaded: {len(snapshot.teams)} teams, "
+            f"{len(snapshot.pairs)} pairs (source v{source_version})"
+        )
+        return snapshot
+
+    def _source_moved(self) -> bool:
+        self._last_check = time.time()
+        try:
+            conn = _connect(self.db_path)
+            try:
+                return self._read_source_version(conn) != self._snapshot.source_version
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return False
+
+    def snapshot(self) -> TeamContext:
+        """Current snapshot; reloads when invalidated or the version stamp moved."""
+        now = time.time()
+        if self._stale:
+            if now - self._last_attempt >= LOAD_RETRY_SECONDS:
+                return self.load()
+            return self._snapshot
+        if now - self._last_check >= VERSION_CHECK_SECONDS and self._source_moved():
+            return self.load()
+        return self._snapshot
+
+    def invalidate(self):
+        """Force the next snapshot() to reload."""
+        self._stale = True
+        self._last_attempt = 0.0
+
+    # ── player vs team (NemesisEngine) ───────────────────────────────────
+
+    def player_matchups(self, player_id: str) -> Dict[str, Dict]:
+        """All player_vs_team rows for one player keyed by opponent, cached per snapshot."""
+        snap = self.snapshot()
+        pid = str(player_id)
+        cached = snap.player_matchups.get(pid)
+        if cached is not None:
+            return cached
+        rows: Dict[str, Dict] = {}
+        try:
+            conn = _connect(self.db_path)
+            try:
+                if _table_exists(conn, 'player_vs_team'):
+                    for r in conn.execute("SELECT * FROM player_vs_team WHERE player_id = ?", (pid,)):
+                        rows[str(r['opponent']).upper()] = dict(r)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"[TEAM-CTX] player_vs_team read failed for {pid}: {e}")
+            return rows
+        if len(snap.player_matchups) >= PLAYER_CACHE_LIMIT:
+            snap.player_matchups.clear()
+        snap.player_matchups[pid] = rows
+        return rows
+
+    def status(self) -> Dict:
+        snap = self._snapshot
+        return {
+            "version": snap.version,
+            "source_version": snap.source_version,
+            "teams": len(snap.teams),
+            "pairs": len(snap.pairs),
+            "position_rows": len(snap.position_defense),
+            "cached_players": len(snap.player_matchups),
+            "age_seconds": round(snap.age_seconds, 1),
+            "db_path": self.db_path,
+        }
+
+
+# ============================================================================
+# SINGLETON
+# ============================================================================
+
+_stores: Dict[str, TeamContextStore] = {}
+
+
+def get_team_context_store(db_path=None) -> TeamContextStore:
+    """Shared store per database path."""
+    key = str(db_path or _default_db_path())
+    store = _stores.get(key)
+    if store is None:
+        store = _stores.setdefault(key, TeamContextStore(key))
+    return store
@@ -22,6 +22,22 @@ from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
+def filters_match(filters: dict, filter_key: Optional[str], filter_value: Optional[str]) -> bool:
+    """A broadcast reaches a connection unless it filters the same key to another value."""
+    if not (filter_key and filter_value):
+        return True
+    return filter_key not in filters or filters.get(filter_key) == filter_value
+
+
+def ws_message(event_type: str, data: dict) -> dict:
+    """Server → client envelope shared by broadcasts and subscribe snapshots."""
+    return {
+        "type": event_type,
+        "data": data,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
 # ── Connection state type ────────────────────────────────────────────────────
 class ConnectionState:
     """Tracks a single WebSocket connection's metadata."""
@@ -128,21 +144,14 @@ class WebSocketConnectionManager:
         async with self._lock:
             targets = list(self._connections.items())
 
-        payload = {
-            "type": event_type,
-            "data": data,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
+        payload = ws_message(event_type, data)
 
         dead_connections = []
 
         for conn_id, state in targets:
-            # Filter matching logic
-            if filter_key and filter_value:
-                conn_filters = state.filters
-                # If the client has a filter for this key but a different value, skip
-                if filter_key in conn_filters and conn_filters.get(filter_key) != filter_value:
-                    continue
+            # If the client has a filter for this key but a different value, skip
+            if not filters_match(state.filters, filter_key, filter_value):
+                continue
 
             try:
                 start = time.monotonic()
@@ -6,6 +6,8 @@ Dispatches incoming WebSocket messages to appropriate handlers.
 Protocol:
   Client → Server messages MUST contain an "action" field:
     - subscribe:   { action: "subscribe", filters: { team: "LAL", ... } }
+                   answered with "subscribed", then the latest leaders_update /
+                   game_update / player_update messages matching the filters
     - unsubscribe: { action: "unsubscribe" }
     - ping:        { action: "ping" }
     - annotate:    { action: "annotate", context_type, context_id, content }
@@ -18,10 +20,13 @@ Protocol:
 """
 
 import logging
+import sys
 from datetime import datetime, timezone
 
 from fastapi import WebSocket
 
+from services.ws_connection_manager import ws_message
+
 logger = logging.getLogger(__name__)
 
 # Valid subscription filter keys
@@ -62,6 +67,9 @@ async def handle_ws_message(
                 "type": "subscribed",
                 "filters": valid_filters,
             })
+            # Current state for the new filters, so nothing waits for the next cycle
+            for event_type, data in _subscription_snapshot(valid_filters):
+                await websocket.send_json(ws_message(event_type, data))
             logger.info(
                 "ws_subscribed",
                 extra={
@@ -120,6 +128,17 @@ async def handle_ws_message(
             pass  # connection may already be dead
 
 
+def _subscription_snapshot(filters: dict) -> list:
+    """
+    The producer's last broadcast, filtered. Empty if the producer is not
+    running; its module is never imported here (that would stall the loop
+    while the warm-up registry is still loading it).
+    """
+    module = sys.modules.get("services.async_pulse_producer_cloud")
+    producer = module.get_cloud_producer() if module else None
+    return producer.ws_snapshot(filters) if producer else []
+
+
 async def _handle_annotation(
     connection_id: str,
     session_token: str,
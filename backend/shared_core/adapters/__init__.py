@@ -10,6 +10,7 @@ from .nba_api_adapter import (
     NormalizedPlayerStats,
     NormalizedGameInfo,
     NormalizedBoxScore,
+    BoxScoreColumns,
     get_nba_adapter
 )
 
@@ -19,5 +20,6 @@ __all__ = [
     'NormalizedPlayerStats',
     'NormalizedGameInfo',
     'NormalizedBoxScore',
+    'BoxScoreColumns',
     'get_nba_adapter'
 ]
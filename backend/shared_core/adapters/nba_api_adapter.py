@@ -10,20 +10,37 @@ v2.1 Hardening:
 - Typed error classification (network vs 4xx vs parsing)
 - atexit session cleanup for Cloud Run container shutdown
 - Configurable timeout (connect=5s, read=10s)
+
+v2.2 Change detection:
+- Conditional GETs (If-None-Match / If-Modified-Since) against the CDN
+- Body-hash dedup: a byte-identical 200 skips json parsing and normalization
+- Scoreboard/boxscore caches are bounded LRUs with single-flight loading
+- content_version(key) lets callers skip work when nothing changed
+
+NBA_CDN_BASE_URL (env) overrides the CDN host, e.g. to replay a recorded
+game night from scripts/pulse_replay_server.py.
 """
 
 import asyncio
 import atexit
+import hashlib
+import json
 import logging
+import os
 import random
 import re
 import time
-from typing import Dict, List, Optional, Any, Literal, Tuple
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Literal, Tuple
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+NBA_CDN_BASE_URL = os.environ.get("NBA_CDN_BASE_URL", "https://cdn.nba.com").rstrip("/")
+
 
 # ============================================================================
 # CANONICAL DATA STRUCTURES (QuantSight Internal Schema)
@@ -124,6 +141,11 @@ class NormalizedBoxScore:
             'ftm': sum(p.ftm for p in active),
         }
     
+    def to_columns(self, home_team: str = '', away_team: str = '') -> 'BoxScoreColumns':
+        """Columnar arrays of this game's active players (see BoxScoreColumns)."""
+        matchup = [(home_team, away_team)] if (home_team or away_team) else None
+        return BoxScoreColumns.from_boxscores([self], matchup)
+    
     def to_dict(self) -> Dict:
         return {
             'game_id': self.game_id,
@@ -133,6 +155,103 @@ class NormalizedBoxScore:
         }
 
 
+BOX_STAT_FIELDS: Tuple[str, ...] = (
+    'pts', 'fgm', 'fga', 'fg3m', 'fg3a', 'ftm', 'fta',
+    'oreb', 'dreb', 'reb', 'ast', 'stl', 'blk', 'tov', 'pf', 'plus_minus',
+)
+TEAM_TOTAL_FIELDS: Tuple[str, ...] = ('fga', 'fta', 'tov', 'minutes')
+
+
+def minutes_to_float(minutes: str) -> float:
+    """"MM:SS" (as produced by _parse_iso_minutes) to fractional minutes."""
+    try:
+        mins, _, secs = str(minutes or '0:00').partition(':')
+        return int(mins or 0) + int(secs or 0) / 60.0
+    except ValueError:
+        return 0.0
+
+
+@dataclass
+class BoxScoreColumns:
+    """
+    Columnar view of every active player across one or more box scores.
+
+    One row per player, in all_active_players() order game by game.
+    `stats` holds a float array per BOX_STAT_FIELDS entry; `team_totals`
+    holds each player's own team totals (active players only, same as
+    NormalizedBoxScore.get_team_stats) broadcast to the player's row, so
+    per-team math is a single elementwise expression.
+    """
+    players: List[NormalizedPlayerStats]
+    game_ids: List[str]
+    spans: Dict[str, Tuple[int, int]]         # game_id -> [start, stop) row range
+    teams: np.ndarray
+    opponents: np.ndarray
+    minutes: np.ndarray
+    stats: Dict[str, np.ndarray]
+    team_totals: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def __getitem__(self, stat: str) -> np.ndarray:
+        return self.stats[stat]
+
+    @classmethod
+    def from_boxscores(
+        cls,
+        boxscores: List[NormalizedBoxScore],
+        matchups: Optional[List[Tuple[str, str]]] = None
+    ) -> 'BoxScoreColumns':
+        """
+        Build the arrays for a batch of games. matchups[i] = (home, away)
+        overrides the tricodes in boxscores[i].game_info when given.
+        """
+        players: List[NormalizedPlayerStats] = []
+        game_ids: List[str] = []
+        spans: Dict[str, Tuple[int, int]] = {}
+        opponents: List[str] = []
+        groups: List[int] = []                # 2 * game index + (0 home / 1 away)
+
+        for i, box in enumerate(boxscores):
+            home, away = matchups[i] if matchups else (
+                box.game_info.home_team_tricode, box.game_info.away_team_tricode)
+            start = len(players)
+            for side, roster in enumerate((box.home_players, box.away_players)):
+                for p in roster:
+                    if p.status != 'ACTIVE':
+                        continue
+                    players.append(p)
+                    groups.append(2 * i + side)
+                    opponents.append(away if p.team_tricode == home else home)
+            game_ids.append(box.game_id)
+            spans[box.game_id] = (start, len(players))
+
+        stats = {
+            f: np.fromiter((getattr(p, f) or 0 for p in players), dtype=float, count=len(players))
+            for f in BOX_STAT_FIELDS
+        }
+        minutes = np.fromiter((minutes_to_float(p.minutes) for p in players), dtype=float, count=len(players))
+        group_idx = np.asarray(groups, dtype=np.intp)
+        n_groups = 2 * len(boxscores)
+        by_field = {**stats, 'minutes': minutes}
+        team_totals = {
+            f: np.bincount(group_idx, weights=by_field[f], minlength=n_groups)[group_idx]
+            for f in TEAM_TOTAL_FIELDS
+        }
+
+        return cls(
+            players=players,
+            game_ids=game_ids,
+            spans=spans,
+            teams=np.array([p.team_tricode for p in players], dtype=object),
+            opponents=np.array(opponents, dtype=object),
+            minutes=minutes,
+            stats=stats,
+            team_totals=team_totals,
+        )
+
+
 # ============================================================================
 # ADAPTER: Normalizes NBA API Responses
 # ============================================================================
@@ -190,8 +309,8 @@ class NBAApiAdapter:
     # ========================================================================
     
     # NBA Live Data API endpoints
-    SCOREBOARD_URL = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_00.json"
-    BOXSCORE_URL_TEMPLATE = "https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{game_id}.json"
+    SCOREBOARD_URL = f"{NBA_CDN_BASE_URL}/static/json/liveData/scoreboard/todaysScoreboard_00.json"
+    BOXSCORE_URL_TEMPLATE = NBA_CDN_BASE_URL + "/static/json/liveData/boxscore/boxscore_{game_id}.json"
     
     # ========================================================================
     # STATUS CODE MAPPING
@@ -384,6 +503,78 @@ class NBAApiAdapter:
 # ASYNC ADAPTER (v2.0 - Native aiohttp)
 # ============================================================================
 
+# ============================================================================
+# RESPONSE CACHE: bounded LRU + single-flight + change detection
+# ============================================================================
+
+class _CacheEntry:
+    """One cached, normalized CDN response plus its HTTP validators."""
+    __slots__ = ("value", "fetched_at", "etag", "last_modified", "body_hash", "version")
+
+    def __init__(self, value: Any, fetched_at: float, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, body_hash: Optional[str] = None,
+                 version: int = 1):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body_hash = body_hash
+        self.version = version
+
+
+class _SingleFlightLRU:
+    """
+    Bounded LRU of _CacheEntry keyed by resource.
+
+    `load()` coalesces concurrent misses for the same key onto one in-flight
+    fetch, so a cold cache never sends a burst of identical CDN requests.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[_CacheEntry]:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: _CacheEntry):
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def load(self, key: str,
+                   loader: Callable[[Optional[_CacheEntry]], Awaitable[_CacheEntry]]) -> _CacheEntry:
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            entry = await loader(self._data.get(key))
+            self.put(key, entry)
+            future.set_result(entry)
+            return entry
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+
 class AsyncNBAApiAdapter(NBAApiAdapter):
     """
     Async version of NBA API Adapter using native aiohttp.
@@ -392,7 +583,7 @@ class AsyncNBAApiAdapter(NBAApiAdapter):
     Directly hits NBA CDN endpoints for minimal latency.
     """
 
-    VERSION = "2.1.0"
+    VERSION = "2.2.0"
 
     # ── Request hardening constants ───────────────────────────────────────
     MAX_RETRIES = 3
@@ -417,6 +608,7 @@ class AsyncNBAApiAdapter(NBAApiAdapter):
     # ── In-memory TTL cache constants ─────────────────────────────────────
     SCOREBOARD_CACHE_TTL = 15   # seconds — one poll cycle
     BOXSCORE_CACHE_TTL   = 30   # seconds — slow enough to avoid CDN throttle
+    BOXSCORE_CACHE_MAX   = 64   # entries — a full slate is 15 games
 
     def __init__(self):
         self._session: Optional[Any] = None
@@ -427,11 +619,11 @@ class AsyncNBAApiAdapter(NBAApiAdapter):
         self._error_count: int = 0
         self._session_lock = None
 
-        # ── TTL cache stores ──────────────────────────────────────────────
-        # scoreboard: (value, fetched_at)
-        self._scoreboard_cache: Optional[Tuple[List, float]] = None
-        # boxscores: { game_id: (value, fetched_at) }
-        self._boxscore_cache: Dict[str, Tuple[Optional[Any], float]] = {}
+        # ── TTL caches (bounded LRU, single-flight) ───────────────────────
+        # keys: "scoreboard", "boxscore:{game_id}"
+        self._cache = _SingleFlightLRU(maxsize=self.BOXSCORE_CACHE_MAX + 1)
+        self._not_modified_count: int = 0
+        self._unchanged_body_count: int = 0
 
         try:
             import aiohttp
@@ -488,11 +680,13 @@ class AsyncNBAApiAdapter(NBAApiAdapter):
             await self._session.close()
         self._session = None
 
-    async def _get_with_retry(self, url: str) -> Optional[Dict]:
+    async def _request_with_retry(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Optional[Tuple[int, bytes, Any]]:
         """
         GET a URL with up to MAX_RETRIES attempts, exponential backoff + jitter.
 
-        Returns parsed JSON dict or None.
+        Returns (status, raw body, response headers) for 200 and 304, or None.
         Raises only on non-retryable errors (4xx except 429).
         """
         session = await self._get_session()
@@ -502,12 +696,16 @@ class AsyncNBAApiAdapter(NBAApiAdapter):
         last_error: Optional[Exception] = None
         for attempt in range(1, self.MAX_RETRIES + 1):
             try:
-                async with session.get(url) as response:
+                async with session.get(url, headers=headers) as response:
                     self._request_count += 1
 
                     if response.status == 200:
                         self._last_success = datetime.now()
-                        return await response.json(content_type=None)
+                        return 200, await response.read(), response.headers
+
+                    if response.status == 304:
+                        self._last_success = datetime.now()
+                        return 304, b"", response.headers
 
                     if response.status == 429:
                         # Rate limited — always retry with longer delay
@@ -561,6 +759,88 @@ class AsyncNBAApiAdapter(NBAApiAdapter):
         logger.error(f"NBA CDN fetch failed after {self.MAX_RETRIES} attempts for {url}: {last_error}")
         return None
 
+    async def _get_with_retry(self, url: str) -> Optional[Dict]:
+        """GET a URL with retries and return the parsed JSON dict, or None."""
+        result = await self._request_with_retry(url)
+        if result is None:
+            return None
+        try:
+            return json.loads(result[1])
+        except ValueError as e:
+            self._last_error = f"Invalid JSON: {e}"
+            self._error_count += 1
+            return None
+
+    async def _load_conditional(
+        self,
+        url: str,
+        prev: Optional[_CacheEntry],
+        normalize: Callable[[Dict], Any],
+        fallback: Callable[[], Awaitable[Any]],
+    ) -> _CacheEntry:
+        """
+        Revalidate one cached CDN resource.
+
+        304 Not Modified or a byte-identical body keeps the previous entry
+        (same value object, same version) without parsing or normalizing.
+        Only a genuinely new body is parsed, normalized and versioned.
+        """
+        now = time.monotonic()
+        version = (prev.version + 1) if prev else 1
+
+        if self._aiohttp_available:
+            headers: Dict[str, str] = {}
+            if prev is not None and prev.etag:
+                headers["If-None-Match"] = prev.etag
+            if prev is not None and prev.last_modified:
+                headers["If-Modified-Since"] = prev.last_modified
+
+            result = await self._request_with_retry(url, headers=headers or None)
+            if result is not None:
+                status, body, resp_headers = result
+                if status == 304 and prev is not None:
+                    self._not_modified_count += 1
+                    prev.fetched_at = now
+                    return prev
+
+                body_hash = hashlib.blake2b(body, digest_size=16).hexdigest()
+                etag = resp_headers.get("ETag")
+                last_modified = resp_headers.get("Last-Modified")
+                if prev is not None and body_hash == prev.body_hash:
+                    self._unchanged_body_count += 1
+                    prev.fetched_at = now
+                    prev.etag, prev.last_modified = etag, last_modified
+                    return prev
+                if status == 200:
+                    try:
+                        value = normalize(json.loads(body))
+                        return _CacheEntry(value, now, etag, last_modified, body_hash, version)
+                    except ValueError as e:
+                        logger.warning(f"NBA CDN returned invalid JSON for {url}: {e}")
+
+        # Native fetch unavailable or failed — nba_api library fallback (always "changed")
+        return _CacheEntry(await fallback(), now, version=version)
+
+    async def _fetch_cached(self, key: str, ttl: float, url: str,
+                            normalize: Callable[[Dict], Any],
+                            fallback: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry.fetched_at < ttl:
+            return entry.value
+        entry = await self._cache.load(
+            key, lambda prev: self._load_conditional(url, prev, normalize, fallback)
+        )
+        return entry.value
+
+    def content_version(self, key: str) -> int:
+        """
+        Monotonic content version of a cached resource ("scoreboard" or
+        "boxscore:{game_id}"); 0 if never fetched. Unchanged when the CDN
+        answered 304 or returned an identical body.
+        """
+        entry = self._cache.get(key)
+        return entry.version if entry is not None else 0
+
     def get_health(self) -> Dict:
         """Return adapter health metrics for the /health endpoint."""
         return {
@@ -574,36 +854,24 @@ class AsyncNBAApiAdapter(NBAApiAdapter):
                 round(self._error_count / self._request_count, 3)
                 if self._request_count > 0 else 0.0
             ),
+            "not_modified_count": self._not_modified_count,
+            "unchanged_body_count": self._unchanged_body_count,
+            "cache_entries": len(self._cache),
+            "cache_coalesced": self._cache.coalesced,
+            "cache_evictions": self._cache.evictions,
         }
     
     async def fetch_scoreboard_async(self) -> List[NormalizedGameInfo]:
         """
         Fetch today's scoreboard — returns cached result if within TTL.
-        Falls back to nba_api library when native aiohttp is unavailable.
+        Revalidates with a conditional GET; falls back to the nba_api
+        library when native aiohttp is unavailable or the CDN fails.
         """
-        now = time.monotonic()
-        if self._scoreboard_cache is not None:
-            cached_val, fetched_at = self._scoreboard_cache
-            if now - fetched_at < self.SCOREBOARD_CACHE_TTL:
-                return cached_val
-
-        result = (
-            await self._fetch_scoreboard_native()
-            if self._aiohttp_available
-            else await self._fetch_scoreboard_fallback()
+        return await self._fetch_cached(
+            "scoreboard", self.SCOREBOARD_CACHE_TTL, self.SCOREBOARD_URL,
+            self.normalize_scoreboard, self._fetch_scoreboard_fallback,
         )
-        self._scoreboard_cache = (result, now)
-        return result
-    
-    async def _fetch_scoreboard_native(self) -> List[NormalizedGameInfo]:
-        """Native aiohttp scoreboard fetch with retry + headers."""
-        raw_data = await self._get_with_retry(self.SCOREBOARD_URL)
-        if raw_data is not None:
-            return self.normalize_scoreboard(raw_data)
-        # _get_with_retry exhausted retries — fall back to nba_api library
-        logger.warning("CDN scoreboard failed after retries, trying nba_api fallback")
-        return await self._fetch_scoreboard_fallback()
-    
+
     async def _fetch_scoreboard_fallback(self) -> List[NormalizedGameInfo]:
         """Fallback using nba_api with ThreadPoolExecutor."""
         import asyncio
@@ -628,32 +896,16 @@ class AsyncNBAApiAdapter(NBAApiAdapter):
     async def fetch_boxscore_async(self, game_id: str) -> Optional[NormalizedBoxScore]:
         """
         Fetch boxscore for a single game — returns cached result if within TTL.
-        Falls back to nba_api library when native aiohttp is unavailable.
+        Unchanged CDN bodies return the previous NormalizedBoxScore object
+        without re-normalizing. 404 (game not started) or exhausted retries
+        fall back to the nba_api library.
         """
-        now = time.monotonic()
-        cached = self._boxscore_cache.get(game_id)
-        if cached is not None:
-            cached_val, fetched_at = cached
-            if now - fetched_at < self.BOXSCORE_CACHE_TTL:
-                return cached_val
-
-        result = (
-            await self._fetch_boxscore_native(game_id)
-            if self._aiohttp_available
-            else await self._fetch_boxscore_fallback(game_id)
+        return await self._fetch_cached(
+            f"boxscore:{game_id}", self.BOXSCORE_CACHE_TTL,
+            self.BOXSCORE_URL_TEMPLATE.format(game_id=game_id),
+            self.normalize_boxscore, lambda: self._fetch_boxscore_fallback(game_id),
         )
-        self._boxscore_cache[game_id] = (result, now)
-        return result
-    
-    async def _fetch_boxscore_native(self, game_id: str) -> Optional[NormalizedBoxScore]:
-        """Native aiohttp boxscore fetch with retry + headers."""
-        url = self.BOXSCORE_URL_TEMPLATE.format(game_id=game_id)
-        raw_data = await self._get_with_retry(url)
-        if raw_data is not None:
-            return self.normalize_boxscore(raw_data)
-        # _get_with_retry returned None (404 = game not started, or retries exhausted)
-        return await self._fetch_boxscore_fallback(game_id)
-    
+
     async def _fetch_boxscore_fallback(self, game_id: str) -> Optional[NormalizedBoxScore]:
         """Fallback using nba_api with ThreadPoolExecutor."""
         import asyncio
@@ -10,6 +10,9 @@ from shared_core.calculators.advanced_stats import (
     calculate_effective_fg,
     calculate_usage_rate,
     calculate_in_game_usage,
+    calculate_true_shooting_many,
+    calculate_effective_fg_many,
+    calculate_in_game_usage_many,
 )
 from shared_core.calculators.matchup_grades import calculate_matchup_grade
 
@@ -18,5 +21,8 @@ __all__ = [
     "calculate_effective_fg",
     "calculate_usage_rate",
     "calculate_in_game_usage",
+    "calculate_true_shooting_many",
+    "calculate_effective_fg_many",
+    "calculate_in_game_usage_many",
     "calculate_matchup_grade",
 ]
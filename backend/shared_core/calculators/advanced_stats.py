@@ -6,6 +6,8 @@ Platform-agnostic advanced NBA statistics calculations.
 
 from typing import Dict, Optional
 
+import numpy as np
+
 
 def calculate_true_shooting(
     pts: float,
@@ -177,6 +179,68 @@ def calculate_in_game_usage(
 
 
 
+# ============================================================================
+# VECTORIZED VARIANTS (aligned per-player arrays, same math as the scalars)
+# ============================================================================
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator, 0.0 wherever the denominator is not positive."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def calculate_true_shooting_many(
+    pts: np.ndarray,
+    fga: np.ndarray,
+    fta: np.ndarray
+) -> np.ndarray:
+    """Vectorized calculate_true_shooting."""
+    tsa = np.asarray(fga, dtype=float) + (0.44 * np.asarray(fta, dtype=float))
+    return np.clip(_safe_ratio(pts, 2 * tsa), 0.0, 1.0)
+
+
+def calculate_effective_fg_many(
+    fgm: np.ndarray,
+    fg3m: np.ndarray,
+    fga: np.ndarray
+) -> np.ndarray:
+    """Vectorized calculate_effective_fg."""
+    made = np.asarray(fgm, dtype=float) + (0.5 * np.asarray(fg3m, dtype=float))
+    return np.clip(_safe_ratio(made, fga), 0.0, 1.5)
+
+
+def calculate_in_game_usage_many(
+    fga: np.ndarray,
+    fta: np.ndarray,
+    tov: np.ndarray,
+    minutes: np.ndarray,
+    team_fga: np.ndarray,
+    team_fta: np.ndarray,
+    team_tov: np.ndarray,
+    elapsed_game_minutes: np.ndarray = 48.0
+) -> np.ndarray:
+    """
+    Vectorized calculate_in_game_usage.
+
+    Team totals and elapsed minutes are per-player arrays (each player's own
+    team / game), so one call covers every game of a pulse cycle.
+    
+    Returns:
+        Usage rate array as percentage (0-50 clamp, 0.0 where undefined)
+    """
+    minutes = np.asarray(minutes, dtype=float)
+    team_fga = np.asarray(team_fga, dtype=float)
+    player_usage = np.asarray(fga, dtype=float) + (0.44 * np.asarray(fta, dtype=float)) + tov
+    team_usage = team_fga + (0.44 * np.asarray(team_fta, dtype=float)) + team_tov
+    
+    share = _safe_ratio(player_usage, np.where(team_fga > 0, team_usage, 0.0))
+    usg = 100 * share * _safe_ratio(np.broadcast_to(elapsed_game_minutes, minutes.shape), minutes)
+    return np.clip(usg, 0.0, 50.0)
+
+
 def calculate_assist_rate(
     ast: float,
     minutes: float,
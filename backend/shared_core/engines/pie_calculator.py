@@ -8,6 +8,8 @@ This is the platform-agnostic core logic used by both Desktop and Mobile backend
 
 from typing import Dict, Optional
 
+import numpy as np
+
 
 def calculate_pie(
     stats: Dict[str, float],
@@ -158,6 +160,43 @@ def calculate_live_pie(
     return round(max(-0.5, min(1.0, pie)), 3)
 
 
+def calculate_live_pie_many(
+    pts: np.ndarray,
+    fgm: np.ndarray,
+    fga: np.ndarray,
+    ftm: np.ndarray,
+    fta: np.ndarray,
+    oreb: np.ndarray,
+    dreb: np.ndarray,
+    ast: np.ndarray,
+    stl: np.ndarray,
+    blk: np.ndarray,
+    pf: np.ndarray,
+    tov: np.ndarray,
+    game_total_estimate: float = 100.0
+) -> np.ndarray:
+    """
+    Vectorized calculate_live_pie over aligned per-player stat arrays.
+
+    Same formula, clamp and rounding as the scalar version; used by the
+    pulse producer to score every active player of a cycle in one pass.
+    
+    Returns:
+        Float array of PIE values, one per player
+    """
+    pie_numerator = (
+        np.asarray(pts, dtype=float) + fgm + ftm - fga - fta +
+        dreb + (0.5 * np.asarray(oreb, dtype=float)) +
+        ast + stl + (0.5 * np.asarray(blk, dtype=float)) -
+        pf - tov
+    )
+    
+    if game_total_estimate <= 0:
+        return np.zeros_like(pie_numerator)
+    
+    return np.round(np.clip(pie_numerator / game_total_estimate, -0.5, 1.0), 3)
+
+
 def _calculate_game_contribution(
     team_stats: Dict[str, float],
     opponent_stats: Dict[str, float]
@@ -0,0 +1,125 @@
+"""
+NBA Adapter Change-Detection Tests
+==================================
+Conditional GETs, body-hash dedup and the single-flight LRU in
+AsyncNBAApiAdapter. The CDN is replaced by a scripted _request_with_retry.
+"""
+
+import asyncio
+import json
+import unittest
+
+from shared_core.adapters.nba_api_adapter import AsyncNBAApiAdapter, _CacheEntry, _SingleFlightLRU
+
+
+SCOREBOARD = {"scoreboard": {"games": [{
+    "gameId": "0022500001", "gameStatus": 2,
+    "homeTeam": {"teamTricode": "LAL", "score": 50},
+    "awayTeam": {"teamTricode": "BOS", "score": 48},
+    "period": 3, "gameClock": "PT05M00.00S", "gameStatusText": "Q3 5:00",
+}]}}
+
+
+class _ScriptedAdapter(AsyncNBAApiAdapter):
+    """Adapter whose CDN responses come from a queue; records request headers."""
+
+    SCOREBOARD_CACHE_TTL = 0  # always revalidate
+
+    def __init__(self, responses):
+        super().__init__()
+        self._aiohttp_available = True
+        self.responses = list(responses)
+        self.sent_headers = []
+        self.normalize_calls = 0
+
+    async def _request_with_retry(self, url, headers=None):
+        self.sent_headers.append(headers or {})
+        await asyncio.sleep(0)
+        return self.responses.pop(0)
+
+    def normalize_scoreboard(self, raw_data):
+        self.normalize_calls += 1
+        return super().normalize_scoreboard(raw_data)
+
+
+def _ok(payload, etag=None):
+    headers = {"ETag": etag} if etag else {}
+    return 200, json.dumps(payload).encode(), headers
+
+
+class TestConditionalFetch(unittest.TestCase):
+
+    def test_not_modified_keeps_value_and_version(self):
+        adapter = _ScriptedAdapter([_ok(SCOREBOARD, etag='"v1"'), (304, b"", {})])
+
+        async def run():
+            first = await adapter.fetch_scoreboard_async()
+            v1 = adapter.content_version("scoreboard")
+            second = await adapter.fetch_scoreboard_async()
+            return first, v1, second
+
+        first, v1, second = asyncio.run(run())
+        self.assertIs(first, second)
+        self.assertEqual(adapter.content_version("scoreboard"), v1)
+        self.assertEqual(adapter.sent_headers[1].get("If-None-Match"), '"v1"')
+        self.assertEqual(adapter.normalize_calls, 1)
+        self.assertEqual(adapter.get_health()["not_modified_count"], 1)
+
+    def test_identical_body_skips_normalization(self):
+        adapter = _ScriptedAdapter([_ok(SCOREBOARD), _ok(SCOREBOARD)])
+
+        async def run():
+            await adapter.fetch_scoreboard_async()
+            await adapter.fetch_scoreboard_async()
+
+        asyncio.run(run())
+        self.assertEqual(adapter.normalize_calls, 1)
+        self.assertEqual(adapter.content_version("scoreboard"), 1)
+        self.assertEqual(adapter.get_health()["unchanged_body_count"], 1)
+
+    def test_changed_body_bumps_version(self):
+        changed = json.loads(json.dumps(SCOREBOARD))
+        changed["scoreboard"]["games"][0]["homeTeam"]["score"] = 52
+        adapter = _ScriptedAdapter([_ok(SCOREBOARD), _ok(changed)])
+
+        async def run():
+            await adapter.fetch_scoreboard_async()
+            return await adapter.fetch_scoreboard_async()
+
+        games = asyncio.run(run())
+        self.assertEqual(games[0].home_score, 52)
+        self.assertEqual(adapter.content_version("scoreboard"), 2)
+
+
+class TestSingleFlightLRU(unittest.TestCase):
+
+    def test_concurrent_misses_share_one_load(self):
+        cache = _SingleFlightLRU(maxsize=4)
+        calls = []
+
+        async def loader(prev):
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return _CacheEntry("value", 0.0)
+
+        async def run():
+            return await asyncio.gather(*(cache.load("k", loader) for _ in range(5)))
+
+        entries = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(e is entries[0] for e in entries))
+        self.assertEqual(cache.coalesced, 4)
+
+    def test_bounded_lru_eviction(self):
+        cache = _SingleFlightLRU(maxsize=2)
+        cache.put("a", _CacheEntry(1, 0.0))
+        cache.put("b", _CacheEntry(2, 0.0))
+        cache.get("a")                       # a is now most recent
+        cache.put("c", _CacheEntry(3, 0.0))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.evictions, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
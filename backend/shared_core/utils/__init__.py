@@ -11,11 +11,13 @@ from .game_status import (
     is_game_upcoming,
     GameStatus
 )
+from .season import season_for_date
 
 __all__ = [
     'normalize_game_status',
     'is_game_active',
     'is_game_completed',
     'is_game_upcoming',
-    'GameStatus'
+    'GameStatus',
+    'season_for_date'
 ]
@@ -0,0 +1,18 @@
+"""
+NBA Season Labels - Pure Function Utility
+=========================================
+Maps game dates to the season string used across stored game logs,
+shot summaries and H2H aggregates ('2025-26').
+"""
+
+from typing import Optional
+
+
+def season_for_date(game_date: str) -> Optional[str]:
+    """'2025-11-03' or '20251103' → '2025-26'. Seasons roll over in October."""
+    digits = "".join(ch for ch in str(game_date or "") if ch.isdigit())
+    if len(digits) < 6:
+        return None
+    year, month = int(digits[:4]), int(digits[4:6])
+    start = year if month >= 10 else year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
@@ -0,0 +1,166 @@
+"""
+Historical Backtest Tests
+=========================
+a) EMACalculator.prior_windows matches calculate() on every pre-game window
+b) Replays only see games logged before the target night
+c) The process pool returns exactly the in-process records; a sweep reuses EMA states
+d) Reports score MAE, Floor-Ceiling coverage, hit rate and grades; ledger rows score the same way
+e) scripts/run_backtest.py runs a grid sweep end to end and prints JSON reports
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import date
+
+import numpy as np
+import pytest
+
+# Ensure backend directory is in path
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'scripts'))
+
+from aegis.learning_ledger import LearningLedger
+from backtest import (
+    BacktestConfig,
+    ReplayRecord,
+    expand_grid,
+    records_from_ledger,
+    run_backtest,
+    summarize,
+)
+from benchmarks.fixtures import ROSTER, build_fixture_league
+from engines.ema_calculator import EMACalculator
+
+START, END = date(2024, 12, 20), date(2025, 1, 13)
+PLAYERS = [p['player_id'] for p in ROSTER[:4]]
+
+
+@pytest.fixture(scope="module")
+def league(tmp_path_factory):
+    return build_fixture_league(tmp_path_factory.mktemp("backtest"))
+
+
+def _run(league, configs, **kwargs):
+    kwargs.setdefault("players", PLAYERS)
+    kwargs.setdefault("workers", 1)
+    return run_backtest(league.db_path, configs, START, END, **kwargs)
+
+
+def _record(ev, actual, floor, ceiling, line, grade="B"):
+    stats = ('points', 'rebounds', 'assists')
+    return ReplayRecord(config="c", player_id="1", game_date="2025-01-01",
+                        floor=dict.fromkeys(stats, floor), ev=dict.fromkeys(stats, ev),
+                        ceiling=dict.fromkeys(stats, ceiling), actual=dict.fromkeys(stats, actual),
+                        line=dict.fromkeys(stats, line), nominal_coverage=0.6,
+                        confluence_score=75.0, confluence_grade=grade)
+
+
+def test_prior_windows_match_calculate():
+    rng = np.random.default_rng(5)
+    values = rng.integers(0, 40, 40).astype(float)
+    for alpha in (0.1, 0.15, 0.3):
+        calculator = EMACalculator(alpha=alpha)
+        for lookback in (1, 5, 15):
+            ema, std = calculator.prior_windows(values, lookback)
+            assert len(ema) == len(values) + 1 and np.isnan(ema[0])
+            for i in range(1, len(values) + 1):
+                window = values[max(0, i - lookback):i]
+                expected = calculator.calculate([{'pts': v} for v in reversed(window)])
+                assert round(float(ema[i]), 2) == expected['points_ema']
+                assert round(float(std[i]), 2) == expected['points_std']
+    assert len(EMACalculator().prior_windows(np.array([]), 15)[0]) == 1
+
+
+def test_replay_uses_only_prior_games(league):
+    config = BacktestConfig(n_simulations=300)
+    before = _run(league, [config]).records["baseline"]
+    assert before and all(START.isoformat() <= r.game_date <= END.isoformat() for r in before)
+
+    # Rewrite everything from 2025-01-05 on: earlier replays must not move
+    cutoff = "2025-01-05"
+    with sqlite3.connect(league.db_path) as conn:
+        conn.execute("UPDATE player_game_logs SET points = points + 30 WHERE game_date >= ?", (cutoff,))
+    try:
+        after = _run(league, [config]).records["baseline"]
+    finally:
+        with sqlite3.connect(league.db_path) as conn:
+            conn.execute("UPDATE player_game_logs SET points = points - 30 WHERE game_date >= ?", (cutoff,))
+
+    early = [(r.player_id, r.game_date, r.ev, r.floor) for r in before if r.game_date < cutoff]
+    assert early == [(r.player_id, r.game_date, r.ev, r.floor) for r in after if r.game_date < cutoff]
+    moved = [(a.actual['points'] - b.actual['points']) for a, b in zip(after, before) if a.game_date == cutoff]
+    assert moved and set(moved) == {30.0}
+
+
+def test_pool_matches_in_process_and_shares_ema_states(league):
+    configs = expand_grid(BacktestConfig(n_simulations=200),
+                          {"ema_alpha": [0.1, 0.2], "n_simulations": [200, 400]})
+    assert [c.name for c in configs] == ["ema_alpha=0.1,n_simulations=200", "ema_alpha=0.1,n_simulations=400",
+                                         "ema_alpha=0.2,n_simulations=200", "ema_alpha=0.2,n_simulations=400"]
+
+    serial = _run(league, configs)
+    pooled = _run(league, configs, workers=2)
+
+    assert pooled.workers == 2 and serial.workers == 1
+    assert pooled.records == serial.records
+    assert (serial.ema_misses, serial.ema_hits) == (2 * len(PLAYERS), 2 * len(PLAYERS))   # one per alpha
+    assert serial.records[configs[0].name] != serial.records[configs[2].name]
+    with pytest.raises(ValueError):
+        _run(league, [BacktestConfig(), BacktestConfig()])
+
+
+def test_report_metrics_and_ledger_rows(tmp_path):
+    records = [
+        _record(ev=20.0, actual=24, floor=15.0, ceiling=25.0, line=18.5, grade="A"),   # inside, over hit
+        _record(ev=20.0, actual=30, floor=15.0, ceiling=25.0, line=21.5, grade="A"),   # above, under miss
+        _record(ev=10.0, actual=4, floor=6.0, ceiling=14.0, line=10.5, grade="C"),     # below, under hit
+        _record(ev=10.0, actual=10, floor=6.0, ceiling=14.0, line=9.5, grade="C"),     # inside, over hit
+    ]
+    report = summarize("c", records)
+
+    assert report.projections == 4
+    assert report.mae["points"] == round((4 + 10 + 6 + 0) / 4, 4)
+    assert (report.coverage["points"], report.below_floor["points"], report.above_ceiling["points"]) == \
+        (0.5, 0.25, 0.25)
+    assert report.hit_rate["points"] == 0.75
+    assert report.calibration_gap["points"] == round(0.5 - 0.6, 4)
+    assert report.by_grade == {"A": {"projections": 2, "points_mae": 7.0, "points_coverage": 0.5},
+                               "C": {"projections": 2, "points_mae": 3.0, "points_coverage": 0.5}}
+
+    ledger = LearningLedger(db_path=tmp_path / "ledger.db")
+    for pid, (floor, ev, ceiling), actual in (("1", (15.0, 20.0, 25.0), 24), ("2", (6.0, 10.0, 14.0), 4),
+                                             ("3", (6.0, 10.0, 14.0), None)):
+        ledger.record_projection(pid, "BOS", START, {"floor": {"points": floor}, "ev": {"points": ev},
+                                                     "ceiling": {"points": ceiling}}, confluence_score=72.0)
+        if actual is not None:
+            ledger.update_actuals(pid, START, {"points": actual})
+    rows = ledger.get_audited_between(START, END)
+    production = summarize("ledger", records_from_ledger(rows))
+
+    assert production.projections == 2 and production.mae["points"] == 5.0
+    assert production.coverage["points"] == 0.5 and production.hit_rate["points"] is None
+    assert production.mae["rebounds"] is None and production.by_grade["B"]["projections"] == 2
+
+
+def test_cli_grid_sweep_json(league, capsys):
+    import run_backtest as cli
+
+    code = cli.main(["--db", str(league.db_path), "--start", START.isoformat(), "--end", END.isoformat(),
+                     "--players", *PLAYERS[:2], "--sims", "200", "--workers", "1", "--json",
+                     "--grid", "lookback=10,15", "--grid", "confluence_weights=0.4/0.3/0.3,0.2/0.3/0.5"])
+    out = json.loads(capsys.readouterr().out)
+
+    assert code == 0 and out["players"] == 2
+    names = [r["config"] for r in out["reports"]]
+    assert names == ["lookback=10,confluence_weights=0.4/0.3/0.3", "lookback=10,confluence_weights=0.2/0.3/0.5",
+                     "lookback=15,confluence_weights=0.4/0.3/0.3", "lookback=15,confluence_weights=0.2/0.3/0.5"]
+    assert out["configs"][names[1]]["confluence_weights"] == {
+        "model_agreement": 0.2, "sample_size": 0.3, "historical_accuracy": 0.5}
+    first, reweighted = out["reports"][0], out["reports"][1]
+    assert first["mae"] == reweighted["mae"]                   # weights only move the grades
+    assert 0 < first["coverage"]["points"] < 1 and first["nominal_coverage"] >= 0.5
+    with pytest.raises(SystemExit):
+        cli.main(["--db", str(league.db_path), "--grid", "bogus=1"])
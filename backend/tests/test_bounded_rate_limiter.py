@@ -0,0 +1,161 @@
+"""
+Bounded-Memory Rate Limiter Tests
+==================================
+a) GCRA admits a burst of `limit`, then one request per period/limit; remaining/retry_after
+b) The key store never exceeds max_keys; LRU eviction and expired sweeps are counted
+c) RateLimiterMiddleware: 429 with Retry-After, per-bucket limits, purge via _MEMORY_BUCKETS.clear()
+d) Inquisitor _rate_limited: one store per fingerprint per 60s, RED never limited, bounded table
+e) AdaptiveSampler forced sampling expires and is capped
+"""
+
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vanguard.utils.rate_limit import BoundedRateLimiter
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_gcra_burst_and_refill():
+    clock = _Clock()
+    limiter = BoundedRateLimiter(limit=5, period=10, clock=clock)
+
+    decisions = [limiter.check("ip") for _ in range(6)]
+    assert [d.allowed for d in decisions] == [True] * 5 + [False]
+    assert [d.remaining for d in decisions[:5]] == [4, 3, 2, 1, 0]
+    assert decisions[5].retry_after == pytest.approx(2.0)
+
+    # One request refills every period / limit seconds
+    clock.now += 2.0
+    assert limiter.check("ip").allowed and not limiter.check("ip").allowed
+    clock.now += 10.0
+    assert limiter.check("ip").remaining == 4
+    assert (limiter.stats["allowed"], limiter.stats["suppressed"]) == (7, 2)
+
+    # Per-call overrides and the side-effect-free probe
+    assert [limiter.check("ai", 2, 60).allowed for _ in range(3)] == [True, True, False]
+    assert limiter.is_limited("ai") and not limiter.is_limited("unknown")
+
+
+def test_store_is_bounded():
+    clock = _Clock()
+    limiter = BoundedRateLimiter(limit=1, period=60, max_keys=100, clock=clock)
+
+    for i in range(1000):
+        limiter.check(f"ip-{i}")
+    assert len(limiter) == 100
+    assert limiter.stats["evictions"] == limiter.stats["evicted_active"] == 900
+    assert "ip-999" in limiter and "ip-0" not in limiter
+
+    # A key that keeps being seen stays hot while newcomers churn the cold end
+    limiter.clear()
+    limiter.check("hot")
+    for i in range(500):
+        clock.now += 0.01
+        limiter.check(f"scan-{i}")
+        assert not limiter.check("hot").allowed
+    assert len(limiter) == 100
+
+    # Expired keys are swept as new keys arrive, before anything live is evicted
+    clock.now += 61
+    evictions = limiter.stats["evictions"]
+    for i in range(60):
+        limiter.check(f"late-{i}")
+    assert limiter.stats["evictions"] == evictions
+    assert limiter.stats["expired"] >= 60 and limiter.active_keys() == 60
+
+
+def test_middleware_limits_and_purge():
+    from vanguard.middleware import rate_limiter
+    from vanguard.middleware.rate_limiter import _MEMORY_BUCKETS, RateLimiterMiddleware
+
+    app = FastAPI()
+    app.add_middleware(RateLimiterMiddleware)
+
+    @app.get("/api/test")
+    async def public():
+        return {"ok": True}
+
+    @app.get("/ai/insight")
+    async def ai():
+        return {"ok": True}
+
+    @app.get("/healthz")
+    async def healthz():
+        return {"ok": True}
+
+    _MEMORY_BUCKETS.clear()
+    client = TestClient(app)
+    limit, window = rate_limiter._LIMITS["ai"]
+    responses = [client.get("/ai/insight") for _ in range(limit + 1)]
+    assert [r.status_code for r in responses] == [200] * limit + [429]
+    assert responses[0].headers["X-RateLimit-Remaining"] == str(limit - 1)
+    assert responses[0].headers["X-RateLimit-Bucket"] == "ai"
+    assert 1 <= int(responses[-1].headers["Retry-After"]) <= window // limit
+
+    # Buckets are independent, bypass paths never touch the store
+    assert client.get("/api/test").headers["X-RateLimit-Remaining"] == str(rate_limiter._LIMITS["public"][0] - 1)
+    assert all(client.get("/healthz").status_code == 200 for _ in range(100))
+    assert len(_MEMORY_BUCKETS) == 2
+
+    # /admin/cache/purge contract: len() then clear()
+    _MEMORY_BUCKETS.clear()
+    assert len(_MEMORY_BUCKETS) == 0 and client.get("/ai/insight").status_code == 200
+    _MEMORY_BUCKETS.clear()
+
+
+def test_inquisitor_fingerprint_throttle(monkeypatch):
+    from vanguard.inquisitor import middleware
+
+    clock = _Clock()
+    limiter = BoundedRateLimiter(limit=1, period=middleware._RATE_LIMIT_SECONDS, max_keys=50, clock=clock)
+    monkeypatch.setattr(middleware, "_fingerprint_limiter", limiter)
+
+    assert middleware._rate_limited("fp-a") is False
+    assert middleware._rate_limited("fp-a") is True
+    assert middleware._rate_limited("fp-a", severity="AMBER") is True
+    assert middleware._rate_limited("fp-a", severity="RED") is False
+    clock.now += 59.9
+    assert middleware._rate_limited("fp-a") is True
+    clock.now += 0.1
+    assert middleware._rate_limited("fp-a") is False
+
+    for i in range(200):
+        middleware._rate_limited(f"flood-{i}")
+    assert len(limiter) == 50
+    assert limiter.get_stats()["evictions"] == 151 and limiter.stats["suppressed"] == 3
+
+
+def test_sampler_forced_endpoints_expire_and_are_capped(monkeypatch):
+    from vanguard.inquisitor import sampler as sampler_module
+
+    clock = _Clock()
+    monkeypatch.setattr(sampler_module.time, "monotonic", clock)
+    monkeypatch.setattr(sampler_module, "_MAX_FORCED_ENDPOINTS", 10)
+    sampler = sampler_module.AdaptiveSampler()
+    sampler.current_rate = 0.0
+
+    sampler.force_sampling("/players/1", rate=1.0, duration_sec=300)
+    assert sampler.should_sample("/players/1") and not sampler.should_sample("/players/2")
+    clock.now += 301
+    assert not sampler.should_sample("/players/1")
+    assert "/players/1" not in sampler.forced_endpoints
+
+    for i in range(25):
+        sampler.force_sampling(f"/players/{i}", duration_sec=300)
+    assert len(sampler.forced_endpoints) == 10
+    assert sampler.get_stats()["forced_evictions"] == 15
+    assert sampler.should_sample("/players/24") and not sampler.should_sample("/players/0")
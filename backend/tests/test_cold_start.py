@@ -0,0 +1,213 @@
+"""
+Cold Start Tests
+================
+a) `import main` stays under the import-time budget and pulls in none of the heavy stacks
+b) Deferred routers import on the first request under their paths; eager ones are there at once
+c) Route precedence matches eager registration no matter which router loads first
+d) Unmatched paths load whatever is pending before 404ing; broken routers are recorded, not fatal
+e) Warm-up starts services, flips /readyz from "serving" to "warm" and stops services in reverse
+f) /status and /health never import the pulse producer; they report it once warm-up has
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Ensure backend directory is in path
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.warmup import AppWarmup, LazyRouter, WarmService
+
+# Cumulative `import main` budget; fastapi alone is ~0.6s on a dev laptop
+IMPORT_BUDGET_MS = float(os.getenv("QS_IMPORT_BUDGET_MS", "3000"))
+
+# Must stay off the startup path - each costs hundreds of ms to seconds
+HEAVY_MODULES = [
+    "pandas", "sklearn", "firebase_admin", "google.genai", "google.generativeai",
+    "api.public_routes", "services.async_pulse_producer_cloud", "vanguard.ai",
+]
+
+
+def _importtime(module):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cum, name = line.split("|")
+            if cum.strip().isdigit():
+                cumulative[name.strip()] = int(cum) / 1000
+    return cumulative
+
+
+def _write_router(tmp_path, name, body):
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(f"""
+        from fastapi import APIRouter
+        router = APIRouter()
+    """) + textwrap.dedent(body), encoding="utf-8")
+
+
+def _fake_app(tmp_path, monkeypatch, specs, services=()):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    app = FastAPI()
+    warmup = AppWarmup(specs, services).install(app)
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    return app, warmup
+
+
+def test_import_main_budget():
+    cumulative = _importtime("main")
+    assert cumulative["main"] <= IMPORT_BUDGET_MS, \
+        f"import main took {cumulative['main']:.0f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)"
+    loaded_heavy = [m for m in HEAVY_MODULES if m in cumulative]
+    assert loaded_heavy == [], f"startup imports heavy modules: {loaded_heavy}"
+    assert "api.live_stream_routes" in cumulative           # startup-critical stays eager
+
+
+def test_deferred_router_loads_on_first_request(tmp_path, monkeypatch):
+    _write_router(tmp_path, "cs_eager_routes", """
+        @router.get("/live/status")
+        async def live():
+            return {"live": True}
+    """)
+    _write_router(tmp_path, "cs_lazy_routes", """
+        @router.get("/teams/{abbr}")
+        async def team(abbr: str):
+            return {"team": abbr}
+    """)
+    app, warmup = _fake_app(tmp_path, monkeypatch, [
+        LazyRouter("cs_eager_routes", name="live", eager=True),
+        LazyRouter("cs_lazy_routes", name="teams", paths=("/teams",)),
+    ])
+    assert "/live/status" in [r.path for r in app.routes]
+    assert "cs_lazy_routes" not in sys.modules and [s.key for s in warmup.pending] == ["teams"]
+
+    client = TestClient(app)
+    assert client.get("/health").json() == {"ok": True}
+    assert "cs_lazy_routes" not in sys.modules                # unrelated paths don't load it
+    assert client.get("/teams/BOS").json() == {"team": "BOS"}
+    assert warmup.is_loaded("teams") and warmup.pending == []
+
+
+def test_route_precedence_is_registration_order(tmp_path, monkeypatch):
+    _write_router(tmp_path, "cs_first_routes", """
+        @router.get("/players/{pid}")
+        async def first(pid: str):
+            return {"owner": "first"}
+    """)
+    _write_router(tmp_path, "cs_second_routes", """
+        @router.get("/players/{pid}")
+        async def second(pid: str):
+            return {"owner": "second"}
+
+        @router.get("/data")
+        async def data():
+            return {"owner": "second"}
+    """)
+    app, warmup = _fake_app(tmp_path, monkeypatch, [
+        LazyRouter("cs_first_routes", name="first", paths=("/players",)),
+        LazyRouter("cs_second_routes", name="second", paths=("/players", "/data")),
+    ])
+    client = TestClient(app)
+    assert client.get("/data").json() == {"owner": "second"}  # second loads first...
+    assert warmup.pending[0].key == "first"
+    assert client.get("/players/1").json() == {"owner": "first"}   # ...but first still wins
+    assert [r.path for r in app.routes][-1] == "/health"      # app's own routes stay last
+
+
+def test_unmatched_path_loads_pending_and_failures_are_recorded(tmp_path, monkeypatch):
+    _write_router(tmp_path, "cs_unhinted_routes", """
+        @router.get("/explain/{pid}")
+        async def explain(pid: str):
+            return {"pid": pid}
+    """)
+    app, warmup = _fake_app(tmp_path, monkeypatch, [
+        LazyRouter("cs_missing_routes", name="missing", paths=("/gone",)),
+        LazyRouter("cs_unhinted_routes", name="unhinted"),
+    ])
+    client = TestClient(app)
+    assert client.get("/explain/7").json() == {"pid": "7"}    # no hint: found via the miss fallback
+    assert "ModuleNotFoundError" in warmup.failed["missing"]
+    assert client.get("/gone").status_code == 404
+    assert client.get("/nowhere").status_code == 404
+
+
+def test_warmup_services_and_readiness(tmp_path, monkeypatch):
+    _write_router(tmp_path, "cs_warm_routes", """
+        @router.get("/nexus/ping")
+        async def ping():
+            return "pong"
+    """)
+    events = []
+
+    def service(name, fail=False):
+        async def start():
+            if fail:
+                raise RuntimeError("no credentials")
+            events.append(f"start {name}")
+
+        async def stop():
+            events.append(f"stop {name}")
+        return WarmService(name, start, stop)
+
+    _, warmup = _fake_app(tmp_path, monkeypatch, [LazyRouter("cs_warm_routes", name="nexus", paths=("/nexus",))],
+                          [service("producer"), service("poller", fail=True), service("poller2")])
+    status = warmup.status()
+    assert status["status"] == "serving" and status["routers"]["pending"] == ["nexus"]
+
+    async def lifecycle():
+        await warmup.start()
+        snapshot = warmup.status()
+        await warmup.shutdown()
+        return snapshot
+
+    status = asyncio.run(lifecycle())
+    assert status["status"] == "warm" and status["warm"] and "nexus" in status["routers"]["loaded"]
+    assert status["services"]["poller"] == "failed: no credentials"
+    assert events == ["start producer", "start poller2", "stop poller2", "stop producer"]
+
+    import main
+    body = TestClient(main.app).get("/readyz").json()
+    assert {"warm", "routers", "services"} <= set(body)
+
+
+def test_status_probes_never_import_producer(monkeypatch):
+    script = textwrap.dedent("""
+        import sys
+        from fastapi.testclient import TestClient
+        import main
+        body = TestClient(main.app).get("/status").json()
+        assert body["status"] == "not_loaded", body
+        assert main._producer_module() is None
+        assert main.PRODUCER_MODULE not in sys.modules
+    """)
+    proc = subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR,
+                          capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    import types
+    import main
+
+    class _Producer:
+        def get_status(self):
+            return {"running": True}
+
+    fake = types.SimpleNamespace(get_cloud_producer=_Producer)
+    monkeypatch.setitem(sys.modules, main.PRODUCER_MODULE, fake)
+    monkeypatch.setattr(main._PRODUCER_SERVICE, "state", "pending")
+    assert main._producer_module() is None                    # mid-import: not reported yet
+    monkeypatch.setattr(main._PRODUCER_SERVICE, "state", "running")
+    assert TestClient(main.app).get("/status").json() == {"running": True}
@@ -0,0 +1,170 @@
+"""
+Streaming Drift Histogram Tests
+================================
+a) PSI / KL / KS from bin counts match a brute-force pass over the raw window
+b) Windows keep exactly the last WINDOW_SIZE values; memory does not grow with volume
+c) Predictions recorded before a reference are replayed; a new reference re-bins the window
+d) check_all_drift scores every model in one pass and agrees with check_drift
+e) Prediction-confidence drift, recommendations and insufficient-data reports
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vanguard.ml.drift_detector import BUCKETS, DriftDetector
+
+FEATURES = ["occurrence_count", "hour", "endpoint_depth"]
+
+
+def _reference(rng, n=2000):
+    return {
+        "occurrence_count": rng.poisson(4, n).tolist(),
+        "hour": rng.integers(0, 24, n).tolist(),
+        "endpoint_depth": rng.normal(3, 1, n).tolist(),
+    }
+
+
+def _stream(rng, n, shift=0.0):
+    return [
+        {"occurrence_count": float(rng.poisson(4 + 4 * shift)), "hour": float(rng.integers(0, 24)),
+         "endpoint_depth": float(rng.normal(3 + shift, 1))}
+        for _ in range(n)
+    ]
+
+
+def _brute_force(reference, current):
+    """The old re-bucketing PSI, with open-ended outer bins, plus KL and KS."""
+    reference, current = np.asarray(reference, float), np.asarray(current, float)
+    breakpoints = np.unique(np.percentile(reference, np.linspace(0, 100, BUCKETS + 1)))
+    clipped = np.clip(current, breakpoints[0], breakpoints[-1])
+    ref_hist, _ = np.histogram(reference, bins=breakpoints)
+    cur_hist, _ = np.histogram(clipped, bins=breakpoints)
+    ref_pct = (ref_hist + 1) / (len(reference) + len(breakpoints))
+    cur_pct = (cur_hist + 1) / (len(current) + len(breakpoints))
+    return {
+        "psi": float(np.sum((cur_pct - ref_pct) * np.log(cur_pct / ref_pct))),
+        "kl": float(np.sum(cur_pct * np.log(cur_pct / ref_pct))),
+        "ks": float(np.max(np.abs(np.cumsum(cur_hist) / len(current) - np.cumsum(ref_hist) / len(reference)))),
+    }
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(9)
+
+
+def test_stats_match_brute_force(rng):
+    detector = DriftDetector()
+    reference = _reference(rng)
+    detector.set_reference_distribution("incident_classifier", reference)
+    stream = _stream(rng, 1300, shift=0.6)
+    for features in stream:
+        detector.record_prediction("incident_classifier", features, None)
+
+    report = detector.check_drift("incident_classifier")
+    window = stream[-DriftDetector.WINDOW_SIZE:]
+    for name in FEATURES:
+        expected = _brute_force(reference[name], [f[name] for f in window])
+        for stat in ("psi", "kl", "ks"):
+            assert report["feature_stats"][name][stat] == round(expected[stat], 4)
+        assert report["feature_drift"][name] == round(expected["psi"], 4)
+    assert report["overall_drift_score"] == round(np.mean([_brute_force(reference[n], [f[n] for f in window])["psi"]
+                                                           for n in FEATURES]), 4)
+
+
+def test_window_is_bounded(rng):
+    detector = DriftDetector()
+    detector.set_reference_distribution("aegis_predictor", _reference(rng))
+    for features in _stream(rng, 600):
+        detector.record_prediction("aegis_predictor", features, None)
+    memory = detector.get_stats()["memory_bytes"]
+
+    stream = _stream(rng, 3000)
+    for features in stream:
+        detector.record_prediction("aegis_predictor", features, None)
+
+    assert detector.get_stats()["memory_bytes"] == memory
+    assert (detector._cur_counts.sum(axis=1) == DriftDetector.WINDOW_SIZE).all()
+    # Counts track exactly the last WINDOW_SIZE values, nothing older
+    row = detector._rows[("aegis_predictor", "hour")]
+    last = np.array([f["hour"] for f in stream[-DriftDetector.WINDOW_SIZE:]])
+    expected = np.bincount(detector._bins(np.full(len(last), row), last), minlength=BUCKETS)
+    assert detector._cur_counts[row].tolist() == expected.tolist()
+
+
+def test_pending_replay_and_rebin(rng):
+    stream = _stream(rng, 800, shift=0.6)
+    early = DriftDetector()
+    for features in stream:
+        early.record_prediction("m", features, None)
+    assert early.get_stats()["pending_predictions"] == DriftDetector.WINDOW_SIZE
+    assert early.check_drift("m")["recommendation"] == "insufficient_data"
+
+    reference = _reference(rng)
+    early.set_reference_distribution("m", reference)
+    late = DriftDetector()
+    late.set_reference_distribution("m", reference)
+    for features in stream:
+        late.record_prediction("m", features, None)
+    assert early.get_stats()["pending_predictions"] == 0
+    assert early.check_drift("m")["feature_stats"] == late.check_drift("m")["feature_stats"]
+
+    # New reference: current windows are re-counted against the new edges
+    shifted = {name: (np.asarray(vals) + 0.6 * (name != "hour")).tolist() for name, vals in reference.items()}
+    late.set_reference_distribution("m", shifted)
+    assert len(late._n_bins) == len(FEATURES)
+    window = stream[-DriftDetector.WINDOW_SIZE:]
+    for name in FEATURES:
+        expected = _brute_force(shifted[name], [f[name] for f in window])["psi"]
+        assert late.check_drift("m")["feature_drift"][name] == round(expected, 4)
+
+
+def test_check_all_drift_matches_per_model(rng):
+    detector = DriftDetector()
+    for i, shift in enumerate((0.0, 0.4, 1.5)):
+        detector.set_reference_distribution(f"model_{i}", _reference(rng))
+        for features in _stream(rng, 700, shift=shift):
+            detector.record_prediction(f"model_{i}", features, None)
+
+    everything = detector.check_all_drift()
+    assert sorted(everything) == ["model_0", "model_1", "model_2"]
+    for name, report in everything.items():
+        single = detector.check_drift(name)
+        assert {k: v for k, v in single.items() if k != "checked_at"} == \
+            {k: v for k, v in report.items() if k != "checked_at"}
+
+    assert [everything[f"model_{i}"]["recommendation"] for i in range(3)] == \
+        ["none", "investigate", "retrain_immediately"]
+    assert detector.get_all_drift_scores() == {m: r["overall_drift_score"] for m, r in everything.items()}
+
+
+def test_prediction_drift_and_sparse_models(rng):
+    detector = DriftDetector()
+    confidences = rng.uniform(0.6, 1.0, 1000)
+    detector.set_reference_distribution("m", _reference(rng), prediction_confidences=confidences.tolist())
+    recent = rng.uniform(0.3, 0.7, 400)
+    for features, confidence in zip(_stream(rng, 400), recent):
+        detector.record_prediction("m", features, "GREEN", confidence)
+
+    report = detector.check_drift("m")
+    assert report["prediction_drift_psi"] == round(_brute_force(confidences, recent)["psi"], 4)
+    assert "__confidence__" not in report["feature_drift"]
+
+    # Fewer than 10 samples: not scored; unknown model: insufficient data
+    sparse = DriftDetector()
+    sparse.set_reference_distribution("m", _reference(rng))
+    for features in _stream(rng, 9):
+        sparse.record_prediction("m", features, None)
+    assert sparse.check_drift("m")["feature_drift"] == {}
+    assert sparse.check_drift("unknown")["recommendation"] == "insufficient_data"
+    # Constant reference feature has a single bin: never reported as drift
+    sparse.set_reference_distribution("flat", {"x": [1.0] * 50})
+    for _ in range(20):
+        sparse.record_prediction("flat", {"x": 9.0}, None)
+    assert sparse.check_drift("flat")["feature_drift"] == {"x": 0.0}
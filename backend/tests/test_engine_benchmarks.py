@@ -0,0 +1,101 @@
+"""
+Engine Benchmark Tests
+======================
+a) measure() reports p50 <= p99, throughput in case units and traced peak memory
+b) Fixed seeds make fixtures and engine fingerprints reproducible run to run
+c) compare() flags latency / throughput / memory regressions and output drift
+d) Baselines are stored per profile and round-trip through JSON
+e) Every engine case runs end to end against the fixture league
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.cases import CASES, build_cases
+from benchmarks.fixtures import ROSTER, build_fixture_league, game_logs, league_singletons
+from benchmarks.harness import BenchCase, BenchResult, compare, load_baseline, measure, run_cases, save_baseline
+
+
+def _result(name="vertex_mc", **overrides):
+    values = dict(name=name, iterations=10, units=1000, unit="sims", p50_ms=10.0, p99_ms=12.0,
+                  mean_ms=10.0, throughput=100_000.0, peak_kb=1000.0, fingerprint=25.5)
+    values.update(overrides)
+    return BenchResult(**values)
+
+
+def test_measure_latency_throughput_memory():
+    def run(seed):
+        buf = np.ones(1_000_000)            # ~7.6 MB, visible to tracemalloc
+        time.sleep(0.002)
+        return float(buf.sum())
+
+    result = measure(BenchCase("alloc", run, units=500, unit="sims", iterations=5))
+    assert result.iterations == 5 and result.fingerprint == 1_000_000.0
+    assert 2.0 <= result.p50_ms <= result.p99_ms
+    assert abs(result.throughput - 500 / (result.mean_ms / 1000)) / result.throughput < 1e-3
+    assert result.peak_kb >= 7500
+
+
+def test_fixed_seeds_are_reproducible(tmp_path):
+    case = BenchCase("draw", lambda seed: float(np.random.normal(size=100).sum()), iterations=3)
+    assert measure(case, seed=7).fingerprint == measure(case, seed=7).fingerprint
+    assert measure(case, seed=7).fingerprint != measure(case, seed=8).fingerprint
+
+    assert game_logs(ROSTER[0]) == game_logs(ROSTER[0])
+    first = build_fixture_league(tmp_path / "a")
+    second = build_fixture_league(tmp_path / "b")
+    assert first.logs == second.logs
+    assert (first.data_dir / "players" / f"{ROSTER[0]['player_id']}_games.csv").exists()
+
+
+def test_compare_flags_regressions_and_drift():
+    baseline = {"profiles": {"full": {"cases": {"vertex_mc": _result().to_dict(), "ema": _result("ema").to_dict()}}}}
+
+    same = compare([_result(p50_ms=11.0), _result("ema")], baseline, "full")
+    assert same.ok and not same.improvements
+
+    slow = compare([_result(p50_ms=14.0, p99_ms=17.0, mean_ms=14.0, throughput=70_000.0, peak_kb=1300.0),
+                    _result("ema", fingerprint=26.0), _result("deep_mc")], baseline, "full", tolerance=0.25)
+    assert sorted(r.metric for r in slow.regressions) == ["p50_ms", "peak_kb", "throughput"]   # p99 gets 2x
+    assert [(d.name, d.metric) for d in slow.drift] == [("ema", "fingerprint")]
+    assert slow.new_cases == ["deep_mc"] and not slow.ok
+
+    fast = compare([_result(p50_ms=5.0, throughput=200_000.0)], baseline, "full")
+    assert fast.ok and {r.metric for r in fast.improvements} == {"p50_ms", "throughput"}
+    assert compare([_result(units=5000, fingerprint=1.0)], baseline, "full").drift == []   # resized: not drift
+    assert compare([_result()], baseline, "quick").new_cases == ["vertex_mc"]
+
+
+def test_baseline_round_trip(tmp_path):
+    path = tmp_path / "baselines.json"
+    assert load_baseline(path) == {}
+
+    save_baseline(path, [_result()], "quick", seed=42)
+    saved = save_baseline(path, [_result("ema")], "full", seed=42, existing=load_baseline(path))
+    assert load_baseline(path) == saved
+    assert set(saved["profiles"]) == {"quick", "full"}
+    assert saved["profiles"]["quick"]["cases"]["vertex_mc"]["p50_ms"] == 10.0
+    assert saved["profiles"]["full"]["environment"]["numpy"] == np.__version__
+
+    updated = save_baseline(path, [_result(p50_ms=9.0)], "quick", seed=42, existing=saved)
+    assert updated["profiles"]["quick"]["cases"]["vertex_mc"]["p50_ms"] == 9.0
+    assert not path.with_suffix(".tmp").exists()
+
+
+def test_engine_cases_run_on_fixture_league(tmp_path):
+    league = build_fixture_league(tmp_path)
+    with league_singletons(league.db_path):
+        cases = build_cases(league, "quick")
+        results = run_cases(cases, iterations=1, trace_memory=False)
+    assert [r.name for r in results] == list(CASES)
+    by_name = {r.name: r for r in results}
+    assert all(r.fingerprint > 0 and r.throughput > 0 for r in results)
+    assert by_name["ema"].units == by_name["confluence"].units == len(ROSTER)
+    assert by_name["orchestrator"].unit == "sims" and by_name["orchestrator"].units == 10_000
+    assert (tmp_path / "learning_ledger.db").exists()
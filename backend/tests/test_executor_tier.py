@@ -0,0 +1,131 @@
+"""
+Executor Tier Tests
+===================
+Uses asyncio.run() directly — no pytest-asyncio dependency required.
+
+a) Blocking work runs off the loop (heartbeat keeps ticking)
+b) Per-route concurrency cap is enforced
+c) Saturated route raises ExecutorSaturated and counts the rejection
+d) Failures are counted and re-raised
+e) LoopStallWatchdog records a stall with the blocking stack
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import executor_tier
+from services.executor_tier import ExecutorTier, ExecutorSaturated, LoopStallWatchdog
+
+
+def test_blocking_work_does_not_stall_loop():
+    async def _test():
+        tier = ExecutorTier(cpu_workers=2, io_workers=2)
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        hb = asyncio.create_task(heartbeat())
+        result = await tier.run("io", lambda: (time.sleep(0.2), "done")[1], route="t")
+        hb.cancel()
+        tier.shutdown()
+        return result, ticks
+
+    result, ticks = asyncio.run(_test())
+    assert result == "done"
+    assert ticks >= 10
+
+
+def test_route_concurrency_cap(monkeypatch):
+    monkeypatch.setitem(executor_tier.ROUTE_LIMITS, "capped", 2)
+    peak = 0
+    active = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal peak, active
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    async def _test():
+        tier = ExecutorTier(cpu_workers=8, io_workers=8)
+        await asyncio.gather(*(tier.run("cpu", work, route="capped") for _ in range(8)))
+        stats = tier.stats()["routes"]["cpu:capped"]
+        tier.shutdown()
+        return stats
+
+    stats = asyncio.run(_test())
+    assert peak == 2
+    assert stats["completed"] == 8
+    assert stats["queued"] == 0 and stats["active"] == 0
+
+
+def test_saturated_route_rejects(monkeypatch):
+    monkeypatch.setitem(executor_tier.ROUTE_LIMITS, "tiny", 1)
+    monkeypatch.setattr(executor_tier, "DEFAULT_MAX_QUEUED", 1)
+
+    async def _test():
+        tier = ExecutorTier(cpu_workers=1, io_workers=1)
+        results = await asyncio.gather(
+            *(tier.run("io", time.sleep, 0.05, route="tiny") for _ in range(4)),
+            return_exceptions=True,
+        )
+        stats = tier.stats()["routes"]["io:tiny"]
+        tier.shutdown()
+        return results, stats
+
+    results, stats = asyncio.run(_test())
+    rejected = [r for r in results if isinstance(r, ExecutorSaturated)]
+    assert len(rejected) == 2
+    assert stats["rejected"] == 2
+    assert stats["completed"] == 2
+
+
+def test_failures_are_counted():
+    def boom():
+        raise ValueError("engine exploded")
+
+    async def _test():
+        tier = ExecutorTier(cpu_workers=1, io_workers=1)
+        with pytest.raises(ValueError):
+            await tier.run("cpu", boom, route="fails")
+        stats = tier.stats()["routes"]["cpu:fails"]
+        tier.shutdown()
+        return stats
+
+    stats = asyncio.run(_test())
+    assert stats["failed"] == 1
+    assert stats["active"] == 0
+
+
+def test_watchdog_captures_blocking_stack():
+    def blocking_handler():
+        time.sleep(0.3)
+
+    async def _test():
+        dog = LoopStallWatchdog(threshold_ms=100, interval=0.01)
+        dog.start()
+        await asyncio.sleep(0.05)
+        blocking_handler()  # deliberately on the loop
+        await asyncio.sleep(0.05)
+        await dog.stop()
+        return dog
+
+    dog = asyncio.run(_test())
+    assert dog.stalls >= 1
+    assert "blocking_handler" in dog.recent[0]["stack"]
@@ -0,0 +1,221 @@
+"""
+H2H Materializer Tests
+======================
+a) Opponent/column normalization across the game-log table shapes
+b) Vectorized aggregates and recency weighting match hand-computed values
+c) Incremental refresh only recomputes pairs touched by new rows
+d) Logs from player_game_logs win over API-backfilled duplicates
+e) Firestore records are chunked through batch_upsert_h2h; failures hold the watermark
+f) Backfilled game rows (ingest h2h job) reach SQLite and Firestore player_h2h_games
+"""
+
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import services.h2h_materializer as mat
+from services.h2h_materializer import H2HMaterializer, compute_h2h, normalize_logs
+
+AS_OF = datetime(2025, 3, 1)
+
+
+class _Adapter:
+    def __init__(self, ok=True):
+        self.calls = []
+        self.ok = ok
+
+    def batch_upsert_h2h(self, records):
+        self.calls.append(list(records))
+        return self.ok
+
+
+def _db(tmp_path, logs, h2h_games=()):
+    path = tmp_path / "nba.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE player_game_logs (
+            player_id TEXT, game_id TEXT, game_date TEXT, opponent TEXT, result TEXT,
+            mins INTEGER, pts INTEGER, reb INTEGER, ast INTEGER, fgm INTEGER, fga INTEGER,
+            fg3m INTEGER, fg3a INTEGER, PRIMARY KEY (player_id, game_id))
+    """)
+    conn.execute("""
+        CREATE TABLE player_h2h_games (
+            player_id TEXT, opponent TEXT, game_date TEXT, game_id TEXT, pts INTEGER,
+            reb INTEGER, ast INTEGER, fg3m INTEGER, result TEXT,
+            PRIMARY KEY (player_id, opponent, game_date))
+    """)
+    _insert(conn, logs)
+    conn.executemany("INSERT INTO player_h2h_games VALUES (?,?,?,?,?,?,?,?,?)", h2h_games)
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def _insert(conn, logs):
+    conn.executemany(
+        "INSERT OR REPLACE INTO player_game_logs VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)", logs)
+
+
+def _log(pid, gid, date, opp, pts, result="W", fg3m=2):
+    return (pid, gid, date, opp, result, 30, pts, 5, 4, 8, 16, fg3m, 5)
+
+
+def _vs_team(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT player_id, opponent, games, avg_pts, win_pct FROM player_vs_team").fetchall()
+    conn.close()
+    return {(r[0], r[1]): r[2:] for r in rows}
+
+
+def test_normalize_shapes():
+    raw = pd.DataFrame({
+        "player_id": [2544, "2544"],
+        "game_date": ["2025-01-02T00:00:00", "2025-01-05"],
+        "opponent": ["vs. BOS", "@ gsw"],
+        "points": ["31", None],
+        "fg3_made": [4, 1],
+        "WL": ["W", "L"],
+    })
+    out = normalize_logs(raw)
+    assert list(out["opponent"]) == ["BOS", "GSW"]
+    assert list(out["player_id"]) == ["2544", "2544"]
+    assert out["pts"].iloc[0] == 31 and pd.isna(out["pts"].iloc[1])
+    assert list(out["fg3m"]) == [4, 1] and list(out["win"]) == [1.0, 0.0]
+    assert out["reb"].isna().all()
+
+
+def test_compute_h2h_weighted():
+    logs = normalize_logs(pd.DataFrame({
+        "player_id": ["1", "1", "1"],
+        "game_id": ["a", "b", "c"],
+        "game_date": ["2025-03-01", "2024-03-01", "2025-02-01"],
+        "opponent": ["BOS", "BOS", "LAL"],
+        "pts": [30, 10, 20],
+        "fgm": [10, 4, 8], "fga": [20, 10, 16],
+        "result": ["W", "L", "W"],
+    }))
+    agg = compute_h2h(logs, as_of=AS_OF, half_life_days=365)
+    bos = agg.loc[("1", "BOS")]
+    assert bos["games"] == 2 and bos["pts"] == 20
+    assert abs(bos["fg_pct"] - 14 / 30) < 1e-9 and bos["win_pct"] == 0.5
+    # Year-old game weighs half: (30*1 + 10*0.5) / 1.5
+    assert abs(bos["pts_weighted"] - 35 / 1.5) < 0.05
+    assert pd.isna(bos["fg3_pct"])
+    assert agg.loc[("1", "LAL")]["last_game_date"] == pd.Timestamp("2025-02-01")
+
+
+def test_incremental_refresh(tmp_path):
+    path = _db(tmp_path, [
+        _log("1", "g1", "2025-01-01", "BOS", 20),
+        _log("1", "g2", "2025-01-08", "LAL", 10),
+        _log("2", "g1", "2025-01-01", "LAL", 8),
+    ])
+    m = H2HMaterializer(path, use_firestore=False)
+    first = m.refresh(as_of=AS_OF)
+    assert first["pairs"] == 3
+    assert m.refresh(as_of=AS_OF)["pairs"] == 0
+
+    conn = sqlite3.connect(path)
+    _insert(conn, [_log("1", "g3", "2025-02-01", "BOS", 30, result="L")])
+    conn.commit()
+    conn.close()
+
+    second = m.refresh(as_of=AS_OF)
+    assert second["pairs"] == 1
+    stats = _vs_team(path)
+    assert stats[("1", "BOS")] == (2, 25.0, 0.5)
+    assert stats[("2", "LAL")] == (1, 8.0, 1.0)
+
+
+def test_game_logs_preferred_over_backfill(tmp_path):
+    path = _db(
+        tmp_path,
+        [_log("1", "g1", "2025-01-01", "BOS", 20)],
+        h2h_games=[
+            ("1", "BOS", "2025-01-01", "g1", 99, 1, 1, 1, "W"),       # duplicate of g1
+            ("1", "BOS", "2023-12-01", "old", 12, 1, 1, 1, "L"),      # backfilled season
+        ],
+    )
+    m = H2HMaterializer(path, use_firestore=False)
+    m.refresh_pairs([("1", "bos")], as_of=AS_OF)
+    assert _vs_team(path)[("1", "BOS")] == (2, 16.0, 0.5)
+    assert m.covered_seasons("1") == {"2024-25"}
+
+
+def test_firestore_chunks_and_watermark(tmp_path, monkeypatch):
+    monkeypatch.setattr(mat, "FIRESTORE_CHUNK", 2)
+    teams = ["BOS", "LAL", "GSW", "MIA", "NYK"]
+    path = _db(tmp_path, [_log("1", f"g{i}", "2025-01-01", t, 20) for i, t in enumerate(teams)])
+
+    failing = _Adapter(ok=False)
+    summary = H2HMaterializer(path, adapter=failing).refresh(as_of=AS_OF)
+    assert not summary["firestore_synced"]
+    assert [len(c) for c in failing.calls] == [2, 2, 1]
+
+    adapter = _Adapter()
+    m = H2HMaterializer(path, adapter=adapter)
+    assert m.refresh(as_of=AS_OF)["pairs"] == 5       # watermark was held back
+    record = adapter.calls[0][0]
+    assert record["3pm"] == 2.0 and record["fg_pct"] == 50.0 and record["source"] == "local_logs"
+    assert set(record["recency_weighted"]) >= {"pts", "reb", "ast", "3pm"}
+    assert m.refresh(as_of=AS_OF)["pairs"] == 0
+
+
+class _GamesBatch:
+    def __init__(self, db):
+        self.db, self.ops = db, []
+
+    def set(self, ref, data, merge=False):
+        self.ops.append((ref, data))
+
+    def commit(self):
+        self.db.commits.append(self.ops)
+
+
+class _GamesDB:
+    def __init__(self):
+        self.commits = []
+
+    def batch(self):
+        return _GamesBatch(self)
+
+    def collection(self, name):
+        assert name == "player_h2h_games"
+        return self
+
+    def document(self, doc_id):
+        return doc_id
+
+
+def test_backfilled_games_dual_write(tmp_path):
+    from services.h2h_fetcher import H2HFetcher
+    from services.h2h_firestore_adapter import MAX_BATCH_OPS, H2HFirestoreAdapter
+
+    fetcher = H2HFetcher(str(tmp_path / "nba.db"))
+    adapter = H2HFirestoreAdapter.__new__(H2HFirestoreAdapter)
+    adapter.db, adapter.enabled = _GamesDB(), True
+    fetcher.firestore_adapter = adapter
+
+    stats = dict(pts=20, reb=5, ast=4, stl=1, blk=0, tov=2, min=30, fgm=8, fga=16,
+                 fg3m=2, fg3a=5, ftm=2, fta=2, plus_minus=3, result="W")
+    rows = [{**stats, "player_id": 2544, "opponent": "bos", "game_id": f"g{i}",
+             "game_date": f"2024-{1 + i // 28:02d}-{1 + i % 28:02d}"} for i in range(MAX_BATCH_OPS + 10)]
+    assert fetcher.save_h2h_batch(rows) == len(rows)
+
+    conn = sqlite3.connect(fetcher.db_path)
+    assert conn.execute("SELECT COUNT(*) FROM player_h2h_games").fetchone()[0] == len(rows)
+    conn.close()
+    assert [len(ops) for ops in adapter.db.commits] == [MAX_BATCH_OPS, 10]
+    doc_id, doc = adapter.db.commits[0][0]
+    assert doc_id == "2544_BOS_2024-01-01"
+    assert (doc["player_id"], doc["opponent"], doc["pts"]) == ("2544", "BOS", 20)
+
+    # Firestore failure never loses the SQLite write
+    adapter.db = None
+    assert fetcher.save_h2h_batch(rows[:3]) == 3
@@ -0,0 +1,204 @@
+"""
+Micro-Batched Incident Classification Tests
+============================================
+a) classify_batch matches the old one-row-at-a-time path (labels, confidence, probabilities)
+b) A batch is scored with a single predict_proba call; classify() delegates to it
+c) Unavailable model, low confidence and empty input degrade to None / []
+d) IncidentMicroBatcher coalesces concurrent callers and flushes at max_batch
+e) Prediction outcomes and batch throughput / queueing land in the RolloutGovernor
+f) A cancelled flush task or a short result list still resolves every caller (None)
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import LabelEncoder
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ml.incident_classifier.features import TARGET_LABELS, extract_features_single
+from vanguard.ml import rollout_governor
+from vanguard.ml.incident_model import (
+    CONFIDENCE_THRESHOLD,
+    IncidentMicroBatcher,
+    IncidentModelWrapper,
+)
+
+ENDPOINTS = ["/api/players/2544", "/live/games", "/vanguard/admin/status", "/aegis/simulate", "/health"]
+ERRORS = ["HTTPError404", "HTTPError500", "HTTPError401", "HTTPError429", "HTTPError503"]
+
+
+def _incident(i):
+    return {
+        "fingerprint": f"fp-{i}",
+        "error_type": ERRORS[i % len(ERRORS)],
+        "endpoint": ENDPOINTS[(i * 3) % len(ENDPOINTS)],
+        "error_message": ["timeout talking to nba", "permission denied", "", "connect refused"][i % 4],
+        "severity": "RED" if i % 3 == 0 else "YELLOW",
+        "occurrence_count": 1 + (i * 7) % 50,
+        "first_seen": "2026-01-27T10:00:00Z",
+        "last_seen": f"2026-01-27T{10 + i % 12:02d}:30:00Z",
+    }
+
+
+INCIDENTS = [_incident(i) for i in range(40)]
+
+
+def _matrix(incidents):
+    rows = [extract_features_single(inc) for inc in incidents]
+    names = sorted(rows[0].keys())
+    return np.array([[r[n] for n in names] for r in rows], dtype=float)
+
+
+class CountingModel:
+    """Fitted classifier that counts predict_proba calls and rows."""
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = []
+
+    def predict_proba(self, X):
+        self.calls.append(len(X))
+        return self.model.predict_proba(X)
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    fresh = rollout_governor.RolloutGovernor()
+    monkeypatch.setattr(rollout_governor, "_governor", fresh)
+    return fresh
+
+
+@pytest.fixture
+def wrapper(governor):
+    encoder = LabelEncoder().fit(TARGET_LABELS)
+    y = encoder.transform([TARGET_LABELS[i % len(TARGET_LABELS)] for i in range(len(INCIDENTS))])
+    X = _matrix(INCIDENTS)
+    # Overfit on purpose so most predictions clear the confidence threshold
+    model = LogisticRegression(C=1e4, max_iter=5000).fit(X, y)
+
+    wrapper = IncidentModelWrapper()
+    wrapper._model, wrapper._encoder, wrapper._loaded = CountingModel(model), encoder, True
+    wrapper._mark_loaded("test")
+    return wrapper
+
+
+def _reference(wrapper, incident):
+    """classify() as it was: one row, inverse_transform per class."""
+    probas = wrapper._model.model.predict_proba(_matrix([incident]))[0]
+    idx = probas.argmax()
+    if probas[idx] < CONFIDENCE_THRESHOLD:
+        return None
+    encoder = wrapper._encoder
+    return {
+        "label": encoder.inverse_transform([idx])[0],
+        "confidence": round(float(probas[idx]), 4),
+        "probabilities": {encoder.inverse_transform([i])[0]: round(float(p), 4)
+                          for i, p in enumerate(probas) if i < len(encoder.classes_)},
+    }
+
+
+def test_batch_matches_per_incident_path(wrapper):
+    results = wrapper.classify_batch(INCIDENTS)
+    assert len(results) == len(INCIDENTS) and any(results)
+
+    for incident, result in zip(INCIDENTS, results):
+        expected = _reference(wrapper, incident)
+        if expected is None:
+            assert result is None
+            continue
+        assert {k: result[k] for k in expected} == expected
+        assert result["model_version"] == "loaded_from_test"
+        assert all(type(label) is str for label in result["probabilities"])
+
+
+def test_single_predict_call_per_batch(wrapper):
+    wrapper.classify_batch(INCIDENTS)
+    assert wrapper._model.calls == [len(INCIDENTS)]
+
+    expected = _reference(wrapper, INCIDENTS[0])
+    single = wrapper.classify(INCIDENTS[0])
+    assert wrapper._model.calls[-1] == 1
+    assert (single and {k: single[k] for k in expected}) == expected
+
+
+def test_degrades_to_none(wrapper, monkeypatch):
+    assert wrapper.classify_batch([]) == []
+
+    monkeypatch.setattr("vanguard.ml.incident_model.CONFIDENCE_THRESHOLD", 1.01)
+    assert wrapper.classify_batch(INCIDENTS[:5]) == [None] * 5
+
+    missing = IncidentModelWrapper()
+    monkeypatch.setattr(missing, "load", lambda: False)
+    assert missing.classify_batch(INCIDENTS[:3]) == [None] * 3
+    assert missing.classify(INCIDENTS[0]) is None
+
+
+def test_micro_batcher_coalesces_callers(wrapper, monkeypatch):
+    sizes = []
+    real = wrapper.classify_batch
+    monkeypatch.setattr(wrapper, "classify_batch", lambda incs: sizes.append(len(incs)) or real(incs))
+
+    async def storm(batcher, incidents):
+        return await asyncio.gather(*(batcher.classify(inc) for inc in incidents))
+
+    batcher = IncidentMicroBatcher(wrapper, max_batch=64, max_wait_ms=20)
+    results = asyncio.run(storm(batcher, INCIDENTS[:10]))
+    assert sizes == [10]
+    # One result per caller, in caller order
+    assert [r and r["label"] for r in results] == [r and r["label"] for r in real(INCIDENTS[:10])]
+
+    sizes.clear()
+    capped = IncidentMicroBatcher(wrapper, max_batch=4, max_wait_ms=20)
+    asyncio.run(storm(capped, INCIDENTS[:10]))
+    assert sizes == [4, 4, 2]
+    assert capped.get_stats()["batches"] == 3 and capped.queue_depth == 0
+
+
+def test_governor_receives_metrics(wrapper, governor):
+    assert governor.primary.version_id == "loaded_from_test"
+
+    results = wrapper.classify_batch(INCIDENTS)
+    used = sum(r is not None for r in results)
+    assert governor.primary.predictions_total == len(INCIDENTS)
+    assert (governor.primary.predictions_used, governor.primary.predictions_fallback) == \
+        (used, len(INCIDENTS) - used)
+
+    async def storm():
+        batcher = IncidentMicroBatcher(wrapper, max_batch=8, max_wait_ms=5)
+        await asyncio.gather(*(batcher.classify(inc) for inc in INCIDENTS[:20]))
+
+    asyncio.run(storm())
+    metrics = governor.get_status()["batching"]
+    assert metrics["batches"] == 3 and metrics["incidents"] == 20
+    assert (metrics["avg_batch_size"], metrics["max_batch_size"]) == (round(20 / 3, 2), 8)
+    assert metrics["avg_queue_wait_ms"] >= 0 and metrics["avg_inference_ms"] > 0
+    assert metrics["incidents_per_s"] > 0 and metrics["queue_depth"] == 0
+    assert rollout_governor.RolloutGovernor().get_batch_metrics() == {"batches": 0}
+
+
+def test_micro_batcher_never_strands_callers(wrapper, monkeypatch):
+    async def cancelled_flush():
+        batcher = IncidentMicroBatcher(wrapper, max_batch=3, max_wait_ms=1000)
+        monkeypatch.setattr(wrapper, "classify_batch", lambda incs: time.sleep(0.2) or [])
+        callers = [asyncio.ensure_future(batcher.classify(inc)) for inc in INCIDENTS[:3]]
+        await asyncio.sleep(0.05)
+        for task in list(batcher._in_flight):
+            task.cancel()
+        return await asyncio.wait_for(asyncio.gather(*callers), timeout=1)
+
+    assert asyncio.run(cancelled_flush()) == [None] * 3
+
+    async def short_results():
+        batcher = IncidentMicroBatcher(wrapper, max_batch=4, max_wait_ms=5)
+        monkeypatch.setattr(wrapper, "classify_batch", lambda incs: [{"label": "x"}])
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.classify(inc) for inc in INCIDENTS[:4])), timeout=1)
+
+    assert asyncio.run(short_results()) == [{"label": "x"}, None, None, None]
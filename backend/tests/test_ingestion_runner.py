@@ -0,0 +1,210 @@
+"""
+Ingestion Runner Tests
+======================
+a) TokenBucket paces acquirers at the configured rate; penalize() pauses everyone
+b) Retryable errors back off and retry; 429s pause the governor; hard errors fail fast
+c) Writes are batched; checkpoints advance only after a committed write and resume skips them;
+   a clean finish clears the job's checkpoint so the next run starts over
+d) Workers overlap upstream latency while the governor caps the request rate
+e) get_json maps HTTP status codes onto the retry taxonomy
+f) fetch_one retries a one-off request like a job item and raises once it gives up
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+from aiohttp import web
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.ingestion_runner import (
+    IngestError,
+    IngestionJob,
+    IngestionRunner,
+    RateLimited,
+    RetryableError,
+    TokenBucket,
+)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+async def _no_sleep(_seconds):
+    return None
+
+
+def test_token_bucket_rate_and_penalty():
+    clock = _FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=1.0, clock=clock, sleep=clock.sleep)
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    asyncio.run(take(5))
+    assert bucket.acquired == 5
+    assert abs(clock.now - 2.0) < 1e-9          # 1 from the burst, then one every 0.5s
+
+    bucket.penalize(10.0)
+    asyncio.run(take(1))
+    assert abs(clock.now - 12.5) < 1e-9          # blocked, then burst drained -> one refill
+
+
+def test_retry_taxonomy():
+    attempts = {}
+
+    async def fetch(ctx, item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == "flaky" and attempts[item] < 3:
+            raise RetryableError("timeout")
+        if item == "limited" and attempts[item] == 1:
+            raise RateLimited(retry_after=7)
+        if item == "bad":
+            raise IngestError("HTTP 404")
+        if item == "dead":
+            raise RetryableError("HTTP 503")
+        return [item]
+
+    clock = _FakeClock()
+    runner = IngestionRunner(governor=TokenBucket(1000, 1000, clock=clock, sleep=clock.sleep),
+                             workers=1, sleep=_no_sleep)
+    job = IngestionJob("t", ["flaky", "limited", "bad", "dead"], fetch, max_retries=2)
+    (m,) = asyncio.run(runner.run([job]))
+
+    assert attempts == {"flaky": 3, "limited": 2, "bad": 1, "dead": 3}
+    assert (m.ok, m.failed, m.retries, m.rate_limited) == (2, 2, 5, 1)
+    assert runner.governor._blocked_until == 7.0
+
+
+def test_batched_writes_and_resume(tmp_path):
+    path = str(tmp_path / "ckpt.json")
+    batches = []
+    fail_once = {"armed": True}
+
+    def write(records):
+        if fail_once["armed"] and len(batches) == 1:
+            fail_once["armed"] = False
+            raise RuntimeError("disk full")
+        batches.append(sorted(records))
+        return len(records)
+
+    async def fetch(ctx, item):
+        return [item * 10, item * 10 + 1]
+
+    job = IngestionJob("nums", list(range(7)), fetch, write, batch_size=3)
+    (m,) = IngestionRunner(rate=1000, burst=1000, workers=1, checkpoint_path=path).run_sync([job])
+    assert [len(b) for b in batches] == [6, 2]              # 3 items, (3 failed), last 1
+    assert m.write_errors == 1 and m.written == 8 and m.ok == 7
+
+    finalized = []
+    job = IngestionJob("nums", list(range(7)), fetch, write, batch_size=3, finalize=lambda: finalized.append(1))
+    (m,) = IngestionRunner(rate=1000, burst=1000, workers=1, checkpoint_path=path).run_sync([job])
+    assert m.skipped == 4 and m.ok == 3                    # only the failed batch is redone
+    assert batches[-1] == [30, 31, 40, 41, 50, 51]
+    assert finalized == [1]
+
+    (m,) = IngestionRunner(rate=1000, burst=1000, checkpoint_path=path).run_sync([job])
+    assert m.skipped == 0 and m.ok == 7                    # the resumed run finished clean
+
+    (m,) = IngestionRunner(rate=1000, burst=1000, checkpoint_path=path).run_sync([job], resume=False)
+    assert m.skipped == 0 and m.ok == 7
+
+
+def test_workers_overlap_latency():
+    in_flight, peak = [0], [0]
+
+    async def fetch(ctx, item):
+        await ctx.runner.governor.acquire()
+        ctx.metrics.requests += 1
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.05)
+        in_flight[0] -= 1
+        return [item]
+
+    jobs = [IngestionJob("a", range(8), fetch), IngestionJob("b", range(8), fetch)]
+    start = time.perf_counter()
+    metrics = IngestionRunner(rate=1000, burst=1000, workers=8).run_sync(jobs)
+    elapsed = time.perf_counter() - start
+    assert peak[0] == 8 and elapsed < 0.4                  # serial would be 0.8s
+    assert [m.ok for m in metrics] == [8, 8] and all(m.finished for m in metrics)
+
+    start = time.perf_counter()
+    (m,) = IngestionRunner(rate=40, burst=1, workers=8).run_sync([IngestionJob("c", range(9), fetch)])
+    assert time.perf_counter() - start >= 0.19             # 8 refills at 40/s
+    assert m.requests == 9
+
+
+def test_get_json_status_mapping():
+    async def scenario():
+        calls = {"n": 0}
+
+        async def handler(request):
+            calls["n"] += 1
+            code = request.query["code"]
+            if code == "429":
+                return web.Response(status=429, headers={"Retry-After": "0"})
+            if code == "200":
+                return web.json_response({"player": request.query.get("id")})
+            return web.Response(status=int(code))
+
+        app = web.Application()
+        app.router.add_get("/stats", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/stats"
+
+        async def fetch(ctx, code):
+            return [await ctx.get_json(url, {"code": code, "id": "2544"})]
+
+        ingest = IngestionRunner(rate=1000, burst=1000, workers=2, sleep=_no_sleep,
+                                 rate_limit_cooldown=0.01)
+        job = IngestionJob("http", ["200", "404", "500", "429"], fetch, max_retries=1)
+        try:
+            (m,) = await ingest.run([job])
+        finally:
+            await runner.cleanup()
+        return m, calls["n"], ingest
+
+    m, served, ingest = asyncio.run(scenario())
+    assert (m.ok, m.failed, m.rate_limited) == (1, 3, 2)
+    assert served == m.requests == 1 + 1 + 2 + 2
+    assert ingest._session is None
+
+
+def test_fetch_one_retries():
+    attempts = {"n": 0}
+
+    async def flaky(ctx, _):
+        attempts["n"] += 1
+        if attempts["n"] < 3:
+            raise RetryableError("HTTP 503")
+        return [{"player_id": 2544}]
+
+    runner = IngestionRunner(rate=1000, burst=1000, sleep=_no_sleep)
+    assert asyncio.run(runner.fetch_one("players", flaky)) == [{"player_id": 2544}]
+    assert attempts["n"] == 3
+
+    async def down(ctx, _):
+        raise RetryableError("HTTP 503")
+
+    with pytest.raises(IngestError):
+        asyncio.run(runner.fetch_one("players", down, max_retries=1))
@@ -0,0 +1,189 @@
+"""
+Set-Based Ledger Audit Tests
+============================
+a) run_daily_audit joins projections to game logs in one query and matches the per-row audit
+b) log_projections / record_projections write a slate in one transaction, same rows as single calls
+c) update_actuals_batch reproduces update_actuals' error and within-range rules, edges included
+d) AutoTuner.update_actuals_batch matches update_actuals game for game and skips unknown games
+e) NextDayAudit writes the whole slate's actuals with one ledger call
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+from datetime import date
+
+import pytest
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from aegis.auto_tuner import AutoTuner
+from aegis.learning_ledger import LearningLedger
+from aegis.next_day_audit import NextDayAudit
+from engines.model_auto_tuner import ModelAutoTuner
+
+GAME_DATE = date(2026, 1, 27)
+
+# player_id: (proj pts, reb, ast), (actual pts, reb, ast) or None for a DNP
+SLATE = {
+    "1": ((25.5, 8.0, 7.5), (31, 7, 9)),
+    "2": ((18.0, 4.0, 2.0), (18, 4, 2)),
+    "3": ((12.0, 10.0, 1.0), (4, 15, None)),
+    "4": ((20.0, 5.0, 5.0), None),
+    "5": ((9.0, 3.0, 1.0), (21, 3, 1)),
+}
+
+
+def _projection(pts_floor, pts_ev, pts_ceiling):
+    return {"floor": {"points": pts_floor, "rebounds": 2.0, "assists": 1.0},
+            "ev": {"points": pts_ev, "rebounds": 4.0, "assists": 2.0},
+            "ceiling": {"points": pts_ceiling, "rebounds": 6.0, "assists": 3.0}}
+
+
+@pytest.fixture
+def tuner(tmp_path):
+    tuner = ModelAutoTuner(db_path=tmp_path / "nba_data.db")
+    with sqlite3.connect(tuner.db_path) as conn:
+        conn.execute("CREATE TABLE game_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, player_id TEXT, "
+                     "game_date TEXT, pts INTEGER, reb INTEGER, ast INTEGER)")
+        for pid, (_, actual) in SLATE.items():
+            if actual:
+                conn.execute("INSERT INTO game_logs (player_id, game_date, pts, reb, ast) VALUES (?, ?, ?, ?, ?)",
+                             (pid, GAME_DATE.isoformat(), *actual))
+        # A duplicate later row and another night's game must not leak into the audit
+        conn.execute("INSERT INTO game_logs (player_id, game_date, pts, reb, ast) VALUES ('1', ?, 0, 0, 0)",
+                     (GAME_DATE.isoformat(),))
+        conn.execute("INSERT INTO game_logs (player_id, game_date, pts, reb, ast) VALUES ('4', '2026-01-26', 40, 9, 9)")
+    tuner.log_projections([
+        {"player_id": pid, "player_name": f"Player {pid}", "game_date": GAME_DATE.isoformat(), "opponent": "GSW",
+         "proj_points": proj[0], "proj_rebounds": proj[1], "proj_assists": proj[2]}
+        for pid, (proj, _) in SLATE.items()
+    ])
+    return tuner
+
+
+def test_daily_audit_single_join(tuner, monkeypatch):
+    connections = []
+    real = tuner._get_connection
+    monkeypatch.setattr(tuner, "_get_connection", lambda: connections.append(1) or real())
+
+    report = tuner.run_daily_audit(GAME_DATE.isoformat())
+    assert len(connections) == 2                                # one join, one report write
+
+    # Per-row reference: the audit as it ran before, one stat line at a time
+    audits = []
+    for pid, (proj, actual) in SLATE.items():
+        if actual:
+            for stat, p, a in zip(("points", "rebounds", "assists"), proj, actual):
+                audits.append((abs(p - (a or 0)), pid, stat))
+    errors = [e for e, _, _ in audits]
+    assert report.total_projections == len(SLATE)
+    assert report.overall_mae == round(sum(errors) / len(errors), 2)
+    assert report.mae_points == round(sum(e for e, _, s in audits if s == "points") / 4, 2)
+    assert report.mae_assists == round((1.5 + 0 + 1.0 + 0) / 4, 2)
+    expected = sorted(audits, key=lambda a: a[0], reverse=True)[:ModelAutoTuner.WORST_MISSES]
+    assert [(m.error, m.player_id, m.stat) for m in report.worst_misses] == expected
+    assert report.worst_misses[0].actual == 21 and not report.needs_recalibration
+    assert tuner.get_recent_reports(1)[0]["total_projections"] == len(SLATE)
+
+    empty = tuner.run_daily_audit("2026-01-01")
+    assert (empty.total_projections, empty.overall_mae, empty.worst_misses) == (0, 0, [])
+
+
+def test_bulk_projection_writes(tuner, tmp_path):
+    with sqlite3.connect(tuner.db_path) as conn:
+        rows = conn.execute("SELECT player_id, proj_points, proj_threes FROM projection_log ORDER BY id").fetchall()
+    assert rows == [(pid, proj[0], 0) for pid, (proj, _) in SLATE.items()]
+    assert tuner.log_projections([]) == 0
+
+    single = LearningLedger(db_path=tmp_path / "single.db")
+    bulk = LearningLedger(db_path=tmp_path / "bulk.db")
+    slate = [{"player_id": pid, "opponent_id": "GSW", "game_date": GAME_DATE,
+              "projection": _projection(10.0, 15.0, 20.0), "confluence_score": 70.0,
+              "model_weights": {"xgboost": 0.4}, "execution_time_ms": 12.0} for pid in SLATE]
+    for entry in slate:
+        single.record_projection(**entry)
+    assert bulk.record_projections(slate) == len(SLATE)
+
+    columns = "player_id, opponent_id, game_date, pts_floor, pts_ev, reb_ceiling, model_weights, confluence_score"
+    with sqlite3.connect(single.db_path) as a, sqlite3.connect(bulk.db_path) as b:
+        query = f"SELECT {columns} FROM learning_ledger ORDER BY player_id"
+        assert a.execute(query).fetchall() == b.execute(query).fetchall()
+
+
+def test_ledger_update_actuals_batch(tmp_path):
+    ledger = LearningLedger(db_path=tmp_path / "ledger.db")
+    ranges = {"1": (20.0, 25.0, 30.0), "2": (10.0, 15.0, 20.0), "3": (0.0, 8.0, 12.0),
+              "4": (5.0, 0.0, 9.0), "5": (10.0, 15.0, 20.0)}
+    ledger.record_projections([{"player_id": pid, "opponent_id": "BOS", "game_date": GAME_DATE,
+                                "projection": _projection(*r), "confluence_score": 60.0}
+                               for pid, r in ranges.items()])
+    actuals = {"1": {"points": 31, "rebounds": 7, "assists": 9}, "2": {"points": 20},
+               "3": {"points": 6}, "4": {"points": 7}, "99": {"points": 50}}
+
+    assert ledger.update_actuals_batch(GAME_DATE, actuals) == 4   # "5" untouched, "99" unknown
+    rows = {r["player_id"]: r for r in ledger.get_projections_for_date(GAME_DATE)}
+    assert (rows["1"]["prediction_error"], rows["1"]["within_range"], rows["1"]["ast_actual"]) == (6.0, 0, 9)
+    assert (rows["2"]["prediction_error"], rows["2"]["within_range"]) == (5.0, 1)     # ceiling inclusive
+    assert (rows["3"]["prediction_error"], rows["3"]["within_range"]) == (2.0, None)  # zero floor: no range
+    assert (rows["4"]["prediction_error"], rows["4"]["within_range"]) == (None, 1)    # zero EV: no error
+    assert rows["5"]["pts_actual"] is None
+
+    assert ledger.update_actuals("5", GAME_DATE, {"points": 14})
+    assert not ledger.update_actuals("5", date(2026, 1, 1), {"points": 14})
+    assert ledger.get_historical_accuracy("5") == 1.0
+
+
+def _script(tuner, game_id, home_ev, away_ev, blowout, clutch):
+    tuner.log_game_script(game_id, GAME_DATE, f"H{game_id}", f"A{game_id}", (home_ev - 9, home_ev, home_ev + 9),
+                          (away_ev - 9, away_ev, away_ev + 9), blowout, clutch, ["event"])
+
+
+def test_auto_tuner_update_actuals_batch(tmp_path):
+    finals = [
+        {"game_id": "g1", "home_score": 120, "away_score": 95, "was_blowout": True, "was_clutch": False},
+        {"game_id": "g2", "home_score": 101, "away_score": 103, "was_blowout": False, "was_clutch": True},
+        {"game_id": "g3", "home_score": 99, "away_score": 98, "was_blowout": False, "was_clutch": False},
+        {"game_id": "missing", "home_score": 1, "away_score": 1, "was_blowout": False, "was_clutch": False},
+    ]
+    single, bulk = AutoTuner(db_path=tmp_path / "single.db"), AutoTuner(db_path=tmp_path / "bulk.db")
+    for tuner in (single, bulk):
+        _script(tuner, "g1", 110.0, 100.0, 0.6, 0.1)
+        _script(tuner, "g2", 105.0, 104.0, 0.2, 0.4)
+        _script(tuner, "g3", 112.0, 96.0, 0.7, 0.3)
+
+    one_by_one = [single.update_actuals(**f) for f in finals]
+    batch = bulk.update_actuals_batch(finals)
+
+    assert one_by_one[-1] is None and len(batch) == 3
+    assert batch == one_by_one[:3]
+    assert [r.script_accuracy for r in batch] == [1.0, 1.0, 0.0]
+    assert single.get_audit_summary(days=100000) == bulk.get_audit_summary(days=100000)
+    assert bulk.update_actuals_batch([]) == []
+
+
+def test_next_day_audit_batches_ledger_writes(tmp_path, monkeypatch):
+    ledger = LearningLedger(db_path=tmp_path / "ledger.db")
+    ledger.record_projections([{"player_id": pid, "opponent_id": "BOS", "game_date": GAME_DATE,
+                                "projection": _projection(10.0, 15.0, 20.0), "confluence_score": 60.0}
+                               for pid in SLATE])
+
+    class BoxScores:
+        async def get_box_scores(self, game_date):
+            return {pid: {"points": a[0], "rebounds": a[1], "assists": a[2]}
+                    for pid, (_, a) in SLATE.items() if a}
+
+    batches = []
+    real = ledger.update_actuals_batch
+    monkeypatch.setattr(ledger, "update_actuals_batch", lambda d, a: batches.append(len(a)) or real(d, a))
+    monkeypatch.setattr(ledger, "update_actuals", lambda *a: pytest.fail("per-row update"))
+
+    summary = asyncio.run(NextDayAudit(learning_ledger=ledger, nba_api=BoxScores()).run_audit(GAME_DATE))
+
+    assert batches == [4]
+    assert (summary.total_projections, summary.projections_audited) == (5, 4)
+    assert summary.avg_error == round((16 + 3 + 11 + 6) / 4, 2)
+    assert summary.accuracy_rate == 0.25
+    assert ledger.get_recent_accuracy_stats(days=100000)["total"] == 4
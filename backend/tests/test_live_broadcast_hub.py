@@ -0,0 +1,185 @@
+"""
+LiveBroadcastHub Tests
+======================
+Uses asyncio.run() directly — no pytest-asyncio dependency required.
+
+a) A snapshot is encoded once and the same bytes reach every subscriber
+b) Delta subscribers get the encoder's keyframe, then its patch frames
+c) Subscribers wake only on publish; silence yields a heartbeat
+d) Last-Event-ID resume: replay deltas inside the ring, keyframe outside it
+e) Overflowing subscriber collapses to the latest full frame
+f) /live/stream generator streams hub frames and unsubscribes on close
+g) Ids from another instance or from before a sequence reset resync with a full frame
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.live_broadcast_hub import HEARTBEAT_FRAME, LiveBroadcastHub
+from services.live_delta import LiveDeltaEncoder
+
+
+def _game(gid, home_score=0, away_score=0):
+    return {"game_id": gid, "home_team": "LAL", "away_team": "BOS",
+            "home_score": home_score, "away_score": away_score, "status": "LIVE", "leaders": []}
+
+
+def _snapshot(games, leaders=None, cycle=0):
+    return {"games": games, "leaders": leaders or [],
+            "meta": {"timestamp": f"t{cycle}", "update_cycle": cycle}, "changes": {}}
+
+
+def _publisher(hub):
+    encoder = LiveDeltaEncoder()
+    return lambda snap: hub.publish(snap, encoder.encode(snap))
+
+
+def _id(hub, seq) -> bytes:
+    return f"id: {hub.event_id(seq)}\n".encode()
+
+
+def _data(frame: bytes) -> dict:
+    line = [l for l in frame.decode().splitlines() if l.startswith("data: ")][0]
+    return json.loads(line[len("data: "):])
+
+
+def test_snapshot_encoded_once_for_all_subscribers():
+    async def _test():
+        hub = LiveBroadcastHub()
+        subs = [hub.subscribe() for _ in range(5)]
+        hub.publish(_snapshot([_game("g1")]))
+        return hub, [s.queue.get_nowait() for s in subs]
+
+    hub, frames = asyncio.run(_test())
+    assert all(f is frames[0] for f in frames)
+    assert frames[0].startswith(_id(hub, 1))
+    assert _data(frames[0])["games"][0]["game_id"] == "g1"
+
+
+def test_delta_subscriber_gets_keyframe_then_patches():
+    async def _test():
+        hub = LiveBroadcastHub()
+        publish = _publisher(hub)
+        sub = hub.subscribe(mode="delta")
+        publish(_snapshot([_game("g1"), _game("g2")], leaders=[{"player_id": "1"}]))
+        publish(_snapshot([_game("g1", home_score=2), _game("g2")], leaders=[{"player_id": "1"}]))
+        publish(_snapshot([_game("g1", home_score=2)], leaders=[{"player_id": "1"}]))
+        return [sub.queue.get_nowait() for _ in range(3)]
+
+    first, second, third = asyncio.run(_test())
+    assert b"event: delta" not in first and len(_data(first)["games"]) == 2
+    assert b"event: delta" in second
+    assert _data(second)["games"]["upsert"] == {"g1": {"home_score": 2}}
+    assert _data(second)["leaders"]["upsert"] == {}
+    assert _data(third)["games"] == {"upsert": {}, "remove": ["g2"]}
+
+
+def test_subscriber_wakes_only_on_publish():
+    async def _test():
+        hub = LiveBroadcastHub()
+        sub = hub.subscribe()
+        idle = await sub.next_frame(timeout=0.05)
+        asyncio.get_running_loop().call_later(0.02, hub.publish, _snapshot([_game("g1")]))
+        frame = await sub.next_frame(timeout=1.0)
+        return hub, idle, frame
+
+    hub, idle, frame = asyncio.run(_test())
+    assert idle == HEARTBEAT_FRAME
+    assert frame.startswith(_id(hub, 1))
+
+
+def test_last_event_id_resume():
+    async def _test():
+        hub = LiveBroadcastHub(history_size=4)
+        publish = _publisher(hub)
+        for i in range(6):
+            publish(_snapshot([_game("g1", home_score=i)], cycle=i))
+
+        replay = hub.subscribe(mode="delta", last_event_id=hub.event_id(4))
+        stale = hub.subscribe(mode="delta", last_event_id=hub.event_id(1))
+        current = hub.subscribe(mode="full", last_event_id=hub.event_id(6))
+        behind = hub.subscribe(mode="full", last_event_id=hub.event_id(5))
+        drain = lambda s: [s.queue.get_nowait() for _ in range(s.queue.qsize())]
+        return hub, drain(replay), drain(stale), drain(current), drain(behind)
+
+    hub, replay, stale, current, behind = asyncio.run(_test())
+    assert [f.split(b"\n", 1)[0] + b"\n" for f in replay] == [_id(hub, 5), _id(hub, 6)]
+    assert all(b"event: delta" in f for f in replay)
+    assert len(stale) == 1 and b"event: delta" not in stale[0]  # keyframe
+    assert current == []
+    assert len(behind) == 1 and behind[0].startswith(_id(hub, 6))
+
+
+def test_slow_subscriber_collapses_to_keyframe():
+    async def _test():
+        hub = LiveBroadcastHub(queue_size=3)
+        publish = _publisher(hub)
+        sub = hub.subscribe(mode="delta")
+        for i in range(5):
+            publish(_snapshot([_game("g1", home_score=i)], cycle=i))
+        return hub, sub, [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+
+    hub, sub, frames = asyncio.run(_test())
+    assert sub.resyncs == 1
+    assert frames[0].startswith(_id(hub, 4)) and b"event: delta" not in frames[0]
+    assert frames[-1].startswith(_id(hub, 5))
+
+
+def test_stream_generator_uses_hub(monkeypatch):
+    import api.live_stream_routes as live_stream_routes
+
+    hub = LiveBroadcastHub()
+    monkeypatch.setattr(live_stream_routes, "get_live_hub", lambda: hub)
+    monkeypatch.setattr(live_stream_routes, "_get_producer", lambda: object())
+
+    async def _test():
+        hub.publish(_snapshot([_game("g1")]))
+        gen = live_stream_routes._sse_event_generator(mode="full", last_event_id=None)
+        first = await gen.__anext__()
+        assert hub.subscriber_count == 1
+        hub.publish(_snapshot([_game("g1", home_score=3)]))
+        second = await gen.__anext__()
+        await gen.aclose()
+        return first, second
+
+    first, second = asyncio.run(_test())
+    assert first.startswith(_id(hub, 1)) and second.startswith(_id(hub, 2))
+    assert hub.subscriber_count == 0
+
+
+def test_foreign_or_reset_ids_resync():
+    async def _test():
+        other, hub = LiveBroadcastHub(), LiveBroadcastHub()
+        for i in range(8):
+            other.publish(_snapshot([_game("g1", home_score=i)], cycle=i))
+        publish = _publisher(hub)
+        for i in range(3):
+            publish(_snapshot([_game("g1", home_score=i)], cycle=i))
+        drain = lambda s: [s.queue.get_nowait() for _ in range(s.queue.qsize())]
+
+        # A cursor from another instance is ahead numerically but not current
+        foreign = drain(hub.subscribe(mode="delta", last_event_id=other.event_id(8)))
+        legacy = drain(hub.subscribe(mode="full", last_event_id="8"))
+
+        # The producer's encoder restarts at 1: new epoch, full frame to delta clients
+        before = hub.event_id(3)
+        live = hub.subscribe(mode="delta")
+        drain(live)
+        hub.publish(*(lambda e, s: (s, e.encode(s)))(LiveDeltaEncoder(), _snapshot([_game("g1", 9)])))
+        after_reset = drain(live)
+        resumed = drain(hub.subscribe(mode="delta", last_event_id=before))
+        return hub, before, foreign, legacy, after_reset, resumed
+
+    hub, before, foreign, legacy, after_reset, resumed = asyncio.run(_test())
+    latest = f"id: {before}\n".encode()
+    assert len(foreign) == 1 and foreign[0].startswith(latest) and b"event: delta" not in foreign[0]
+    assert len(legacy) == 1 and legacy[0].startswith(latest)
+    assert not before.startswith(hub.epoch) and hub.stats()["resets"] == 1
+    assert len(after_reset) == 1 and after_reset[0].startswith(_id(hub, 1))
+    assert b"event: delta" not in after_reset[0] and _data(after_reset[0])["games"][0]["home_score"] == 9
+    assert resumed == after_reset
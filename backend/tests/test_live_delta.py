@@ -0,0 +1,169 @@
+"""
+LiveDeltaEncoder Tests
+======================
+a) First frame is a keyframe; unchanged cycles produce empty patches
+b) Row patches carry only changed keys (nested stats diffed, removed keys unset)
+c) Keyframes recur every keyframe_interval cycles
+d) Replaying frames through apply_frame reproduces every snapshot exactly
+e) A skipped frame raises SequenceGap so the client resyncs
+f) Stat increments feed snapshot["changes"]
+g) WebSocket broadcasts stay full-state every cycle; subscribe replays the
+   last broadcast filtered to the new subscription
+"""
+
+import asyncio
+import copy
+import os
+import sys
+
+import pytest
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.live_delta import (
+    UNSET,
+    LiveDeltaEncoder,
+    SequenceGap,
+    apply_frame,
+    diff_row,
+    is_empty_patch,
+)
+
+
+def _leader(pid, pts=0, pie=0.1):
+    return {"player_id": pid, "name": f"P{pid}", "pie": pie, "stats": {"pts": pts, "reb": 1}}
+
+
+def _snap(scores, leaders, cycle=0):
+    return {
+        "games": [{"game_id": gid, "home_score": h, "away_score": a, "clock": f"Q1 {cycle}"}
+                  for gid, (h, a) in scores.items()],
+        "leaders": leaders,
+        "meta": {"timestamp": f"t{cycle}", "update_cycle": cycle},
+        "changes": {},
+    }
+
+
+def test_first_frame_keyframe_then_empty_patch():
+    enc = LiveDeltaEncoder()
+    snap = _snap({"g1": (0, 0)}, [_leader("1")])
+    first = enc.encode(copy.deepcopy(snap))
+    second = enc.encode(copy.deepcopy(snap))
+    assert first["type"] == "keyframe" and first["seq"] == 1
+    assert second["type"] == "patch" and second["base_seq"] == 1
+    assert is_empty_patch(second)
+
+
+def test_row_patch_contains_only_changes():
+    old = {"a": 1, "stats": {"pts": 2, "reb": 1}, "gone": True}
+    new = {"a": 1, "stats": {"pts": 4, "reb": 1}, "added": "x"}
+    assert diff_row(old, new) == {"stats": {"pts": 4}, "added": "x", UNSET: ["gone"]}
+
+
+def test_keyframe_interval():
+    enc = LiveDeltaEncoder(keyframe_interval=3)
+    types = [enc.encode(_snap({"g1": (i, 0)}, [], i))["type"] for i in range(8)]
+    assert types == ["keyframe", "patch", "patch", "patch",
+                     "keyframe", "patch", "patch", "patch"]
+
+
+def test_apply_frame_reproduces_snapshots():
+    enc = LiveDeltaEncoder()
+    snaps = [
+        _snap({"g1": (0, 0), "g2": (0, 0)}, [_leader("1", 0, 0.2), _leader("2", 0, 0.1)], 0),
+        _snap({"g1": (2, 0), "g2": (0, 0)}, [_leader("1", 2, 0.25), _leader("2", 0, 0.1)], 1),
+        _snap({"g1": (2, 3), "g2": (0, 2)}, [_leader("2", 5, 0.3), _leader("1", 2, 0.25)], 2),
+        _snap({"g1": (4, 3)}, [_leader("2", 5, 0.3), _leader("3", 1, 0.05)], 3),
+    ]
+    state = None
+    for snap in snaps:
+        frame = enc.encode(snap)
+        state = apply_frame(state, copy.deepcopy(frame))
+        assert state["seq"] == frame["seq"]
+        assert state["games"] == snap["games"]
+        assert state["leaders"] == snap["leaders"]
+        assert state["meta"] == snap["meta"]
+
+
+def test_sequence_gap_forces_resync():
+    enc = LiveDeltaEncoder()
+    state = apply_frame(None, enc.encode(_snap({"g1": (0, 0)}, [], 0)))
+    enc.encode(_snap({"g1": (1, 0)}, [], 1))  # dropped on the wire
+    with pytest.raises(SequenceGap):
+        apply_frame(state, enc.encode(_snap({"g1": (2, 0)}, [], 2)))
+
+
+def test_changes_feed_gold_pulse():
+    enc = LiveDeltaEncoder()
+    enc.encode(_snap({"g1": (0, 0)}, [_leader("1", 4)]))
+    nxt = _snap({"g1": (3, 0)}, [_leader("1", 7), _leader("9", 2)])
+    assert enc.changes_for(nxt) == {"1": {"pts": 3}}
+
+
+class _FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, payload):
+        self.sent.append(payload)
+
+
+class _FakeWSManager:
+    active_count = 1
+
+    def __init__(self):
+        self.broadcasts = []
+
+    async def broadcast_to_subscribers(self, event_type, data, filter_key=None, filter_value=None):
+        self.broadcasts.append((event_type, data.get("game_id") or data.get("player_id")))
+
+    async def update_filters(self, connection_id, filters):
+        pass
+
+
+class _FakePresence:
+    async def get_viewers(self, key, value):
+        return 2
+
+    async def update_context(self, session_token, filters):
+        pass
+
+
+def test_ws_full_frames_and_subscribe_snapshot(monkeypatch):
+    import services.async_pulse_producer_cloud as producer_module
+    import services.presence_manager as presence_module
+    import services.ws_connection_manager as ws_module
+    from services.ws_message_handler import handle_ws_message
+
+    manager = _FakeWSManager()
+    monkeypatch.setattr(ws_module, "get_ws_manager", lambda: manager)
+    monkeypatch.setattr(presence_module, "get_presence_manager", lambda: _FakePresence())
+    producer = object.__new__(producer_module.CloudAsyncPulseProducer)
+    producer._update_count, producer._ws_last_broadcast = 0, []
+    monkeypatch.setattr(producer_module, "_cloud_producer", producer)
+
+    games = [{"game_id": "g1", "home_team": "LAL", "away_team": "BOS", "status": "LIVE", "home_score": 50},
+             {"game_id": "g2", "home_team": "NYK", "away_team": "MIA", "status": "LIVE", "home_score": 40}]
+    leaders = [_leader(str(i), pts=i) for i in range(1, 13)]
+
+    async def _test():
+        # An unchanged second cycle still re-sends every game and player
+        await producer._ws_broadcast(None, leaders, games, seq=1)
+        await producer._ws_broadcast(None, leaders, games, seq=2)
+        socket = _FakeSocket()
+        await handle_ws_message("c1", "tok", {"action": "subscribe", "filters": {"team": "LAL"}}, socket)
+        return socket.sent
+
+    sent = asyncio.run(_test())
+    per_cycle = 1 + 4 + 12                          # leaders, 2 games x 2 teams, 12 players
+    assert len(manager.broadcasts) == 2 * per_cycle
+    assert manager.broadcasts[:per_cycle] == manager.broadcasts[per_cycle:]
+
+    assert sent[0] == {"type": "subscribed", "filters": {"team": "LAL"}}
+    snapshot = [(m["type"], m["data"].get("game_id") or m["data"].get("player_id")) for m in sent[1:]]
+    assert snapshot[0] == ("leaders_update", None)
+    assert [gid for kind, gid in snapshot if kind == "game_update"] == ["g1"]
+    assert len([pid for kind, pid in snapshot if kind == "player_update"]) == 12
+    game = next(m["data"] for m in sent if m["type"] == "game_update")
+    assert game["home_score"] == 50 and game["seq"] == 2 and game["viewers"] == 2
@@ -0,0 +1,203 @@
+"""
+Matchup Orchestrator Tests
+==========================
+Uses asyncio.run() directly — no pytest-asyncio dependency required.
+
+a) classify_players matches classify_player with one read and one write for the whole batch
+b) Projections run concurrently, bounded by max_concurrency
+c) Opponent context is fetched once per team and shared by that team's projections
+d) One projector (and its SimulationCache) serves every request; stage timings are reported
+e) A failed projection falls back to DB averages without stalling the batch
+f) Projections run on the request loop; background tasks they spawn are not cancelled
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import services.archetype_engine as archetype_engine_module
+import services.roster_validator as roster_validator_module
+from aegis.matchup_orchestrator import MatchupOrchestrator
+from aegis.simulation_cache import SimulationCache
+from services.archetype_engine import ArchetypeEngine
+from services.roster_validator import RosterValidationResult
+
+PLAYERS = {
+    "1": ("Star Guard", "6-3", 27.0, 4.5, 7.2),
+    "2": ("Big Man", "7-0", 14.0, 11.5, 2.0),
+    "3": ("Wing", "6-7", 11.0, 5.0, 2.5),
+    "11": ("Other Star", "6-8", 24.0, 7.0, 5.0),
+    "12": ("Other Big", "6-11", 9.0, 9.5, 1.5),
+}
+HOME, AWAY = "1610612747", "1610612744"
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(archetype_engine_module, "HAS_TRACKING", False)   # no network profiles
+    path = tmp_path / "nba_data.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE player_rolling_averages (player_id TEXT, avg_points REAL, "
+                     "avg_rebounds REAL, avg_assists REAL)")
+        conn.execute("CREATE TABLE player_bio (player_id TEXT, player_name TEXT, height TEXT)")
+        for pid, (name, height, pts, reb, ast) in PLAYERS.items():
+            conn.execute("INSERT INTO player_rolling_averages VALUES (?, ?, ?, ?)", (pid, pts, reb, ast))
+            conn.execute("INSERT INTO player_bio VALUES (?, ?, ?)", (pid, name, height))
+    return str(path)
+
+
+class FakeValidator:
+    def validate_both_teams(self, home_id, away_id):
+        def team(team_id, ids):
+            players = [{"player_id": pid, "name": PLAYERS[pid][0]} for pid in ids]
+            return RosterValidationResult(team_id=team_id, team_name=f"Team {team_id}", active_players=players,
+                                          health_lights={pid: "green" for pid in ids})
+        return team(home_id, ["1", "2", "3"]), team(away_id, ["11", "12"])
+
+    def get_vacuum_redistribution(self, team_id):
+        return {}
+
+
+class FakeProjector:
+    """Stands in for AegisOrchestrator: cached, slow enough to overlap, counts contexts."""
+
+    def __init__(self, fail_for=()):
+        self.cache = SimulationCache()
+        self.contexts = []
+        self.calls = []
+        self.fail_for = set(fail_for)
+        self.active = self.peak = 0
+
+    async def get_opponent_context(self, opponent_id):
+        self.contexts.append(opponent_id)
+        return {"defensive_rating": 105.0, "team": opponent_id}
+
+    async def run_simulation(self, player_id, opponent_id, game_date=None, team_defense=None):
+        cached = self.cache.get(player_id, opponent_id, date=str(game_date))
+        if cached:
+            return cached
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.05)
+            self.calls.append((player_id, opponent_id, team_defense["team"]))
+            if player_id in self.fail_for:
+                raise RuntimeError("no game logs")
+            pts = PLAYERS[player_id][2]
+            result = SimpleNamespace(expected_value={"points": pts, "rebounds": 5.0, "assists": 3.0})
+            self.cache.set(player_id, opponent_id, result, date=str(game_date))
+            return result
+        finally:
+            self.active -= 1
+
+
+def _orchestrator(db_path, monkeypatch, projector, max_concurrency=2):
+    monkeypatch.setattr(roster_validator_module, "get_roster_validator", lambda: FakeValidator())
+    return MatchupOrchestrator(db_path=db_path, projector=projector, max_concurrency=max_concurrency)
+
+
+def test_classify_players_bulk(db_path, monkeypatch):
+    engine = ArchetypeEngine(db_path=db_path)
+    single = {pid: engine.classify_player(pid) for pid in list(PLAYERS) + ["999"]}
+
+    connections = []
+    real = engine._get_connection
+    monkeypatch.setattr(engine, "_get_connection", lambda: connections.append(1) or real())
+    bulk = engine.classify_players(list(PLAYERS) + ["999", "1"])
+
+    assert len(connections) == 2                               # one read, one write
+    assert bulk == single
+    assert bulk["999"]["primary"] is None
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM player_archetypes").fetchone()[0] == len(PLAYERS)
+
+
+def test_projections_run_concurrently_within_bound(db_path, monkeypatch):
+    projector = FakeProjector()
+    orchestrator = _orchestrator(db_path, monkeypatch, projector, max_concurrency=2)
+
+    result = asyncio.run(orchestrator.run_matchup(HOME, AWAY))
+
+    assert projector.peak == 2                                  # overlapped, never above the bound
+    assert len(projector.calls) == 5
+    assert [p.player_id for p in result.home_team.player_projections] == ["1", "2", "3"]
+    assert result.home_team.player_projections[0].ev_points == 27.0
+
+
+def test_opponent_context_fetched_once_per_team(db_path, monkeypatch):
+    projector = FakeProjector()
+    asyncio.run(_orchestrator(db_path, monkeypatch, projector).run_matchup(HOME, AWAY))
+
+    assert sorted(projector.contexts) == sorted([HOME, AWAY])
+    for player_id, opponent_id, context_team in projector.calls:
+        assert context_team == opponent_id
+        assert opponent_id == (AWAY if player_id in ("1", "2", "3") else HOME)
+
+
+def test_shared_projector_cache_and_stage_timings(db_path, monkeypatch):
+    projector = FakeProjector()
+    orchestrator = _orchestrator(db_path, monkeypatch, projector)
+
+    first = asyncio.run(orchestrator.run_matchup(HOME, AWAY))
+    second = asyncio.run(orchestrator.run_matchup(HOME, AWAY))
+
+    assert len(projector.calls) == 5                           # second request served from cache
+    assert projector.cache.get_metrics()["hits"] == 5
+    assert orchestrator.projector is projector
+    assert [p.ev_points for p in second.away_team.player_projections] == \
+        [p.ev_points for p in first.away_team.player_projections]
+    assert set(first.stage_timings_ms) == {"validate", "vacuum", "archetypes", "opponent_context",
+                                           "projections", "assemble"}
+    assert all(ms >= 0 for ms in first.stage_timings_ms.values())
+    assert first.stage_timings_ms["projections"] >= 50          # 5 x 50ms at concurrency 2
+
+
+def test_failed_projection_falls_back(db_path, monkeypatch):
+    projector = FakeProjector(fail_for={"2"})
+    result = asyncio.run(_orchestrator(db_path, monkeypatch, projector).run_matchup(HOME, AWAY))
+
+    big = next(p for p in result.home_team.player_projections if p.player_id == "2")
+    assert (big.ev_points, big.ev_rebounds, big.ev_assists) == (10.0, 4.0, 2.0)   # no player_stats table
+    assert len(result.away_team.player_projections) == 2
+    assert projector.active == 0
+
+
+class SyncingProjector(FakeProjector):
+    """Spawns a fire-and-forget task per projection, like SovereignRouter's delta-sync."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+        self.synced = []
+        self.tasks = []
+
+    async def run_simulation(self, player_id, opponent_id, game_date=None, team_defense=None):
+        self.threads.add(threading.get_ident())
+        self.tasks.append(asyncio.create_task(self._sync(player_id)))
+        return await super().run_simulation(player_id, opponent_id, game_date, team_defense)
+
+    async def _sync(self, player_id):
+        await asyncio.sleep(0.1)
+        self.synced.append(player_id)
+
+
+def test_projections_stay_on_request_loop(db_path, monkeypatch):
+    projector = SyncingProjector()
+    orchestrator = _orchestrator(db_path, monkeypatch, projector)
+
+    async def request():
+        await orchestrator.run_matchup(HOME, AWAY)
+        assert projector.threads == {threading.get_ident()}
+        await asyncio.gather(*projector.tasks)
+
+    asyncio.run(request())
+    assert sorted(projector.synced) == sorted(PLAYERS)
+    assert not any(task.cancelled() for task in projector.tasks)
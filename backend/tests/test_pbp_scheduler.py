@@ -0,0 +1,252 @@
+"""
+PBP Scheduler Tests
+===================
+Uses asyncio.run() directly — no pytest-asyncio dependency required.
+
+a) One cycle commits every game's plays and live state in shared batches
+b) Metadata is read once per game; cursors advance and only new plays publish
+c) A failed commit leaves the cursor in place and refetches the same body
+d) Adaptive intervals: clutch, halftime, pregame, default and error backoff
+e) End Game finalizes, notifies SSE clients and drops the game
+f) stop_tracking ends the stream and releases the channel; retired channels are
+   dropped even while a client is still attached
+"""
+
+import asyncio
+import os
+import sys
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import services.pbp_polling_service as polling
+from services.firebase_pbp_service import FirebasePBPService
+from services.nba_pbp_service import PlayEvent
+from services.pbp_polling_service import PBPPollingService, TrackedGame, clock_seconds
+
+
+def _play(seq, period=1, clock="10:00", home=0, away=0, event="Jump Shot", text="", shooting=False):
+    return PlayEvent(
+        playId=str(seq), sequenceNumber=seq, eventType=event, description=text,
+        period=period, clock=clock, homeScore=home, awayScore=away,
+        isShootingPlay=shooting, primaryPlayerId="2544" if shooting else None,
+        source="espn",
+    )
+
+
+# ── In-memory Firestore ──────────────────────────────────────────────────────
+
+class _Snap:
+    def __init__(self, data):
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _Ref:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+
+    def collection(self, name):
+        return _Ref(self.db, f"{self.path}/{name}")
+
+    def document(self, doc_id):
+        return _Ref(self.db, f"{self.path}/{doc_id}")
+
+    def get(self):
+        self.db.reads.append(self.path)
+        return _Snap(self.db.docs.get(self.path))
+
+
+class _Batch:
+    def __init__(self, db):
+        self.db = db
+        self.ops = []
+
+    def set(self, ref, data, merge=False):
+        self.ops.append((ref.path, data))
+
+    def commit(self):
+        if self.db.fail_commits:
+            raise RuntimeError("deadline exceeded")
+        for path, data in self.ops:
+            self.db.docs.setdefault(path, {}).update(data)
+        self.db.commits += 1
+
+
+class _DB:
+    def __init__(self, docs=None):
+        self.docs = dict(docs or {})
+        self.reads = []
+        self.commits = 0
+        self.fail_commits = False
+
+    def collection(self, name):
+        return _Ref(self, name)
+
+    def batch(self):
+        return _Batch(self)
+
+
+class _Client:
+    """Stands in for AsyncPlayByPlayClient with scripted responses."""
+
+    def __init__(self, responses):
+        self.responses = responses      # game_id -> list of (plays, ended) | None
+        self.calls = []
+        self.forgotten = []
+
+    async def fetch_plays_since(self, game_id, after_seq):
+        self.calls.append((game_id, after_seq))
+        script = self.responses[game_id]
+        result = script.pop(0) if len(script) > 1 else script[0]
+        if result is None:
+            return None
+        plays, ended = result
+        return [p for p in plays if p.sequenceNumber > after_seq], ended
+
+    def forget(self, game_id):
+        self.forgotten.append(game_id)
+
+
+def _service(monkeypatch, db, client):
+    monkeypatch.setattr(polling, "get_firestore_db", lambda: db)
+    monkeypatch.setattr(polling, "async_pbp_client", client)
+    monkeypatch.setattr(FirebasePBPService, "apply_shot_summaries", staticmethod(lambda db, shots: 0))
+    records = []
+    monkeypatch.setattr(PBPPollingService, "_update_game_records",
+                        staticmethod(lambda gid, meta: records.append(gid) or True))
+    finalized = []
+    monkeypatch.setattr(FirebasePBPService, "finalize_game", staticmethod(lambda gid: finalized.append(gid)))
+    monkeypatch.setattr(PBPPollingService, "_seed_channel", staticmethod(lambda channel: None))
+    svc = PBPPollingService()
+    return svc, records, finalized
+
+
+def _track(svc, *game_ids):
+    for gid in game_ids:
+        svc.games[gid] = TrackedGame(game_id=gid)
+
+
+def _meta(date="2025-11-03"):
+    return {"gameDate": date, "homeTeam": {"tricode": "LAL"}, "awayTeam": {"tricode": "BOS"}}
+
+
+def test_cycle_batches_all_games(monkeypatch):
+    db = _DB({"live_games/1": _meta(), "live_games/2": _meta()})
+    client = _Client({
+        "1": [([_play(1), _play(2, shooting=True)], False)],
+        "2": [([_play(5)], False)],
+    })
+    svc, records, _ = _service(monkeypatch, db, client)
+    _track(svc, "1", "2")
+
+    asyncio.run(svc._run_cycle(list(svc.games.values())))
+
+    assert db.commits == 1 and svc.commits == 1
+    assert "pbp_events/1/events/000002" in db.docs
+    assert "pbp_events/2/events/000005" in db.docs
+    assert db.docs["live_games/1"]["lastSequenceNumber"] == 2
+    assert db.docs["live_games/2"]["lastSequenceNumber"] == 5
+    assert any(path.startswith("player_shots/2544/") for path in db.docs)
+    assert sorted(records) == ["1", "2"]
+
+
+def test_metadata_read_once_and_cursor_advances(monkeypatch):
+    db = _DB({"live_games/1": {**_meta(), "lastSequenceNumber": 3}})
+    plays = [_play(s) for s in range(1, 7)]
+    client = _Client({"1": [(plays[:5], False), (plays, False), None]})
+    svc, records, _ = _service(monkeypatch, db, client)
+    _track(svc, "1")
+    game = svc.games["1"]
+
+    async def _run():
+        for _ in range(3):
+            await svc._run_cycle([game])
+
+    asyncio.run(_run())
+
+    assert db.reads == ["live_games/1"]
+    assert [after for _, after in client.calls] == [3, 5, 6]
+    assert game.cursor == 6 and records == ["1"]
+    published = [p["sequenceNumber"] for p in svc.get_channel("1").plays()]
+    assert published == [4, 5, 6]
+
+
+def test_failed_commit_keeps_cursor(monkeypatch):
+    db = _DB({"live_games/1": _meta()})
+    client = _Client({"1": [([_play(1), _play(2)], False)]})
+    svc, _, _ = _service(monkeypatch, db, client)
+    _track(svc, "1")
+    game = svc.games["1"]
+
+    db.fail_commits = True
+    asyncio.run(svc._run_cycle([game]))
+    assert game.cursor == -1 and game.errors == 1
+    assert client.forgotten == ["1"]
+    assert svc.get_channel("1").plays() == []
+
+    db.fail_commits = False
+    asyncio.run(svc._run_cycle([game]))
+    assert game.cursor == 2 and game.errors == 0
+
+
+def test_adaptive_interval():
+    svc = PBPPollingService
+    assert clock_seconds("4:59") == 299 and clock_seconds("45.2") == 45.2
+    assert svc.adaptive_interval(None) == svc.PREGAME_INTERVAL_SEC
+    assert svc.adaptive_interval(_play(1, period=2, clock="6:00")) == svc.POLL_INTERVAL_SEC
+    assert svc.adaptive_interval(_play(1, period=4, clock="2:10", home=99, away=97)) == svc.CLUTCH_INTERVAL_SEC
+    assert svc.adaptive_interval(_play(1, period=5, clock="30.0", home=110, away=110)) == svc.CLUTCH_INTERVAL_SEC
+    assert svc.adaptive_interval(_play(1, period=4, clock="2:10", home=120, away=97)) == svc.POLL_INTERVAL_SEC
+    assert svc.adaptive_interval(_play(1, period=2, clock="0:00", event="End Period")) == svc.HALFTIME_INTERVAL_SEC
+    assert svc.adaptive_interval(_play(1, period=3, clock="0:00", text="End of the 3rd Quarter")) == svc.BREAK_INTERVAL_SEC
+
+    instance = PBPPollingService()
+    game = TrackedGame(game_id="1", last_play=_play(1, period=2, clock="6:00"), errors=3)
+    instance._reschedule(game, now=100.0)
+    assert game.next_poll == 100.0 + min(svc.POLL_INTERVAL_SEC * 8, svc.MAX_BACKOFF_SEC)
+
+
+def test_game_end_finalizes(monkeypatch):
+    db = _DB({"live_games/1": _meta()})
+    client = _Client({"1": [([_play(1), _play(2, event="End Game", text="End of Game")], True)]})
+    svc, _, finalized = _service(monkeypatch, db, client)
+    _track(svc, "1")
+    sub = svc.subscribe_sse("1")
+
+    asyncio.run(svc._run_cycle([svc.games["1"]]))
+
+    assert finalized == ["1"]
+    assert "1" not in svc.games and "1" in client.forgotten
+    assert db.docs["live_games/1"]["lastSequenceNumber"] == 2
+    assert svc.get_channel("1").ended_frame is not None
+    assert sub.queue.qsize() == 2  # plays batch, then game_ended
+
+
+def test_stop_tracking_drops_channel(monkeypatch):
+    db = _DB({"live_games/1": _meta()})
+    client = _Client({"1": [([_play(1)], False)]})
+    svc, _, _ = _service(monkeypatch, db, client)
+    _track(svc, "1")
+    channel = svc.get_channel("1")
+    sub = svc.subscribe_sse("1")
+    asyncio.run(svc._run_cycle([svc.games["1"]]))
+
+    svc.stop_tracking("1")
+    assert "1" not in svc.games and "1" not in svc.channels
+    assert sub.queue.qsize() == 2 and channel.ended_frame is not None   # plays, then game_ended
+    svc.unsubscribe_sse("1", sub)
+    assert "1" not in svc.channels
+
+    # Retired channels beyond ENDED_CHANNELS_KEPT go even with a client attached
+    monkeypatch.setattr(PBPPollingService, "ENDED_CHANNELS_KEPT", 2)
+    lingering = svc.subscribe_sse("a")
+    for gid in ("a", "b", "c"):
+        svc.get_channel(gid).end()
+        svc._retire_channel(gid)
+    assert sorted(svc.channels) == ["b", "c"] and svc._ended_order == ["b", "c"]
+    assert lingering.queue.qsize() == 1
@@ -0,0 +1,120 @@
+"""
+PBP Stream Buffer Tests
+=======================
+Uses asyncio.run() directly — no pytest-asyncio dependency required.
+
+a) A batch is encoded once and the same bytes reach every subscriber
+b) Last-Event-ID resume replays only the missed plays in one frame
+c) Resume points older than the ring get a resync event
+d) Eviction keeps the ring bounded and clears the `complete` flag
+e) Overflowing subscribers receive one compacted replay instead of the backlog
+f) Late joiners after game end receive game_ended immediately
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.pbp_stream_buffer import PBPGameChannel
+
+
+def _plays(*seqs):
+    return [{"sequenceNumber": s, "description": f"play {s}", "period": 1, "clock": "10:00"} for s in seqs]
+
+
+def _payload(frame: bytes) -> dict:
+    line = [l for l in frame.decode().splitlines() if l.startswith("data: ")][0]
+    return json.loads(line[len("data: "):])
+
+
+def _drain(channel, sub):
+    async def _run():
+        frames = []
+        while not sub.queue.empty():
+            frames.append(await channel.next_frame(sub))
+        return frames
+    return asyncio.run(_run())
+
+
+def test_batch_encoded_once_for_all_subscribers():
+    async def _test():
+        channel = PBPGameChannel("g1")
+        subs = [channel.subscribe() for _ in range(4)]
+        channel.publish(_plays(1, 2, 3))
+        return [await channel.next_frame(s) for s in subs]
+
+    frames = asyncio.run(_test())
+    assert all(f is frames[0] for f in frames)
+    assert frames[0].startswith(b"id: 3\n")
+    assert [p["sequenceNumber"] for p in _payload(frames[0])["plays"]] == [1, 2, 3]
+
+
+def test_resume_replays_missed_plays():
+    channel = PBPGameChannel("g1")
+    channel.publish(_plays(1, 2, 3))
+    channel.publish(_plays(4, 5))
+    channel.publish(_plays(6))
+
+    sub = channel.subscribe(last_event_id=4)
+    frames = _drain(channel, sub)
+    assert len(frames) == 1
+    assert [p["sequenceNumber"] for p in _payload(frames[0])["plays"]] == [5, 6]
+
+    current = channel.subscribe(last_event_id=6)
+    assert current.queue.empty()
+
+
+def test_resume_before_ring_gets_resync():
+    channel = PBPGameChannel("g1", start_cursor=100)  # cold start mid-game, not seeded
+    channel.publish(_plays(101, 102))
+    assert not channel.complete
+
+    sub = channel.subscribe(last_event_id=50)
+    assert _payload(_drain(channel, sub)[0])["type"] == "resync"
+
+
+def test_eviction_bounds_memory():
+    channel = PBPGameChannel("g1", max_plays=5)
+    for start in range(1, 13, 3):
+        channel.publish(_plays(start, start + 1, start + 2))
+    assert channel.stats()["buffered_plays"] <= 5
+    assert not channel.complete
+    assert channel.covers(9) and not channel.covers(3)
+
+
+def test_slow_subscriber_gets_compacted_replay():
+    async def _test():
+        channel = PBPGameChannel("g1")
+        sub = channel.subscribe(last_event_id=0)
+        sub.queue = asyncio.Queue(maxsize=2)
+        for seq in range(1, 6):
+            channel.publish(_plays(seq))
+        frame = await channel.next_frame(sub)
+        return sub, frame
+
+    sub, frame = asyncio.run(_test())
+    assert sub.compactions >= 1
+    assert [p["sequenceNumber"] for p in _payload(frame)["plays"]] == [1, 2, 3, 4, 5]
+    assert sub.last_seq == 5
+
+
+def test_late_joiner_after_end():
+    channel = PBPGameChannel("g1")
+    channel.publish(_plays(1))
+    channel.end()
+    sub = channel.subscribe()
+    frames = _drain(channel, sub)
+    assert frames == [channel.ended_frame]
+    assert _payload(frames[0])["type"] == "game_ended"
+
+
+def test_seed_marks_buffer_complete():
+    channel = PBPGameChannel("g1", start_cursor=None)
+    channel.prime(3)
+    channel.seed(_plays(3, 1, 2))
+    assert channel.complete
+    assert [p["sequenceNumber"] for p in channel.plays()] == [1, 2, 3]
@@ -4,8 +4,8 @@ Phase 3 — Live State Cache & Polling Refactor
 Tests for the updated PBPPollingService:
   - Static helper methods (_read_cursor, _write_live_state) are tested
     synchronously against the in-memory Firestore mock.
-  - The async _poll_loop is not fully integration-tested here (that's Phase 7)
-    but key behaviours (v2 call, finalization trigger) are verified via mocks.
+  - The async scheduler is not fully integration-tested here (see
+    test_pbp_scheduler.py) but key wiring (v2 writes, finalization) is verified.
 
 Run:
     cd backend && python tests/test_phase3_polling.py
@@ -182,7 +182,7 @@ def t32_write_live_state_fields():
 def t33_cadence_throttle():
     """
     Simulate two rapid calls to _write_live_state via the throttle logic
-    in _poll_loop.  We test the throttle guard directly.
+    in _run_cycle.  We test the throttle guard directly.
     """
     cadence = PBPPollingService_cadence = 5.0  # seconds
 
@@ -230,37 +230,37 @@ def t34_cursor_survives_restart():
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# T-35: save_plays_batch_v2 is called in the poll loop (not old method)
+# T-35: the cycle commit stages the v2 write path (not old method)
 # ─────────────────────────────────────────────────────────────────────────────
-def t35_poll_loop_uses_v2():
+def t35_cycle_commit_uses_v2():
     """
-    Verify _poll_loop calls save_plays_batch_v2, not save_plays_batch.
-    We do this by checking calls on a mock PBP service.
+    Verify _commit_cycle stages plays through the v2 writer
+    (stage_plays_v2), not the legacy save_plays_batch.
     """
     import inspect
     from services.pbp_polling_service import PBPPollingService
 
     # Read the source and verify it references the right function
-    source = inspect.getsource(PBPPollingService._poll_loop)
-    assert "save_plays_batch_v2" in source, \
-        "_poll_loop must call save_plays_batch_v2, not the legacy save_plays_batch"
-    # It should NOT call the old signature directly
-    # (It's OK if "save_plays_batch" appears as a substring of save_plays_batch_v2)
+    source = inspect.getsource(PBPPollingService._commit_cycle)
+    assert "stage_plays_v2" in source, \
+        "_commit_cycle must stage plays with stage_plays_v2"
+    assert "save_plays_batch(" not in source
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# T-36: _poll_loop calls finalize_game on game-end detection
+# T-36: the scheduler calls finalize_game on game-end detection
 # ─────────────────────────────────────────────────────────────────────────────
 def t36_finalization_wired():
     """
-    Verify finalize_game is referenced in the poll loop.
+    Verify finalize_game is referenced by the scheduler's finalize step.
     """
     import inspect
     from services.pbp_polling_service import PBPPollingService
 
-    source = inspect.getsource(PBPPollingService._poll_loop)
+    assert "_finalize" in inspect.getsource(PBPPollingService._run_cycle)
+    source = inspect.getsource(PBPPollingService._finalize)
     assert "finalize_game" in source, \
-        "_poll_loop must call finalize_game on game-end"
+        "_finalize must call finalize_game on game-end"
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -289,8 +289,8 @@ if __name__ == "__main__":
     test("T-32  _write_live_state creates correct fields", t32_write_live_state_fields)
     test("T-33  Cadence throttle logic correct", t33_cadence_throttle)
     test("T-34  Cursor survives restart simulation", t34_cursor_survives_restart)
-    test("T-35  _poll_loop uses save_plays_batch_v2", t35_poll_loop_uses_v2)
-    test("T-36  _poll_loop wired to finalize_game", t36_finalization_wired)
+    test("T-35  cycle commit uses stage_plays_v2", t35_cycle_commit_uses_v2)
+    test("T-36  scheduler wired to finalize_game", t36_finalization_wired)
     test("T-37  Phase 0+1+2 regression", t37_regression_phases_012)
 
     passed = sum(1 for _, ok, _ in results if ok)
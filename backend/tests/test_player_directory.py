@@ -0,0 +1,182 @@
+"""
+PlayerDirectory Tests
+=====================
+Verifies the in-memory search index behind GET /players/search:
+
+a) Accent-insensitive prefix search ranks exact > prefix > substring
+b) Multi-token prefixes ("lebr jam") intersect correctly
+c) Trigram fuzzy matching tolerates typos
+d) Snapshot version is stable and changes only with roster content
+e) invalidate() triggers exactly one reload; loader failures serve stale data
+f) Endpoint sets ETag and answers If-None-Match with 304
+g) peek() serves a stale snapshot while one background rebuild swaps in the new roster
+"""
+
+import sys
+import os
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.player_directory import PlayerDirectory, normalize_name
+
+
+ROSTER = [
+    {"player_id": "2544", "player_name": "LeBron James", "team": "LAL", "position": "F"},
+    {"player_id": "203999", "player_name": "Nikola Jokić", "team": "DEN", "position": "C"},
+    {"player_id": "1628983", "player_name": "Shai Gilgeous-Alexander", "team": "OKC", "position": "G"},
+    {"player_id": "203507", "player_name": "Giannis Antetokounmpo", "team": "MIL", "position": "F"},
+    {"player_id": "1626179", "player_name": "Terry Rozier", "team": "MIA", "position": "G"},
+    {"player_id": "1630178", "player_name": "Tyrese Maxey", "team": "PHI", "position": "G"},
+    {"player_id": "1629029", "player_name": "Luka Dončić", "team": "LAL", "position": "G"},
+    {"player_id": "1627750", "player_name": "Jamal Murray", "team": "DEN", "position": "G"},
+]
+
+
+def _directory(roster=None):
+    calls = {"n": 0}
+    data = {"roster": list(roster or ROSTER)}
+
+    def loader():
+        calls["n"] += 1
+        return data["roster"]
+
+    return PlayerDirectory(loader=loader), calls, data
+
+
+def test_normalize_name_folds_accents_and_punctuation():
+    assert normalize_name("Nikola Jokić") == "nikola jokic"
+    assert normalize_name("Shai Gilgeous-Alexander") == "shai gilgeous alexander"
+    assert normalize_name("  Royce O'Neale ") == "royce oneale"
+
+
+def test_accent_insensitive_prefix():
+    directory, _, _ = _directory()
+    results = directory.search("joki")
+    assert results[0]["name"] == "Nikola Jokić"
+    assert directory.search("donc")[0]["id"] == "1629029"
+
+
+def test_ranking_exact_before_prefix_before_substring():
+    directory, _, _ = _directory()
+    names = [r["name"] for r in directory.search("ja")]
+    # "James" and "Jamal" are token prefixes and must outrank any fuzzy fill
+    assert set(names[:2]) == {"LeBron James", "Jamal Murray"}
+    assert directory.search("lebron james")[0]["id"] == "2544"
+
+
+def test_multi_token_prefix_intersection():
+    directory, _, _ = _directory()
+    results = directory.search("lebr jam")
+    assert [r["id"] for r in results] == ["2544"]
+    assert directory.search("gilgeous alex")[0]["id"] == "1628983"
+
+
+def test_fuzzy_typo_tolerance():
+    directory, _, _ = _directory()
+    results = directory.search("antetokoumpo")
+    assert results and results[0]["id"] == "203507"
+
+
+def test_empty_query_returns_full_sorted_roster():
+    directory, _, _ = _directory()
+    results = directory.search("")
+    assert len(results) == len(ROSTER)
+    assert [r["name"] for r in results] == sorted(
+        (r["name"] for r in results), key=normalize_name
+    )
+
+
+def test_version_tracks_content():
+    a, _, _ = _directory()
+    b, _, _ = _directory(list(reversed(ROSTER)))
+    assert a.version == b.version
+
+    c, _, _ = _directory(ROSTER + [{"player_id": "1", "player_name": "New Guy"}])
+    assert c.version != a.version
+
+
+def test_invalidate_reloads_once():
+    directory, calls, data = _directory()
+    directory.search("james")
+    directory.search("murray")
+    assert calls["n"] == 1
+
+    data["roster"] = ROSTER + [{"player_id": "9", "player_name": "Cooper Flagg"}]
+    directory.invalidate()
+    assert directory.search("flagg")[0]["id"] == "9"
+    assert calls["n"] == 2
+
+
+def test_loader_failure_serves_stale_snapshot():
+    directory, _, data = _directory()
+    version = directory.version
+
+    def broken():
+        raise RuntimeError("firestore down")
+
+    directory._loader = broken
+    directory.invalidate()
+    assert directory.version == version
+    assert directory.search("maxey")[0]["id"] == "1630178"
+
+
+def test_search_endpoint_etag_roundtrip(monkeypatch):
+    import api.public_routes as public_routes
+
+    directory, calls, _ = _directory()
+    monkeypatch.setattr(public_routes, "get_player_directory", lambda: directory)
+
+    app = FastAPI()
+    app.include_router(public_routes.router)
+    client = TestClient(app)
+
+    resp = client.get("/players/search", params={"q": "jokic"})
+    assert resp.status_code == 200
+    assert resp.json()[0]["id"] == "203999"
+    etag = resp.headers["etag"]
+
+    cached = client.get("/players/search", params={"q": "jokic"}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert calls["n"] == 1
+
+
+def test_peek_refreshes_in_background(monkeypatch):
+    import api.public_routes as public_routes
+
+    directory, calls, data = _directory()
+    monkeypatch.setattr(public_routes, "get_player_directory", lambda: directory)
+    app = FastAPI()
+    app.include_router(public_routes.router)
+    client = TestClient(app)
+    assert directory.peek() is None
+    old = directory.snapshot()
+
+    release = threading.Event()
+    loader = directory._loader
+
+    def slow_loader():
+        release.wait(30)
+        return loader()
+
+    directory._loader = slow_loader
+    data["roster"] = ROSTER + [{"player_id": "9", "player_name": "Cooper Flagg"}]
+    directory.invalidate()
+
+    # Stale snapshot is served immediately; repeated peeks start one rebuild
+    assert directory.peek() is old and directory.peek() is old
+    resp = client.get("/players/search", params={"q": "flagg"})
+    assert resp.headers["etag"] == f'W/"{old.version}"' and resp.json() == []
+
+    release.set()
+    for _ in range(100):
+        if directory._snapshot is not old and not directory._refreshing:
+            break
+        threading.Event().wait(0.01)
+    assert calls["n"] == 2
+    assert directory.peek().search("flagg")[0]["id"] == "9"
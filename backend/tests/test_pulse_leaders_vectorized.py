@@ -0,0 +1,151 @@
+"""
+Vectorized Pulse Leader Tests
+=============================
+a) calculate_live_pie_many matches the scalar calculate_live_pie row for row
+b) TS% / eFG% / in-game usage vector variants match their scalars, zero-attempt edges included
+c) BoxScoreColumns keeps active players only, with per-team totals equal to get_team_stats
+d) _top_k (argpartition) returns the same order as a stable descending sort, ties included
+e) One batch over several games yields the same leaders as per-game extraction
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import services.season_baseline_service as sbs
+from shared_core.adapters.nba_api_adapter import BoxScoreColumns, NBAApiAdapter, minutes_to_float
+from shared_core.calculators.advanced_stats import (
+    calculate_effective_fg,
+    calculate_effective_fg_many,
+    calculate_in_game_usage,
+    calculate_in_game_usage_many,
+    calculate_true_shooting,
+    calculate_true_shooting_many,
+)
+from shared_core.engines.pie_calculator import calculate_live_pie, calculate_live_pie_many
+
+PIE_FIELDS = ['pts', 'fgm', 'fga', 'ftm', 'fta', 'oreb', 'dreb', 'ast', 'stl', 'blk', 'pf', 'tov']
+
+
+def _stat_lines(n=500, seed=7):
+    rng = np.random.default_rng(seed)
+    lines = {f: rng.integers(0, 15, n) for f in PIE_FIELDS + ['fg3m']}
+    lines['fga'][:25] = 0                      # no shots
+    lines['fta'][:10] = 0                      # no shots, no free throws
+    return lines
+
+
+def _pick(lines, fields):
+    return {f: lines[f] for f in fields}
+
+
+def _player(pid, pts, fga, fgm, fta=0, tov=0, minutes="PT20M", status="ACTIVE", **extra):
+    stats = {"points": pts, "fieldGoalsAttempted": fga, "fieldGoalsMade": fgm,
+             "freeThrowsAttempted": fta, "turnovers": tov, "minutes": minutes, **extra}
+    return {"personId": pid, "name": f"Player {pid}", "status": status, "statistics": stats}
+
+
+def _boxscore(game_id, home, away, home_players, away_players, period=2, margin=2):
+    return NBAApiAdapter().normalize_boxscore({"game": {
+        "gameId": game_id, "gameStatus": 2, "period": period, "gameClock": "PT05M00.00S",
+        "homeTeam": {"teamTricode": home, "score": 50 + margin, "players": home_players},
+        "awayTeam": {"teamTricode": away, "score": 50, "players": away_players},
+    }})
+
+
+def test_live_pie_many_matches_scalar():
+    lines = _stat_lines()
+    vector = calculate_live_pie_many(**_pick(lines, PIE_FIELDS))
+    scalar = [calculate_live_pie(**{f: int(lines[f][i]) for f in PIE_FIELDS}) for i in range(len(vector))]
+    assert vector.tolist() == scalar
+    assert vector.min() >= -0.5 and vector.max() <= 1.0
+    assert not calculate_live_pie_many(**_pick(lines, PIE_FIELDS), game_total_estimate=0).any()
+
+
+def test_shooting_and_usage_many_match_scalars():
+    lines = _stat_lines()
+    pts, fgm, fg3m, fga, fta, tov = (lines[f] for f in ('pts', 'fgm', 'fg3m', 'fga', 'fta', 'tov'))
+    n = len(pts)
+    rng = np.random.default_rng(11)
+    minutes = rng.uniform(0, 40, n)
+    minutes[:5] = 0
+    team_fga, team_fta, team_tov = rng.integers(0, 90, n), rng.integers(0, 30, n), rng.integers(0, 15, n)
+    elapsed = rng.uniform(1, 48, n)
+
+    ts = calculate_true_shooting_many(pts, fga, fta)
+    efg = calculate_effective_fg_many(fgm, fg3m, fga)
+    usg = calculate_in_game_usage_many(fga, fta, tov, minutes, team_fga, team_fta, team_tov, elapsed)
+    for i in range(n):
+        assert ts[i] == pytest.approx(calculate_true_shooting(pts[i], fga[i], fta[i]))
+        assert efg[i] == pytest.approx(calculate_effective_fg(fgm[i], fg3m[i], fga[i]))
+        assert usg[i] == pytest.approx(calculate_in_game_usage(
+            fga[i], fta[i], tov[i], minutes[i], team_fga[i], team_fta[i], team_tov[i], elapsed[i]))
+    assert ts[:10].tolist() == [0.0] * 10 and usg[:5].tolist() == [0.0] * 5
+
+
+def test_box_score_columns():
+    box = _boxscore("1", "LAL", "BOS",
+                    [_player(1, 20, 12, 8, fta=4, tov=2, minutes="PT20M30.00S"),
+                     _player(2, 5, 6, 2, tov=1),
+                     _player(3, 0, 0, 0, status="INACTIVE")],
+                    [_player(4, 15, 10, 6, fta=2, tov=3, minutes="PT19M")])
+    cols = box.to_columns("LAL", "BOS")
+
+    assert len(cols) == 3 and [p.player_id for p in cols.players] == ["1", "2", "4"]
+    assert cols.spans == {"1": (0, 3)}
+    assert cols["pts"].tolist() == [20, 5, 15]
+    assert cols.opponents.tolist() == ["BOS", "BOS", "LAL"]
+    assert cols.minutes[0] == pytest.approx(20.5) and minutes_to_float("bad") == 0.0
+    for row, team in ((0, "LAL"), (1, "LAL"), (2, "BOS")):
+        expected = box.get_team_stats(team)
+        assert [cols.team_totals[f][row] for f in ("fga", "fta", "tov")] == \
+            [expected["fga"], expected["fta"], expected["tov"]]
+    assert cols.team_totals["minutes"].tolist() == [40.5, 40.5, 19.0]
+
+
+def test_top_k_matches_stable_sort():
+    producer = pytest.importorskip("services.async_pulse_producer_cloud")
+    rng = np.random.default_rng(3)
+    for values in (rng.integers(0, 6, 200).astype(float), rng.normal(size=57), np.array([0.2, 0.5]), np.empty(0)):
+        expected = sorted(range(len(values)), key=lambda i: values[i], reverse=True)
+        for k in (1, 10, 20, 300):
+            assert producer._top_k(values, k).tolist() == expected[:k]
+
+
+def test_batch_scoring_matches_per_game(monkeypatch):
+    import services.async_pulse_producer_cloud as producer
+
+    if not producer.ADAPTER_AVAILABLE:
+        pytest.skip("shared_core engines shadowed by backend/engines in this run")
+
+    monkeypatch.setattr(sbs, "_snapshot", sbs._EMPTY)
+    monkeypatch.setattr(sbs, "_last_attempt", 1e18)           # no lazy Firestore load
+    sbs.install_snapshot({"1": {"usage_pct": 0.10, "ts_pct": 0.50}, "4": {"usage_pct": 0.30, "ts_pct": 0.70}},
+                         {"BOS": {"def_rating": 105.0}, "LAL": {"def_rating": 116.0}})
+    games = [
+        (_boxscore("1", "LAL", "BOS",
+                   [_player(1, 20, 12, 8, fta=4, tov=2), _player(2, 5, 6, 2, tov=1)],
+                   [_player(4, 15, 10, 6, fta=2, tov=3, minutes="PT19M")]), "LAL", "BOS"),
+        (_boxscore("2", "NYK", "MIA",
+                   [_player(5, 30, 15, 12, fta=6)], [_player(6, 2, 9, 1), _player(7, 2, 2, 1)],
+                   period=4, margin=30), "NYK", "MIA"),
+    ]
+    prod = producer.CloudAsyncPulseProducer.__new__(producer.CloudAsyncPulseProducer)
+    by_game, rows, pie = prod._score_leaders(games)
+
+    for box, home, away in games:
+        assert by_game[box.game_id] == prod._extract_leaders_from_normalized(box, home, away)
+    assert [r["pie"] for r in rows] == pie.tolist()
+    assert [rows[i]["player_id"] for i in producer._top_k(pie, 3)] == ["5", "1", "4"]
+
+    starter = next(r for r in rows if r["player_id"] == "1")
+    assert starter["usage_rate"] == pytest.approx(
+        calculate_in_game_usage(12, 4, 2, 20, 18, 4, 3, 40 / 5), abs=0.05)
+    assert starter["usage_vacuum"] is True and starter["heat_scale"] == "hot"
+    assert starter["opponent"] == "BOS" and starter["matchup_difficulty"] == "elite"
+    assert all(r["is_garbage_time"] for r in by_game["2"]) and not any(r["is_garbage_time"] for r in by_game["1"])
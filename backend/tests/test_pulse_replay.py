@@ -0,0 +1,113 @@
+"""
+Pulse Replay Harness Tests
+==========================
+Uses asyncio.run() directly — no pytest-asyncio dependency required.
+
+a) Timeline answers with the latest body at or before the replay time
+b) Query strings are canonicalised; out-of-order lines are rejected
+c) Replay server sends ETags and answers If-None-Match with 304
+d) Synthetic night normalizes through NBAApiAdapter with rising scores
+e) Benchmark percentiles and baseline regression check
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+# Ensure backend directory (and scripts/) is in path
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'scripts'))
+
+from aiohttp import test_utils
+
+from pulse_replay_server import (
+    BOXSCORE_PATH, ESPN_SUMMARY_PATH, SCOREBOARD_PATH,
+    ReplayClock, ReplayTimeline, create_app, resource_key, synthesize,
+)
+from pulse_load_benchmark import compare, percentiles
+from shared_core.adapters.nba_api_adapter import NBAApiAdapter
+
+
+def _timeline():
+    return ReplayTimeline.from_records([
+        {"t": 0, "path": SCOREBOARD_PATH, "body": {"v": 1}},
+        {"t": 10, "path": SCOREBOARD_PATH, "body": {"v": 2}},
+        {"t": 5, "path": ESPN_SUMMARY_PATH, "query": "event=42", "body": {"plays": []}},
+    ])
+
+
+def test_timeline_lookup():
+    tl = _timeline()
+    assert json.loads(tl.lookup(SCOREBOARD_PATH, 0)[1]) == {"v": 1}
+    assert json.loads(tl.lookup(SCOREBOARD_PATH, 9.9)[1]) == {"v": 1}
+    assert json.loads(tl.lookup(SCOREBOARD_PATH, 10)[1]) == {"v": 2}
+    summary = resource_key(ESPN_SUMMARY_PATH, "event=42")
+    assert tl.lookup(summary, 4) is None
+    assert tl.lookup(summary, 5) is not None
+    assert tl.duration == 10
+
+
+def test_query_canonical_and_order_enforced():
+    assert resource_key("/p", "b=2&a=1") == resource_key("/p", "a=1&b=2")
+    tl = ReplayTimeline()
+    tl.add(5, "/p", "", {})
+    with pytest.raises(ValueError):
+        tl.add(4, "/p", "", {})
+
+
+def test_server_etag_and_304():
+    async def _test():
+        clock = ReplayClock(speedup=1.0, start_at=10)
+        client = test_utils.TestClient(test_utils.TestServer(create_app(_timeline(), clock)))
+        await client.start_server()
+        try:
+            first = await client.get(SCOREBOARD_PATH)
+            etag = first.headers["ETag"]
+            body = await first.json()
+            again = await client.get(SCOREBOARD_PATH, headers={"If-None-Match": etag})
+            missing = await client.get(BOXSCORE_PATH.format(game_id="1"))
+            status = await (await client.get("/_replay/status")).json()
+            return first.status, body, again.status, missing.status, status
+        finally:
+            await client.close()
+
+    first, body, again, missing, status = asyncio.run(_test())
+    assert (first, again, missing) == (200, 304, 404)
+    assert body == {"v": 2}
+    assert status["not_modified"] == 1 and status["not_found"] == 1
+
+
+def test_synthetic_night_normalizes():
+    records = list(synthesize(games=2, step=60.0, stagger=300.0, seed=3))
+    tl = ReplayTimeline.from_records(records)
+    adapter = NBAApiAdapter()
+
+    previous = {}
+    for t in range(0, int(tl.duration) + 1, 300):
+        games = adapter.normalize_scoreboard(json.loads(tl.lookup(SCOREBOARD_PATH, t)[1]))
+        assert len(games) == 2
+        for g in games:
+            total = g.home_score + g.away_score
+            assert total >= previous.get(g.game_id, 0)
+            previous[g.game_id] = total
+    final = adapter.normalize_scoreboard(json.loads(tl.lookup(SCOREBOARD_PATH, tl.duration)[1]))
+    assert {g.status for g in final} == {"FINAL"}
+
+    gid = final[0].game_id
+    box = adapter.normalize_boxscore(json.loads(tl.lookup(BOXSCORE_PATH.format(game_id=gid), tl.duration)[1]))
+    assert sum(p.pts for p in box.home_players) == final[0].home_score
+
+
+def test_percentiles_and_regressions():
+    stats = percentiles([float(v) for v in range(1, 101)])
+    assert (stats["p50"], stats["p99"], stats["max"], stats["count"]) == (50.0, 99.0, 100.0, 100)
+    assert percentiles([])["p50"] is None
+
+    baseline = {"sse": {"fanout_ms": {"p99": 100.0}}, "cycle_ms": {"p95": 50.0}}
+    report = {"sse": {"fanout_ms": {"p99": 130.0}}, "cycle_ms": {"p95": 55.0}}
+    regressions = compare(report, baseline, tolerance=0.25)
+    assert len(regressions) == 1 and regressions[0].startswith("sse.fanout_ms.p99")
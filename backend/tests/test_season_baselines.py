@@ -0,0 +1,196 @@
+"""
+Season Baseline Snapshot Tests
+==============================
+a) Gathers align with the requested ids; unknown ids and missing fields get league defaults
+b) Scalar readers and vectorized defense tiers agree with _classify_defense
+c) warm_cache bulk-loads both collections and hot-swaps a new version
+d) Readers holding the old snapshot are unaffected by a swap
+e) Producer leader extraction uses one gather per boxscore
+f) A cold snapshot read returns defaults at once and loads in the background
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import services.season_baseline_service as sbs
+from services.season_baseline_service import (
+    BaselineSnapshot,
+    classify_defense_many,
+    gather_leader_baselines,
+    get_player_rolling_ts,
+    get_player_season_usage,
+    get_team_defense_rating,
+    install_snapshot,
+)
+
+PLAYERS = {
+    "2544": {"usage_pct": 0.31, "ts_pct": 0.61, "ppg": 25.2, "name": "LeBron James"},
+    "1629029": {"usage_pct": 0.36, "ppg": 33.1},           # no ts_pct
+}
+TEAMS = {
+    "BOS": {"def_rating": 105.1, "pace": 97.0},
+    "WAS": {"def_rating": 118.4},
+    "NYK": {"def_rating": 110.0},
+}
+
+
+@pytest.fixture(autouse=True)
+def _isolated_snapshot(monkeypatch):
+    monkeypatch.setattr(sbs, "_snapshot", sbs._EMPTY)
+    monkeypatch.setattr(sbs, "_last_attempt", time.time())  # no lazy Firestore load
+
+
+class _Doc:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _Collection:
+    def __init__(self, db, docs):
+        self.db = db
+        self.docs = docs
+
+    def document(self, _season):
+        return self
+
+    def collection(self, name):
+        return _Collection(self.db, self.db.data[name])
+
+    def stream(self):
+        self.db.streams += 1
+        return [_Doc(k, v) for k, v in self.docs.items()]
+
+
+class _DB:
+    def __init__(self, players, teams):
+        self.data = {"players": players, "teams": teams}
+        self.streams = 0
+
+    def collection(self, _name):
+        return _Collection(self, {})
+
+
+def test_gather_alignment_and_defaults():
+    snap = BaselineSnapshot.build(PLAYERS, TEAMS, version=1)
+    ids = ["1629029", "unknown", "2544"]
+    values = snap.players.gather(ids, "usage_pct", "ts_pct")
+    np.testing.assert_allclose(values, [[0.36, sbs.LEAGUE_AVG_TS], [sbs.LEAGUE_AVG_USAGE, sbs.LEAGUE_AVG_TS], [0.31, 0.61]])
+    assert np.isnan(snap.players.value("2544", "rpg"))
+    assert snap.teams.gather(["WAS", "XXX"], "def_rating")[:, 0].tolist() == [118.4, sbs.LEAGUE_AVG_DEF_RATING]
+    assert not snap.players.values.flags.writeable
+
+
+def test_scalar_readers_and_tiers(monkeypatch):
+    install_snapshot(PLAYERS, TEAMS)
+    assert get_player_season_usage("2544") == 0.31
+    assert get_player_rolling_ts("1629029") == sbs.LEAGUE_AVG_TS
+    assert get_team_defense_rating("BOS") == (105.1, "elite")
+    assert get_team_defense_rating("???") == (sbs.LEAGUE_AVG_DEF_RATING, "average")
+    assert sbs.get_player_baselines("2544")["name"] == "LeBron James"
+
+    ratings = np.array([100.0, 105.99, 106.0, 109.9, 110.0, 113.9, 114.0, 130.0])
+    assert classify_defense_many(ratings).tolist() == [sbs._classify_defense(r) for r in ratings]
+
+
+def test_warm_cache_hot_swap(monkeypatch):
+    db = _DB(dict(PLAYERS), dict(TEAMS))
+    monkeypatch.setattr(sbs, "_db", db)
+    before = sbs.get_baseline_snapshot().version
+
+    assert sbs.warm_cache("2025-26")
+    first = sbs.get_baseline_snapshot()
+    assert first.version == before + 1 and db.streams == 2
+    assert len(first.players) == 2 and len(first.teams) == 3
+
+    db.data["players"] = {**PLAYERS, "2544": {"usage_pct": 0.29, "ts_pct": 0.6}}
+    assert sbs.warm_cache("2025-26")
+    second = sbs.get_baseline_snapshot()
+    assert second.version == first.version + 1
+    assert second.players.value("2544", "usage_pct") == 0.29
+    # A reader that grabbed the previous snapshot still sees consistent data
+    assert first.players.value("2544", "usage_pct") == 0.31
+    assert sbs.get_baseline_status()["snapshot_version"] == second.version
+
+
+def test_cold_read_loads_in_background(monkeypatch):
+    db = _DB(dict(PLAYERS), dict(TEAMS))
+    monkeypatch.setattr(sbs, "_db", db)
+    monkeypatch.setattr(sbs, "_last_attempt", 0.0)
+    started = []
+
+    class _DeferredThread:
+        def __init__(self, target, **kwargs):
+            started.append(target)
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(sbs.threading, "Thread", _DeferredThread)
+
+    # Cold read: defaults now, one background load queued, no Firestore on this thread
+    assert sbs.get_baseline_snapshot() is sbs._EMPTY
+    assert sbs.get_baseline_snapshot() is sbs._EMPTY
+    assert len(started) == 1 and db.streams == 0
+    assert get_player_season_usage("2544") == sbs.LEAGUE_AVG_USAGE
+
+    started[0]()
+    assert db.streams == 2 and get_player_season_usage("2544") == 0.31
+    # Retried at most every LOAD_RETRY_SECONDS while it keeps failing
+    monkeypatch.setattr(sbs, "_snapshot", sbs._EMPTY)
+    sbs.get_baseline_snapshot()
+    assert len(started) == 1
+
+
+def test_leader_gather_shapes():
+    install_snapshot(PLAYERS, TEAMS)
+    out = gather_leader_baselines(["2544", "1629029", "0"], ["BOS", "WAS", "NYK"])
+    assert out["season_usage"].tolist() == [0.31, 0.36, sbs.LEAGUE_AVG_USAGE]
+    assert out["def_rating"].tolist() == [105.1, 118.4, 110.0]
+    assert out["matchup_difficulty"].tolist() == ["elite", "weak", "average"]
+
+
+def test_producer_single_gather(monkeypatch):
+    import services.async_pulse_producer_cloud as producer
+    from shared_core.adapters.nba_api_adapter import NBAApiAdapter
+
+    if not producer.ADAPTER_AVAILABLE:
+        pytest.skip("shared_core engines shadowed by backend/engines in this run")
+
+    calls = []
+    real = producer.gather_leader_baselines
+
+    def _counting(ids, opponents):
+        calls.append((list(ids), list(opponents)))
+        return real(ids, opponents)
+
+    monkeypatch.setattr(producer, "gather_leader_baselines", _counting)
+    install_snapshot(PLAYERS, TEAMS)
+
+    box = NBAApiAdapter().normalize_boxscore({"game": {
+        "gameId": "1", "gameStatus": 2, "period": 2, "gameClock": "PT05M00.00S",
+        "homeTeam": {"teamTricode": "LAL", "score": 50, "players": [
+            {"personId": 2544, "name": "LeBron James", "status": "ACTIVE",
+             "statistics": {"points": 20, "fieldGoalsAttempted": 12, "fieldGoalsMade": 8, "minutes": "PT20M"}}]},
+        "awayTeam": {"teamTricode": "BOS", "score": 48, "players": [
+            {"personId": 1628369, "name": "Jayson Tatum", "status": "ACTIVE",
+             "statistics": {"points": 15, "fieldGoalsAttempted": 10, "fieldGoalsMade": 6, "minutes": "PT19M"}}]},
+    }})
+    prod = producer.CloudAsyncPulseProducer.__new__(producer.CloudAsyncPulseProducer)
+    leaders = prod._extract_leaders_from_normalized(box, home_team="LAL", away_team="BOS")
+
+    assert len(calls) == 1
+    assert sorted(calls[0][1]) == ["BOS", "LAL"]
+    lebron = next(l for l in leaders if l["player_id"] == "2544")
+    assert lebron["opponent"] == "BOS" and lebron["matchup_difficulty"] == "elite"
+    assert lebron["season_avg_ts"] == 0.61
@@ -0,0 +1,330 @@
+"""
+Shot Aggregator Tests
+=====================
+Verifies the pre-binned shot chart summaries behind GET /player-shots/{id}:
+
+a) Zone classification (paint / mid / three / ft)
+b) Free throws count toward points and zones.ft, never FG totals or hex bins
+c) Hex bins round-trip (center of a bin maps back to the same bin)
+d) Season derivation from game dates
+e) build_delta splits per player, season and game
+f) to_payload shape, season filtering and sort order
+g) ShotAggregator.apply() dedupes re-sent sequence numbers per game
+h) The per-game Firestore `applied` ledgers dedupe across instances and restarts
+   and keep sequence numbers out of the summary doc
+i) Live-created summaries are rebuilt from raw shots; rebuilt shots are not re-applied
+j) A rebuild streams raw shots outside the transaction and recounts if a live
+   increment lands meanwhile
+"""
+
+import sys
+import os
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from google.cloud.firestore_v1 import ArrayUnion, Increment
+
+from services.shot_aggregator import (
+    SUMMARY_SCHEMA_VERSION,
+    ShotAggregator,
+    build_delta,
+    get_player_summary,
+    hex_center,
+    hex_key,
+    needs_rebuild,
+    rebuild_player_summary,
+    shot_zone,
+    summarize_shots,
+    to_payload,
+)
+from shared_core.utils.season import season_for_date
+
+
+def _shot(seq, player="2544", made=True, distance=2, x=0.0, y=10.0, pts=2,
+          game="0022500001", date="2025-11-03", shot_type="Layup"):
+    return {
+        "sequenceNumber": seq,
+        "playerId": player,
+        "made": made,
+        "distance": distance,
+        "x": x,
+        "y": y,
+        "pointsValue": pts,
+        "gameId": game,
+        "gameDate": date,
+        "matchup": "LAL vs. BOS",
+        "shotType": shot_type,
+    }
+
+
+def _merge(target, data):
+    """Firestore set(merge=True) semantics for nested maps, Increment and ArrayUnion."""
+    for key, value in data.items():
+        if isinstance(value, Increment):
+            target[key] = target.get(key, 0) + value.value
+        elif isinstance(value, ArrayUnion):
+            target[key] = target.get(key, []) + [v for v in value.values if v not in target.get(key, [])]
+        elif isinstance(value, dict):
+            _merge(target.setdefault(key, {}), value)
+        else:
+            target[key] = value
+
+
+class _FakeSnapshot:
+    def __init__(self, ref, data, update_time):
+        self.reference, self.id = ref, ref.id
+        self._data, self.update_time = data, update_time
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return self._data
+
+
+class _FakeRef:
+    def __init__(self, db, path):
+        self.db, self.path = db, path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def get(self, field_paths=None, transaction=None):
+        self.db.reads.append(self.path)
+        return _FakeSnapshot(self, self.db.docs.get(self.path), self.db.versions.get(self.path))
+
+    def collection(self, name):
+        return _FakeCollection(self.db, f"{self.path}/{name}")
+
+
+class _FakeTransaction:
+    _read_only = False
+    _max_attempts = 5
+    _id = b"txn"
+
+    def __init__(self, db):
+        self.db, self.writes = db, []
+
+    def _begin(self, retry_id=None):
+        self.writes = []
+
+    def _clean_up(self):
+        pass
+
+    def _rollback(self):
+        self.writes = []
+
+    def _commit(self):
+        for ref, data, merge in self.writes:
+            if merge:
+                _merge(self.db.docs.setdefault(ref.path, {}), data)
+            else:
+                self.db.docs[ref.path] = dict(data)
+            self.db.versions[ref.path] = self.db.versions.get(ref.path, 0) + 1
+        self.db.commits += 1
+        self.db.writes.extend(self.writes)
+
+    def set(self, ref, data, merge=False):
+        self.writes.append((ref, data, merge))
+
+
+class _FakeCollection:
+    def __init__(self, db, path):
+        self.db, self.path = db, path
+
+    def document(self, doc_id):
+        return _FakeRef(self.db, f"{self.path}/{doc_id}")
+
+
+class _FakeDB:
+    """In-memory Firestore (docs keyed by path) with just enough of the client API."""
+
+    def __init__(self):
+        self.docs = {}
+        self.versions = {}
+        self.reads = []
+        self.writes = []
+        self.commits = 0
+
+    def transaction(self):
+        return _FakeTransaction(self)
+
+    def get_all(self, refs, field_paths=None, transaction=None):
+        return [ref.get() for ref in refs]
+
+    def collection(self, name):
+        return _FakeCollection(self, name)
+
+    def summary(self, player_id):
+        return self.docs[f"player_shot_summaries/{player_id}"]
+
+    def ledger(self, player_id, game_id):
+        return self.docs[f"player_shot_summaries/{player_id}/applied/{game_id}"]
+
+
+def test_shot_zone_classification():
+    assert shot_zone(_shot(1, distance=3)) == "paint"
+    assert shot_zone(_shot(2, distance=15)) == "mid"
+    assert shot_zone(_shot(3, distance=25, pts=3)) == "three"
+    assert shot_zone(_shot(4, distance=None, pts=3)) == "three"
+    assert shot_zone(_shot(5, distance=15, pts=1, shot_type="Free Throw 1 of 2")) == "ft"
+
+
+def test_free_throws_excluded_from_field_goals():
+    shots = [
+        _shot(1, made=True),
+        _shot(2, made=False, distance=15, x=120, y=80),
+        _shot(3, made=True, pts=1, shot_type="Free Throw 1 of 1"),
+    ]
+    summary = summarize_shots(shots, "2544")
+    bucket = summary["all"]
+    assert bucket["att"] == 2 and bucket["made"] == 1
+    assert bucket["pts"] == 3
+    assert bucket["zones"]["ft"] == {"att": 1, "made": 1}
+    assert sum(h["att"] for h in bucket["hex"].values()) == 2
+    assert summary["games"]["0022500001"]["att"] == 2
+
+
+def test_hex_center_round_trip():
+    for x, y in [(0, 0), (-220, 15), (95.5, 240), (30, -40)]:
+        key = hex_key(x, y)
+        cx, cy = hex_center(key)
+        assert hex_key(cx, cy) == key
+        assert abs(cx - x) <= 15 and abs(cy - y) <= 15
+
+
+def test_season_for_date():
+    assert season_for_date("2025-11-03") == "2025-26"
+    assert season_for_date("20260215") == "2025-26"
+    assert season_for_date("2025-10-21") == "2025-26"
+    assert season_for_date("2025-06-10") == "2024-25"
+    assert season_for_date("") is None
+
+
+def test_build_delta_per_player_season_game():
+    shots = [
+        _shot(1, player="2544"),
+        _shot(2, player="2544", game="0022400900", date="2025-03-01"),
+        _shot(3, player="1629029", made=False),
+    ]
+    deltas = build_delta(shots)
+    assert set(deltas) == {"2544", "1629029"}
+    lebron = deltas["2544"]
+    assert lebron["all"]["att"] == 2
+    assert set(lebron["seasons"]) == {"2025-26", "2024-25"}
+    assert set(lebron["games"]) == {"0022500001", "0022400900"}
+    assert deltas["1629029"]["all"]["made"] == 0
+
+
+def test_to_payload_shape_and_season_filter():
+    shots = [
+        _shot(1),
+        _shot(2, x=0, y=10),
+        _shot(3, made=False, distance=25, pts=3, x=200, y=150),
+        _shot(4, game="0022400900", date="2025-03-01"),
+    ]
+    summary = summarize_shots(shots, "2544")
+
+    payload = to_payload(summary)
+    assert payload["attempts"] == 4 and payload["made"] == 3
+    assert payload["fgPct"] == 75.0
+    assert payload["zones"]["three"] == {"att": 1, "made": 0, "pct": 0.0}
+    assert payload["zones"]["mid"]["pct"] is None
+    assert payload["hexbins"][0]["att"] == 3  # densest bin first
+    assert [g["gameId"] for g in payload["games"]] == ["0022500001", "0022400900"]
+    assert payload["seasons"] == ["2025-26", "2024-25"]
+
+    season = to_payload(summary, season="2024-25")
+    assert season["attempts"] == 1
+    assert [g["gameId"] for g in season["games"]] == ["0022400900"]
+
+
+def test_apply_dedupes_resent_sequences():
+    db = _FakeDB()
+    agg = ShotAggregator()
+    shots = [_shot(1), _shot(2, player="1629029")]
+
+    assert agg.apply(db, "0022500001", shots) == 2
+    assert db.commits == 1 and len(db.writes) == 4               # 2 summaries + 2 ledgers
+    assert all(merge for _, _, merge in db.writes)
+
+    # Same batch re-sent plus one new shot: only the new one is applied
+    assert agg.apply(db, "0022500001", shots + [_shot(3)]) == 1
+    assert db.commits == 2
+
+    assert agg.apply(db, "0022500001", shots) == 0
+    assert db.commits == 2
+
+    agg.forget_game("0022500001")
+    assert agg.pending("0022500001", shots) == shots
+    # Forgotten locally, but the stored ledger still blocks a double count
+    assert agg.apply(db, "0022500001", shots) == 0
+    assert db.summary("2544")["all"]["att"] == 2
+
+
+def test_ledger_dedupes_across_instances_and_restarts():
+    db = _FakeDB()
+    first, second = ShotAggregator(), ShotAggregator()
+    shots = [_shot(1), _shot(2, made=False, distance=15, x=120, y=80),
+             _shot(3, pts=1, shot_type="Free Throw 1 of 2")]
+
+    assert first.apply(db, "0022500001", shots) == 3
+    # A second instance polling the same game sees the shots in the ledger
+    assert second.apply(db, "0022500001", shots + [_shot(4)]) == 1
+    # So does a restarted process
+    assert ShotAggregator().apply_many(db, {"0022500001": shots + [_shot(4)]}) == 0
+
+    doc = db.summary("2544")
+    assert doc["all"]["att"] == 3 and doc["all"]["pts"] == 5
+    assert doc["games"]["0022500001"]["att"] == 3
+    assert "applied" not in doc
+    assert sorted(db.ledger("2544", "0022500001")["seqs"]) == [1, 2, 3, 4]
+    assert doc == {**doc, **summarize_shots(shots + [_shot(4)], "2544")}
+
+    # A new game only reads and extends that game's ledger
+    db.reads.clear()
+    assert first.apply(db, "0022500002", [_shot(1, game="0022500002")]) == 1
+    assert db.reads == ["player_shot_summaries/2544/applied/0022500002"]
+    assert db.ledger("2544", "0022500002")["seqs"] == [1]
+
+
+def test_rebuild_marks_backfill_and_blocks_reapply():
+    db = _FakeDB()
+    history = [_shot(1, game="0022400900", date="2025-01-10"), _shot(7)]
+    ShotAggregator().apply(db, "0022500001", [_shot(7)])
+
+    # Created by a live increment: no marker, so the raw history must be folded in
+    live = get_player_summary(db, "2544")
+    assert needs_rebuild(live) and live["all"]["att"] == 1
+
+    rebuilt = rebuild_player_summary(db, "2544", lambda: history)
+    assert rebuilt["schemaVersion"] == SUMMARY_SCHEMA_VERSION and not needs_rebuild(rebuilt)
+    assert get_player_summary(db, "2544")["all"]["att"] == 2
+
+    # Re-sending shots the rebuild already counted changes nothing
+    assert ShotAggregator().apply(db, "0022500001", [_shot(7), _shot(8)]) == 1
+    assert get_player_summary(db, "2544")["all"]["att"] == 3
+    assert sorted(db.ledger("2544", "0022400900")["seqs"]) == [1]
+    assert rebuild_player_summary(db, "404", lambda: []) is None
+    assert "player_shot_summaries/404" not in db.docs
+
+
+def test_rebuild_recounts_after_concurrent_increment():
+    db = _FakeDB()
+    raw = [_shot(1, game="0022400900", date="2025-01-10")]
+    loads = []
+
+    def load_shots():
+        loads.append(len(raw))
+        if len(loads) == 1:
+            # A live cycle commits its raw shot and increment while the stream runs
+            raw.append(_shot(7))
+            ShotAggregator().apply(db, "0022500001", [_shot(7)])
+        return list(raw)
+
+    rebuilt = rebuild_player_summary(db, "2544", load_shots)
+    assert loads == [1, 2]
+    assert db.summary("2544") == rebuilt and rebuilt["all"]["att"] == 2
+    assert db.ledger("2544", "0022500001")["seqs"] == [7]
+    # Live apply, the abandoned attempt (no writes), then summary + 2 ledgers in one commit
+    assert db.commits == 3 and len(db.writes) == 2 + 3
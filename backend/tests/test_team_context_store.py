@@ -0,0 +1,174 @@
+"""
+Team Context Store Tests
+========================
+a) One load covers every team, team_id aliases and all 435 matchup pairs
+b) DefenseMatrix / PaceEngine / NemesisEngine are served without per-call queries
+c) bump_team_context_version makes running stores reload within the check window
+d) Player matchups are cached per snapshot and dropped on a version change
+e) DefenseFrictionModule pace profiles come from the shared clock distribution
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import services.team_context_store as tcs
+from services.team_context_store import (
+    bump_team_context_version,
+    get_team_context_store,
+    pace_multiplier,
+    save_position_defense,
+)
+
+TEAMS = [
+    'ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW',
+    'HOU', 'IND', 'LAC', 'LAL', 'MEM', 'MIA', 'MIL', 'MIN', 'NOP', 'NYK',
+    'OKC', 'ORL', 'PHI', 'PHX', 'POR', 'SAC', 'SAS', 'TOR', 'UTA', 'WAS',
+]
+
+
+def _team_row(i, abbr):
+    # opp_pts 110..124.5, pace 94..108.5; WAS has no data yet
+    populated = abbr != 'WAS'
+    return (str(1610612737 + i), abbr, 110 + i * 0.5 if populated else 0, 94 + i * 0.5 if populated else 0,
+            108.0 + i * 0.2)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = tmp_path / "nba.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE team_defense (team_id TEXT PRIMARY KEY, team_abbr TEXT, opp_pts REAL,
+                                   pace REAL, def_rating REAL, division TEXT, opp_fg_pct REAL)
+    """)
+    conn.executemany("INSERT INTO team_defense (team_id, team_abbr, opp_pts, pace, def_rating) VALUES (?,?,?,?,?)",
+                     [_team_row(i, t) for i, t in enumerate(TEAMS)])
+    conn.execute("CREATE TABLE player_vs_team (player_id TEXT, opponent TEXT, games INTEGER, avg_pts REAL, "
+                 "avg_reb REAL, avg_ast REAL)")
+    conn.executemany("INSERT INTO player_vs_team VALUES (?,?,?,?,?,?)", [
+        ("2544", "BOS", 12, 29.5, 8.0, 7.5),
+        ("2544", "GSW", 10, 24.0, 7.0, 8.0),
+    ])
+    conn.execute("CREATE TABLE player_shot_clock (player_id TEXT, team TEXT, clock_range TEXT, fga_freq REAL)")
+    conn.executemany("INSERT INTO player_shot_clock VALUES (?,?,?,?)", [
+        ("1", "GSW", "22-18 Seconds", 0.20), ("2", "GSW", "22-18 Seconds", 0.30),
+        ("1", "GSW", "15-7 Seconds", 0.50), ("1", "GSW", "0-4 Seconds", 0.05),
+    ])
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(tcs, "_stores", {})
+    monkeypatch.setattr(tcs, "_default_db_path", lambda: path)
+    return str(path)
+
+
+def _count_connects(monkeypatch):
+    calls = []
+    real = tcs._connect
+
+    def counting(path):
+        calls.append(path)
+        return real(path)
+
+    monkeypatch.setattr(tcs, "_connect", counting)
+    return calls
+
+
+def test_single_load_and_pairs(db):
+    snap = get_team_context_store().snapshot()
+    assert snap.version == 1 and len(snap.teams) == 30
+    assert len(snap.pairs) == 435
+    assert snap.resolve("1610612738") == "BOS"
+    assert snap.defense_profile("1610612738")["vs_C"] == round((110.5 - 115.0) * 1.1, 1)
+    assert snap.defense_profile("WAS") is None
+
+    pair = snap.pair("okc", "ATL")
+    assert pair.team_a == "ATL" and pair.pace_multiplier == pace_multiplier(94.0, 104.0)
+    assert pair.paoa_against("OKC") == {pos: snap.defense["OKC"][f"vs_{pos}"] for pos in tcs.POSITION_PAOA_SCALE}
+    assert snap.pair("WAS", "BOS").pace_multiplier == 1.0
+    assert pace_multiplier(120.0, 120.0) == 1.12
+
+
+def test_engines_share_one_load(db, monkeypatch):
+    from services.defense_matrix import DefenseMatrix
+    from services.nemesis_engine import NemesisEngine
+    from services.pace_engine import PaceEngine
+
+    calls = _count_connects(monkeypatch)
+    for _ in range(50):
+        assert DefenseMatrix.get_profile("BOS")["available"]
+        assert DefenseMatrix.get_paoa("WAS", "C") == 0.0
+        PaceEngine.calculate_multiplier("BOS", "LAL")
+        NemesisEngine.analyze_head_to_head("2544", "BOS", 25.0)
+    assert len(calls) == 2          # team tables once, player 2544 once
+
+    info = PaceEngine.get_matchup_pace_info("BOS", "LAL")
+    assert info["multiplier"] == PaceEngine.calculate_multiplier("LAL", "BOS")
+    assert NemesisEngine.analyze_head_to_head("2544", "BOS", 25.0)["grade"] == "A+"
+    assert [m["opponent"] for m in NemesisEngine.get_all_matchups("2544")] == ["BOS", "GSW"]
+    assert "WAS" not in DefenseMatrix.get_all_teams() and len(DefenseMatrix.get_all_teams()) == 29
+
+
+def test_version_bump_reloads(db, monkeypatch):
+    store = get_team_context_store()
+    first = store.snapshot()
+
+    conn = sqlite3.connect(db)
+    conn.execute("UPDATE team_defense SET opp_pts = 118.0, pace = 101.0 WHERE team_abbr = 'WAS'")
+    conn.commit()
+    conn.close()
+    save_position_defense([{"team": "WAS", "position": "C", "opp_pts": 24.0, "def_rating": 118.0}], db_path=db)
+
+    # Another process bumps the stamp: this store only notices at the next version check
+    other = tcs.TeamContextStore(db)
+    monkeypatch.setattr(tcs, "_stores", {})
+    assert bump_team_context_version(db, source="test") == 1
+    monkeypatch.setattr(tcs, "_stores", {db: store})
+    assert store.snapshot() is first
+
+    monkeypatch.setattr(tcs, "VERSION_CHECK_SECONDS", 0.0)
+    second = store.snapshot()
+    assert second.version == first.version + 1 and second.source_version == 1
+    assert second.defense_profile("WAS")["opp_pts"] == 118.0
+    assert second.position_defense[("WAS", "C")]["opp_pts"] == 24.0
+    assert first.defense_profile("WAS") is None          # old readers unaffected
+    assert other.snapshot().source_version == 1
+
+
+def test_player_matchups_follow_version(db, monkeypatch):
+    store = get_team_context_store()
+    assert store.player_matchups("2544")["BOS"]["avg_pts"] == 29.5
+
+    conn = sqlite3.connect(db)
+    conn.execute("UPDATE player_vs_team SET avg_pts = 31.0 WHERE opponent = 'BOS'")
+    conn.commit()
+    conn.close()
+    assert store.player_matchups("2544")["BOS"]["avg_pts"] == 29.5   # same snapshot
+
+    bump_team_context_version(db, source="h2h_materializer")          # in-process: invalidates directly
+    assert store.player_matchups("2544")["BOS"]["avg_pts"] == 31.0
+    assert store.status()["cached_players"] == 1
+
+
+def test_friction_pace_profile(db, monkeypatch):
+    from engines.defense_friction_module import DefenseFrictionModule
+
+    module = DefenseFrictionModule(db_path=db)
+    profile = module.get_team_pace_profile("gsw")
+    assert profile.pace == 98.5
+    assert (profile.early_clock_freq, profile.mid_clock_freq, profile.very_late_freq) == (0.25, 0.5, 0.05)
+    assert module.get_team_pace_profile("GSW") is profile
+    assert module.get_team_pace_profile("XXX").pace == 100.0
+
+    conn = sqlite3.connect(db)
+    conn.execute("UPDATE team_defense SET pace = 103.0 WHERE team_abbr = 'GSW'")
+    conn.commit()
+    conn.close()
+    bump_team_context_version(db)
+    assert module.get_team_pace_profile("GSW").pace == 103.0
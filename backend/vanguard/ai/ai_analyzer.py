@@ -227,7 +227,7 @@ Return ONLY valid JSON. No markdown fences, no extra prose.
         logger.info(f"[AI_DEBUG] Starting analysis for {fingerprint}")
         if not self._lazy_load_genai():
             logger.warning(f"[AI_DEBUG] Genai not available, returning fallback for {fingerprint}")
-            return self._create_fallback_analysis(incident)
+            return await self._create_fallback_analysis(incident)
         
         # Check cache first (unless forced)
         if not force_regenerate:
@@ -298,7 +298,7 @@ Return ONLY valid JSON. No markdown fences, no extra prose.
             logger.error(f"[AI_DEBUG] Error type: {type(e).__name__}")
             import traceback
             logger.error(f"[AI_DEBUG] Full traceback:\n{traceback.format_exc()}")
-            return self._create_fallback_analysis(incident)
+            return await self._create_fallback_analysis(incident)
     
     async def _build_analysis_prompt(
         self, 
@@ -332,17 +332,21 @@ Return ONLY valid JSON. No markdown fences, no extra prose.
         if oracle_snapshot:
             telemetry_text = oracle_snapshot.to_prompt_text()
 
-        # ── Inject enhanced KB context (modules, routes, collections) ──
+        # ── Inject KB context for this incident (route, modules, models) ──
         kb_enhanced = ""
         try:
-            from vanguard.vaccine.codebase_kb import get_codebase_context
-            kb_enhanced = await get_codebase_context()
+            from vanguard.vaccine.codebase_kb import get_incident_context
+            kb_enhanced = await get_incident_context(
+                endpoint=incident.get("endpoint"),
+                fingerprint=incident.get("fingerprint"),
+                traceback=traceback_text if traceback_text != "N/A" else None,
+            )
             if kb_enhanced:
                 logger.debug(f"[AI_DEBUG] Enhanced KB injected ({len(kb_enhanced)} chars)")
         except Exception as kb_err:
             logger.debug(f"[AI_DEBUG] Enhanced KB unavailable (non-fatal): {kb_err}")
 
-        # Combine basic endpoint context + full KB context
+        # Combine basic endpoint context + incident KB context
         full_context = context
         if kb_enhanced:
             full_context += "\n\n" + kb_enhanced
@@ -422,7 +426,7 @@ Return ONLY valid JSON. No markdown fences, no extra prose.
             vaccine_recommendation=vaccine_rec if isinstance(vaccine_rec, dict) else None,
         )
 
-    def _create_fallback_analysis(self, incident: Dict) -> IncidentAnalysis:
+    async def _create_fallback_analysis(self, incident: Dict) -> IncidentAnalysis:
         """Create analysis when Gemini AI is unavailable.
         
         Phase 9 Fallback Chain:
@@ -438,10 +442,10 @@ Return ONLY valid JSON. No markdown fences, no extra prose.
             from ..core.feature_flags import flag
             
             if flag("FEATURE_ML_CLASSIFIER_ENABLED"):
-                from ..ml.incident_model import get_incident_model
+                from ..ml.incident_model import get_incident_batcher
                 
-                model = get_incident_model()
-                ml_result = model.classify(incident)
+                # Micro-batched: concurrent fallbacks share one predict_proba
+                ml_result = await get_incident_batcher().classify(incident)
                 
                 if ml_result and ml_result.get("confidence", 0) >= 0.75:
                     logger.info(
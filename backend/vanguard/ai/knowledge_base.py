@@ -2,6 +2,9 @@
 Codebase Knowledge Base
 ========================
 Builds AI-readable index of the entire codebase for incident analysis.
+
+Routes and models come from the shared per-file CodebaseIndex
+(vanguard.vaccine.codebase_kb), so a rebuild only re-parses changed files.
 """
 import json
 import re
@@ -38,8 +41,9 @@ class CodebaseKnowledgeBase:
     Indexes routes, models, dependencies, and recent changes.
     """
     
-    def __init__(self, base_path: str = "backend"):
-        self.base_path = Path(base_path)
+    def __init__(self, base_path: Optional[str] = None):
+        from vanguard.vaccine.codebase_kb import _repo_root
+        self.base_path = Path(base_path) if base_path else _repo_root()
         self.cache_file = Path("/tmp/vanguard/kb_cache.json")
         self.cache_ttl = 3600  # Rebuild every hour
         self._kb_cache: Optional[Dict] = None
@@ -68,91 +72,36 @@ class CodebaseKnowledgeBase:
         logger.info(f"Knowledge base built: {len(kb['routes'])} routes, {len(kb['models'])} models")
         return kb
     
+    def _index(self):
+        from vanguard.vaccine.codebase_kb import get_codebase_index
+        index = get_codebase_index(self.base_path)
+        index.refresh()
+        return index
+    
     def _index_routes(self) -> Dict:
         """Index all FastAPI routes"""
         routes = {}
-        
-        # Find all route files
-        for py_file in self.base_path.rglob("*routes*.py"):
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Extract @router decorators
-                route_pattern = r'@router\.(get|post|put|delete|patch)\(["\']([^"\']+)["\']\)'
-                
-                for match in re.finditer(route_pattern, content):
-                    method, path = match.groups()
-                    
-                    # Extract function name after decorator
-                    func_match = re.search(
-                        r'def\s+(\w+)\s*\(',
-                        content[match.end():match.end()+200]
-                    )
-                    
-                    handler_name = func_match.group(1) if func_match else "unknown"
-                    
-                    routes[path] = {
-                        "method": method.upper(),
-                        "file": str(py_file.relative_to(self.base_path)),
-                        "handler": handler_name
-                    }
-            except Exception as e:
-                logger.warning(f"Failed to index {py_file}: {e}")
-        
+        for route in self._index().routes():
+            routes[route["full_path"]] = {
+                "method": route["method"],
+                "file": route["file"],
+                "handler": route["handler"]
+            }
         return routes
     
     def _index_models(self) -> Dict:
         """Index Pydantic models"""
         models = {}
-        
-        for py_file in self.base_path.rglob("*.py"):
-            # Skip __pycache__ and test files
-            if "__pycache__" in str(py_file) or "test" in py_file.name:
+        for model in self._index().models():
+            # Skip test files
+            if "test" in Path(model["file"]).name:
                 continue
-            
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Find Pydantic models
-                class_pattern = r'class\s+(\w+)\(BaseModel\):'
-                
-                for match in re.finditer(class_pattern, content):
-                    class_name = match.group(1)
-                    
-                    # Extract fields (basic version)
-                    fields = self._extract_model_fields(content, match.end())
-                    
-                    models[class_name] = {
-                        "file": str(py_file.relative_to(self.base_path)),
-                        "fields": fields
-                    }
-            except Exception as e:
-                logger.warning(f"Failed to index models in {py_file}: {e}")
-        
+            models[model["name"]] = {
+                "file": model["file"],
+                "fields": model["fields"][:10]  # Limit to first 10 fields
+            }
         return models
     
-    def _extract_model_fields(self, content: str, start_pos: int) -> List[str]:
-        """Extract field names from Pydantic model"""
-        fields = []
-        
-        # Get next 500 chars
-        snippet = content[start_pos:start_pos+500]
-        
-        # Find field definitions (name: type pattern)
-        field_pattern = r'^\s+(\w+):\s*'
-        
-        for line in snippet.split('\n'):
-            match = re.match(field_pattern, line)
-            if match:
-                fields.append(match.group(1))
-            # Stop at next class or function
-            if re.match(r'^(class|def)\s+', line):
-                break
-        
-        return fields[:10]  # Limit to first 10 fields
-    
     def _get_recent_changes(self, days: int = 7) -> List[Dict]:
         """Get recent git commits"""
         # Skip on Cloud Run — no .git directory or gitpython available in container
@@ -191,8 +140,15 @@ class CodebaseKnowledgeBase:
         """
         kb = self._load_or_build_kb()
         
-        # Find route info
+        # Find route info: exact path first, then templated routes
+        # (/players/{player_id}) that serve this concrete endpoint
         route = kb.get("routes", {}).get(endpoint)
+        if not route:
+            from vanguard.vaccine.codebase_kb import get_codebase_index
+            matches = get_codebase_index(self.base_path).match_route(endpoint)
+            if matches:
+                route = {"method": matches[0]["method"], "file": matches[0]["file"],
+                         "handler": matches[0]["handler"]}
         
         if not route:
             return f"ENDPOINT: {endpoint}\nSTATUS: Unknown endpoint (not found in route index)\n\n{SYSTEM_ARCHITECTURE_SUMMARY}"
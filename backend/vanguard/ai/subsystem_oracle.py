@@ -176,16 +176,15 @@ async def _collect_inquisitor() -> SubsystemResult:
     t0 = time.perf_counter()
     try:
         from vanguard.inquisitor.sampler import get_sampler
-        from vanguard.inquisitor.middleware import _last_stored, _RATE_LIMIT_SECONDS
+        from vanguard.inquisitor.middleware import _fingerprint_limiter
 
         sampler = get_sampler()
-        # Count forced-sampling endpoints
-        forced = getattr(sampler, '_forced_endpoints', {})
-        forced_count = len(forced)
+        sampler_stats = sampler.get_stats()
+        forced_count = sampler_stats["forced_endpoints"]
 
         # Rate limiter: how many fingerprints are currently throttled?
-        now = time.monotonic()
-        throttled = sum(1 for ts in _last_stored.values() if (now - ts) < _RATE_LIMIT_SECONDS)
+        throttled = _fingerprint_limiter.active_keys()
+        limiter_stats = _fingerprint_limiter.get_stats()
 
         try:
             from vanguard.core.feature_flags import flag
@@ -204,7 +203,10 @@ async def _collect_inquisitor() -> SubsystemResult:
             summary=summary,
             details={
                 "forced_endpoints": forced_count,
+                "forced_sampling_evictions": sampler_stats["forced_evictions"],
                 "throttled_fingerprints": throttled,
+                "suppressed_incidents": limiter_stats["suppressed"],
+                "fingerprint_evictions": limiter_stats["evictions"],
                 "middleware_v2": v2_enabled,
             },
             latency_ms=(time.perf_counter() - t0) * 1000,
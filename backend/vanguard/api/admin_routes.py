@@ -2059,6 +2059,7 @@ async def get_kb_status():
             "dep_count":      len(kb.get("dependencies", [])),
             "root":           kb.get("root", "unknown"),
             "schema_version": kb.get("schema_version", "unknown"),
+            "index":          kb.get("index"),
             "markdown_preview": (kb.get("markdown", ""))[:600],
         }
     except Exception as e:
@@ -99,6 +99,11 @@ async def vanguard_lifespan(app: FastAPI) -> AsyncIterator[None]:
             sampler = get_sampler()
             logger.info("inquisitor_initialized", sampling_rate=config.sampling_rate)
             
+            # Surgeon shared state (Redis; no-op unless FEATURE_SURGEON_SHARED_STATE)
+            from ..surgeon.shared_state import start_shared_state
+            if await start_shared_state() is not None:
+                logger.info("surgeon_shared_state_enabled")
+            
             # Step 5: Start Escalation Engine
             from ..surgeon.escalation import get_escalation_engine
             escalation = get_escalation_engine()
@@ -147,6 +152,8 @@ async def vanguard_lifespan(app: FastAPI) -> AsyncIterator[None]:
 
         from ..surgeon.escalation import get_escalation_engine
         await get_escalation_engine().stop()
+        from ..surgeon.shared_state import stop_shared_state
+        await stop_shared_state()
         await close_redis()
         logger.info("vanguard_shutdown_complete")
     except Exception as e:
@@ -36,6 +36,7 @@ _FLAG_DEFAULTS: dict = {
     "FEATURE_SURGEON_MIDDLEWARE":      True,    # SurgeonMiddleware in-memory circuit checks
     "FEATURE_LOAD_SHEDDER":            True,    # LoadSheddingMiddleware (psutil memory guard)
     "FEATURE_INDEX_DOCTOR":            True,    # Auto-PR for missing Firestore indexes
+    "FEATURE_SURGEON_SHARED_STATE":    False,   # Pool Surgeon windows / circuits across instances via Redis
     # ── Phase 5: FULL_SOVEREIGN + Scale ──────────────────────────────────
     "PULSE_SERVICE_ENABLED":            True,    # Live pulse producer + SSE stream
     "FEATURE_HEURISTIC_TRIAGE":         True,    # Deterministic fallback triage engine
@@ -47,6 +48,8 @@ _FLAG_DEFAULTS: dict = {
     "FEATURE_ML_CLASSIFIER_ENABLED":     False,   # ML incident classification in fallback chain
     "FEATURE_PREDICTIVE_CB_ENABLED":     False,   # Predictive circuit breaker (PREDICTIVE_OPEN)
     "FEATURE_AEGIS_ML_ENHANCED":         False,   # ML-enhanced Aegis simulation
+    # ── Runtime diagnostics ──────────────────────────────────────────────
+    "FEATURE_LOOP_BLOCK_DETECTOR":       False,   # Log stacks of handlers that stall the event loop
 }
 
 _TRUTHY = {"1", "true", "yes", "on"}
@@ -20,6 +20,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from ..core.types import Trace, Incident
 from ..core.context import get_request_id
 from ..utils.logger import get_logger
+from ..utils.rate_limit import BoundedRateLimiter
 from .sampler import get_sampler
 from .fingerprint import generate_error_fingerprint
 
@@ -88,8 +89,13 @@ def _should_skip_incident(path: str) -> bool:
 
 # Per-fingerprint rate limiter: max 1 occurrence_count increment per 60s
 # NOTE (Phase 2): RED severity is NEVER rate-limited regardless of this table.
+# Bounded LRU: a flood of distinct fingerprints evicts the coldest entries
+# instead of growing the table; evictions/suppressed are in get_stats().
 _RATE_LIMIT_SECONDS = 60
-_last_stored: dict = {}  # fingerprint -> timestamp (monotonic)
+_RATE_LIMIT_MAX_FINGERPRINTS = 5_000
+_fingerprint_limiter = BoundedRateLimiter(
+    limit=1, period=_RATE_LIMIT_SECONDS, max_keys=_RATE_LIMIT_MAX_FINGERPRINTS
+)
 
 
 def _rate_limited(fingerprint: str, severity: str = "YELLOW") -> bool:
@@ -99,18 +105,8 @@ def _rate_limited(fingerprint: str, severity: str = "YELLOW") -> bool:
     """
     if severity == "RED":
         return False  # RED incidents: always store, never suppress
-    now = time.monotonic()
-    last = _last_stored.get(fingerprint)
-    if last is not None and (now - last) < _RATE_LIMIT_SECONDS:
-        return True
-    _last_stored[fingerprint] = now
-    # Prune stale entries to prevent unbounded growth (keep last 500)
-    if len(_last_stored) > 500:
-        cutoff = now - _RATE_LIMIT_SECONDS
-        stale = [k for k, v in _last_stored.items() if v < cutoff]
-        for k in stale:
-            del _last_stored[k]
-    return False
+    return not _fingerprint_limiter.check(fingerprint).allowed
+
 
 async def _execute_ai_triage(incident: dict, fingerprint: str, storage):
     """Executes AI analysis and Surgeon logic in the background so it doesn't block the request path."""
@@ -4,12 +4,19 @@ Adaptive Sampling Logic
 Dynamically adjusts trace sampling rate based on system load.
 """
 
+import time
+from collections import OrderedDict
+
 import psutil
 from ..core.config import get_vanguard_config
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Forced-sampling entries are keyed by raw path, so an error storm across
+# many URLs must not grow the table: least recently forced is evicted first.
+_MAX_FORCED_ENDPOINTS = 256
+
 
 class AdaptiveSampler:
     """
@@ -25,16 +32,21 @@ class AdaptiveSampler:
         self.config = get_vanguard_config()
         self.default_rate = self.config.sampling_rate
         self.current_rate = self.default_rate
-        self.forced_endpoints: dict[str, float] = {}  # {endpoint: sampling_rate}
+        # {endpoint: (sampling_rate, expires_at monotonic)}, LRU order
+        self.forced_endpoints: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self.forced_evictions = 0
     
     def should_sample(self, endpoint: str) -> bool:
         """Determine if this request should be fully traced."""
         import random
         
         # Check if endpoint has forced sampling
-        if endpoint in self.forced_endpoints:
-            rate = self.forced_endpoints[endpoint]
-            return random.random() < rate
+        forced = self.forced_endpoints.get(endpoint)
+        if forced is not None:
+            rate, expires_at = forced
+            if time.monotonic() < expires_at:
+                return random.random() < rate
+            del self.forced_endpoints[endpoint]
         
         # Adaptive sampling based on CPU
         return random.random() < self.current_rate
@@ -66,10 +78,22 @@ class AdaptiveSampler:
             rate: Sampling rate (0.0-1.0)
             duration_sec: How long to maintain this rate (default 5 min)
         """
-        self.forced_endpoints[endpoint] = rate
+        if endpoint in self.forced_endpoints:
+            self.forced_endpoints.move_to_end(endpoint)
+        elif len(self.forced_endpoints) >= _MAX_FORCED_ENDPOINTS:
+            self.forced_endpoints.popitem(last=False)
+            self.forced_evictions += 1
+        self.forced_endpoints[endpoint] = (rate, time.monotonic() + duration_sec)
         logger.info("forced_sampling_enabled", endpoint=endpoint, rate=rate, duration=duration_sec)
-        
-        # TODO: Schedule removal after duration_sec (requires background task)
+    
+    def get_stats(self) -> dict:
+        """Forced-sampling table size (unexpired entries) and eviction count."""
+        now = time.monotonic()
+        return {
+            "forced_endpoints": sum(1 for _, exp in self.forced_endpoints.values() if exp > now),
+            "forced_evictions": self.forced_evictions,
+            "current_rate": self.current_rate,
+        }
 
 
 # Global sampler instance
@@ -1,6 +1,6 @@
 """
-In-Process Sliding Window Rate Limiter
-========================================
+In-Process Rate Limiter
+========================
 Replaces the broken Redis-backed limiter.
 
 Why in-process instead of Redis?
@@ -8,8 +8,10 @@ Why in-process instead of Redis?
   The old limiter silently failed open — zero throttling was happening.
   This implementation actually works.
 
-Algorithm: Sliding window using deque of request timestamps per IP.
-  - O(n) cleanup per request, n = window size (small in practice)
+Algorithm: GCRA per "ip:bucket" key (vanguard.utils.rate_limit).
+  - O(1) per request: one float per key, no timestamp deque to trim
+  - Bounded memory: at most _MAX_KEYS keys, least recently seen evicted
+    first, so a scan from many IPs cannot grow the store
   - asyncio-safe: event loop is single-threaded, no lock needed
 
 Limits:
@@ -27,21 +29,21 @@ Purge:
   to reset all rate limit windows.
 """
 
-import time
 import logging
-from collections import deque, defaultdict
-from typing import Dict, Deque
+import math
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
+from ..utils.rate_limit import BoundedRateLimiter
+
 logger = logging.getLogger(__name__)
 
 # ── Module-level bucket store ───────────────────────────────────────────────
 # Exported so /admin/cache/purge can clear it.
-# Structure: { "ip:bucket" -> deque([timestamp, ...]) }
-_MEMORY_BUCKETS: Dict[str, Deque[float]] = defaultdict(deque)
+# Structure: LRU of { "ip:bucket" -> theoretical arrival time }, capped at _MAX_KEYS
+_MAX_KEYS = 20_000
 
 # ── Route classification ─────────────────────────────────────────────────────
 _BYPASS_PATHS = frozenset({
@@ -57,6 +59,8 @@ _LIMITS = {
     "public": (60,  60),   # 60 req / 60s
 }
 
+_MEMORY_BUCKETS = BoundedRateLimiter(*_LIMITS["public"], max_keys=_MAX_KEYS)
+
 
 def _classify(path: str) -> str:
     if any(path.startswith(p) for p in _AI_PREFIXES):
@@ -73,32 +77,9 @@ def _get_client_ip(request: Request) -> str:
     return request.client.host if request.client else "unknown"
 
 
-def _sliding_window_check(key: str, limit: int, window: int) -> tuple[bool, int, int]:
-    """
-    Returns (allowed, current_count, remaining).
-    Evicts timestamps older than window seconds.
-    """
-    now = time.monotonic()
-    bucket = _MEMORY_BUCKETS[key]
-
-    # Evict expired entries from the left
-    cutoff = now - window
-    while bucket and bucket[0] < cutoff:
-        bucket.popleft()
-
-    current = len(bucket)
-
-    if current >= limit:
-        return False, current, 0
-
-    # Record this request
-    bucket.append(now)
-    return True, current + 1, limit - (current + 1)
-
-
 class RateLimiterMiddleware(BaseHTTPMiddleware):
     """
-    In-process sliding window rate limiter.
+    In-process GCRA rate limiter with a bounded key store.
     No Redis required. Actually enforces limits.
     """
 
@@ -114,22 +95,23 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         limit, window = _LIMITS[bucket_type]
         key = f"{client_ip}:{bucket_type}"
 
-        allowed, current, remaining = _sliding_window_check(key, limit, window)
+        decision = _MEMORY_BUCKETS.check(key, limit, window)
 
-        if not allowed:
+        if not decision.allowed:
+            retry_after = max(1, math.ceil(decision.retry_after))
             logger.warning(
                 f"[RATE_LIMIT] 429 ip={client_ip} path={path} "
-                f"bucket={bucket_type} current={current} limit={limit}"
+                f"bucket={bucket_type} limit={limit}"
             )
             return JSONResponse(
                 status_code=429,
                 content={
                     "error": "Too Many Requests",
                     "detail": f"Limit: {limit} requests per {window}s",
-                    "retry_after": window,
+                    "retry_after": retry_after,
                 },
                 headers={
-                    "Retry-After": str(window),
+                    "Retry-After": str(retry_after),
                     "X-RateLimit-Limit": str(limit),
                     "X-RateLimit-Remaining": "0",
                     "X-RateLimit-Window": str(window),
@@ -138,7 +120,7 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
 
         response = await call_next(request)
         response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
         response.headers["X-RateLimit-Window"] = str(window)
         response.headers["X-RateLimit-Bucket"] = bucket_type
         return response
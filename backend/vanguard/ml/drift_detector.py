@@ -8,71 +8,138 @@ Drift Types:
     2. Prediction Drift — Model output distribution shifts
     3. Performance Drift — Accuracy degrades over time
 
-Uses Population Stability Index (PSI) for distribution comparison.
+Uses Population Stability Index (PSI) for distribution comparison, with
+KL divergence and a binned KS statistic alongside. All three come from
+fixed-bin histograms kept up to date as predictions are recorded.
 """
 
 import logging
 from collections import deque
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timezone
 
 import numpy as np
 
 logger = logging.getLogger("vanguard.ml.drift_detector")
 
+BUCKETS = 10             # Reference-quantile bins per feature
+MIN_SAMPLES = 10         # Below this a feature's drift is not scored
+CONFIDENCE_FEATURE = "__confidence__"   # Row holding prediction confidences
+
+
+def _bin_edges(reference: np.ndarray, buckets: int = BUCKETS) -> np.ndarray:
+    """Interior bin edges from reference quantiles (duplicates collapsed).
+
+    The outer bins are open-ended, so values beyond the reference range
+    land in the first/last bin instead of being dropped.
+    """
+    breakpoints = np.unique(np.percentile(reference, np.linspace(0, 100, buckets + 1)))
+    return breakpoints[1:-1]
+
+
+def _bin_stats(ref: np.ndarray, cur: np.ndarray, n_bins: np.ndarray) -> Dict[str, np.ndarray]:
+    """PSI, KL and KS for many histograms at once.
+
+    ref / cur are (rows, BUCKETS) count matrices, padded past each row's
+    n_bins. Proportions use the same add-one smoothing as before so that
+    empty bins stay finite.
 
-def _psi(reference: np.ndarray, current: np.ndarray, buckets: int = 10) -> float:
-    """Calculate Population Stability Index (PSI) between two distributions.
-    
     PSI < 0.1: No significant drift
     PSI 0.1-0.25: Moderate drift (investigation recommended)
     PSI > 0.25: Significant drift (retrain recommended)
-    
-    Args:
-        reference: Reference distribution (training data)
-        current: Current distribution (recent predictions)
-        buckets: Number of histogram buckets
-        
-    Returns:
-        PSI score (0+, lower = less drift)
     """
-    if len(reference) < 10 or len(current) < 10:
-        return 0.0  # Not enough data
-    
-    # Use reference distribution to define bucket boundaries
-    breakpoints = np.percentile(reference, np.linspace(0, 100, buckets + 1))
-    breakpoints = np.unique(breakpoints)
-    
-    if len(breakpoints) < 2:
-        return 0.0
-    
-    ref_hist, _ = np.histogram(reference, bins=breakpoints)
-    cur_hist, _ = np.histogram(current, bins=breakpoints)
-    
-    # Avoid division by zero
-    ref_pct = (ref_hist + 1) / (len(reference) + len(breakpoints))
-    cur_pct = (cur_hist + 1) / (len(current) + len(breakpoints))
-    
-    psi = np.sum((cur_pct - ref_pct) * np.log(cur_pct / ref_pct))
-    return float(psi)
+    mask = np.arange(ref.shape[1]) < n_bins[:, None]
+    ref_n = ref.sum(axis=1, keepdims=True)
+    cur_n = cur.sum(axis=1, keepdims=True)
+    denom = n_bins[:, None] + 1
+    ref_pct = np.where(mask, (ref + 1) / (ref_n + denom), 1.0)
+    cur_pct = np.where(mask, (cur + 1) / (cur_n + denom), 1.0)
+    log_ratio = np.log(cur_pct / ref_pct)
+
+    psi = np.sum((cur_pct - ref_pct) * log_ratio, axis=1)
+    kl = np.sum(np.where(mask, cur_pct * log_ratio, 0.0), axis=1)
+    ks = np.max(np.abs(np.cumsum(cur / np.maximum(cur_n, 1), axis=1)
+                       - np.cumsum(ref / np.maximum(ref_n, 1), axis=1)), axis=1)
+
+    # A constant reference has a single bin: nothing to compare
+    flat = n_bins < 2
+    return {
+        "psi": np.where(flat, 0.0, psi),
+        "kl": np.where(flat, 0.0, kl),
+        "ks": np.where(flat, 0.0, ks),
+    }
 
 
 class DriftDetector:
     """Monitors ML model drift for both incident classifier and Aegis predictor.
     
-    Maintains rolling windows of feature values and predictions to
-    detect distribution shifts over time.
+    Every (model, feature) pair with a reference distribution is a row in
+    fixed-size arrays: reference bin counts, current bin counts over the
+    last WINDOW_SIZE predictions, and a ring buffer of those predictions'
+    values. Recording a prediction moves one count per feature (the
+    evicted value's bin down, the new value's bin up), so check_drift
+    never re-buckets raw data, and memory is fixed per row no matter how
+    many predictions are recorded.
     """
     
     WINDOW_SIZE = 500  # Keep last 500 predictions for comparison
     
     def __init__(self):
-        # Per-model drift tracking
-        self._feature_windows: Dict[str, Dict[str, deque]] = {}
-        self._prediction_windows: Dict[str, deque] = {}
-        self._reference_distributions: Dict[str, Dict[str, np.ndarray]] = {}
+        # Row registry: (model, feature) -> row in the arrays below
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._model_rows: Dict[str, Dict[str, int]] = {}
+        self._edges = np.empty((0, BUCKETS - 1))       # Interior edges, +inf padded
+        self._n_bins = np.empty(0, dtype=np.int64)
+        self._ref_counts = np.empty((0, BUCKETS))
+        self._cur_counts = np.empty((0, BUCKETS))
+        self._ring = np.empty((0, self.WINDOW_SIZE))
+        self._ring_pos = np.empty(0, dtype=np.int64)
+        self._ring_len = np.empty(0, dtype=np.int64)
+
+        # Predictions seen before a model's reference was set (bounded)
+        self._pending: Dict[str, deque] = {}
         self._last_drift_check: Dict[str, float] = {}
         self._drift_scores: Dict[str, float] = {}
+
+    # ── Histogram rows ──
+
+    def _add_rows(self, count: int):
+        self._edges = np.vstack([self._edges, np.full((count, BUCKETS - 1), np.inf)])
+        self._n_bins = np.concatenate([self._n_bins, np.zeros(count, dtype=np.int64)])
+        self._ref_counts = np.vstack([self._ref_counts, np.zeros((count, BUCKETS))])
+        self._cur_counts = np.vstack([self._cur_counts, np.zeros((count, BUCKETS))])
+        self._ring = np.vstack([self._ring, np.zeros((count, self.WINDOW_SIZE))])
+        self._ring_pos = np.concatenate([self._ring_pos, np.zeros(count, dtype=np.int64)])
+        self._ring_len = np.concatenate([self._ring_len, np.zeros(count, dtype=np.int64)])
+
+    def _bins(self, rows: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Bin index of values[i] in row rows[i] (vectorized searchsorted)."""
+        if values.ndim == 1:
+            return (values[:, None] >= self._edges[rows]).sum(axis=1)
+        return (values[:, :, None] >= self._edges[rows][:, None, :]).sum(axis=2)
+
+    def _push(self, rows: np.ndarray, values: np.ndarray):
+        """Append one value per row to its window, evicting the oldest when full.
+
+        rows must be distinct, so each (row, bin) pair is touched once.
+        """
+        pos = self._ring_pos[rows]
+        full = self._ring_len[rows] == self.WINDOW_SIZE
+        if full.any():
+            evicted = self._ring[rows[full], pos[full]]
+            self._cur_counts[rows[full], self._bins(rows[full], evicted)] -= 1.0
+        self._cur_counts[rows, self._bins(rows, values)] += 1.0
+        self._ring[rows, pos] = values
+        self._ring_pos[rows] = (pos + 1) % self.WINDOW_SIZE
+        self._ring_len[rows] = np.minimum(self._ring_len[rows] + 1, self.WINDOW_SIZE)
+
+    def _rebin(self, rows: np.ndarray):
+        """Recount the current windows of rows after their edges changed."""
+        self._cur_counts[rows] = 0.0
+        filled = np.arange(self.WINDOW_SIZE) < self._ring_len[rows][:, None]
+        bins = self._bins(rows, self._ring[rows])
+        r, _ = np.nonzero(filled)
+        np.add.at(self._cur_counts, (rows[r], bins[filled]), 1.0)
     
     def record_prediction(
         self,
@@ -89,71 +156,116 @@ class DriftDetector:
             prediction: The model's output
             confidence: Prediction confidence (0-1)
         """
-        # Initialize windows if needed
-        if model_name not in self._feature_windows:
-            self._feature_windows[model_name] = {}
-        if model_name not in self._prediction_windows:
-            self._prediction_windows[model_name] = deque(maxlen=self.WINDOW_SIZE)
-        
-        # Record feature values
+        model_rows = self._model_rows.get(model_name)
+        if model_rows is None:
+            # No reference yet: hold the raw values until one arrives
+            pending = self._pending.setdefault(model_name, deque(maxlen=self.WINDOW_SIZE))
+            pending.append((dict(features), confidence))
+            return
+
+        rows, values = [], []
         for feat_name, feat_value in features.items():
-            if feat_name not in self._feature_windows[model_name]:
-                self._feature_windows[model_name][feat_name] = deque(maxlen=self.WINDOW_SIZE)
-            self._feature_windows[model_name][feat_name].append(float(feat_value))
-        
-        # Record prediction confidence
-        self._prediction_windows[model_name].append(confidence)
+            row = model_rows.get(feat_name)
+            if row is not None:
+                rows.append(row)
+                values.append(float(feat_value))
+        row = model_rows.get(CONFIDENCE_FEATURE)
+        if row is not None:
+            rows.append(row)
+            values.append(float(confidence))
+        if rows:
+            self._push(np.array(rows), np.array(values))
     
     def set_reference_distribution(
         self,
         model_name: str,
         feature_distributions: Dict[str, List[float]],
+        prediction_confidences: Optional[List[float]] = None,
     ):
         """Set reference distributions from training data.
+
+        Bins each feature once at reference-quantile edges; the raw values
+        are not kept. Features already being tracked are re-binned against
+        the new edges from their current windows.
         
         Args:
             model_name: Model identifier
             feature_distributions: Feature name → list of values from training set
+            prediction_confidences: Optional reference confidences, enabling
+                prediction drift
         """
-        self._reference_distributions[model_name] = {
-            name: np.array(vals) for name, vals in feature_distributions.items()
-        }
+        distributions = dict(feature_distributions)
+        if prediction_confidences is not None:
+            distributions[CONFIDENCE_FEATURE] = prediction_confidences
+
+        new = [name for name in distributions if (model_name, name) not in self._rows]
+        if new:
+            first = len(self._n_bins)
+            self._add_rows(len(new))
+            for offset, name in enumerate(new):
+                self._rows[(model_name, name)] = first + offset
+        model_rows = self._model_rows.setdefault(model_name, {})
+
+        for name, vals in distributions.items():
+            row = self._rows[(model_name, name)]
+            model_rows[name] = row
+            reference = np.asarray(vals, dtype=float)
+            edges = _bin_edges(reference) if len(reference) else np.empty(0)
+            self._edges[row] = np.inf
+            self._edges[row, :len(edges)] = edges
+            self._n_bins[row] = len(edges) + 1 if len(reference) else 0
+            self._ref_counts[row] = 0.0
+            if len(reference):
+                np.add.at(self._ref_counts[row], self._bins(np.full(len(reference), row), reference), 1.0)
+        self._rebin(np.array([self._rows[(model_name, name)] for name in distributions]))
+
+        for features, confidence in self._pending.pop(model_name, ()):
+            self.record_prediction(model_name, features, None, confidence)
+
         logger.info(
             f"Reference distributions set for {model_name}: "
             f"{len(feature_distributions)} features"
         )
-    
-    def check_drift(self, model_name: str) -> Dict[str, Any]:
-        """Check for drift on a specific model.
-        
-        Returns:
-            Drift report with per-feature and aggregate scores
-        """
+
+    # ── Drift checks ──
+
+    def _report(self, model_name: str, stats: Dict[str, np.ndarray], index: Dict[int, int]) -> Dict[str, Any]:
         result = {
             "model_name": model_name,
             "checked_at": datetime.now(timezone.utc).isoformat(),
             "overall_drift_score": 0.0,
             "drift_detected": False,
             "feature_drift": {},
+            "feature_stats": {},
             "prediction_drift_psi": 0.0,
             "recommendation": "none",
         }
         
-        feature_windows = self._feature_windows.get(model_name, {})
-        reference = self._reference_distributions.get(model_name, {})
-        
-        if not feature_windows or not reference:
+        model_rows = self._model_rows.get(model_name, {})
+        tracked = {name: row for name, row in model_rows.items() if self._ring_len[row]}
+        if not tracked or not any(name != CONFIDENCE_FEATURE for name in tracked):
             result["recommendation"] = "insufficient_data"
             return result
         
         # Check feature drift
         drift_scores = []
-        for feat_name, ref_values in reference.items():
-            current_values = feature_windows.get(feat_name)
-            if current_values and len(current_values) >= 10:
-                psi = _psi(ref_values, np.array(current_values))
-                result["feature_drift"][feat_name] = round(psi, 4)
-                drift_scores.append(psi)
+        for feat_name, row in tracked.items():
+            if self._ring_len[row] < MIN_SAMPLES:
+                continue
+            i = index[row]
+            # Too small a reference to compare against scores as no drift
+            scored = self._ref_counts[row].sum() >= MIN_SAMPLES
+            psi = float(stats["psi"][i]) if scored else 0.0
+            if feat_name == CONFIDENCE_FEATURE:
+                result["prediction_drift_psi"] = round(psi, 4)
+                continue
+            result["feature_drift"][feat_name] = round(psi, 4)
+            result["feature_stats"][feat_name] = {
+                "psi": round(psi, 4),
+                "kl": round(float(stats["kl"][i]), 4) if scored else 0.0,
+                "ks": round(float(stats["ks"][i]), 4) if scored else 0.0,
+            }
+            drift_scores.append(psi)
         
         # Aggregate drift score
         if drift_scores:
@@ -174,6 +286,26 @@ class DriftDetector:
         
         self._drift_scores[model_name] = score
         return result
+
+    def _check(self, model_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Score every row of model_names in one vectorized pass."""
+        rows = np.array(sorted(r for m in model_names for r in self._model_rows.get(m, {}).values()),
+                        dtype=np.int64)
+        stats = _bin_stats(self._ref_counts[rows], self._cur_counts[rows], self._n_bins[rows])
+        index = {int(row): i for i, row in enumerate(rows)}
+        return {m: self._report(m, stats, index) for m in model_names}
+    
+    def check_drift(self, model_name: str) -> Dict[str, Any]:
+        """Check for drift on a specific model.
+        
+        Returns:
+            Drift report with per-feature and aggregate scores
+        """
+        return self._check([model_name])[model_name]
+
+    def check_all_drift(self) -> Dict[str, Dict[str, Any]]:
+        """Check every model with a reference distribution at once."""
+        return self._check(list(self._model_rows))
     
     def get_drift_score(self, model_name: str) -> float:
         """Get the last computed drift score for a model."""
@@ -183,6 +315,18 @@ class DriftDetector:
         """Get drift scores for all monitored models."""
         return dict(self._drift_scores)
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Tracked histograms and the memory they hold."""
+        arrays = (self._edges, self._n_bins, self._ref_counts, self._cur_counts,
+                  self._ring, self._ring_pos, self._ring_len)
+        return {
+            "models": len(self._model_rows),
+            "histograms": len(self._n_bins),
+            "window_size": self.WINDOW_SIZE,
+            "pending_predictions": sum(len(p) for p in self._pending.values()),
+            "memory_bytes": int(sum(a.nbytes for a in arrays)),
+        }
+
 
 # ─────────────────────────────────────────────
 # Singleton
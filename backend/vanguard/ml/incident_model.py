@@ -9,18 +9,23 @@ Key patterns:
     - Fallback to None (caller must handle) if model unavailable
     - Feature extraction reuses ml.incident_classifier.features
     - Admin reload endpoint clears cache and re-downloads
+    - classify_batch() scores many incidents as one feature matrix;
+      IncidentMicroBatcher coalesces concurrent async callers into it
 
 Integration point:
-    ai_analyzer.py → _create_fallback_analysis() → incident_model.classify()
+    ai_analyzer.py → _create_fallback_analysis() → incident batcher → classify_batch()
 """
 
 import asyncio
 import os
 import io
 import logging
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from datetime import datetime, timezone
 
+import numpy as np
+
 logger = logging.getLogger("vanguard.ml.incident_model")
 
 # ─────────────────────────────────────────────
@@ -32,6 +37,8 @@ GCS_ENCODER_BLOB = "models/incident_classifier/latest_encoder.joblib"
 LOCAL_MODEL_PATH = "/tmp/ml_models/incident_classifier.joblib"
 LOCAL_ENCODER_PATH = "/tmp/ml_models/label_encoder.joblib"
 CONFIDENCE_THRESHOLD = 0.75  # Minimum confidence to use ML prediction
+BATCH_MAX_SIZE = 64          # Flush the micro-batch as soon as it holds this many
+BATCH_MAX_WAIT_MS = 5.0      # ...or this long after its first incident arrived
 
 
 class IncidentModelWrapper:
@@ -49,6 +56,7 @@ class IncidentModelWrapper:
         self._load_error: Optional[str] = None
         self._model_version: Optional[str] = None
         self._load_timestamp: Optional[str] = None
+        self._classes: Optional[np.ndarray] = None  # encoder index → label
     
     @property
     def is_loaded(self) -> bool:
@@ -141,6 +149,26 @@ class IncidentModelWrapper:
             logger.debug(f"Artifacts dir load failed: {e}")
         return False
     
+    def _mark_loaded(self, source: str):
+        """Record a successful load and precompute the label table.
+
+        The encoder's classes_ array is what inverse_transform indexes into,
+        so decoding a whole batch is one fancy-index instead of a call per
+        class per incident. The model is also registered as the rollout
+        governor's primary so batch metrics have somewhere to land.
+        """
+        self._load_error = None
+        self._load_timestamp = datetime.now(timezone.utc).isoformat()
+        self._model_version = f"loaded_from_{source}"
+        self._classes = (
+            np.asarray(self._encoder.classes_) if self._encoder is not None else None
+        )
+
+        from .rollout_governor import get_rollout_governor
+        governor = get_rollout_governor()
+        if governor.primary is None:
+            governor.register_primary(self._model_version, source)
+    
     def _load_sync(self) -> bool:
         """Synchronous load from any available source.
         
@@ -157,9 +185,7 @@ class IncidentModelWrapper:
             ("artifacts_dir", self._try_load_from_artifacts_dir),
         ]:
             if loader():
-                self._load_error = None
-                self._load_timestamp = datetime.now(timezone.utc).isoformat()
-                self._model_version = f"loaded_from_{loader_name}"
+                self._mark_loaded(loader_name)
                 return True
         
         self._load_error = "Model not found in any source"
@@ -177,9 +203,7 @@ class IncidentModelWrapper:
         # Try local cache first (fast, no I/O worth offloading)
         if self._try_load_from_local():
             self._loaded = True
-            self._load_error = None
-            self._load_timestamp = datetime.now(timezone.utc).isoformat()
-            self._model_version = "loaded_from_local_cache"
+            self._mark_loaded("local_cache")
             return True
         
         # GCS download is the blocking operation — offload to thread pool
@@ -203,6 +227,7 @@ class IncidentModelWrapper:
         # Clear memory state
         self._model = None
         self._encoder = None
+        self._classes = None
         self._loaded = False
         self._load_error = None
         
@@ -217,87 +242,114 @@ class IncidentModelWrapper:
         # Reload from origin (non-blocking)
         return await self.load_async()
     
-    def classify(
+    def _predict_matrix(self, X: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Predicted class index per row, plus the probability matrix if any."""
+        model = self._model
+        
+        # Handle imblearn Pipeline vs plain model
+        if hasattr(model, "predict_proba"):
+            probas = np.asarray(model.predict_proba(X))
+        elif hasattr(model, "named_steps") and hasattr(model.named_steps.get("clf", None), "predict_proba"):
+            probas = np.asarray(model.named_steps["clf"].predict_proba(X))
+        else:
+            # Fallback: predict without probabilities
+            return np.asarray(model.predict(X)), None
+        return probas.argmax(axis=1), probas
+    
+    def classify_batch(
         self,
-        incident: Dict[str, Any],
-    ) -> Optional[Dict[str, Any]]:
-        """Classify a single incident using the ML model.
+        incidents: Sequence[Dict[str, Any]],
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Classify many incidents with one predict_proba call.
         
         Args:
-            incident: Raw incident dictionary
+            incidents: Raw incident dictionaries
             
         Returns:
-            Classification result dict or None if model unavailable/low confidence.
-            Result includes:
-                - label: str (predicted class)
-                - confidence: float (0.0–1.0)
-                - probabilities: dict (class → probability)
-                - model_version: str
+            One entry per incident, in order: the classify() result dict, or
+            None if the model is unavailable or the prediction is below
+            CONFIDENCE_THRESHOLD.
         """
+        incidents = list(incidents)
+        if not incidents:
+            return []
+        
         # Ensure model is loaded (sync — fast if cached in memory)
         if not self.load():
-            return None
+            return [None] * len(incidents)
         
         try:
             from ml.incident_classifier.features import extract_features_single
             
-            # Extract features
-            features = extract_features_single(incident)
-            feature_names = sorted(features.keys())
-            X = [[features[name] for name in feature_names]]
+            rows = [extract_features_single(incident) for incident in incidents]
+            feature_names = sorted(rows[0].keys())
+            X = np.array([[row[name] for name in feature_names] for row in rows], dtype=float)
             
-            # Predict
-            model = self._model
-            
-            # Handle imblearn Pipeline vs plain model
-            if hasattr(model, "predict_proba"):
-                probas = model.predict_proba(X)[0]
-                predicted_idx = probas.argmax()
-                confidence = float(probas[predicted_idx])
-            elif hasattr(model, "named_steps") and hasattr(model.named_steps.get("clf", None), "predict_proba"):
-                probas = model.named_steps["clf"].predict_proba(X)[0]
-                predicted_idx = probas.argmax()
-                confidence = float(probas[predicted_idx])
+            predicted, probas = self._predict_matrix(X)
+            if probas is not None:
+                confidences = probas[np.arange(len(incidents)), predicted].astype(float)
             else:
-                # Fallback: predict without probabilities
-                predicted_idx = model.predict(X)[0]
-                confidence = 0.5
-                probas = None
+                confidences = np.full(len(incidents), 0.5)
             
-            # Decode label
-            if self._encoder is not None:
-                label = self._encoder.inverse_transform([predicted_idx])[0]
-                if probas is not None:
-                    prob_dict = {
-                        self._encoder.inverse_transform([i])[0]: round(float(p), 4)
-                        for i, p in enumerate(probas)
-                        if i < len(self._encoder.classes_)
-                    }
-                else:
-                    prob_dict = {}
+            # Decode labels through the precomputed class table
+            classes = self._classes
+            if classes is not None:
+                labels = classes[predicted.astype(int)].tolist()
+                prob_labels = classes[:probas.shape[1]].tolist() if probas is not None else []
             else:
-                label = str(predicted_idx)
-                prob_dict = {}
+                labels = [str(idx) for idx in predicted.tolist()]
+                prob_labels = []
             
-            # Apply confidence threshold
-            if confidence < CONFIDENCE_THRESHOLD:
-                logger.debug(
-                    f"ML confidence {confidence:.3f} below threshold "
-                    f"{CONFIDENCE_THRESHOLD} for {incident.get('fingerprint', '?')}"
-                )
-                return None
+            used = confidences >= CONFIDENCE_THRESHOLD
+            from .rollout_governor import get_rollout_governor
+            get_rollout_governor().record_predictions(False, confidences, used)
             
-            return {
-                "label": label,
-                "confidence": round(confidence, 4),
-                "probabilities": prob_dict,
-                "model_version": self._model_version,
-                "classified_at": datetime.now(timezone.utc).isoformat(),
-            }
+            classified_at = datetime.now(timezone.utc).isoformat()
+            results: List[Optional[Dict[str, Any]]] = []
+            for i, incident in enumerate(incidents):
+                # Apply confidence threshold
+                if not used[i]:
+                    logger.debug(
+                        f"ML confidence {confidences[i]:.3f} below threshold "
+                        f"{CONFIDENCE_THRESHOLD} for {incident.get('fingerprint', '?')}"
+                    )
+                    results.append(None)
+                    continue
+                
+                prob_dict = {
+                    label: round(float(p), 4) for label, p in zip(prob_labels, probas[i])
+                } if prob_labels else {}
+                results.append({
+                    "label": labels[i],
+                    "confidence": round(float(confidences[i]), 4),
+                    "probabilities": prob_dict,
+                    "model_version": self._model_version,
+                    "classified_at": classified_at,
+                })
+            return results
             
         except Exception as e:
             logger.error(f"ML classification failed: {e}", exc_info=True)
-            return None
+            return [None] * len(incidents)
+    
+    def classify(
+        self,
+        incident: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """Classify a single incident using the ML model.
+        
+        Args:
+            incident: Raw incident dictionary
+            
+        Returns:
+            Classification result dict or None if model unavailable/low confidence.
+            Result includes:
+                - label: str (predicted class)
+                - confidence: float (0.0–1.0)
+                - probabilities: dict (class → probability)
+                - model_version: str
+        """
+        return self.classify_batch([incident])[0]
     
     def health_status(self) -> Dict[str, Any]:
         """Return health status for SYSTEM_SNAPSHOT integration."""
@@ -309,10 +361,110 @@ class IncidentModelWrapper:
         }
 
 
+class IncidentMicroBatcher:
+    """Coalesces concurrent classify() awaits into classify_batch() calls.
+    
+    During an incident storm many triage requests arrive within a few
+    milliseconds of each other. Each caller parks a future; the batch is
+    scored as one matrix when it reaches max_batch or max_wait_ms after its
+    first incident, whichever comes first. Inference runs in the thread pool
+    so the event loop keeps accepting requests while a batch is scored.
+    """
+    
+    def __init__(
+        self,
+        model: Optional[IncidentModelWrapper] = None,
+        max_batch: int = BATCH_MAX_SIZE,
+        max_wait_ms: float = BATCH_MAX_WAIT_MS,
+    ):
+        self._model = model
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight: set = set()
+        self.batches = 0
+        self.incidents = 0
+    
+    @property
+    def model(self) -> IncidentModelWrapper:
+        return self._model if self._model is not None else get_incident_model()
+    
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+    
+    async def classify(self, incident: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Queue one incident and wait for its batch to be scored."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((incident, future, time.perf_counter()))
+        
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return await future
+    
+    def _flush(self):
+        """Hand everything queued so far to a scoring task."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+    
+    async def _run(self, batch: List[Tuple[Dict[str, Any], asyncio.Future, float]]):
+        started = time.perf_counter()
+        incidents = [incident for incident, _, _ in batch]
+        try:
+            try:
+                results = await asyncio.to_thread(self.model.classify_batch, incidents)
+            except Exception as e:
+                logger.error(f"ML batch classification failed: {e}", exc_info=True)
+                results = [None] * len(batch)
+            
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():  # Caller may have been cancelled
+                    future.set_result(result)
+        finally:
+            # Flush task cancelled or a short result list: resolve the stragglers
+            # with None (rule-based fallback) so no caller waits forever
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_result(None)
+        inference_ms = (time.perf_counter() - started) * 1000
+        
+        self.batches += 1
+        self.incidents += len(batch)
+        queue_wait_ms = [(started - enqueued) * 1000 for _, _, enqueued in batch]
+        from .rollout_governor import get_rollout_governor
+        get_rollout_governor().record_batch(
+            size=len(batch),
+            queue_wait_ms=max(queue_wait_ms),
+            inference_ms=inference_ms,
+            queue_depth=len(self._pending),
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "incidents": self.incidents,
+            "avg_batch_size": round(self.incidents / self.batches, 2) if self.batches else 0.0,
+            "queue_depth": self.queue_depth,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait_ms,
+        }
+
+
 # ─────────────────────────────────────────────
 # Singleton accessor
 # ─────────────────────────────────────────────
 _instance: Optional[IncidentModelWrapper] = None
+_batcher: Optional[IncidentMicroBatcher] = None
 
 
 def get_incident_model() -> IncidentModelWrapper:
@@ -324,3 +476,11 @@ def get_incident_model() -> IncidentModelWrapper:
     if _instance is None:
         _instance = IncidentModelWrapper()
     return _instance
+
+
+def get_incident_batcher() -> IncidentMicroBatcher:
+    """Get or create the global micro-batcher over get_incident_model()."""
+    global _batcher
+    if _batcher is None:
+        _batcher = IncidentMicroBatcher()
+    return _batcher
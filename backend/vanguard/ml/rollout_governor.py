@@ -7,6 +7,7 @@ Provides:
     1. Canary model routing (1-5% traffic to candidate model)
     2. Automatic rollback rules (fallback rate, drift, severity shift)
     3. Model version registry with A/B comparison metrics
+    4. Inference throughput / queueing metrics from the incident micro-batcher
 
 Strategy:
     - New model → canary (5% traffic) → compare for 1h → promote or rollback
@@ -19,7 +20,7 @@ Strategy:
 import time
 import logging
 from collections import deque
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence
 from datetime import datetime, timezone
 
 logger = logging.getLogger("vanguard.ml.rollout_governor")
@@ -33,6 +34,7 @@ CANARY_EVAL_WINDOW_S = 3600     # 1 hour evaluation before promotion
 MAX_FALLBACK_RATE = 0.20         # Rollback if > 20% fallback rate
 MAX_DRIFT_PSI = 0.25             # Rollback if drift exceeds threshold
 MAX_SEVERITY_INCREASE = 0.15     # Rollback if RED severity increases 15%+
+BATCH_WINDOW = 256               # Recent micro-batches kept for throughput stats
 
 
 class ModelVersion:
@@ -98,11 +100,17 @@ class RolloutGovernor:
         self._state = "STABLE"  # STABLE, CANARY, EVALUATING, ROLLED_BACK
         self._rollback_reasons: list = []
         self._prediction_counter = 0
+        # (finished_at, size, queue_wait_ms, inference_ms, queue_depth)
+        self._batches: deque = deque(maxlen=BATCH_WINDOW)
     
     @property
     def state(self) -> str:
         return self._state
     
+    @property
+    def primary(self) -> Optional[ModelVersion]:
+        return self._primary
+    
     def register_primary(self, version_id: str, source: str):
         """Register the current production model."""
         self._primary = ModelVersion(version_id, source)
@@ -140,17 +148,56 @@ class RolloutGovernor:
         used: bool,  # True if confidence >= threshold
     ):
         """Record a prediction outcome for the active or candidate model."""
+        self.record_predictions(is_candidate, [confidence], [used])
+    
+    def record_predictions(
+        self,
+        is_candidate: bool,
+        confidences: Sequence[float],
+        used: Sequence[bool],
+    ):
+        """Record a batch of prediction outcomes in one update."""
         model = self._candidate if is_candidate else self._primary
         if model is None:
             return
         
-        model.predictions_total += 1
-        model.cumulative_confidence += confidence
+        n_used = int(sum(bool(u) for u in used))
+        model.predictions_total += len(confidences)
+        model.cumulative_confidence += float(sum(confidences))
+        model.predictions_used += n_used
+        model.predictions_fallback += len(confidences) - n_used
+    
+    def record_batch(
+        self,
+        size: int,
+        queue_wait_ms: float,
+        inference_ms: float,
+        queue_depth: int = 0,
+    ):
+        """Record one micro-batch: how many incidents, how long the oldest
+        waited in the queue, how long scoring took, and what was left queued."""
+        self._batches.append((time.time(), size, queue_wait_ms, inference_ms, queue_depth))
+    
+    def get_batch_metrics(self) -> Dict[str, Any]:
+        """Throughput and queueing over the recent batch window."""
+        if not self._batches:
+            return {"batches": 0}
         
-        if used:
-            model.predictions_used += 1
-        else:
-            model.predictions_fallback += 1
+        sizes = [b[1] for b in self._batches]
+        waits = sorted(b[2] for b in self._batches)
+        inference = [b[3] for b in self._batches]
+        busy_s = sum(inference) / 1000
+        return {
+            "batches": len(self._batches),
+            "incidents": sum(sizes),
+            "avg_batch_size": round(sum(sizes) / len(sizes), 2),
+            "max_batch_size": max(sizes),
+            "avg_queue_wait_ms": round(sum(waits) / len(waits), 3),
+            "p95_queue_wait_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 3),
+            "avg_inference_ms": round(sum(inference) / len(inference), 3),
+            "incidents_per_s": round(sum(sizes) / busy_s, 1) if busy_s > 0 else None,
+            "queue_depth": self._batches[-1][4],
+        }
     
     def evaluate(self, drift_score: float = 0.0) -> Dict[str, Any]:
         """Evaluate canary candidate for promotion or rollback.
@@ -241,6 +288,7 @@ class RolloutGovernor:
             "candidate": self._candidate.to_dict() if self._candidate else None,
             "canary_traffic_pct": CANARY_TRAFFIC_PCT,
             "rollback_reasons": self._rollback_reasons,
+            "batching": self.get_batch_metrics(),
         }
 
 
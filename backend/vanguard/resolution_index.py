@@ -0,0 +1,235 @@
+"""
+Vanguard Resolution Index
+Inverted index over resolution records for similar-fix lookups
+
+Two signals, both held in token -> posting-list maps so a lookup only
+touches records that share something with the query:
+
+    - incident pattern tokens scored with BM25 ("/nexus/health 404" also
+      indexes "nexus" and "health", so sibling routes still match)
+    - optional stack-trace fingerprints: a bottom-k sketch of hashed
+      character n-grams, with line numbers, addresses and ids masked, so two
+      traces through the same frames overlap even when the numbers differ
+
+Postings are appended as records arrive. A query adds each matching term's
+cached BM25 weights into one dense score vector, so it costs a few array
+operations per query token rather than a pass over every stored record.
+"""
+import math
+import re
+import zlib
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TRACE_NGRAM = 5          # Characters per shingle
+TRACE_SKETCH_SIZE = 64   # Smallest hashes kept per trace
+TRACE_WEIGHT = 0.5       # Trace overlap weight next to the normalized pattern score
+
+_WORD_RE = re.compile(r"[a-z0-9_]+")
+_TRACE_NOISE_RE = re.compile(r"0x[0-9a-f]+|\d+")
+
+
+def tokenize_pattern(pattern: str) -> List[str]:
+    """Whitespace tokens plus their alphanumeric parts, lowercased."""
+    tokens = []
+    for word in pattern.lower().split():
+        tokens.append(word)
+        parts = _WORD_RE.findall(word)
+        if len(parts) > 1 or (parts and parts[0] != word):
+            tokens.extend(parts)
+    return tokens
+
+
+def trace_fingerprint(stack_trace: str, n: int = TRACE_NGRAM, k: int = TRACE_SKETCH_SIZE) -> List[int]:
+    """Bottom-k sketch of a stack trace's character n-grams.
+
+    Numbers and hex addresses are masked and whitespace collapsed first, so
+    the same failure on another line number or request id fingerprints the
+    same. The overlap of two sketches estimates their n-gram Jaccard.
+    """
+    text = " ".join(_TRACE_NOISE_RE.sub("#", stack_trace.lower()).split())
+    if not text:
+        return []
+    grams = {text[i:i + n] for i in range(max(1, len(text) - n + 1))}
+    return sorted({zlib.crc32(g.encode()) for g in grams})[:k]
+
+
+class _Postings:
+    """Growable (record id, term frequency) list with a cached array view.
+
+    BM25 weights depend on the corpus size and average length, so they are
+    cached against the index size they were computed for.
+    """
+
+    __slots__ = ("ids", "tfs", "_cache", "_weights")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.tfs = array("f")
+        self._cache: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._weights: Optional[Tuple[int, np.ndarray]] = None
+
+    def add(self, record_id: int, tf: float = 1.0):
+        self.ids.append(record_id)
+        self.tfs.append(tf)
+        self._cache = None
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._cache is None:
+            self._cache = (np.frombuffer(self.ids, dtype=np.int64).copy(),
+                           np.frombuffer(self.tfs, dtype=np.float32).astype(float))
+        return self._cache
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class ResolutionIndex:
+    """Inverted index of incident patterns and trace fingerprints.
+
+    Record ids are positions in the learner's resolution list. Only ids
+    marked searchable (verified fixes) are returned by search(), and each
+    carries a rank that breaks score ties (the fix's reduction percentage).
+    """
+
+    def __init__(self):
+        self._terms: Dict[str, _Postings] = {}
+        self._grams: Dict[int, _Postings] = {}
+        self._doc_len = array("f")
+        self._rank = array("d")
+        self._searchable = bytearray()
+        self._mask: Optional[np.ndarray] = None
+        self._total_len = 0.0
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def add(
+        self,
+        record_id: int,
+        pattern: str,
+        fingerprint: Sequence[int] = (),
+        searchable: bool = False,
+        rank: float = 0.0,
+    ):
+        """Index the next record; ids must arrive in order 0, 1, 2, ..."""
+        if record_id != len(self._doc_len):
+            raise ValueError(f"Record ids must be added in order: expected {len(self._doc_len)}, got {record_id}")
+
+        tokens = tokenize_pattern(pattern)
+        for term, tf in Counter(tokens).items():
+            self._terms.setdefault(term, _Postings()).add(record_id, tf)
+        for gram in set(fingerprint):
+            self._grams.setdefault(gram, _Postings()).add(record_id)
+
+        self._doc_len.append(len(tokens))
+        self._total_len += len(tokens)
+        self._rank.append(rank)
+        self._searchable.append(1 if searchable else 0)
+
+    def set_searchable(self, record_id: int, searchable: bool = True, rank: Optional[float] = None):
+        self._searchable[record_id] = 1 if searchable else 0
+        self._mask = None
+        if rank is not None:
+            self._rank[record_id] = rank
+
+    def _bm25_weights(self, postings: _Postings) -> np.ndarray:
+        """Per-posting BM25 contribution, cached until the next add()."""
+        n_docs = len(self._doc_len)
+        if postings._weights is not None and postings._weights[0] == n_docs:
+            return postings._weights[1]
+
+        ids, tfs = postings.arrays()
+        df = len(postings)
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        avg_len = self._total_len / n_docs or 1.0
+        doc_len = np.frombuffer(self._doc_len, dtype=np.float32)[ids]
+        weights = idf * tfs * (BM25_K1 + 1) / (tfs + BM25_K1 * (1 - BM25_B + BM25_B * doc_len / avg_len))
+        postings._weights = (n_docs, weights)
+        return weights
+
+    def _pattern_scores(self, pattern: str) -> np.ndarray:
+        """Dense BM25 score per record id (0 where no token is shared)."""
+        scores = np.zeros(len(self._doc_len))
+        for term in set(tokenize_pattern(pattern)):
+            postings = self._terms.get(term)
+            if postings is not None:
+                # ids are unique within one posting list, so += is safe
+                scores[postings.arrays()[0]] += self._bm25_weights(postings)
+        return scores
+
+    def _trace_scores(self, fingerprint: Sequence[int]) -> np.ndarray:
+        """Dense share of the query sketch each record's sketch also contains."""
+        fingerprint = set(fingerprint)
+        overlap = np.zeros(len(self._doc_len))
+        for gram in fingerprint:
+            postings = self._grams.get(gram)
+            if postings is not None:
+                overlap[postings.arrays()[0]] += 1.0
+        return overlap / len(fingerprint)
+
+    def search(
+        self,
+        pattern: str,
+        fingerprint: Sequence[int] = (),
+        limit: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """(record id, score) of searchable records sharing a token or n-gram.
+
+        Without a fingerprint the score is raw BM25. With one, each side is
+        brought to 0..1 (BM25 over its best hit, sketch overlap as a share
+        of the query sketch) and the trace side is weighted by TRACE_WEIGHT.
+        Highest score first, then highest rank, then oldest.
+        """
+        if not self._doc_len:
+            return []
+        scores = self._pattern_scores(pattern)
+        if fingerprint:
+            best = scores.max() or 1.0
+            scores = scores / best + TRACE_WEIGHT * self._trace_scores(fingerprint)
+
+        scores *= self._searchable_mask()
+        rank = np.frombuffer(self._rank, dtype=np.float64)
+        if limit is None:
+            ids = np.flatnonzero(scores > 0)
+            order = np.lexsort((ids, -rank[ids], -scores[ids]))
+            return [(int(i), float(scores[i])) for i in ids[order]]
+
+        # Peel off the best score level until limit is filled: a couple of
+        # linear passes per level beats partitioning the whole vector
+        hits: List[Tuple[int, float]] = []
+        while len(hits) < limit:
+            best = scores.max()
+            if best <= 0:
+                break
+            tied = np.flatnonzero(scores == best)
+            tied = tied[np.lexsort((tied, -rank[tied]))]
+            hits.extend((int(i), float(best)) for i in tied[:limit - len(hits)])
+            scores[tied] = 0.0
+        return hits
+
+    def _searchable_mask(self) -> np.ndarray:
+        if self._mask is None or len(self._mask) != len(self._searchable):
+            self._mask = np.frombuffer(self._searchable, dtype=np.uint8).astype(float)
+        return self._mask
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "records": len(self._doc_len),
+            "searchable": sum(self._searchable),
+            "terms": len(self._terms),
+            "trace_grams": len(self._grams),
+        }
+
+
+def build_index(entries: Iterable[Tuple[str, Sequence[int], bool, float]]) -> ResolutionIndex:
+    """Index (pattern, fingerprint, searchable, rank) entries as ids 0..n-1."""
+    index = ResolutionIndex()
+    for record_id, (pattern, fingerprint, searchable, rank) in enumerate(entries):
+        index.add(record_id, pattern, fingerprint, searchable, rank)
+    return index
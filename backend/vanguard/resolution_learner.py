@@ -1,13 +1,21 @@
 """
 Vanguard Resolution Learning System
 Automatically tracks what fixes resolved which incidents for continuous learning
+
+Resolutions are kept in an append-only JSON Lines log (one "record" line per
+fix, one "verify" line per verification), so recording a fix appends a line
+instead of rewriting the whole history. Similar-fix lookups go through a
+ResolutionIndex (BM25 over pattern tokens, optional stack-trace n-gram
+fingerprints) rebuilt from the log on load.
 """
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import json
 from pathlib import Path
 
+from vanguard.resolution_index import ResolutionIndex, build_index, trace_fingerprint
+
 @dataclass
 class ResolutionRecord:
     """Record of what fixed an incident"""
@@ -21,6 +29,7 @@ class ResolutionRecord:
     incidents_after: int
     reduction_percentage: float
     verification_period_hours: int = 24
+    trace_fingerprint: List[int] = field(default_factory=list)  # Stack-trace n-gram sketch
 
 class VanguardResolutionLearner:
     """
@@ -28,29 +37,82 @@ class VanguardResolutionLearner:
     Stores what fixed what for future reference and automated healing
     """
     
-    def __init__(self, storage_path: str = "vanguard/resolutions.json"):
+    def __init__(self, storage_path: str = "vanguard/resolutions.jsonl"):
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         self.resolutions: List[ResolutionRecord] = self._load_resolutions()
+        self._index: ResolutionIndex = build_index(
+            (r.incident_pattern, r.trace_fingerprint, r.incidents_after != -1, r.reduction_percentage)
+            for r in self.resolutions
+        )
+        # Unverified record ids per pattern, oldest first
+        self._unverified: Dict[str, List[int]] = {}
+        for record_id, record in enumerate(self.resolutions):
+            if record.incidents_after == -1:
+                self._unverified.setdefault(record.incident_pattern, []).append(record_id)
     
     def _load_resolutions(self) -> List[ResolutionRecord]:
-        """Load past resolutions from storage"""
-        if not self.storage_path.exists():
+        """Load past resolutions from storage
+        
+        Replays the JSON Lines log. A legacy JSON array (resolutions.json,
+        or an array at storage_path) is loaded and rewritten as a log once.
+        """
+        legacy = self.storage_path.with_suffix(".json")
+        source = self.storage_path if self.storage_path.exists() else legacy
+        if not source.exists():
             return []
         
         try:
-            with open(self.storage_path, 'r') as f:
-                data = json.load(f)
-                return [ResolutionRecord(**r) for r in data]
+            with open(source, 'r') as f:
+                text = f.read()
         except Exception as e:
             print(f"⚠️ Failed to load resolutions: {e}")
             return []
+        
+        if text.lstrip().startswith('['):
+            try:
+                resolutions = [ResolutionRecord(**r) for r in json.loads(text)]
+            except Exception as e:
+                print(f"⚠️ Failed to load resolutions: {e}")
+                return []
+            self.resolutions = resolutions
+            self._save_resolutions()
+            return resolutions
+        
+        resolutions: List[ResolutionRecord] = []
+        for line_no, line in enumerate(text.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+                op = event.pop("op")
+                if op == "record":
+                    resolutions.append(ResolutionRecord(**event))
+                elif op == "verify":
+                    record = resolutions[event["id"]]
+                    record.incidents_after = event["incidents_after"]
+                    record.reduction_percentage = event["reduction_percentage"]
+            except Exception as e:
+                # A torn last line from an interrupted append loses only that event
+                print(f"⚠️ Skipping unreadable resolution log line {line_no}: {e}")
+        return resolutions
+    
+    def _append_event(self, event: Dict):
+        """Append one event line to the resolution log"""
+        try:
+            with open(self.storage_path, 'a') as f:
+                f.write(json.dumps(event) + "\n")
+        except Exception as e:
+            print(f"❌ Failed to save resolution: {e}")
     
     def _save_resolutions(self):
-        """Persist resolutions to storage"""
+        """Rewrite the log compacted: one record line per resolution, current state"""
         try:
-            with open(self.storage_path, 'w') as f:
-                json.dump([asdict(r) for r in self.resolutions], f, indent=2)
+            tmp_path = self.storage_path.with_suffix(self.storage_path.suffix + ".tmp")
+            with open(tmp_path, 'w') as f:
+                for record in self.resolutions:
+                    f.write(json.dumps({"op": "record", **asdict(record)}) + "\n")
+            tmp_path.replace(self.storage_path)
         except Exception as e:
             print(f"❌ Failed to save resolutions: {e}")
     
@@ -61,11 +123,15 @@ class VanguardResolutionLearner:
         fix_files: List[str],
         deployed_revision: str,
         incidents_before: int,
-        fix_commit: Optional[str] = None
+        fix_commit: Optional[str] = None,
+        stack_trace: Optional[str] = None
     ) -> ResolutionRecord:
         """
         Record a fix deployment
         This is called RIGHT AFTER deploying a fix
+        
+        stack_trace, when given, is reduced to an n-gram fingerprint so later
+        incidents with a similar trace find this fix.
         """
         record = ResolutionRecord(
             incident_pattern=incident_pattern,
@@ -77,11 +143,15 @@ class VanguardResolutionLearner:
             incidents_before=incidents_before,
             incidents_after=-1,  # Will be updated after verification
             reduction_percentage=0.0,
-            verification_period_hours=24
+            verification_period_hours=24,
+            trace_fingerprint=trace_fingerprint(stack_trace) if stack_trace else []
         )
         
+        record_id = len(self.resolutions)
         self.resolutions.append(record)
-        self._save_resolutions()
+        self._index.add(record_id, incident_pattern, record.trace_fingerprint)
+        self._unverified.setdefault(incident_pattern, []).append(record_id)
+        self._append_event({"op": "record", **asdict(record)})
         
         print(f"""
 ✅ Resolution recorded for: {incident_pattern}
@@ -149,60 +219,62 @@ class VanguardResolutionLearner:
         This is called 24 hours AFTER deployment
         """
         # Find the most recent unverified fix for this pattern
-        for record in reversed(self.resolutions):
-            if (record.incident_pattern == incident_pattern and 
-                record.incidents_after == -1):
-                
-                record.incidents_after = incidents_after
-                record.reduction_percentage = (
-                    ((record.incidents_before - incidents_after) / record.incidents_before * 100)
-                    if record.incidents_before > 0 else 0.0
-                )
-                
-                self._save_resolutions()
-                
-                print(f"""
+        pending = self._unverified.get(incident_pattern)
+        if pending:
+            record_id = pending.pop()
+            if not pending:
+                del self._unverified[incident_pattern]
+            record = self.resolutions[record_id]
+            
+            record.incidents_after = incidents_after
+            record.reduction_percentage = (
+                ((record.incidents_before - incidents_after) / record.incidents_before * 100)
+                if record.incidents_before > 0 else 0.0
+            )
+            
+            self._index.set_searchable(record_id, True, rank=record.reduction_percentage)
+            self._append_event({
+                "op": "verify",
+                "id": record_id,
+                "incidents_after": record.incidents_after,
+                "reduction_percentage": record.reduction_percentage,
+            })
+            
+            print(f"""
 📊 Verification complete for: {incident_pattern}
    Before: {record.incidents_before} incidents
    After: {incidents_after} incidents
    Reduction: {record.reduction_percentage:.1f}%
    Status: {'✅ EFFECTIVE' if record.reduction_percentage > 80 else '⚠️ PARTIAL' if record.reduction_percentage > 50 else '❌ INEFFECTIVE'}
-                """)
-                
-                return record
+            """)
+            
+            return record
         
         return None
     
-    def get_similar_resolutions(self, incident_pattern: str, limit: int = 5) -> List[ResolutionRecord]:
+    def get_similar_resolutions(
+        self,
+        incident_pattern: str,
+        limit: int = 5,
+        stack_trace: Optional[str] = None
+    ) -> List[ResolutionRecord]:
         """
         Find similar past resolutions for an incident pattern
         Useful for suggesting fixes for new incidents
-        """
-        # Simple keyword matching (can be enhanced with ML later)
-        keywords = incident_pattern.lower().split()
         
-        matches = []
-        for record in self.resolutions:
-            if record.incidents_after == -1:
-                continue  # Skip unverified fixes
-            
-            pattern_keywords = record.incident_pattern.lower().split()
-            match_score = sum(1 for kw in keywords if kw in pattern_keywords)
-            
-            if match_score > 0:
-                matches.append((match_score, record))
-        
-        # Sort by match score and effectiveness
-        matches.sort(key=lambda x: (x[0], x[1].reduction_percentage), reverse=True)
-        
-        return [record for _, record in matches[:limit]]
+        Verified fixes only, ranked by BM25 over pattern tokens (plus stack
+        trace fingerprint overlap when a trace is given), then effectiveness.
+        """
+        fingerprint = trace_fingerprint(stack_trace) if stack_trace else ()
+        hits = self._index.search(incident_pattern, fingerprint, limit=limit)
+        return [self.resolutions[record_id] for record_id, _ in hits]
     
-    def suggest_fix(self, incident_pattern: str) -> Optional[str]:
+    def suggest_fix(self, incident_pattern: str, stack_trace: Optional[str] = None) -> Optional[str]:
         """
         Suggest a fix based on similar past resolutions
         This is the "smart healing" feature
         """
-        similar = self.get_similar_resolutions(incident_pattern, limit=1)
+        similar = self.get_similar_resolutions(incident_pattern, limit=1, stack_trace=stack_trace)
         
         if not similar:
             return None
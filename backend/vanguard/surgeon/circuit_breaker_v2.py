@@ -22,6 +22,11 @@ Vanguard incidents posted on:
     CLOSED → OPEN:  type=CIRCUIT_OPENED, severity=RED
     OPEN → CLOSED:  type=CIRCUIT_RECOVERED, severity=GREEN
 
+Shared state (optional, shared_state.SharedSurgeonState):
+    Transitions are published to Redis write-behind; circuits opened or
+    closed by other instances are adopted on the next sync, without
+    re-posting their incidents. OPEN → HALF_OPEN stays local (time based).
+
 Replaces the 1st-gen circuit_breaker.py which had OPEN/CLOSED semantics inverted.
 """
 
@@ -80,6 +85,53 @@ class CircuitBreakerV2:
     def __init__(self):
         self._circuits: Dict[str, _CircuitEntry] = {}
         self._global_lock = asyncio.Lock()
+        self._shared = None  # Optional SharedSurgeonState
+
+    def attach_shared_state(self, shared) -> None:
+        """Publish transitions to shared and adopt the ones it reports."""
+        self._shared = shared
+        shared.on_circuit_update = self._adopt_shared
+
+    def _publish(self, endpoint: str, entry: _CircuitEntry) -> None:
+        """Queue entry's current state for the other instances (no I/O)."""
+        if self._shared is None:
+            return
+        opened_at = None
+        if entry.opened_at is not None:
+            opened_at = self._shared.now() - (time.monotonic() - entry.opened_at)
+        self._shared.publish_transition(endpoint, entry.state.value, opened_at,
+                                        entry.failure_rate_at_open)
+
+    def _adopt_shared(self, update) -> None:
+        """Apply a transition another instance won (called by the sync loop)."""
+        endpoint, state, opened_at, failure_rate, version = update
+        if _is_excluded(endpoint):
+            return
+        state = CircuitState(state)
+        entry = self._circuits.get(endpoint)
+        if entry is None:
+            if state == CircuitState.CLOSED:
+                return
+            entry = self._circuits[endpoint] = _CircuitEntry()
+        if entry.state == state and state == CircuitState.CLOSED:
+            return
+
+        entry.state = state
+        entry.last_probe_at = None
+        if state == CircuitState.CLOSED:
+            entry.opened_at = None
+            entry.prediction_confidence = 0.0
+        else:
+            age = max(0.0, self._shared.now() - opened_at) if opened_at is not None else 0.0
+            entry.opened_at = time.monotonic() - age
+            entry.failure_rate_at_open = failure_rate
+
+        logger.info(
+            "circuit_breaker_shared_adopted",
+            endpoint=endpoint,
+            state=state.value,
+            version=version,
+        )
 
     async def get_state(self, endpoint: str) -> CircuitState:
         """
@@ -206,6 +258,7 @@ class CircuitBreakerV2:
                 entry.state = CircuitState.CLOSED
                 entry.opened_at = None
                 entry.last_probe_at = None
+                self._publish(endpoint, entry)
                 logger.info("circuit_force_closed", endpoint=endpoint)
 
     # ── Internal transition methods ──────────────────────────────────────────
@@ -217,6 +270,7 @@ class CircuitBreakerV2:
         entry.opened_at = time.monotonic()
         entry.last_probe_at = None
         entry.failure_rate_at_open = failure_rate
+        self._publish(endpoint, entry)
 
         logger.error(
             "circuit_breaker_OPEN",
@@ -243,6 +297,7 @@ class CircuitBreakerV2:
         entry.state = CircuitState.OPEN
         entry.opened_at = time.monotonic()  # reset timer
         entry.last_probe_at = None
+        self._publish(endpoint, entry)
 
         logger.warning(
             "circuit_breaker_probe_failed",
@@ -273,6 +328,7 @@ class CircuitBreakerV2:
         entry.state = CircuitState.CLOSED
         entry.opened_at = None
         entry.last_probe_at = None
+        self._publish(endpoint, entry)
 
         logger.info(
             "circuit_breaker_CLOSED",
@@ -297,6 +353,7 @@ class CircuitBreakerV2:
         entry.state = CircuitState.PREDICTIVE_OPEN
         entry.opened_at = time.monotonic()
         entry.prediction_confidence = confidence
+        self._publish(endpoint, entry)
 
         logger.warning(
             "circuit_breaker_PREDICTIVE_OPEN",
@@ -323,6 +380,7 @@ class CircuitBreakerV2:
         entry.state = CircuitState.CLOSED
         entry.opened_at = None
         entry.prediction_confidence = 0.0
+        self._publish(endpoint, entry)
 
         logger.info(
             "circuit_breaker_prediction_cleared",
@@ -424,6 +482,8 @@ class CircuitBreakerV2:
                 data["prediction_confidence"] = round(entry.prediction_confidence, 4)
             if entry.opened_at is not None:
                 data["quarantine_elapsed_s"] = round(now - entry.opened_at, 1)
+            if self._shared is not None:
+                data["shared_version"] = self._shared.version(endpoint)
             snapshot[endpoint] = data
         return snapshot
 
@@ -10,6 +10,10 @@ A "failure" is any 5xx response OR unhandled exception.
 Thread-safe via asyncio.Lock per endpoint slot.
 Max tracked endpoints: 200 (evict LRU beyond limit).
 
+Optional shared state (shared_state.SharedSurgeonState): outcomes are also
+buffered for Redis, and rates / counts come from the window pooled across
+instances while that view is fresh. The local window is the fallback.
+
 Excluded routes (never tracked):
   /healthz, /readyz, /health, /health/deps, /vanguard/*, /admin/*
 
@@ -24,7 +28,7 @@ Usage:
 
 import asyncio
 import time
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from ..utils.logger import get_logger
 
@@ -115,9 +119,17 @@ class FailureTracker:
     thread safety under concurrent requests.
     """
 
-    def __init__(self):
+    def __init__(self, shared=None):
         self._windows: Dict[str, _EndpointWindow] = {}
         self._global_lock = asyncio.Lock()  # protects _windows dict mutations
+        self._shared = shared               # Optional SharedSurgeonState
+
+    def attach_shared_state(self, shared) -> None:
+        """Pool windows across instances through shared (None = local only)."""
+        self._shared = shared
+
+    def _shared_window(self, endpoint: str) -> Optional[Tuple[int, int]]:
+        return self._shared.window(endpoint) if self._shared is not None else None
 
     async def record(self, endpoint: str, status_code: int) -> None:
         """
@@ -133,6 +145,8 @@ class FailureTracker:
         window = await self._get_or_create_window(endpoint)
         async with window.lock:
             window.record(_is_failure(status_code), time.monotonic())
+        if self._shared is not None:
+            self._shared.record(endpoint, _is_failure(status_code))
 
     async def record_exception(self, endpoint: str) -> None:
         """
@@ -145,6 +159,8 @@ class FailureTracker:
         window = await self._get_or_create_window(endpoint)
         async with window.lock:
             window.record(True, time.monotonic())
+        if self._shared is not None:
+            self._shared.record(endpoint, True)
 
     async def get_failure_rate(self, endpoint: str) -> float:
         """
@@ -154,6 +170,11 @@ class FailureTracker:
             float between 0.0 (no failures) and 1.0 (all failures).
             Returns 0.0 if no data exists for this endpoint.
         """
+        pooled = self._shared_window(endpoint)
+        if pooled is not None:
+            total, failed = pooled
+            return failed / total if total else 0.0
+
         window = self._windows.get(endpoint)
         if window is None:
             return 0.0
@@ -165,6 +186,10 @@ class FailureTracker:
         Get total requests in the current window for an endpoint.
         Used by circuit breaker to enforce minimum request threshold.
         """
+        pooled = self._shared_window(endpoint)
+        if pooled is not None:
+            return pooled[0]
+
         window = self._windows.get(endpoint)
         if window is None:
             return 0
@@ -178,6 +203,8 @@ class FailureTracker:
         Reset failure tracking for an endpoint.
         Called when circuit transitions to HALF_OPEN for clean probe measurement.
         """
+        if self._shared is not None:
+            self._shared.reset(endpoint)
         window = self._windows.get(endpoint)
         if window is not None:
             async with window.lock:
@@ -226,6 +253,9 @@ class FailureTracker:
                 "failure_rate": round(window.failure_rate, 4),
                 "window_age_s": round(now - window.window_start, 1),
             }
+            pooled = self._shared_window(endpoint)
+            if pooled is not None:
+                snapshot[endpoint]["shared_total"], snapshot[endpoint]["shared_failed"] = pooled
         return snapshot
 
 
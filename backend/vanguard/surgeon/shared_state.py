@@ -0,0 +1,393 @@
+"""
+Surgeon Shared State — Redis backend for FailureTracker / CircuitBreakerV2
+===========================================================================
+Without it every Cloud Run instance learns about a failing upstream on its
+own, so the dependency keeps getting hammered until each instance's window
+trips separately. With it, instances pool their failure windows and circuit
+transitions through Redis.
+
+The hot path never waits on Redis. record() and publish_transition() only
+append to a local write-behind buffer; a background loop flushes it every
+FLUSH_INTERVAL_S in one pipeline and pulls back the merged view:
+
+    vanguard:surgeon:win:{endpoint}      hash   "{bucket}:t" / "{bucket}:f" counts
+    vanguard:surgeon:winidx:{endpoint}   zset   live bucket ids (score = bucket)
+    vanguard:surgeon:circuit:{endpoint}  hash   state, opened_at, failure_rate, version
+    vanguard:surgeon:circuits            set    endpoints with a shared circuit
+
+Windows are BUCKET_S buckets over the last WINDOW_SECONDS; the window
+script adds the flushed deltas, drops expired buckets and returns the
+pooled (total, failed) atomically. Circuit transitions are a
+compare-and-set on version: the first instance to publish from the version
+it last saw wins, the others adopt the winner's state on their next sync.
+
+FAIL OPEN: if Redis errors or the last good sync is older than
+STALE_AFTER_S, readers fall back to their local window.
+
+Usage:
+    shared = await start_shared_state()   # no-op unless FEATURE_SURGEON_SHARED_STATE
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+from .failure_tracker import WINDOW_SECONDS
+
+logger = get_logger(__name__)
+
+# ── Configuration ────────────────────────────────────────────────────────────
+KEY_PREFIX = "vanguard:surgeon:"
+BUCKET_S = 5                    # shared window granularity
+FLUSH_INTERVAL_S = 1.0          # write-behind flush / sync period
+STALE_AFTER_S = 5.0             # older shared view → use local window
+CIRCUIT_TTL_S = 3600            # shared circuit records expire after an hour idle
+
+# KEYS: window hash, bucket index zset
+# ARGV: oldest live bucket, ttl, then (bucket, d_total, d_failed) triples
+_WINDOW_LUA = """
+local oldest = tonumber(ARGV[1])
+for i = 3, #ARGV, 3 do
+  local b = ARGV[i]
+  if tonumber(b) >= oldest then
+    redis.call('HINCRBY', KEYS[1], b .. ':t', ARGV[i + 1])
+    redis.call('HINCRBY', KEYS[1], b .. ':f', ARGV[i + 2])
+    redis.call('ZADD', KEYS[2], b, b)
+  end
+end
+local stale = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', '(' .. oldest)
+for _, b in ipairs(stale) do
+  redis.call('HDEL', KEYS[1], b .. ':t', b .. ':f')
+end
+if #stale > 0 then
+  redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', '(' .. oldest)
+end
+local total, failed = 0, 0
+for _, b in ipairs(redis.call('ZRANGE', KEYS[2], 0, -1)) do
+  total = total + (tonumber(redis.call('HGET', KEYS[1], b .. ':t')) or 0)
+  failed = failed + (tonumber(redis.call('HGET', KEYS[1], b .. ':f')) or 0)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return {total, failed}
+"""
+
+# KEYS: circuit hash, circuit index set
+# ARGV: endpoint, expected version, state, opened_at, failure_rate, ttl
+# Returns {applied, state, opened_at, failure_rate, version}
+_TRANSITION_LUA = """
+local version = tonumber(redis.call('HGET', KEYS[1], 'version')) or 0
+if version == tonumber(ARGV[2]) then
+  version = version + 1
+  redis.call('HSET', KEYS[1], 'state', ARGV[3], 'opened_at', ARGV[4],
+             'failure_rate', ARGV[5], 'version', version)
+  redis.call('EXPIRE', KEYS[1], ARGV[6])
+  redis.call('SADD', KEYS[2], ARGV[1])
+  return {1, ARGV[3], ARGV[4], ARGV[5], version}
+end
+local cur = redis.call('HMGET', KEYS[1], 'state', 'opened_at', 'failure_rate')
+return {0, cur[1], cur[2], cur[3], version}
+"""
+
+# KEYS: circuit index set; ARGV: circuit key prefix
+# Returns flat (endpoint, state, opened_at, failure_rate, version) tuples
+_SNAPSHOT_LUA = """
+local out = {}
+for _, ep in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+  local h = redis.call('HMGET', ARGV[1] .. ep, 'state', 'opened_at', 'failure_rate', 'version')
+  if h[1] then
+    table.insert(out, ep)
+    table.insert(out, h[1])
+    table.insert(out, h[2])
+    table.insert(out, h[3])
+    table.insert(out, h[4])
+  else
+    redis.call('SREM', KEYS[1], ep)
+  end
+end
+return out
+"""
+
+# (endpoint, state, opened_at epoch or None, failure_rate, version)
+CircuitUpdate = Tuple[str, str, Optional[float], float, int]
+
+
+def _key(kind: str, endpoint: str = "") -> str:
+    return f"{KEY_PREFIX}{kind}{':' + endpoint if endpoint else ''}"
+
+
+def _opened_at(raw) -> Optional[float]:
+    return float(raw) if raw not in (None, "", "None") else None
+
+
+class SharedSurgeonState:
+    """
+    Write-behind buffer plus pooled view of the Surgeon's windows and circuits.
+
+    record(), reset(), window() and publish_transition() are synchronous and
+    touch only local dicts; flush() is the single place that talks to Redis.
+    """
+
+    def __init__(
+        self,
+        redis,
+        flush_interval_s: float = FLUSH_INTERVAL_S,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.redis = redis
+        self.flush_interval_s = flush_interval_s
+        self.instance_id = os.getenv("K_REVISION", "local") + ":" + uuid.uuid4().hex[:8]
+        self._clock = clock
+
+        # Write-behind buffers
+        self._pending: Dict[str, Dict[int, List[int]]] = {}      # endpoint → bucket → [total, failed]
+        self._inflight: Dict[str, Dict[int, List[int]]] = {}     # handed to the running flush
+        self._resets: set = set()
+        self._transitions: Dict[str, Tuple[str, Optional[float], float, int]] = {}
+
+        # Pooled view from the last sync
+        self._windows: Dict[str, Tuple[int, int]] = {}
+        self._versions: Dict[str, int] = {}
+        self._synced_at: Optional[float] = None
+
+        self.on_circuit_update: Optional[Callable[[CircuitUpdate], None]] = None
+        self._window_script = redis.register_script(_WINDOW_LUA)
+        self._transition_script = redis.register_script(_TRANSITION_LUA)
+        self._snapshot_script = redis.register_script(_SNAPSHOT_LUA)
+
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self.stats = {"flushes": 0, "errors": 0, "transitions_won": 0, "transitions_lost": 0,
+                      "last_flush_ms": 0.0}
+
+    # ── Hot path (no I/O) ────────────────────────────────────────────────────
+
+    def _bucket(self, now: float) -> int:
+        return int(now // BUCKET_S)
+
+    def _oldest_bucket(self, now: float) -> int:
+        return self._bucket(now) - WINDOW_SECONDS // BUCKET_S + 1
+
+    def record(self, endpoint: str, is_failure: bool) -> None:
+        """Buffer one request outcome for the next flush."""
+        counts = self._pending.setdefault(endpoint, {}).setdefault(self._bucket(self._clock()), [0, 0])
+        counts[0] += 1
+        if is_failure:
+            counts[1] += 1
+
+    def reset(self, endpoint: str) -> None:
+        """Clear an endpoint's shared window (locally now, in Redis on flush)."""
+        self._resets.add(endpoint)
+        self._pending.pop(endpoint, None)
+        self._inflight.pop(endpoint, None)
+        self._windows[endpoint] = (0, 0)
+
+    @property
+    def fresh(self) -> bool:
+        return self._synced_at is not None and self._clock() - self._synced_at <= STALE_AFTER_S
+
+    def window(self, endpoint: str) -> Optional[Tuple[int, int]]:
+        """
+        Pooled (total, failed) for endpoint: last synced view plus this
+        instance's unflushed outcomes. None when the shared view is stale
+        or has not covered this endpoint yet.
+        """
+        if not self.fresh or endpoint not in self._windows:
+            return None
+        total, failed = self._windows[endpoint]
+        oldest = self._oldest_bucket(self._clock())
+        for buffer in (self._inflight, self._pending):
+            for bucket, (t, f) in buffer.get(endpoint, {}).items():
+                if bucket >= oldest:
+                    total += t
+                    failed += f
+        return total, failed
+
+    def now(self) -> float:
+        """Epoch seconds on the clock shared windows and circuits use."""
+        return self._clock()
+
+    def version(self, endpoint: str) -> int:
+        return self._versions.get(endpoint, 0)
+
+    def publish_transition(self, endpoint: str, state: str,
+                           opened_at: Optional[float], failure_rate: float) -> None:
+        """
+        Queue a circuit transition (opened_at as epoch seconds). Only the
+        latest per endpoint is sent, compared against the version this
+        instance last saw before any of them.
+        """
+        base = self._transitions.get(endpoint, (None, None, None, self.version(endpoint)))[3]
+        self._transitions[endpoint] = (state, opened_at, failure_rate, base)
+
+    # ── Sync ─────────────────────────────────────────────────────────────────
+
+    async def flush(self) -> bool:
+        """
+        Push buffered outcomes, resets and transitions in one pipeline and
+        pull back pooled windows and every shared circuit. Returns False
+        (buffers kept for the next attempt) if Redis is unavailable.
+        """
+        started = time.perf_counter()
+        now = self._clock()
+        oldest = self._oldest_bucket(now)
+
+        pending, self._pending = self._pending, {}
+        self._inflight = pending
+        resets, self._resets = self._resets, set()
+        transitions, self._transitions = self._transitions, {}
+        # Refresh every endpoint we have a view or a shared circuit for,
+        # not only those with traffic
+        endpoints = sorted(set(pending) | set(self._windows) | resets | set(self._versions))
+
+        try:
+            # Scripts queue onto the pipeline (EVALSHA, loaded on NOSCRIPT)
+            pipe = self.redis.pipeline(transaction=False)
+            for endpoint in resets:
+                pipe.delete(_key("win", endpoint), _key("winidx", endpoint))
+            for endpoint in endpoints:
+                args: List = [oldest, WINDOW_SECONDS + BUCKET_S]
+                for bucket, (t, f) in pending.get(endpoint, {}).items():
+                    args.extend((bucket, t, f))
+                await self._window_script(keys=[_key("win", endpoint), _key("winidx", endpoint)],
+                                          args=args, client=pipe)
+            for endpoint, (state, opened_at, rate, base) in transitions.items():
+                await self._transition_script(
+                    keys=[_key("circuit", endpoint), _key("circuits")],
+                    args=[endpoint, base, state, "" if opened_at is None else opened_at, rate, CIRCUIT_TTL_S],
+                    client=pipe,
+                )
+            await self._snapshot_script(keys=[_key("circuits")], args=[KEY_PREFIX + "circuit:"], client=pipe)
+            results = await pipe.execute()
+        except Exception as e:
+            # Keep everything for the next attempt; readers go local once stale
+            self._inflight = {}
+            for endpoint, buckets in pending.items():
+                mine = self._pending.setdefault(endpoint, {})
+                for bucket, (t, f) in buckets.items():
+                    counts = mine.setdefault(bucket, [0, 0])
+                    counts[0] += t
+                    counts[1] += f
+            self._resets |= resets
+            for endpoint, queued in transitions.items():
+                self._transitions.setdefault(endpoint, queued)
+            self.stats["errors"] += 1
+            logger.warning("surgeon_shared_state_flush_failed", error=str(e))
+            return False
+
+        results = results[len(resets):]
+        for endpoint, (total, failed) in zip(endpoints, results):
+            if endpoint not in self._resets:     # reset again while in flight
+                self._windows[endpoint] = (int(total), int(failed))
+        results = results[len(endpoints):]
+
+        for endpoint, (applied, *_rest) in zip(transitions, results):
+            self.stats["transitions_won" if int(applied) else "transitions_lost"] += 1
+        snapshot = results[len(transitions)]
+
+        self._inflight = {}
+        self._synced_at = now
+        self._apply_snapshot(snapshot)
+        self.stats["flushes"] += 1
+        self.stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return True
+
+    def _apply_snapshot(self, flat: List) -> None:
+        for i in range(0, len(flat), 5):
+            endpoint, state, opened_at, rate, version = flat[i:i + 5]
+            version = int(version)
+            # A transition queued since this flush started settles on the
+            # next one: adopting now would move its compare-and-set base
+            if endpoint in self._transitions or version <= self._versions.get(endpoint, 0):
+                continue
+            self._versions[endpoint] = version
+            if self.on_circuit_update is not None:
+                try:
+                    self.on_circuit_update((endpoint, state, _opened_at(opened_at), float(rate or 0.0), version))
+                except Exception as e:
+                    logger.error("surgeon_shared_state_adopt_failed", endpoint=endpoint, error=str(e))
+
+    async def _loop(self) -> None:
+        while self._running:
+            await self.flush()
+            await asyncio.sleep(self.flush_interval_s)
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._loop())
+        logger.info("surgeon_shared_state_started", instance=self.instance_id,
+                    flush_interval_s=self.flush_interval_s)
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()    # last buffered outcomes
+
+    def get_status(self) -> Dict:
+        return {
+            "instance_id": self.instance_id,
+            "fresh": self.fresh,
+            "synced_age_s": None if self._synced_at is None else round(self._clock() - self._synced_at, 2),
+            "buffered_endpoints": len(self._pending),
+            "queued_transitions": len(self._transitions),
+            "shared_circuits": len(self._versions),
+            **self.stats,
+        }
+
+
+# ── Singleton ────────────────────────────────────────────────────────────────
+_shared_state: Optional[SharedSurgeonState] = None
+
+
+def get_shared_state() -> Optional[SharedSurgeonState]:
+    """The running shared-state backend, or None in per-instance mode."""
+    return _shared_state
+
+
+def attach_shared_state(shared: SharedSurgeonState) -> SharedSurgeonState:
+    """Point the FailureTracker and CircuitBreakerV2 singletons at shared."""
+    global _shared_state
+    from .circuit_breaker_v2 import get_circuit_breaker_v2
+    from .failure_tracker import get_failure_tracker
+
+    get_failure_tracker().attach_shared_state(shared)
+    get_circuit_breaker_v2().attach_shared_state(shared)
+    _shared_state = shared
+    return shared
+
+
+async def start_shared_state() -> Optional[SharedSurgeonState]:
+    """
+    Start the shared backend if FEATURE_SURGEON_SHARED_STATE is on and
+    Redis is reachable. Otherwise the Surgeon stays per-instance.
+    """
+    from ..core.feature_flags import flag
+    from ..bootstrap.redis_client import get_redis_or_none
+
+    if not flag("FEATURE_SURGEON_SHARED_STATE"):
+        return None
+    redis = await get_redis_or_none()
+    if redis is None:
+        logger.warning("surgeon_shared_state_unavailable", reason="redis_unreachable")
+        return None
+    shared = attach_shared_state(SharedSurgeonState(redis))
+    shared.start()
+    return shared
+
+
+async def stop_shared_state() -> None:
+    global _shared_state
+    if _shared_state is not None:
+        await _shared_state.stop()
+        _shared_state = None
@@ -0,0 +1,226 @@
+"""
+Tests for the incremental codebase knowledge index
+===================================================
+Covers:
+  1. summarise_source: routes with router prefixes, models, imports, mounts
+  2. refresh() re-parses only changed files; a touch with the same content rehashes
+  3. The index persists and a fresh instance reloads it without parsing
+  4. match_route / select pick the serving route, traceback files and one import hop
+  5. get_incident_context is a small slice of the full KB, cached per fingerprint
+"""
+
+import asyncio
+import os
+import sys
+import textwrap
+
+# Ensure backend is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from vanguard.vaccine import codebase_kb
+from vanguard.vaccine.codebase_index import CodebaseIndex, summarise_source
+
+NEXUS_ROUTES = '''
+"""Nexus player routes."""
+from fastapi import APIRouter
+from pydantic import BaseModel
+from ..services.player_store import load_player
+
+router = APIRouter(prefix="/nexus")
+
+
+class PlayerOut(BaseModel):
+    player_id: str
+    name: str
+    pts: float
+
+
+@router.get("/players/{player_id}")
+async def get_player(player_id: str):
+    return load_player(player_id)
+
+
+@router.api_route("/refresh", methods=["GET", "POST"])
+async def refresh():
+    return {}
+'''
+
+PLAYER_STORE = '''
+"""Player storage."""
+from google.cloud import firestore
+
+
+def load_player(player_id):
+    return firestore.Client().collection("players").document(player_id).get()
+'''
+
+LIVE_ROUTES = '''
+from fastapi import APIRouter
+
+router = APIRouter()
+
+
+@router.get("/games/{game_id}")
+async def get_game(game_id: str):
+    return {}
+
+
+@router.get("/games/today")
+async def games_today():
+    return []
+'''
+
+MAIN = '''
+from vanguard.lazy import LazyRouter
+
+ROUTERS = [LazyRouter("api.live_routes", prefix="/live")]
+'''
+
+FILLER = '''
+"""Unrelated engine {n}."""
+
+
+def compute_{n}(x):
+    return x * {n}
+'''
+
+TRACE = '''Traceback (most recent call last):
+  File "/app/vanguard/api/nexus_routes.py", line 19, in get_player
+    return load_player(player_id)
+  File "/app/vanguard/services/player_store.py", line 6, in load_player
+KeyError: 'player_id'
+'''
+
+
+def _tree(root):
+    files = {
+        "vanguard/api/nexus_routes.py": NEXUS_ROUTES,
+        "vanguard/services/player_store.py": PLAYER_STORE,
+        "api/live_routes.py": LIVE_ROUTES,
+        "main.py": MAIN,
+        "server.py": "",
+        "vanguard/tests/test_skipped.py": "def test_x(): pass\n",
+    }
+    files.update({f"engines/engine_{n}.py": FILLER.format(n=n) for n in range(30)})
+    for rel, source in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source))
+    return root
+
+
+def _index(root):
+    return CodebaseIndex(root, index_path=root / "data" / "kb" / "file_index.json",
+                         dirs=["vanguard", "engines", "api"], skip_dirs={"tests"}, skip_prefixes=("test_",))
+
+
+# ── Test 1: AST summary ────────────────────────────────────────────────────
+def test_summarise_source():
+    summary = summarise_source(NEXUS_ROUTES, "vanguard/api/nexus_routes.py")
+
+    assert summary["docstring"] == "Nexus player routes." and summary["error"] is None
+    assert [(r["method"], r["path"], r["handler"]) for r in summary["routes"]] == [
+        ("GET", "/nexus/players/{player_id}", "get_player"),
+        ("GET", "/nexus/refresh", "refresh"),
+        ("POST", "/nexus/refresh", "refresh"),
+    ]
+    assert summary["models"] == [{"name": "PlayerOut", "fields": ["player_id", "name", "pts"], "line": 10}]
+    assert "vanguard.services.player_store.load_player" in summary["imports"]
+
+    assert summarise_source(MAIN, "main.py")["mounts"] == [{"module": "api.live_routes", "prefix": "/live"}]
+    broken = summarise_source("def broken(:\n", "x.py")
+    assert broken["error"].startswith("SyntaxError") and broken["routes"] == []
+
+
+# ── Test 2: incremental refresh ────────────────────────────────────────────
+def test_refresh_reparses_only_changed_files(tmp_path):
+    root = _tree(tmp_path)
+    index = _index(root)
+
+    first = index.refresh()
+    assert first["parsed"] == first["files"] == 35 and index.generation == 1
+    assert "vanguard/tests/test_skipped.py" not in [m["rel_path"] for m in index.modules()]
+
+    assert index.refresh()["unchanged"] == 35 and index.generation == 1
+
+    store = root / "vanguard" / "services" / "player_store.py"
+    store.write_text(store.read_text().replace('"players"', '"player_profiles"'))
+    changed = index.refresh()
+    assert (changed["parsed"], changed["unchanged"]) == (1, 34) and index.generation == 2
+    assert index.collections() == ["player_profiles"]
+
+    # Same bytes, new mtime: hashed but not parsed, structure unchanged
+    os.utime(store, ns=(store.stat().st_atime_ns, store.stat().st_mtime_ns + 10**9))
+    touched = index.refresh()
+    assert (touched["parsed"], touched["rehashed"]) == (0, 1) and index.generation == 2
+
+    (root / "engines" / "engine_0.py").unlink()
+    assert index.refresh()["removed"] == 1 and len(index) == 34
+
+
+# ── Test 3: persistence ────────────────────────────────────────────────────
+def test_index_reloads_from_disk(tmp_path):
+    root = _tree(tmp_path)
+    index = _index(root)
+    index.refresh()
+
+    reloaded = _index(root)
+    assert reloaded.modules() == index.modules()
+    assert reloaded.refresh()["parsed"] == 0
+
+    # A different root never reuses the file
+    other = CodebaseIndex(tmp_path / "elsewhere", index_path=root / "data" / "kb" / "file_index.json")
+    assert len(other) == 0
+
+
+# ── Test 4: route matching and incident selection ──────────────────────────
+def test_match_route_and_select(tmp_path):
+    index = _index(_tree(tmp_path))
+    index.refresh()
+
+    # The LazyRouter mount in main.py prefixes api/live_routes.py
+    assert index.match_route("/live/games/today")[0]["handler"] == "games_today"
+    assert index.match_route("/live/games/0022400123?period=2")[0]["handler"] == "get_game"
+    assert index.match_route("/nexus/refresh", method="POST")[0]["method"] == "POST"
+    # Mounted somewhere the index cannot see: suffix match still finds it
+    assert index.match_route("/v2/nexus/players/2544")[0]["handler"] == "get_player"
+    assert index.match_route("/nowhere") == []
+
+    by_endpoint = index.select(endpoint="/nexus/players/2544")
+    assert [m["rel_path"] for m in by_endpoint["modules"]] == [
+        "vanguard/api/nexus_routes.py", "vanguard/services/player_store.py"]
+    assert [m["name"] for m in by_endpoint["models"]] == ["PlayerOut"]
+    assert by_endpoint["collections"] == ["players"]
+
+    # Innermost traceback frame first
+    by_trace = index.select(traceback=TRACE)
+    assert [m["rel_path"] for m in by_trace["modules"]][:2] == [
+        "vanguard/services/player_store.py", "vanguard/api/nexus_routes.py"]
+    assert by_trace["routes"] == []
+
+
+# ── Test 5: per-incident KB context ────────────────────────────────────────
+def test_incident_context_is_sliced_and_cached(tmp_path, monkeypatch):
+    root = _tree(tmp_path)
+    monkeypatch.setattr(codebase_kb, "_repo_root", lambda: root)
+    monkeypatch.setattr(codebase_kb, "_BACKEND_DIRS", ["vanguard", "engines", "api"])
+    monkeypatch.setattr(codebase_kb, "_INDEXES", {})
+    monkeypatch.setattr(codebase_kb, "_KB_CACHE", None)
+    monkeypatch.setattr(codebase_kb, "_KB_BUILT_AT", None)
+    codebase_kb._SLICE_CACHE.clear()
+
+    async def contexts():
+        full = await codebase_kb.get_codebase_context()
+        first = await codebase_kb.get_incident_context(endpoint="/nexus/players/2544", fingerprint="fp-1")
+        index = codebase_kb.get_codebase_index(root)
+        calls = []
+        monkeypatch.setattr(index, "select", lambda **kw: calls.append(kw))
+        again = await codebase_kb.get_incident_context(endpoint="/nexus/players/2544", fingerprint="fp-1")
+        return full, first, again, calls
+
+    full, first, again, calls = asyncio.run(contexts())
+    assert "compute_7" in full and "compute_7" not in first
+    assert "GET /nexus/players/{player_id}" in first and "PlayerOut" in first and "players" in first
+    assert len(first) < len(full) / 2
+    assert again == first and calls == []
+    codebase_kb._SLICE_CACHE.clear()
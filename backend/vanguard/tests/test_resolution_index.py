@@ -0,0 +1,190 @@
+"""
+Tests for the indexed VanguardResolutionLearner lookups
+=========================================================
+Covers:
+  1. BM25 scores match a brute-force reference; only verified fixes return
+  2. Ranking: best pattern match first, effectiveness breaks ties
+  3. Stack-trace fingerprints ignore line numbers and pull in similar traces
+  4. record_fix / verify_fix append to the log; reload replays it exactly
+  5. Legacy resolutions.json is migrated; a torn last log line is skipped
+  6. Lookups stay sub-millisecond-scale at tens of thousands of records
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+# Ensure backend is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from vanguard.resolution_index import (
+    BM25_B,
+    BM25_K1,
+    build_index,
+    tokenize_pattern,
+    trace_fingerprint,
+)
+from vanguard.resolution_learner import VanguardResolutionLearner
+
+ROUTES = [f"/{a}/{b}" for a in ("api", "live", "aegis", "nexus", "vanguard")
+          for b in ("health", "players", "box", "pbp", "sim", "leaders")]
+CODES = ("404", "500", "502", "503", "429")
+ERRORS = ("HTTPError", "TimeoutError", "KeyError", "ConnectionError")
+
+TRACE = """Traceback (most recent call last):
+  File "/app/services/nba_api_connector.py", line 212, in fetch_box_score
+    resp = session.get(url, timeout=5)
+  File "/usr/lib/python3.11/site-packages/requests/sessions.py", line 602, in get
+requests.exceptions.ReadTimeout: HTTPSConnectionPool(host='stats.nba.com', port=443): Read timed out. (read timeout=5)
+"""
+
+
+def _corpus(n, seed=7):
+    rng = random.Random(seed)
+    return [f"{rng.choice(ROUTES)}/{rng.randint(1, 300)} {rng.choice(CODES)} {rng.choice(ERRORS)}"
+            for _ in range(n)]
+
+
+def _bm25_reference(patterns, query):
+    docs = [tokenize_pattern(p) for p in patterns]
+    avg_len = sum(map(len, docs)) / len(docs)
+    df = Counter(t for d in docs for t in set(d))
+    scores = []
+    for doc in docs:
+        tf = Counter(doc)
+        score = 0.0
+        for term in set(tokenize_pattern(query)):
+            if tf[term]:
+                idf = math.log(1 + (len(docs) - df[term] + 0.5) / (df[term] + 0.5))
+                score += idf * tf[term] * (BM25_K1 + 1) / (
+                    tf[term] + BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avg_len))
+        scores.append(score)
+    return scores
+
+
+def _learner(tmp_path, name="resolutions.jsonl"):
+    return VanguardResolutionLearner(storage_path=str(tmp_path / name))
+
+
+# ── Test 1: BM25 matches brute force, unverified never returned ───────────
+def test_bm25_matches_reference():
+    patterns = _corpus(400)
+    index = build_index((p, (), i % 3 != 0, 0.0) for i, p in enumerate(patterns))
+
+    for query in ("/api/health 404 HTTPError", "/live/pbp 503", "TimeoutError", "nothing-shared"):
+        reference = _bm25_reference(patterns, query)
+        hits = index.search(query)
+        expected = {i for i, s in enumerate(reference) if s > 0 and i % 3 != 0}
+        assert {i for i, _ in hits} == expected
+        for record_id, score in hits:
+            assert math.isclose(score, reference[record_id], rel_tol=1e-6)
+        assert [s for _, s in hits] == sorted((s for _, s in hits), reverse=True)
+        assert index.search(query, limit=7) == hits[:7]
+
+
+# ── Test 2: ranking through the learner ────────────────────────────────────
+def test_similar_resolutions_ranking(tmp_path):
+    learner = _learner(tmp_path)
+    fixes = [
+        ("/nexus/health 404", "Register nexus router", 50, 0),
+        ("/aegis/sim 500 KeyError", "Guard missing key", 40, 20),
+        ("/aegis/sim 500 KeyError", "Default opponent pace", 40, 2),
+        ("/nexus/status 404", "Add status route", 10, 5),
+        ("/live/box 502", "Retry upstream", 30, 30),
+    ]
+    for pattern, description, before, after in fixes:
+        learner.record_fix(pattern, description, ["x.py"], "rev-1", before)
+        learner.verify_fix(pattern, after)
+    learner.record_fix("/nexus/health 404", "Unverified duplicate", ["y.py"], "rev-2", 9)
+
+    assert [r.fix_description for r in learner.get_similar_resolutions("/nexus/health 404")][:2] == \
+        ["Register nexus router", "Add status route"]
+    # Same pattern twice: the more effective fix (95% vs 50% reduction) wins the tie
+    assert [r.fix_description for r in learner.get_similar_resolutions("/aegis/sim 500 KeyError", limit=2)] == \
+        ["Default opponent pace", "Guard missing key"]
+    assert learner.get_similar_resolutions("/unrelated 418") == []
+    assert "Register nexus router" in learner.suggest_fix("/nexus/health 404")
+
+
+# ── Test 3: stack-trace fingerprints ───────────────────────────────────────
+def test_trace_fingerprints(tmp_path):
+    moved = TRACE.replace("line 212", "line 240").replace("timeout=5", "timeout=8")
+    assert trace_fingerprint(TRACE) == trace_fingerprint(moved)
+    assert len(trace_fingerprint(TRACE)) == 64 and trace_fingerprint("") == []
+
+    learner = _learner(tmp_path)
+    learner.record_fix("/api/box 500 ReadTimeout", "Raise NBA API timeout", ["nba_api_connector.py"], "r1", 20,
+                       stack_trace=TRACE)
+    learner.record_fix("/api/box 500 KeyError", "Handle empty box score", ["box.py"], "r2", 20,
+                       stack_trace='File "/app/services/box.py", line 9, in parse\nKeyError: \'homeTeam\'')
+    learner.verify_fix("/api/box 500 ReadTimeout", 2)
+    learner.verify_fix("/api/box 500 KeyError", 0)
+
+    # Pattern alone prefers the more effective KeyError fix; the trace flips it
+    assert learner.get_similar_resolutions("/api/box 500", limit=1)[0].fix_description == "Handle empty box score"
+    best = learner.get_similar_resolutions("/api/box 500", limit=1, stack_trace=moved)[0]
+    assert best.fix_description == "Raise NBA API timeout"
+
+
+# ── Test 4: append-only log, exact replay ──────────────────────────────────
+def test_log_appends_and_replays(tmp_path):
+    learner = _learner(tmp_path)
+    learner.record_fix("/nexus/health 404", "Register nexus router", ["a.py"], "r1", 50, stack_trace=TRACE)
+    before = learner.storage_path.read_bytes()
+    learner.record_fix("/live/box 502", "Retry upstream", ["b.py"], "r2", 30)
+    learner.verify_fix("/nexus/health 404", 0)
+
+    after = learner.storage_path.read_bytes()
+    assert after.startswith(before)                                  # appended, never rewritten
+    ops = [json.loads(line)["op"] for line in after.decode().splitlines()]
+    assert ops == ["record", "record", "verify"]
+
+    reloaded = _learner(tmp_path)
+    assert reloaded.resolutions == learner.resolutions
+    assert reloaded.get_stats() == learner.get_stats()
+    assert reloaded.get_similar_resolutions("/nexus/health 404") == learner.get_similar_resolutions("/nexus/health 404")
+    assert reloaded.verify_fix("/live/box 502", 3).reduction_percentage == 90.0
+    assert reloaded.verify_fix("/live/box 502", 3) is None           # nothing left to verify
+
+
+# ── Test 5: legacy migration and torn lines ────────────────────────────────
+def test_legacy_json_and_torn_line(tmp_path):
+    legacy = [{"incident_pattern": "/nexus/health 404", "fix_description": "Register nexus router",
+               "fix_files": ["a.py"], "fix_commit": None, "deployed_revision": "r1",
+               "timestamp": "2026-01-01T00:00:00Z", "incidents_before": 50, "incidents_after": 0,
+               "reduction_percentage": 100.0, "verification_period_hours": 24}]
+    (tmp_path / "resolutions.json").write_text(json.dumps(legacy, indent=2))
+
+    learner = _learner(tmp_path)
+    assert [r.fix_description for r in learner.get_similar_resolutions("/nexus/health 404")] == \
+        ["Register nexus router"]
+    assert learner.storage_path.read_text().count("\n") == 1
+
+    with open(learner.storage_path, "a") as f:
+        f.write('{"op": "record", "incident_pattern": "/live')        # interrupted append
+    reloaded = _learner(tmp_path)
+    assert len(reloaded.resolutions) == 1
+    assert reloaded.resolutions[0].trace_fingerprint == []
+
+
+# ── Test 6: lookup latency at scale ────────────────────────────────────────
+def test_lookup_latency_at_scale():
+    patterns = _corpus(30_000, seed=11)
+    index = build_index((p, (), True, float(i % 100)) for i, p in enumerate(patterns))
+    queries = _corpus(100, seed=12)
+    for query in queries:
+        index.search(query, limit=5)
+
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        hits = index.search(query, limit=5)
+        timings.append(time.perf_counter() - start)
+        assert len(hits) == 5
+    timings.sort()
+    # Well under a linear scan (tens of ms here); generous for slow CI boxes
+    assert timings[len(timings) // 2] < 0.005
@@ -0,0 +1,228 @@
+"""
+Tests for the Redis shared state behind FailureTracker / CircuitBreakerV2
+==========================================================================
+Two "instances" (each its own tracker, breaker and SharedSurgeonState) talk
+to one fakeredis server, which runs the Lua scripts for real.
+
+Covers:
+  1. Windows pool across instances after a flush; local window until then
+  2. Expired buckets drop out of the shared window
+  3. Redis outage: the hot path keeps working locally, buffers replay on recovery
+  4. A circuit opened on one instance is adopted by the other (no duplicate incident)
+  5. Concurrent transitions: one compare-and-set wins, both converge; recovery propagates
+  6. The background loop flushes periodically and once more on stop()
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import fakeredis
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from vanguard.surgeon.circuit_breaker_v2 import CircuitBreakerV2, CircuitState
+from vanguard.surgeon.failure_tracker import FailureTracker, WINDOW_SECONDS
+from vanguard.surgeon.shared_state import BUCKET_S, STALE_AFTER_S, SharedSurgeonState
+
+ENDPOINT = "/players/2544/stats"
+
+
+class _Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _instance(server, clock):
+    redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    shared = SharedSurgeonState(redis, clock=clock)
+    cb = CircuitBreakerV2()
+    cb.attach_shared_state(shared)
+    cb._post_incident = AsyncMock()
+    return SimpleNamespace(shared=shared, tracker=FailureTracker(shared=shared), cb=cb)
+
+
+async def _traffic(inst, ok, failed, endpoint=ENDPOINT):
+    for _ in range(ok):
+        await inst.tracker.record(endpoint, 200)
+    for _ in range(failed):
+        await inst.tracker.record(endpoint, 503)
+
+
+async def _evaluate(inst, endpoint=ENDPOINT):
+    with patch("vanguard.surgeon.circuit_breaker_v2.get_failure_tracker", return_value=inst.tracker):
+        await inst.cb.evaluate_endpoint(endpoint)
+
+
+# ── Test 1: pooled windows ─────────────────────────────────────────────────
+def test_windows_pool_across_instances():
+    async def _test():
+        server, clock = fakeredis.FakeServer(), _Clock()
+        a, b = _instance(server, clock), _instance(server, clock)
+
+        await _traffic(a, ok=2, failed=4)
+        await _traffic(b, ok=4, failed=2)
+        # Never synced: each instance only knows its own window
+        assert await a.tracker.get_request_count(ENDPOINT) == 6
+        assert round(await a.tracker.get_failure_rate(ENDPOINT), 4) == round(4 / 6, 4)
+
+        assert await a.shared.flush() and await b.shared.flush()
+        await a.shared.flush()
+        for inst in (a, b):
+            assert await inst.tracker.get_request_count(ENDPOINT) == 12
+            assert await inst.tracker.get_failure_rate(ENDPOINT) == 0.5
+
+        # Unflushed outcomes count immediately on top of the pooled view
+        await _traffic(b, ok=0, failed=3)
+        assert b.shared.window(ENDPOINT) == (15, 9)
+        assert a.tracker.get_all_rates()[ENDPOINT]["shared_total"] == 12
+
+        # Stale view (no sync for a while) → back to the local window
+        clock.now += STALE_AFTER_S + 1
+        assert await a.tracker.get_request_count(ENDPOINT) == 6
+
+    asyncio.run(_test())
+
+
+# ── Test 2: bucket expiry in the Lua window ────────────────────────────────
+def test_expired_buckets_leave_window():
+    async def _test():
+        server, clock = fakeredis.FakeServer(), _Clock()
+        a = _instance(server, clock)
+
+        await _traffic(a, ok=5, failed=5)
+        await a.shared.flush()
+        clock.now += WINDOW_SECONDS / 2
+        await _traffic(a, ok=3, failed=0)
+        await a.shared.flush()
+        assert a.shared.window(ENDPOINT) == (13, 5)
+
+        clock.now += WINDOW_SECONDS / 2 + BUCKET_S
+        await a.shared.flush()
+        assert a.shared.window(ENDPOINT) == (3, 0)
+        redis = a.shared.redis
+        assert await redis.zcard(f"vanguard:surgeon:winidx:{ENDPOINT}") == 1
+        assert len(await redis.hgetall(f"vanguard:surgeon:win:{ENDPOINT}")) == 2
+
+    asyncio.run(_test())
+
+
+# ── Test 3: Redis outage ───────────────────────────────────────────────────
+def test_outage_keeps_hot_path_local():
+    async def _test():
+        server, clock = fakeredis.FakeServer(), _Clock()
+        a, b = _instance(server, clock), _instance(server, clock)
+        await a.shared.flush()
+
+        server.connected = False
+        await _traffic(a, ok=1, failed=11)
+        await _evaluate(a)                                   # trips on pooled view + buffer
+        assert await a.cb.get_state(ENDPOINT) == CircuitState.OPEN
+        assert not await a.shared.flush()
+        assert a.shared.stats["errors"] == 1
+
+        clock.now += STALE_AFTER_S + 1
+        assert not a.shared.fresh
+        await a.tracker.record(ENDPOINT, 200)
+        assert await a.tracker.get_request_count(ENDPOINT) == 1      # local (reset on OPEN)
+
+        # Back online: the queued OPEN and buffered outcome replay
+        server.connected = True
+        assert await a.shared.flush() and await b.shared.flush()
+        assert await b.cb.get_state(ENDPOINT) == CircuitState.OPEN
+        assert b.shared.window(ENDPOINT) is None             # b has no view of it yet
+        await b.shared.flush()                               # adopted circuits are synced too
+        assert b.shared.window(ENDPOINT) == (1, 0)
+
+    asyncio.run(_test())
+
+
+# ── Test 4: adoption without duplicate incidents ───────────────────────────
+def test_open_circuit_is_adopted():
+    async def _test():
+        server, clock = fakeredis.FakeServer(), _Clock()
+        a, b = _instance(server, clock), _instance(server, clock)
+
+        await _traffic(b, ok=3, failed=0)                    # b alone would stay CLOSED
+        await b.shared.flush()
+        await _traffic(a, ok=2, failed=10)
+        await _evaluate(a)
+        assert await a.cb.get_state(ENDPOINT) == CircuitState.OPEN
+        assert a.cb._post_incident.await_count == 1
+
+        await a.shared.flush()
+        clock.now += 20
+        await b.shared.flush()
+        assert await b.cb.get_state(ENDPOINT) == CircuitState.OPEN
+        assert b.cb.get_all_states()[ENDPOINT]["quarantine_elapsed_s"] >= 20
+        assert b.cb.get_all_states()[ENDPOINT]["shared_version"] == 1
+        b.cb._post_incident.assert_not_awaited()
+        # a reset the shared window on OPEN, so b's earlier traffic is gone too
+        assert b.shared.window(ENDPOINT) == (0, 0)
+
+        # Blast-radius routes are never adopted, even if Redis says so
+        b.cb._adopt_shared(("/health", "OPEN", clock.now, 1.0, 9))
+        assert await b.cb.get_state("/health") == CircuitState.CLOSED
+
+    asyncio.run(_test())
+
+
+# ── Test 5: compare-and-set conflicts and recovery ─────────────────────────
+def test_transitions_converge():
+    async def _test():
+        server, clock = fakeredis.FakeServer(), _Clock()
+        a, b = _instance(server, clock), _instance(server, clock)
+
+        # Both trip before either has synced
+        await _traffic(a, ok=0, failed=12)
+        await _traffic(b, ok=0, failed=12)
+        await _evaluate(a)
+        await _evaluate(b)
+        await a.shared.flush()
+        await b.shared.flush()
+        assert (a.shared.stats["transitions_won"], b.shared.stats["transitions_lost"]) == (1, 1)
+        await b.shared.flush()                               # b adopts a's OPEN
+        assert a.shared.version(ENDPOINT) == b.shared.version(ENDPOINT) == 1
+
+        # Quarantine expires locally; a's probe succeeds and closes everywhere
+        for inst in (a, b):
+            inst.cb._circuits[ENDPOINT].opened_at -= 61
+            assert await inst.cb.get_state(ENDPOINT) == CircuitState.HALF_OPEN
+        await a.cb.record_probe_result(ENDPOINT, success=True)
+        await a.shared.flush()
+        await b.shared.flush()
+        assert await b.cb.get_state(ENDPOINT) == CircuitState.CLOSED
+        assert b.shared.version(ENDPOINT) == 2
+        assert await fakeredis.FakeAsyncRedis(server=server, decode_responses=True).hgetall(
+            f"vanguard:surgeon:circuit:{ENDPOINT}") == {
+                "state": "CLOSED", "opened_at": "", "failure_rate": "1.0", "version": "2"}
+
+    asyncio.run(_test())
+
+
+# ── Test 6: background loop ────────────────────────────────────────────────
+def test_loop_flushes_and_drains_on_stop():
+    async def _test():
+        server, clock = fakeredis.FakeServer(), _Clock()
+        a, b = _instance(server, clock), _instance(server, clock)
+        a.shared.flush_interval_s = 0.01
+
+        a.shared.start()
+        await _traffic(a, ok=4, failed=1)
+        await asyncio.sleep(0.05)
+        assert a.shared.stats["flushes"] >= 2
+        await _traffic(a, ok=1, failed=0)
+        await a.shared.stop()
+        assert a.shared._task is None and a.shared._pending == {}
+
+        await b.tracker.record(ENDPOINT, 200)
+        await b.shared.flush()
+        assert b.shared.window(ENDPOINT) == (7, 1)
+        assert a.shared.get_status()["fresh"] is True
+
+    asyncio.run(_test())
@@ -0,0 +1,136 @@
+"""
+Bounded-Memory Rate Limiter
+============================
+GCRA (generic cell rate algorithm) per key, held in an LRU with a hard
+capacity cap. Shared by the HTTP rate limiter and the Inquisitor's
+per-fingerprint incident throttle.
+
+Per key we keep one float: the theoretical arrival time (TAT) of the next
+request. With emission interval T = period / limit and burst tolerance
+tau = period - T, a request at `now` is allowed iff TAT - now <= tau, in
+which case TAT advances to max(TAT, now) + T. That admits a burst of
+`limit` and then one request every T seconds — a sliding window without
+the per-request timestamp deque.
+
+Memory and cost:
+  - check() is O(1): one dict lookup, move_to_end, and at most
+    _SWEEP_PER_CHECK expired entries popped from the cold end.
+  - At most max_keys entries. A new key arriving at capacity evicts the
+    least recently seen one. Evicting an expired key loses nothing;
+    evicting a key that is still limited lets it start fresh, which is
+    counted separately (evicted_active) so a flood that is churning real
+    state is visible.
+  - Single-threaded asyncio callers only; no lock.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional
+
+# Expired entries dropped from the LRU end per check (bounded work per call)
+_SWEEP_PER_CHECK = 2
+
+
+class RateDecision(NamedTuple):
+    allowed: bool
+    remaining: int       # requests still allowed right now, after this one
+    retry_after: float   # seconds until the next request would be allowed
+
+
+class BoundedRateLimiter:
+    """GCRA limiter over an LRU of at most `max_keys` keys."""
+
+    def __init__(
+        self,
+        limit: int,
+        period: float,
+        max_keys: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if limit < 1 or period <= 0 or max_keys < 1:
+            raise ValueError("limit, period and max_keys must be positive")
+        self.limit = limit
+        self.period = float(period)
+        self.max_keys = max_keys
+        self._clock = clock
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "allowed": 0, "suppressed": 0, "evictions": 0, "evicted_active": 0, "expired": 0,
+        }
+
+    def check(
+        self,
+        key: str,
+        limit: Optional[int] = None,
+        period: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> RateDecision:
+        """Admit or suppress one event for `key`.
+
+        `limit` / `period` override the defaults for this call; a key must
+        always be checked with the same pair.
+        """
+        limit = limit or self.limit
+        period = float(period or self.period)
+        now = self._clock() if now is None else now
+        interval = period / limit
+        tolerance = period - interval
+
+        tat = self._tat.get(key)
+        if tat is None:
+            self._sweep(now)
+            if len(self._tat) >= self.max_keys:
+                _, evicted_tat = self._tat.popitem(last=False)
+                self.stats["evictions"] += 1
+                if evicted_tat > now:
+                    self.stats["evicted_active"] += 1
+            tat = now
+        else:
+            self._tat.move_to_end(key)
+            tat = max(tat, now)
+
+        if tat - now > tolerance:
+            self._tat[key] = tat
+            self.stats["suppressed"] += 1
+            return RateDecision(False, 0, tat - now - tolerance)
+
+        tat += interval
+        self._tat[key] = tat
+        self.stats["allowed"] += 1
+        return RateDecision(True, int((period - (tat - now)) // interval), 0.0)
+
+    def _sweep(self, now: float) -> None:
+        """Drop up to _SWEEP_PER_CHECK expired keys from the cold end."""
+        for _ in range(_SWEEP_PER_CHECK):
+            if not self._tat:
+                return
+            key, tat = next(iter(self._tat.items()))
+            if tat > now:
+                return
+            del self._tat[key]
+            self.stats["expired"] += 1
+
+    def is_limited(self, key: str, now: Optional[float] = None) -> bool:
+        """True if the next event for `key` would be suppressed (no side effects)."""
+        tat = self._tat.get(key)
+        if tat is None:
+            return False
+        now = self._clock() if now is None else now
+        return tat - now > self.period - self.period / self.limit
+
+    def active_keys(self, now: Optional[float] = None) -> int:
+        """Keys that still carry state (TAT in the future). O(n) — diagnostics only."""
+        now = self._clock() if now is None else now
+        return sum(1 for tat in self._tat.values() if tat > now)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "keys": len(self._tat), "max_keys": self.max_keys}
+
+    def clear(self) -> None:
+        self._tat.clear()
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._tat
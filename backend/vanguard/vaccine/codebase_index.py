@@ -0,0 +1,458 @@
+"""
+Vanguard Codebase Index
+========================
+Persistent per-file index of the backend, shared by the vaccine KB
+(codebase_kb) and the AI analyzer's endpoint KB (ai.knowledge_base).
+
+Each file's entry is keyed by (mtime_ns, size) with a SHA-1 content hash
+behind it: a refresh stats every file, hashes only files whose stat
+changed, and re-parses with ast only files whose content changed. Entries
+hold structure, not source:
+
+  - module docstring, top-level classes (+ methods) and functions (+ args)
+  - FastAPI routes with handler, line and the APIRouter's own prefix
+  - Pydantic models and their fields
+  - Firestore collections referenced, imports resolved to module names
+  - LazyRouter(...) mount prefixes (main.py)
+
+select() returns the slice relevant to one incident: the route serving
+its endpoint, the modules named in its traceback or code references, and
+one import hop around them. Prompts then carry a handful of modules
+instead of the whole KB.
+
+Usage:
+    index = CodebaseIndex(root, index_path=root / "data" / "kb" / "file_index.json",
+                          dirs=["vanguard", "api"])
+    index.refresh()                       # incremental; persists on change
+    index.select(endpoint="/aegis/simulate/2544", traceback=tb_text)
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+_ROUTE_METHODS = ("get", "post", "put", "delete", "patch")
+_COLLECTION_RE = re.compile(r'\.collection\(["\']([A-Za-z0-9_-]+)["\']\)')
+_TRACE_FILE_RE = re.compile(r'File "([^"]+\.py)"')
+_PATH_PARAM_RE = re.compile(r"\{(\w+)(:path)?\}")
+
+
+# ── AST summariser ────────────────────────────────────────────────────────────
+
+def _const_str(node: Optional[ast.AST]) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _kwarg(call: ast.Call, name: str) -> Optional[ast.AST]:
+    for kw in call.keywords:
+        if kw.arg == name:
+            return kw.value
+    return None
+
+
+def _call_name(call: ast.Call) -> str:
+    func = call.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return ""
+
+
+def _route_specs(fn: ast.AST) -> List[Tuple[str, str, str]]:
+    """(method, path, router variable) for each FastAPI route decorator."""
+    specs = []
+    for dec in fn.decorator_list:
+        if not (isinstance(dec, ast.Call) and isinstance(dec.func, ast.Attribute)
+                and isinstance(dec.func.value, ast.Name)):
+            continue
+        owner, attr = dec.func.value.id, dec.func.attr
+        if owner != "app" and not owner.endswith("router"):
+            continue
+        path = _const_str(dec.args[0]) if dec.args else _const_str(_kwarg(dec, "path"))
+        if path is None:
+            continue
+        if attr in _ROUTE_METHODS:
+            specs.append((attr.upper(), path, owner))
+        elif attr == "api_route":
+            methods = _kwarg(dec, "methods")
+            names = [_const_str(m) for m in getattr(methods, "elts", [])] or ["GET"]
+            specs.extend((m.upper(), path, owner) for m in names if m)
+    return specs
+
+
+def _resolve_import(node: ast.ImportFrom, package: List[str]) -> List[str]:
+    """Absolute dotted names an ImportFrom may refer to (module and module.name)."""
+    if node.level:
+        base = package[:len(package) - (node.level - 1)] if node.level > 1 else package
+        if node.level - 1 > len(package):
+            return []
+        parts = base + (node.module.split(".") if node.module else [])
+    else:
+        parts = node.module.split(".") if node.module else []
+    if not parts:
+        return []
+    module = ".".join(parts)
+    return [module] + [f"{module}.{a.name}" for a in node.names if a.name != "*"]
+
+
+def summarise_source(source: str, rel_path: str) -> Dict[str, Any]:
+    """
+    Parse one Python file and return its structure — no source code:
+    docstring, classes, functions, routes, models, collections, imports
+    and LazyRouter mounts.
+    """
+    result: Dict[str, Any] = {
+        "rel_path":    rel_path,
+        "docstring":   "",
+        "classes":     [],
+        "functions":   [],
+        "routes":      [],
+        "models":      [],
+        "collections": sorted(set(_COLLECTION_RE.findall(source))),
+        "imports":     [],
+        "mounts":      [],
+        "error":       None,
+    }
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as se:
+        result["error"] = f"SyntaxError: {se}"
+        return result
+
+    result["docstring"] = (ast.get_docstring(tree) or "")[:200]
+    package = rel_path[:-3].replace("\\", "/").split("/")[:-1]
+
+    imports = set()
+    router_prefixes: Dict[str, str] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.update(a.name for a in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.update(_resolve_import(node, package))
+        elif isinstance(node, ast.Call) and _call_name(node) == "LazyRouter" and node.args:
+            module = _const_str(node.args[0])
+            if module:
+                result["mounts"].append({"module": module, "prefix": _const_str(_kwarg(node, "prefix")) or ""})
+    result["imports"] = sorted(imports)[:60]
+
+    for node in ast.iter_child_nodes(tree):
+        # router = APIRouter(prefix="/nexus", ...)
+        if (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)
+                and _call_name(node.value) == "APIRouter"):
+            prefix = _const_str(_kwarg(node.value, "prefix")) or ""
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    router_prefixes[target.id] = prefix
+
+    for node in ast.iter_child_nodes(tree):
+        if isinstance(node, ast.ClassDef):
+            methods = [
+                n.name for n in ast.iter_child_nodes(node)
+                if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and not n.name.startswith("__")
+            ]
+            result["classes"].append({
+                "name":    node.name,
+                "doc":     (ast.get_docstring(node) or "")[:120],
+                "methods": methods[:20],
+            })
+            if any((isinstance(b, ast.Name) and b.id == "BaseModel")
+                   or (isinstance(b, ast.Attribute) and b.attr == "BaseModel") for b in node.bases):
+                fields = [
+                    n.target.id for n in node.body
+                    if isinstance(n, ast.AnnAssign) and isinstance(n.target, ast.Name)
+                ]
+                result["models"].append({"name": node.name, "fields": fields[:20], "line": node.lineno})
+
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            args = [a.arg for a in node.args.args if a.arg != "self"][:8]
+            result["functions"].append({
+                "name":  node.name,
+                "args":  args,
+                "doc":   (ast.get_docstring(node) or "")[:100],
+                "async": isinstance(node, ast.AsyncFunctionDef),
+            })
+            for method, path, owner in _route_specs(node):
+                result["routes"].append({
+                    "method":  method,
+                    "path":    router_prefixes.get(owner, "") + path,
+                    "handler": node.name,
+                    "line":    node.lineno,
+                })
+
+    return result
+
+
+def _route_regex(path: str) -> "re.Pattern[str]":
+    """/players/{player_id}/stats -> regex matching concrete request paths."""
+    pattern, pos = "", 0
+    for m in _PATH_PARAM_RE.finditer(path):
+        pattern += re.escape(path[pos:m.start()]) + (".+" if m.group(2) else "[^/]+")
+        pos = m.end()
+    pattern += re.escape(path[pos:])
+    return re.compile(pattern.rstrip("/") or "/")
+
+
+# ── Index ─────────────────────────────────────────────────────────────────────
+
+class CodebaseIndex:
+    """
+    Per-file structural index of the backend, refreshed incrementally.
+
+    generation increases whenever any file's structure changes, so callers
+    can key their own caches (rendered prompt slices, route tables) on it.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        index_path: Optional[Path] = None,
+        dirs: Sequence[str] = (),
+        skip_dirs: Iterable[str] = (),
+        skip_prefixes: Sequence[str] = (),
+    ):
+        self.root = Path(root)
+        self.index_path = Path(index_path) if index_path else None
+        self.dirs = list(dirs)
+        self.skip_dirs = set(skip_dirs)
+        self.skip_prefixes = tuple(skip_prefixes)
+        self.generation = 0
+        self.last_refresh: Dict[str, Any] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._order: List[str] = []
+        self._route_table: Optional[List[Tuple["re.Pattern[str]", Dict[str, Any]]]] = None
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    # ── persistence ──
+
+    def _load(self):
+        if not self.index_path or not self.index_path.exists():
+            return
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION or data.get("root") != str(self.root):
+                return
+            self._entries = data["files"]
+            self._order = [rel for rel in data.get("order", []) if rel in self._entries]
+            self.generation = 1
+        except Exception as e:
+            logger.debug(f"[QuantSight KB] Index load failed, rebuilding: {e}")
+
+    def _save(self):
+        if not self.index_path:
+            return
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({
+                "version": INDEX_VERSION,
+                "root":    str(self.root),
+                "order":   self._order,
+                "files":   self._entries,
+            }), encoding="utf-8")
+            tmp.replace(self.index_path)
+        except Exception as e:
+            logger.debug(f"[QuantSight KB] Could not persist index: {e}")
+
+    # ── crawl ──
+
+    def _files(self) -> List[Path]:
+        """Configured dirs in order (recursive), then top-level files of root."""
+        files, seen = [], set()
+        search_dirs = [self.root / d for d in self.dirs if (self.root / d).is_dir()] + [self.root]
+        for search_dir in search_dirs:
+            if search_dir == self.root:
+                candidates = [f for f in self.root.glob("*.py") if f.is_file()]
+            else:
+                candidates = [
+                    f for f in search_dir.rglob("*.py")
+                    if f.is_file() and not any(skip in f.parts for skip in self.skip_dirs)
+                ]
+            for f in sorted(candidates):
+                if f in seen or f.name.startswith(self.skip_prefixes):
+                    continue
+                seen.add(f)
+                files.append(f)
+        return files
+
+    def refresh(self) -> Dict[str, Any]:
+        """Re-parse changed files only; returns what the refresh did."""
+        started = time.perf_counter()
+        entries: Dict[str, Dict[str, Any]] = {}
+        order: List[str] = []
+        parsed = unchanged = rehashed = 0
+
+        for path in self._files():
+            rel = path.relative_to(self.root).as_posix()
+            try:
+                st = path.stat()
+                entry = self._entries.get(rel)
+                if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                    unchanged += 1
+                else:
+                    data = path.read_bytes()
+                    digest = hashlib.sha1(data).hexdigest()
+                    if entry and entry["sha1"] == digest:
+                        rehashed += 1          # touched, same content
+                        entry = dict(entry, mtime_ns=st.st_mtime_ns, size=st.st_size)
+                    else:
+                        parsed += 1
+                        entry = {
+                            "mtime_ns": st.st_mtime_ns,
+                            "size":     st.st_size,
+                            "sha1":     digest,
+                            "module":   summarise_source(data.decode("utf-8", errors="replace"), rel),
+                        }
+            except OSError as e:
+                logger.warning(f"[QuantSight KB] Failed to index {rel}: {e}")
+                continue
+            entries[rel] = entry
+            order.append(rel)
+
+        removed = len(self._entries.keys() - entries.keys())
+        if parsed or removed or order != self._order:
+            self.generation += 1
+            self._route_table = None
+        if parsed or removed or rehashed or order != self._order:
+            self._entries, self._order = entries, order
+            self._save()
+
+        self.last_refresh = {
+            "files":     len(order),
+            "parsed":    parsed,
+            "unchanged": unchanged,
+            "rehashed":  rehashed,
+            "removed":   removed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        return self.last_refresh
+
+    # ── queries ──
+
+    def modules(self) -> List[Dict[str, Any]]:
+        return [self._entries[rel]["module"] for rel in self._order]
+
+    def module(self, rel_path: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(rel_path)
+        return entry["module"] if entry else None
+
+    def _mount_prefixes(self) -> Dict[str, str]:
+        """rel_path of a lazily mounted router module -> its mount prefix."""
+        prefixes = {}
+        for rel in self._order:
+            for mount in self._entries[rel]["module"].get("mounts", []):
+                prefixes[mount["module"].replace(".", "/") + ".py"] = mount["prefix"]
+        return prefixes
+
+    def routes(self) -> List[Dict[str, Any]]:
+        """Every route with its file and full (mount + router + decorator) path."""
+        mounts = self._mount_prefixes()
+        routes = []
+        for rel in self._order:
+            prefix = mounts.get(rel, "")
+            for route in self._entries[rel]["module"]["routes"]:
+                routes.append(dict(route, file=rel, full_path=prefix + route["path"]))
+        return routes
+
+    def models(self) -> List[Dict[str, Any]]:
+        return [dict(m, file=rel) for rel in self._order for m in self._entries[rel]["module"].get("models", [])]
+
+    def collections(self) -> List[str]:
+        return sorted({c for rel in self._order for c in self._entries[rel]["module"].get("collections", [])})
+
+    def match_route(self, endpoint: str, method: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Routes that can serve endpoint, best first: a full-path match beats
+        a suffix match (router mounted somewhere we could not see), then more
+        literal characters beat more parameters.
+        """
+        if self._route_table is None:
+            self._route_table = [(_route_regex(r["full_path"]), r) for r in self.routes()]
+        path = endpoint.split("?", 1)[0].rstrip("/") or "/"
+
+        scored = []
+        for regex, route in self._route_table:
+            if method and route["method"] != method.upper():
+                continue
+            literal = len(_PATH_PARAM_RE.sub("", route["full_path"]))
+            if regex.fullmatch(path):
+                scored.append(((1, literal), route))
+            elif route["full_path"].strip("/") and re.fullmatch(".*/" + regex.pattern.lstrip("/"), path):
+                scored.append(((0, literal), route))
+        scored.sort(key=lambda s: s[0], reverse=True)
+        return [route for _, route in scored]
+
+    def resolve_path(self, hint: str) -> Optional[str]:
+        """Indexed rel_path for a traceback / code-reference path, if any."""
+        hint = hint.replace("\\", "/")
+        if hint in self._entries:
+            return hint
+        best = None
+        for rel in self._order:
+            if hint.endswith("/" + rel) and (best is None or len(rel) > len(best)):
+                best = rel
+        return best
+
+    def _module_path(self, dotted: str) -> Optional[str]:
+        base = dotted.replace(".", "/")
+        for rel in (base + ".py", base + "/__init__.py"):
+            if rel in self._entries:
+                return rel
+        return None
+
+    def select(
+        self,
+        endpoint: Optional[str] = None,
+        modules: Sequence[str] = (),
+        traceback: Optional[str] = None,
+        max_modules: int = 6,
+    ) -> Dict[str, Any]:
+        """
+        The slice of the index relevant to one incident:
+
+          routes       routes that can serve endpoint (best 3)
+          modules      their handler files, then traceback / referenced
+                       files (innermost frame first), then one import hop
+          models       Pydantic models defined in those modules
+          collections  Firestore collections those modules touch
+        """
+        routes = self.match_route(endpoint)[:3] if endpoint else []
+        picked: List[str] = []
+
+        def add(rel: Optional[str]):
+            if rel and rel not in picked and len(picked) < max_modules:
+                picked.append(rel)
+
+        for route in routes:
+            add(route["file"])
+        hints = list(modules)
+        if traceback:
+            hints.extend(reversed(_TRACE_FILE_RE.findall(traceback)))
+        for hint in hints:
+            add(self.resolve_path(hint))
+        for rel in list(picked):
+            for dotted in self._entries[rel]["module"]["imports"]:
+                add(self._module_path(dotted))
+
+        selected = [self._entries[rel]["module"] for rel in picked]
+        return {
+            "routes":      routes,
+            "modules":     selected,
+            "models":      [dict(m, file=mod["rel_path"]) for mod in selected for m in mod.get("models", [])],
+            "collections": sorted({c for mod in selected for c in mod.get("collections", [])}),
+        }
@@ -13,27 +13,34 @@ Gives the AI:
   - Key data models and schemas
   - Common patterns (Firestore, async, FastAPI decorators)
 
+Modules are summarised through a persistent CodebaseIndex, so a rebuild
+re-parses only files whose content changed since the last one.
+
 Usage:
-    from vanguard.vaccine.codebase_kb import get_codebase_context
+    from vanguard.vaccine.codebase_kb import get_codebase_context, get_incident_context
     ctx = await get_codebase_context()     # returns a rich markdown string
+    # Per incident, only the routes/modules/models that incident touches:
+    ctx = await get_incident_context(endpoint="/aegis/simulate/2544", traceback=tb)
     # Inject into Gemini prompt as a SYSTEM block
 """
 
 import os
-import ast
 import json
 import asyncio
 import logging
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from .codebase_index import CodebaseIndex
 
 logger = logging.getLogger(__name__)
 
 # ── Config ────────────────────────────────────────────────────────────────────
 
 _BACKEND_DIRS = [
-    "vanguard", "services", "engines", "api", "aegis",
+    "vanguard", "services", "engines", "api", "app", "aegis",
     "nexus", "models", "shared_core", "telemetry",
 ]
 
@@ -42,19 +49,22 @@ _SKIP_DIRS = {
     "migrations", ".backup_cache",
 }
 
-_SKIP_FILES = {
-    "test_", "tests/", "fetch_", "check_", "debug_",
-    "populate_", "sync_", "verify_",
-}
+_SKIP_PREFIXES = ("test_", "fetch_", "check_", "debug_", "verify_", "sync_", "populate_")
 
-# Max lines to read from each file for summary extraction
-_MAX_LINES = 120
+# Modules listed in the full-KB markdown (cap for prompt size)
+_MAX_MODULES = 120
 
 # Cache — rebuilt when stale (6 hours)
 _KB_CACHE: Optional[dict] = None
 _KB_BUILT_AT: Optional[datetime] = None
 _KB_TTL_SECONDS = 6 * 3600
 
+# One index per backend root; rendered incident slices keyed by
+# (fingerprint, index generation) so repeats of an incident reuse them
+_INDEXES: Dict[str, CodebaseIndex] = {}
+_SLICE_CACHE: "OrderedDict[Tuple, str]" = OrderedDict()
+_SLICE_CACHE_SIZE = 256
+
 
 # ── Repo root detection ───────────────────────────────────────────────────────
 
@@ -69,161 +79,28 @@ def _repo_root() -> Path:
     return Path.cwd()
 
 
-# ── AST-based module summariser ───────────────────────────────────────────────
-
-def _summarise_module(file_path: Path) -> dict:
-    """
-    Parse a Python file with AST and extract:
-      - Module docstring
-      - Top-level class names + their docstrings
-      - Top-level function/async def names + their signatures
-      - Imports (to build dependency graph)
-    Returns a compact dict — no source code, only structure.
-    """
-    result = {
-        "path":      str(file_path),
-        "rel_path":  "",
-        "docstring":  "",
-        "classes":   [],
-        "functions": [],
-        "imports":   [],
-        "routes":    [],       # FastAPI @router.get/post etc.
-        "error":     None,
-    }
-
-    try:
-        source = file_path.read_text(encoding="utf-8", errors="replace")
-        lines  = source.splitlines()
-        # Only parse up to _MAX_LINES for performance, but get top-level structure
-        try:
-            tree = ast.parse(source)
-        except SyntaxError as se:
-            result["error"] = f"SyntaxError: {se}"
-            return result
-
-        # Module docstring
-        result["docstring"] = (ast.get_docstring(tree) or "")[:200]
-
-        for node in ast.walk(tree):
-            # Imports
-            if isinstance(node, ast.Import):
-                for a in node.names:
-                    result["imports"].append(a.name.split(".")[0])
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    result["imports"].append(node.module.split(".")[0])
-
-        # Top-level only
-        for node in ast.iter_child_nodes(tree):
-            if isinstance(node, ast.ClassDef):
-                methods = [
-                    n.name for n in ast.iter_child_nodes(node)
-                    if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
-                    and not n.name.startswith("__")
-                ]
-                result["classes"].append({
-                    "name":    node.name,
-                    "doc":     (ast.get_docstring(node) or "")[:120],
-                    "methods": methods[:20],
-                })
-
-            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                args = [a.arg for a in node.args.args if a.arg != "self"][:8]
-                result["functions"].append({
-                    "name": node.name,
-                    "args": args,
-                    "doc":  (ast.get_docstring(node) or "")[:100],
-                    "async": isinstance(node, ast.AsyncFunctionDef),
-                })
-
-        # Route detection: scan source text for @router. or @app. decorators
-        for i, line in enumerate(lines[:_MAX_LINES]):
-            stripped = line.strip()
-            for method in ("get", "post", "put", "delete", "patch"):
-                if stripped.startswith(f"@router.{method}(") or stripped.startswith(f"@app.{method}("):
-                    # Grab the path from the decorator string
-                    try:
-                        path_start = stripped.index('"') + 1
-                        path_end   = stripped.index('"', path_start)
-                        route_path = stripped[path_start:path_end]
-                    except ValueError:
-                        try:
-                            path_start = stripped.index("'") + 1
-                            path_end   = stripped.index("'", path_start)
-                            route_path = stripped[path_start:path_end]
-                        except ValueError:
-                            route_path = "?"
-                    result["routes"].append(f"{method.upper()} {route_path}")
-
-        result["imports"] = list(set(result["imports"]))[:30]
-
-    except Exception as e:
-        result["error"] = str(e)
-
-    return result
-
-
-# ── Main crawler ──────────────────────────────────────────────────────────────
-
-def _crawl_backend(root: Path) -> list[dict]:
-    """Walk backend dirs and summarise each .py module."""
-    modules = []
-
-    # Priority dirs first
-    search_dirs = []
-    for d in _BACKEND_DIRS:
-        p = root / d
-        if p.is_dir():
-            search_dirs.append(p)
-    # Also include root-level files like server.py
-    search_dirs.append(root)
-
-    seen = set()
-    for search_dir in search_dirs:
-        if search_dir == root:
-            # Only top-level .py files, not recursively
-            py_files = [f for f in root.glob("*.py") if f.is_file()]
-        else:
-            py_files = [
-                f for f in search_dir.rglob("*.py")
-                if f.is_file()
-                and not any(skip in str(f) for skip in _SKIP_DIRS)
-            ]
-
-        for f in sorted(py_files):
-            if str(f) in seen:
-                continue
-            # Skip test/utility scripts
-            if any(f.name.startswith(prefix) for prefix in ("test_", "fetch_", "check_", "debug_", "verify_", "sync_", "populate_")):
-                continue
-            seen.add(str(f))
-            mod = _summarise_module(f)
-            try:
-                mod["rel_path"] = str(f.relative_to(root))
-            except Exception:
-                mod["rel_path"] = f.name
-            # Drop path (redundant)
-            mod.pop("path", None)
-            modules.append(mod)
-
-            if len(modules) >= 120:   # cap for prompt size
-                break
-        if len(modules) >= 120:
-            break
+# ── Per-file index ────────────────────────────────────────────────────────────
 
-    return modules
+def get_codebase_index(root: Optional[Path] = None) -> CodebaseIndex:
+    """The persistent per-file index for root (default: the repo root)."""
+    root = Path(root) if root is not None else _repo_root()
+    key = str(root)
+    if key not in _INDEXES:
+        _INDEXES[key] = CodebaseIndex(
+            root,
+            index_path=root / "data" / "kb" / "file_index.json",
+            dirs=_BACKEND_DIRS,
+            skip_dirs=_SKIP_DIRS,
+            skip_prefixes=_SKIP_PREFIXES,
+        )
+    return _INDEXES[key]
 
 
 # ── Route index ───────────────────────────────────────────────────────────────
 
-def _build_route_index(modules: list[dict]) -> list[str]:
+def _build_route_index(index: CodebaseIndex) -> list[str]:
     """Collect all discovered routes across all modules."""
-    routes = []
-    for m in modules:
-        for r in m.get("routes", []):
-            rel = m.get("rel_path", "?")
-            routes.append(f"{r}  [{rel}]")
-    return routes
+    return [f"{r['method']} {r['full_path']}  [{r['file']}]" for r in index.routes()]
 
 
 # ── Convention extractor ──────────────────────────────────────────────────────
@@ -262,36 +139,6 @@ def _extract_error_patterns(root: Path) -> list[str]:
     return list(dict.fromkeys(patterns))[:15]   # deduplicate + cap
 
 
-# ── Firestore collection scanner ──────────────────────────────────────────────
-
-def _scan_firestore_collections(root: Path) -> list[str]:
-    """
-    Scan codebase for Firestore collection references:
-      db.collection("...")   .collection("...")
-    Returns deduplicated list of collection names found.
-    """
-    import re
-    collections = set()
-    pattern = re.compile(r'\.collection\(["\']([A-Za-z0-9_-]+)["\']\)')
-
-    search_dirs = [root / d for d in _BACKEND_DIRS if (root / d).is_dir()]
-    search_dirs.append(root)
-
-    for d in search_dirs:
-        py_files = d.glob("*.py") if d == root else d.rglob("*.py")
-        for f in py_files:
-            if any(skip in str(f) for skip in _SKIP_DIRS):
-                continue
-            try:
-                src = f.read_text(encoding="utf-8", errors="replace")
-                for m in pattern.finditer(src):
-                    collections.add(m.group(1))
-            except Exception:
-                pass
-
-    return sorted(collections)
-
-
 # ── Router mount scanner ─────────────────────────────────────────────────────
 
 def _scan_router_mounts(root: Path) -> list[str]:
@@ -327,13 +174,10 @@ def _scan_router_mounts(root: Path) -> list[str]:
 
 # ── Markdown formatter ────────────────────────────────────────────────────────
 
-def _format_context_markdown(kb: dict) -> str:
-    """
-    Render the KB as a concise markdown block suitable for injection
-    into a Gemini system prompt (target: <2000 tokens).
-    """
+def _markdown_header(kb: dict, title: str = "## QuantSight Codebase Context") -> list[str]:
+    """Architecture + dependency preamble shared by the full and incident contexts."""
     lines = [
-        "## QuantSight Codebase Context",
+        title,
         f"_Generated: {kb['built_at']}  |  Backend root: {kb['root']}_\n",
 
         "### Architecture",
@@ -351,6 +195,67 @@ def _format_context_markdown(kb: dict) -> str:
     deps = kb.get("dependencies", [])
     lines.extend(deps[:40])
     lines += ["```", ""]
+    return lines
+
+
+def _markdown_footer(kb: dict) -> list[str]:
+    """Observed conventions + patch rules shared by the full and incident contexts."""
+    lines = []
+    patterns = kb.get("error_patterns", [])
+    if patterns:
+        lines.append("### Observed Error/Response Patterns (match these conventions)")
+        lines.append("```python")
+        for p in patterns[:10]:
+            lines.append(p)
+        lines.append("```")
+        lines.append("")
+
+    lines += [
+        "### Critical Rules for Patches",
+        "1. Never modify: `main.py`, `.env`, `config.py`, `requirements.txt`, Dockerfile",
+        "2. Always use `async def` for route handlers and storage calls",
+        "3. Catch exceptions narrowly — do NOT use bare `except:` in new code",
+        "4. Use `logger = logging.getLogger(__name__)` — never `print()` in production code",
+        "5. Return dicts from route handlers — Pydantic auto-serializes via FastAPI",
+        "6. Firestore is the ONLY persistent store — no PostgreSQL/SQLite references",
+        "7. All external HTTP calls use `httpx` or `aiohttp` (async) — never `requests` in async context",
+        "8. Do not add new imports for stdlib modules already in scope (os, json, datetime, pathlib, typing)",
+        "",
+    ]
+    return lines
+
+
+def _format_module(m: dict, detailed: bool = False) -> list[str]:
+    """One module entry; detailed adds method and argument lists."""
+    rel = m.get("rel_path", "?")
+    doc = m.get("docstring", "").replace("\n", " ")[:100]
+    if detailed:
+        classes = "; ".join(
+            f"{c['name']}({', '.join(c.get('methods', [])[:8])})" for c in m.get("classes", [])
+        )[:300]
+        fns = ", ".join(
+            f"{f['name']}({', '.join(f.get('args', []))})"
+            for f in m.get("functions", []) if not f["name"].startswith("_")
+        )[:300]
+    else:
+        classes = ", ".join(c["name"] for c in m.get("classes", []))
+        fns = ", ".join(f["name"] for f in m.get("functions", []) if not f["name"].startswith("_"))[:120]
+    rts = ", ".join(f"{r['method']} {r['path']}" for r in m.get("routes", []))[:100]
+
+    lines = [f"**{rel}**"]
+    if doc:     lines.append(f"  - _Doc_: {doc}")
+    if classes: lines.append(f"  - _Classes_: {classes}")
+    if fns:     lines.append(f"  - _Functions_: {fns}")
+    if rts:     lines.append(f"  - _Routes_: {rts}")
+    return lines
+
+
+def _format_context_markdown(kb: dict) -> str:
+    """
+    Render the KB as a concise markdown block suitable for injection
+    into a Gemini system prompt (target: <2000 tokens).
+    """
+    lines = _markdown_header(kb)
 
     # Router Mounts (prefix mapping)
     mounts = kb.get("router_mounts", [])
@@ -384,42 +289,56 @@ def _format_context_markdown(kb: dict) -> str:
     modules = kb.get("modules", [])
     lines.append("### Key Modules")
     for m in modules[:30]:
-        rel = m.get("rel_path", "?")
-        doc = m.get("docstring", "").replace("\n", " ")[:100]
-        classes = ", ".join(c["name"] for c in m.get("classes", []))
-        fns = ", ".join(f["name"] for f in m.get("functions", []) if not f["name"].startswith("_"))[:120]
-        rts = ", ".join(m.get("routes", []))[:100]
-
-        lines.append(f"**{rel}**")
-        if doc:     lines.append(f"  - _Doc_: {doc}")
-        if classes: lines.append(f"  - _Classes_: {classes}")
-        if fns:     lines.append(f"  - _Functions_: {fns}")
-        if rts:     lines.append(f"  - _Routes_: {rts}")
+        lines.extend(_format_module(m))
     lines.append("")
 
-    # Error patterns
-    patterns = kb.get("error_patterns", [])
-    if patterns:
-        lines.append("### Observed Error/Response Patterns (match these conventions)")
-        lines.append("```python")
-        for p in patterns[:10]:
-            lines.append(p)
+    lines.extend(_markdown_footer(kb))
+    return "\n".join(lines)
+
+
+def _format_incident_markdown(kb: dict, selection: dict) -> str:
+    """
+    Render only what one incident touches: the route serving its endpoint,
+    the modules around it (with signatures), their models and collections.
+    """
+    lines = _markdown_header(kb, "## QuantSight Codebase Context (incident slice)")
+
+    routes = selection["routes"]
+    if routes:
+        lines.append("### Route Serving This Endpoint")
+        lines.append("```")
+        for r in routes:
+            lines.append(f"{r['method']} {r['full_path']}  → {r['handler']}()  [{r['file']}:{r['line']}]")
         lines.append("```")
         lines.append("")
 
-    lines += [
-        "### Critical Rules for Patches",
-        "1. Never modify: `main.py`, `.env`, `config.py`, `requirements.txt`, Dockerfile",
-        "2. Always use `async def` for route handlers and storage calls",
-        "3. Catch exceptions narrowly — do NOT use bare `except:` in new code",
-        "4. Use `logger = logging.getLogger(__name__)` — never `print()` in production code",
-        "5. Return dicts from route handlers — Pydantic auto-serializes via FastAPI",
-        "6. Firestore is the ONLY persistent store — no PostgreSQL/SQLite references",
-        "7. All external HTTP calls use `httpx` or `aiohttp` (async) — never `requests` in async context",
-        "8. Do not add new imports for stdlib modules already in scope (os, json, datetime, pathlib, typing)",
-        "",
-    ]
+    modules = selection["modules"]
+    if modules:
+        lines.append("### Relevant Modules")
+        for m in modules:
+            lines.extend(_format_module(m, detailed=True))
+        lines.append("")
+    else:
+        lines.append("_No indexed module matched this incident's endpoint or traceback._")
+        lines.append("")
+
+    models = selection["models"]
+    if models:
+        lines.append("### Data Models In Scope")
+        for model in models[:15]:
+            lines.append(f"- `{model['name']}` ({model['file']}): {', '.join(model['fields'][:12])}")
+        lines.append("")
+
+    collections = selection["collections"]
+    if collections:
+        lines.append("### Firestore Collections Used Here")
+        lines.append("Use ONLY these collection names (plus any listed in the full KB).")
+        lines.append("```")
+        lines.extend(collections)
+        lines.append("```")
+        lines.append("")
 
+    lines.extend(_markdown_footer(kb))
     return "\n".join(lines)
 
 
@@ -430,15 +349,22 @@ async def build_kb() -> dict:
     global _KB_CACHE, _KB_BUILT_AT
 
     root = _repo_root()
+    index = get_codebase_index(root)
     logger.info(f"[QuantSight KB] Building codebase knowledge base from {root}")
 
-    # Run CPU-bound crawl in executor to avoid blocking event loop
+    # Run CPU-bound refresh in executor to avoid blocking event loop;
+    # only files changed since the last build are re-parsed
     loop = asyncio.get_event_loop()
-    modules      = await loop.run_in_executor(None, _crawl_backend, root)
-    routes       = await loop.run_in_executor(None, _build_route_index, modules)
+    index_stats  = await loop.run_in_executor(None, index.refresh)
+    modules      = index.modules()[:_MAX_MODULES]
+    routes       = _build_route_index(index)
     errors       = await loop.run_in_executor(None, _extract_error_patterns, root)
-    collections  = await loop.run_in_executor(None, _scan_firestore_collections, root)
+    collections  = index.collections()
     router_mounts = await loop.run_in_executor(None, _scan_router_mounts, root)
+    router_mounts += [
+        f"{mount['module']} → prefix={mount['prefix'] or '(none)'}  [{m['rel_path']}]"
+        for m in index.modules() for mount in m.get("mounts", [])
+    ]
 
     # Read requirements.txt for dependency list
     deps = []
@@ -453,7 +379,7 @@ async def build_kb() -> dict:
 
     built_at = datetime.now(timezone.utc).isoformat()
     kb = {
-        "schema_version": "1.1",
+        "schema_version": "1.2",
         "built_at":       built_at,
         "root":           str(root),
         "module_count":   len(modules),
@@ -465,6 +391,7 @@ async def build_kb() -> dict:
         "dependencies":   deps,
         "firestore_collections": collections,
         "router_mounts":  router_mounts,
+        "index":          index_stats,
     }
 
     # Generate the formatted markdown context
@@ -486,7 +413,10 @@ async def build_kb() -> dict:
     except Exception as e:
         logger.debug(f"[QuantSight KB] Could not persist to disk: {e}")
 
-    logger.info(f"[QuantSight KB] Built: {len(modules)} modules, {len(routes)} routes, {len(collections)} collections, {len(deps)} deps")
+    logger.info(
+        f"[QuantSight KB] Built: {len(modules)} modules, {len(routes)} routes, {len(collections)} collections, "
+        f"{len(deps)} deps ({index_stats['parsed']} files re-parsed in {index_stats['elapsed_ms']}ms)"
+    )
     return kb
 
 
@@ -532,9 +462,53 @@ async def get_codebase_context() -> str:
     return _KB_CACHE.get("markdown", "") if _KB_CACHE else ""
 
 
+async def get_incident_context(
+    endpoint: Optional[str] = None,
+    module: Union[str, Sequence[str], None] = None,
+    fingerprint: Optional[str] = None,
+    traceback: Optional[str] = None,
+) -> str:
+    """
+    Codebase context for one incident instead of the whole KB: the route
+    that serves endpoint, the modules named by module (file paths, e.g. code
+    references) or found in traceback, one import hop around them, and the
+    models and collections those modules use.
+
+    Rendered slices are cached per fingerprint until the index changes.
+    Falls back to the full context if the KB cannot be built.
+    """
+    full = await get_codebase_context()
+    if not _KB_CACHE or "built_at" not in _KB_CACHE:
+        return full
+
+    try:
+        index = get_codebase_index(_repo_root())
+        if not len(index):
+            await asyncio.get_event_loop().run_in_executor(None, index.refresh)
+
+        key = (fingerprint, index.generation, _KB_CACHE["built_at"]) if fingerprint else None
+        if key and key in _SLICE_CACHE:
+            _SLICE_CACHE.move_to_end(key)
+            return _SLICE_CACHE[key]
+
+        modules = [module] if isinstance(module, str) else list(module or ())
+        selection = index.select(endpoint=endpoint, modules=modules, traceback=traceback)
+        context = _format_incident_markdown(_KB_CACHE, selection)
+
+        if key:
+            _SLICE_CACHE[key] = context
+            if len(_SLICE_CACHE) > _SLICE_CACHE_SIZE:
+                _SLICE_CACHE.popitem(last=False)
+        return context
+    except Exception as e:
+        logger.warning(f"[QuantSight KB] Incident slice failed, using full context: {e}")
+        return full
+
+
 async def invalidate_kb():
     """Force a rebuild on the next call to get_codebase_context()."""
     global _KB_CACHE, _KB_BUILT_AT
     _KB_CACHE    = None
     _KB_BUILT_AT = None
+    _SLICE_CACHE.clear()
     logger.info("[QuantSight KB] Cache invalidated — will rebuild on next request")
@@ -283,11 +283,20 @@ class VaccineGenerator:
             logger.error("💉 Cannot generate fix: No GenAI client")
             return None
 
-        # Fetch codebase knowledge base context (cached, non-blocking)
+        # Fetch codebase knowledge base context for this incident (cached, non-blocking)
         kb_context = ""
         try:
-            from vanguard.vaccine.codebase_kb import get_codebase_context
-            kb_context = await get_codebase_context()
+            from vanguard.vaccine.codebase_kb import get_incident_context
+            ref_files = [
+                ref.get('file', '') if isinstance(ref, dict) else str(ref)
+                for ref in analysis.get('code_references', [])
+            ]
+            kb_context = await get_incident_context(
+                endpoint=analysis.get('endpoint'),
+                module=[f for f in ref_files if f],
+                fingerprint=analysis.get('fingerprint'),
+                traceback=analysis.get('stacktrace') or analysis.get('traceback'),
+            )
             if kb_context:
                 logger.debug(f"💉 KB context injected ({len(kb_context)} chars)")
         except Exception as kb_err:
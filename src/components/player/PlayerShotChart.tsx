@@ -2,23 +2,39 @@ import { useEffect, useState } from 'react';
 import { SectionErrorBoundary } from '../common/SectionErrorBoundary';
 import { Activity, Target } from 'lucide-react';
 
-interface ShotAttempt {
-    sequenceNumber?: number;
+interface ZoneSplit {
+    att: number;
+    made: number;
+    pct: number | null;
+}
+
+interface HexBin {
+    x: number;
+    y: number;
+    att: number;
+    made: number;
+    pct: number | null;
+}
+
+interface ShotGame {
     gameId: string;
     gameDate: string;
     matchup: string;
-    playerId: string | number;
-    playerName?: string;
-    teamTricode?: string;
-    shotType?: string;
-    distance: number | null;
-    shotArea?: string | null;
-    made: boolean;
-    period?: number;
-    clock?: string;
-    x: number | null;
-    y: number | null;
-    pointsValue?: number;
+    att: number;
+    made: number;
+}
+
+/** Server-side binned payload from GET /player-shots/{id} (view=bins) */
+interface ShotSummary {
+    attempts: number;
+    made: number;
+    points: number;
+    fgPct: number | null;
+    zones: Record<'paint' | 'mid' | 'three' | 'ft', ZoneSplit>;
+    hexSize: number;
+    hexbins: HexBin[];
+    games: ShotGame[];
+    seasons: string[];
 }
 
 interface ClusteredShot {
@@ -38,7 +54,6 @@ interface PlayerShotChartProps {
 // NBA court half-court dimensions
 const COURT_W = 500;
 const COURT_H = 470;
-const CLUSTER_RADIUS = 12; // pixels — shots within this radius merge
 
 function courtX(x: number): number {
     return ((x + 250) / 500) * COURT_W;
@@ -47,47 +62,20 @@ function courtY(y: number): number {
     return ((y + 50) / 470) * COURT_H;
 }
 
-/** Group shots that land within CLUSTER_RADIUS pixels of each other */
-function clusterShots(shots: ShotAttempt[]): ClusteredShot[] {
-    const clusters: ClusteredShot[] = [];
-
-    for (const s of shots) {
-        if (s.x === null || s.y === null) continue;
-        const sx = courtX(s.x);
-        const sy = courtY(s.y);
-
-        // Find existing cluster within radius
-        let merged = false;
-        for (const c of clusters) {
-            const dx = c.cx - sx;
-            const dy = c.cy - sy;
-            if (Math.sqrt(dx * dx + dy * dy) <= CLUSTER_RADIUS) {
-                // Weighted average position
-                const newTotal = c.total + 1;
-                c.cx = (c.cx * c.total + sx) / newTotal;
-                c.cy = (c.cy * c.total + sy) / newTotal;
-                if (s.made) c.made++;
-                else c.missed++;
-                c.total = newTotal;
-                c.pct = c.total > 0 ? (c.made / c.total) * 100 : 0;
-                merged = true;
-                break;
-            }
-        }
-
-        if (!merged) {
-            clusters.push({
-                cx: sx,
-                cy: sy,
-                made: s.made ? 1 : 0,
-                missed: s.made ? 0 : 1,
-                total: 1,
-                pct: s.made ? 100 : 0,
-            });
-        }
-    }
+/** Project server hex bins onto the SVG court */
+function binsToClusters(bins: HexBin[]): ClusteredShot[] {
+    return bins.map(b => ({
+        cx: courtX(b.x),
+        cy: courtY(b.y),
+        made: b.made,
+        missed: b.att - b.made,
+        total: b.att,
+        pct: b.pct ?? 0,
+    }));
+}
 
-    return clusters;
+function formatPct(z: ZoneSplit | undefined): string {
+    return z && z.pct !== null ? z.pct.toFixed(1) : '—';
 }
 
 function getClusterColor(pct: number): string {
@@ -99,7 +87,9 @@ function getClusterColor(pct: number): string {
 }
 
 function PlayerShotChartContent({ playerId }: PlayerShotChartProps) {
-    const [shots, setShots] = useState<ShotAttempt[]>([]);
+    const [summary, setSummary] = useState<ShotSummary | null>(null);
+    const [games, setGames] = useState<ShotGame[]>([]);
+    const [totalAttempts, setTotalAttempts] = useState(0);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [source, setSource] = useState<string>('');
@@ -113,12 +103,18 @@ function PlayerShotChartContent({ playerId }: PlayerShotChartProps) {
             setError(null);
             try {
                 const base = import.meta.env.VITE_API_URL || 'https://quantsight-cloud-458498663186.us-central1.run.app';
-                // Use the new endpoint that tries Firestore first, then NBA API
-                const res = await fetch(`${base}/player-shots/${playerId}`);
+                // Pre-binned zones + hexbins (one Firestore read server-side)
+                const gameParam = selectedGame ? `?game_id=${encodeURIComponent(selectedGame)}` : '';
+                const res = await fetch(`${base}/player-shots/${playerId}${gameParam}`);
                 if (!res.ok) throw new Error(`Shot data unavailable (${res.status})`);
                 const data = await res.json();
-                setShots(data.shots || []);
-                setSource(data.source || '');
+                const next: ShotSummary | null = data.summary || null;
+                setSummary(next);
+                if (!selectedGame) {
+                    setGames(next?.games || []);
+                    setTotalAttempts(next?.attempts || 0);
+                    setSource(data.source || '');
+                }
             } catch (e: any) {
                 setError(e.message || 'Failed to load shot chart data');
             } finally {
@@ -126,9 +122,9 @@ function PlayerShotChartContent({ playerId }: PlayerShotChartProps) {
             }
         };
         fetchShots();
-    }, [playerId]);
+    }, [playerId, selectedGame]);
 
-    if (loading) {
+    if (loading && !summary) {
         return (
             <div className="flex flex-col items-center justify-center py-16 space-y-4 border border-pro-border rounded-xl bg-pro-surface relative shadow-sm" >
                 
@@ -138,7 +134,7 @@ function PlayerShotChartContent({ playerId }: PlayerShotChartProps) {
         );
     }
 
-    if (error || shots.length === 0) {
+    if (error || !summary || (summary.attempts === 0 && !selectedGame)) {
         return (
             <div className="p-8 text-center border border-pro-border rounded-xl bg-pro-surface text-pro-muted relative shadow-sm" >
                 
@@ -151,28 +147,16 @@ function PlayerShotChartContent({ playerId }: PlayerShotChartProps) {
         );
     }
 
-    // Unique games for filter
-    const games = Array.from(new Set(shots.map(s => s.gameId))).map(gid => {
-        const shot = shots.find(s => s.gameId === gid);
-        return { gameId: gid, gameDate: shot?.gameDate || '', matchup: shot?.matchup || gid };
-    });
-    games.sort((a, b) => (b.gameDate || '').localeCompare(a.gameDate || ''));
-
-    const filteredShots = selectedGame ? shots.filter(s => s.gameId === selectedGame) : shots;
-    const madeShots = filteredShots.filter(s => s.made);
-    const missedShots = filteredShots.filter(s => !s.made);
-    const fgPct = filteredShots.length > 0 ? ((madeShots.length / filteredShots.length) * 100).toFixed(1) : '0';
+    const fgPct = summary.fgPct !== null ? summary.fgPct.toFixed(1) : '0';
 
-    // Cluster shots for visualization
-    const clusters = clusterShots(filteredShots);
+    // Hex bins arrive pre-aggregated from the server
+    const clusters = binsToClusters(summary.hexbins);
 
     // Zone breakdown
-    const paintShots = filteredShots.filter(s => (s.distance || 0) < 8);
-    const midShots = filteredShots.filter(s => (s.distance || 0) >= 8 && (s.distance || 0) < 23);
-    const threeShots = filteredShots.filter(s => (s.distance || 0) >= 23);
-    const paintPct = paintShots.length > 0 ? ((paintShots.filter(s => s.made).length / paintShots.length) * 100).toFixed(1) : '—';
-    const midPct = midShots.length > 0 ? ((midShots.filter(s => s.made).length / midShots.length) * 100).toFixed(1) : '—';
-    const threePct = threeShots.length > 0 ? ((threeShots.filter(s => s.made).length / threeShots.length) * 100).toFixed(1) : '—';
+    const { paint, mid, three } = summary.zones;
+    const paintPct = formatPct(paint);
+    const midPct = formatPct(mid);
+    const threePct = formatPct(three);
 
     return (
         <div className="space-y-6">
@@ -180,13 +164,13 @@ function PlayerShotChartContent({ playerId }: PlayerShotChartProps) {
             <div className="flex items-center justify-between flex-wrap gap-3">
                 <h3 className="text-lg font-medium font-bold tracking-normal uppercase text-pro-text flex items-center gap-2">
                     <Target className="w-5 h-5 text-blue-500" /> Shot Chart
-                    <span className="text-xs text-pro-muted font-mono ml-2 tracking-wide uppercase">{filteredShots.length} shots</span>
+                    <span className="text-xs text-pro-muted font-mono ml-2 tracking-wide uppercase">{summary.attempts} shots</span>
                     {source && (
-                        <span className={`text-xs px-2 py-0.5 rounded-xl border font-mono uppercase tracking-wide ml-2 ${source === 'firestore' ? 'bg-emerald-500/10 text-emerald-500 border-emerald-500/50' :
-                                source === 'nba_api' ? 'bg-blue-500/10 text-blue-500 border-blue-500/50' :
+                        <span className={`text-xs px-2 py-0.5 rounded-xl border font-mono uppercase tracking-wide ml-2 ${source.startsWith('firestore') ? 'bg-emerald-500/10 text-emerald-500 border-emerald-500/50' :
+                                source.startsWith('nba_api') ? 'bg-blue-500/10 text-blue-500 border-blue-500/50' :
                                     'bg-white/[0.02] text-pro-muted border-pro-border'
                             }`}>
-                            {source === 'firestore' ? 'LIVE' : source === 'nba_api' ? 'NBA API' : source}
+                            {source.startsWith('firestore') ? 'LIVE' : source.startsWith('nba_api') ? 'NBA API' : source}
                         </span>
                     )}
                 </h3>
@@ -195,7 +179,7 @@ function PlayerShotChartContent({ playerId }: PlayerShotChartProps) {
                     onChange={(e) => setSelectedGame(e.target.value || null)}
                     className="bg-pro-bg border border-pro-border rounded-xl px-3 py-1.5 text-pro-text text-xs font-mono uppercase tracking-wide focus:border-blue-500 outline-none cursor-pointer"
                 >
-                    <option value="">All Games ({shots.length} shots)</option>
+                    <option value="">All Games ({totalAttempts} shots)</option>
                     {games.map(g => (
                         <option key={g.gameId} value={g.gameId}>
                             {g.gameDate} — {g.matchup}
@@ -204,7 +188,7 @@ function PlayerShotChartContent({ playerId }: PlayerShotChartProps) {
                 </select>
             </div>
 
-            {/* Court SVG with clustering */}
+            {/* Court SVG with server-side hex bins */}
             <div className="bg-pro-surface border border-pro-border rounded-xl p-4 overflow-hidden relative shadow-sm" >
                 
                 <div className="aspect-[500/470] max-w-2xl mx-auto relative z-10">
@@ -221,7 +205,7 @@ function PlayerShotChartContent({ playerId }: PlayerShotChartProps) {
                         <path d={`M ${courtX(-220)} 0 Q ${courtX(-220)} ${courtY(300)}, ${COURT_W / 2} ${courtY(375)} Q ${courtX(220)} ${courtY(300)}, ${courtX(220)} 0`}
                             fill="none" stroke="#475569" strokeWidth="1.5" />
 
-                        {/* Clustered shots — size scales with frequency, color with FG% */}
+                        {/* Hex bins — size scales with frequency, color with FG% */}
                         {clusters.map((c, i) => {
                             const r = Math.min(18, 4 + Math.sqrt(c.total) * 2.5);
                             const color = getClusterColor(c.pct);
@@ -285,25 +269,25 @@ function PlayerShotChartContent({ playerId }: PlayerShotChartProps) {
                     
                     <div className="text-xs text-pro-muted font-medium font-semibold uppercase tracking-wide mb-1 relative z-10">Overall FG%</div>
                     <div className="text-2xl font-mono text-pro-text relative z-10">{fgPct}%</div>
-                    <div className="text-xs text-blue-500 font-mono mt-0.5 opacity-80 uppercase tracking-wider relative z-10">{madeShots.length}/{filteredShots.length}</div>
+                    <div className="text-xs text-blue-500 font-mono mt-0.5 opacity-80 uppercase tracking-wider relative z-10">{summary.made}/{summary.attempts}</div>
                 </div>
                 <div className="bg-pro-surface border border-pro-border rounded-xl p-4 text-center relative shadow-sm" >
                     
                     <div className="text-xs text-pro-muted font-medium font-semibold uppercase tracking-wide mb-1 relative z-10">Paint (&lt;8ft)</div>
                     <div className={`text-2xl font-mono relative z-10 ${parseFloat(paintPct) >= 50 ? 'text-emerald-500' : 'text-pro-text'}`}>{paintPct}%</div>
-                    <div className="text-xs text-blue-500 font-mono mt-0.5 opacity-80 uppercase tracking-wider relative z-10">{paintShots.filter(s => s.made).length}/{paintShots.length}</div>
+                    <div className="text-xs text-blue-500 font-mono mt-0.5 opacity-80 uppercase tracking-wider relative z-10">{paint.made}/{paint.att}</div>
                 </div>
                 <div className="bg-pro-surface border border-pro-border rounded-xl p-4 text-center relative shadow-sm" >
                     
                     <div className="text-xs text-pro-muted font-medium font-semibold uppercase tracking-wide mb-1 relative z-10">Mid-Range</div>
                     <div className="text-2xl font-mono text-pro-text relative z-10">{midPct}%</div>
-                    <div className="text-xs text-blue-500 font-mono mt-0.5 opacity-80 uppercase tracking-wider relative z-10">{midShots.filter(s => s.made).length}/{midShots.length}</div>
+                    <div className="text-xs text-blue-500 font-mono mt-0.5 opacity-80 uppercase tracking-wider relative z-10">{mid.made}/{mid.att}</div>
                 </div>
                 <div className="bg-pro-surface border border-pro-border rounded-xl p-4 text-center relative shadow-sm" >
                     
                     <div className="text-xs text-pro-muted font-medium font-semibold uppercase tracking-wide mb-1 relative z-10">3-Point</div>
                     <div className={`text-2xl font-mono relative z-10 ${parseFloat(threePct) >= 36 ? 'text-emerald-500' : 'text-pro-text'}`}>{threePct}%</div>
-                    <div className="text-xs text-blue-500 font-mono mt-0.5 opacity-80 uppercase tracking-wider relative z-10">{threeShots.filter(s => s.made).length}/{threeShots.length}</div>
+                    <div className="text-xs text-blue-500 font-mono mt-0.5 opacity-80 uppercase tracking-wider relative z-10">{three.made}/{three.att}</div>
                 </div>
             </div>
         </div>
@@ -37,6 +37,17 @@ export function useLivePlayByPlay(gameId: string | null) {
     const eventSourceRef = useRef<EventSource | null>(null);
     const retryTimeoutRef = useRef<any>(null);
     const gameEndedRef = useRef<boolean>(false);
+    // Highest sequenceNumber seen — sent on reconnect so the server replays
+    // missed plays from its ring buffer instead of us re-hydrating.
+    const lastSeqRef = useRef<number | null>(null);
+
+    const trackLastSeq = (list: PlayEvent[]) => {
+        for (const p of list) {
+            if (lastSeqRef.current === null || p.sequenceNumber > lastSeqRef.current) {
+                lastSeqRef.current = p.sequenceNumber;
+            }
+        }
+    };
 
     // 1. Initial Hydration
     const fetchCachedPlays = useCallback(async (id: string) => {
@@ -45,6 +56,7 @@ export function useLivePlayByPlay(gameId: string | null) {
                 path: `v1/games/${id}/plays?limit=1000`
             });
             if (res && res.plays) {
+                trackLastSeq(res.plays);
                 setPlays(res.plays);
             }
         } catch (err) {
@@ -60,7 +72,8 @@ export function useLivePlayByPlay(gameId: string | null) {
 
         // Use robust connection from config
         const baseUrl = API_BASE.replace(/\/+$/, '');
-        const sseUrl = `${baseUrl}/v1/games/${id}/stream`;
+        const resume = lastSeqRef.current !== null ? `?last_event_id=${lastSeqRef.current}` : '';
+        const sseUrl = `${baseUrl}/v1/games/${id}/stream${resume}`;
 
         const es = new EventSource(sseUrl);
         eventSourceRef.current = es;
@@ -91,7 +104,11 @@ export function useLivePlayByPlay(gameId: string | null) {
                     }
                     setIsConnected(false);
                     setIsReconnecting(false);
+                } else if (data.type === 'resync') {
+                    // Server buffer no longer covers our resume point
+                    fetchCachedPlays(id);
                 } else if (data.type === 'plays_update' && data.plays) {
+                    trackLastSeq(data.plays as PlayEvent[]);
                     // Append new plays and deduplicate by sequenceNumber
                     setPlays(prev => {
                         const existingSeq = new Set(prev.map(p => p.sequenceNumber));
@@ -119,7 +136,7 @@ export function useLivePlayByPlay(gameId: string | null) {
             }
         };
 
-    }, []);
+    }, [fetchCachedPlays]);
 
     useEffect(() => {
         if (!gameId) {
@@ -132,6 +149,7 @@ export function useLivePlayByPlay(gameId: string | null) {
         setPlays([]);
         setError(null);
         gameEndedRef.current = false;
+        lastSeqRef.current = null;
 
         // Initial load
         fetchCachedPlays(gameId).then(() => {